@@ -0,0 +1,834 @@
+#!/usr/bin/env python3
+"""
+Await-chain analyzer for the chat POST hot path.
+
+Parses src/app/api/chat/route.ts (and the src/lib/*.ts functions it calls)
+without a TypeScript toolchain, builds a def/use dependency graph of the
+statements in every block of POST - following calls into executeTool and
+other async helpers - and reports runs of `await`s that execute one after
+another although none of them depends on the others. Each run is a
+candidate for Promise.all (or for dropping the await entirely).
+
+Findings are ranked by an estimate of how often they run per request:
+  - every enclosing loop multiplies by its literal bound or --loop-factor
+  - callbacks passed to .map / .forEach / ... multiply by --fanout
+  - if / else / catch blocks multiply by --branch-factor
+  - case branches divide by the number of cases, or use --profile shares
+    (JSON {"<case label>": count}, e.g. from sparkie_tool_log)
+and each finding scores weight x (awaits in run - 1), i.e. estimated
+round trips saved per request.
+
+The analysis is lexical: identifiers in type annotations count as uses and
+any assignment or mutating call counts as a def, so it errs towards
+reporting dependencies that are not there (missed findings), not the
+reverse. Runs where a statement writes to the database - in its own text or
+in an async function it calls, e.g. saveAttempt() - are flagged
+confidence="review": two independent-looking writes can still rely on
+ordering, and a write is not safe to defer without checking who reads it.
+
+Usage:
+  python3 .github/scripts/await_chain.py                 # top findings, text
+  python3 .github/scripts/await_chain.py --json -o awaits.json
+  python3 .github/scripts/await_chain.py --profile tool_counts.json --top 50
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+
+ROUTE = 'src/app/api/chat/route.ts'
+SRC_ROOT = 'src'
+
+KEYWORDS = set('''
+    abstract any as async await boolean break case catch class const continue debugger default delete do
+    else enum export extends false finally for from function get if implements import in instanceof
+    interface let new null number object of package private protected public readonly return set static
+    string super switch symbol this throw true try type typeof undefined unknown var void while with yield
+    never Promise Record Array Map Set Date JSON Math Object String Number Boolean Error console process
+'''.split())
+
+REGEX_PREV_CHARS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_PREV_WORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw', 'yield', 'await'}
+MUTATORS = ('push', 'unshift', 'pop', 'shift', 'splice', 'sort', 'reverse', 'set', 'add', 'delete', 'clear', 'fill')
+FANOUT_METHODS = ('map', 'forEach', 'flatMap', 'filter', 'reduce', 'some', 'every', 'find', 'findIndex')
+SQL_WRITE_RE = re.compile(r'\b(INSERT|UPDATE|DELETE|UPSERT|CREATE|ALTER|DROP|TRUNCATE)\b'
+                          r"|method:\s*['\"](?:POST|PUT|PATCH|DELETE)['\"]")
+# Deliberate pauses: never worth parallelising, and they order what follows.
+SLEEP_RE = re.compile(r'\bawait\s+new\s+Promise\s*\(\s*\(?\s*\w+\s*\)?\s*=>\s*setTimeout\b')
+IDENT_RE = re.compile(r'[A-Za-z_$][\w$]*')
+EXIT_RE = re.compile(r'\b(return|throw|break|continue)\b')
+
+
+# ── Lexing ───────────────────────────────────────────────────────────────────
+
+def sanitize(src):
+    """
+    Same-length copy of src with comments, string/regex contents and template
+    text blanked out. Template `${expr}` keeps expr, wrapped as ` (expr)`, so
+    identifiers and awaits inside interpolations still count.
+    """
+    out = list(src)
+    n = len(src)
+    i = 0
+    tpl_stack = []  # brace depth inside each open ${ ... }
+    in_template = False
+    last_sig = ''
+    last_word = ''
+
+    def blank(a, b):
+        for k in range(a, min(b, n)):
+            if out[k] != '\n':
+                out[k] = ' '
+
+    while i < n:
+        ch = src[i]
+        nxt = src[i + 1] if i + 1 < n else ''
+        if in_template:
+            if ch == '\\':
+                blank(i, i + 2)
+                i += 2
+            elif ch == '`':
+                in_template = False
+                last_sig = '`'
+                i += 1
+            elif ch == '$' and nxt == '{':
+                out[i], out[i + 1] = ' ', '('
+                tpl_stack.append(0)
+                in_template = False
+                last_sig = '('
+                i += 2
+            else:
+                blank(i, i + 1)
+                i += 1
+            continue
+
+        if ch == '/' and nxt == '/':
+            j = src.find('\n', i)
+            j = n if j < 0 else j
+            blank(i, j)
+            i = j
+        elif ch == '/' and nxt == '*':
+            j = src.find('*/', i + 2)
+            j = n if j < 0 else j + 2
+            blank(i, j)
+            i = j
+        elif ch in '\'"':
+            j = i + 1
+            while j < n and src[j] != ch and src[j] != '\n':
+                j += 2 if src[j] == '\\' else 1
+            blank(i + 1, j)
+            last_sig = ch
+            i = j + 1
+        elif ch == '`':
+            in_template = True
+            i += 1
+        elif ch == '/' and (last_sig in REGEX_PREV_CHARS or last_sig == '' or last_word in REGEX_PREV_WORDS):
+            j, in_class = i + 1, False
+            while j < n and src[j] != '\n':
+                c = src[j]
+                if c == '\\':
+                    j += 2
+                    continue
+                if c == '[':
+                    in_class = True
+                elif c == ']':
+                    in_class = False
+                elif c == '/' and not in_class:
+                    break
+                j += 1
+            if j < n and src[j] == '/':
+                blank(i + 1, j)
+                j += 1
+                while j < n and src[j].isalpha():
+                    j += 1
+                last_sig = '/'
+                last_word = ''
+                i = j
+            else:
+                last_sig = '/'
+                i += 1
+        else:
+            if tpl_stack:
+                if ch == '{':
+                    tpl_stack[-1] += 1
+                elif ch == '}':
+                    if tpl_stack[-1] == 0:
+                        tpl_stack.pop()
+                        out[i] = ')'
+                        in_template = True
+                        i += 1
+                        continue
+                    tpl_stack[-1] -= 1
+            if ch.isalnum() or ch in '_$':
+                j = i
+                while j < n and (src[j].isalnum() or src[j] in '_$'):
+                    j += 1
+                last_word = src[i:j]
+                last_sig = src[j - 1]
+                i = j
+                continue
+            if not ch.isspace():
+                last_sig = ch
+                last_word = ''
+            i += 1
+    return ''.join(out)
+
+
+def match_close(code, i):
+    """Index of the bracket closing code[i] (one of ({[)."""
+    pairs = {'(': ')', '[': ']', '{': '}'}
+    stack = [pairs[code[i]]]
+    j = i + 1
+    n = len(code)
+    while j < n:
+        c = code[j]
+        if c in pairs:
+            stack.append(pairs[c])
+        elif c in ')]}':
+            stack.pop()
+            if not stack:
+                return j
+        j += 1
+    raise ValueError(f'unbalanced bracket at offset {i}')
+
+
+def match_open(code, j):
+    """Index of the bracket opening code[j] (one of )]})."""
+    pairs = {')': '(', ']': '[', '}': '{'}
+    stack = [pairs[code[j]]]
+    i = j - 1
+    while i >= 0:
+        c = code[i]
+        if c in pairs:
+            stack.append(pairs[c])
+        elif c in '([{':
+            stack.pop()
+            if not stack:
+                return i
+        i -= 1
+    raise ValueError(f'unbalanced bracket at offset {j}')
+
+
+def word_before(code, i):
+    """(word, start) immediately before offset i, skipping whitespace."""
+    j = i - 1
+    while j >= 0 and code[j].isspace():
+        j -= 1
+    end = j + 1
+    while j >= 0 and (code[j].isalnum() or code[j] in '_$'):
+        j -= 1
+    return code[j + 1:end], j + 1
+
+
+def prev_sig(code, i):
+    j = i - 1
+    while j >= 0 and code[j].isspace():
+        j -= 1
+    return j
+
+
+# ── Source files ─────────────────────────────────────────────────────────────
+
+class Source:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'r', encoding='utf-8') as f:
+            self.raw = f.read()
+        self.code = sanitize(self.raw)
+        self._line_starts = [0] + [m.end() for m in re.finditer('\n', self.raw)]
+        self._fn_cache = {}
+        self._fn_index = {}
+        for m in re.finditer(r'\basync\s+function\s+([A-Za-z_$][\w$]*)\s*\(', self.code):
+            self._fn_index.setdefault(m.group(1), m)
+        self.imports = {}
+        for m in re.finditer(r"import\s*\{([^}]*)\}\s*from\s*'([^']+)'", self.raw):
+            for part in m.group(1).split(','):
+                part = part.strip()
+                if not part or part.startswith('type '):
+                    continue
+                orig, _, alias = part.partition(' as ')
+                self.imports[(alias or orig).strip()] = (orig.strip(), m.group(2))
+
+    def line(self, offset):
+        lo, hi = 0, len(self._line_starts) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self._line_starts[mid] <= offset:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo + 1
+
+    def async_function(self, name):
+        """(body_open, body_close) of `async function name(`, or None."""
+        if name not in self._fn_cache:
+            self._fn_cache[name] = self._find_async_function(name)
+        return self._fn_cache[name]
+
+    def _find_async_function(self, name):
+        m = self._fn_index.get(name)
+        if not m:
+            return None
+        close = match_close(self.code, m.end() - 1)
+        angle, i = 0, close + 1
+        while i < len(self.code):
+            c = self.code[i]
+            if c == '<':
+                angle += 1
+            elif c == '>' and self.code[i - 1] != '=':
+                angle -= 1
+            elif c == '{' and angle == 0:
+                return i, match_close(self.code, i)
+            elif c in '{[(' and angle > 0:
+                i = match_close(self.code, i)
+            i += 1
+        return None
+
+
+def resolve_module(spec, from_path):
+    if spec.startswith('@/'):
+        base = os.path.join(SRC_ROOT, spec[2:])
+    elif spec.startswith('.'):
+        base = os.path.normpath(os.path.join(os.path.dirname(from_path), spec))
+    else:
+        return None
+    for cand in (base + '.ts', base + '.tsx', os.path.join(base, 'index.ts')):
+        if os.path.exists(cand):
+            return cand
+    return None
+
+
+# ── Statements ───────────────────────────────────────────────────────────────
+
+CONT_END = ('=', ',', '(', '[', '{', '=>', '&&', '||', '??', '?', ':', '+', '-', '*', '/', '.', '|', '&', '<', '>')
+CONT_START = ('.', '?', ':', '&&', '||', '??', '+', '*', '/', ')', ']', '=>', '|', '&', 'else', 'catch', 'finally', 'as ')
+
+
+def split_statements(code, start, end):
+    """Split code[start:end] (a block interior) into (s, e) statement spans."""
+    spans = []
+    i, s = start, start
+    depth = 0
+    while i < end:
+        c = code[i]
+        if c in '([{':
+            depth += 1
+        elif c in ')]}':
+            depth -= 1
+        elif depth == 0 and c == ';':
+            if code[s:i].strip():
+                spans.append((s, i))
+            s = i + 1
+        elif depth == 0 and c == '\n':
+            cur = code[s:i].rstrip()
+            rest = code[i + 1:end].lstrip()
+            label = re.match(r'\s*(case\b[^\n]*|default\s*):\s*$', code[s:i])
+            if cur.strip() and (label or not (cur.endswith(CONT_END) or rest.startswith(CONT_START))):
+                spans.append((s, i))
+                s = i + 1
+        i += 1
+    if code[s:end].strip():
+        spans.append((s, end))
+    return spans
+
+
+class Stmt:
+    def __init__(self, src, s, e):
+        self.src, self.e = src, e
+        lead = src.code[s:e]
+        self.s = s + len(lead) - len(lead.lstrip())  # skip blanked leading comments
+        self.blocks = []     # (open, close, kind, factor, label) control blocks
+        self.functions = []  # (open, close, factor) nested function bodies
+        self._scan_nested(s, e)
+        code = src.code
+        own = list(code[s:e])
+        for o, c, *_ in self.blocks + self.functions:
+            for k in range(o - s, c - s + 1):
+                own[k] = ' '
+        self.own = ''.join(own)
+        fn_free = list(code[s:e])
+        for o, c, _f in self.functions:
+            for k in range(o - s, c - s + 1):
+                fn_free[k] = ' '
+        self.fn_free = ''.join(fn_free)  # statement minus nested function bodies
+
+        self.awaits = len(re.findall(r'\bawait\b', self.fn_free))
+        self.direct_awaits = len(re.findall(r'\bawait\b', self.own))
+        self.exits = bool(EXIT_RE.search(self.fn_free))
+        self.barrier = bool(SLEEP_RE.search(self.fn_free))
+        self.uses = self._idents(code[s:e])
+        self.defs = self._defs(code[s:e])
+        self.writes = bool(SQL_WRITE_RE.search(src.raw[s:e]))
+
+    def _scan_nested(self, s, e):
+        code = self.src.code
+        i = s
+        while i < e:
+            if code[i] != '{':
+                i += 1
+                continue
+            close = match_close(code, i)
+            kind, factor, label = self._classify(i)
+            if kind == 'function':
+                self.functions.append((i, close, factor))
+            elif kind == 'object':
+                self._scan_nested(i + 1, close)
+            else:
+                self.blocks.append((i, close, kind, factor, label))
+            i = close + 1
+
+    def _classify(self, i):
+        """(kind, factor, label) for the `{` at offset i."""
+        code = self.src.code
+        p = prev_sig(code, i)
+        if p < 0:
+            return 'block', 1.0, None
+        if code[p] == '>' and code[p - 1] == '=':
+            return 'function', self._callback_factor(p - 1), None
+        if code[p] == ')':
+            o = match_open(code, p)
+            word, _ = word_before(code, o)
+            if word in ('if', 'catch'):
+                return 'branch', ARGS.branch_factor, None
+            if word in ('for', 'while'):
+                return 'loop', loop_factor(code[o:p + 1]), None
+            if word == 'switch':
+                return 'switch', 1.0, None
+            # function / method signature, possibly with a return type before {
+            return 'function', 1.0, None
+        word, _ = word_before(code, p + 1)
+        if word in ('else',):
+            return 'branch', ARGS.branch_factor, None
+        if word in ('try', 'finally'):
+            return 'block', 1.0, None
+        if word == 'do':
+            return 'loop', ARGS.loop_factor, None
+        if code[p] == ':':
+            head = code[code.rfind('\n', 0, p) + 1:p]
+            m = re.match(r'\s*(case|default)\b', head)
+            if m:
+                return 'case', 1.0, self.src.raw[code.rfind('\n', 0, p) + 1:p].strip()
+        # return type annotation between ) and { (e.g. `): Promise<void> {`)
+        k = p
+        angle = 0
+        while k > self.s:
+            c = code[k]
+            if c == '>':
+                angle += 1
+            elif c == '<':
+                angle -= 1
+            elif c == ')' and angle == 0:
+                between = code[k + 1:i].strip()
+                if between.startswith(':'):
+                    return 'function', 1.0, None
+                break
+            elif c in ';\n' and angle == 0:
+                break
+            k -= 1
+        return 'object', 1.0, None
+
+    def _callback_factor(self, arrow):
+        """Fan-out factor when the arrow function at `arrow` is a .map(...)-style callback."""
+        code = self.src.code
+        depth, k = 0, arrow
+        while k > self.s:
+            c = code[k]
+            if c in ')]}':
+                depth += 1
+            elif c in '([{':
+                if depth == 0:
+                    if c == '(':
+                        word, wstart = word_before(code, k)
+                        if word in FANOUT_METHODS and wstart > 0 and code[wstart - 1] == '.':
+                            return ARGS.fanout
+                    return 1.0
+                depth -= 1
+            k -= 1
+        return 1.0
+
+    @staticmethod
+    def _idents(text):
+        names = set()
+        for m in IDENT_RE.finditer(text):
+            a = m.start()
+            if a and (text[a - 1].isalnum() or text[a - 1] in '_$'):
+                continue
+            if a and text[a - 1] == '.' and not text[max(0, a - 3):a] == '...':
+                continue
+            if m.group() not in KEYWORDS:
+                names.add(m.group())
+        return names
+
+    def _defs(self, text):
+        defs = set()
+        for m in re.finditer(r'\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)', text):
+            defs.add(m.group(1))
+        for m in re.finditer(r'\b(?:const|let|var)\s+([{[])', text):
+            close = match_close(text, m.end() - 1)
+            defs |= pattern_names(text[m.end() - 1:close + 1])
+        for m in re.finditer(r'(?:^|[;(])\s*\(?\s*([{[])', text):
+            try:
+                close = match_close(text, m.end() - 1)
+            except (ValueError, IndexError):
+                continue
+            if re.match(r'\s*=(?![=>])', text[close + 1:]):
+                defs |= pattern_names(text[m.end() - 1:close + 1])
+        assign = re.compile(r'(?<![\w$.])([A-Za-z_$][\w$]*)(?:\??\.[\w$]+|\[[^\]\n]*\])*\s*'
+                            r'(?:=(?![=>])|\+=|-=|\*=|/=|\|\|=|&&=|\?\?=|\+\+|--)')
+        for m in assign.finditer(text):
+            defs.add(m.group(1))
+        for m in re.finditer(r'(?:\+\+|--)([A-Za-z_$][\w$]*)', text):
+            defs.add(m.group(1))
+        mut = re.compile(r'(?<![\w$.])([A-Za-z_$][\w$]*)(?:\.[\w$]+)*\.(?:' + '|'.join(MUTATORS) + r')\s*\(')
+        for m in mut.finditer(text):
+            defs.add(m.group(1))
+        return defs - KEYWORDS
+
+    def callee(self):
+        m = re.search(r'\bawait\s+([A-Za-z_$][\w$.]*)', self.fn_free)
+        return m.group(1) if m else None
+
+    def snippet(self):
+        raw = self.src.raw[self.s:self.e].strip()
+        first = raw.split('\n', 1)[0].strip()
+        return first[:140]
+
+
+def pattern_names(pattern):
+    """Names bound by a destructuring pattern like `{ a, b: c, ...d }` or `[x, , y]`."""
+    inner = pattern[1:-1]
+    names = set()
+    depth, token, parts = 0, '', []
+    for ch in inner:
+        if ch in '{[(':
+            depth += 1
+        elif ch in '}])':
+            depth -= 1
+        if ch == ',' and depth == 0:
+            parts.append(token)
+            token = ''
+        else:
+            token += ch
+    parts.append(token)
+    for part in parts:
+        part = part.strip()
+        if not part:
+            continue
+        part = part.lstrip('.').strip()
+        eq = re.search(r'(?<![=!<>])=(?![=>])', part)
+        if eq and pattern[0] == '[' or (eq and ':' not in part[:eq.start()]):
+            part = part[:eq.start()].strip()
+        if pattern[0] == '{' and ':' in part:
+            part = part.split(':', 1)[1].strip()
+            eq = re.search(r'(?<![=!<>])=(?![=>])', part)
+            if eq:
+                part = part[:eq.start()].strip()
+        if part[:1] in '{[':
+            try:
+                names |= pattern_names(part[:match_close(part, 0) + 1])
+            except (ValueError, IndexError):
+                pass
+        elif IDENT_RE.fullmatch(part):
+            names.add(part)
+    return names
+
+
+def loop_factor(header):
+    m = re.search(r'<\s*=?\s*(\d+)\s*;', header)
+    if m:
+        return max(1.0, min(float(m.group(1)), ARGS.loop_factor))
+    return ARGS.loop_factor
+
+
+# ── Analysis ─────────────────────────────────────────────────────────────────
+
+class Analyzer:
+    def __init__(self, args):
+        self.args = args
+        self.sources = {}
+        self.findings = []
+        self.edges = []                   # (caller_key, callee_key, local_weight)
+        self.functions = {}               # key -> (Source, open, close)
+        self.writers = {}                 # key -> writes to the database (itself or via callees)
+        self.profile = {}
+        if args.profile:
+            with open(args.profile, 'r', encoding='utf-8') as f:
+                self.profile = {k: float(v) for k, v in json.load(f).items()}
+
+    def source(self, path):
+        if path not in self.sources:
+            self.sources[path] = Source(path)
+        return self.sources[path]
+
+    def resolve_call(self, src, name):
+        """(path, fn) for an async function name visible from src, else None."""
+        if src.async_function(name):
+            return (src.path, name)
+        if name in src.imports:
+            orig, spec = src.imports[name]
+            path = resolve_module(spec, src.path)
+            if path and self.source(path).async_function(orig):
+                return (path, orig)
+        return None
+
+    def function_writes(self, key, stack=()):
+        """True if the async function at key writes to the database, itself or through an async function it calls."""
+        if key in self.writers:
+            return self.writers[key]
+        if key in stack:
+            return False
+        src = self.source(key[0])
+        span = src.async_function(key[1])
+        writes = False
+        if span:
+            writes = bool(SQL_WRITE_RE.search(src.raw[span[0]:span[1] + 1]))
+            if not writes:
+                writes = self.calls_writer(src, src.code[span[0]:span[1] + 1], stack + (key,)) is not None
+        self.writers[key] = writes
+        return writes
+
+    def calls_writer(self, src, code, stack=()):
+        """Name of the first async function called in code that writes to the database, else None."""
+        for m in re.finditer(r'(?<![\w$.])([A-Za-z_$][\w$]*)\s*\(', code):
+            name = m.group(1)
+            if name in KEYWORDS:
+                continue
+            target = self.resolve_call(src, name)
+            if target and target not in stack and self.function_writes(target, stack):
+                return name
+        return None
+
+    def analyze_function(self, key):
+        path, name = key
+        src = self.source(path)
+        span = src.async_function(name)
+        if not span:
+            return
+        self.functions[key] = (src, span)
+        self.analyze_block(key, src, span[0] + 1, span[1], 1.0, None)
+
+    def analyze_block(self, key, src, start, end, weight, case, cases_in_switch=None):
+        stmts = [Stmt(src, s, e) for s, e in split_statements(src.code, start, end)]
+
+        # Segments: case labels inside a switch body start a new segment.
+        segment, seg_case, seg_weight = [], case, weight
+        segments = []
+        for st in stmts:
+            label = re.match(r"\s*(?:case\s+(.+?)|default)\s*:", st.own)
+            if cases_in_switch and label:
+                if segment:
+                    segments.append((segment, seg_case, seg_weight))
+                raw_label = src.raw[st.s:st.e].strip().split(':', 1)[0]
+                seg_case = raw_label.replace('case', '', 1).strip().strip("'\"") if raw_label.startswith('case') else 'default'
+                seg_weight = weight * self.case_share(seg_case, cases_in_switch)
+                segment = [st]
+                continue
+            segment.append(st)
+        if segment:
+            segments.append((segment, seg_case, seg_weight))
+
+        for seg, seg_case, w in segments:
+            self.find_runs(key, src, seg, w, seg_case)
+            for st in seg:
+                self.record_calls(key, src, st, w)
+                for o, c, kind, factor, label in st.blocks:
+                    if kind == 'switch':
+                        labels = re.findall(r"^\s*case\s+'([^']+)'\s*:", src.raw[o:c], re.M) or ['?']
+                        self.analyze_block(key, src, o + 1, c, w, seg_case, labels)
+                    elif kind == 'case':
+                        cl = (label or '').replace('case', '', 1).strip().rstrip(':').strip().strip("'\"")
+                        share = self.case_share(cl, cases_in_switch) if cases_in_switch and seg_case is None else 1.0
+                        self.analyze_block(key, src, o + 1, c, w * share, cl or seg_case)
+                    else:
+                        self.analyze_block(key, src, o + 1, c, w * factor, seg_case)
+                for o, c, factor in st.functions:
+                    self.analyze_block(key, src, o + 1, c, w * factor, seg_case)
+
+    def case_share(self, label, labels):
+        if self.profile:
+            total = sum(self.profile.get(l, 0.0) for l in labels) or 1.0
+            return self.profile.get(label, 0.0) / total
+        return 1.0 / max(1, len(labels))
+
+    def record_calls(self, key, src, st, w):
+        for m in re.finditer(r'(?<![\w$.])([A-Za-z_$][\w$]*)\s*\(', st.own):
+            name = m.group(1)
+            if name in KEYWORDS:
+                continue
+            target = self.resolve_call(src, name)
+            if target and target != key:
+                self.edges.append((key, target, w))
+
+    def find_runs(self, key, src, seg, weight, case):
+        n = len(seg)
+        # reach[j] = indices i < j that statement j depends on (transitively)
+        # Early exits and sleeps order everything after them; a sleep also
+        # waits for everything before it.
+        reach = [set() for _ in range(n)]
+        for j in range(n):
+            if seg[j].barrier:
+                reach[j] = set(range(j))
+                continue
+            for i in range(j):
+                a, b = seg[i], seg[j]
+                direct = (a.defs & b.uses) or (b.defs & a.uses) or (a.defs & b.defs)
+                if direct or a.exits or a.barrier:
+                    reach[j].add(i)
+                    reach[j] |= reach[i]
+
+        run = []
+        for j, st in enumerate(seg):
+            if st.awaits == 0:
+                continue
+            if run and not any(i in reach[j] for i in run):
+                run.append(j)
+            else:
+                self.emit(key, src, seg, run, weight, case)
+                run = [j]
+        self.emit(key, src, seg, run, weight, case)
+
+    def emit(self, key, src, seg, run, weight, case):
+        if len(run) < 2:
+            return
+        members = [seg[i] for i in run]
+        via = [None if m.writes else self.calls_writer(src, m.fn_free, (key,)) for m in members]
+        self.findings.append({
+            'file': src.path,
+            'function': key[1],
+            'case': case,
+            'local_weight': weight,
+            'awaits': [{
+                'line': src.line(m.s),
+                'callee': m.callee(),
+                'binds': sorted(m.defs & _declared(m.own)),
+                'compound': m.direct_awaits == 0,
+                'writes_db': m.writes or w is not None,
+                'writes_via': w,
+                'schema_guard': _schema_guard(m),
+                'code': m.snippet(),
+            } for m, w in zip(members, via)],
+            'confidence': 'review' if any(m.writes or w or _schema_guard(m) for m, w in zip(members, via)) else 'high',
+        })
+
+    def run(self, entries):
+        seen = set()
+        queue = list(entries)
+        while queue:
+            key = queue.pop(0)
+            if key in seen:
+                continue
+            seen.add(key)
+            self.analyze_function(key)
+            for caller, callee, _w in self.edges:
+                if caller == key and callee not in seen and len(seen) < self.args.max_functions:
+                    queue.append(callee)
+
+        fw = defaultdict(float)
+        for key, w in entries.items():
+            fw[key] += w
+        for _ in range(12):  # call graph is (almost) a DAG; a few passes converge
+            nxt = defaultdict(float, {k: w for k, w in entries.items()})
+            for caller, callee, w in self.edges:
+                if callee not in entries:
+                    nxt[callee] += fw[caller] * w
+            if nxt == fw:
+                break
+            fw = nxt
+
+        for f in self.findings:
+            f['weight'] = round(fw[(f['file'], f['function'])] * f['local_weight'], 4)
+            f['score'] = round(f['weight'] * (len(f['awaits']) - 1), 4)
+            if any(a['schema_guard'] for a in f['awaits']):
+                f['suggestion'] = 'schema guard - run once at startup instead'
+            elif any(a['writes_db'] and not a['binds'] for a in f['awaits']):
+                f['suggestion'] = 'Promise.all / fire-and-forget'
+            else:
+                f['suggestion'] = 'Promise.all'
+        self.findings.sort(key=lambda f: -f['score'])
+        for n, f in enumerate(self.findings, 1):
+            f['id'] = f"{os.path.basename(f['file'])}:{f['awaits'][0]['line']}"
+            f['rank'] = n
+        return fw
+
+
+DDL_RE = re.compile(r'\b(CREATE|ALTER)\s+(TABLE|INDEX|UNIQUE)\b')
+
+
+def _schema_guard(stmt):
+    # ensureTable() & co. look independent but the next query needs the table
+    return bool(DDL_RE.search(stmt.src.raw[stmt.s:stmt.e])) or (stmt.callee() or '').startswith('ensure')
+
+
+def _declared(text):
+    names = set(re.findall(r'\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)', text))
+    for m in re.finditer(r'\b(?:const|let|var)\s+([{[])', text):
+        names |= pattern_names(text[m.end() - 1:match_close(text, m.end() - 1) + 1])
+    for m in re.finditer(r'(?:^|[;(])\s*\(?\s*([{[])', text):
+        try:
+            close = match_close(text, m.end() - 1)
+        except (ValueError, IndexError):
+            continue
+        if re.match(r'\s*=(?![=>])', text[close + 1:]):
+            names |= pattern_names(text[m.end() - 1:close + 1])
+    return names
+
+
+def main(argv=None):
+    global ARGS
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    ap.add_argument('--entry', action='append', default=None,
+                    help='path:function[:weight] entry point (default: route.ts POST per request)')
+    ap.add_argument('--loop-factor', type=float, default=4.0)
+    ap.add_argument('--fanout', type=float, default=3.0)
+    ap.add_argument('--branch-factor', type=float, default=0.5)
+    ap.add_argument('--profile', help='JSON {case label: count} used to weight switch cases')
+    ap.add_argument('--max-functions', type=int, default=200)
+    ap.add_argument('--top', type=int, default=25)
+    ap.add_argument('--json', action='store_true', help='emit the full report as JSON')
+    ap.add_argument('-o', '--output', help='write the report to this file instead of stdout')
+    ARGS = ap.parse_args(argv)
+
+    entries = {}
+    for spec in ARGS.entry or [f'{ROUTE}:POST:1']:
+        parts = spec.split(':')
+        entries[(parts[0], parts[1])] = float(parts[2]) if len(parts) > 2 else 1.0
+
+    analyzer = Analyzer(ARGS)
+    fw = analyzer.run(entries)
+    report = {
+        'version': 1,
+        'entries': [{'file': k[0], 'function': k[1], 'weight': w} for k, w in entries.items()],
+        'params': {'loop_factor': ARGS.loop_factor, 'fanout': ARGS.fanout,
+                   'branch_factor': ARGS.branch_factor, 'profile': ARGS.profile},
+        'functions': sorted(
+            ({'file': k[0], 'function': k[1], 'calls_per_request': round(w, 4)} for k, w in fw.items()),
+            key=lambda f: -f['calls_per_request']),
+        'findings': analyzer.findings,
+    }
+
+    out = open(ARGS.output, 'w', encoding='utf-8') if ARGS.output else sys.stdout
+    try:
+        if ARGS.json:
+            json.dump(report, out, indent=2)
+            out.write('\n')
+        else:
+            print(f"{len(analyzer.findings)} sequential-await runs in {len(fw)} functions "
+                  f"(score = est. round trips saved per request)\n", file=out)
+            for f in analyzer.findings[:ARGS.top]:
+                where = f"{f['function']}" + (f" case {f['case']}" if f['case'] else '')
+                print(f"#{f['rank']:<3} score {f['score']:<8g} {f['file']} {where} "
+                      f"[{f['confidence']}] -> {f['suggestion']}", file=out)
+                for a in f['awaits']:
+                    print(f"       L{a['line']:<6} {a['code']}", file=out)
+                print(file=out)
+    finally:
+        if ARGS.output:
+            out.close()
+
+
+ARGS = None
+
+if __name__ == '__main__':
+    main()
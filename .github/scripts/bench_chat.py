@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for POST /api/chat against local stand-ins.
+
+Starts `node server.js` (production build) with
+  DATABASE_URL      - a local Postgres (?sslmode=disable is honoured by db.ts)
+  MINIMAX_BASE_URL  - llm_stub.py, serving scripted replies
+  SPARKIE_INTERNAL_SECRET + x-internal-user-id - session-less auth, one user per VU
+then replays bench-conversations.json with N virtual users and reports
+p50/p95/p99 of
+  ttft_ms    - request start -> first content delta on the SSE stream
+  total_ms   - request start -> end of stream
+  rounds     - LLM calls the route made for the request (counted by the stub)
+  db_queries - statements per request, measured in a serial probe pass after
+               the load pass (pg_stat_statements if installed, otherwise
+               committed transactions from pg_stat_database)
+
+Anything else the route reaches for (Supermemory, Composio, GitHub) still goes
+to the network and fails or times out offline, the same way for every
+revision - compare runs, don't read absolute numbers.
+
+Usage:
+  # current checkout (needs `npm run build` first, or --build)
+  python3 .github/scripts/bench_chat.py run --db postgres://postgres@127.0.0.1/sparkie?sslmode=disable -o head.json
+
+  # two revisions side by side (git worktrees under --workdir, node_modules symlinked)
+  python3 .github/scripts/bench_chat.py run --rev HEAD~3 --rev HEAD --build --db ... -o perf.json
+
+  python3 .github/scripts/bench_chat.py compare base.json head.json
+
+  # cold start: spawn -> /api/health, then the first and second /api/chat
+  # requests (ttft, total, statements); --reset-db empties the public schema
+  # before every boot so migrations / first-call DDL are included
+  python3 .github/scripts/bench_chat.py boot --rev HEAD~1 --rev HEAD --reset-db --db ...
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(HERE, '..', '..'))
+DEFAULT_SCRIPT = os.path.join(HERE, 'bench-conversations.json')
+INTERNAL_SECRET = 'bench-internal-secret'
+METRICS = ('ttft_ms', 'total_ms', 'rounds', 'db_queries')
+BOOT_METRICS = ('boot_ms', 'first_ttft_ms', 'first_total_ms', 'first_db_queries',
+                'warm_ttft_ms', 'warm_total_ms', 'warm_db_queries')
+
+
+def percentile(values, p):
+    """Nearest-rank percentile; None for an empty sample."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[k]
+
+
+def median_or_none(values):
+    return statistics.median(values) if values else None
+
+
+def summarize(values):
+    values = [v for v in values if v is not None]
+    return {'n': len(values), 'p50': percentile(values, 50), 'p95': percentile(values, 95),
+            'p99': percentile(values, 99), 'mean': sum(values) / len(values) if values else None}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+# ── Postgres statement counter ───────────────────────────────────────────────
+
+class PgCounter:
+    """Cumulative statement count for the bench database, read through psql."""
+
+    def __init__(self, url):
+        self.url = url.replace('sslmode=no-verify', 'sslmode=disable')
+        self.source = None
+        if self._psql("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'") == '1':
+            self.source = 'pg_stat_statements'
+        elif self._psql('SELECT 1') == '1':
+            self.source = 'pg_stat_database'
+
+    def _psql(self, sql):
+        if not shutil.which('psql'):
+            return None
+        out = subprocess.run(['psql', self.url, '-Atqc', sql], capture_output=True, text=True)
+        return out.stdout.strip() if out.returncode == 0 else None
+
+    def read(self):
+        if self.source == 'pg_stat_statements':
+            sql = ('SELECT COALESCE(sum(calls), 0) FROM pg_stat_statements '
+                   'WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())')
+        elif self.source == 'pg_stat_database':
+            sql = ('SELECT xact_commit + xact_rollback FROM pg_stat_database '
+                   'WHERE datname = current_database()')
+        else:
+            return None
+        value = self._psql(sql)
+        return int(value) if value else None
+
+
+# ── Streaming HTTP client ────────────────────────────────────────────────────
+
+async def post_stream(port, path, headers, body, timeout):
+    """POST and consume an SSE response. Returns timing and stream facts."""
+    t0 = time.perf_counter()
+    result = {'status': None, 'ttfb_ms': None, 'ttft_ms': None, 'total_ms': None,
+              'content': '', 'error': None}
+    data = json.dumps(body).encode()
+    head = [f'POST {path} HTTP/1.1', f'Host: 127.0.0.1:{port}', 'Content-Type: application/json',
+            f'Content-Length: {len(data)}', 'Connection: close']
+    head += [f'{k}: {v}' for k, v in headers.items()]
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode() + data)
+        await writer.drain()
+
+        async def consume():
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError('closed before a response')
+            result['status'] = int(status_line.split()[1])
+            result['ttfb_ms'] = (time.perf_counter() - t0) * 1000
+            chunked = False
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                if line.lower().startswith(b'transfer-encoding:') and b'chunked' in line.lower():
+                    chunked = True
+            buf = b''
+            async for piece in body_pieces(reader, chunked):
+                buf += piece
+                while b'\n\n' in buf:
+                    event, buf = buf.split(b'\n\n', 1)
+                    on_event(event)
+
+        def on_event(event):
+            for line in event.split(b'\n'):
+                if not line.startswith(b'data: ') or line == b'data: [DONE]':
+                    continue
+                try:
+                    payload = json.loads(line[6:])
+                except ValueError:
+                    continue
+                choices = payload.get('choices') if isinstance(payload, dict) else None
+                delta = (choices[0].get('delta') or {}) if choices else {}
+                if delta.get('content'):
+                    if result['ttft_ms'] is None:
+                        result['ttft_ms'] = (time.perf_counter() - t0) * 1000
+                    result['content'] += delta['content']
+
+        await asyncio.wait_for(consume(), timeout)
+        writer.close()
+    except asyncio.TimeoutError:
+        result['error'] = 'timeout'
+    except (OSError, ValueError, IndexError) as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+    result['total_ms'] = (time.perf_counter() - t0) * 1000
+    return result
+
+
+async def body_pieces(reader, chunked):
+    if not chunked:
+        while True:
+            piece = await reader.read(65536)
+            if not piece:
+                return
+            yield piece
+    while True:
+        size_line = await reader.readline()
+        if not size_line:
+            return
+        size = int(size_line.split(b';')[0].strip() or b'0', 16)
+        if size == 0:
+            return
+        yield await reader.readexactly(size)
+        await reader.readexactly(2)
+
+
+# ── Processes ────────────────────────────────────────────────────────────────
+
+def wait_http(url, timeout, proc):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f'{proc.args[0]} exited with {proc.returncode} before {url} came up')
+        try:
+            with urllib.request.urlopen(url, timeout=2) as r:
+                if r.status < 500:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.25)
+    raise SystemExit(f'{url} not ready after {timeout}s')
+
+
+def http_json(url, method='GET'):
+    req = urllib.request.Request(url, method=method, data=b'' if method == 'POST' else None)
+    with urllib.request.urlopen(req, timeout=10) as r:
+        return json.loads(r.read())
+
+
+def stop(proc):
+    if proc and proc.poll() is None:
+        os.killpg(proc.pid, signal.SIGTERM)
+        try:
+            proc.wait(10)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+
+
+def start_stub(args, port, log):
+    cmd = [sys.executable, os.path.join(HERE, 'llm_stub.py'), '--port', str(port), '--script', args.script,
+           '--ttft-ms', str(args.stub_ttft_ms), '--tokens-per-s', str(args.stub_tokens_per_s),
+           '--jitter', str(args.stub_jitter), '--seed', args.stub_seed,
+           '--error-rate', str(args.stub_error_rate), '--timeout-rate', str(args.stub_timeout_rate)]
+    proc = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+    wait_http(f'http://127.0.0.1:{port}/_stats', 15, proc)
+    return proc
+
+
+def start_app(tree, args, port, stub_port, log):
+    env = dict(os.environ,
+               NODE_ENV='production', PORT=str(port), DATABASE_URL=args.db,
+               MINIMAX_API_KEY='bench', MINIMAX_BASE_URL=f'http://127.0.0.1:{stub_port}',
+               SPARKIE_INTERNAL_SECRET=INTERNAL_SECRET,
+               NEXTAUTH_SECRET=os.environ.get('NEXTAUTH_SECRET', 'bench'),
+               NEXTAUTH_URL=f'http://127.0.0.1:{port}')
+    proc = subprocess.Popen(['node', 'server.js'], cwd=tree, env=env, stdout=log,
+                            stderr=subprocess.STDOUT, start_new_session=True)
+    wait_http(f'http://127.0.0.1:{port}/api/health', args.boot_timeout, proc)
+    return proc
+
+
+def prepare_tree(rev, args):
+    """Worktree for rev (None = current checkout), built if asked."""
+    if rev is None:
+        tree = ROOT
+    else:
+        sha = subprocess.run(['git', 'rev-parse', '--short', rev], cwd=ROOT, check=True,
+                             capture_output=True, text=True).stdout.strip()
+        tree = os.path.join(args.workdir, sha)
+        if not os.path.isdir(tree):
+            subprocess.run(['git', 'worktree', 'add', '--detach', tree, sha], cwd=ROOT, check=True)
+        if not os.path.exists(os.path.join(tree, 'node_modules')):
+            os.symlink(os.path.join(ROOT, 'node_modules'), os.path.join(tree, 'node_modules'))
+    if args.build or not os.path.isdir(os.path.join(tree, '.next')):
+        subprocess.run(['npm', 'run', 'build'], cwd=tree, check=True)
+    return tree
+
+
+def describe(tree):
+    out = subprocess.run(['git', 'log', '-1', '--format=%h %s'], cwd=tree, capture_output=True, text=True)
+    dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=tree,
+                           capture_output=True, text=True).stdout.strip()
+    return out.stdout.strip() + (' (dirty)' if dirty else '')
+
+
+# ── Load ─────────────────────────────────────────────────────────────────────
+
+def load_script(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['conversations']
+
+
+class Runner:
+    def __init__(self, args, app_port, conversations):
+        self.args = args
+        self.port = app_port
+        self.conversations = conversations
+        self.seq = 0
+        self.samples = []
+
+    async def conversation(self, vu, conv):
+        history = []
+        for turn_idx, turn in enumerate(conv['turns']):
+            self.seq += 1
+            seq = self.seq
+            history.append({'role': 'user', 'content': f"{turn['user']} [bench:{conv['name']}/{turn_idx}/{seq}]"})
+            res = await post_stream(self.port, '/api/chat',
+                                    {'x-internal-user-id': f'bench-user-{vu}', 'x-internal-secret': INTERNAL_SECRET},
+                                    {'messages': history}, self.args.timeout)
+            history.append({'role': 'assistant', 'content': res.pop('content') or '...'})
+            res.update(seq=str(seq), conversation=conv['name'], turn=turn_idx, vu=vu)
+            self.samples.append(res)
+
+    async def vu(self, vu, iterations):
+        for i in range(iterations):
+            await self.conversation(vu, self.conversations[(vu + i) % len(self.conversations)])
+
+    async def load(self, concurrency, iterations):
+        await asyncio.gather(*(self.vu(v, iterations) for v in range(concurrency)))
+
+
+def probe_db(args, runner, pg):
+    """Serial pass: one request at a time, statement delta per request."""
+    per_request = []
+    # pg_stat_database is flushed by idle backends at most every 10 s
+    settle = max(args.db_settle, 11) if pg.source == 'pg_stat_database' else args.db_settle
+    for conv in runner.conversations:
+        for _ in range(args.db_probe):
+            before = pg.read()
+            start = len(runner.samples)
+            asyncio.run(runner.conversation(10_000, conv))
+            time.sleep(settle)
+            after = pg.read()
+            turns = len(runner.samples) - start
+            del runner.samples[start:]
+            if before is not None and after is not None:
+                # minus the `before` read itself
+                per_request.append((after - before - 1) / turns)
+    return per_request
+
+
+def bench_tree(rev, args):
+    tree = prepare_tree(rev, args)
+    os.makedirs(args.workdir, exist_ok=True)
+    label = describe(tree)
+    stub_port, app_port = free_port(), free_port()
+    log_path = os.path.join(args.workdir, f"server-{label.split()[0]}.log")
+    stub = app = None
+    with open(log_path, 'w') as log:
+        try:
+            stub = start_stub(args, stub_port, log)
+            app = start_app(tree, args, app_port, stub_port, log)
+            runner = Runner(args, app_port, load_script(args.script))
+
+            if args.warmup:
+                asyncio.run(runner.load(min(args.concurrency, 2), args.warmup))
+                runner.samples.clear()
+            http_json(f'http://127.0.0.1:{stub_port}/_reset', 'POST')
+
+            t0 = time.perf_counter()
+            asyncio.run(runner.load(args.concurrency, args.iterations))
+            wall = time.perf_counter() - t0
+            stub_stats = http_json(f'http://127.0.0.1:{stub_port}/_stats')
+            calls = stub_stats['calls']
+            for s in runner.samples:
+                s['rounds'] = calls.get(s['seq'], 0)
+
+            pg = PgCounter(args.db)
+            db = probe_db(args, runner, pg) if args.db_probe and pg.source else []
+        finally:
+            stop(app)
+            stop(stub)
+
+    samples = runner.samples
+    ok = [s for s in samples if s['status'] == 200 and not s['error']]
+    result = {
+        'revision': label,
+        'tree': tree,
+        'config': {k: getattr(args, k) for k in ('concurrency', 'iterations', 'stub_ttft_ms', 'stub_tokens_per_s',
+                                                 'stub_jitter', 'stub_seed', 'stub_error_rate', 'stub_timeout_rate')},
+        'requests': len(samples),
+        'errors': len(samples) - len(ok),
+        'throughput_rps': len(samples) / wall if wall else None,
+        'db_source': pg.source,
+        'stub': {k: stub_stats[k] for k in ('faults', 'peak_active', 'loop_lag_ms')},
+        'metrics': {
+            'ttft_ms': summarize([s['ttft_ms'] for s in ok]),
+            'total_ms': summarize([s['total_ms'] for s in ok]),
+            'rounds': summarize([s['rounds'] for s in ok]),
+            'db_queries': summarize(db),
+        },
+        'by_conversation': {
+            name: {m: summarize([s[m] for s in ok if s['conversation'] == name]) for m in ('ttft_ms', 'total_ms', 'rounds')}
+            for name in sorted({s['conversation'] for s in samples})
+        },
+        'log': log_path,
+    }
+    if args.samples:
+        result['samples'] = samples
+    return result
+
+
+# ── Boot ─────────────────────────────────────────────────────────────────────
+
+def reset_db(url):
+    if not shutil.which('psql'):
+        raise SystemExit('--reset-db needs psql on PATH')
+    subprocess.run(['psql', url.replace('sslmode=no-verify', 'sslmode=disable'), '-v', 'ON_ERROR_STOP=1', '-qc',
+                    'DROP SCHEMA public CASCADE; CREATE SCHEMA public;'], check=True)
+
+
+def probe_request(args, port, pg, body, user):
+    before = pg.read()
+    res = asyncio.run(post_stream(port, '/api/chat',
+                                  {'x-internal-user-id': user, 'x-internal-secret': INTERNAL_SECRET},
+                                  body, args.timeout))
+    time.sleep(args.db_settle)
+    after = pg.read()
+    res['db_queries'] = after - before - 1 if before is not None and after is not None else None
+    return res
+
+
+def boot_tree(rev, args):
+    """Cold start, --repeat times: boot time plus the first two chat requests."""
+    tree = prepare_tree(rev, args)
+    os.makedirs(args.workdir, exist_ok=True)
+    label = describe(tree)
+    conv = load_script(args.script)[0]
+    body = {'messages': [{'role': 'user', 'content': conv['turns'][0]['user']}]}
+    stub_port = free_port()
+    log_path = os.path.join(args.workdir, f"boot-{label.split()[0]}.log")
+    pg = PgCounter(args.db)
+    runs = []
+    stub = app = None
+    with open(log_path, 'w') as log:
+        try:
+            stub = start_stub(args, stub_port, log)
+            for i in range(args.repeat):
+                if args.reset_db:
+                    reset_db(args.db)
+                app_port = free_port()
+                t0 = time.perf_counter()
+                app = start_app(tree, args, app_port, stub_port, log)
+                boot_ms = (time.perf_counter() - t0) * 1000
+                first = probe_request(args, app_port, pg, body, f'bench-boot-{i}')
+                warm = probe_request(args, app_port, pg, body, f'bench-boot-{i}')
+                stop(app)
+                app = None
+                runs.append({'boot_ms': boot_ms,
+                             **{f'first_{k}': first[k] for k in ('ttft_ms', 'total_ms', 'db_queries')},
+                             **{f'warm_{k}': warm[k] for k in ('ttft_ms', 'total_ms', 'db_queries')},
+                             'errors': [r['error'] for r in (first, warm) if r['error']]})
+        finally:
+            stop(app)
+            stop(stub)
+    return {
+        'revision': label,
+        'tree': tree,
+        'reset_db': args.reset_db,
+        'db_source': pg.source,
+        'runs': runs,
+        'median': {k: median_or_none([r[k] for r in runs if r[k] is not None]) for k in BOOT_METRICS},
+        'log': log_path,
+    }
+
+
+def cmd_boot(args):
+    if not args.db:
+        raise SystemExit('--db (or DATABASE_URL) is required')
+    args.workdir = os.path.abspath(args.workdir or os.path.join(tempfile.gettempdir(), 'sparkie-bench'))
+    results = [boot_tree(rev, args) for rev in (args.rev or [None])]
+    for i, r in enumerate(results):
+        print(f"  r{i} {r['revision']}: {len(r['runs'])} boots, reset_db={r['reset_db']}, db via {r['db_source'] or 'n/a'}")
+    cols = ''.join(f'{"r" + str(i):>9}' for i in range(len(results)))
+    print(f'{"median":<18}{cols}')
+    for m in BOOT_METRICS:
+        print(f'{m:<18}' + ''.join(f'{fmt(r["median"][m]):>9}' for r in results))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results if len(results) > 1 else results[0], f, indent=2)
+        print(f'wrote {args.output}')
+
+
+# ── Reporting ────────────────────────────────────────────────────────────────
+
+def fmt(v):
+    if v is None:
+        return '-'
+    return f'{v:.0f}' if abs(v) >= 100 else f'{v:.1f}'
+
+
+def print_results(results):
+    if len(results) == 1:
+        r = results[0]
+        print(f"{r['revision']}: {r['requests']} requests, {r['errors']} errors, "
+              f"{fmt(r['throughput_rps'])} req/s, db via {r['db_source'] or 'n/a'}")
+        print(f'{"metric":<12} {"p50":>9} {"p95":>9} {"p99":>9}')
+        for m in METRICS:
+            s = r['metrics'][m]
+            print(f'{m:<12} {fmt(s["p50"]):>9} {fmt(s["p95"]):>9} {fmt(s["p99"]):>9}')
+        return
+    for i, r in enumerate(results):
+        print(f"  r{i} {r['revision']}: {r['requests']} requests, {r['errors']} errors, {fmt(r['throughput_rps'])} req/s")
+    cols = ''.join(f'{"r" + str(i):>9}' for i in range(len(results)))
+    print(f'{"metric":<16}{cols} {"delta":>8}')
+    for m in METRICS:
+        for p in ('p50', 'p95', 'p99'):
+            vals = [r['metrics'][m][p] for r in results]
+            delta = '-'
+            if vals[0] and vals[-1] is not None:
+                delta = f'{(vals[-1] - vals[0]) / vals[0] * 100:+.0f}%'
+            print(f'{m + " " + p:<16}' + ''.join(f'{fmt(v):>9}' for v in vals) + f' {delta:>8}')
+
+
+def cmd_run(args):
+    if not args.db:
+        raise SystemExit('--db (or DATABASE_URL) is required')
+    args.workdir = os.path.abspath(args.workdir or os.path.join(tempfile.gettempdir(), 'sparkie-bench'))
+    results = [bench_tree(rev, args) for rev in (args.rev or [None])]
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results if len(results) > 1 else results[0], f, indent=2)
+        print(f'wrote {args.output}')
+
+
+def cmd_compare(args):
+    results = []
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        results += data if isinstance(data, list) else [data]
+    print_results(results)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Load benchmark for /api/chat')
+    sub = ap.add_subparsers(dest='cmd', required=True)
+
+    run = sub.add_parser('run', help='benchmark the checkout or one or more --rev')
+    run.add_argument('--rev', action='append', help='git revision to benchmark (repeatable; default: working tree)')
+    run.add_argument('--db', default=os.environ.get('DATABASE_URL'), help='local Postgres URL')
+    run.add_argument('--script', default=DEFAULT_SCRIPT)
+    run.add_argument('-c', '--concurrency', type=int, default=8)
+    run.add_argument('-n', '--iterations', type=int, default=5, help='conversations per virtual user')
+    run.add_argument('--warmup', type=int, default=1, help='conversations per VU before measuring')
+    run.add_argument('--timeout', type=float, default=120, help='per-request timeout in seconds')
+    run.add_argument('--db-probe', type=int, default=2, help='serial runs per conversation for db_queries (0 = skip)')
+    run.add_argument('--db-settle', type=float, default=1.5, help='wait after each probe for fire-and-forget writes')
+    run.add_argument('--stub-ttft-ms', type=float, default=300)
+    run.add_argument('--stub-tokens-per-s', type=float, default=80)
+    run.add_argument('--stub-jitter', type=float, default=0.2)
+    run.add_argument('--stub-seed', default='sparkie')
+    run.add_argument('--stub-error-rate', type=float, default=0, help='fraction of LLM replies that return 503')
+    run.add_argument('--stub-timeout-rate', type=float, default=0, help='fraction of LLM replies that never answer')
+    run.add_argument('--boot-timeout', type=float, default=90)
+    run.add_argument('--build', action='store_true', help='run `npm run build` in each tree first')
+    run.add_argument('--workdir', help='worktrees and logs (default: $TMPDIR/sparkie-bench)')
+    run.add_argument('--samples', action='store_true', help='keep per-request samples in the JSON')
+    run.add_argument('-o', '--output')
+    run.set_defaults(fn=cmd_run)
+
+    boot = sub.add_parser('boot', help='cold-start time and first-request latency per --rev')
+    boot.add_argument('--rev', action='append', help='git revision to benchmark (repeatable; default: working tree)')
+    boot.add_argument('--db', default=os.environ.get('DATABASE_URL'), help='local Postgres URL')
+    boot.add_argument('--reset-db', action='store_true', help='DROP SCHEMA public CASCADE before every boot')
+    boot.add_argument('--repeat', type=int, default=5, help='boots per revision')
+    boot.add_argument('--script', default=DEFAULT_SCRIPT)
+    boot.add_argument('--timeout', type=float, default=120, help='per-request timeout in seconds')
+    boot.add_argument('--db-settle', type=float, default=1.5, help='wait after each request for fire-and-forget writes')
+    boot.add_argument('--stub-ttft-ms', type=float, default=300)
+    boot.add_argument('--stub-tokens-per-s', type=float, default=80)
+    boot.add_argument('--stub-jitter', type=float, default=0)
+    boot.add_argument('--stub-seed', default='sparkie')
+    boot.add_argument('--stub-error-rate', type=float, default=0)
+    boot.add_argument('--stub-timeout-rate', type=float, default=0)
+    boot.add_argument('--boot-timeout', type=float, default=90)
+    boot.add_argument('--build', action='store_true', help='run `npm run build` in each tree first')
+    boot.add_argument('--workdir', help='worktrees and logs (default: $TMPDIR/sparkie-bench)')
+    boot.add_argument('-o', '--output')
+    boot.set_defaults(fn=cmd_boot)
+
+    cmp_ = sub.add_parser('compare', help='print saved results side by side (first file is the baseline)')
+    cmp_.add_argument('files', nargs='+')
+    cmp_.set_defaults(fn=cmd_compare)
+
+    args = ap.parse_args(argv)
+    args.fn(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env node
+/**
+ * Benchmark: build-mode file parsing while the response streams.
+ *
+ * Generates a multi-file build response (--kb, default 320 KB) in the
+ * ---FILE: name--- ... ---END FILE--- format the build route asks for (or
+ * fenced code blocks with --format fence), streams it in --chunk sized deltas
+ * and compares, per delta,
+ *   full    - parseAIResponse(everything so far), what ChatInput did per delta
+ *   stream  - StreamingFileParser.push(delta)
+ *
+ * Then checks the stream against one parseAIResponse of the whole response:
+ * finish() must be identical, and the last version of every file seen during
+ * the stream must match the final parse (same names and contents). The same
+ * check runs on a smaller response streamed in deltas of 1, 2, 3, 5 and 8
+ * chars, where markers and fences always straddle deltas.
+ *
+ * src/lib/fileParser.ts is compiled with the project's `typescript` package,
+ * so this needs node_modules.
+ *
+ * Usage:
+ *   node .github/scripts/bench_file_parser.js
+ *   node .github/scripts/bench_file_parser.js --kb 600 --chunk 48 --format fence
+ */
+
+'use strict'
+
+const fs = require('fs')
+const path = require('path')
+const Module = require('module')
+
+const ROOT = path.join(__dirname, '..', '..')
+
+function arg(name, def) {
+  const i = process.argv.indexOf(`--${name}`)
+  if (i === -1) return def
+  return typeof def === 'number' ? Number(process.argv[i + 1]) : process.argv[i + 1]
+}
+
+const KB = arg('kb', 320)
+const CHUNK = arg('chunk', 64)
+const FORMAT = arg('format', 'markers')
+
+function loadFileParser() {
+  let ts
+  try {
+    ts = require('typescript')
+  } catch (_) {
+    console.error('typescript is not installed - run `npm install` first')
+    process.exit(1)
+  }
+  const file = path.join(ROOT, 'src', 'lib', 'fileParser.ts')
+  const { outputText } = ts.transpileModule(fs.readFileSync(file, 'utf-8'), {
+    compilerOptions: { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2019 },
+  })
+  const m = new Module(file, module)
+  m.filename = file
+  m._compile(outputText, file)
+  return m.exports
+}
+
+function makeFile(n, lines) {
+  const out = []
+  for (let i = 0; i < lines; i++) {
+    out.push(`export function handler${n}_${i}(req: Request): Response {\n` +
+             `  const id = new URL(req.url).searchParams.get('id') ?? '${n}-${i}'\n` +
+             `  return Response.json({ id, ok: true, n: ${i} })\n}\n`)
+  }
+  return out.join('\n')
+}
+
+function makeResponse(kb) {
+  const dirs = ['src', 'src/components', 'src/lib', 'src/routes', 'public']
+  const parts = ['[THINKING] Scaffolding the project, then the components and routes.\n\n']
+  let n = 0
+  while (parts.join('').length < kb * 1024) {
+    const name = `${dirs[n % dirs.length]}/module${n}.ts`
+    const body = makeFile(n, 8 + (n * 7) % 40)
+    if (FORMAT === 'fence') parts.push(`Here is ${name}:\n\n\`\`\`${name}\n${body}\`\`\`\n\n`)
+    else {
+      if (n % 6 === 0) parts.push(`---FOLDER: ${dirs[n % dirs.length]}/part${n}---\n`)
+      parts.push(`---FILE: ${name}---\n${body}---END FILE---\n\n`)
+    }
+    n++
+  }
+  return parts.join('')
+}
+
+function pct(sorted, p) {
+  return sorted[Math.min(sorted.length - 1, Math.floor(p / 100 * sorted.length))]
+}
+
+function time(fn) {
+  const t0 = process.hrtime.bigint()
+  const out = fn()
+  return [Number(process.hrtime.bigint() - t0) / 1e6, out]
+}
+
+function row(name, ms) {
+  const s = [...ms].sort((a, b) => a - b)
+  const total = ms.reduce((a, b) => a + b, 0)
+  console.log(`${name.padEnd(8)} ${pct(s, 50).toFixed(3).padStart(9)} ${pct(s, 95).toFixed(3).padStart(9)} ` +
+              `${s[s.length - 1].toFixed(2).padStart(9)} ${total.toFixed(0).padStart(10)}`)
+}
+
+function streamDeltas(StreamingFileParser, deltas, projectName, onPush) {
+  const parser = new StreamingFileParser(projectName)
+  const seen = new Map()
+  const folders = []
+  let growingUpdates = 0
+  for (const d of deltas) {
+    const update = onPush ? onPush(parser, d) : parser.push(d)
+    for (const f of update.completed) seen.set(f.name, f.content)
+    if (update.growing) { seen.set(update.growing.name, update.growing.content); growingUpdates++ }
+    folders.push(...update.folders)
+  }
+  return { parser, seen, folders, growingUpdates }
+}
+
+function split(response, chunk) {
+  const deltas = []
+  for (let i = 0; i < response.length; i += chunk) deltas.push(response.slice(i, i + chunk))
+  return deltas
+}
+
+/** What the stream got wrong against one parseAIResponse of the whole response */
+function problemsOf({ seen, folders }, streamed, expected, projectName) {
+  const problems = []
+  if (JSON.stringify(streamed) !== JSON.stringify(expected)) problems.push('finish() differs from parseAIResponse')
+  const mismatched = expected.files.filter(f => seen.get(f.name) !== f.content)
+  if (mismatched.length) problems.push(`${mismatched.length} files differ from the final parse, e.g. ${mismatched[0].name}`)
+  // A file outside the first file's root makes parseAIResponse wrap every file in the
+  // project folder; the stream then re-sends the earlier files under their wrapped names
+  const finalNames = new Set(expected.files.map(f => f.name))
+  const rewrapped = [...seen.keys()].filter(name => !finalNames.has(name) && finalNames.has(`${projectName}/${name}`))
+  const extra = [...seen.keys()].filter(name => !finalNames.has(name) && !rewrapped.includes(name))
+  if (extra.length) problems.push(`${extra.length} names never in the final parse, e.g. ${extra[0]}`)
+  if (JSON.stringify(folders) !== JSON.stringify(expected.folders ?? [])) problems.push('folders differ')
+  return { problems, rewrapped }
+}
+
+function main() {
+  const { parseAIResponse, StreamingFileParser } = loadFileParser()
+  const response = makeResponse(KB)
+  const deltas = split(response, CHUNK)
+  const projectName = 'bench-project'
+
+  const full = []
+  let soFar = ''
+  for (const d of deltas) {
+    soFar += d
+    full.push(time(() => parseAIResponse(soFar, projectName))[0])
+  }
+
+  const stream = []
+  const result = streamDeltas(StreamingFileParser, deltas, projectName, (parser, d) => {
+    const [ms, update] = time(() => parser.push(d))
+    stream.push(ms)
+    return update
+  })
+  const [finishMs, streamed] = time(() => result.parser.finish())
+  const expected = parseAIResponse(response, projectName)
+
+  const files = expected.files.length
+  console.log(`${(response.length / 1024).toFixed(0)} KB ${FORMAT} response, ${files} files, ` +
+              `${deltas.length} deltas of ${CHUNK} chars`)
+  console.log(`${'mode'.padEnd(8)} ${'p50 ms'.padStart(9)} ${'p95 ms'.padStart(9)} ${'max ms'.padStart(9)} ${'total ms'.padStart(10)}`)
+  row('full', full)
+  row('stream', stream)
+  console.log(`finish(): ${finishMs.toFixed(2)} ms (one parseAIResponse), ${result.growingUpdates} growing-file updates`)
+
+  const { problems, rewrapped } = problemsOf(result, streamed, expected, projectName)
+  if (rewrapped.length) console.log(`${rewrapped.length} early files re-sent under the project folder once the roots diverged`)
+
+  // Small deltas: every marker and fence arrives in pieces
+  const small = makeResponse(16)
+  const smallExpected = parseAIResponse(small, projectName)
+  for (const chunk of [1, 2, 3, 5, 8]) {
+    const r = streamDeltas(StreamingFileParser, split(small, chunk), projectName)
+    for (const p of problemsOf(r, r.parser.finish(), smallExpected, projectName).problems) problems.push(`${chunk}-char deltas: ${p}`)
+  }
+
+  if (problems.length) {
+    for (const p of problems) console.log(`MISMATCH: ${p}`)
+    process.exit(1)
+  }
+  console.log(`stream matches parseAIResponse: files, contents, folders (also in 1/2/3/5/8-char deltas of a ` +
+              `${(small.length / 1024).toFixed(0)} KB response, ${smallExpected.files.length} files)`)
+}
+
+main()
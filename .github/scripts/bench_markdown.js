@@ -0,0 +1,147 @@
+#!/usr/bin/env node
+/**
+ * Benchmark: markdown parse cost while an assistant message streams.
+ *
+ * Streams a generated code-heavy answer (--kb, default 24 KB) in --chunk sized
+ * updates (roughly one frame's worth of tokens) and compares, per update,
+ *   full         - re-parse the whole message (ReactMarkdown on every change)
+ *   incremental  - src/lib/markdownBlocks.ts: parse only blocks completed by this
+ *                  update plus the open tail (AnimatedMarkdown while streaming)
+ *
+ * Parse times use mdast-util-from-markdown + GFM (the parser under react-markdown)
+ * when node_modules has it; otherwise only characters handed to the parser per
+ * update are reported, which is what the parse time scales with.
+ *
+ * src/lib/markdownBlocks.ts is compiled with the project's `typescript`
+ * package, so this needs node_modules.
+ *
+ * Usage:
+ *   node .github/scripts/bench_markdown.js
+ *   node .github/scripts/bench_markdown.js --kb 48 --chunk 16
+ */
+
+'use strict'
+
+const fs = require('fs')
+const path = require('path')
+const Module = require('module')
+
+const ROOT = path.join(__dirname, '..', '..')
+
+function arg(name, def) {
+  const i = process.argv.indexOf(`--${name}`)
+  return i === -1 ? def : Number(process.argv[i + 1])
+}
+
+const KB = arg('kb', 24)
+const CHUNK = arg('chunk', 24)
+
+function loadMarkdownBlocks() {
+  let ts
+  try {
+    ts = require('typescript')
+  } catch (_) {
+    console.error('typescript is not installed - run `npm install` first')
+    process.exit(1)
+  }
+  const file = path.join(ROOT, 'src', 'lib', 'markdownBlocks.ts')
+  const { outputText } = ts.transpileModule(fs.readFileSync(file, 'utf-8'), {
+    compilerOptions: { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2019 },
+  })
+  const m = new Module(file, module)
+  m.filename = file
+  m._compile(outputText, file)
+  return m.exports
+}
+
+const { MarkdownBlockSplitter } = loadMarkdownBlocks()
+
+function makeAnswer() {
+  const parts = []
+  let n = 0
+  while (parts.join('').length < KB * 1024) {
+    n++
+    parts.push(`## Step ${n}: update the handler\n\n`)
+    parts.push(`This step rewires **handler ${n}** so it reads from the cache first and only falls back to the database ` +
+               `when the entry is missing. See [the docs](https://example.com/docs/${n}) for the \`ttl\` option.\n\n`)
+    parts.push(`- keeps the public signature\n- adds a \`cacheKey\` helper\n- logs misses at debug level\n\n`)
+    parts.push('```ts\n')
+    for (let i = 0; i < 14; i++) parts.push(`export async function handler${n}_${i}(id: string) {\n  return cache.get(\`k:\${id}\`) ?? await db.load(id, ${i})\n}\n`)
+    parts.push('```\n\n')
+    parts.push(`| option | default |\n| --- | --- |\n| ttl | ${n * 10}s |\n| size | ${n * 100} |\n\n`)
+  }
+  return parts.join('')
+}
+
+function pct(sorted, p) {
+  return sorted[Math.min(sorted.length - 1, Math.floor(p / 100 * sorted.length))]
+}
+
+async function loadParser() {
+  try {
+    const { fromMarkdown } = await import('mdast-util-from-markdown')
+    const { gfm } = await import('micromark-extension-gfm')
+    const { gfmFromMarkdown } = await import('mdast-util-gfm')
+    return (src) => fromMarkdown(src, { extensions: [gfm()], mdastExtensions: [gfmFromMarkdown()] })
+  } catch (_) {
+    return null
+  }
+}
+
+function time(fn) {
+  const t0 = process.hrtime.bigint()
+  fn()
+  return Number(process.hrtime.bigint() - t0) / 1e6
+}
+
+async function main() {
+  const parse = await loadParser()
+  const answer = makeAnswer()
+  const updates = []
+  for (let end = CHUNK; end < answer.length + CHUNK; end += CHUNK) updates.push(answer.slice(0, Math.min(end, answer.length)))
+
+  const full = { chars: [], ms: [] }
+  for (const content of updates) {
+    full.chars.push(content.length)
+    if (parse) full.ms.push(time(() => parse(content)))
+  }
+
+  const inc = { chars: [], ms: [], splitMs: [] }
+  const splitter = new MarkdownBlockSplitter()
+  let rendered = 0
+  for (const content of updates) {
+    let res
+    inc.splitMs.push(time(() => { res = splitter.update(content) }))
+    const fresh = res.blocks.slice(rendered)
+    rendered = res.blocks.length
+    inc.chars.push(fresh.reduce((a, b) => a + b.length, 0) + res.tail.length)
+    if (parse) inc.ms.push(time(() => { for (const b of fresh) parse(b); parse(res.tail) }))
+  }
+
+  console.log(`${(answer.length / 1024).toFixed(1)} KB answer, ${updates.length} updates of ${CHUNK} chars, ` +
+              `${rendered} blocks${parse ? '' : ' (parser not installed: chars only)'}`)
+  const row = (name, r) => {
+    const chars = [...r.chars].sort((a, b) => a - b)
+    const total = r.chars.reduce((a, b) => a + b, 0)
+    let line = `${name.padEnd(12)} ${String(pct(chars, 50)).padStart(10)} ${String(chars[chars.length - 1]).padStart(10)} ` +
+               `${(total / 1048576).toFixed(1).padStart(10)}`
+    if (parse) {
+      const ms = [...r.ms].sort((a, b) => a - b)
+      line += ` ${pct(ms, 50).toFixed(2).padStart(9)} ${pct(ms, 95).toFixed(2).padStart(9)} ${r.ms.reduce((a, b) => a + b, 0).toFixed(0).padStart(9)}`
+    }
+    console.log(line)
+  }
+  console.log(`${'mode'.padEnd(12)} ${'chars p50'.padStart(10)} ${'chars max'.padStart(10)} ${'total MB'.padStart(10)}` +
+              (parse ? ` ${'ms p50'.padStart(9)} ${'ms p95'.padStart(9)} ${'total ms'.padStart(9)}` : ''))
+  row('full', full)
+  row('incremental', inc)
+  const split = [...inc.splitMs].sort((a, b) => a - b)
+  const counters = splitter.stats()
+  console.log(`splitter: p50 ${pct(split, 50).toFixed(3)} ms, max ${split[split.length - 1].toFixed(3)} ms per update, ` +
+              `${counters.scannedChars} chars scanned in total, ${counters.resets} resets`)
+}
+
+main().catch((err) => {
+  console.error(err)
+  process.exit(1)
+})
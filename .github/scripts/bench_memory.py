@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full vs ranked memory retrieval (src/lib/memoryRetrieval.ts).
+
+Seeds a throw-away schema (bench_mem) in the given Postgres with users holding
+--sizes memories each, plus --others users of 500 as background, builds the
+same indexes as db/migrations/0003_memory_search_indexes.sql, then per user size times
+  full    - SELECT every user_memories row (the old loadMemories query)
+  cold    - the queries an uncached ranked request issues, back to back: the
+            recent probe, then pinned + user FTS only for users over
+            FULL_RECALL_LIMIT, the newest self rows, and self FTS only when
+            those don't all fit the self budget
+  warm    - the queries left once the per-user and self rows are cached:
+            the two FTS queries, under the same conditions
+over --queries synthetic chat messages, using psql's \\timing in one session.
+It also reports the prompt size each mode produces, with the ranked budget
+applied the way memoryRetrieval.ts applies it.
+
+Usage:
+  python3 .github/scripts/bench_memory.py --db postgres://postgres@127.0.0.1/bench?sslmode=disable
+  python3 .github/scripts/bench_memory.py --db ... --sizes 1000,10000,50000 --keep
+"""
+import argparse
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+
+SCHEMA = 'bench_mem'
+CATEGORIES = ['identity', 'preference', 'emotion', 'project', 'relationship', 'habit', 'conversation', 'procedure']
+
+# Mirrors memoryRetrieval.ts
+FULL_RECALL_LIMIT = 200
+PINNED_LIMIT = 40
+RELEVANT_LIMIT = 40
+RECENT_LIMIT = 40
+SELF_LIMIT = 80
+PINNED_CATEGORIES = ['identity', 'preference', 'relationship']
+CHARS_PER_TOKEN = 4
+USER_TOKEN_BUDGET = 2000
+SELF_TOKEN_BUDGET = 1000
+TSQUERY = "replace(plainto_tsquery('english', {q})::text, ' & ', ' | ')::tsquery"
+
+FULL_SQL = "SELECT category, content FROM user_memories WHERE user_id = {u} ORDER BY created_at ASC"
+RANKED_SQL = dict([
+    ('recent', "SELECT category, content FROM user_memories WHERE user_id = {u} ORDER BY created_at DESC LIMIT %d" % (FULL_RECALL_LIMIT + 1)),
+    ('pinned', "SELECT category, content FROM user_memories WHERE user_id = {u} AND category = ANY(ARRAY[%s]) "
+               "ORDER BY created_at DESC LIMIT %d" % (','.join(f"'{c}'" for c in PINNED_CATEGORIES), PINNED_LIMIT)),
+    ('relevant', "SELECT category, content FROM user_memories WHERE user_id = {u} AND to_tsvector('english', content) @@ %s "
+                 "ORDER BY ts_rank_cd(to_tsvector('english', content), %s) DESC, created_at DESC LIMIT %d"
+                 % (TSQUERY, TSQUERY, RELEVANT_LIMIT)),
+    ('self_relevant', "SELECT category, content FROM sparkie_self_memory WHERE to_tsvector('english', content) @@ %s "
+                      "ORDER BY ts_rank_cd(to_tsvector('english', content), %s) DESC, created_at DESC LIMIT %d"
+                      % (TSQUERY, TSQUERY, RELEVANT_LIMIT)),
+    ('self_recent', "SELECT category, content FROM sparkie_self_memory ORDER BY created_at DESC LIMIT %d" % (SELF_LIMIT + 1)),
+])
+
+
+def lit(s):
+    return "'" + s.replace("'", "''") + "'"
+
+
+def vocabulary(n, rng):
+    syllables = ['ka', 'lo', 'mi', 'ren', 'sa', 'tor', 'vi', 'xen', 'bar', 'del', 'fi', 'gan', 'hu', 'jo', 'nu', 'pra']
+    words = {''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(n * 2)}
+    return sorted(words)[:n]
+
+
+class Psql:
+    def __init__(self, url):
+        if not shutil.which('psql'):
+            raise SystemExit('psql not found on PATH')
+        self.url = url
+
+    def run(self, sql, capture=True):
+        out = subprocess.run(['psql', self.url, '-v', 'ON_ERROR_STOP=1', '-Atq', '-F', '\t'],
+                             input=f'SET search_path = {SCHEMA};\n' + sql, capture_output=capture, text=True)
+        if out.returncode != 0:
+            raise SystemExit(out.stderr.strip())
+        return out.stdout
+
+    def timed(self, statements):
+        """Run statements in one session with \\timing; returns ms per statement."""
+        script = '\\timing on\n\\o /dev/null\n' + '\n'.join(s.rstrip(';') + ';' for s in statements)
+        text = self.run(script)
+        return [float(t) for t in re.findall(r'^Time: ([\d.]+) ms', text, re.M)]
+
+    def rows(self, sql):
+        return [tuple(line.split('\t', 1)) for line in self.run(sql).splitlines() if '\t' in line]
+
+
+def seed(db, sizes, others, self_rows, rng):
+    vocab = vocabulary(3000, rng)
+    vocab_sql = 'ARRAY[' + ','.join(lit(w) for w in vocab) + ']'
+    cats_sql = 'ARRAY[' + ','.join(lit(c) for c in CATEGORIES) + ']'
+    # 6-30 random words per memory, categories uniformly spread
+    text_expr = (f"(SELECT string_agg(({vocab_sql})[1 + floor(random() * {len(vocab)})::int], ' ') "
+                 f"FROM generate_series(1, 6 + (g % 25)) WHERE g > 0)")
+    db.run(f"""
+        DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+        CREATE SCHEMA {SCHEMA};
+        SET search_path = {SCHEMA};
+        CREATE TABLE user_memories (
+          id SERIAL PRIMARY KEY, user_id TEXT NOT NULL, category TEXT NOT NULL DEFAULT 'general',
+          content TEXT NOT NULL, created_at TIMESTAMPTZ DEFAULT NOW(), updated_at TIMESTAMPTZ DEFAULT NOW()
+        );
+        CREATE TABLE sparkie_self_memory (
+          id SERIAL PRIMARY KEY, category TEXT, content TEXT NOT NULL, created_at TIMESTAMPTZ DEFAULT NOW()
+        );
+    """)
+    users = [(f'heavy-{n}', n) for n in sizes] + [(f'other-{i}', 500) for i in range(others)]
+    for user_id, n in users:
+        print(f'  seeding {user_id} ({n} memories)', flush=True)
+        db.run(f"""
+            INSERT INTO user_memories (user_id, category, content, created_at)
+            SELECT {lit(user_id)}, ({cats_sql})[1 + (g % {len(CATEGORIES)})], {text_expr},
+                   NOW() - (g || ' minutes')::interval
+            FROM generate_series(1, {n}) g;
+        """)
+    db.run(f"""
+        INSERT INTO sparkie_self_memory (category, content, created_at)
+        SELECT 'self', {text_expr}, NOW() - (g || ' minutes')::interval FROM generate_series(1, {self_rows}) g;
+        CREATE INDEX idx_user_memories_user_id ON user_memories(user_id);
+        CREATE INDEX idx_user_memories_user_created ON user_memories(user_id, created_at DESC);
+        CREATE INDEX idx_user_memories_fts ON user_memories USING GIN (to_tsvector('english', content));
+        CREATE INDEX idx_self_memory_fts ON sparkie_self_memory USING GIN (to_tsvector('english', content));
+        ANALYZE user_memories;
+        ANALYZE sparkie_self_memory;
+    """)
+    return vocab
+
+
+def take_within_budget(groups, prefix, budget_tokens):
+    seen, out, left = set(), [], budget_tokens * CHARS_PER_TOKEN
+    for rows in groups:
+        for cat, content in rows:
+            if content in seen:
+                continue
+            line = f'{prefix}{cat}] {content}'
+            if len(line) + 1 > left:
+                continue
+            seen.add(content)
+            out.append(line)
+            left -= len(line) + 1
+    return out
+
+
+def plan(db, user):
+    """Which ranked queries memoryRetrieval.ts issues for this user: (cold, warm)."""
+    ranks_user = len(db.rows(RANKED_SQL['recent'].format(u=lit(user)))) > FULL_RECALL_LIMIT
+    self_rows = db.rows(RANKED_SQL['self_recent'])
+    newest = take_within_budget([self_rows[:SELF_LIMIT]], '[self:', SELF_TOKEN_BUDGET)
+    ranks_self = len(self_rows) > SELF_LIMIT or len(newest) < min(len(self_rows), SELF_LIMIT)
+    warm = (['relevant'] if ranks_user else []) + (['self_relevant'] if ranks_self else [])
+    cold = ['recent'] + (['pinned'] if ranks_user else []) + ['self_recent'] + warm
+    return cold, warm
+
+
+def prompt_chars(db, user, q):
+    full = db.rows(FULL_SQL.format(u=lit(user)))
+    full_chars = sum(len(f'[{c}] {t}') + 1 for c, t in full)
+    cold, _warm = plan(db, user)
+    got = {name: db.rows(RANKED_SQL[name].format(u=lit(user), q=lit(q))) if name in cold else []
+           for name in RANKED_SQL}
+    if len(got['recent']) <= FULL_RECALL_LIMIT:
+        user_lines = [f'[{c}] {t}' for c, t in got['recent']]
+    else:
+        user_lines = take_within_budget([got['pinned'], got['relevant'], got['recent'][:RECENT_LIMIT]], '[', USER_TOKEN_BUDGET)
+    self_recent = got['self_recent'][:SELF_LIMIT]
+    self_lines = take_within_budget([got['self_relevant'], self_recent], '[self:', SELF_TOKEN_BUDGET)
+    ranked_chars = sum(len(l) + 1 for l in user_lines + self_lines)
+    return len(full), full_chars, len(user_lines), ranked_chars, len(got['relevant'])
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--db', required=True, help='Postgres URL (a scratch database; schema bench_mem is dropped)')
+    ap.add_argument('--sizes', default='100,1000,10000,50000')
+    ap.add_argument('--others', type=int, default=100, help='background users with 500 memories each')
+    ap.add_argument('--self-rows', type=int, default=2000)
+    ap.add_argument('--queries', type=int, default=20)
+    ap.add_argument('--seed', type=int, default=1)
+    ap.add_argument('--keep', action='store_true', help='reuse an existing bench_mem schema')
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    db = Psql(args.db)
+    sizes = [int(s) for s in args.sizes.split(',')]
+    if args.keep and db.run(f"SELECT to_regclass('{SCHEMA}.user_memories') IS NOT NULL").strip() == 't':
+        vocab = vocabulary(3000, rng)
+    else:
+        print('seeding...')
+        vocab = seed(db, sizes, args.others, args.self_rows, rng)
+    messages = [' '.join(rng.choice(vocab) for _ in range(rng.randint(4, 14))) for _ in range(args.queries)]
+
+    print(f'\n{"memories":>9} {"full ms":>9} {"cold ms":>9} {"warm ms":>9} {"queries":>8} {"speed-up":>9} '
+          f'{"full rows":>10} {"full chars":>11} {"ranked rows":>12} {"ranked chars":>13} {"fts hits":>9}')
+    for n in sizes:
+        user = f'heavy-{n}'
+        cold, warm = plan(db, user)
+        full_ms = db.timed([FULL_SQL.format(u=lit(user))] * args.queries)
+        per_message = []
+        for names in (cold, warm):
+            if not names:
+                per_message.append([0.0] * len(messages))
+                continue
+            t = db.timed([RANKED_SQL[name].format(u=lit(user), q=lit(q)) for q in messages for name in names])
+            per_message.append([sum(t[i:i + len(names)]) for i in range(0, len(t), len(names))])
+        cold_ms, warm_ms = per_message
+        sizes_out = [prompt_chars(db, user, q) for q in messages[:5]]
+        full_rows, full_chars = sizes_out[0][0], sizes_out[0][1]
+        ranked_rows = statistics.median(s[2] for s in sizes_out)
+        ranked_chars = statistics.median(s[3] for s in sizes_out)
+        hits = statistics.median(s[4] for s in sizes_out)
+        f_med, c_med, w_med = (statistics.median(x) for x in (full_ms, cold_ms, warm_ms))
+        print(f'{n:>9} {f_med:>9.1f} {c_med:>9.1f} {w_med:>9.1f} {f"{len(cold)}/{len(warm)}":>8} {f_med / c_med:>8.1f}x '
+              f'{full_rows:>10} {full_chars:>11,} {ranked_rows:>12.0f} {ranked_chars:>13,.0f} {hits:>9.0f}')
+    print('\nms = median server+transfer time per message, summed over the queries issued; '
+          'queries = cold/warm count; speed-up = full vs cold')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: legacy per-patch loop vs patchlib on route.ts.
+
+Picks N unique lines of the target file as anchors and times
+  legacy  - `old in content` + `content.replace(old, new, 1)` per patch
+  find    - patchlib plan/render with per-anchor str.find
+  ac      - patchlib plan/render with one Aho-Corasick scan
+
+Usage: python3 .github/scripts/bench_patchlib.py [path] [--counts 5,20,100,500,2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import patchlib  # noqa: E402
+
+
+def pick_anchors(content, n, seed=1):
+    lines = content.splitlines(keepends=True)
+    candidates = [l for l in set(lines) if len(l) >= 30 and content.count(l) == 1]
+    candidates.sort()
+    random.Random(seed).shuffle(candidates)
+    if len(candidates) < n:
+        raise SystemExit(f'only {len(candidates)} unique anchor lines available, asked for {n}')
+    return [(l, l.upper(), f'bench {i}') for i, l in enumerate(candidates[:n])]
+
+
+def legacy(content, patches):
+    for old, new, _desc in patches:
+        assert old in content
+        content = content.replace(old, new, 1)
+    return content
+
+
+def engine(content, patches, threshold):
+    saved = patchlib.AC_THRESHOLD
+    patchlib.AC_THRESHOLD = threshold
+    try:
+        return patchlib.apply_patches(content, patches)[0]
+    finally:
+        patchlib.AC_THRESHOLD = saved
+
+
+def best_of(fn, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('path', nargs='?', default='src/app/api/chat/route.ts')
+    ap.add_argument('--counts', default='5,20,100,500,2000')
+    ap.add_argument('--repeat', type=int, default=3)
+    args = ap.parse_args()
+
+    with open(args.path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    print(f'{args.path}: {len(content):,} chars, best of {args.repeat}')
+    print(f'{"patches":>8} {"legacy ms":>10} {"find ms":>9} {"ac ms":>8} {"speed-up":>9}')
+    for n in (int(c) for c in args.counts.split(',')):
+        patches = pick_anchors(content, n)
+        t_legacy, expected = best_of(lambda: legacy(content, patches), args.repeat)
+        t_find, out_find = best_of(lambda: engine(content, patches, sys.maxsize), args.repeat)
+        t_ac, out_ac = best_of(lambda: engine(content, patches, 0), args.repeat)
+        assert out_find == expected and out_ac == expected, 'engine output differs from legacy loop'
+        auto = t_ac if n >= patchlib.AC_THRESHOLD else t_find
+        print(f'{n:>8} {t_legacy:>10.1f} {t_find:>9.1f} {t_ac:>8.1f} {t_legacy / auto:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
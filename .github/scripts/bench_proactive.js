@@ -0,0 +1,172 @@
+#!/usr/bin/env node
+/**
+ * Load test: proactive push fan-out, old global array vs src/lib/proactiveHub.js.
+ *
+ * Simulates --clients connections spread over --users users (in-process fake
+ * transports, no sockets) and measures, for each implementation,
+ *   connect_ms    - registering every client
+ *   push p50/p95  - one targeted push (a random user's connections), in µs
+ *   churn_ms      - disconnecting and reconnecting --churn of the clients
+ *   heap_mb       - heap growth for the registered clients (+ timers), needs --expose-gc
+ *   backlog_mb    - heap held after --burst pushes to every user while --slow of the
+ *                   clients are backpressured (the array has no queue: a slow SSE
+ *                   consumer buffers every chunk in its stream)
+ *
+ * The "array" side reproduces the old code: Array.push to register, a full scan
+ * per push, findIndex + splice on disconnect, and one 30s setInterval per SSE client.
+ *
+ * Usage:
+ *   node --expose-gc .github/scripts/bench_proactive.js
+ *   node --expose-gc .github/scripts/bench_proactive.js --clients 20000 --users 5000 --pushes 20000
+ */
+
+'use strict'
+
+const path = require('path')
+const { ProactiveHub } = require(path.join(__dirname, '..', '..', 'src', 'lib', 'proactiveHub'))
+
+function arg(name, def) {
+  const i = process.argv.indexOf(`--${name}`)
+  return i === -1 ? def : Number(process.argv[i + 1])
+}
+
+const CLIENTS = arg('clients', 5000)
+const USERS = arg('users', 1000)
+const PUSHES = arg('pushes', 10000)
+const CHURN = arg('churn', 0.1)
+const SLOW = arg('slow', 0.05)
+const BURST = arg('burst', 200)
+
+const EVENT = { type: 'proactive', subtype: 'inbox_check', data: { newCount: 3, senders: ['a@b.c'], subjects: ['hello there'] }, timestamp: 0 }
+// The burst cycles through the real subtypes: the snapshot ones coalesce in the hub, the others queue
+const BURST_SUBTYPES = ['task_completed', 'inbox_check', 'morning_brief', 'checkin']
+
+let seed = 42
+function rand() {
+  seed = (seed * 1103515245 + 12345) & 0x7fffffff
+  return seed / 0x7fffffff
+}
+
+function heapMb() {
+  if (global.gc) { global.gc(); global.gc() }
+  return process.memoryUsage().heapUsed / 1048576
+}
+
+function pct(sorted, p) {
+  return sorted[Math.min(sorted.length - 1, Math.floor(p / 100 * sorted.length))]
+}
+
+function fakeTransport(slow) {
+  // A slow client's stream never drains: everything written stays buffered
+  const t = { slow, buffered: [], delivered: 0 }
+  t.send = (data) => { if (t.slow) t.buffered.push(data); else t.delivered++ }
+  t.backpressured = () => t.slow && t.buffered.length >= 32
+  return t
+}
+
+// ── Old implementation ─────────────────────────────────────────────────────
+function arrayImpl() {
+  const clients = []
+  return {
+    add(userId, t) {
+      const c = { ws: null, userId, sseSend: t.send }
+      c.interval = setInterval(() => {}, 30_000)
+      clients.push(c)
+      return c
+    },
+    remove(c) {
+      clearInterval(c.interval)
+      const idx = clients.findIndex(x => x.sseSend === c.sseSend)
+      if (idx !== -1) clients.splice(idx, 1)
+    },
+    publish(userId, event) {
+      const payload = JSON.stringify(event)
+      for (const c of clients) {
+        if (c.userId !== userId) continue
+        try { c.sseSend(payload) } catch (_) {}
+      }
+    },
+    close() { for (const c of clients) clearInterval(c.interval) },
+  }
+}
+
+// ── Hub ─────────────────────────────────────────────────────────────────────
+function hubImpl() {
+  const hub = new ProactiveHub()
+  return {
+    hub,
+    add(userId, t) {
+      return hub.add({ userId, kind: 'sse', send: t.send, backpressured: t.backpressured, heartbeat: () => {} })
+    },
+    remove(c) { hub.remove(c) },
+    publish(userId, event) { hub.publish(userId, event) },
+    close() { hub.stopTimers() },
+  }
+}
+
+function run(name, make) {
+  seed = 42
+  const base = heapMb()
+  const impl = make()
+  const conns = []
+
+  let t0 = process.hrtime.bigint()
+  for (let i = 0; i < CLIENTS; i++) {
+    const userId = `user-${i % USERS}`
+    const t = fakeTransport(false)
+    conns.push({ userId, t, handle: impl.add(userId, t) })
+  }
+  const connectMs = Number(process.hrtime.bigint() - t0) / 1e6
+  const heap = heapMb() - base
+
+  const lat = []
+  for (let i = 0; i < PUSHES; i++) {
+    const userId = `user-${Math.floor(rand() * USERS)}`
+    const s = process.hrtime.bigint()
+    impl.publish(userId, EVENT)
+    lat.push(Number(process.hrtime.bigint() - s) / 1e3)
+  }
+  lat.sort((a, b) => a - b)
+
+  const churnN = Math.floor(CLIENTS * CHURN)
+  t0 = process.hrtime.bigint()
+  for (let n = 0; n < churnN; n++) {
+    const i = Math.floor(rand() * conns.length)
+    const c = conns[i]
+    impl.remove(c.handle)
+    c.handle = impl.add(c.userId, c.t)
+  }
+  const churnMs = Number(process.hrtime.bigint() - t0) / 1e6
+
+  for (const c of conns) c.t.slow = rand() < SLOW
+  const beforeBurst = heapMb()
+  for (let b = 0; b < BURST; b++) {
+    for (let u = 0; u < USERS; u++) {
+      impl.publish(`user-${u}`, { ...EVENT, subtype: BURST_SUBTYPES[b % BURST_SUBTYPES.length], timestamp: b })
+    }
+  }
+  const backlog = heapMb() - beforeBurst
+  const maxBuffered = Math.max(...conns.map(c => c.t.buffered.length + (c.handle.queue ? c.handle.queue.length : 0)))
+
+  const extra = impl.hub ? impl.hub.stats() : null
+  impl.close()
+  return { name, connectMs, heap, p50: pct(lat, 50), p95: pct(lat, 95), p99: pct(lat, 99), churnMs, backlog, maxBuffered, extra }
+}
+
+function fmt(v, d = 1) {
+  return typeof v === 'number' ? v.toFixed(d) : String(v)
+}
+
+const results = [run('array', arrayImpl), run('hub', hubImpl)]
+console.log(`${CLIENTS} clients / ${USERS} users, ${PUSHES} targeted pushes, ${Math.round(CHURN * 100)}% churn, ` +
+            `${Math.round(SLOW * 100)}% slow x ${BURST}-event burst${global.gc ? '' : ' (run with --expose-gc for heap numbers)'}`)
+console.log(`${'impl'.padEnd(6)} ${'connect ms'.padStart(11)} ${'heap MB'.padStart(8)} ${'push p50 µs'.padStart(12)} ` +
+            `${'p95 µs'.padStart(8)} ${'p99 µs'.padStart(8)} ${'churn ms'.padStart(9)} ${'backlog MB'.padStart(11)} ${'max buffered'.padStart(13)}`)
+for (const r of results) {
+  console.log(`${r.name.padEnd(6)} ${fmt(r.connectMs).padStart(11)} ${fmt(r.heap).padStart(8)} ${fmt(r.p50).padStart(12)} ` +
+              `${fmt(r.p95).padStart(8)} ${fmt(r.p99).padStart(8)} ${fmt(r.churnMs).padStart(9)} ${fmt(r.backlog).padStart(11)} ${String(r.maxBuffered).padStart(13)}`)
+}
+const hubStats = results[1].extra
+if (hubStats) {
+  console.log(`hub: sent ${hubStats.sent}, queued ${hubStats.queued}, coalesced ${hubStats.coalesced}, dropped ${hubStats.dropped}`)
+}
@@ -0,0 +1,152 @@
+#!/usr/bin/env node
+/**
+ * Throughput benchmark: terminal WebSocket framing for PTY output.
+ *
+ * Runs a noisy command once, records each stdout chunk and its arrival time
+ * (the way E2B's pty onData delivers them), then replays the same chunks with
+ * the same spacing through three senders:
+ *   json-per-chunk  - the old path: one { type: 'output' } JSON text frame per chunk
+ *   json-coalesced  - src/lib/ptyOutput.js, legacy client (JSON text frames)
+ *   binary          - src/lib/ptyOutput.js, client connected with ?frames=binary
+ *
+ * Frames go over a real loopback WebSocket when the `ws` package is installed
+ * (node_modules), otherwise into an in-process sink that only counts them.
+ * Reports frames, bytes on the wire, server CPU ms and wall ms until the client
+ * has received everything.
+ *
+ * Usage:
+ *   node .github/scripts/bench_pty.js
+ *   node .github/scripts/bench_pty.js --lines 200000
+ *   node .github/scripts/bench_pty.js --cmd 'npm install --verbose'
+ */
+
+'use strict'
+
+const path = require('path')
+const { spawn } = require('child_process')
+const { PtyOutput } = require(path.join(__dirname, '..', '..', 'src', 'lib', 'ptyOutput'))
+
+function arg(name, def) {
+  const i = process.argv.indexOf(`--${name}`)
+  return i === -1 ? def : process.argv[i + 1]
+}
+
+const LINES = Number(arg('lines', 50000))
+// npm-style log lines with ANSI colours and the odd multi-byte glyph, one write per line
+const DEFAULT_CMD = `python3 -u -c "
+for i in range(${LINES}):
+    print(f'\\x1b[32mnpm\\x1b[0m http fetch GET 200 https://registry.npmjs.org/pkg-{i} {i % 97}ms (cache hit) ✔')
+"`
+const CMD = arg('cmd', DEFAULT_CMD)
+
+let WebSocket = null
+let WebSocketServer = null
+try {
+  ({ WebSocket, WebSocketServer } = require('ws'))
+} catch (_) {}
+
+const encodeMessage = (type, data) => JSON.stringify({ type, data })
+
+/** A connected server-side socket plus a promise for "client got N payload bytes" */
+async function openPair() {
+  if (!WebSocket) {
+    const sink = { readyState: 1, bufferedAmount: 0, frames: 0, wire: 0 }
+    sink.send = (data) => {
+      sink.frames++
+      const len = typeof data === 'string' ? Buffer.byteLength(data) : data.length
+      sink.wire += len
+    }
+    return { server: sink, stats: sink, received: () => Promise.resolve(), close: () => {} }
+  }
+  const wss = new WebSocketServer({ port: 0, perMessageDeflate: false })
+  await new Promise(r => wss.once('listening', r))
+  const serverSide = new Promise(r => wss.once('connection', r))
+  const client = new WebSocket(`ws://127.0.0.1:${wss.address().port}`, { perMessageDeflate: false })
+  const server = await serverSide
+  await new Promise(r => client.once('open', r))
+  const stats = { frames: 0, wire: 0, payload: 0 }
+  let want = Infinity
+  let done
+  client.on('message', (data, isBinary) => {
+    stats.frames++
+    stats.wire += data.length
+    stats.payload += isBinary ? data.length : Buffer.byteLength(JSON.parse(data.toString()).data)
+    if (stats.payload >= want && done) done()
+  })
+  return {
+    server,
+    stats,
+    received: (bytes) => new Promise(r => {
+      want = bytes
+      done = r
+      if (stats.payload >= want) r()
+    }),
+    close: () => { client.close(); wss.close() },
+  }
+}
+
+/** Run the command once, keeping each stdout chunk and when it arrived */
+function record() {
+  return new Promise((resolve, reject) => {
+    const chunks = []
+    const t0 = process.hrtime.bigint()
+    const child = spawn('sh', ['-c', CMD], { stdio: ['ignore', 'pipe', 'inherit'] })
+    child.stdout.on('data', (data) => chunks.push({ at: Number(process.hrtime.bigint() - t0) / 1e6, data }))
+    child.on('error', reject)
+    child.on('close', () => resolve(chunks))
+  })
+}
+
+const sleep = (ms) => new Promise(r => setTimeout(r, ms))
+
+/** Replay the recorded chunks with their original spacing through one sender */
+async function run(mode, recorded) {
+  const pair = await openPair()
+  const ws = pair.server
+  ws.binaryFrames = mode === 'binary'
+  const out = new PtyOutput(() => [ws], encodeMessage)
+  const clients = new Set([ws])
+
+  let textBytes = 0
+  const t0 = process.hrtime.bigint()
+  const cpu0 = process.cpuUsage()
+  for (const { at, data } of recorded) {
+    const ahead = at - Number(process.hrtime.bigint() - t0) / 1e6
+    if (ahead >= 1) await sleep(ahead)
+    if (mode === 'json-per-chunk') {
+      const text = Buffer.from(data).toString('utf-8')
+      textBytes += Buffer.byteLength(text)
+      clients.forEach(c => { if (c.readyState === 1) c.send(encodeMessage('output', text)) })
+    } else {
+      out.push(data)
+    }
+  }
+  out.flush()
+  const cpu = process.cpuUsage(cpu0)
+  const bytes = recorded.reduce((n, c) => n + c.data.length, 0)
+  // The per-chunk path decodes each chunk alone, so split multi-byte chars count as U+FFFD
+  await pair.received(mode === 'json-per-chunk' ? textBytes : bytes)
+  const wallMs = Number(process.hrtime.bigint() - t0) / 1e6
+  pair.close()
+  return { mode, chunks: recorded.length, bytes, frames: pair.stats.frames, wire: pair.stats.wire, cpuMs: (cpu.user + cpu.system) / 1000, wallMs }
+}
+
+async function main() {
+  console.log(`transport: ${WebSocket ? 'loopback WebSocket (ws)' : 'in-process sink (ws not installed)'}`)
+  const recorded = await record()
+  const results = []
+  for (const mode of ['json-per-chunk', 'json-coalesced', 'binary']) results.push(await run(mode, recorded))
+  console.log(`${'mode'.padEnd(15)} ${'pty chunks'.padStart(10)} ${'out MB'.padStart(7)} ${'frames'.padStart(8)} ` +
+              `${'wire MB'.padStart(8)} ${'cpu ms'.padStart(8)} ${'wall ms'.padStart(8)}`)
+  for (const r of results) {
+    console.log(`${r.mode.padEnd(15)} ${String(r.chunks).padStart(10)} ${(r.bytes / 1048576).toFixed(1).padStart(7)} ` +
+                `${String(r.frames).padStart(8)} ${(r.wire / 1048576).toFixed(1).padStart(8)} ` +
+                `${r.cpuMs.toFixed(0).padStart(8)} ${r.wallMs.toFixed(0).padStart(8)}`)
+  }
+  console.log('cpu ms = process CPU over the replay (identical replay loop in every mode; sleeps cost nothing)')
+}
+
+main().catch((err) => {
+  console.error(err)
+  process.exit(1)
+})
@@ -0,0 +1,156 @@
+#!/usr/bin/env node
+/**
+ * Replay benchmark: how streamed chat deltas reach the screen.
+ *
+ * Replays a synthetic fast token stream (seeded, so every strategy sees the
+ * same arrival times) through three ways of updating the message:
+ *   per-token  - one store update per delta
+ *   debounce   - the old 16ms clearTimeout / setTimeout "throttle" in ChatInput
+ *   frame      - src/lib/frameCoalescer.ts, flushed on the final chunk
+ *
+ * "Frames" are a 16ms timer here (no requestAnimationFrame in node). Reports
+ * UI updates, time to first paint, the median / max gap between visible
+ * updates while the stream runs, and how many characters were still missing
+ * from the screen when the last chunk arrived.
+ *
+ * src/lib/frameCoalescer.ts is compiled with the project's `typescript`
+ * package, so this needs node_modules.
+ *
+ * Usage:
+ *   node .github/scripts/bench_stream.js
+ *   node .github/scripts/bench_stream.js --tokens 4000 --ms 3
+ */
+
+'use strict'
+
+const fs = require('fs')
+const path = require('path')
+const Module = require('module')
+
+const ROOT = path.join(__dirname, '..', '..')
+
+function arg(name, def) {
+  const i = process.argv.indexOf(`--${name}`)
+  return i === -1 ? def : Number(process.argv[i + 1])
+}
+
+const TOKENS = arg('tokens', 2000)
+const MEAN_MS = arg('ms', 4)
+
+function loadFrameCoalescer() {
+  let ts
+  try {
+    ts = require('typescript')
+  } catch (_) {
+    console.error('typescript is not installed - run `npm install` first')
+    process.exit(1)
+  }
+  const file = path.join(ROOT, 'src', 'lib', 'frameCoalescer.ts')
+  const { outputText } = ts.transpileModule(fs.readFileSync(file, 'utf-8'), {
+    compilerOptions: { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2019 },
+  })
+  const m = new Module(file, module)
+  m.filename = file
+  m._compile(outputText, file)
+  return m.exports
+}
+
+const { FrameCoalescer } = loadFrameCoalescer()
+
+let seed = 7
+function rand() {
+  seed = (seed * 1103515245 + 12345) & 0x7fffffff
+  return seed / 0x7fffffff
+}
+
+/** Arrival schedule: mostly steady, with the odd network hiccup and burst */
+function makeStream() {
+  seed = 7
+  const out = []
+  let at = 0
+  for (let i = 0; i < TOKENS; i++) {
+    const r = rand()
+    at += r < 0.02 ? MEAN_MS * 15 : r < 0.1 ? 0 : MEAN_MS * (0.5 + rand())
+    out.push({ at, text: `tok${i} ` })
+  }
+  return out
+}
+
+const sleep = (ms) => new Promise(r => setTimeout(r, ms))
+const now = () => Number(process.hrtime.bigint()) / 1e6
+
+function strategies(paint) {
+  return {
+    'per-token': () => ({ set: paint, finish: () => {} }),
+    debounce: () => {
+      let timer = null
+      return {
+        set: (v) => {
+          clearTimeout(timer)
+          timer = setTimeout(() => paint(v), 16)
+        },
+        finish: () => {},
+      }
+    },
+    frame: () => {
+      const frames = new FrameCoalescer(paint)
+      return { set: (v) => frames.set(v), finish: () => frames.flush() }
+    },
+  }
+}
+
+async function run(name, stream) {
+  let visible = ''
+  const paints = []
+  const paint = (v) => {
+    visible = v
+    paints.push(now())
+  }
+  const s = strategies(paint)[name]()
+  const t0 = now()
+  let full = ''
+  for (const { at, text } of stream) {
+    const ahead = at - (now() - t0)
+    if (ahead >= 1) await sleep(ahead)
+    full += text
+    s.set(full)
+  }
+  const end = now()
+  s.finish()
+  const tailMissing = full.length - visible.length
+  await sleep(50)
+  const gaps = []
+  const during = paints.filter(t => t <= end)
+  for (let i = 1; i < during.length; i++) gaps.push(during[i] - during[i - 1])
+  gaps.sort((a, b) => a - b)
+  return {
+    name,
+    updates: paints.length,
+    firstMs: paints.length ? paints[0] - t0 : NaN,
+    medianGap: gaps.length ? gaps[Math.floor(gaps.length / 2)] : NaN,
+    maxGap: gaps.length ? gaps[gaps.length - 1] : (end - t0),
+    tailMissing,
+    complete: visible === full,
+    streamMs: end - t0,
+  }
+}
+
+async function main() {
+  const stream = makeStream()
+  const results = []
+  for (const name of ['per-token', 'debounce', 'frame']) results.push(await run(name, stream))
+  console.log(`${TOKENS} tokens, ~${MEAN_MS}ms apart (with bursts and stalls), stream ${results[0].streamMs.toFixed(0)}ms`)
+  console.log(`${'strategy'.padEnd(10)} ${'updates'.padStart(8)} ${'first ms'.padStart(9)} ${'gap p50 ms'.padStart(11)} ` +
+              `${'gap max ms'.padStart(11)} ${'tail missing'.padStart(13)} ${'final ok'.padStart(9)}`)
+  for (const r of results) {
+    console.log(`${r.name.padEnd(10)} ${String(r.updates).padStart(8)} ${r.firstMs.toFixed(0).padStart(9)} ` +
+                `${r.medianGap.toFixed(1).padStart(11)} ${r.maxGap.toFixed(0).padStart(11)} ` +
+                `${String(r.tailMissing).padStart(13)} ${String(r.complete).padStart(9)}`)
+  }
+  console.log('tail missing = characters not yet on screen when the last chunk arrived (before finish)')
+}
+
+main().catch((err) => {
+  console.error(err)
+  process.exit(1)
+})
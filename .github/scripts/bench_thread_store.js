@@ -0,0 +1,238 @@
+#!/usr/bin/env node
+/**
+ * Benchmark: threadStore budget checks and context loads on a long thread.
+ *
+ * Plays --rows messages for one synthetic user through the real
+ * src/lib/threadStore.ts (compiled with the project's `typescript` package,
+ * '@/' resolved to src/) against a local Postgres, compressing the oldest
+ * batch whenever the uncompressed budget passes MAX_THREAD_TOKENS, the way the
+ * chat checkpoint does. Every --pin-th message is a pinned tool result.
+ *
+ * It compares
+ *   budget  - getUncompressedTokenCount() (running counter) against the old
+ *             SUM(token_estimate) over the user's rows, timed at each check
+ *   load    - loadThreadContext() against the old load (every compressed row
+ *             joined, three sequential queries), --loads times each
+ * and checks that the counter still equals the SUM at the end.
+ *
+ * Every sentence of a level-0 summary is tagged with its number, so the run also
+ * reports which summaries survive compaction: in the whole hierarchy and in
+ * its oldest (top-level) row, how many are still mentioned, the oldest and
+ * newest, and the longest run missing in between.
+ * --merger old replays the same thread with the previous default merger (every
+ * input keeps its start, at every level) for comparison.
+ *
+ * Needs node_modules (pg, typescript). Migrations are applied first.
+ *
+ * Usage:
+ *   node .github/scripts/bench_thread_store.js --db postgres://postgres@127.0.0.1/sparkie?sslmode=disable
+ *   node .github/scripts/bench_thread_store.js --db ... --rows 10000 --loads 100
+ *   node .github/scripts/bench_thread_store.js --db ... --rows 20000 --merger old
+ */
+
+'use strict'
+
+const fs = require('fs')
+const path = require('path')
+const Module = require('module')
+
+const ROOT = path.join(__dirname, '..', '..')
+
+function arg(name, def) {
+  const i = process.argv.indexOf(`--${name}`)
+  if (i === -1) return def
+  return typeof def === 'number' ? Number(process.argv[i + 1]) : process.argv[i + 1]
+}
+
+const ROWS = arg('rows', 5000)
+const LOADS = arg('loads', 50)
+const PIN_EVERY = arg('pin', 25)
+const MERGER = arg('merger', 'default')
+
+function installTsLoader() {
+  let ts
+  try {
+    ts = require('typescript')
+  } catch (_) {
+    console.error('typescript is not installed - run `npm install` first')
+    process.exit(1)
+  }
+  const resolve = Module._resolveFilename
+  Module._resolveFilename = function (request, ...rest) {
+    if (request.startsWith('@/')) request = path.join(ROOT, 'src', request.slice(2))
+    return resolve.call(this, request, ...rest)
+  }
+  require.extensions['.ts'] = (m, filename) => {
+    const { outputText } = ts.transpileModule(fs.readFileSync(filename, 'utf-8'), {
+      compilerOptions: { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2019, esModuleInterop: true },
+    })
+    m._compile(outputText, filename)
+  }
+}
+
+// ── Old implementation ─────────────────────────────────────────────────────
+async function oldTokenCount(query, userId) {
+  const res = await query(
+    `SELECT COALESCE(SUM(token_estimate), 0) as total FROM sparkie_threads
+     WHERE user_id = $1 AND is_compressed = FALSE AND is_pinned = FALSE`,
+    [userId]
+  )
+  return Number(res.rows[0]?.total ?? 0)
+}
+
+async function oldLoad(query, userId) {
+  const summaryRes = await query(
+    `SELECT content FROM sparkie_threads WHERE user_id = $1 AND is_compressed = TRUE ORDER BY created_at ASC`,
+    [userId]
+  )
+  const compressedSummary = summaryRes.rows.map(r => r.content).join('\n\n')
+  const pinnedRes = await query(
+    `SELECT role, content, tool_call_id, is_tool_result FROM sparkie_threads
+     WHERE user_id = $1 AND is_pinned = TRUE ORDER BY created_at ASC`,
+    [userId]
+  )
+  const recentRes = await query(
+    `SELECT role, content, token_estimate FROM sparkie_threads
+     WHERE user_id = $1 AND is_compressed = FALSE AND is_pinned = FALSE
+     ORDER BY created_at DESC LIMIT 30`,
+    [userId]
+  )
+  return { compressedSummary, pinnedPairs: pinnedRes.rows, recentMessages: recentRes.rows.reverse() }
+}
+
+// The default merger before it kept the end of top-level inputs
+async function oldClipMerge(summaries) {
+  const share = Math.floor(500 / 0.25 / summaries.length)
+  return summaries.map((text) => {
+    if (text.length <= share) return text
+    const cut = text.slice(0, share)
+    const end = Math.max(cut.lastIndexOf('. '), cut.lastIndexOf('\n'))
+    return (end > share / 2 ? cut.slice(0, end + 1) : cut).trimEnd() + ' …'
+  }).join('\n\n')
+}
+
+/** Which level-0 summaries (by number) a summary text still mentions */
+function coverage(text, total) {
+  const found = new Set()
+  for (const m of text.matchAll(/\[s(\d+)\]/g)) found.add(Number(m[1]))
+  const nums = [...found].sort((a, b) => a - b)
+  if (!nums.length) return `none of ${total}`
+  let gap = 0
+  for (let i = 1; i < nums.length; i++) gap = Math.max(gap, nums[i] - nums[i - 1] - 1)
+  return `${nums.length} of ${total} (oldest #${nums[0]}, newest #${nums[nums.length - 1]}, longest missing run ${gap})`
+}
+
+// ── Helpers ────────────────────────────────────────────────────────────────
+let seed = 7
+function rand() {
+  seed = (seed * 1103515245 + 12345) & 0x7fffffff
+  return seed / 0x7fffffff
+}
+
+function sentence(n) {
+  const words = ['deploy', 'memory', 'thread', 'schedule', 'build', 'preview', 'radio', 'token', 'summary', 'goal']
+  const out = []
+  for (let i = 0; i < n; i++) out.push(words[Math.floor(rand() * words.length)])
+  return out.join(' ') + '.'
+}
+
+async function time(fn) {
+  const t0 = process.hrtime.bigint()
+  const out = await fn()
+  return [Number(process.hrtime.bigint() - t0) / 1e6, out]
+}
+
+function row(name, ms) {
+  const s = [...ms].sort((a, b) => a - b)
+  const at = p => s[Math.min(s.length - 1, Math.floor(p / 100 * s.length))]
+  console.log(`${name.padEnd(12)} ${at(50).toFixed(2).padStart(9)} ${at(95).toFixed(2).padStart(9)} ${s[s.length - 1].toFixed(2).padStart(9)}`)
+}
+
+async function main() {
+  const db = arg('db', process.env.DATABASE_URL)
+  if (!db) {
+    console.error('--db (or DATABASE_URL) is required')
+    process.exit(1)
+  }
+  process.env.DATABASE_URL = db
+  await require(path.join(ROOT, 'db', 'migrate.js')).migrate({ log: () => {} })
+
+  installTsLoader()
+  const store = require('@/lib/threadStore')
+  const { query, pool } = require('@/lib/db')
+  const userId = `bench-thread-${process.pid}`
+
+  const countNew = []
+  const countOld = []
+  let compressions = 0
+  const t0 = Date.now()
+  for (let i = 0; i < ROWS; i++) {
+    const pinned = i % PIN_EVERY === PIN_EVERY - 1
+    await store.appendThreadMessage(userId, pinned
+      ? { role: 'tool', content: sentence(20), tool_call_id: `call_${i}`, is_tool_result: true }
+      : { role: i % 2 ? 'assistant' : 'user', content: sentence(20 + Math.floor(rand() * 120)) })
+
+    const [msNew, budget] = await time(() => store.getUncompressedTokenCount(userId))
+    const [msOld] = await time(() => oldTokenCount(query, userId))
+    countNew.push(msNew)
+    countOld.push(msOld)
+    if (budget > store.MAX_THREAD_TOKENS) {
+      const summary = Array.from({ length: 15 }, () => `[s${compressions}] ${sentence(10)}`).join(' ')
+      if (MERGER === 'old') await store.compressOldestBatch(userId, summary, oldClipMerge)
+      else await store.compressOldestBatch(userId, summary)
+      compressions++
+    }
+  }
+  const seedMs = Date.now() - t0
+
+  const loadNew = []
+  const loadOld = []
+  let ctxNew
+  let ctxOld
+  for (let i = 0; i < LOADS; i++) {
+    const [a, n] = await time(() => store.loadThreadContext(userId))
+    const [b, o] = await time(() => oldLoad(query, userId))
+    loadNew.push(a)
+    loadOld.push(b)
+    ctxNew = n
+    ctxOld = o
+  }
+
+  const counter = await store.getUncompressedTokenCount(userId)
+  const actual = await oldTokenCount(query, userId)
+  const levels = await query(
+    `SELECT summary_level, COUNT(*)::int AS n FROM sparkie_threads
+     WHERE user_id = $1 AND summary_level IS NOT NULL GROUP BY summary_level ORDER BY summary_level`,
+    [userId]
+  )
+  const total = await query(`SELECT COUNT(*)::int AS n FROM sparkie_threads WHERE user_id = $1`, [userId])
+  const stored = await query(
+    `SELECT content FROM sparkie_threads WHERE user_id = $1 AND summary_level IS NOT NULL ORDER BY created_at ASC`,
+    [userId]
+  )
+  await query(`DELETE FROM sparkie_threads WHERE user_id = $1`, [userId])
+  await query(`DELETE FROM sparkie_thread_budget WHERE user_id = $1`, [userId])
+  await pool.end()
+
+  console.log(`${ROWS} messages -> ${total.rows[0].n} thread rows, ${compressions} compressions, seeded in ${(seedMs / 1000).toFixed(1)}s`)
+  console.log(`summary rows by level: ${levels.rows.map(r => `L${r.summary_level}=${r.n}`).join(' ') || 'none'}`)
+  console.log(`${'ms'.padEnd(12)} ${'p50'.padStart(9)} ${'p95'.padStart(9)} ${'max'.padStart(9)}`)
+  row('budget new', countNew)
+  row('budget old', countOld)
+  row('load new', loadNew)
+  row('load old', loadOld)
+  console.log(`summary chars loaded: new ${ctxNew.compressedSummary.length}, old ${ctxOld.compressedSummary.length}`)
+  console.log(`summaries still mentioned (${MERGER} merger):`)
+  console.log(`  whole hierarchy  ${coverage(stored.rows.map(r => r.content).join('\n\n'), compressions)}`)
+  console.log(`  oldest row       ${coverage(stored.rows[0]?.content ?? '', compressions)}`)
+  console.log(`  loaded context   ${coverage(ctxNew.compressedSummary, compressions)}`)
+  console.log(`pinned ${ctxNew.pinnedPairs.length}, recent ${ctxNew.recentMessages.length}`)
+
+  if (counter !== actual) {
+    console.log(`MISMATCH: running counter ${counter} != SUM ${actual}`)
+    process.exit(1)
+  }
+  console.log(`running counter matches SUM(token_estimate): ${counter}`)
+}
+
+main().catch(err => { console.error(err); process.exit(1) })
@@ -0,0 +1,173 @@
+#!/usr/bin/env node
+/**
+ * Replay: per-turn tool selection (src/lib/toolSelection.ts) vs shipping every tool.
+ *
+ * Loads the tool definitions straight from chat/route.ts and the sprint*-tools.ts
+ * files (name, description, parameter names; schema size is approximated by each
+ * definition's source length), then replays .github/scripts/bench-tool-calls.json:
+ * each case is a user message plus the tool(s) a correct first call may use.
+ *
+ * Modes: full (every tool), current (the route before selection: core tools
+ * for conversational messages, every tool otherwise) and selected.
+ * Reports, per mode, schema tokens per call, how often an acceptable tool was
+ * in the offered set ("tool offered") and the share of each case's acceptable
+ * tools that were offered, averaged over cases ("recall"). A miss is what the
+ * route's widen fallback recovers from at the cost of one extra round trip.
+ *
+ * Both measure the offered set only: whether the model then calls the right
+ * tool, and what it needs on later rounds of a multi-step turn, is not replayed.
+ *
+ * src/lib/toolSelection.ts is compiled with the project's `typescript`
+ * package, so this needs node_modules.
+ *
+ * Usage:
+ *   node .github/scripts/bench_tool_selection.js
+ *   node .github/scripts/bench_tool_selection.js --verbose
+ */
+
+'use strict'
+
+const fs = require('fs')
+const path = require('path')
+const Module = require('module')
+
+const ROOT = path.join(__dirname, '..', '..')
+
+function loadToolSelection() {
+  let ts
+  try {
+    ts = require('typescript')
+  } catch (_) {
+    console.error('typescript is not installed - run `npm install` first')
+    process.exit(1)
+  }
+  const file = path.join(ROOT, 'src', 'lib', 'toolSelection.ts')
+  const { outputText } = ts.transpileModule(fs.readFileSync(file, 'utf-8'), {
+    compilerOptions: { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2019 },
+  })
+  const m = new Module(file, module)
+  m.filename = file
+  m._compile(outputText, file)
+  return m.exports
+}
+
+const { selectTools } = loadToolSelection()
+
+const SOURCES = [
+  'src/app/api/chat/route.ts',
+  'src/lib/sprint2-tools.ts',
+  'src/lib/sprint3-tools.ts',
+  'src/lib/sprint4-tools.ts',
+  'src/lib/sprint5-tools.ts',
+]
+
+// Mirrors CORE_TOOL_NAMES and the conversational check in chat/route.ts
+const CORE_TOOL_NAMES = [
+  'save_memory', 'read_memory', 'delete_memory', 'list_memories',
+  'schedule_task', 'read_pending_tasks', 'get_scheduled_tasks',
+  'get_current_time', 'search_web', 'get_weather',
+  'browser_navigate', 'browser_screenshot', 'get_github',
+  'send_card_to_user', 'composio_execute', 'composio_discover',
+  'post_to_feed',
+]
+const ACTION_RE = /\b(run|execute|call|invoke|use|apply|try|check|search|fetch|get|load|find|look.up|build|create|make|generate|send|post|update|delete|remove|archive)\b/i
+
+function tierOf(message) {
+  const words = message.trim().split(/\s+/).filter(Boolean).length
+  return words <= 25 && !ACTION_RE.test(message) ? 'conversational' : 'task'
+}
+
+const DEF_RE = /name:\s*'([a-z_0-9]+)',\s*description:\s*(['"`])((?:\\.|(?!\2)[\s\S])*?)\2/g
+
+/** Tool objects shaped like the real ones, first definition of each name wins (as in the route) */
+function loadTools() {
+  const tools = []
+  const seen = new Set()
+  for (const rel of SOURCES) {
+    const src = fs.readFileSync(path.join(ROOT, rel), 'utf-8')
+    const defs = []
+    let m
+    while ((m = DEF_RE.exec(src))) defs.push({ at: m.index, name: m[1], description: m[3] })
+    defs.forEach((d, i) => {
+      if (seen.has(d.name)) return
+      seen.add(d.name)
+      const body = src.slice(d.at, i + 1 < defs.length ? defs[i + 1].at : Math.min(src.length, d.at + 4000))
+      const properties = {}
+      const propsAt = body.indexOf('properties:')
+      if (propsAt !== -1) {
+        for (const p of body.slice(propsAt).matchAll(/\n\s*([a-zA-Z_]+):\s*\{\s*type:/g)) properties[p[1]] = {}
+      }
+      tools.push({
+        type: 'function',
+        function: { name: d.name, description: d.description, parameters: { type: 'object', properties } },
+        // approximate wire size of the real definition
+        _chars: body.replace(/\s+/g, ' ').length,
+      })
+    })
+  }
+  return tools
+}
+
+function main() {
+  const verbose = process.argv.includes('--verbose')
+  const tools = loadTools()
+  const chars = new Map(tools.map(t => [t.function.name, t._chars]))
+  const fullTokens = Math.round([...chars.values()].reduce((a, b) => a + b, 0) / 4)
+  const { cases } = JSON.parse(fs.readFileSync(path.join(__dirname, 'bench-tool-calls.json'), 'utf-8'))
+
+  const coreTokens = Math.round(CORE_TOOL_NAMES.reduce((n, name) => n + (chars.get(name) ?? 0), 0) / 4)
+  const rows = {
+    full: { tokens: 0, hit: 0, recall: 0, n: 0, offered: 0 },
+    current: { tokens: 0, hit: 0, recall: 0, n: 0, offered: 0 },
+    selected: { tokens: 0, hit: 0, recall: 0, n: 0, offered: 0, ms: 0 },
+  }
+  // Share of the acceptable tools in the offered set; a case that needs no tool counts as 1
+  const recallOf = (expect, offered) => expect.length ? expect.filter(offered).length / expect.length : 1
+  const misses = []
+  for (const c of cases) {
+    const tier = c.tier ?? tierOf(c.user)
+    const t0 = process.hrtime.bigint()
+    const sel = selectTools(tools, { message: c.user, tier, always: CORE_TOOL_NAMES })
+    rows.selected.ms += Number(process.hrtime.bigint() - t0) / 1e6
+    const selTokens = Math.round(sel.tools.reduce((n, t) => n + chars.get(t.function.name), 0) / 4)
+    const needsTool = c.expect.length > 0
+    const hit = !needsTool || c.expect.some(name => sel.names.has(name))
+
+    rows.full.n++
+    rows.full.tokens += fullTokens
+    rows.full.offered += tools.length
+    rows.full.hit++ // every tool is offered
+    rows.full.recall++
+    const cur = rows.current
+    cur.n++
+    if (tier === 'conversational') {
+      cur.tokens += coreTokens
+      cur.offered += CORE_TOOL_NAMES.length
+      if (!needsTool || c.expect.some(name => CORE_TOOL_NAMES.includes(name))) cur.hit++
+      cur.recall += recallOf(c.expect, name => CORE_TOOL_NAMES.includes(name))
+    } else {
+      cur.tokens += fullTokens
+      cur.offered += tools.length
+      cur.hit++
+      cur.recall++
+    }
+    rows.selected.n++
+    rows.selected.tokens += selTokens
+    rows.selected.offered += sel.tools.length
+    rows.selected.recall += recallOf(c.expect, name => sel.names.has(name))
+    if (hit) rows.selected.hit++
+    else misses.push({ user: c.user, tier, expect: c.expect })
+    if (verbose) console.log(`${hit ? 'ok  ' : 'MISS'} [${tier}] ${sel.tools.length} tools  ${c.user}`)
+  }
+
+  console.log(`${tools.length} tools (~${fullTokens} schema tokens), ${cases.length} replay cases`)
+  console.log(`${'mode'.padEnd(9)} ${'tools/call'.padStart(11)} ${'tokens/call'.padStart(12)} ${'saved'.padStart(7)} ${'tool offered'.padStart(13)} ${'recall'.padStart(7)} ${'select ms'.padStart(10)}`)
+  for (const [name, r] of Object.entries(rows)) {
+    console.log(`${name.padEnd(9)} ${(r.offered / r.n).toFixed(1).padStart(11)} ${Math.round(r.tokens / r.n).toString().padStart(12)} ` +
+                `${`${Math.round(100 - 100 * r.tokens / rows.full.tokens)}%`.padStart(7)} ${`${r.hit}/${r.n}`.padStart(13)} ${`${Math.round(100 * r.recall / r.n)}%`.padStart(7)} ` +
+                `${(r.ms === undefined ? '-' : (r.ms / r.n).toFixed(3)).padStart(10)}`)
+  }
+  for (const m of misses) console.log(`  miss [${m.tier}] "${m.user}" expected one of ${m.expect.join(', ')}`)
+}
+
+main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env node
+/**
+ * Check: how the chat route ends a forwarded upstream stream.
+ *
+ * Replays upstream SSE bodies through src/lib/sseStream.ts, the wrappers the
+ * chat route returns for its final answer:
+ *   sanitizing   - sanitizingStream with the route's timing event as tail
+ *   passthrough  - passthroughStream with media blocks + timing as tail
+ * Each upstream body ends with its own `data: [DONE]`, also split across
+ * chunks, and the body is cut at every chunk size from 1 to 16 bytes.
+ * The client must see exactly one [DONE]. It must be the last event, and the
+ * timing event must come before it. With timing off, [DONE] must still come
+ * last and only once. Also checks that an XML tool call spread over several
+ * deltas never reaches the client.
+ *
+ * src/lib/sseStream.ts is compiled with the project's `typescript` package,
+ * so this needs node_modules. Exits 1 on any failure.
+ *
+ * Usage:
+ *   node .github/scripts/check_sse_stream.js
+ */
+
+'use strict'
+
+const fs = require('fs')
+const path = require('path')
+const Module = require('module')
+
+const ROOT = path.join(__dirname, '..', '..')
+
+function loadSseStream() {
+  let ts
+  try {
+    ts = require('typescript')
+  } catch (_) {
+    console.error('typescript is not installed - run `npm install` first')
+    process.exit(1)
+  }
+  const file = path.join(ROOT, 'src', 'lib', 'sseStream.ts')
+  const { outputText } = ts.transpileModule(fs.readFileSync(file, 'utf-8'), {
+    compilerOptions: { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2019 },
+  })
+  const m = new Module(file, module)
+  m.filename = file
+  m._compile(outputText, file)
+  return m.exports
+}
+
+const { sanitizingStream, passthroughStream } = loadSseStream()
+
+const delta = content => `data: ${JSON.stringify({ choices: [{ delta: { content } }] })}\n\n`
+const TIMING = `data: ${JSON.stringify({ timing: { totalMs: 12.3, stages: [] } })}\n\n`
+const MEDIA = delta('![image](https://example.com/a.png)')
+
+const UPSTREAM = [
+  ': keep-alive\n\n',
+  delta('Hello'),
+  delta(' from minimax-m2.5'),
+  delta('<minimax:tool_call><invoke name="x">'),
+  delta('<parameter name="a">1</parameter></invoke></minimax:tool_call>'),
+  delta(' world'),
+  'data: [DONE]\n\n',
+].join('')
+
+function body(text, size) {
+  const bytes = new TextEncoder().encode(text)
+  return new ReadableStream({
+    start(controller) {
+      for (let i = 0; i < bytes.length; i += size) controller.enqueue(bytes.slice(i, i + size))
+      controller.close()
+    },
+  })
+}
+
+async function collect(stream) {
+  const reader = stream.getReader()
+  const decoder = new TextDecoder()
+  let out = ''
+  for (;;) {
+    const { done, value } = await reader.read()
+    if (done) return out + decoder.decode()
+    out += decoder.decode(value, { stream: true })
+  }
+}
+
+/** What a client sees: the data payloads in order */
+function events(text) {
+  return text.split('\n').filter(l => l.startsWith('data: ')).map(l => l.slice(6))
+}
+
+function orderProblems(out, withTiming) {
+  const ev = events(out)
+  const problems = []
+  const dones = ev.filter(e => e === '[DONE]').length
+  if (dones !== 1) problems.push(`${dones} [DONE] events`)
+  if (ev[ev.length - 1] !== '[DONE]') problems.push('[DONE] is not the last event')
+  const timingAt = ev.findIndex(e => e.startsWith('{"timing"'))
+  if (withTiming && timingAt === -1) problems.push('no timing event')
+  if (withTiming && timingAt > ev.indexOf('[DONE]')) problems.push('timing after [DONE]')
+  if (!withTiming && timingAt !== -1) problems.push('timing event sent with timing off')
+  return problems
+}
+
+async function main() {
+  const failures = []
+  let cases = 0
+  for (let size = 1; size <= 16; size++) {
+    for (const withTiming of [true, false]) {
+      const tail = () => (withTiming ? TIMING : '')
+      const sanitized = await collect(sanitizingStream(body(UPSTREAM, size), { tail }))
+      const problems = orderProblems(sanitized, withTiming)
+      if (/minimax:tool_call|<invoke|<parameter/.test(sanitized)) problems.push('XML tool call reached the client')
+      if (/minimax-m2/.test(sanitized)) problems.push('model name reached the client')
+      for (const p of problems) failures.push(`sanitizing, ${size}-byte chunks, timing ${withTiming ? 'on' : 'off'}: ${p}`)
+
+      const passed = await collect(passthroughStream(body(UPSTREAM, size), { tail: () => MEDIA + tail() }))
+      const passProblems = orderProblems(passed, withTiming)
+      const ev = events(passed)
+      if (ev.indexOf(MEDIA.slice(6, -2)) === -1 || ev.indexOf(MEDIA.slice(6, -2)) > ev.indexOf('[DONE]')) passProblems.push('media not before [DONE]')
+      for (const p of passProblems) failures.push(`passthrough, ${size}-byte chunks, timing ${withTiming ? 'on' : 'off'}: ${p}`)
+      cases += 2
+    }
+  }
+
+  // An upstream body that ends without a trailing newline still ends with our [DONE]
+  const unterminated = await collect(sanitizingStream(body(delta('x') + 'data: [DONE]', 5), { tail: () => TIMING }))
+  for (const p of orderProblems(unterminated, true)) failures.push(`sanitizing, [DONE] without newline: ${p}`)
+  cases++
+
+  if (failures.length) {
+    for (const f of failures) console.log(`FAIL: ${f}`)
+    process.exit(1)
+  }
+  console.log(`${cases} streams: one [DONE], last, after the timing event (and the media blocks on passthrough)`)
+}
+
+main().catch(err => { console.error(err); process.exit(1) })
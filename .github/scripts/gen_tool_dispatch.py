@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Generate src/lib/sprint-dispatch.ts from the sprint tool files.
+
+Reads every src/lib/sprintN-tools.ts (SPARKIE_TOOLS_SN definitions) and
+src/lib/sprintN-cases.ts (executeSprintNTool handlers) and emits:
+
+  SPRINT_TOOL_HANDLERS  - Map<tool name, handler>, so executeTool's default
+                          branch does one lookup instead of awaiting every
+                          sprint handler in turn
+  SPRINT_CHIP_LABELS    - task_chip labels
+  SPRINT_WORKLOG_LABELS - worklog step labels
+  SPRINT_STEP_ICONS     - step_trace icons
+
+Handlers are matched on their `case '...'` names, so tools a sprint handles
+without defining (e.g. composio_get_tool_schemas) dispatch too. When two
+sprints handle the same name the lower sprint wins, as it did in the old
+await chain. Labels come from LABELS below; tools without an entry get
+labels derived from their name and are reported.
+
+Usage:
+  python3 .github/scripts/gen_tool_dispatch.py          # write the file
+  python3 .github/scripts/gen_tool_dispatch.py --check  # exit 1 if stale
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+
+LIB = 'src/lib'
+OUT = os.path.join(LIB, 'sprint-dispatch.ts')
+
+# tool name -> (chip label, worklog step label, step icon)
+LABELS = {
+    # Sprint 2
+    'get_schema': ('Reading DB schema...', 'Reading database schema', 'database'),
+    'get_deployment_history': ('Pulling deploy history...', 'Pulling deployment history', 'rocket'),
+    'search_github': ('Searching codebase...', 'Searching the repository', 'search'),
+    'create_calendar_event': ('Drafting calendar event...', 'Drafting calendar event for approval', 'calendarToday'),
+    'transcribe_audio': ('Transcribing audio...', 'Transcribing audio', 'mic'),
+    'text_to_speech': ('Synthesizing speech...', 'Running the tool — text to speech', 'mic'),
+    # Sprint 3
+    'execute_script': ('Running script...', 'Running script', 'code'),
+    'npm_run': ('Running npm...', 'Running npm command', 'terminal'),
+    'git_ops': ('Running git ops...', 'Running git operation', 'git'),
+    'delete_memory': ('Pruning memory...', 'Deleting memory entry', 'trash'),
+    'run_tests': ('Running tests...', 'Running test suite', 'check'),
+    'check_lint': ('Checking lint...', 'Running lint check', 'alert'),
+    # Sprint 4
+    'read_email_thread': ('Reading thread...', 'Reading email thread', 'mail'),
+    'manage_email': ('Managing email...', 'Managing email', 'mail'),
+    'rsvp_event': ('Sending RSVP...', 'RSVPing to event', 'calendar'),
+    'manage_calendar_event': ('Updating calendar...', 'Managing calendar event', 'calendar'),
+    'analyze_file': ('Analyzing file...', 'Analyzing file', 'file'),
+    'fetch_url': ('Fetching URL...', 'Fetching URL', 'globe'),
+    'research': ('Researching...', 'Researching topic', 'search'),
+    # Sprint 5
+    'composio_discover': ('Discovering tools...', 'Searching Composio tools', 'search'),
+    'composio_execute': ('Running connected app...', 'Running the tool — connected app action', 'zap'),
+    'composio_get_tool_schemas': ('Reading tool schemas...', 'Reading Composio tool schemas', 'file'),
+    'composio_multi_execute_tool': ('Running connected apps...', 'Running the tool — connected app actions', 'zap'),
+    'COMPOSIO_SEARCH_TOOLS': ('Discovering tools...', 'Searching Composio tools', 'search'),
+    'COMPOSIO_MANAGE_CONNECTIONS': ('Checking connections...', 'Managing app connections', 'zap'),
+    'manage_topic': ('Managing topic context...', 'Managing topic', 'brain'),
+    'link_to_topic': ('Linking to topic...', 'Linking to topic', 'brain'),
+    'topic_search': ('Searching topics...', 'Searching topics', 'search'),
+    'manage_contact': ('Updating contacts...', 'Managing contact', 'brain'),
+    'save_user_memory': ('Memory recalled', 'Saving to memory', 'brain'),
+    'search_user_memory': ('Memory recalled', 'Searching memory', 'brain'),
+    'chat_history_search': ('Memory recalled', 'Searching chat history', 'search'),
+    'run_workbench': ('Running workbench...', 'Running workbench script', 'code'),
+    'github_push_commit': ('Pushing commit...', 'Pushing commit to GitHub', 'git'),
+    'github_open_pr': ('Opening pull request...', 'Opening pull request', 'git'),
+}
+
+# executeSprintNTool parameter name -> expression in the generated adapter
+PARAM_EXPR = {
+    'name': 'name',
+    'args': 'args',
+    'userId': 'ctx.userId',
+    'baseUrl': 'ctx.baseUrl',
+    'executeConnector': 'ctx.executeConnectorTool',
+    'composioApiKey': 'ctx.composioApiKey',
+}
+
+DEF_RE = re.compile(r"export const (SPARKIE_TOOLS_S\d+)\s*=")
+TOOL_RE = re.compile(r"function:\s*\{\s*name:\s*'([A-Za-z0-9_]+)'")
+FN_RE = re.compile(r"export async function (executeSprint(\d+)Tool)\(")
+CASE_RE = re.compile(r"^\s*case '([A-Za-z0-9_]+)':", re.M)
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def signature_at(src, open_paren):
+    """Text between the parenthesis at open_paren and its matching close."""
+    depth = 0
+    for i in range(open_paren, len(src)):
+        if src[i] == '(':
+            depth += 1
+        elif src[i] == ')':
+            depth -= 1
+            if depth == 0:
+                return src[open_paren + 1:i]
+    raise SystemExit('unbalanced parameter list')
+
+
+def param_names(signature):
+    """Top-level parameter names of a TS signature (ignores nested parens)."""
+    names, depth, token = [], 0, ''
+    for ch in signature:
+        if ch in '(<{[':
+            depth += 1
+        elif ch in ')}]' or (ch == '>' and not token.endswith('=')):
+            depth -= 1
+        if ch == ',' and depth == 0:
+            names.append(token)
+            token = ''
+        else:
+            token += ch
+    names.append(token)
+    return [n.split(':')[0].strip().rstrip('?') for n in names if n.strip()]
+
+
+def collect(root):
+    sprints, warnings = [], []
+    for cases_path in sorted(glob.glob(os.path.join(root, LIB, 'sprint*-cases.ts')),
+                             key=lambda p: int(re.search(r'sprint(\d+)-', p).group(1))):
+        src = read(cases_path)
+        fn = FN_RE.search(src)
+        if not fn:
+            raise SystemExit(f'{cases_path}: no executeSprintNTool export found')
+        fn_name, num, sig = fn.group(1), int(fn.group(2)), signature_at(src, fn.end() - 1)
+        params = param_names(sig)
+        unknown = [p for p in params if p not in PARAM_EXPR]
+        if unknown:
+            raise SystemExit(f'{cases_path}: {fn_name} has unmapped parameters {unknown} - extend PARAM_EXPR')
+
+        tools_path = os.path.join(root, LIB, f'sprint{num}-tools.ts')
+        defined = []
+        if os.path.exists(tools_path):
+            tsrc = read(tools_path)
+            if not DEF_RE.search(tsrc):
+                warnings.append(f'{tools_path}: no SPARKIE_TOOLS_S{num} export')
+            defined = TOOL_RE.findall(tsrc)
+        cases = list(dict.fromkeys(CASE_RE.findall(src)))
+        for t in defined:
+            if t not in cases:
+                warnings.append(f'{t} is defined in sprint{num}-tools.ts but has no case in {fn_name}')
+        sprints.append({'num': num, 'fn': fn_name, 'params': params, 'cases': cases, 'defined': defined})
+    return sprints, warnings
+
+
+def ts_str(s):
+    return "'" + s.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+
+def derived_labels(name):
+    words = name.lower().replace('_', ' ')
+    return (f'Running {words}...', f'Running — {words}', 'zap')
+
+
+def render(sprints, warnings):
+    owner = {}
+    for sp in sprints:
+        for name in sp['cases']:
+            if name in owner:
+                warnings.append(f"{name} is handled by sprint {owner[name]} and sprint {sp['num']}; sprint {owner[name]} wins")
+                continue
+            owner[name] = sp['num']
+
+    names = list(owner)
+    labels = {}
+    for name in names:
+        if name in LABELS:
+            labels[name] = LABELS[name]
+        else:
+            labels[name] = derived_labels(name)
+            warnings.append(f'{name} has no LABELS entry; using derived labels')
+
+    out = [
+        '// AUTO-GENERATED by .github/scripts/gen_tool_dispatch.py — do not edit by hand.',
+        '// Re-run the generator after adding a tool to any src/lib/sprintN-tools.ts / sprintN-cases.ts.',
+        '',
+    ]
+    for sp in sprints:
+        out.append(f"import {{ {sp['fn']} }} from '@/lib/sprint{sp['num']}-cases'")
+    out += [
+        '',
+        'export interface SprintToolContext {',
+        '  userId: string | null',
+        '  baseUrl: string',
+        '  executeConnectorTool: (slug: string, args: Record<string, unknown>, uid: string) => Promise<string>',
+        '  composioApiKey: string',
+        '}',
+        '',
+        'export type SprintToolHandler = (',
+        '  name: string,',
+        '  args: Record<string, unknown>,',
+        '  ctx: SprintToolContext',
+        ') => Promise<string | null>',
+        '',
+    ]
+    for sp in sprints:
+        call_args = ', '.join(PARAM_EXPR[p] for p in sp['params'])
+        out.append(f"const s{sp['num']}: SprintToolHandler = (name, args, ctx) => {sp['fn']}({call_args})")
+    out += ['', '// One lookup per tool call instead of awaiting each sprint handler in turn.',
+            'export const SPRINT_TOOL_HANDLERS = new Map<string, SprintToolHandler>([']
+    for name in names:
+        out.append(f"  [{ts_str(name)}, s{owner[name]}],")
+    out += ['])', '']
+
+    for const, idx in (('SPRINT_CHIP_LABELS', 0), ('SPRINT_WORKLOG_LABELS', 1), ('SPRINT_STEP_ICONS', 2)):
+        out.append(f'export const {const}: Record<string, string> = {{')
+        for name in names:
+            key = name if re.match(r'^[A-Za-z_]\w*$', name) else ts_str(name)
+            out.append(f'  {key}: {ts_str(labels[name][idx])},')
+        out += ['}', '']
+    return '\n'.join(out)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--check', action='store_true', help='exit 1 if the generated file is out of date')
+    ap.add_argument('--root', default='.')
+    args = ap.parse_args()
+
+    sprints, warnings = collect(args.root)
+    text = render(sprints, warnings)
+    for w in warnings:
+        print(f'WARN: {w}')
+
+    out_path = os.path.join(args.root, OUT)
+    current = read(out_path) if os.path.exists(out_path) else None
+    if args.check:
+        if current != text:
+            print(f'{OUT} is out of date - run gen_tool_dispatch.py')
+            sys.exit(1)
+        print(f'{OUT} is up to date')
+        return
+    if current == text:
+        print(f'{OUT} unchanged')
+        return
+    with open(out_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    total = sum(len(sp['cases']) for sp in sprints)
+    print(f"Wrote {OUT}: {total} handlers across {len(sprints)} sprints")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI-compatible stand-in for the MiniMax API, used by bench_chat.py.
+
+Point the app at it with MINIMAX_BASE_URL=http://127.0.0.1:<port>. It serves
+  POST /v1/chat/completions       - JSON or SSE stream, scripted replies
+  POST /anthropic/v1/messages     - short canned text (memory extraction etc.)
+  GET  /_stats                    - calls per bench request tag, faults, peak streams
+  POST /_reset                    - clear the counters
+
+Replies are picked from a conversation script (see bench-conversations.json).
+bench_chat.py tags each user message with `[bench:<conv>/<turn>/<seq>]`; the
+stub looks the turn up in the script and counts the assistant tool rounds
+already in the payload to decide which step to answer with:
+
+  request carries `tools`  -> steps[rounds so far] (tool_calls or text)
+  request without `tools`  -> the turn's final text step
+
+Untagged requests (summaries, classifiers) get a one-line default reply.
+
+Timing is deterministic for a given --seed: the jitter for a reply is drawn
+from an RNG seeded with (seed, tag, round), not from arrival order, so two
+runs of the same script see the same latencies at any concurrency. A step
+can override the server defaults and inject faults:
+
+  {"text": "...", "ttft_ms": 2500, "tokens_per_s": 20}
+  {"tool_calls": [{"name": "a", "arguments": {}}, {"name": "b", "arguments": {}}]}
+  {"fault": "timeout"}              - accept, then never answer (--hang-s)
+  {"fault": "reset"}                - close the socket mid-reply
+  {"fault": 503, "text": "..."}     - that status with an error body
+
+--error-rate / --timeout-rate inject the same faults at random (seeded) into
+any tagged reply. Everything runs on one asyncio loop with no per-request
+threads; `selfbench` checks it holds the configured TTFT with hundreds of
+concurrent streams before it is trusted as an upstream.
+
+Usage:
+  python3 .github/scripts/llm_stub.py --script .github/scripts/bench-conversations.json --port 18080
+  python3 .github/scripts/llm_stub.py selfbench --streams 500
+"""
+import argparse
+import asyncio
+import collections
+import json
+import os
+import random
+import re
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+TAG_RE = re.compile(r'\[bench:([\w.-]+)/(\d+)/(\d+)\]')
+TOKEN_RE = re.compile(r'\S+\s*|\s+')
+DEFAULT_TEXT = 'Okay.'
+REASONS = {200: 'OK', 404: 'Not Found', 429: 'Too Many Requests', 500: 'Internal Server Error',
+           502: 'Bad Gateway', 503: 'Service Unavailable', 504: 'Gateway Timeout'}
+
+
+class Script:
+    """Conversation script indexed by (conversation name, turn index)."""
+
+    def __init__(self, path=None):
+        self.turns = {}
+        if path:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for conv in data['conversations']:
+                for i, turn in enumerate(conv['turns']):
+                    self.turns[(conv['name'], i)] = turn['steps']
+
+    def step(self, conv, turn, rounds, with_tools):
+        steps = self.turns.get((conv, turn))
+        if not steps:
+            return {'text': DEFAULT_TEXT}
+        if with_tools and rounds < len(steps):
+            return steps[rounds]
+        texts = [s for s in steps if 'text' in s and 'fault' not in s]
+        return texts[-1] if texts else {'text': DEFAULT_TEXT}
+
+
+def find_tag(messages):
+    for m in reversed(messages or []):
+        if m.get('role') != 'user':
+            continue
+        content = m.get('content')
+        if isinstance(content, list):
+            content = ' '.join(p.get('text', '') for p in content if isinstance(p, dict))
+        hit = TAG_RE.search(content or '')
+        if hit:
+            return hit.group(1), int(hit.group(2)), hit.group(3)
+    return None
+
+
+def tool_rounds(messages):
+    """Assistant tool_call messages after the last user message."""
+    rounds = 0
+    for m in reversed(messages or []):
+        if m.get('role') == 'user':
+            break
+        if m.get('role') == 'assistant' and m.get('tool_calls'):
+            rounds += 1
+    return rounds
+
+
+def tool_call_objects(step, seq):
+    return [{
+        'id': f'call_{seq}_{i}',
+        'type': 'function',
+        'function': {'name': c['name'], 'arguments': json.dumps(c.get('arguments', {}))},
+    } for i, c in enumerate(step['tool_calls'])]
+
+
+def loop_lag(samples):
+    ordered = sorted(samples)
+    if not ordered:
+        return {'p50': 0, 'p99': 0, 'max': 0}
+    return {'p50': ordered[len(ordered) // 2], 'p99': ordered[int(len(ordered) * 0.99)], 'max': ordered[-1]}
+
+
+class Reply:
+    """Timing and fault plan for one reply, fixed before anything is sent."""
+
+    def __init__(self, stub, step, key, tagged):
+        rng = random.Random(f'{stub.seed}:{key}')
+        jitter = stub.jitter
+        self.ttft = max(0.0, step.get('ttft_ms', stub.ttft_ms) / 1000 * (1 + rng.uniform(-jitter, jitter)))
+        rate = step.get('tokens_per_s', stub.tokens_per_s)
+        self.token_delay = 1 / rate if rate > 0 else 0
+        self.jitter_rng, self.jitter = rng, jitter
+        self.fault = step.get('fault')
+        if self.fault is None and tagged:
+            roll = rng.random()
+            if roll < stub.timeout_rate:
+                self.fault = 'timeout'
+            elif roll < stub.timeout_rate + stub.error_rate:
+                self.fault = stub.error_status
+
+    def token_sleep(self):
+        if not self.token_delay:
+            return 0
+        return self.token_delay * (1 + self.jitter_rng.uniform(-self.jitter, self.jitter))
+
+
+class Stub:
+    def __init__(self, script, args):
+        self.script = script
+        self.ttft_ms = args.ttft_ms
+        self.tokens_per_s = args.tokens_per_s
+        self.jitter = args.jitter
+        self.seed = args.seed
+        self.error_rate = args.error_rate
+        self.timeout_rate = args.timeout_rate
+        self.error_status = args.error_status
+        self.hang_s = args.hang_s
+        self.min_tick = args.min_tick_ms / 1000
+        self.started = time.time()
+        self.reset()
+
+    def reset(self):
+        self.lag = collections.deque(maxlen=20000)
+        self.calls = {}
+        self.faults = {}
+        self.active = 0
+        self.peak = 0
+        self.served = 0
+
+    # ── HTTP plumbing ────────────────────────────────────────────────────────
+
+    async def handle(self, reader, writer):
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            while True:
+                head = await reader.readuntil(b'\r\n\r\n')
+                lines = head.decode('latin-1').split('\r\n')
+                method, path, _ = lines[0].split(' ', 2)
+                headers = {}
+                for line in lines[1:]:
+                    if ':' in line:
+                        k, v = line.split(':', 1)
+                        headers[k.strip().lower()] = v.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                keep = await self.route(method, path.split('?')[0], body, writer)
+                if not keep or headers.get('connection', '').lower() == 'close':
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            try:
+                writer.close()
+            except Exception:
+                pass
+
+    async def send_json(self, writer, status, obj):
+        data = json.dumps(obj).encode()
+        writer.write(f'HTTP/1.1 {status} {REASONS.get(status, "Error")}\r\nContent-Type: application/json\r\n'
+                     f'Content-Length: {len(data)}\r\n\r\n'.encode() + data)
+        await writer.drain()
+        return True
+
+    async def start_sse(self, writer):
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n'
+                     b'Cache-Control: no-cache\r\nTransfer-Encoding: chunked\r\n\r\n')
+
+    async def send_event(self, writer, payload):
+        data = b'data: ' + (payload if isinstance(payload, bytes) else json.dumps(payload).encode()) + b'\n\n'
+        writer.write(b'%x\r\n%s\r\n' % (len(data), data))
+        # Only yield to the transport when the peer is actually behind
+        if writer.transport.get_write_buffer_size() > 65536:
+            await writer.drain()
+
+    async def paced(self, writer, events, reply):
+        """Send events on the reply's token schedule.
+
+        Each event has a due time; every wake-up writes all events already due
+        and sleeps at least --min-tick-ms, so a stream costs one timer per tick
+        rather than per token and falls behind in bursts, as real upstreams do.
+        """
+        due, t = [], time.perf_counter()
+        for _ in events:
+            t += reply.token_sleep()
+            due.append(t)
+        i = 0
+        while i < len(events):
+            now = time.perf_counter()
+            while i < len(events) and due[i] <= now:
+                await self.send_event(writer, events[i])
+                i += 1
+            if i < len(events):
+                await asyncio.sleep(max(self.min_tick, due[i] - now))
+
+    async def end_sse(self, writer):
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+
+    async def route(self, method, path, body, writer):
+        if method == 'GET' and path == '/_stats':
+            return await self.send_json(writer, 200, {
+                'calls': self.calls, 'faults': self.faults, 'served': self.served,
+                'active': self.active, 'peak_active': self.peak, 'uptime_s': time.time() - self.started,
+                'loop_lag_ms': loop_lag(self.lag)})
+        if method == 'POST' and path == '/_reset':
+            self.reset()
+            return await self.send_json(writer, 200, {'ok': True})
+        if method == 'POST' and path.endswith('/chat/completions'):
+            return await self.tracked(self.chat(json.loads(body or b'{}'), writer))
+        if method == 'POST' and path.endswith('/messages'):
+            return await self.tracked(self.anthropic(writer))
+        return await self.send_json(writer, 404, {'error': f'no stub for {method} {path}'})
+
+    async def watch_loop(self, interval=0.01):
+        """Record how late the event loop wakes up - the stub's own queueing delay."""
+        while True:
+            t0 = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.lag.append((time.perf_counter() - t0 - interval) * 1000)
+
+    async def tracked(self, coro):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            return await coro
+        finally:
+            self.active -= 1
+            self.served += 1
+
+    # ── Endpoints ────────────────────────────────────────────────────────────
+
+    async def chat(self, payload, writer):
+        messages = payload.get('messages') or []
+        tag = find_tag(messages)
+        with_tools = bool(payload.get('tools'))
+        rounds = tool_rounds(messages)
+        if tag:
+            conv, turn, seq = tag
+            self.calls[seq] = self.calls.get(seq, 0) + 1
+            step = self.script.step(conv, turn, rounds, with_tools)
+            key = f'{seq}:{rounds}:{self.calls[seq]}'
+        else:
+            seq, step, key = 'untagged', {'text': DEFAULT_TEXT}, f'untagged:{self.served}'
+        if 'tool_calls' in step and not with_tools:
+            step = {'text': DEFAULT_TEXT}
+
+        reply = Reply(self, step, key, bool(tag))
+        if reply.fault is not None:
+            self.faults[str(reply.fault)] = self.faults.get(str(reply.fault), 0) + 1
+            return await self.inject(writer, reply)
+        await asyncio.sleep(reply.ttft)
+        if payload.get('stream'):
+            return await self.stream_step(writer, step, seq, reply)
+        return await self.json_step(writer, step, seq, reply)
+
+    async def inject(self, writer, reply):
+        if reply.fault == 'timeout':
+            # Hold the connection open without a byte, like an upstream that stalls
+            await asyncio.sleep(self.hang_s)
+            return False
+        await asyncio.sleep(reply.ttft)
+        if reply.fault == 'reset':
+            writer.transport.abort()
+            return False
+        status = int(reply.fault)
+        await self.send_json(writer, status, {'error': {'message': f'stub injected {status}', 'type': 'stub_fault'}})
+        return True
+
+    async def json_step(self, writer, step, seq, reply):
+        message = {'role': 'assistant', 'content': step.get('text', '')}
+        finish = 'stop'
+        if 'tool_calls' in step:
+            message['tool_calls'] = tool_call_objects(step, seq)
+            finish = 'tool_calls'
+        else:
+            # Non-streamed replies still take as long as generating the text would
+            await asyncio.sleep(sum(reply.token_sleep() for _ in TOKEN_RE.findall(message['content'])))
+        return await self.send_json(writer, 200, {
+            'id': f'chatcmpl-{seq}', 'object': 'chat.completion', 'created': int(time.time()),
+            'model': 'stub', 'choices': [{'index': 0, 'message': message, 'finish_reason': finish}],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': len(TOKEN_RE.findall(message['content']))},
+        })
+
+    async def stream_step(self, writer, step, seq, reply):
+        await self.start_sse(writer)
+
+        def chunk(delta, finish=None):
+            return {'id': f'chatcmpl-{seq}', 'object': 'chat.completion.chunk', 'model': 'stub',
+                    'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish}]}
+
+        if 'tool_calls' in step:
+            # Same shape as OpenAI: id/name first, then the arguments in fragments
+            await self.send_event(writer, chunk({'role': 'assistant', 'content': None}))
+            for i, c in enumerate(tool_call_objects(step, seq)):
+                head = {'index': i, 'id': c['id'], 'type': 'function',
+                        'function': {'name': c['function']['name'], 'arguments': ''}}
+                await self.send_event(writer, chunk({'tool_calls': [head]}))
+                args = c['function']['arguments']
+                for j in range(0, len(args), 16):
+                    await self.send_event(writer, chunk({'tool_calls': [{'index': i, 'function': {'arguments': args[j:j + 16]}}]}))
+                    await asyncio.sleep(reply.token_sleep())
+            await self.send_event(writer, chunk({}, 'tool_calls'))
+        else:
+            tokens = TOKEN_RE.findall(step.get('text', ''))
+            if tokens:
+                await self.send_event(writer, chunk({'role': 'assistant', 'content': tokens[0]}))
+            # Pre-encoded frame halves: one json.dumps per token instead of per chunk object
+            prefix, suffix = json.dumps(chunk({'content': ''})).split('""', 1)
+            prefix, suffix = prefix.encode(), suffix.encode()
+            await self.paced(writer, [prefix + json.dumps(tok).encode() + suffix for tok in tokens[1:]], reply)
+            await self.send_event(writer, chunk({}, 'stop'))
+        await self.send_event(writer, b'[DONE]')
+        await self.end_sse(writer)
+        return True
+
+    async def anthropic(self, writer):
+        await asyncio.sleep(self.ttft_ms / 1000)
+        return await self.send_json(writer, 200, {
+            'id': 'msg_stub', 'type': 'message', 'role': 'assistant', 'model': 'stub',
+            'content': [{'type': 'text', 'text': '[]'}], 'stop_reason': 'end_turn',
+            'usage': {'input_tokens': 0, 'output_tokens': 1},
+        })
+
+
+async def start(args):
+    stub = Stub(Script(args.script), args)
+    server = await asyncio.start_server(stub.handle, args.host, args.port, backlog=args.backlog)
+    stub.lag_task = asyncio.ensure_future(stub.watch_loop())
+    return stub, server
+
+
+async def serve(args):
+    _stub, server = await start(args)
+    print(f'llm_stub listening on http://{args.host}:{args.port}', flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+# ── Self-benchmark ───────────────────────────────────────────────────────────
+
+def _client_shard(port, first, count, timeout):
+    """One client process: `count` concurrent streams, tags first..first+count-1."""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from bench_chat import post_stream  # noqa: E402
+
+    async def one(i):
+        msg = {'stream': True, 'messages': [{'role': 'user', 'content': f'selfbench [bench:selfbench/0/{i}]'}]}
+        return await post_stream(port, '/v1/chat/completions', {'Connection': 'close'}, msg, timeout)
+
+    async def shard():
+        return await asyncio.gather(*(one(i) for i in range(first, first + count)))
+
+    return asyncio.run(shard())
+
+
+def selfbench(args):
+    """--streams concurrent SSE replies from a stub process, driven by --clients processes.
+
+    The verdict comes from the stub's own event-loop lag: client-side TTFT
+    also includes the clients' parsing time, which is not the stub's cost.
+    """
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from bench_chat import free_port, http_json, stop, summarize, wait_http  # noqa: E402
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < 4 * args.streams:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(hard, 4 * args.streams), hard))
+    script = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+    json.dump({'conversations': [{'name': 'selfbench', 'turns': [
+        {'user': 'selfbench', 'steps': [{'text': ' '.join(['token'] * args.tokens)}]}]}]}, script)
+    script.close()
+
+    port = free_port()
+    cmd = [sys.executable, os.path.abspath(__file__), '--port', str(port), '--script', script.name,
+           '--ttft-ms', str(args.ttft_ms), '--tokens-per-s', str(args.tokens_per_s), '--jitter', str(args.jitter),
+           '--min-tick-ms', str(args.min_tick_ms)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, start_new_session=True)
+    try:
+        wait_http(f'http://127.0.0.1:{port}/_stats', 15, proc)
+        http_json(f'http://127.0.0.1:{port}/_reset', 'POST')
+        per = -(-args.streams // args.clients)
+        t0 = time.perf_counter()
+        with ProcessPoolExecutor(args.clients) as pool:
+            futures = [pool.submit(_client_shard, port, i * per, min(per, args.streams - i * per), 120)
+                       for i in range(args.clients) if i * per < args.streams]
+            results = [r for f in futures for r in f.result()]
+        wall = time.perf_counter() - t0
+        stats = http_json(f'http://127.0.0.1:{port}/_stats')
+    finally:
+        stop(proc)
+        os.unlink(script.name)
+
+    ok = [r for r in results if r['status'] == 200 and not r['error']]
+    ttft = summarize([r['ttft_ms'] for r in ok])
+    total = summarize([r['total_ms'] for r in ok])
+    lag = stats['loop_lag_ms']
+    ideal_total = args.ttft_ms + (args.tokens * 1000 / args.tokens_per_s if args.tokens_per_s else 0)
+    print(f'{args.streams} streams x {args.tokens} tokens in {wall:.2f}s over {args.clients} client processes, '
+          f'{len(results) - len(ok)} failed, stub peak {stats["peak_active"]} concurrent')
+    print(f'client ttft_ms   p50 {ttft["p50"]:.0f}  p95 {ttft["p95"]:.0f}  p99 {ttft["p99"]:.0f}  (configured {args.ttft_ms:.0f})')
+    print(f'client total_ms  p50 {total["p50"]:.0f}  p95 {total["p95"]:.0f}  p99 {total["p99"]:.0f}  (ideal {ideal_total:.0f})')
+    print(f'stub loop lag ms p50 {lag["p50"]:.1f}  p99 {lag["p99"]:.1f}  max {lag["max"]:.1f}')
+    if (os.cpu_count() or 1) < 2:
+        print('note: single CPU - the clients compete with the stub, so lag is overstated')
+    if len(ok) < len(results) or lag['p99'] > args.max_overhead_ms:
+        print(f'FAIL: stub loop lag p99 above {args.max_overhead_ms:.0f} ms - it would skew the benchmark')
+        return 1
+    print('OK')
+    return 0
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    ap.add_argument('mode', nargs='?', choices=('serve', 'selfbench'), default='serve')
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=18080)
+    ap.add_argument('--script', help='conversation script JSON')
+    ap.add_argument('--ttft-ms', type=float, default=300, help='delay before the first byte of every reply')
+    ap.add_argument('--tokens-per-s', type=float, default=80, help='streamed text rate (0 = no delay)')
+    ap.add_argument('--jitter', type=float, default=0.2, help='+/- fraction applied to TTFT and each token delay')
+    ap.add_argument('--seed', default='sparkie', help='jitter and random-fault seed')
+    ap.add_argument('--error-rate', type=float, default=0, help='fraction of tagged replies answered with --error-status')
+    ap.add_argument('--error-status', type=int, default=503)
+    ap.add_argument('--timeout-rate', type=float, default=0, help='fraction of tagged replies that never answer')
+    ap.add_argument('--hang-s', type=float, default=600, help='how long a timeout fault holds the connection')
+    ap.add_argument('--min-tick-ms', type=float, default=20, help='shortest sleep between streamed writes')
+    ap.add_argument('--backlog', type=int, default=2048)
+    selfb = ap.add_argument_group('selfbench')
+    selfb.add_argument('--streams', type=int, default=500)
+    selfb.add_argument('--tokens', type=int, default=200)
+    selfb.add_argument('--clients', type=int, default=os.cpu_count() or 4, help='client processes')
+    selfb.add_argument('--max-overhead-ms', type=float, default=20, help='allowed stub loop lag p99')
+    args = ap.parse_args(argv)
+    return args
+
+
+if __name__ == '__main__':
+    opts = parse_args()
+    try:
+        if opts.mode == 'selfbench':
+            sys.exit(selfbench(opts))
+        asyncio.run(serve(opts))
+    except KeyboardInterrupt:
+        pass
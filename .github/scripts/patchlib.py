@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Shared patch engine for the .github/scripts patch passes.
+
+A pass is a list of (old, new, desc) tuples, same shape the scripts have
+always used. Instead of `old in content` + `content.replace(old, new, 1)`
+per patch (two full scans and a full string rebuild each), the engine:
+
+  1. locates every anchor against the untouched original content,
+  2. validates the plan (missing / ambiguous / overlapping anchors),
+  3. writes every replacement into one output buffer.
+
+Large passes (AC_THRESHOLD anchors or more) are located with one
+Aho-Corasick scan of the file. Below that, per-anchor str.find is cheaper:
+it runs in C, while the automaton walks the text in Python - see
+bench_patchlib.py for the crossover on route.ts.
+
+Anchors are matched against the ORIGINAL content, so a patch can no longer
+depend on text inserted by an earlier patch in the same pass - split such
+passes in two.
+
+Multi-file passes go through apply_patch_set(): every file is read, checked
+and rendered in parallel worker processes, and only if ALL of them succeed
+are the results committed - temp file + fsync + rename per file, with the
+already-renamed files restored if a later rename fails. A bad anchor in one
+file therefore never leaves the others half-patched.
+
+run_pass() adds an applied-patch manifest (patch-manifest.json): each patch
+is identified by a hash of (old, new) and each file by the sha256 it had
+after the pass. Re-runs skip recorded patches - a file whose hash still
+matches is not even scanned - and `--check` reports which patches are
+pending, applied or conflicting without touching anything. Patches wrapped in
+optional() are skipped instead of failing when neither their anchor nor their
+replacement is present.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Anchor count at which a single Aho-Corasick scan beats per-anchor str.find
+# on the 550 KB route.ts (measured with bench_patchlib.py).
+AC_THRESHOLD = 500
+
+
+class PatchError(Exception):
+    """Raised when a pass cannot be applied cleanly. `problems` lists why."""
+
+    def __init__(self, path, problems):
+        self.path = path
+        self.problems = problems
+        super().__init__(f'{path}: ' + '; '.join(problems))
+
+
+class AnchorAutomaton:
+    """Aho-Corasick automaton over a fixed set of literal anchors."""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for idx, pat in enumerate(self.patterns):
+            if not pat:
+                raise ValueError(f'anchor {idx + 1} is empty')
+            state = 0
+            for ch in pat:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] = self._out[state] + (idx,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def scan(self, text):
+        """Return, per pattern, the list of start offsets where it occurs."""
+        hits = [[] for _ in self.patterns]
+        lengths = [len(p) for p in self.patterns]
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for pos, ch in enumerate(text):
+            node = goto[state]
+            while state and ch not in node:
+                state = fail[state]
+                node = goto[state]
+            state = node.get(ch, 0)
+            if out[state]:
+                end = pos + 1
+                for idx in out[state]:
+                    hits[idx].append(end - lengths[idx])
+        return hits
+
+
+def locate_anchors(content, anchors):
+    """
+    Return, per anchor, its start offsets. Only the first two offsets are
+    guaranteed - enough to tell unique from ambiguous.
+    """
+    anchors = list(anchors)
+    if len(anchors) >= AC_THRESHOLD:
+        return AnchorAutomaton(anchors).scan(content)
+    hits = []
+    for old in anchors:
+        if not old:
+            raise ValueError(f'anchor {len(hits) + 1} is empty')
+        first = content.find(old)
+        if first < 0:
+            hits.append([])
+            continue
+        second = content.find(old, first + 1)
+        hits.append([first] if second < 0 else [first, second])
+    return hits
+
+
+def plan_patches(content, patches, path='<content>'):
+    """
+    Locate every anchor and return (spans, warnings). Nothing is rebuilt.
+
+    spans are (start, end, new, index) sorted by start. An anchor that occurs
+    more than once keeps str.replace(old, new, 1) semantics (first occurrence
+    wins) but is reported as ambiguous. Missing anchors and anchors whose
+    chosen spans overlap raise PatchError.
+    """
+    hits = locate_anchors(content, (old for old, _new, _desc in patches))
+
+    problems, warnings, spans = [], [], []
+    for i, ((old, new, desc), where) in enumerate(zip(patches, hits)):
+        if not where:
+            problems.append(f'anchor {i + 1} not found ({desc}): {old[:60]!r}')
+            continue
+        if len(where) > 1:
+            warnings.append(f'anchor {i + 1} is ambiguous ({desc}): matches more than once, using the first')
+        spans.append((where[0], where[0] + len(old), new, i))
+
+    spans.sort()
+    for (s1, e1, _n1, i1), (s2, e2, _n2, i2) in zip(spans, spans[1:]):
+        if s2 < e1:
+            problems.append(
+                f'anchors {i1 + 1} and {i2 + 1} overlap at chars {s2:,}-{min(e1, e2):,} '
+                f'({patches[i1][2]} / {patches[i2][2]})'
+            )
+    if problems:
+        raise PatchError(path, problems)
+    return spans, warnings
+
+
+def render(content, spans):
+    """Write every planned replacement into a single output buffer."""
+    out, cursor = [], 0
+    for start, end, new, _i in spans:
+        out.append(content[cursor:start])
+        out.append(new)
+        cursor = end
+    out.append(content[cursor:])
+    return ''.join(out)
+
+
+def apply_patches(content, patches, path='<content>'):
+    """Plan + render in one call. Returns (new_content, warnings)."""
+    spans, warnings = plan_patches(content, patches, path)
+    return render(content, spans), warnings
+
+
+def patch_file(path, patches):
+    """Drop-in replacement for the per-script patch_file() helpers."""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    try:
+        spans, warnings = plan_patches(content, patches, path)
+    except PatchError as e:
+        for p in e.problems:
+            print(f'  ERROR: {p} in {path}')
+        sys.exit(1)
+    for w in warnings:
+        print(f'  WARN: {w}')
+    updated = render(content, spans)
+    for i, (_old, _new, desc) in enumerate(patches):
+        print(f'  [{i+1}] {desc}')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(updated)
+    delta = len(updated) - len(content)
+    print(f'  -> {len(updated):,} chars ({delta:+d})')
+    return updated
+
+
+class OptionalPatch(tuple):
+    """An (old, new, desc) patch that is skipped, not a conflict, when its anchor is gone."""
+
+
+def optional(old, new, desc):
+    return OptionalPatch((old, new, desc))
+
+
+def patch_id(old, new):
+    """Stable id of a patch: hash of its anchor and replacement."""
+    h = hashlib.sha256()
+    h.update(old.encode('utf-8'))
+    h.update(b'\0')
+    h.update(new.encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def classify(content, patches, recorded=()):
+    """
+    Status of each patch against the current content:
+      applied  - the replacement text is present and the anchor is not, or
+                 both are (insertions keep their anchor) and the manifest
+                 recorded the patch as applied
+      pending  - the anchor is present otherwise
+      conflict - neither is present (the file drifted under the patch)
+      skipped  - neither is present, but the patch is optional()
+    """
+    statuses = []
+    for patch in patches:
+        old, new, _desc = patch
+        has_new, has_old = new in content, old in content
+        if has_new and (not has_old or old in new or patch_id(old, new) in recorded):
+            statuses.append('applied')
+        elif has_old:
+            statuses.append('pending')
+        else:
+            statuses.append('skipped' if isinstance(patch, OptionalPatch) else 'conflict')
+    return statuses
+
+
+def _render_file(path, patches, recorded=()):
+    """
+    Worker: read + classify + plan + render one file; only pending patches
+    are applied. Returns a picklable result.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    statuses = classify(content, patches, recorded)
+    result = {'path': path, 'original': content, 'updated': content, 'warnings': [], 'statuses': statuses}
+    conflicts = [
+        f'patch {i + 1} conflicts ({patches[i][2]}): neither anchor nor replacement found'
+        for i, st in enumerate(statuses) if st == 'conflict'
+    ]
+    if conflicts:
+        result['problems'] = conflicts
+        return result
+    pending = [p for p, st in zip(patches, statuses) if st == 'pending']
+    if pending:
+        try:
+            result['updated'], result['warnings'] = apply_patches(content, pending, path)
+        except PatchError as e:
+            result['problems'] = e.problems
+    return result
+
+
+def _fast_path(path, patches, entry):
+    """
+    Manifest hit: every patch is recorded and the file hash matches the
+    recorded result, so the file is known to be fully patched - no scan.
+    """
+    if not entry or entry.get('result_sha256') is None:
+        return None
+    recorded = entry.get('patches', {})
+    # optional() patches skipped by the recorded run are absent from the manifest
+    statuses = ['applied' if patch_id(p[0], p[1]) in recorded else 'skipped' for p in patches]
+    if any(st == 'skipped' and not isinstance(p, OptionalPatch) for p, st in zip(patches, statuses)):
+        return None
+    try:
+        if file_sha256(path) != entry['result_sha256']:
+            return None
+    except FileNotFoundError:
+        return None
+    return {'path': path, 'original': None, 'updated': None, 'warnings': [],
+            'statuses': statuses, 'cached': True}
+
+
+def render_patch_set(patch_set, workers=None, entries=None):
+    """
+    Render every file of {path: patches} in parallel, entirely in memory.
+    `entries` maps path -> manifest entry; files matching their entry are
+    resolved from the hash alone. Raises PatchError listing the problems of
+    every failing file.
+    """
+    entries = entries or {}
+    results, todo = {}, []
+    for path, patches in patch_set.items():
+        hit = _fast_path(path, patches, entries.get(path))
+        if hit:
+            results[path] = hit
+        else:
+            todo.append(path)
+
+    recorded = [set(entries.get(p, {}).get('patches', {})) for p in todo]
+    if len(todo) <= 1 or workers == 1:
+        rendered = [_render_file(p, patch_set[p], rec) for p, rec in zip(todo, recorded)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or min(len(todo), os.cpu_count() or 1)) as pool:
+            rendered = list(pool.map(_render_file, todo, (patch_set[p] for p in todo), recorded))
+    for r in rendered:
+        r['drifted'] = bool(entries.get(r['path'], {}).get('result_sha256'))
+        results[r['path']] = r
+
+    ordered = [results[p] for p in patch_set]
+    problems = [f"{r['path']}: {p}" for r in ordered for p in r.get('problems', ())]
+    if problems:
+        raise PatchError('patch set', problems)
+    return ordered
+
+
+def _write_temp(path, text):
+    """Write text next to path (same filesystem, so rename is atomic)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return tmp
+
+
+def commit_rendered(results):
+    """
+    All-or-nothing write of rendered results. Every temp file is written
+    before the first rename; if a rename fails, files already replaced are
+    restored from their in-memory originals.
+    """
+    changed = [r for r in results if not r.get('cached') and r['updated'] != r['original']]
+    temps = []
+    try:
+        for r in changed:
+            temps.append((r, _write_temp(r['path'], r['updated'])))
+    except BaseException:
+        for _r, tmp in temps:
+            os.unlink(tmp)
+        raise
+
+    done = []
+    try:
+        for r, tmp in temps:
+            os.replace(tmp, r['path'])
+            done.append(r)
+    except BaseException:
+        for r in done:
+            os.replace(_write_temp(r['path'], r['original']), r['path'])
+        for _r, tmp in temps[len(done):]:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        raise
+    return changed
+
+
+class Manifest:
+    """
+    Applied-patch manifest: per pass and file, the ids of applied patches and
+    the sha256 of the file they produced.
+
+      {"version": 1, "passes": {"<pass>": {"<path>": {
+          "patches": {"<id>": "<desc>"}, "result_sha256": "<hex>"}}}}
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except FileNotFoundError:
+            self.data = {'version': 1, 'passes': {}}
+
+    def entries(self, name):
+        return self.data['passes'].get(name, {})
+
+    def record(self, name, path, patches, result_sha256):
+        entry = self.data['passes'].setdefault(name, {}).setdefault(path, {'patches': {}})
+        for old, new, desc in patches:
+            entry['patches'][patch_id(old, new)] = desc
+        entry['result_sha256'] = result_sha256
+
+    def save(self):
+        text = json.dumps(self.data, indent=2, sort_keys=True) + '\n'
+        os.replace(_write_temp(self.path, text), self.path)
+
+
+def apply_patch_set(patch_set, workers=None, manifest=None, name=None):
+    """
+    Check, render and atomically commit {path: patches}. Prints the same
+    per-patch log as patch_file(); exits 1 without writing anything if any
+    file fails. With a Manifest, patches it records as applied are skipped
+    and the manifest is updated after the commit.
+    """
+    entries = manifest.entries(name) if manifest else {}
+    try:
+        results = render_patch_set(patch_set, workers, entries)
+    except PatchError as e:
+        for p in e.problems:
+            print(f'  ERROR: {p}')
+        print('  Nothing written.')
+        sys.exit(1)
+
+    for r in results:
+        print(f"Patching {r['path']}...")
+        if r.get('cached'):
+            print('  up to date (manifest hash match)')
+            continue
+        if r.get('drifted'):
+            print('  WARN: file changed since the manifest was written')
+        for w in r['warnings']:
+            print(f'  WARN: {w}')
+        for i, ((_old, _new, desc), st) in enumerate(zip(patch_set[r['path']], r['statuses'])):
+            note = {'pending': '', 'applied': ' (already applied)', 'skipped': ' (skipped: anchor not found)'}[st]
+            print(f'  [{i+1}] {desc}{note}')
+        delta = len(r['updated']) - len(r['original'])
+        print(f"  -> {len(r['updated']):,} chars ({delta:+d})")
+    commit_rendered(results)
+
+    if manifest:
+        for r in results:
+            if not r.get('cached'):
+                result_sha = hashlib.sha256(r['updated'].encode('utf-8')).hexdigest()
+                done = [p for p, st in zip(patch_set[r['path']], r['statuses']) if st != 'skipped']
+                manifest.record(name, r['path'], done, result_sha)
+        manifest.save()
+    return results
+
+
+def check_patch_set(patch_set, manifest=None, name=None):
+    """
+    --check: report pending / applied / conflicting patches without writing.
+    Returns 0 if everything is applied, 1 if anything is pending, 2 on conflict.
+    """
+    entries = manifest.entries(name) if manifest else {}
+    worst = 0
+    for path, patches in patch_set.items():
+        entry = entries.get(path)
+        hit = _fast_path(path, patches, entry)
+        if hit:
+            skipped = hit['statuses'].count('skipped')
+            print(f'{path}: {len(patches) - skipped} applied' + (f', {skipped} skipped' if skipped else '') + ' (manifest hash match)')
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            statuses = classify(f.read(), patches, (entry or {}).get('patches', {}))
+        drift = ' drifted from manifest' if entry and entry.get('result_sha256') else ''
+        print(f'{path}:{drift}')
+        for i, ((_old, _new, desc), st) in enumerate(zip(patches, statuses)):
+            print(f'  [{i+1}] {st:<8} {desc}')
+            worst = max(worst, {'applied': 0, 'skipped': 0, 'pending': 1, 'conflict': 2}[st])
+    return worst
+
+
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'patch-manifest.json')
+
+
+def run_pass(name, patch_set, argv=None):
+    """
+    CLI entry point for a named pass: `--check` reports status and exits,
+    otherwise pending patches are applied and recorded in the manifest.
+    """
+    ap = argparse.ArgumentParser(description=f'Patch pass: {name}')
+    ap.add_argument('--check', action='store_true', help='report pending/applied/conflicting patches, write nothing')
+    ap.add_argument('--manifest', default=DEFAULT_MANIFEST)
+    ap.add_argument('--workers', type=int, default=None)
+    args = ap.parse_args(argv)
+
+    manifest = Manifest(args.manifest)
+    if args.check:
+        sys.exit(check_patch_set(patch_set, manifest, name))
+    return apply_patch_set(patch_set, args.workers, manifest, name)
@@ -1,30 +1,19 @@
 #!/usr/bin/env python3
 """
 Perf Pass 2 - self-contained patch script.
-Runs from the checked-out repo root. Reads each file, applies targeted
-string replacements, writes back. All anchors verified against actual file content.
+Runs from the checked-out repo root. All four files are checked and rendered
+in parallel via patchlib; nothing is written unless every anchor in every
+file matches. Safe to re-run: applied patches are skipped via the manifest.
+`--check` reports pending / applied / conflicting patches only.
 """
-import re, sys
+import os, sys
 
-def patch_file(path, patches):
-    with open(path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    original = content
-    for i, (old, new, desc) in enumerate(patches):
-        if old not in content:
-            print(f'  ERROR: anchor {i+1} not found in {path}: {repr(old[:60])}')
-            sys.exit(1)
-        content = content.replace(old, new, 1)
-        print(f'  [{i+1}] {desc}')
-    with open(path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    delta = len(content) - len(original)
-    print(f'  -> {len(content):,} chars ({delta:+d})')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from patchlib import run_pass  # parallel render, all-or-nothing commit, manifest
 
 # ============================================================
 # 1. route.ts
 # ============================================================
-print('Patching route.ts...')
 
 with open('src/app/api/chat/route.ts', 'r', encoding='utf-8') as f:
     rt = f.read()
@@ -164,12 +153,9 @@ rt_patches = [
     ),
 ]
 
-patch_file('src/app/api/chat/route.ts', rt_patches)
-
 # ============================================================
 # 2. appStore.ts
 # ============================================================
-print('Patching appStore.ts...')
 
 store_patches = [
     (
@@ -228,12 +214,10 @@ store_patches = [
         'appendToMessage targeted update'
     ),
 ]
-patch_file('src/store/appStore.ts', store_patches)
 
 # ============================================================
 # 3. ChatView.tsx
 # ============================================================
-print('Patching ChatView.tsx...')
 
 cv_patches = [
     (
@@ -247,12 +231,10 @@ cv_patches = [
         'shallow selector'
     ),
 ]
-patch_file('src/components/chat/ChatView.tsx', cv_patches)
 
 # ============================================================
 # 4. ChatInput.tsx
 # ============================================================
-print('Patching ChatInput.tsx...')
 
 ci_patches = [
     (
@@ -283,6 +265,15 @@ ci_patches = [
         'stream updateMessage 16ms throttle'
     ),
 ]
-patch_file('src/components/chat/ChatInput.tsx', ci_patches)
 
-print('\nAll patches applied successfully.')
+# ============================================================
+# Commit all four files together, or none of them
+# ============================================================
+if __name__ == '__main__':
+    run_pass('perf2', {
+        'src/app/api/chat/route.ts': rt_patches,
+        'src/store/appStore.ts': store_patches,
+        'src/components/chat/ChatView.tsx': cv_patches,
+        'src/components/chat/ChatInput.tsx': ci_patches,
+    })
+    print('\nAll patches applied successfully.')
@@ -0,0 +1,243 @@
+#!/usr/bin/env node
+/**
+ * Multi-process check for scheduler coordination against one Postgres.
+ *
+ * Spawns --procs worker processes. Each loads the real src/lib/schedulerLeader.ts
+ * and src/lib/taskClaim.ts (compiled with the project's `typescript` package,
+ * '@/' resolved to src/), then
+ *   - campaigns for leadership the way startScheduler() does, reporting changes
+ *   - claims due tasks in batches of --batch and "runs" each for a few ms
+ *
+ * The parent applies migrations, seeds --tasks due AI tasks, SIGKILLs the
+ * leader once a third of them have run, and checks that
+ *   - no task ran twice
+ *   - every task ran and ended completed, except those the killed process had
+ *     claimed in flight (left in_progress for stale-claim recovery)
+ *   - at most one process was leader at any moment, and a new one took over
+ *
+ * Needs node_modules (pg, typescript).
+ *
+ * Usage:
+ *   node .github/scripts/scheduler_cluster.js --db postgres://postgres@127.0.0.1/sparkie?sslmode=disable
+ *   node .github/scripts/scheduler_cluster.js --db ... --procs 6 --tasks 600 --batch 5
+ */
+
+'use strict'
+
+const fs = require('fs')
+const path = require('path')
+const Module = require('module')
+const { spawn } = require('child_process')
+
+const ROOT = path.join(__dirname, '..', '..')
+const TASK_PREFIX = 'cluster_check_'
+const CAMPAIGN_MS = 500
+
+function arg(name, def) {
+  const i = process.argv.indexOf(`--${name}`)
+  if (i === -1) return def
+  return typeof def === 'number' ? Number(process.argv[i + 1]) : process.argv[i + 1]
+}
+
+const sleep = ms => new Promise(r => setTimeout(r, ms))
+
+// ── Worker ──────────────────────────────────────────────────────────────────
+
+function installTsLoader() {
+  let ts
+  try {
+    ts = require('typescript')
+  } catch (_) {
+    console.error('typescript is not installed - run `npm install` first')
+    process.exit(1)
+  }
+  const resolve = Module._resolveFilename
+  Module._resolveFilename = function (request, ...rest) {
+    if (request.startsWith('@/')) request = path.join(ROOT, 'src', request.slice(2))
+    return resolve.call(this, request, ...rest)
+  }
+  require.extensions['.ts'] = (m, filename) => {
+    const { outputText } = ts.transpileModule(fs.readFileSync(filename, 'utf-8'), {
+      compilerOptions: { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2019, esModuleInterop: true },
+    })
+    m._compile(outputText, filename)
+  }
+}
+
+async function worker() {
+  installTsLoader()
+  const leader = require('@/lib/schedulerLeader')
+  const { claimDueTasks } = require('@/lib/taskClaim')
+  const { query } = require('@/lib/db')
+  const batchSize = arg('batch', 3)
+  const emit = ev => process.stdout.write(JSON.stringify({ pid: process.pid, t: Date.now(), ...ev }) + '\n')
+
+  let wasLeader = false
+  setInterval(() => {
+    const now = leader.isSchedulerLeader()
+    if (now !== wasLeader) emit({ ev: now ? 'lead' : 'resign' })
+    wasLeader = now
+  }, 20)
+  leader.startLeaderElection()
+
+  for (;;) {
+    const batch = await claimDueTasks(batchSize).catch(() => [])
+    if (batch.length === 0) {
+      await sleep(50)
+      continue
+    }
+    await Promise.all(batch.map(async task => {
+      emit({ ev: 'start', id: task.id })
+      await sleep(5 + Math.random() * 40)
+      await query(`UPDATE sparkie_tasks SET status = 'completed', resolved_at = NOW() WHERE id = $1`, [task.id])
+      emit({ ev: 'ran', id: task.id })
+    }))
+  }
+}
+
+// ── Parent ──────────────────────────────────────────────────────────────────
+
+async function main() {
+  const db = arg('db', process.env.DATABASE_URL)
+  const procs = arg('procs', 4)
+  const tasks = arg('tasks', 300)
+  if (!db) {
+    console.error('--db (or DATABASE_URL) is required')
+    process.exit(1)
+  }
+  process.env.DATABASE_URL = db
+
+  const { migrate } = require(path.join(ROOT, 'db', 'migrate.js'))
+  await migrate({ log: () => {} })
+
+  const { Client } = require('pg')
+  const pg = new Client({ connectionString: db, ssl: db.includes('sslmode=disable') ? false : { rejectUnauthorized: false } })
+  await pg.connect()
+  await pg.query(`DELETE FROM sparkie_tasks WHERE id LIKE $1`, [`${TASK_PREFIX}%`])
+
+  const children = new Map()
+  const events = []
+  for (let i = 0; i < procs; i++) {
+    const child = spawn(process.execPath, [__filename, '--worker', '--batch', String(arg('batch', 3))], {
+      env: { ...process.env, SPARKIE_LEADER_CAMPAIGN_MS: String(CAMPAIGN_MS) },
+      stdio: ['ignore', 'pipe', 'inherit'],
+    })
+    let buf = ''
+    child.stdout.on('data', chunk => {
+      buf += chunk
+      const lines = buf.split('\n')
+      buf = lines.pop()
+      for (const line of lines) {
+        try { events.push(JSON.parse(line)) } catch (_) { /* worker log line */ }
+      }
+    })
+    children.set(child.pid, child)
+  }
+
+  // Let the election settle before any work shows up
+  await sleep(CAMPAIGN_MS * 3)
+  const ids = Array.from({ length: tasks }, (_, i) => `${TASK_PREFIX}${i}`)
+  await pg.query(
+    `INSERT INTO sparkie_tasks (id, user_id, label, action, executor, status, trigger_type, scheduled_at)
+     SELECT id, 'cluster-check', 'cluster check', 'noop', 'ai', 'pending', 'manual', NOW()
+     FROM unnest($1::text[]) AS t(id)`,
+    [ids]
+  )
+  const t0 = Date.now()
+
+  const ran = () => events.filter(e => e.ev === 'ran').length
+  let killed = null
+  while (Date.now() - t0 < 60_000) {
+    if (!killed && ran() >= tasks / 3) {
+      const lead = currentLeader(events)
+      if (lead) {
+        children.get(lead).kill('SIGKILL')
+        killed = { pid: lead, t: Date.now() }
+      }
+    }
+    const open = await pg.query(
+      `SELECT COUNT(*)::int AS n FROM sparkie_tasks WHERE id LIKE $1 AND status = 'pending'`, [`${TASK_PREFIX}%`]
+    )
+    if (killed && open.rows[0].n === 0 && currentLeader(events, killed.pid)) break
+    await sleep(100)
+  }
+  await sleep(200)
+  const finishedAt = Date.now()
+  for (const child of children.values()) child.kill('SIGKILL')
+
+  const rows = await pg.query(
+    `SELECT id, status, claimed_by FROM sparkie_tasks WHERE id LIKE $1`, [`${TASK_PREFIX}%`]
+  )
+  await pg.query(`DELETE FROM sparkie_tasks WHERE id LIKE $1`, [`${TASK_PREFIX}%`])
+  await pg.end()
+
+  const problems = []
+  const runs = new Map()
+  for (const e of events) if (e.ev === 'ran') runs.set(e.id, (runs.get(e.id) ?? 0) + 1)
+  const twice = [...runs].filter(([, n]) => n > 1)
+  if (twice.length) problems.push(`${twice.length} tasks ran more than once, e.g. ${twice[0][0]}`)
+
+  const killedTag = killed ? `:${killed.pid}` : null
+  const inFlight = rows.rows.filter(r => r.status === 'in_progress' && killedTag && r.claimed_by?.endsWith(killedTag))
+  const unfinished = rows.rows.filter(r => r.status !== 'completed' && !inFlight.includes(r))
+  if (unfinished.length) problems.push(`${unfinished.length} tasks not completed, e.g. ${unfinished[0].id} (${unfinished[0].status})`)
+
+  const intervals = leaderIntervals(events, killed, finishedAt)
+  for (let i = 1; i < intervals.length; i++) {
+    if (intervals[i].from < intervals[i - 1].to) {
+      problems.push(`pids ${intervals[i - 1].pid} and ${intervals[i].pid} were leader at the same time`)
+    }
+  }
+  if (!killed) problems.push('no leader was elected to kill')
+  else if (!intervals.some(iv => iv.pid !== killed.pid && iv.from >= killed.t)) problems.push('no new leader after the kill')
+
+  const perPid = new Map()
+  for (const e of events) if (e.ev === 'ran') perPid.set(e.pid, (perPid.get(e.pid) ?? 0) + 1)
+  console.log(`${procs} processes, ${tasks} tasks, ${((finishedAt - t0) / 1000).toFixed(1)}s`)
+  console.log(`tasks run per process: ${[...perPid].map(([pid, n]) => `${pid}=${n}`).join(' ')}`)
+  console.log(`leaders: ${intervals.map(iv => `${iv.pid} ${iv.from - t0}..${iv.to - t0}ms`).join(', ')}`)
+  if (killed) {
+    const failover = intervals.find(iv => iv.pid !== killed.pid && iv.from >= killed.t)
+    console.log(`killed leader ${killed.pid}` +
+                (failover ? `, ${failover.pid} took over after ${failover.from - killed.t}ms` : '') +
+                `, ${inFlight.length} of its claims left for stale recovery`)
+  }
+  if (problems.length) {
+    for (const p of problems) console.log(`FAIL: ${p}`)
+    process.exit(1)
+  }
+  console.log('ok: each task ran once, one leader at a time, failover after kill')
+}
+
+function currentLeader(events, exceptPid) {
+  const state = new Map()
+  for (const e of events) {
+    if (e.ev === 'lead') state.set(e.pid, true)
+    else if (e.ev === 'resign') state.set(e.pid, false)
+  }
+  for (const [pid, lead] of state) if (lead && pid !== exceptPid) return pid
+  return null
+}
+
+/** Leadership spans per pid, sorted by start; a killed leader's span ends at the kill */
+function leaderIntervals(events, killed, finishedAt) {
+  const open = new Map()
+  const out = []
+  for (const e of events) {
+    if (e.ev === 'lead') open.set(e.pid, e.t)
+    else if (e.ev === 'resign' && open.has(e.pid)) {
+      out.push({ pid: e.pid, from: open.get(e.pid), to: e.t })
+      open.delete(e.pid)
+    }
+  }
+  for (const [pid, from] of open) {
+    out.push({ pid, from, to: killed && pid === killed.pid ? killed.t : finishedAt })
+  }
+  return out.sort((a, b) => a.from - b.from)
+}
+
+if (process.argv.includes('--worker')) {
+  worker().catch(err => { console.error(err); process.exit(1) })
+} else {
+  main().catch(err => { console.error(err); process.exit(1) })
+}
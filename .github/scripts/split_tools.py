@@ -0,0 +1,917 @@
+#!/usr/bin/env python3
+"""
+Split executeTool() in src/app/api/chat/route.ts into lazily loaded tool modules.
+
+Every chat cold start compiles and evaluates all of route.ts, and with it the
+`case` branch of every tool. This codemod moves each branch that can stand on
+its own into src/lib/tools/<tool>.ts and writes src/lib/tools/registry.ts,
+which maps tool names to dynamic import()s. Each import is its own chunk, so
+a tool's code is loaded the first time that tool is called. executeTool asks
+the registry first and falls back to its remaining cases and the sprint table.
+
+What the split changes is how much of route.ts V8 compiles in a new process;
+a warm process is unaffected. --parse measures that compile cost alone. How
+much of it shows up in cold start and time to first token is what --boot
+measures, and nothing should be claimed about either without its numbers.
+
+A branch can move when:
+  - its body is a single `{ ... }` block (no fallthrough, no bare statements)
+  - it has no `break` / `continue` outside a loop of its own
+  - it only uses imports, executeTool's parameters / ctx fields, body locals
+    and globals. A branch that calls a helper declared in route.ts stays put,
+    and the report names the helpers that keep it there.
+
+Extracted modules are normal source afterwards; edit them in place. The
+registry is regenerated from src/lib/tools/*.ts on every --write, the same
+way gen_tool_dispatch.py regenerates sprint-dispatch.ts.
+
+Usage:
+  python3 .github/scripts/split_tools.py                 # dry run: plan + size report
+  python3 .github/scripts/split_tools.py --verbose       # ... plus the blocking helpers per case
+  python3 .github/scripts/split_tools.py --write         # extract, write modules + registry, rewrite route.ts
+  python3 .github/scripts/split_tools.py --check         # exit 1 if a movable case or a stale registry remains
+
+  # cold start + time to first chat response, HEAD vs the rewritten working tree
+  # (bench_chat.py boot; needs node_modules and a local Postgres)
+  python3 .github/scripts/split_tools.py --boot --db postgres://postgres@127.0.0.1/sparkie?sslmode=disable
+
+  # V8 parse + compile of route.ts alone, --base vs the working tree, lazy (what
+  # V8 compiles up front) and eager (every function body): measurable without a
+  # build or a database
+  python3 .github/scripts/split_tools.py --parse --base 60051d3^
+"""
+import argparse
+import glob
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.abspath(os.path.join(HERE, '..', '..'))
+ROUTE = os.path.join('src', 'app', 'api', 'chat', 'route.ts')
+TOOLS_DIR = os.path.join('src', 'lib', 'tools')
+REGISTRY = os.path.join(TOOLS_DIR, 'registry.ts')
+TYPES = os.path.join(TOOLS_DIR, 'types.ts')
+GENERATED = {'registry.ts', 'types.ts'}
+
+REGEX_AFTER_PUNCT = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_AFTER_WORD = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw', 'yield', 'await'}
+DECL_WORDS = {'const', 'let', 'var', 'function', 'class', 'interface', 'type', 'enum'}
+LOOP_WORDS = {'for', 'while', 'switch'}
+
+
+# ── Lexer ────────────────────────────────────────────────────────────────────
+# Just enough TypeScript to find braces, identifiers and statement boundaries.
+# Strings and comments are skipped. Template literals are skipped too, except
+# for their ${...} expressions, which are lexed as code.
+
+class Tok:
+    __slots__ = ('kind', 'val', 'start', 'end', 'depth')
+
+    def __init__(self, kind, val, start, end, depth):
+        self.kind, self.val, self.start, self.end, self.depth = kind, val, start, end, depth
+
+    def __repr__(self):
+        return f'{self.kind}:{self.val}@{self.start}'
+
+
+def lex(src):
+    toks = []
+    i, n = 0, len(src)
+    depth = 0
+    braces = []          # 'code' | 'tmpl' per open brace, to resume template literals
+
+    def prev_sig():
+        return toks[-1] if toks else None
+
+    def scan_template(i):
+        """From just after a backtick (or a closing ${}), to the closing backtick or the next ${."""
+        while i < n:
+            c = src[i]
+            if c == '\\':
+                i += 2
+                continue
+            if c == '`':
+                return i + 1, False
+            if c == '$' and i + 1 < n and src[i + 1] == '{':
+                return i + 2, True
+            i += 1
+        raise SystemExit('unterminated template literal')
+
+    while i < n:
+        c = src[i]
+        if c in ' \t\r\n':
+            i += 1
+            continue
+        if src.startswith('//', i):
+            j = src.find('\n', i)
+            i = n if j == -1 else j
+            continue
+        if src.startswith('/*', i):
+            j = src.find('*/', i + 2)
+            i = n if j == -1 else j + 2
+            continue
+        if c in '\'"':
+            j = i + 1
+            while j < n and src[j] != c:
+                j += 2 if src[j] == '\\' else 1
+            toks.append(Tok('str', src[i + 1:j], i, j + 1, depth))
+            i = j + 1
+            continue
+        if c == '`':
+            j, opened = scan_template(i + 1)
+            toks.append(Tok('tmpl', '`', i, j, depth))
+            if opened:
+                braces.append('tmpl')
+                depth += 1
+            i = j
+            continue
+        if c == '/':
+            p = prev_sig()
+            if p is None or (p.kind == 'punct' and p.val in REGEX_AFTER_PUNCT) or (p.kind == 'id' and p.val in REGEX_AFTER_WORD):
+                j, in_class = i + 1, False
+                while j < n:
+                    d = src[j]
+                    if d == '\\':
+                        j += 2
+                        continue
+                    if d == '[':
+                        in_class = True
+                    elif d == ']':
+                        in_class = False
+                    elif d == '/' and not in_class:
+                        break
+                    elif d == '\n':
+                        raise SystemExit(f'unterminated regex at offset {i}')
+                    j += 1
+                j += 1
+                while j < n and (src[j].isalnum()):
+                    j += 1
+                toks.append(Tok('re', src[i:j], i, j, depth))
+                i = j
+                continue
+        if c.isalpha() or c in '_$':
+            j = i + 1
+            while j < n and (src[j].isalnum() or src[j] in '_$'):
+                j += 1
+            toks.append(Tok('id', src[i:j], i, j, depth))
+            i = j
+            continue
+        if c.isdigit():
+            j = i + 1
+            while j < n and (src[j].isalnum() or src[j] in '._'):
+                j += 1
+            toks.append(Tok('num', src[i:j], i, j, depth))
+            i = j
+            continue
+        if src.startswith('...', i):
+            toks.append(Tok('punct', '...', i, i + 3, depth))
+            i += 3
+            continue
+        if c == '{':
+            braces.append('code')
+            toks.append(Tok('punct', '{', i, i + 1, depth))
+            depth += 1
+            i += 1
+            continue
+        if c == '}':
+            kind = braces.pop() if braces else 'code'
+            depth -= 1
+            if kind == 'tmpl':
+                j, opened = scan_template(i + 1)
+                toks.append(Tok('tmpl', '`', i, j, depth))
+                if opened:
+                    braces.append('tmpl')
+                    depth += 1
+                i = j
+                continue
+            toks.append(Tok('punct', '}', i, i + 1, depth))
+            i += 1
+            continue
+        toks.append(Tok('punct', c, i, i + 1, depth))
+        i += 1
+    if depth != 0:
+        raise SystemExit(f'unbalanced braces (depth {depth} at end of file)')
+    return toks
+
+
+def match_close(toks, k):
+    """Index of the token closing the bracket at toks[k]."""
+    pairs = {'{': '}', '(': ')', '[': ']'}
+    open_, close = toks[k].val, pairs[toks[k].val]
+    level = 0
+    for m in range(k, len(toks)):
+        t = toks[m]
+        if t.kind != 'punct':
+            continue
+        if t.val == open_:
+            level += 1
+        elif t.val == close:
+            level -= 1
+            if level == 0:
+                return m
+    raise SystemExit(f'no match for {open_} at offset {toks[k].start}')
+
+
+# ── Analysis ─────────────────────────────────────────────────────────────────
+
+def parse_imports(src, toks):
+    """local name -> (module, imported name or 'default' / '*', is_type)."""
+    imports = {}
+    k = 0
+    while k < len(toks):
+        t = toks[k]
+        if not (t.kind == 'id' and t.val == 'import' and t.depth == 0):
+            k += 1
+            continue
+        m = k + 1
+        while toks[m].kind != 'str':
+            m += 1
+        module = toks[m].val
+        spec = src[toks[k].end:toks[m].start]
+        stmt_type = re.match(r'\s*type\s', spec) is not None
+        spec = re.sub(r'^\s*type\s', ' ', spec)
+        spec = re.sub(r'\s*from\s*$', '', spec).strip()
+        named = re.search(r'\{([^}]*)\}', spec)
+        if named:
+            for part in named.group(1).split(','):
+                part = part.strip()
+                if not part:
+                    continue
+                is_type = stmt_type or part.startswith('type ')
+                part = re.sub(r'^type\s+', '', part)
+                orig, _, local = part.partition(' as ')
+                imports[(local or orig).strip()] = (module, orig.strip(), is_type)
+            spec = spec[:named.start()] + spec[named.end():]
+        for part in spec.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            if part.startswith('*'):
+                imports[part.split(' as ')[1].strip()] = (module, '*', stmt_type)
+            else:
+                imports[part] = (module, 'default', stmt_type)
+        k = m + 1
+    return imports
+
+
+def top_level_names(toks, skip_range):
+    """Names route.ts declares at depth 0, outside skip_range (token indexes)."""
+    names = set()
+    for k, t in enumerate(toks):
+        if skip_range[0] <= k <= skip_range[1] or t.depth != 0 or t.kind != 'id' or t.val not in DECL_WORDS:
+            continue
+        nxt = toks[k + 1] if k + 1 < len(toks) else None
+        if nxt is None:
+            continue
+        if nxt.kind == 'id':
+            names.add(nxt.val)
+        elif nxt.kind == 'punct' and nxt.val in '{[' and t.val in ('const', 'let', 'var'):
+            end = match_close(toks, k + 1)
+            for m in range(k + 2, end):
+                if toks[m].kind == 'id' and not (toks[m + 1].kind == 'punct' and toks[m + 1].val == ':'):
+                    names.add(toks[m].val)
+    names.discard('async')
+    return names
+
+
+def references(toks, lo, hi):
+    """Identifiers a token range reads: not property names, not object keys."""
+    refs = set()
+    for k in range(lo, hi):
+        t = toks[k]
+        if t.kind != 'id':
+            continue
+        p = toks[k - 1]
+        if p.kind == 'punct' and p.val == '.':
+            continue
+        n = toks[k + 1]
+        if n.kind == 'punct' and n.val in (':', '?') and p.kind == 'punct' and p.val in ('{', ','):
+            # object literal / type literal key (`{ a: 1 }`, `{ a?: string }`)
+            if n.val == ':' or (toks[k + 2].kind == 'punct' and toks[k + 2].val == ':'):
+                continue
+        refs.add(t.val)
+    return refs
+
+
+def declared(toks, lo, hi):
+    """Names declared with a plain `const|let|var|function NAME` inside the range."""
+    return {toks[k + 1].val for k in range(lo, hi - 1)
+            if toks[k].kind == 'id' and toks[k].val in ('const', 'let', 'var', 'function', 'class') and toks[k + 1].kind == 'id'}
+
+
+def top_declared(toks, lo, hi):
+    """Names the block toks[lo] .. toks[hi] declares at its own level, destructuring included.
+
+    The module body shares one scope with the handler's parameters and the ctx
+    fields it destructures; a case block had a scope of its own.
+    """
+    level = toks[lo].depth + 1
+    names = set()
+    for k in range(lo + 1, hi):
+        t = toks[k]
+        if t.depth != level or t.kind != 'id' or t.val not in ('const', 'let', 'var', 'function', 'class'):
+            continue
+        nxt = toks[k + 1]
+        if nxt.kind == 'id':
+            names.add(nxt.val)
+        elif nxt.val in '{[':
+            end = match_close(toks, k + 1)
+            names |= {toks[m].val for m in range(k + 2, end) if toks[m].kind == 'id' and toks[m + 1].val != ':'}
+    return names
+
+
+def loose_jumps(toks, lo, hi):
+    """`break` / `continue` in the range that would leave the enclosing switch."""
+    loop_blocks = []          # token index of the closing brace of each loop body
+    bad = []
+    k = lo
+    while k < hi:
+        t = toks[k]
+        while loop_blocks and k > loop_blocks[-1]:
+            loop_blocks.pop()
+        if t.kind == 'id' and t.val in LOOP_WORDS | {'do'}:
+            m = k + 1
+            if t.val != 'do' and toks[m].kind == 'punct' and toks[m].val == '(':
+                m = match_close(toks, m) + 1
+            if toks[m].kind == 'punct' and toks[m].val == '{':
+                loop_blocks.append(match_close(toks, m))
+        elif t.kind == 'id' and t.val in ('break', 'continue') and not loop_blocks:
+            bad.append(t.val)
+        k += 1
+    return bad
+
+
+def line_start(src, t):
+    return src[src.rfind('\n', 0, t.start) + 1:t.start].strip() == ''
+
+
+def ends_in_return(src, toks, lo, hi):
+    """Whether the block toks[lo] .. toks[hi] ('{' .. '}') cannot run off its end.
+
+    A case body that can falls through into the next case in executeTool. Only
+    the shapes executeTool uses are recognised: a trailing return / throw, and
+    try/catch or if/else whose branches all end that way.
+    """
+    level = toks[lo].depth + 1
+    last = None
+    for k in range(lo + 1, hi):
+        t = toks[k]
+        if t.depth == level and t.kind == 'id' and (k == lo + 1 or toks[k - 1].val == ';' or line_start(src, t)):
+            last = k
+    if last is None:
+        return False
+    t = toks[last]
+    if t.val in ('return', 'throw'):
+        return True
+    if t.val == 'try':
+        body_close = match_close(toks, last + 1)
+        k = body_close + 1
+        ok = ends_in_return(src, toks, last + 1, body_close)
+        if toks[k].val == 'catch':
+            k += 1
+            if toks[k].val == '(':
+                k = match_close(toks, k) + 1
+            catch_close = match_close(toks, k)
+            ok = ok and ends_in_return(src, toks, k, catch_close)
+            k = catch_close + 1
+        if toks[k].val == 'finally':
+            return ends_in_return(src, toks, k + 1, match_close(toks, k + 1)) or ok
+        return ok
+    if t.val == 'if':
+        k = last
+        while True:
+            k = match_close(toks, k + 1) + 1                # past the condition
+            if toks[k].val != '{':
+                return False
+            close = match_close(toks, k)
+            if not ends_in_return(src, toks, k, close):
+                return False
+            k = close + 1
+            if k >= hi or toks[k].val != 'else':
+                return False
+            if toks[k + 1].val == 'if':
+                k += 1
+                continue
+            if toks[k + 1].val != '{':
+                return False
+            return ends_in_return(src, toks, k + 1, match_close(toks, k + 1))
+    return False
+
+
+def find_execute_tool(toks):
+    for k, t in enumerate(toks):
+        if t.kind == 'id' and t.val == 'executeTool' and toks[k - 1].val == 'function' and t.depth == 0:
+            params_open = k + 1
+            params_close = match_close(toks, params_open)
+            m = params_close
+            while not (toks[m].kind == 'punct' and toks[m].val == '{'):
+                m += 1
+            body_close = match_close(toks, m)
+            for s in range(m, body_close):
+                if toks[s].kind == 'id' and toks[s].val == 'switch' and toks[s + 1].val == '(':
+                    sw_open = match_close(toks, s + 1) + 1
+                    return {'fn': k, 'params': (params_open, params_close), 'body': (m, body_close),
+                            'switch': s, 'switch_block': (sw_open, match_close(toks, sw_open))}
+    raise SystemExit(f'{ROUTE}: executeTool switch not found')
+
+
+def scope_names(src, toks, et):
+    """executeTool's parameters and the ctx fields it destructures before the switch."""
+    lo, hi = et['params']
+    names = {toks[k].val for k in range(lo, hi) if toks[k].kind == 'id' and toks[k + 1].val in (':', '?')
+             and toks[k].depth == toks[lo].depth}
+    ctx_fields = []
+    for k in range(et['body'][0], et['switch']):
+        if toks[k].val == 'const' and toks[k + 1].val == '{':
+            end = match_close(toks, k + 1)
+            ctx_fields = [toks[m].val for m in range(k + 2, end) if toks[m].kind == 'id']
+            break
+    # the ctx parameter's type, to be reused as ToolContext
+    ctx_type = None
+    for k in range(lo, hi):
+        if toks[k].val == 'ctx' and toks[k + 1].val == ':' and toks[k + 2].val == '{':
+            ctx_type = src[toks[k + 2].start:toks[match_close(toks, k + 2)].end]
+    return names, ctx_fields, ctx_type
+
+
+def collect_cases(src, toks, et):
+    """Top-level case groups of the executeTool switch."""
+    lo, hi = et['switch_block']
+    level = toks[lo].depth + 1
+    labels_at = [k for k in range(lo + 1, hi) if toks[k].depth == level and toks[k].kind == 'id'
+                 and toks[k].val in ('case', 'default') and (toks[k].val == 'default' or toks[k + 2].val == ':')]
+    groups = []
+    k_i = 0
+    while k_i < len(labels_at):
+        first = labels_at[k_i]
+        names = []
+        k = first
+        # consecutive labels share one body (fallthrough)
+        while k_i < len(labels_at) and labels_at[k_i] == k:
+            if toks[k].val == 'default':
+                names.append(None)
+                k += 2
+            else:
+                names.append(toks[k + 1].val)
+                k += 3
+            k_i += 1
+        body_lo = k
+        body_hi = labels_at[k_i] if k_i < len(labels_at) else hi
+        groups.append({'names': names, 'label_tok': first, 'body': (body_lo, body_hi)})
+    return groups
+
+
+def classify(src, toks, group, route_names, imports, scope):
+    names = group['names']
+    lo, hi = group['body']
+    if None in names:
+        return 'default branch'
+    if lo >= hi:
+        return 'falls through'
+    if not (toks[lo].val == '{' and match_close(toks, lo) == hi - 1):
+        return 'body is not one { } block'
+    if not ends_in_return(src, toks, lo, hi - 1):
+        return 'can fall through (no trailing return)'
+    jumps = loose_jumps(toks, lo + 1, hi - 1)
+    if jumps:
+        return f"uses {'/'.join(sorted(set(jumps)))} outside a loop"
+    clash = top_declared(toks, lo, hi - 1) & (scope | {'ctx'})
+    if clash:
+        return 'redeclares ' + ', '.join(sorted(clash))
+    refs = references(toks, lo + 1, hi - 1) - declared(toks, lo + 1, hi - 1)
+    blockers = sorted(r for r in refs if r in route_names and r not in imports and r not in scope)
+    group['refs'] = refs
+    if blockers:
+        group['blockers'] = blockers
+        return 'uses route.ts helpers: ' + ', '.join(blockers)
+    return None
+
+
+def analyze(root):
+    path = os.path.join(root, ROUTE)
+    with open(path, 'r', encoding='utf-8') as f:
+        src = f.read()
+    toks = lex(src)
+    et = find_execute_tool(toks)
+    imports = parse_imports(src, toks)
+    scope, ctx_fields, ctx_type = scope_names(src, toks, et)
+    scope |= set(ctx_fields)
+    route_names = top_level_names(toks, (et['fn'] - 2, et['body'][1])) | {'executeTool'}
+    groups = collect_cases(src, toks, et)
+    for g in groups:
+        g['reason'] = classify(src, toks, g, route_names, imports, scope)
+        lo, hi = g['body']
+        g['bytes'] = len(src[toks[g['label_tok']].start:toks[hi - 1].end].encode('utf-8'))
+    return {'src': src, 'toks': toks, 'et': et, 'imports': imports, 'ctx_fields': ctx_fields,
+            'ctx_type': ctx_type, 'groups': groups}
+
+
+# ── Generation ───────────────────────────────────────────────────────────────
+
+def handler_name(tool):
+    head, *rest = tool.split('_')
+    return 'run' + head[:1].upper() + head[1:] + ''.join(w[:1].upper() + w[1:] for w in rest)
+
+
+def import_lines(refs, imports):
+    by_module = {}
+    for name in sorted(refs):
+        if name not in imports:
+            continue
+        module, orig, is_type = imports[name]
+        by_module.setdefault(module, []).append((name, orig, is_type))
+    lines = []
+    for module, specs in by_module.items():
+        default = [n for n, o, _ in specs if o == 'default']
+        star = [n for n, o, _ in specs if o == '*']
+        named = [(n, o, t) for n, o, t in specs if o not in ('default', '*')]
+        for n in star:
+            lines.append(f"import * as {n} from '{module}'")
+        parts = []
+        if named:
+            all_types = all(t for _, _, t in named)
+            inner = ', '.join(('' if all_types or not t else 'type ') + (o if o == n else f'{o} as {n}') for n, o, t in named)
+            parts.append(('type ' if all_types and not default else '') + '{ ' + inner + ' }')
+        if default:
+            parts.insert(0, default[0])
+        if parts:
+            lines.append(f"import {', '.join(parts)} from '{module}'")
+    return lines
+
+
+def dedent(src, toks, lo, hi, by):
+    """src between toks[lo] and toks[hi], `by` spaces less indented.
+
+    Lines that start inside a template literal are part of the string and
+    keep their indentation.
+    """
+    start, end = toks[lo].end, toks[hi].start
+    literal = [(t.start, t.end) for t in toks[lo:hi] if t.kind in ('tmpl', 'str')]
+    out = []
+    pos = start
+    for line in src[start:end].split('\n'):
+        inside = any(a < pos < b for a, b in literal)
+        lead = len(line) - len(line.lstrip(' '))
+        out.append(line if inside else line[min(lead, by):])
+        pos += len(line) + 1
+    return '\n'.join(out).strip('\n').rstrip()
+
+
+def render_module(analysis, group):
+    src, toks = analysis['src'], analysis['toks']
+    lo, hi = group['body']
+    tool = group['names'][0]
+    # case bodies sit two spaces in from their label; module bodies at 2
+    case_indent = toks[group['label_tok']].start - src.rfind('\n', 0, toks[group['label_tok']].start) - 1
+    body = dedent(src, toks, lo, hi - 1, case_indent)
+    refs = group['refs']
+    used_ctx = [f for f in analysis['ctx_fields'] if f in refs]
+    lines = [
+        f"// {', '.join(group['names'])} — moved out of executeTool() in src/app/api/chat/route.ts",
+        '// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.',
+        '',
+        *import_lines(refs, analysis['imports']),
+        "import type { ToolContext } from '@/lib/tools/types'",
+        '',
+    ]
+    if len(group['names']) > 1:
+        lines += [f"export const TOOL_NAMES = [{', '.join(repr(n) for n in group['names'])}]", '']
+    params = (f"{'name' if 'name' in refs else '_name'}: string, {'args' if 'args' in refs else '_args'}: Record<string, unknown>, "
+              f"{'ctx' if used_ctx or 'ctx' in refs else '_ctx'}: ToolContext")
+    lines.append(f'export default async function {handler_name(tool)}({params}): Promise<string> {{')
+    if used_ctx:
+        lines.append(f"  const {{ {', '.join(used_ctx)} }} = ctx")
+    lines.append(body)
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def render_types(ctx_type):
+    fields = [f.strip() for f in ctx_type.strip('{} ').split(';') if f.strip()]
+    return '\n'.join([
+        '// AUTO-GENERATED by .github/scripts/split_tools.py from executeTool()\'s ctx parameter — do not edit by hand.',
+        '',
+        '/** What executeTool() in chat/route.ts hands to every tool */',
+        'export interface ToolContext {',
+        *[f'  {f}' for f in fields],
+        '}',
+        '',
+        'export type ToolHandler = (name: string, args: Record<string, unknown>, ctx: ToolContext) => Promise<string>',
+        '',
+        'export interface ToolModule {',
+        '  default: ToolHandler',
+        '  TOOL_NAMES?: string[]',
+        '}',
+        '',
+    ])
+
+
+def module_tools(root):
+    """tool name -> module basename, from the modules in src/lib/tools."""
+    owners = {}
+    for path in sorted(glob.glob(os.path.join(root, TOOLS_DIR, '*.ts'))):
+        base = os.path.basename(path)[:-3]
+        if base + '.ts' in GENERATED:
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        m = re.search(r'export const TOOL_NAMES\s*=\s*\[([^\]]*)\]', text)
+        names = re.findall(r"'([A-Za-z0-9_]+)'", m.group(1)) if m else [base]
+        for n in names:
+            owners[n] = base
+    return owners
+
+
+def render_registry(owners):
+    lines = [
+        '// AUTO-GENERATED by .github/scripts/split_tools.py — do not edit by hand.',
+        '// Re-run `python3 .github/scripts/split_tools.py --write` after adding or renaming a module here.',
+        '',
+        "import type { ToolHandler, ToolModule } from '@/lib/tools/types'",
+        '',
+        "// One dynamic import per tool: each is its own chunk, compiled and evaluated on the tool's first call",
+        '// instead of with chat/route.ts at cold start.',
+        'const LOADERS: Record<string, () => Promise<ToolModule>> = {',
+        *[f"  {name}: () => import('@/lib/tools/{base}')," for name, base in sorted(owners.items())],
+        '}',
+        '',
+        'const loaded = new Map<string, ToolHandler>()',
+        '',
+        'export function hasToolModule(name: string): boolean {',
+        '  return Object.prototype.hasOwnProperty.call(LOADERS, name)',
+        '}',
+        '',
+        '/** The handler for an extracted tool, or null if executeTool still handles it inline */',
+        'export async function loadToolModule(name: string): Promise<ToolHandler | null> {',
+        '  const cached = loaded.get(name)',
+        '  if (cached) return cached',
+        '  if (!hasToolModule(name)) return null',
+        '  const handler = (await LOADERS[name]()).default',
+        '  loaded.set(name, handler)',
+        '  return handler',
+        '}',
+        '',
+    ]
+    return '\n'.join(lines)
+
+
+DISPATCH = (
+    "    // Tools moved to src/lib/tools/ (split_tools.py) load on first call\n"
+    "    const toolModule = await loadToolModule(name)\n"
+    "    if (toolModule) return await toolModule(name, args, ctx)\n"
+)
+REGISTRY_IMPORT = "import { loadToolModule } from '@/lib/tools/registry'\n"
+
+
+def rewrite_route(analysis, moved):
+    src, toks, et = analysis['src'], analysis['toks'], analysis['et']
+    cuts = []
+    for g in moved:
+        start = toks[g['label_tok']].start
+        start = src.rfind('\n', 0, start) + 1
+        end = toks[g['body'][1] - 1].end
+        # take the trailing newline and one blank separator line with the case
+        if src.startswith('\n', end):
+            end += 1
+        if src.startswith('\n', end):
+            end += 1
+        cuts.append((start, end, ''))
+    if DISPATCH not in src:
+        sw = toks[et['switch']].start
+        line_start = src.rfind('\n', 0, sw) + 1
+        cuts.append((line_start, line_start, DISPATCH))
+    if REGISTRY_IMPORT not in src:
+        # next to the other executeTool dispatch import
+        sprint = src.find("from '@/lib/sprint-dispatch'")
+        at = src.find('\n', sprint) + 1 if sprint != -1 else 0
+        cuts.append((at, at, REGISTRY_IMPORT))
+    out, last = [], 0
+    for start, end, text in sorted(cuts):
+        out.append(src[last:start])
+        out.append(text)
+        last = end
+    out.append(src[last:])
+    return prune_imports(''.join(out), set().union(*(g['refs'] for g in moved)) if moved else set())
+
+
+def prune_imports(src, candidates):
+    """Drop import specifiers the extracted cases took with them and route.ts no longer reads."""
+    toks = lex(src)
+    imports = parse_imports(src, toks)
+    # every identifier occurrence outside import statements
+    import_spans = []
+    for k, t in enumerate(toks):
+        if t.kind == 'id' and t.val == 'import' and t.depth == 0:
+            m = k + 1
+            while toks[m].kind != 'str':
+                m += 1
+            import_spans.append((t.start, toks[m].end))
+    used = set()
+    for k, t in enumerate(toks):
+        if t.kind == 'id' and not any(a <= t.start < b for a, b in import_spans):
+            if not (k and toks[k - 1].val == '.'):
+                used.add(t.val)
+    dead = {n for n in candidates if n in imports and n not in used}
+    if not dead:
+        return src
+    out = src
+    for a, b in reversed(import_spans):
+        stmt = out[a:b]
+        names_here = [n for n in dead if re.search(r'\b' + re.escape(n) + r'\b', stmt)]
+        if not names_here:
+            continue
+        named = re.search(r'\{([^}]*)\}', stmt)
+        if not named:
+            # default / namespace import of a dead name: drop the statement
+            if re.match(r'import\s+(\*\s+as\s+)?(\w+)\s+from', stmt).group(2) in dead:
+                end = b + 1 if out.startswith('\n', b) else b
+                out = out[:a] + out[end:]
+            continue
+        keep = [p.strip() for p in named.group(1).split(',') if p.strip()
+                and re.sub(r'^type\s+', '', p.strip()).split(' as ')[-1].strip() not in dead]
+        if keep:
+            out = out[:a] + stmt[:named.start()] + '{ ' + ', '.join(keep) + ' }' + stmt[named.end():] + out[b:]
+        else:
+            end = b + 1 if out.startswith('\n', b) else b
+            out = out[:a] + out[end:]
+    return out
+
+
+# ── Report / CLI ─────────────────────────────────────────────────────────────
+
+def kb(n):
+    return f'{n / 1024:.1f} KB'
+
+
+def report(analysis, moved, kept, verbose, new_route=None, modules=None):
+    size = len(analysis['src'].encode('utf-8'))
+    cases = [g for g in analysis['groups'] if None not in g['names']]
+    print(f'{ROUTE}: {kb(size)}, {analysis["src"].count(chr(10))} lines, executeTool has {len(cases)} case branches')
+    print(f'  movable: {len(moved)} ({kb(sum(g["bytes"] for g in moved))})')
+    print(f'  staying: {len(kept)} ({kb(sum(g["bytes"] for g in kept))})')
+    reasons = {}
+    for g in kept:
+        key = g['reason'].split(':')[0]
+        reasons.setdefault(key, []).append(g)
+    for key, gs in sorted(reasons.items(), key=lambda kv: -len(kv[1])):
+        print(f'    {len(gs):>3}  {key}')
+    helpers = {}
+    for g in kept:
+        for h in g.get('blockers', []):
+            helpers.setdefault(h, []).append(g['names'][0])
+    if helpers:
+        top = sorted(helpers.items(), key=lambda kv: -len(kv[1]))[:8]
+        print('  helpers keeping the most cases in route.ts: ' + ', '.join(f'{h} ({len(c)})' for h, c in top))
+    if verbose:
+        for g in analysis['groups']:
+            if None in g['names']:
+                continue
+            status = 'move' if g['reason'] is None else 'stay'
+            print(f"    {status}  {'/'.join(g['names']):<28} {kb(g['bytes']):>9}  {g['reason'] or ''}")
+    if new_route is not None:
+        after = len(new_route.encode('utf-8'))
+        print(f'  route.ts after: {kb(after)} ({100 - 100 * after / size:.0f}% smaller); '
+              f'{len(modules)} modules in {TOOLS_DIR}/ ({kb(sum(modules.values()))}), loaded on first call')
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def boot(args):
+    """bench_chat.py boot for --base (before) and the working tree (after)."""
+    sys.path.insert(0, HERE)
+    import bench_chat
+    common = ['--build', '--repeat', str(args.repeat)] + (['--db', args.db] if args.db else [])
+    print(f'\ncold start and first /api/chat response, before ({args.base}):')
+    bench_chat.main(['boot', '--rev', args.base, *common])
+    print('\nafter (working tree):')
+    bench_chat.main(['boot', *common])
+
+
+# Type-strips a .ts file to an ES module: the project's `typescript` when
+# node_modules has it, else node's own stripTypeScriptTypes (node >= 22.13)
+STRIP_JS = r'''
+const fs = require('fs')
+const [src, out] = process.argv.slice(1)
+const code = fs.readFileSync(src, 'utf-8')
+let js
+try {
+  const ts = require('typescript')
+  js = ts.transpileModule(code, { compilerOptions: { module: ts.ModuleKind.ESNext, target: ts.ScriptTarget.ES2019 } }).outputText
+} catch (_) {
+  js = require('node:module').stripTypeScriptTypes(code, { mode: 'transform' })
+}
+fs.writeFileSync(out, js)
+'''
+
+# One cold sample: a fresh process, so V8's compilation cache is empty
+PARSE_JS = r'''
+const vm = require('vm')
+const code = require('fs').readFileSync(process.argv[1], 'utf-8')
+const t0 = process.hrtime.bigint()
+new vm.SourceTextModule(code, { identifier: process.argv[1] })
+console.log(Number(process.hrtime.bigint() - t0) / 1e6)
+'''
+
+
+def parse_cost(args):
+    """Cold parse + compile of route.ts at --base and in the working tree."""
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, rev in ((f'before ({args.base})', args.base), ('after (working tree)', None)):
+            src = os.path.join(tmp, 'route.ts')
+            if rev:
+                text = subprocess.run(['git', 'show', f'{rev}:{ROUTE}'], cwd=args.root, check=True,
+                                      capture_output=True, text=True).stdout
+                write(src, text)
+            else:
+                src = os.path.join(args.root, ROUTE)
+            out = os.path.join(tmp, 'route.mjs')
+            subprocess.run(['node', '--no-warnings', '-e', STRIP_JS, src, out], cwd=args.root, check=True)
+            # lazy: what V8 compiles up front; eager (--no-lazy): every function body too,
+            # an upper bound that includes executeTool's full compile on its first call
+            samples = {mode: [float(subprocess.run(['node', '--no-warnings', '--experimental-vm-modules', *flags,
+                                                    '-e', PARSE_JS, out],
+                                                   check=True, capture_output=True, text=True).stdout)
+                              for _ in range(args.repeat)]
+                       for mode, flags in (('lazy', []), ('eager', ['--no-lazy']))}
+            rows.append((label, os.path.getsize(src), os.path.getsize(out), samples))
+    print(f'\nroute.ts parse + compile, fresh node per sample, {args.repeat} samples, p50 (min) ms:')
+    print(f"  {'tree':<28} {'ts':>10} {'js':>10} {'lazy':>14} {'eager':>14}")
+    for label, ts_bytes, js_bytes, samples in rows:
+        cells = [f'{statistics.median(samples[m]):.1f} ({min(samples[m]):.1f})' for m in ('lazy', 'eager')]
+        print(f'  {label:<28} {kb(ts_bytes):>10} {kb(js_bytes):>10} {cells[0]:>14} {cells[1]:>14}')
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Move executeTool cases into lazily loaded modules')
+    ap.add_argument('--root', default=ROOT)
+    ap.add_argument('--write', action='store_true', help='write the modules and registry and rewrite route.ts')
+    ap.add_argument('--check', action='store_true', help='exit 1 if a movable case or a stale registry remains')
+    ap.add_argument('--only', action='append', help='limit --write to these tools (repeatable)')
+    ap.add_argument('--verbose', action='store_true')
+    ap.add_argument('--boot', action='store_true', help='benchmark cold start and first response: --base vs working tree')
+    ap.add_argument('--parse', action='store_true', help='benchmark parse + compile of route.ts: --base vs working tree')
+    ap.add_argument('--base', default='HEAD', help='revision to compare against for --boot / --parse')
+    ap.add_argument('--db', default=os.environ.get('DATABASE_URL'), help='local Postgres URL for --boot')
+    ap.add_argument('--repeat', type=int, default=5, help='boots (--boot) or samples (--parse) per tree')
+    args = ap.parse_args(argv)
+
+    analysis = analyze(args.root)
+    movable = [g for g in analysis['groups'] if g['reason'] is None]
+    kept = [g for g in analysis['groups'] if g['reason'] is not None and None not in g['names']]
+    moved = [g for g in movable if not args.only or g['names'][0] in args.only]
+
+    if args.check:
+        owners = module_tools(args.root)
+        reg_path = os.path.join(args.root, REGISTRY)
+        current = open(reg_path, encoding='utf-8').read() if os.path.exists(reg_path) else ''
+        stale = owners and current != render_registry(owners)
+        report(analysis, movable, kept, args.verbose)
+        if stale:
+            print(f'{REGISTRY} is stale - run with --write')
+        return 1 if movable or stale else 0
+
+    if not args.write:
+        report(analysis, movable, kept, args.verbose)
+        if movable:
+            print('dry run - nothing written; --write to apply')
+        if args.boot:
+            boot(args)
+        if args.parse:
+            parse_cost(args)
+        return 0
+
+    if analysis['ctx_type'] is None:
+        raise SystemExit('executeTool ctx parameter type not found')
+    modules = {}
+    existing = module_tools(args.root)
+    for g in moved:
+        clash = [n for n in g['names'] if n in existing]
+        if clash:
+            raise SystemExit(f"{', '.join(clash)} already has a module in {TOOLS_DIR}/ and a case in route.ts - remove one")
+        text = render_module(analysis, g)
+        modules[g['names'][0]] = len(text.encode('utf-8'))
+        write(os.path.join(args.root, TOOLS_DIR, g['names'][0] + '.ts'), text)
+    new_route = rewrite_route(analysis, moved) if moved else analysis['src']
+    write(os.path.join(args.root, TYPES), render_types(analysis['ctx_type']))
+    write(os.path.join(args.root, REGISTRY), render_registry(module_tools(args.root)))
+    write(os.path.join(args.root, ROUTE), new_route)
+    report(analysis, moved, kept, args.verbose, new_route, modules)
+
+    if args.boot:
+        boot(args)
+    if args.parse:
+        parse_cost(args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 """Sprint 2 wiring patch - runs in GitHub Actions."""
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from patchlib import PatchError, apply_patches
 
 with open('src/app/api/chat/route.ts', 'r', encoding='utf-8') as f:
     content = f.read()
 
 original_size = len(content)
 print(f"Original: {original_size} chars")
+patches = []
 
 OLD_IMPORT = "import { writeWorklog, writeMsgBatch } from '@/lib/worklog'"
 NEW_IMPORT = (
@@ -13,15 +18,16 @@ NEW_IMPORT = (
     "import { SPARKIE_TOOLS_S2 } from '@/lib/sprint2-tools'\n"
     "import { executeSprint2Tool } from '@/lib/sprint2-cases'"
 )
-assert OLD_IMPORT in content, "PATCH1 anchor not found"
-content = content.replace(OLD_IMPORT, NEW_IMPORT, 1)
-print("PATCH 1 OK")
+patches.append((OLD_IMPORT, NEW_IMPORT, "PATCH 1"))
 
+# PATCH 2 - spread S2 at the close of the tools array (the one holding send_email).
+# "  },\n]\n" closes other arrays too, so the anchor runs from send_email to it.
 idx = content.rfind("name: 'send_email'")
 close_idx = content.find("  },\n]\n", idx)
-assert close_idx > 0, "PATCH2 array close not found"
-content = content[:close_idx] + "  },\n  ...SPARKIE_TOOLS_S2,\n]\n" + content[close_idx + len("  },\n]\n"):]
-print("PATCH 2 OK")
+assert idx > 0 and close_idx > 0, "PATCH2 array close not found"
+OLD_SPREAD = content[idx:close_idx + len("  },\n]\n")]
+NEW_SPREAD = content[idx:close_idx] + "  },\n  ...SPARKIE_TOOLS_S2,\n]\n"
+patches.append((OLD_SPREAD, NEW_SPREAD, "PATCH 2"))
 
 OLD_DEFAULT = (
     "      default:\n"
@@ -41,15 +47,15 @@ NEW_DEFAULT = (
     "        return 'Tool not available: ' + name\n"
     "      }"
 )
-assert OLD_DEFAULT in content, "PATCH3 default case not found"
-content = content.replace(OLD_DEFAULT, NEW_DEFAULT, 1)
-print("PATCH 3 OK")
+patches.append((OLD_DEFAULT, NEW_DEFAULT, "PATCH 3"))
 
+# PATCH 4 - hive labels, inserted before the close of the map holding get_current_time
 gct_idx = content.find('get_current_time: "')
 assert gct_idx > 0, "PATCH4 hive anchor not found"
 hive_close = content.find('      }\n      const pickHive', gct_idx)
 assert hive_close > 0, "PATCH4 hive close not found"
 insert_at = content.rfind('\n', 0, hive_close) + 1
+hive_end = hive_close + len('      }\n      const pickHive')
 sprint2_hive = (
     '        // Sprint 2\n'
     '        get_schema: "Schema Bee Active",\n'
@@ -59,8 +65,11 @@ sprint2_hive = (
     '        transcribe_audio: "Transcription Bee Online",\n'
     '        text_to_speech: "Voice Synthesis Active",\n'
 )
-content = content[:insert_at] + sprint2_hive + content[insert_at:]
-print("PATCH 4 OK")
+patches.append((
+    content[gct_idx:hive_end],
+    content[gct_idx:insert_at] + sprint2_hive + content[insert_at:hive_end],
+    "PATCH 4",
+))
 
 OLD_CHIP = "            send_email: 'Sending email...',\n          }"
 NEW_CHIP = (
@@ -70,9 +79,7 @@ NEW_CHIP = (
     "            transcribe_audio: 'Transcribing audio...', text_to_speech: 'Synthesizing speech...',\n"
     "          }"
 )
-assert OLD_CHIP in content, "PATCH5 chip not found"
-content = content.replace(OLD_CHIP, NEW_CHIP, 1)
-print("PATCH 5 OK")
+patches.append((OLD_CHIP, NEW_CHIP, "PATCH 5"))
 
 OLD_WLOG = "            send_email: 'Running the tool \u2014 sending email',\n          }"
 NEW_WLOG = (
@@ -85,9 +92,7 @@ NEW_WLOG = (
     "            text_to_speech: 'Running the tool \u2014 text to speech',\n"
     "          }"
 )
-assert OLD_WLOG in content, "PATCH6 worklog not found"
-content = content.replace(OLD_WLOG, NEW_WLOG, 1)
-print("PATCH 6 OK")
+patches.append((OLD_WLOG, NEW_WLOG, "PATCH 6"))
 
 OLD_ICON = "            send_email: 'zap',\n          }"
 NEW_ICON = (
@@ -96,9 +101,17 @@ NEW_ICON = (
     "            create_calendar_event: 'calendarToday', transcribe_audio: 'mic', text_to_speech: 'mic',\n"
     "          }"
 )
-assert OLD_ICON in content, "PATCH7 icon not found"
-content = content.replace(OLD_ICON, NEW_ICON, 1)
-print("PATCH 7 OK")
+patches.append((OLD_ICON, NEW_ICON, "PATCH 7"))
+
+# Apply every patch in one pass over the original content
+try:
+    content, warnings = apply_patches(content, patches, 'src/app/api/chat/route.ts')
+except PatchError as e:
+    raise SystemExit('\n'.join(e.problems))
+for w in warnings:
+    print(f"WARN: {w}")
+for _old, _new, desc in patches:
+    print(f"{desc} OK")
 
 checks = [
     "import { SPARKIE_TOOLS_S2 }",
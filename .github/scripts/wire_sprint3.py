@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 """Sprint 3 wiring patch - runs in GitHub Actions."""
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from patchlib import PatchError, apply_patches
 
 with open('src/app/api/chat/route.ts', 'r', encoding='utf-8') as f:
     content = f.read()
 
 original_size = len(content)
 print(f"Original: {original_size} chars")
+patches = []
 
 # PATCH 1 - add S3 imports after S2 imports
 OLD_IMPORT = "import { executeSprint2Tool } from '@/lib/sprint2-cases'"
@@ -14,16 +19,12 @@ NEW_IMPORT = (
     "import { SPARKIE_TOOLS_S3 } from '@/lib/sprint3-tools'\n"
     "import { executeSprint3Tool } from '@/lib/sprint3-cases'"
 )
-assert OLD_IMPORT in content, "PATCH1 anchor not found"
-content = content.replace(OLD_IMPORT, NEW_IMPORT, 1)
-print("PATCH 1 OK")
+patches.append((OLD_IMPORT, NEW_IMPORT, "PATCH 1"))
 
 # PATCH 2 - spread S3 after S2 in tools array
 OLD_SPREAD = "  ...SPARKIE_TOOLS_S2,\n]"
 NEW_SPREAD = "  ...SPARKIE_TOOLS_S2,\n  ...SPARKIE_TOOLS_S3,\n]"
-assert OLD_SPREAD in content, "PATCH2 S2 spread not found"
-content = content.replace(OLD_SPREAD, NEW_SPREAD, 1)
-print("PATCH 2 OK")
+patches.append((OLD_SPREAD, NEW_SPREAD, "PATCH 2"))
 
 # PATCH 3 - chain S3 in default case
 OLD_DEFAULT = (
@@ -38,9 +39,7 @@ NEW_DEFAULT = (
     "        if (s3result !== null) return s3result\n"
     "        if (userId) {"
 )
-assert OLD_DEFAULT in content, "PATCH3 default case not found"
-content = content.replace(OLD_DEFAULT, NEW_DEFAULT, 1)
-print("PATCH 3 OK")
+patches.append((OLD_DEFAULT, NEW_DEFAULT, "PATCH 3"))
 
 # PATCH 4 - hive labels
 OLD_HIVE = '        text_to_speech: "Voice Synthesis Active",'
@@ -54,9 +53,7 @@ NEW_HIVE = (
     '        run_tests: "Test Runner Active",\n'
     '        check_lint: "Lint Checker Active",'
 )
-assert OLD_HIVE in content, "PATCH4 hive anchor not found"
-content = content.replace(OLD_HIVE, NEW_HIVE, 1)
-print("PATCH 4 OK")
+patches.append((OLD_HIVE, NEW_HIVE, "PATCH 4"))
 
 # PATCH 5 - chip labels
 OLD_CHIP = "            transcribe_audio: 'Transcribing audio...', text_to_speech: 'Synthesizing speech...',\n          }"
@@ -67,9 +64,7 @@ NEW_CHIP = (
     "            run_tests: 'Running tests...', check_lint: 'Checking lint...',\n"
     "          }"
 )
-assert OLD_CHIP in content, "PATCH5 chip not found"
-content = content.replace(OLD_CHIP, NEW_CHIP, 1)
-print("PATCH 5 OK")
+patches.append((OLD_CHIP, NEW_CHIP, "PATCH 5"))
 
 # PATCH 6 - worklog labels
 OLD_WLOG = "            text_to_speech: 'Running the tool \u2014 text to speech',\n          }"
@@ -83,9 +78,7 @@ NEW_WLOG = (
     "            check_lint: 'Running lint check',\n"
     "          }"
 )
-assert OLD_WLOG in content, "PATCH6 worklog not found"
-content = content.replace(OLD_WLOG, NEW_WLOG, 1)
-print("PATCH 6 OK")
+patches.append((OLD_WLOG, NEW_WLOG, "PATCH 6"))
 
 # PATCH 7 - icon map
 OLD_ICON = "            create_calendar_event: 'calendarToday', transcribe_audio: 'mic', text_to_speech: 'mic',\n          }"
@@ -95,9 +88,17 @@ NEW_ICON = (
     "            delete_memory: 'trash', run_tests: 'checkCircle', check_lint: 'alertCircle',\n"
     "          }"
 )
-assert OLD_ICON in content, "PATCH7 icon not found"
-content = content.replace(OLD_ICON, NEW_ICON, 1)
-print("PATCH 7 OK")
+patches.append((OLD_ICON, NEW_ICON, "PATCH 7"))
+
+# Apply every patch in one pass over the original content
+try:
+    content, warnings = apply_patches(content, patches, 'src/app/api/chat/route.ts')
+except PatchError as e:
+    raise SystemExit('\n'.join(e.problems))
+for w in warnings:
+    print(f"WARN: {w}")
+for _old, _new, desc in patches:
+    print(f"{desc} OK")
 
 # Verify all insertions
 checks = [
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 """Sprint 4 wiring patch - runs in GitHub Actions."""
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from patchlib import PatchError, apply_patches
 
 with open('src/app/api/chat/route.ts', 'r', encoding='utf-8') as f:
     content = f.read()
 
 original_size = len(content)
 print(f"Original: {original_size} chars")
+patches = []
 
 # PATCH 1 - add S4 imports after S3 imports
 OLD_IMPORT = "import { executeSprint3Tool } from '@/lib/sprint3-cases'"
@@ -14,16 +19,12 @@ NEW_IMPORT = (
     "import { SPARKIE_TOOLS_S4 } from '@/lib/sprint4-tools'\n"
     "import { executeSprint4Tool } from '@/lib/sprint4-cases'"
 )
-assert OLD_IMPORT in content, "PATCH1 anchor not found"
-content = content.replace(OLD_IMPORT, NEW_IMPORT, 1)
-print("PATCH 1 OK")
+patches.append((OLD_IMPORT, NEW_IMPORT, "PATCH 1"))
 
 # PATCH 2 - spread S4 after S3 in tools array
 OLD_SPREAD = "  ...SPARKIE_TOOLS_S3,\n]"
 NEW_SPREAD = "  ...SPARKIE_TOOLS_S3,\n  ...SPARKIE_TOOLS_S4,\n]"
-assert OLD_SPREAD in content, "PATCH2 S3 spread not found"
-content = content.replace(OLD_SPREAD, NEW_SPREAD, 1)
-print("PATCH 2 OK")
+patches.append((OLD_SPREAD, NEW_SPREAD, "PATCH 2"))
 
 # PATCH 3 - chain S4 in default case
 OLD_DEFAULT = (
@@ -38,9 +39,7 @@ NEW_DEFAULT = (
     "        if (s4result !== null) return s4result\n"
     "        if (userId) {"
 )
-assert OLD_DEFAULT in content, "PATCH3 default case not found"
-content = content.replace(OLD_DEFAULT, NEW_DEFAULT, 1)
-print("PATCH 3 OK")
+patches.append((OLD_DEFAULT, NEW_DEFAULT, "PATCH 3"))
 
 # PATCH 4 - hive labels
 OLD_HIVE = '        check_lint: "Lint Checker Active",'
@@ -55,9 +54,7 @@ NEW_HIVE = (
     '        fetch_url: "Web Reader Active",\n'
     '        research: "Research Engine Active",'
 )
-assert OLD_HIVE in content, "PATCH4 hive anchor not found"
-content = content.replace(OLD_HIVE, NEW_HIVE, 1)
-print("PATCH 4 OK")
+patches.append((OLD_HIVE, NEW_HIVE, "PATCH 4"))
 
 # PATCH 5 - chip labels
 OLD_CHIP = "            run_tests: 'Running tests...', check_lint: 'Checking lint...',\n          }"
@@ -68,9 +65,7 @@ NEW_CHIP = (
     "            analyze_file: 'Analyzing file...', fetch_url: 'Fetching URL...', research: 'Researching...',\n"
     "          }"
 )
-assert OLD_CHIP in content, "PATCH5 chip not found"
-content = content.replace(OLD_CHIP, NEW_CHIP, 1)
-print("PATCH 5 OK")
+patches.append((OLD_CHIP, NEW_CHIP, "PATCH 5"))
 
 # PATCH 6 - worklog labels
 OLD_WLOG = "            check_lint: 'Running lint check',\n          }"
@@ -85,9 +80,7 @@ NEW_WLOG = (
     "            research: 'Researching topic',\n"
     "          }"
 )
-assert OLD_WLOG in content, "PATCH6 worklog not found"
-content = content.replace(OLD_WLOG, NEW_WLOG, 1)
-print("PATCH 6 OK")
+patches.append((OLD_WLOG, NEW_WLOG, "PATCH 6"))
 
 # PATCH 7 - icon map
 OLD_ICON = "            delete_memory: 'trash', run_tests: 'checkCircle', check_lint: 'alertCircle',\n          }"
@@ -97,9 +90,17 @@ NEW_ICON = (
     "            manage_calendar_event: 'calendar', analyze_file: 'file', fetch_url: 'globe', research: 'search',\n"
     "          }"
 )
-assert OLD_ICON in content, "PATCH7 icon not found"
-content = content.replace(OLD_ICON, NEW_ICON, 1)
-print("PATCH 7 OK")
+patches.append((OLD_ICON, NEW_ICON, "PATCH 7"))
+
+# Apply every patch in one pass over the original content
+try:
+    content, warnings = apply_patches(content, patches, 'src/app/api/chat/route.ts')
+except PatchError as e:
+    raise SystemExit('\n'.join(e.problems))
+for w in warnings:
+    print(f"WARN: {w}")
+for _old, _new, desc in patches:
+    print(f"{desc} OK")
 
 # Verify
 checks = [
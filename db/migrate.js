@@ -0,0 +1,233 @@
+/**
+ * db/migrate.js — versioned schema migrations
+ *
+ * Applies db/migrations/NNNN_name.sql in version order and records each one in
+ * schema_version. server.js runs the transactional ones at boot, before it
+ * starts listening, so request paths can assume the schema exists instead of
+ * re-running CREATE TABLE IF NOT EXISTS guards on every cold process.
+ *
+ *   - Each file runs in its own transaction, recorded in the same transaction
+ *   - A file whose first line is `-- migrate:no-transaction` is a build: it runs
+ *     statement by statement outside a transaction (CREATE INDEX CONCURRENTLY);
+ *     statements are split on a `;` at end of line, so keep those files to
+ *     plain DDL. Builds only add indexes, so server.js defers them
+ *     (builds: 'defer') and applies them after it is listening (builds: 'only')
+ *   - A failed concurrent build leaves an INVALID index that IF NOT EXISTS would
+ *     skip forever; before each CREATE INDEX CONCURRENTLY an invalid index of
+ *     the same name is dropped so the build is retried
+ *   - A session advisory lock serialises instances booting at the same time;
+ *     builds take a second one, so a deferred build never holds up another
+ *     instance's boot, and an index another session is still building (also
+ *     INVALID until it finishes) is never mistaken for a failed one
+ *   - Applied files are checksummed; editing one afterwards only warns —
+ *     add a new migration instead
+ *
+ * Uses its own single pg client rather than the app pool (src/lib/db.ts is
+ * TypeScript and only exists inside the Next bundle).
+ *
+ * CLI: `npm run migrate` (or `node db/migrate.js --status`); applies builds
+ * inline. `npm run dev` runs it before `next dev`, reading DATABASE_URL from
+ * the same .env files Next loads.
+ */
+
+'use strict'
+
+const fs     = require('fs')
+const path   = require('path')
+const crypto = require('crypto')
+const { Client } = require('pg')
+
+const MIGRATIONS_DIR = path.join(__dirname, 'migrations')
+const LOCK_KEY = 'sparkie_schema_migrations'
+const BUILD_LOCK_KEY = 'sparkie_schema_builds'
+const FILE_RE = /^(\d+)_([\w-]+)\.sql$/
+const NO_TRANSACTION = /^--\s*migrate:no-transaction\b/
+const CONCURRENT_INDEX_RE = /^CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+("?[\w.]+"?)/i
+
+// Same TLS handling as src/lib/db.ts
+function clientConfig(rawUrl) {
+  const sslDisabled = rawUrl.includes('sslmode=disable')
+  const connectionString = sslDisabled || rawUrl.includes('sslmode=no-verify')
+    ? rawUrl
+    : `${rawUrl}${rawUrl.includes('?') ? '&' : '?'}sslmode=no-verify`
+  return {
+    connectionString,
+    ssl: sslDisabled ? false : { rejectUnauthorized: false },
+    connectionTimeoutMillis: 10000,
+  }
+}
+
+function loadMigrations(dir = MIGRATIONS_DIR) {
+  const seen = new Map()
+  return fs.readdirSync(dir)
+    .filter(f => FILE_RE.test(f))
+    .map(file => {
+      const [, num, name] = file.match(FILE_RE)
+      const version = parseInt(num, 10)
+      if (seen.has(version)) throw new Error(`duplicate migration version ${version}: ${seen.get(version)} and ${file}`)
+      seen.set(version, file)
+      const sql = fs.readFileSync(path.join(dir, file), 'utf8')
+      return {
+        version,
+        name,
+        file,
+        sql,
+        checksum: crypto.createHash('sha256').update(sql).digest('hex').slice(0, 16),
+        transactional: !NO_TRANSACTION.test(sql),
+      }
+    })
+    .sort((a, b) => a.version - b.version)
+}
+
+function splitStatements(sql) {
+  return sql
+    .split(/;\s*$/m)
+    .map(s => s.replace(/^\s*--.*$/gm, '').trim())
+    .filter(Boolean)
+}
+
+function record(client, m, ms) {
+  return client.query(
+    'INSERT INTO schema_version (version, name, checksum, duration_ms) VALUES ($1, $2, $3, $4)',
+    [m.version, m.name, m.checksum, ms]
+  )
+}
+
+// Drop what an interrupted CREATE INDEX CONCURRENTLY left behind. Only safe
+// under BUILD_LOCK_KEY: a build still in progress is INVALID too.
+async function dropInvalidIndex(client, stmt, log) {
+  const match = stmt.match(CONCURRENT_INDEX_RE)
+  if (!match) return
+  const { rows } = await client.query(
+    'SELECT NOT i.indisvalid AS invalid FROM pg_index i WHERE i.indexrelid = to_regclass($1)',
+    [match[1]]
+  )
+  if (!rows[0]?.invalid) return
+  log(`[migrate] dropping invalid index ${match[1]} left by an interrupted build`)
+  await client.query(`DROP INDEX CONCURRENTLY IF EXISTS ${match[1]}`)
+}
+
+async function applyBuild(client, m, log) {
+  await client.query('SELECT pg_advisory_lock(hashtext($1))', [BUILD_LOCK_KEY])
+  try {
+    // Another instance may have finished this build while we waited
+    const { rowCount } = await client.query('SELECT 1 FROM schema_version WHERE version = $1', [m.version])
+    if (rowCount) return null
+    const t0 = Date.now()
+    for (const stmt of splitStatements(m.sql)) {
+      await dropInvalidIndex(client, stmt, log)
+      await client.query(stmt)
+    }
+    await record(client, m, Date.now() - t0)
+    return Date.now() - t0
+  } finally {
+    await client.query('SELECT pg_advisory_unlock(hashtext($1))', [BUILD_LOCK_KEY]).catch(() => {})
+  }
+}
+
+async function applyOne(client, m, log) {
+  if (!m.transactional) return applyBuild(client, m, log)
+  const t0 = Date.now()
+  await client.query('BEGIN')
+  try {
+    await client.query(m.sql)
+    await record(client, m, Date.now() - t0)
+    await client.query('COMMIT')
+  } catch (err) {
+    await client.query('ROLLBACK').catch(() => {})
+    throw err
+  }
+  return Date.now() - t0
+}
+
+/**
+ * Bring the database up to the newest migration.
+ * builds: 'include' (default) applies everything in order, 'defer' skips the
+ * no-transaction builds and lists them in `deferred`, 'only' applies just the
+ * pending builds (without the boot lock).
+ * Resolves { version, applied: [{ version, name, ms }], deferred, ms, skipped }.
+ */
+async function migrate({ connectionString = process.env.DATABASE_URL, dir = MIGRATIONS_DIR, log = console.log, dryRun = false, builds = 'include' } = {}) {
+  const started = Date.now()
+  if (!connectionString) {
+    log('[migrate] DATABASE_URL not set — skipping')
+    return { version: null, applied: [], deferred: [], ms: 0, skipped: true }
+  }
+  const migrations = loadMigrations(dir)
+  const client = new Client(clientConfig(connectionString))
+  await client.connect()
+  try {
+    if (builds !== 'only') await client.query('SELECT pg_advisory_lock(hashtext($1))', [LOCK_KEY])
+    await client.query(`
+      CREATE TABLE IF NOT EXISTS schema_version (
+        version     INTEGER PRIMARY KEY,
+        name        TEXT NOT NULL,
+        checksum    TEXT NOT NULL,
+        duration_ms INTEGER,
+        applied_at  TIMESTAMPTZ DEFAULT NOW()
+      )
+    `)
+    const done = new Map(
+      (await client.query('SELECT version, checksum FROM schema_version')).rows.map(r => [r.version, r.checksum])
+    )
+    const applied = []
+    const deferred = []
+    for (const m of migrations) {
+      if (done.has(m.version)) {
+        if (done.get(m.version) !== m.checksum) {
+          log(`[migrate] warning: ${m.file} changed after it was applied — add a new migration instead`)
+        }
+        continue
+      }
+      if ((builds === 'defer' && !m.transactional) || (builds === 'only' && m.transactional)) {
+        deferred.push({ version: m.version, name: m.name })
+        continue
+      }
+      if (dryRun) {
+        applied.push({ version: m.version, name: m.name, ms: 0 })
+        continue
+      }
+      try {
+        const ms = await applyOne(client, m, log)
+        if (ms === null) continue
+        applied.push({ version: m.version, name: m.name, ms })
+        log(`[migrate] applied ${m.file} in ${ms}ms`)
+      } catch (err) {
+        err.message = `${m.file}: ${err.message}`
+        throw err
+      }
+    }
+    const versions = [...done.keys(), ...(dryRun ? [] : applied.map(a => a.version))]
+    return {
+      version: versions.length ? Math.max(...versions) : null,
+      applied,
+      deferred,
+      ms: Date.now() - started,
+      skipped: false,
+    }
+  } finally {
+    if (builds !== 'only') await client.query('SELECT pg_advisory_unlock(hashtext($1))', [LOCK_KEY]).catch(() => {})
+    await client.end().catch(() => {})
+  }
+}
+
+module.exports = { migrate, loadMigrations, MIGRATIONS_DIR }
+
+if (require.main === module) {
+  // next dev / next start read .env*; the CLI runs before them, so load the same files
+  // (@next/env is a direct dependency, pinned to the `next` version)
+  require('@next/env').loadEnvConfig(path.join(__dirname, '..'), process.env.NODE_ENV !== 'production')
+  const dryRun = process.argv.includes('--status')
+  migrate({ dryRun })
+    .then(r => {
+      if (r.skipped) return
+      const pending = r.applied.map(a => `${a.version}_${a.name}`).join(', ') || 'none'
+      console.log(dryRun
+        ? `[migrate] schema at v${r.version ?? 0}, pending: ${pending}`
+        : `[migrate] schema at v${r.version ?? 0} (${r.applied.length} applied) in ${r.ms}ms`)
+    })
+    .catch(err => {
+      console.error('[migrate] failed:', err.message)
+      process.exit(1)
+    })
+}
@@ -0,0 +1,617 @@
+-- 0001_baseline.sql
+-- Every table the app used to create on first use, in one place.
+--
+-- Gathered from the CREATE TABLE IF NOT EXISTS / ALTER TABLE ... ADD COLUMN IF
+-- NOT EXISTS guards that ran on request paths (chat, agent, tasks, worklog,
+-- threadStore, toolCallWrapper, ...) and the DDL half of /api/admin/migrate.
+-- Where two call sites disagreed on a table's shape, the CREATE is the union
+-- and the ALTERs below it bring tables created by an older variant up to it.
+-- Everything is idempotent, so this is safe on a database those guards
+-- already populated.
+
+DO $$ BEGIN
+  CREATE EXTENSION IF NOT EXISTS pgcrypto;
+EXCEPTION WHEN insufficient_privilege THEN
+  RAISE NOTICE 'pgcrypto not installed — gen_random_uuid() needs PostgreSQL 13+';
+END $$;
+
+-- ── Accounts & marketplace ───────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS users (
+  id                     UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  email                  TEXT UNIQUE NOT NULL,
+  display_name           TEXT,
+  avatar_url             TEXT,
+  password_hash          TEXT,
+  email_verified         BOOLEAN DEFAULT false,
+  verify_token           TEXT,
+  verify_token_expires   TIMESTAMPTZ,
+  gender                 TEXT,
+  age                    INTEGER,
+  tier                   TEXT DEFAULT 'free',
+  credits                INTEGER DEFAULT 100,
+  role                   TEXT DEFAULT 'user',
+  preferences            JSONB DEFAULT '{}',
+  created_at             TIMESTAMPTZ DEFAULT now(),
+  updated_at             TIMESTAMPTZ DEFAULT now()
+);
+ALTER TABLE users ADD COLUMN IF NOT EXISTS password_hash          TEXT;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS email_verified         BOOLEAN DEFAULT false;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS verify_token           TEXT;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS verify_token_expires   TIMESTAMPTZ;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS gender                 TEXT;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS age                    INTEGER;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS avatar_url             TEXT;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS tier                   TEXT DEFAULT 'free';
+ALTER TABLE users ADD COLUMN IF NOT EXISTS credits                INTEGER DEFAULT 100;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS role                   TEXT DEFAULT 'user';
+ALTER TABLE users ADD COLUMN IF NOT EXISTS preferences            JSONB DEFAULT '{}';
+CREATE INDEX IF NOT EXISTS idx_users_verify_token ON users(verify_token);
+
+CREATE TABLE IF NOT EXISTS agents (
+  id                   UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  name                 TEXT NOT NULL,
+  short_desc           TEXT,
+  full_instructions    TEXT,
+  workflow             TEXT,
+  capabilities         TEXT[],
+  icon_url             TEXT,
+  creator_id           UUID REFERENCES users(id) ON DELETE SET NULL,
+  is_official          BOOLEAN DEFAULT false,
+  views                INTEGER DEFAULT 0,
+  credit_cost          INTEGER DEFAULT 1,
+  categories           TEXT[],
+  visibility           TEXT DEFAULT 'public',
+  forked_from          UUID REFERENCES agents(id) ON DELETE SET NULL,
+  created_at           TIMESTAMPTZ DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_agents_creator_id ON agents(creator_id);
+CREATE INDEX IF NOT EXISTS idx_agents_visibility ON agents(visibility);
+
+CREATE TABLE IF NOT EXISTS agent_starters (
+  id          UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  agent_id    UUID REFERENCES agents(id) ON DELETE CASCADE,
+  text        TEXT NOT NULL,
+  sort_order  INTEGER DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS generations (
+  id            UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id       UUID REFERENCES users(id) ON DELETE SET NULL,
+  type          TEXT NOT NULL,
+  model         TEXT,
+  prompt        TEXT,
+  output_url    TEXT,
+  duration_sec  INTEGER,
+  credits_used  INTEGER DEFAULT 1,
+  metadata      JSONB,
+  created_at    TIMESTAMPTZ DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_generations_user_id ON generations(user_id);
+CREATE INDEX IF NOT EXISTS idx_generations_type ON generations(type);
+
+CREATE TABLE IF NOT EXISTS credit_transactions (
+  id          UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id     UUID REFERENCES users(id) ON DELETE SET NULL,
+  amount      INTEGER NOT NULL,
+  reason      TEXT,
+  ref_id      UUID,
+  created_at  TIMESTAMPTZ DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_credit_transactions_user_id ON credit_transactions(user_id);
+
+CREATE TABLE IF NOT EXISTS subscriptions (
+  id                   UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id              UUID REFERENCES users(id) ON DELETE CASCADE UNIQUE,
+  tier                 TEXT NOT NULL,
+  status               TEXT DEFAULT 'active',
+  current_period_end   TIMESTAMPTZ,
+  stripe_sub_id        TEXT,
+  created_at           TIMESTAMPTZ DEFAULT now()
+);
+
+-- ── Memory ───────────────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS user_memories (
+  id          SERIAL PRIMARY KEY,
+  user_id     TEXT NOT NULL,
+  category    TEXT NOT NULL DEFAULT 'general',
+  hint        TEXT,
+  quote       TEXT,
+  content     TEXT NOT NULL,
+  source      TEXT DEFAULT 'sparkie',
+  created_at  TIMESTAMPTZ DEFAULT NOW(),
+  updated_at  TIMESTAMPTZ DEFAULT NOW()
+);
+ALTER TABLE user_memories ADD COLUMN IF NOT EXISTS category   TEXT DEFAULT 'general';
+ALTER TABLE user_memories ADD COLUMN IF NOT EXISTS hint       TEXT;
+ALTER TABLE user_memories ADD COLUMN IF NOT EXISTS quote      TEXT;
+ALTER TABLE user_memories ADD COLUMN IF NOT EXISTS source     TEXT DEFAULT 'sparkie';
+ALTER TABLE user_memories ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+CREATE INDEX IF NOT EXISTS idx_user_memories_user_id ON user_memories(user_id);
+CREATE INDEX IF NOT EXISTS idx_user_memories_user_created ON user_memories(user_id, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS user_sessions (
+  id            SERIAL PRIMARY KEY,
+  user_id       TEXT NOT NULL UNIQUE,
+  last_seen_at  TIMESTAMPTZ DEFAULT NOW(),
+  session_count INTEGER DEFAULT 1,
+  first_seen_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS sparkie_self_memory (
+  id            SERIAL PRIMARY KEY,
+  category      TEXT NOT NULL DEFAULT 'self',
+  content       TEXT NOT NULL,
+  source        TEXT DEFAULT 'sparkie',
+  memory_type   TEXT DEFAULT 'self',
+  expires_at    TIMESTAMPTZ,
+  stale_flagged BOOLEAN DEFAULT false,
+  created_at    TIMESTAMPTZ DEFAULT NOW()
+);
+ALTER TABLE sparkie_self_memory
+  ADD COLUMN IF NOT EXISTS source        TEXT DEFAULT 'sparkie',
+  ADD COLUMN IF NOT EXISTS memory_type   TEXT DEFAULT 'self',
+  ADD COLUMN IF NOT EXISTS expires_at    TIMESTAMPTZ,
+  ADD COLUMN IF NOT EXISTS stale_flagged BOOLEAN DEFAULT false;
+CREATE INDEX IF NOT EXISTS idx_sparkie_self_memory_category ON sparkie_self_memory(category);
+
+CREATE TABLE IF NOT EXISTS user_identity_files (
+  id          SERIAL PRIMARY KEY,
+  user_id     TEXT NOT NULL,
+  file_type   TEXT NOT NULL,
+  content     TEXT NOT NULL DEFAULT '',
+  created_at  TIMESTAMPTZ DEFAULT NOW(),
+  updated_at  TIMESTAMPTZ DEFAULT NOW(),
+  CONSTRAINT user_identity_files_user_type_unique UNIQUE (user_id, file_type)
+);
+CREATE INDEX IF NOT EXISTS idx_user_identity_files_user_id ON user_identity_files(user_id);
+
+CREATE TABLE IF NOT EXISTS sparkie_user_model (
+  user_id              TEXT PRIMARY KEY,
+  peak_hours           JSONB DEFAULT '[]',
+  avg_response_time_ms INTEGER DEFAULT 0,
+  follow_up_rate       REAL DEFAULT 0,
+  satisfaction_signals JSONB DEFAULT '{"highSatisfaction":[],"lowSatisfaction":[]}',
+  preferred_format     TEXT DEFAULT 'mixed',
+  session_count        INTEGER DEFAULT 0,
+  raw_signals          JSONB DEFAULT '[]',
+  updated_at           TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- ── Conversation ─────────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS chat_messages (
+  id           UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id      TEXT NOT NULL,
+  role         TEXT NOT NULL CHECK (role IN ('user', 'assistant')),
+  content      TEXT NOT NULL,
+  msg_type     TEXT DEFAULT 'text',
+  metadata     JSONB,
+  created_at   TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_chat_messages_user_id ON chat_messages(user_id);
+CREATE INDEX IF NOT EXISTS idx_chat_messages_created_at ON chat_messages(user_id, created_at);
+
+CREATE TABLE IF NOT EXISTS sparkie_threads (
+  id               BIGSERIAL PRIMARY KEY,
+  user_id          TEXT NOT NULL,
+  role             TEXT NOT NULL,
+  content          TEXT NOT NULL,
+  tool_call_id     TEXT,
+  is_tool_result   BOOLEAN DEFAULT FALSE,
+  is_pinned        BOOLEAN DEFAULT FALSE,
+  is_compressed    BOOLEAN DEFAULT FALSE,
+  token_estimate   INT DEFAULT 0,
+  created_at       TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_sparkie_threads_user ON sparkie_threads(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_sparkie_threads_pinned ON sparkie_threads(user_id, is_pinned);
+
+CREATE TABLE IF NOT EXISTS sparkie_deferred_intents (
+  id            UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id       TEXT NOT NULL,
+  intent        TEXT NOT NULL,
+  source_msg    TEXT DEFAULT '',
+  not_before    TIMESTAMPTZ DEFAULT NOW(),
+  due_at        TIMESTAMPTZ,
+  status        TEXT DEFAULT 'pending',
+  surfaced_at   TIMESTAMPTZ,
+  created_at    TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_deferred_intents_user ON sparkie_deferred_intents(user_id, status, not_before);
+
+-- ── Tasks, worklog & tracing ─────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS sparkie_tasks (
+  id             TEXT PRIMARY KEY,
+  user_id        TEXT NOT NULL,
+  action         TEXT NOT NULL,
+  label          TEXT NOT NULL,
+  payload        JSONB NOT NULL DEFAULT '{}',
+  status         TEXT NOT NULL DEFAULT 'pending',
+  executor       TEXT NOT NULL DEFAULT 'human',
+  trigger_type   TEXT DEFAULT 'manual',
+  trigger_config JSONB DEFAULT '{}',
+  scheduled_at   TIMESTAMPTZ,
+  why_human      TEXT,
+  depends_on     TEXT,
+  draft_id       TEXT,
+  result         TEXT,
+  created_at     TIMESTAMPTZ DEFAULT NOW(),
+  resolved_at    TIMESTAMPTZ
+);
+ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS executor       TEXT NOT NULL DEFAULT 'human';
+ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS trigger_type   TEXT DEFAULT 'manual';
+ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS trigger_config JSONB DEFAULT '{}';
+ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS scheduled_at   TIMESTAMPTZ;
+ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS why_human      TEXT;
+ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS depends_on     TEXT;
+ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS draft_id       TEXT;
+ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS result         TEXT;
+CREATE INDEX IF NOT EXISTS idx_sparkie_tasks_user ON sparkie_tasks(user_id, status);
+
+CREATE TABLE IF NOT EXISTS sparkie_task_context (
+  task_id           TEXT PRIMARY KEY,
+  user_id           TEXT NOT NULL,
+  user_intent       TEXT NOT NULL DEFAULT '',
+  confidence        FLOAT DEFAULT 0.8,
+  approach          TEXT DEFAULT '',
+  alternatives      JSONB DEFAULT '[]',
+  side_observations JSONB DEFAULT '[]',
+  step_index        INT DEFAULT 0,
+  checkpoint_data   JSONB DEFAULT '{}',
+  token_budget_used INT DEFAULT 0,
+  started_at        TIMESTAMPTZ DEFAULT NOW(),
+  updated_at        TIMESTAMPTZ DEFAULT NOW(),
+  completed_at      TIMESTAMPTZ
+);
+CREATE INDEX IF NOT EXISTS idx_task_context_user ON sparkie_task_context(user_id, started_at DESC);
+
+CREATE TABLE IF NOT EXISTS sparkie_worklog (
+  id                    TEXT PRIMARY KEY,
+  user_id               TEXT NOT NULL,
+  type                  TEXT NOT NULL,
+  content               TEXT NOT NULL,
+  metadata              JSONB DEFAULT '{}',
+  status                TEXT DEFAULT 'done',
+  decision_type         TEXT,
+  reasoning             TEXT,
+  estimated_duration_ms INT,
+  actual_duration_ms    INT,
+  signal_priority       TEXT,
+  depends_on            JSONB DEFAULT '[]',
+  side_effect_of        TEXT,
+  confidence            FLOAT,
+  conclusion            TEXT,
+  icon                  TEXT,
+  tag                   TEXT,
+  cost_usd              NUMERIC(10,6),
+  created_at            TIMESTAMPTZ DEFAULT NOW()
+);
+ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS status                TEXT DEFAULT 'done';
+ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS decision_type         TEXT;
+ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS reasoning             TEXT;
+ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS estimated_duration_ms INT;
+ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS actual_duration_ms    INT;
+ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS signal_priority       TEXT;
+ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS depends_on            JSONB DEFAULT '[]';
+ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS side_effect_of        TEXT;
+ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS confidence            FLOAT;
+ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS conclusion            TEXT;
+ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS icon                  TEXT;
+ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS tag                   TEXT;
+ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS cost_usd              NUMERIC(10,6);
+CREATE INDEX IF NOT EXISTS idx_worklog_user_time ON sparkie_worklog(user_id, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS sparkie_tool_log (
+  id          TEXT PRIMARY KEY,
+  user_id     TEXT,
+  tool        TEXT NOT NULL,
+  args_hash   TEXT,
+  duration_ms INT,
+  success     BOOLEAN NOT NULL DEFAULT true,
+  error_code  TEXT,
+  cached      BOOLEAN NOT NULL DEFAULT false,
+  created_at  TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_tool_log_tool_time ON sparkie_tool_log(tool, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS sparkie_execution_traces (
+  id          SERIAL PRIMARY KEY,
+  user_id     TEXT NOT NULL,
+  request_id  TEXT NOT NULL,
+  duration_ms INTEGER,
+  step_count  INTEGER,
+  had_loop    BOOLEAN DEFAULT false,
+  token_est   INTEGER,
+  summary     JSONB,
+  created_at  TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS sparkie_outreach_log (
+  id      SERIAL PRIMARY KEY,
+  user_id TEXT NOT NULL,
+  type    TEXT NOT NULL,
+  sent_at TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_outreach_user ON sparkie_outreach_log(user_id, sent_at);
+
+CREATE TABLE IF NOT EXISTS sparkie_attempt_history (
+  id           UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id      TEXT NOT NULL,
+  domain       TEXT NOT NULL,
+  attempt_type TEXT NOT NULL DEFAULT 'failure',
+  summary      TEXT NOT NULL,
+  outcome      TEXT NOT NULL,
+  lesson       TEXT NOT NULL,
+  expires_at   TIMESTAMPTZ,
+  created_at   TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_sparkie_attempt_history_user_domain ON sparkie_attempt_history(user_id, domain);
+
+-- ── Self-model ───────────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS sparkie_behavior_rules (
+  id            UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  condition     TEXT NOT NULL,
+  action        TEXT NOT NULL,
+  reasoning     TEXT,
+  confidence    FLOAT DEFAULT 1.0,
+  times_applied INT DEFAULT 0,
+  last_applied  TIMESTAMPTZ,
+  created_at    TIMESTAMPTZ DEFAULT now(),
+  active        BOOLEAN DEFAULT true
+);
+CREATE INDEX IF NOT EXISTS idx_behavior_rules_active ON sparkie_behavior_rules(active, confidence DESC);
+
+CREATE TABLE IF NOT EXISTS sparkie_causal_graph (
+  id               UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  cause_event      TEXT NOT NULL,
+  effect_event     TEXT NOT NULL,
+  confidence       FLOAT DEFAULT 0.5,
+  occurrence_count INT DEFAULT 1,
+  last_observed    TIMESTAMPTZ DEFAULT now(),
+  created_at       TIMESTAMPTZ DEFAULT now(),
+  UNIQUE(cause_event, effect_event)
+);
+CREATE INDEX IF NOT EXISTS idx_causal_effect ON sparkie_causal_graph(effect_event, confidence DESC);
+CREATE INDEX IF NOT EXISTS idx_causal_cause ON sparkie_causal_graph(cause_event, confidence DESC);
+
+CREATE TABLE IF NOT EXISTS sparkie_goals (
+  id                        UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  title                     TEXT NOT NULL,
+  description               TEXT DEFAULT '',
+  type                      TEXT NOT NULL DEFAULT 'monitor',
+  priority                  TEXT NOT NULL DEFAULT 'P2',
+  status                    TEXT DEFAULT 'active',
+  progress                  TEXT DEFAULT 'Not started',
+  success_criteria          TEXT DEFAULT '',
+  check_every_n_sessions    INT DEFAULT 1,
+  sessions_without_progress INT DEFAULT 0,
+  created_at                TIMESTAMPTZ DEFAULT now(),
+  last_checked              TIMESTAMPTZ,
+  completed_at              TIMESTAMPTZ
+);
+CREATE INDEX IF NOT EXISTS idx_goals_status_priority ON sparkie_goals(status, priority);
+
+CREATE TABLE IF NOT EXISTS sparkie_self_reflections (
+  id                 UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  reflection_date    DATE NOT NULL UNIQUE,
+  what_worked        JSONB DEFAULT '[]',
+  what_failed        JSONB DEFAULT '[]',
+  patterns_noticed   JSONB DEFAULT '[]',
+  rules_created      JSONB DEFAULT '[]',
+  goals_progress     JSONB DEFAULT '[]',
+  growth_observed    TEXT DEFAULT '',
+  tomorrow_intention TEXT DEFAULT '',
+  created_at         TIMESTAMPTZ DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_reflections_date ON sparkie_self_reflections(reflection_date DESC);
+
+CREATE TABLE IF NOT EXISTS sparkie_dream_journal (
+  id         UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  dream_date DATE NOT NULL UNIQUE,
+  narrative  TEXT NOT NULL,
+  theme      TEXT DEFAULT '',
+  mood       TEXT DEFAULT 'reflective',
+  intention  TEXT DEFAULT '',
+  created_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- ── Topics & contacts ────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS sparkie_topics (
+  id                  TEXT PRIMARY KEY DEFAULT gen_random_uuid()::TEXT,
+  user_id             TEXT NOT NULL,
+  name                TEXT NOT NULL,
+  fingerprint         TEXT,
+  aliases             JSONB DEFAULT '[]',
+  summary             TEXT DEFAULT '',
+  notification_policy TEXT DEFAULT 'auto',
+  status              TEXT DEFAULT 'active',
+  total_threads       INTEGER DEFAULT 0,
+  last_state          TEXT,
+  last_round          INT DEFAULT 0,
+  step_count          INT DEFAULT 0,
+  original_request    TEXT,
+  topic_type          TEXT DEFAULT 'chat',
+  cognition_state     JSONB DEFAULT '{}',
+  created_at          TIMESTAMPTZ DEFAULT NOW(),
+  updated_at          TIMESTAMPTZ DEFAULT NOW()
+);
+ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS aliases          JSONB DEFAULT '[]';
+ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS total_threads    INTEGER DEFAULT 0;
+ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS last_state       TEXT;
+ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS last_round       INT DEFAULT 0;
+ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS step_count       INT DEFAULT 0;
+ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS original_request TEXT;
+ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS topic_type       TEXT DEFAULT 'chat';
+ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS cognition_state  JSONB DEFAULT '{}';
+CREATE INDEX IF NOT EXISTS idx_sparkie_topics_user ON sparkie_topics(user_id, status);
+
+CREATE TABLE IF NOT EXISTS sparkie_topic_links (
+  id          SERIAL PRIMARY KEY,
+  topic_id    TEXT NOT NULL REFERENCES sparkie_topics(id) ON DELETE CASCADE,
+  user_id     TEXT,
+  source_type TEXT NOT NULL,
+  source_id   TEXT NOT NULL,
+  summary     TEXT DEFAULT '',
+  created_at  TIMESTAMPTZ DEFAULT NOW(),
+  UNIQUE(topic_id, source_type, source_id)
+);
+ALTER TABLE sparkie_topic_links ADD COLUMN IF NOT EXISTS user_id TEXT;
+CREATE INDEX IF NOT EXISTS idx_sparkie_topic_links ON sparkie_topic_links(topic_id);
+
+CREATE TABLE IF NOT EXISTS sparkie_topic_threads (
+  id          UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  topic_id    TEXT NOT NULL,
+  source_type TEXT NOT NULL,
+  source_id   TEXT NOT NULL,
+  summary     TEXT DEFAULT '',
+  created_at  TIMESTAMPTZ DEFAULT NOW(),
+  UNIQUE(topic_id, source_type, source_id)
+);
+CREATE INDEX IF NOT EXISTS idx_sparkie_topic_threads_topic_id ON sparkie_topic_threads(topic_id);
+CREATE INDEX IF NOT EXISTS idx_sparkie_topic_threads_source ON sparkie_topic_threads(source_type, source_id);
+
+CREATE TABLE IF NOT EXISTS sparkie_contacts (
+  id              UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id         TEXT NOT NULL,
+  email           TEXT NOT NULL,
+  display_name    TEXT DEFAULT '',
+  notes           TEXT DEFAULT '',
+  cc_preference   TEXT DEFAULT '',
+  response_sla    TEXT DEFAULT '',
+  priority        TEXT DEFAULT 'normal',
+  created_at      TIMESTAMPTZ DEFAULT NOW(),
+  updated_at      TIMESTAMPTZ DEFAULT NOW(),
+  UNIQUE(user_id, email)
+);
+CREATE INDEX IF NOT EXISTS idx_sparkie_contacts_user_id ON sparkie_contacts(user_id);
+CREATE INDEX IF NOT EXISTS idx_sparkie_contacts_email ON sparkie_contacts(email);
+
+CREATE TABLE IF NOT EXISTS sparkie_bridge (
+  id          UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id     TEXT NOT NULL DEFAULT '',
+  author      TEXT NOT NULL,  -- 'sparkie-prime' or 'studio-agent'
+  type        TEXT DEFAULT 'note',  -- 'context', 'activity', 'preference', 'note'
+  content     TEXT NOT NULL,
+  metadata    JSONB DEFAULT '{}',
+  created_at  TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_sparkie_bridge_user_id ON sparkie_bridge(user_id);
+CREATE INDEX IF NOT EXISTS idx_sparkie_bridge_author ON sparkie_bridge(author);
+CREATE INDEX IF NOT EXISTS idx_sparkie_bridge_created_at ON sparkie_bridge(created_at);
+
+-- ── Content & workspace ──────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS sparkie_feed (
+  id                  SERIAL PRIMARY KEY,
+  content             TEXT NOT NULL,
+  media_url           TEXT,
+  media_type          TEXT DEFAULT 'none',
+  mood                TEXT DEFAULT '',
+  likes               INTEGER DEFAULT 0,
+  code_html           TEXT,
+  code_title          TEXT,
+  companion_image_url TEXT,
+  created_at          TIMESTAMPTZ DEFAULT NOW()
+);
+ALTER TABLE sparkie_feed ADD COLUMN IF NOT EXISTS code_html           TEXT;
+ALTER TABLE sparkie_feed ADD COLUMN IF NOT EXISTS code_title          TEXT;
+ALTER TABLE sparkie_feed ADD COLUMN IF NOT EXISTS companion_image_url TEXT;
+
+CREATE TABLE IF NOT EXISTS sparkie_assets (
+  id           UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id      TEXT NOT NULL,
+  name         TEXT NOT NULL,
+  content      TEXT NOT NULL,
+  asset_type   TEXT NOT NULL DEFAULT 'other',
+  source       TEXT NOT NULL DEFAULT 'agent',
+  chat_id      TEXT,
+  chat_title   TEXT,
+  file_id      TEXT,
+  language     TEXT DEFAULT '',
+  created_at   TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_sparkie_assets_user_id ON sparkie_assets(user_id);
+CREATE INDEX IF NOT EXISTS idx_sparkie_assets_created ON sparkie_assets(user_id, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS sparkie_uploads (
+  id          SERIAL PRIMARY KEY,
+  file_id     TEXT NOT NULL UNIQUE,
+  user_id     TEXT NOT NULL,
+  filename    TEXT NOT NULL,
+  mime_type   TEXT NOT NULL DEFAULT 'application/octet-stream',
+  size_bytes  INTEGER NOT NULL DEFAULT 0,
+  content     TEXT NOT NULL,
+  created_at  TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_sparkie_uploads_user ON sparkie_uploads(user_id);
+CREATE INDEX IF NOT EXISTS idx_sparkie_uploads_file_id ON sparkie_uploads(file_id);
+
+CREATE TABLE IF NOT EXISTS sparkie_workspace (
+  id         SERIAL PRIMARY KEY,
+  user_id    TEXT NOT NULL,
+  key        TEXT NOT NULL,
+  value      TEXT NOT NULL,
+  created_at TIMESTAMPTZ DEFAULT NOW(),
+  updated_at TIMESTAMPTZ DEFAULT NOW(),
+  UNIQUE(user_id, key)
+);
+CREATE INDEX IF NOT EXISTS idx_workspace_user_key ON sparkie_workspace(user_id, key);
+
+CREATE TABLE IF NOT EXISTS sparkie_projects (
+  id               TEXT PRIMARY KEY,
+  user_id          TEXT NOT NULL,
+  repo             TEXT NOT NULL,
+  summary          TEXT NOT NULL DEFAULT '',
+  tech_stack       JSONB NOT NULL DEFAULT '[]',
+  key_files        JSONB NOT NULL DEFAULT '{}',
+  known_issues     JSONB NOT NULL DEFAULT '[]',
+  active_features  JSONB NOT NULL DEFAULT '[]',
+  last_ingested_at TIMESTAMPTZ DEFAULT NOW(),
+  created_at       TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_sparkie_projects_user ON sparkie_projects(user_id);
+
+CREATE TABLE IF NOT EXISTS sparkie_skills (
+  id           SERIAL PRIMARY KEY,
+  user_id      TEXT,
+  name         TEXT NOT NULL,
+  description  TEXT DEFAULT '',
+  source_url   TEXT DEFAULT '',
+  category     TEXT DEFAULT 'Custom',
+  content      TEXT DEFAULT '',
+  installed_at TIMESTAMPTZ DEFAULT NOW(),
+  UNIQUE(name)
+);
+
+CREATE TABLE IF NOT EXISTS sparkie_radio_tracks (
+  id         TEXT PRIMARY KEY,
+  user_id    TEXT NOT NULL,
+  title      TEXT NOT NULL,
+  artist     TEXT,
+  src        TEXT NOT NULL,
+  type       TEXT DEFAULT 'url',
+  cover_url  TEXT,
+  added_at   TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_radio_tracks_user ON sparkie_radio_tracks(user_id, added_at DESC);
+
+CREATE TABLE IF NOT EXISTS dream_journal (
+  id         UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  user_id    TEXT NOT NULL,
+  title      TEXT,
+  content    TEXT NOT NULL,
+  category   TEXT DEFAULT 'night_dreams',
+  mood       TEXT DEFAULT 'neutral',
+  images     TEXT[] DEFAULT '{}',
+  theme      TEXT DEFAULT 'default',
+  created_at TIMESTAMPTZ DEFAULT NOW(),
+  updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+ALTER TABLE dream_journal ADD COLUMN IF NOT EXISTS category TEXT DEFAULT 'night_dreams';
+ALTER TABLE dream_journal ADD COLUMN IF NOT EXISTS title    TEXT;
+ALTER TABLE dream_journal ADD COLUMN IF NOT EXISTS images   TEXT[] DEFAULT '{}';
+ALTER TABLE dream_journal ADD COLUMN IF NOT EXISTS theme    TEXT DEFAULT 'default';
+
+CREATE TABLE IF NOT EXISTS dream_journal_lock (
+  user_id       TEXT PRIMARY KEY,
+  passcode_hash TEXT NOT NULL,
+  created_at    TIMESTAMPTZ DEFAULT NOW()
+);
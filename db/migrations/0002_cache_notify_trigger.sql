@@ -0,0 +1,24 @@
+-- 0002_cache_notify_trigger.sql
+-- Row triggers that publish memory cache invalidations from inside Postgres
+-- (see src/lib/cacheBus.ts), so every write path — chat tools, /api/memory,
+-- skills, admin cleanup, manual SQL — evicts the per-instance memory caches.
+
+CREATE OR REPLACE FUNCTION sparkie_cache_notify() RETURNS trigger AS $$
+BEGIN
+  PERFORM pg_notify('sparkie_cache', json_build_object(
+    'cache', TG_ARGV[0],
+    'userId', COALESCE(to_jsonb(NEW) ->> 'user_id', to_jsonb(OLD) ->> 'user_id', '*')
+  )::text);
+  RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS sparkie_cache_notify_user_memories ON user_memories;
+CREATE TRIGGER sparkie_cache_notify_user_memories
+  AFTER INSERT OR UPDATE OR DELETE ON user_memories
+  FOR EACH ROW EXECUTE PROCEDURE sparkie_cache_notify('memories');
+
+DROP TRIGGER IF EXISTS sparkie_cache_notify_sparkie_self_memory ON sparkie_self_memory;
+CREATE TRIGGER sparkie_cache_notify_sparkie_self_memory
+  AFTER INSERT OR UPDATE OR DELETE ON sparkie_self_memory
+  FOR EACH ROW EXECUTE PROCEDURE sparkie_cache_notify('memories');
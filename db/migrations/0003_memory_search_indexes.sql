@@ -0,0 +1,13 @@
+-- migrate:no-transaction
+-- 0003_memory_search_indexes.sql
+-- GIN expression indexes behind ranked memory retrieval (src/lib/memoryRetrieval.ts).
+-- Built CONCURRENTLY so a large user_memories keeps taking writes, which means
+-- no transaction: the runner executes these one statement at a time. If a build
+-- is interrupted, drop the INVALID index it leaves behind before the next boot —
+-- IF NOT EXISTS would otherwise keep it.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_memories_fts
+  ON user_memories USING GIN (to_tsvector('english', content));
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_self_memory_fts
+  ON sparkie_self_memory USING GIN (to_tsvector('english', content));
@@ -0,0 +1,12 @@
+-- 0004_task_claims.sql
+-- Claim bookkeeping for due AI tasks (src/lib/taskClaim.ts). Instances claim
+-- batches with FOR UPDATE SKIP LOCKED and stamp the claim, so stale-task
+-- recovery measures how long a task has been running rather than how old it is.
+
+ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMPTZ;
+ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS claimed_by TEXT;
+
+-- The claim query's scan: due AI tasks in schedule order
+CREATE INDEX IF NOT EXISTS idx_tasks_ai_due
+  ON sparkie_tasks (scheduled_at)
+  WHERE executor = 'ai' AND status = 'pending' AND scheduled_at IS NOT NULL;
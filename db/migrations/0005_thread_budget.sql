@@ -0,0 +1,38 @@
+-- 0005_thread_budget.sql
+-- Running per-user token count and summary levels for src/lib/threadStore.ts.
+--
+-- sparkie_thread_budget.uncompressed_tokens is kept equal to
+-- SUM(token_estimate) over the user's uncompressed, unpinned thread rows by the
+-- statements that change that set (append, compress), so the budget check is a
+-- primary-key read instead of an aggregate over the whole thread.
+--
+-- summary_level marks compression summaries: 0 for a summary of raw messages,
+-- n + 1 for a summary merged from level-n summaries. NULL for everything else,
+-- including the '[compressed]' husks of summarised messages.
+
+CREATE TABLE IF NOT EXISTS sparkie_thread_budget (
+  user_id             TEXT PRIMARY KEY,
+  uncompressed_tokens BIGINT NOT NULL DEFAULT 0,
+  updated_at          TIMESTAMPTZ DEFAULT NOW()
+);
+
+INSERT INTO sparkie_thread_budget (user_id, uncompressed_tokens)
+SELECT user_id, COALESCE(SUM(token_estimate), 0) FROM sparkie_threads
+WHERE is_compressed = FALSE AND is_pinned = FALSE
+GROUP BY user_id
+ON CONFLICT (user_id) DO UPDATE SET uncompressed_tokens = EXCLUDED.uncompressed_tokens, updated_at = NOW();
+
+ALTER TABLE sparkie_threads ADD COLUMN IF NOT EXISTS summary_level INT;
+
+-- Summaries written before this migration: compressed rows that are not husks
+UPDATE sparkie_threads SET summary_level = 0
+WHERE is_compressed = TRUE AND summary_level IS NULL AND content <> '[compressed]';
+
+CREATE INDEX IF NOT EXISTS idx_sparkie_threads_summaries
+  ON sparkie_threads (user_id, summary_level, created_at)
+  WHERE summary_level IS NOT NULL;
+
+-- The compression and recent-window scans: uncompressed, unpinned rows in order
+CREATE INDEX IF NOT EXISTS idx_sparkie_threads_live
+  ON sparkie_threads (user_id, created_at)
+  WHERE is_compressed = FALSE AND is_pinned = FALSE;
@@ -0,0 +1,10 @@
+-- 0006_self_memory_notify.sql
+-- sparkie_self_memory is shared by every user, so its trigger used to publish
+-- 'memories' with userId '*', flushing every user's memory cache on every
+-- instance. Publish on its own cache name instead; only the self-memory cache
+-- (src/lib/memoryRetrieval.ts) listens for it.
+
+DROP TRIGGER IF EXISTS sparkie_cache_notify_sparkie_self_memory ON sparkie_self_memory;
+CREATE TRIGGER sparkie_cache_notify_sparkie_self_memory
+  AFTER INSERT OR UPDATE OR DELETE ON sparkie_self_memory
+  FOR EACH ROW EXECUTE PROCEDURE sparkie_cache_notify('self_memory');
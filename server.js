@@ -16,6 +16,22 @@
  *   Server → Client  { type: 'ping',      data: ''             }
  *   Client → Server  { type: 'input',     data: '<keystrokes>' }
  *   Client → Server  { type: 'resize',    cols: N, rows: N     }
+ *
+ *   Clients that connect with ?frames=binary receive PTY output as raw binary
+ *   frames instead of 'output' JSON; every other frame stays JSON text. Output
+ *   is coalesced either way (src/lib/ptyOutput.js).
+ *
+ * Boot:
+ *   db/migrate.js brings the schema up to date while Next prepares; the server
+ *   only listens once both finish, so API routes can assume every table exists.
+ *   Index builds (no-transaction migrations) don't gate listen: they run in the
+ *   background once the server is up, and reads fall back to seq scans until
+ *   they land. SKIP_MIGRATIONS=1 boots without touching the schema.
+ *
+ * Shutdown:
+ *   SIGTERM / SIGINT stop accepting connections, then await every function in
+ *   global.__shutdownHooks (registered from inside the Next bundle, e.g. the
+ *   write-behind log sinks) for up to SHUTDOWN_GRACE_MS before exiting.
  */
 
 'use strict'
@@ -24,6 +40,10 @@ const http    = require('http')
 const { WebSocketServer } = require('ws')
 const { parse } = require('url')
 const next    = require('next')
+const { migrate } = require('./db/migrate')
+const { getProactiveHub } = require('./src/lib/proactiveHub')
+
+const bootStartedAt = Date.now()
 
 const dev  = process.env.NODE_ENV !== 'production'
 const port = parseInt(process.env.PORT || '3000', 10)
@@ -132,7 +152,61 @@ function attachWsHandlers(ws, sess, sessionId) {
   })
 }
 
-app.prepare().then(() => {
+function runMigrations() {
+  if (process.env.SKIP_MIGRATIONS === '1') {
+    console.log('> Migrations skipped (SKIP_MIGRATIONS=1)')
+    return Promise.resolve()
+  }
+  return migrate({ builds: 'defer' }).then((r) => {
+    if (r.skipped) return
+    const deferred = r.deferred.length ? `, ${r.deferred.length} index build(s) deferred` : ''
+    console.log(`> Schema v${r.version} (${r.applied.length} migration(s) applied${deferred}) in ${r.ms}ms`)
+  })
+}
+
+// After listen: a failure here only costs the indexes, so it logs instead of exiting
+function runDeferredBuilds() {
+  if (process.env.SKIP_MIGRATIONS === '1') return
+  migrate({ builds: 'only' }).then((r) => {
+    if (r.skipped || !r.applied.length) return
+    console.log(`> Index builds done: ${r.applied.map((a) => `${a.version}_${a.name} ${a.ms}ms`).join(', ')}`)
+  }).catch((err) => {
+    console.error('> Index build failed (retried next boot or `npm run migrate`):', err && err.message ? err.message : err)
+  })
+}
+
+const SHUTDOWN_GRACE_MS = 5000
+
+function installShutdown(server) {
+  let stopping = false
+  function shutdown(signal) {
+    if (stopping) return
+    stopping = true
+    console.log(`> ${signal} — flushing and shutting down`)
+    server.close()
+    const hooks = [...(global.__shutdownHooks || [])].map((fn) => Promise.resolve().then(fn).catch((err) => {
+      console.error('> Shutdown hook failed:', err && err.message ? err.message : err)
+    }))
+    const grace = new Promise((resolve) => setTimeout(resolve, SHUTDOWN_GRACE_MS).unref())
+    Promise.race([Promise.all(hooks), grace]).then(() => process.exit(0))
+  }
+  process.once('SIGTERM', () => shutdown('SIGTERM'))
+  process.once('SIGINT', () => shutdown('SIGINT'))
+}
+
+function timed(promise) {
+  const t0 = Date.now()
+  return promise.then(() => Date.now() - t0)
+}
+
+const ready = Promise.all([timed(runMigrations()), timed(app.prepare())])
+
+ready.catch((err) => {
+  console.error('> Boot failed:', err && err.message ? err.message : err)
+  process.exit(1)
+})
+
+ready.then(([migrateMs, prepareMs]) => {
   const server = http.createServer((req, res) => {
     if (req.url?.startsWith('/api/')) {
       console.log(`[req] ${new Date().toISOString()} ${req.method} ${req.url}`)
@@ -146,43 +220,10 @@ app.prepare().then(() => {
   // noServer mode: client connects to /api/proactive-ws/<userId> (path-based userId, exact path option won't match)
   const wssProactive = new WebSocketServer({ noServer: true, perMessageDeflate: false })
 
-  // Global registry for proactive WebSocket clients — shared with Next.js API routes
-  // via global.__proactiveClients. API routes push events to this Set.
-  // eslint-disable-next-line no-var
-  var __proactiveClients = global.__proactiveClients || []
-  if (!global.__proactiveClients) global.__proactiveClients = __proactiveClients
-
-  // Universal push — works for both WebSocket clients (ws.send) and SSE clients (sseSend)
-  function pushToClient(client, data) {
-    const str = typeof data === 'string' ? data : JSON.stringify(data)
-    if (client.sseSend) {
-      client.sseSend(str)
-    } else if (client.ws && client.ws.readyState === 1 /* OPEN */) {
-      try { client.ws.send(str) } catch (_) {}
-    }
-  }
-
-  // Broadcast to all clients, or to a specific userId
-  function broadcastProactive(data, targetUserId) {
-    const str = typeof data === 'string' ? data : JSON.stringify(data)
-    for (const client of __proactiveClients) {
-      if (targetUserId && client.userId !== targetUserId) continue
-      pushToClient(client, str)
-    }
-  }
-
-  function proactiveClientsAdd(ws, userId) {
-    __proactiveClients.push({ ws, userId })
-    global.__proactiveClients = __proactiveClients
-    console.log('[proactive] client connected: userId=' + userId + ', total=' + __proactiveClients.length)
-  }
-
-  function proactiveClientsRemove(ws) {
-    const idx = __proactiveClients.findIndex(function(c) { return c.ws === ws })
-    if (idx !== -1) __proactiveClients.splice(idx, 1)
-    // Don't reassign __proactiveClients — mutate in place so API route references stay valid
-    console.log('[proactive] client disconnected, total=' + __proactiveClients.length)
-  }
+  // Proactive clients (WS here, SSE in /api/proactive-sse) live in one per-user hub,
+  // shared with the Next.js API routes through global.__proactiveHub
+  const proactiveHub = getProactiveHub()
+  const PROACTIVE_WS_HIGH_WATER = 256 * 1024
 
   // prependListener ensures we can reject non-WS paths BEFORE
   // ws or Next.js get a chance to handle them.
@@ -217,7 +258,8 @@ app.prepare().then(() => {
   wssTerminal.on('connection', (ws, req) => {
     const { query } = parse(req.url, true)
     const sessionId = query && query.sessionId
-    console.log('[WS] connection sessionId:', sessionId)
+    ws.binaryFrames = query && query.frames === 'binary'
+    console.log('[WS] connection sessionId:', sessionId, '| frames:', ws.binaryFrames ? 'binary' : 'json')
 
     // Diagnostic: log socket state at moment of connection
     const sock = ws._socket
@@ -317,7 +359,15 @@ app.prepare().then(() => {
       return
     }
 
-    proactiveClientsAdd(ws, userId)
+    const client = proactiveHub.add({
+      userId,
+      kind: 'ws',
+      send: (data) => { if (ws.readyState === 1 /* OPEN */) ws.send(data) },
+      backpressured: () => ws.bufferedAmount > PROACTIVE_WS_HIGH_WATER,
+      // Shared 30s heartbeat; the first one lands 30-60s after connect, giving the DO proxy time to settle
+      heartbeat: () => { if (ws.readyState === 1) ws.ping() },
+    })
+    console.log('[proactive] client connected: userId=' + userId + ', total=' + proactiveHub.clientCount)
 
     // Delay ack by 1000ms — DO proxy needs time to stabilize WS tunnel before we send bytes
     // Sending immediately causes "Invalid frame header" on the client
@@ -327,25 +377,15 @@ app.prepare().then(() => {
       }
     }, 1000)
 
-    // First heartbeat ping at 60s, then every 30s — gives DO proxy time to establish tunnel
-    const pingInterval = setInterval(() => {
-      if (ws.readyState === /* OPEN */ 1) {
-        try { ws.ping() } catch (_) {}
-      } else {
-        clearInterval(pingInterval)
+    function onGone() {
+      if (proactiveHub.remove(client)) {
+        console.log('[proactive] client disconnected, total=' + proactiveHub.clientCount)
       }
-    }, 30_000)
-    // First ping fires at 60s mark (60s > first interval tick at 30s)
-    setTimeout(() => {
-      if (ws.readyState === 1) {
-        try { ws.ping() } catch (_) {}
-      }
-    }, 60_000)
-
-    ws.on('close', () => { proactiveClientsRemove(ws); clearInterval(pingInterval) })
+    }
+    ws.on('close', onGone)
     ws.on('error', (err) => {
       console.error('[proactive-ws] error event:', err.message, 'userId:', userId)
-      proactiveClientsRemove(ws); clearInterval(pingInterval)
+      onGone()
     })
   })
 
@@ -354,6 +394,9 @@ app.prepare().then(() => {
     console.log(`> Sparkie Studio ready on http://localhost:${port}`)
     console.log(`> WebSocket terminal on ws://localhost:${port}/api/terminal-ws`)
     console.log(`> WebSocket proactive push on ws://localhost:${port}/api/proactive-ws`)
+    console.log(`> Boot ${Date.now() - bootStartedAt}ms (migrations ${migrateMs}ms, next prepare ${prepareMs}ms, in parallel)`)
     startKeepalive(port)
+    runDeferredBuilds()
   })
+  installShutdown(server)
 })
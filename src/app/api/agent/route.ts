@@ -7,28 +7,12 @@ import { runTTLDecaySweep } from '@/lib/knowledgeTTL'
 import { writeWorklog } from '@/lib/worklog'
 import { classifySignalImpact } from '@/lib/signalQueue'
 import { getAttempts, formatAttemptBlock } from '@/lib/attemptHistory'
-import type { WebSocket } from 'ws'
-
-// ── Push proactive events to WebSocket clients via server.js global registry ─────
-// server.js maintains global.__proactiveClients = Array<{ ws: WebSocket, userId: string }>
-declare global {
-  // eslint-disable-next-line no-var
-  var __proactiveClients: Array<{ ws: WebSocket | null; userId: string; sseSend?: (data: string) => void }> | undefined
-}
+import { getProactiveHub } from '@/lib/proactiveHub'
+import { claimDueTasks, releaseStaleClaims } from '@/lib/taskClaim'
 
+// ── Push proactive events to this user's WebSocket / SSE clients (see proactiveHub.js) ─────
 function pushProactiveEvent(userId: string, event: { type: string; subtype: string; data: Record<string, unknown>; timestamp: number }): void {
-  const clients = global.__proactiveClients ?? []
-  const payload = JSON.stringify(event)
-  for (const c of clients) {
-    if (c.userId !== userId) continue
-    if (c.sseSend) {
-      // SSE client — send via its sseSend function
-      try { c.sseSend(payload) } catch (e) { console.error('[proactive SSE push error]', e) }
-    } else if (c.ws && c.ws.readyState === 1 /* OPEN */) {
-      // WebSocket client — send via ws.send
-      try { c.ws.send(payload) } catch (e) { console.error('[proactive WS push error]', e) }
-    }
-  }
+  getProactiveHub().publish(userId, event)
 }
 
 export const runtime = 'nodejs'
@@ -36,25 +20,6 @@ export const maxDuration = 60
 
 // ── Helpers ─────────────────────────────────────────────────────────────────
 
-async function ensureTables() {
-  await query(`CREATE TABLE IF NOT EXISTS sparkie_outreach_log (
-    id SERIAL PRIMARY KEY, user_id TEXT NOT NULL,
-    type TEXT NOT NULL, sent_at TIMESTAMPTZ DEFAULT NOW()
-  )`).catch(() => {})
-  await query(`CREATE INDEX IF NOT EXISTS idx_outreach_user ON sparkie_outreach_log(user_id, sent_at)`).catch(() => {})
-  await query(`CREATE TABLE IF NOT EXISTS sparkie_tasks (
-    id TEXT PRIMARY KEY, user_id TEXT NOT NULL, action TEXT NOT NULL, label TEXT NOT NULL,
-    payload JSONB NOT NULL DEFAULT '{}', status TEXT NOT NULL DEFAULT 'pending',
-    executor TEXT NOT NULL DEFAULT 'human', trigger_type TEXT DEFAULT 'manual',
-    trigger_config JSONB DEFAULT '{}', scheduled_at TIMESTAMPTZ, why_human TEXT,
-    created_at TIMESTAMPTZ DEFAULT NOW(), resolved_at TIMESTAMPTZ
-  )`).catch(() => {})
-  await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS executor TEXT NOT NULL DEFAULT 'human'`).catch(() => {})
-  await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS trigger_type TEXT DEFAULT 'manual'`).catch(() => {})
-  await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS scheduled_at TIMESTAMPTZ`).catch(() => {})
-  await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS depends_on TEXT`).catch(() => {})
-}
-
 /**
  * Compute next scheduled_at from a 5-field cron expression (no npm needed).
  * Handles: exact values, wildcards, step expressions (e.g. every-n), comma lists, ranges.
@@ -123,22 +88,14 @@ async function executeDueTasks(userId: string, host: string, proto: string, cook
   )
   const workContext = activeTopics.rows.map(t => t.name).join(' ')
 
-  const dueTasks = await query<{
-    id: string; label: string; action: string; trigger_type: string; trigger_config: Record<string, unknown>
-  }>(
-    `SELECT id, label, action, trigger_type, trigger_config FROM sparkie_tasks
-     WHERE user_id = $1 AND executor = 'ai' AND status = 'pending'
-     AND scheduled_at IS NOT NULL AND scheduled_at <= NOW()
-     ORDER BY scheduled_at ASC LIMIT 5`,
-    [userId]
-  )
-
-  if (dueTasks.rows.length === 0) return []
-
   const apiKey = process.env.MINIMAX_API_KEY ?? ''
   const executed: Array<{ id: string; label: string; result: string }> = []
 
-  for (const task of dueTasks.rows) {
+  // Up to 5 tasks, each claimed (in_progress) just before it runs, so a task never
+  // waits out its claim window behind the others and no other instance picks it up
+  for (let n = 0; n < 5; n++) {
+    const [task] = await claimDueTasks(1, userId)
+    if (!task) break
     // Classify signal impact before executing — skip if context was invalidated
     const impactSignal = { id: 'pre_exec', type: 'tool_result' as const, priority: 'P2' as const, payload: { taskId: task.id, topicId: activeTopics.rows[0]?.id }, created_at: Date.now(), stale_after: Date.now() + 600000, userId }
     const impact = classifySignalImpact(impactSignal, workContext)
@@ -147,8 +104,6 @@ async function executeDueTasks(userId: string, host: string, proto: string, cook
       continue
     }
     try {
-      await query(`UPDATE sparkie_tasks SET status = 'in_progress' WHERE id = $1`, [task.id])
-
       let result = 'Task executed'
       if (apiKey) {
         // ── Orchestrator loop ──────────────────────────────────────────────
@@ -579,7 +534,6 @@ export async function POST(req: NextRequest) {
     if (!userId) return NextResponse.json({ message: null, type: null })
 
     const { currentHour } = await req.json() as { currentHour?: number }
-    await ensureTables()
 
     const hour = currentHour ?? new Date().getHours()
 
@@ -594,11 +548,7 @@ export async function POST(req: NextRequest) {
     const cookieHeader = req.headers.get('cookie') ?? ''
 
     // ── 0. Recover stuck in_progress tasks (same as GET cron) ──────────────
-    await query(
-      `UPDATE sparkie_tasks SET status = 'pending'
-       WHERE user_id = $1 AND status = 'in_progress' AND created_at < NOW() - INTERVAL '5 minutes'`,
-      [userId]
-    ).catch((e) => console.error('[agent POST] stuck task recovery error:', e))
+    await releaseStaleClaims(userId).catch((e) => console.error('[agent POST] stuck task recovery error:', e))
 
     // ── 1. Execute due AI tasks ─────────────────────────────────────────────
     const executed = await executeDueTasks(userId, host, proto, cookieHeader)
@@ -713,16 +663,12 @@ export async function GET(req: NextRequest) {
       return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
     }
 
-    await ensureTables()
 
     const host  = req.headers.get('host') ?? 'localhost:3000'
     const proto = req.headers.get('x-forwarded-proto') ?? 'https'
 
     // ── Recover stuck in_progress tasks before anything else ─────────────────
-    await query(
-      `UPDATE sparkie_tasks SET status = 'pending'
-       WHERE status = 'in_progress' AND created_at < NOW() - INTERVAL '5 minutes'`
-    ).catch(() => {})
+    await releaseStaleClaims().catch(() => {})
 
     // ── Issue 5: Clean up stale GMAIL_MODIFY_MESSAGE failures on agent startup ──
     await query(
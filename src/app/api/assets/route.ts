@@ -5,26 +5,6 @@ import { query } from '@/lib/db'
 
 export const runtime = 'nodejs'
 
-async function ensureTable() {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_assets (
-      id           UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-      user_id      TEXT NOT NULL,
-      name         TEXT NOT NULL,
-      content      TEXT NOT NULL,
-      asset_type   TEXT NOT NULL DEFAULT 'other',
-      source       TEXT NOT NULL DEFAULT 'agent',
-      chat_id      TEXT,
-      chat_title   TEXT,
-      file_id      TEXT,
-      language     TEXT DEFAULT '',
-      created_at   TIMESTAMPTZ DEFAULT NOW()
-    )
-  `)
-  await query(`CREATE INDEX IF NOT EXISTS idx_sparkie_assets_user_id ON sparkie_assets(user_id)`)
-  await query(`CREATE INDEX IF NOT EXISTS idx_sparkie_assets_created ON sparkie_assets(user_id, created_at DESC)`)
-}
-
 // GET /api/assets — load all assets for the current user
 export async function GET(req: NextRequest) {
   const session = await getServerSession(authOptions)
@@ -32,7 +12,6 @@ export async function GET(req: NextRequest) {
   if (!userId) return NextResponse.json({ assets: [] })
 
   try {
-    await ensureTable()
     const result = await query(
       `SELECT id, name, content, asset_type, source, chat_id, chat_title, file_id, language, created_at
        FROM sparkie_assets
@@ -67,7 +46,6 @@ export async function POST(req: NextRequest) {
   if (!userId) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
 
   try {
-    await ensureTable()
     const body = await req.json()
     const { name, content, assetType, source, chatId, chatTitle, fileId, language } = body
 
@@ -97,7 +75,6 @@ export async function DELETE(req: NextRequest) {
   if (!userId) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
 
   try {
-    await ensureTable()
     const { searchParams } = new URL(req.url)
     const assetId = searchParams.get('id')
 
@@ -2,6 +2,7 @@ import { NextRequest, NextResponse } from 'next/server'
 import { getServerSession } from 'next-auth'
 import { authOptions } from '@/lib/auth'
 import { query } from '@/lib/db'
+import { flushAllSinks } from '@/lib/writeBehind'
 
 // ── sparkie_bridge — shared mind between Sparkie Prime (OpenClaw) and Studio Agent ─
 // Each user gets their own bridge entries. Entries are scoped by user_id so multiple
@@ -31,6 +32,8 @@ export async function GET(req: NextRequest) {
       const bridgeParams = since ? [userId, since] : [userId]
       const bridge = await query(bridgeQuery, bridgeParams)
 
+      // Queued worklog rows carry their enqueue time — write them before reading past `since`
+      await flushAllSinks()
       const worklogQuery = since
         ? "SELECT id, created_at, type, content, metadata FROM sparkie_worklog WHERE user_id = $1 AND created_at > $2 ORDER BY created_at DESC LIMIT 20"
         : "SELECT id, created_at, type, content, metadata FROM sparkie_worklog WHERE user_id = $1 ORDER BY created_at DESC LIMIT 20"
@@ -59,6 +62,7 @@ export async function GET(req: NextRequest) {
     const { searchParams } = new URL(req.url)
     const since = searchParams.get('since')
     const sinceClause = since ? `AND created_at > '${since}'` : ''
+    await flushAllSinks()
     const bridge = await query(
       `SELECT id, user_id, author, type, content, metadata, created_at FROM sparkie_bridge WHERE 1=1 ${sinceClause} ORDER BY created_at DESC LIMIT 50`,
       []
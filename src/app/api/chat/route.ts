@@ -8,28 +8,32 @@ import path from 'path'
 import { getServerSession } from 'next-auth/next'
 import { authOptions } from '@/lib/auth'
 import { query } from '@/lib/db'
-import { loadIdentityFiles, buildIdentityBlock, updateSessionFile, updateContextFile, updateActionsFile, type IdentityFiles } from '@/lib/identity'
+import { LruCache } from '@/lib/lruCache'
+import { onInvalidation, publishInvalidation } from '@/lib/cacheBus'
+import { loadRankedMemories, loadSelfMemories } from '@/lib/memoryRetrieval'
+import { loadIdentityFiles, buildIdentityBlock, updateSessionFile, type IdentityFiles } from '@/lib/identity'
 import { buildEnvironmentalContext, formatEnvContextBlock, recordUserActivity } from '@/lib/environmentalContext'
 import { extractDeferredIntent, saveDeferredIntent, loadReadyDeferredIntents, markDeferredIntentSurfaced } from '@/lib/timeModel'
-import { startTrace, addTraceEntry, detectTraceLoop, endTrace, persistTrace, getTokenStatus, updateTokenEstimate } from '@/lib/executionTrace'
+import { startTrace, addTraceEntry, detectTraceLoop, endTrace, persistTrace, getTokenStatus, updateTokenEstimate, StageTimer } from '@/lib/executionTrace'
 import { getAttempts, saveAttempt, formatAttemptBlock } from '@/lib/attemptHistory'
 import { getUserModel, formatUserModelBlock, ingestSessionSignal, detectEmotionalState, formatEmotionalStateBlock } from '@/lib/userModel'
 import { readSessionSnapshot, writeSessionSnapshot } from '@/lib/threadStore'
 import { writeWorklog, writeMsgBatch } from '@/lib/worklog'
-import { createBehaviorRule, listBehaviorRules, updateBehaviorRule, formatBehaviorRulesBlock } from '@/lib/behaviorRules'
-import { queryCausalGraph, addCausalLink, observeEventPair, formatCausalInference } from '@/lib/causalModel'
-import { createGoal, loadActiveGoals, updateGoalProgress, completeGoal, listGoals, formatGoalsBlock, tickSessionsWithoutProgress } from '@/lib/goalEngine'
+import { listBehaviorRules, formatBehaviorRulesBlock } from '@/lib/behaviorRules'
+import { observeEventPair, formatCausalInference } from '@/lib/causalModel'
+import { loadActiveGoals, updateGoalProgress, formatGoalsBlock, tickSessionsWithoutProgress } from '@/lib/goalEngine'
 import { runSelfReflection, getRecentReflections, formatSelfReflectionBlock } from '@/lib/selfReflection'
 import { SPARKIE_TOOLS_S2 } from '@/lib/sprint2-tools'
-import { executeSprint2Tool } from '@/lib/sprint2-cases'
 import { SPARKIE_TOOLS_S3 } from '@/lib/sprint3-tools'
-import { executeSprint3Tool } from '@/lib/sprint3-cases'
 import { SPARKIE_TOOLS_S4 } from '@/lib/sprint4-tools'
-import { executeSprint4Tool } from '@/lib/sprint4-cases'
 import { SPARKIE_TOOLS_S5 } from '@/lib/sprint5-tools'
-import { executeSprint5Tool } from '@/lib/sprint5-cases'
+import { SPRINT_TOOL_HANDLERS, SPRINT_CHIP_LABELS, SPRINT_WORKLOG_LABELS, SPRINT_STEP_ICONS } from '@/lib/sprint-dispatch'
+import { loadToolModule } from '@/lib/tools/registry'
+import { selectTools, recordWidened, toolSelectionEnabled } from '@/lib/toolSelection'
+import { PromptBuilder } from '@/lib/promptPrefix'
+import { passthroughStream, sanitizingStream, upstreamLines } from '@/lib/sseStream'
 import { updateTopicCognition } from '@/lib/scheduler'
-import { ingestRepo, getProjectContext, addKnownIssue, resolveKnownIssue, formatProjectContextBlock } from '@/lib/repoIngestion'
+import { getProjectContext, addKnownIssue, formatProjectContextBlock } from '@/lib/repoIngestion'
 
 export const runtime = 'nodejs'
 export const maxDuration = 180
@@ -99,7 +103,9 @@ For STACK B projects: after writing the files, use execute_terminal to run npm i
 - For React: TypeScript strict, clean component structure, no prop drilling
 - Always create a SPEC.md describing what was built and how to use it
 `
-const MINIMAX_BASE = 'https://api.minimax.io/v1'
+// MINIMAX_ORIGIN can point at a local OpenAI-compatible stub (see .github/scripts/bench_chat.py)
+const MINIMAX_ORIGIN = process.env.MINIMAX_BASE_URL || 'https://api.minimax.io'
+const MINIMAX_BASE = `${MINIMAX_ORIGIN}/v1`
 
 // ── Sparkie's Soul + Identity (injected into every system prompt) ─────────────
 const SPARKIE_SOUL = `# SOUL.md — Sparkie's Heart
@@ -2851,72 +2857,116 @@ const SPARKIE_TOOLS = [
   },
 ]
 
-// ── One-time DDL init guard ───────────────────────────────────────────────────────
-let _dbInitialized = false
-async function ensureDbInit(): Promise<void> {
-  if (_dbInitialized) return
-  _dbInitialized = true
-  try {
-    await query(`CREATE TABLE IF NOT EXISTS user_memories (
-      id SERIAL PRIMARY KEY, user_id TEXT NOT NULL, category TEXT NOT NULL DEFAULT 'general',
-      content TEXT NOT NULL, created_at TIMESTAMPTZ DEFAULT NOW(), updated_at TIMESTAMPTZ DEFAULT NOW()
-    )`)
-    await query(`CREATE INDEX IF NOT EXISTS idx_user_memories_user_id ON user_memories(user_id)`)
-    await query(`CREATE TABLE IF NOT EXISTS user_sessions (
-      id SERIAL PRIMARY KEY, user_id TEXT NOT NULL UNIQUE,
-      last_seen_at TIMESTAMPTZ DEFAULT NOW(), session_count INTEGER DEFAULT 1,
-      first_seen_at TIMESTAMPTZ DEFAULT NOW()
-    )`)
-  } catch { /* tables may already exist */ }
-}
-
-// ── Memory helpers ─────────────────────────────────────────────────────────────
-async function loadMemories(userId: string, queryText?: string): Promise<string> {
-  // ── Supermemory semantic retrieval (if configured) ──────────────────────────
-  const smKey = process.env.SUPERMEMORY_API_KEY
-  if (smKey && queryText) {
-    try {
-      const smRes = await fetch('https://api.supermemory.ai/v3/profile', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json', 'Authorization': `Bearer ${smKey}` },
-        body: JSON.stringify({ containerTag: userId, q: queryText }),
-        signal: AbortSignal.timeout(2000),
-      })
-      if (smRes.ok) {
-        const sm = await smRes.json() as {
-          profile?: { static?: string[]; dynamic?: string[] }
-          searchResults?: { results?: Array<{ memory?: string }> }
+// ── Tool validation (once per process) ────────────────────────────────────────
+// SPARKIE_TOOLS is static, so the filter below runs on first use instead of every round.
+// The array identity is also what toolSelection caches its index on.
+let _validTools: typeof SPARKIE_TOOLS | null = null
+function getValidTools(): typeof SPARKIE_TOOLS {
+  if (_validTools) return _validTools
+  // Use ONLY SPARKIE_TOOLS — do NOT include connectorTools.
+  // Deduplicate by function name: keep first occurrence only.
+  // MiniMax rejects requests with duplicate function names.
+  const seen = new Set<string>()
+  const allTools = SPARKIE_TOOLS
+  const validTools: typeof allTools = []
+  for (const t of allTools) {
+    const name = t?.function?.name?.trim()
+    const params = t?.function?.parameters
+    const paramsType = typeof params
+    const isObject = paramsType === 'object' && params !== null && !Array.isArray(params)
+    const hasObjectType = isObject && (params as Record<string, unknown>).type === 'object'
+    if (!name) {
+      console.warn(`[tool-filter] REMOVING tool with empty name`)
+      continue
+    }
+    if (seen.has(name)) {
+      console.warn(`[tool-filter] REMOVING duplicate tool "${name}"`)
+      continue
+    }
+    if (!isObject || !hasObjectType) {
+      console.warn(`[tool-filter] REMOVING tool "${name}" paramsType=${paramsType} isObject=${isObject} hasObjectType=${hasObjectType}`)
+      continue
+    }
+    const p = params as { required?: string[]; properties?: Record<string, unknown> }
+    // empty-properties filter removed
+    // Reject tools with empty required array — MiniMax may reject "required is empty"
+    if (Array.isArray(p.required) && p.required.length === 0) {
+      delete p.required
+    }
+    if (p.required && p.properties) {
+      let requiredOk = true
+      for (const req of p.required) {
+        if (!(req in p.properties)) {
+          console.warn(`[tool-filter] REMOVING tool "${name}" — required field "${req}" missing from properties`)
+          requiredOk = false
+          break
         }
-        const parts: string[] = []
-        const staticFacts = sm.profile?.static?.filter(Boolean) ?? []
-        const dynamicCtx  = sm.profile?.dynamic?.filter(Boolean) ?? []
-        const relevant    = sm.searchResults?.results?.slice(0, 8).map(r => r.memory).filter(Boolean) ?? []
-        if (staticFacts.length) parts.push('### Who they are\n' + staticFacts.join('\n'))
-        if (dynamicCtx.length)  parts.push('### Current context\n' + dynamicCtx.join('\n'))
-        if (relevant.length)    parts.push('### Most relevant to this conversation\n' + relevant.join('\n'))
-        if (parts.length) return parts.join('\n\n')
       }
-    } catch { /* fall through to SQL */ }
+      if (!requiredOk) continue
+    }
+    seen.add(name)
+    validTools.push(t)
   }
+  console.log(`[tool-filter] ${allTools.length} total → ${validTools.length} valid (removed ${allTools.length - validTools.length})`)
+  _validTools = validTools
+  return validTools
+}
+
+// ── Memory helpers ─────────────────────────────────────────────────────────────
+// Supermemory profile + search block per user. The profile half doesn't depend on
+// the message; the search half comes from the message that filled the entry, which
+// within a minute of one conversation is close enough. Empty results (error, 2s
+// timeout, nothing stored) are cached too, so a slow Supermemory costs one wait
+// per user per minute, not one per message. Not evicted on 'memories': every turn
+// pushes to Supermemory, which indexes asynchronously, so the TTL is the real bound
+const _smCache = new LruCache<string, string>({ name: 'chat.supermemory', maxEntries: 2000, ttlMs: 60_000, maxBytes: 16 * 1024 * 1024 })
+
+async function loadSupermemory(smKey: string, userId: string, queryText: string): Promise<string> {
+  try {
+    const smRes = await fetch('https://api.supermemory.ai/v3/profile', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', 'Authorization': `Bearer ${smKey}` },
+      body: JSON.stringify({ containerTag: userId, q: queryText }),
+      signal: AbortSignal.timeout(2000),
+    })
+    if (!smRes.ok) return ''
+    const sm = await smRes.json() as {
+      profile?: { static?: string[]; dynamic?: string[] }
+      searchResults?: { results?: Array<{ memory?: string }> }
+    }
+    const parts: string[] = []
+    const staticFacts = sm.profile?.static?.filter(Boolean) ?? []
+    const dynamicCtx  = sm.profile?.dynamic?.filter(Boolean) ?? []
+    const relevant    = sm.searchResults?.results?.slice(0, 8).map(r => r.memory).filter(Boolean) ?? []
+    if (staticFacts.length) parts.push('### Who they are\n' + staticFacts.join('\n'))
+    if (dynamicCtx.length)  parts.push('### Current context\n' + dynamicCtx.join('\n'))
+    if (relevant.length)    parts.push('### Most relevant to this conversation\n' + relevant.join('\n'))
+    return parts.join('\n\n')
+  } catch { return '' }
+}
 
-  // ── SQL fallback ─────────────────────────────────────────────────────────────
+async function loadSqlMemories(userId: string, queryText?: string): Promise<string> {
+  // Ranked top-k within a token budget (lib/memoryRetrieval). It caches the
+  // message-independent rows per user (and the self rows once); only the
+  // full-text matches for this message hit the database
   try {
-    await ensureDbInit()
-    const [userRes, selfRes] = await Promise.all([
-      query<{ category: string; content: string }>(
-        'SELECT category, content FROM user_memories WHERE user_id = $1 ORDER BY created_at ASC',
-        [userId]
-      ),
-      query<{ category: string; content: string }>(
-        'SELECT category, content FROM sparkie_self_memory ORDER BY created_at DESC LIMIT 80'
-      ).catch(() => ({ rows: [] as Array<{ category: string; content: string }> })),
+    const [userBlock, selfBlock] = await Promise.all([
+      loadRankedMemories(userId, queryText),
+      loadSelfMemories(queryText),
     ])
-    const lines: string[] = []
-    for (const r of userRes.rows) lines.push(`[${r.category}] ${r.content}`)
-    for (const r of selfRes.rows) lines.push(`[self:${r.category}] ${r.content}`)
-    return lines.join('\n')
+    return [userBlock, selfBlock].filter(Boolean).join('\n')
   } catch { return '' }
 }
+
+async function loadMemories(userId: string, queryText?: string): Promise<string> {
+  // Supermemory (if configured) and the SQL fallback start together, so a miss
+  // or timeout doesn't put the database load behind the external round trip
+  const smKey = process.env.SUPERMEMORY_API_KEY
+  const sql = loadSqlMemories(userId, queryText)
+  if (!smKey || !queryText) return sql
+  const smBlock = await _smCache.getOrLoad(userId, () => loadSupermemory(smKey, userId, queryText)).catch(() => '')
+  return smBlock || sql
+}
 async function getAwareness(userId: string): Promise<{ daysSince: number; sessionCount: number; timeLabel: string; shouldBrief: boolean }> {
   try {
     const now = new Date()
@@ -2947,7 +2997,7 @@ async function getAwareness(userId: string): Promise<{ daysSince: number; sessio
 
 async function extractAndSaveMemories(userId: string, conversation: string, apiKey: string) {
   try {
-    const extractRes = await fetch('https://api.minimax.io/anthropic/v1/messages', {
+    const extractRes = await fetch(`${MINIMAX_ORIGIN}/anthropic/v1/messages`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
@@ -3007,7 +3057,7 @@ function pushToSupermemory(userId: string, content: string): void {
     method: 'POST',
     headers: { 'Content-Type': 'application/json', 'Authorization': `Bearer ${smKey}` },
     body: JSON.stringify({ content, containerTag: userId }),
-  }).catch(() => {})
+  }).then(() => publishInvalidation('memories', userId)).catch(() => {})
 }
 
 // ── Supermemory: push a full conversation snapshot ─────────────────────────────
@@ -3018,7 +3068,7 @@ function pushConversationToSupermemory(userId: string, conversation: string): vo
     method: 'POST',
     headers: { 'Content-Type': 'application/json', 'Authorization': `Bearer ${smKey}` },
     body: JSON.stringify({ content: conversation, containerTag: userId }),
-  }).catch(() => {})
+  }).then(() => publishInvalidation('memories', userId)).catch(() => {})
 }
 
 // ── Tool executor ─────────────────────────────────────────────────────────────
@@ -3029,17 +3079,10 @@ async function executeTool(
 ): Promise<string> {
   const { userId, tavilyKey, apiKey, doKey, baseUrl, cookieHeader, abortSignal } = ctx
   try {
+    // Tools moved to src/lib/tools/ (split_tools.py) load on first call
+    const toolModule = await loadToolModule(name)
+    if (toolModule) return await toolModule(name, args, ctx)
     switch (name) {
-      case 'get_weather': {
-        const city = args.city as string | undefined
-        const weatherUrl = city
-          ? `${baseUrl}/api/weather?city=${encodeURIComponent(city)}`
-          : `${baseUrl}/api/weather`
-        const res = await fetch(weatherUrl, { signal: AbortSignal.timeout(8000) })
-        if (!res.ok) return `Weather fetch failed: ${res.status}`
-        return JSON.stringify(await res.json())
-      }
-
       case 'search_web': {
         if (!tavilyKey) return 'Web search not available'
         const searchQuery = (args.query as string).slice(0, 200)
@@ -3114,58 +3157,6 @@ async function executeTool(
         })
       }
 
-      case 'get_radio_playlist': {
-        const res = await fetch('https://raw.githubusercontent.com/Draguniteus/SparkieRadio/main/playlist.json', {
-          signal: AbortSignal.timeout(5000),
-        })
-        if (!res.ok) return 'Could not fetch radio playlist'
-        const d = await res.json() as Array<{ title: string; artist: string }>
-        return (Array.isArray(d) ? d : []).map((t, i) => `${i + 1}. ${t.title} — ${t.artist}`).join('\n')
-      }
-
-      case 'generate_image': {
-        const prompt = args.prompt as string
-        if (!prompt?.trim()) return 'No prompt provided for image generation'
-
-        // ── Pollinations gen.pollinations.ai — direct, no slow pre-providers ──
-        // grok-imagine/p-image/klein confirmed working; seedream/seedream5 for quality variety
-        // 25s timeout each × 5 models max = ~125s total, well under serverless limits
-        const polModels = ['grok-imagine', 'p-image', 'klein', 'seedream', 'seedream5']
-        for (const polModel of polModels) {
-          try {
-            const seed = Math.floor(Math.random() * 999999)
-            const polUrl = 'https://gen.pollinations.ai/image/' + encodeURIComponent(prompt) + '?model=' + polModel + '&width=1024&height=1024&nologo=true&seed=' + seed
-            const polAuthKey = process.env.POLLINATIONS_API_KEY
-            const imgRes = await fetch(polUrl, {
-              headers: { 'User-Agent': 'SparkieStudio/1.0', ...(polAuthKey ? { Authorization: `Bearer ${polAuthKey}` } : {}) },
-              signal: AbortSignal.timeout(25000),
-            })
-            if (imgRes.ok) {
-              const ct = imgRes.headers.get('content-type') || 'image/jpeg'
-              const buf = await imgRes.arrayBuffer()
-              const b64 = Buffer.from(buf).toString('base64')
-              const dataUrl = 'data:' + ct + ';base64,' + b64
-              // Persist asset to DB so the message stores a stable URL (not MB of base64)
-              if (userId) {
-                try {
-                  const fid = crypto.randomUUID()
-                  const slug = (prompt as string).slice(0, 40).replace(/[^a-z0-9]/gi, '_').toLowerCase()
-                  await query(
-                    `INSERT INTO sparkie_assets (user_id, name, content, asset_type, source, file_id, chat_title, chat_id, language)
-                     VALUES ($1, $2, $3, 'image', 'agent', $4, '', '', '')`,
-                    [userId, slug + '.jpg', dataUrl, fid]
-                  )
-                  return 'IMAGE_URL:' + baseUrl + '/api/assets-image?fid=' + fid
-                } catch { /* fall back to data URL if DB save fails */ }
-              }
-              return 'IMAGE_URL:' + dataUrl
-            }
-          } catch { /* try next model */ }
-        }
-
-        return 'Image generation is temporarily unavailable. Please try again in a moment.'
-      }
-
       // Alias for text_to_speech — UI maps reference generate_speech
       case 'generate_speech': {
         if (!userId) return 'Not authenticated'
@@ -3317,7 +3308,7 @@ async function executeTool(
         let styleTagsFromLyrics = ''
         if (!lyricsText) {
           try {
-            const lyricsRes = await fetch('https://api.minimax.io/v1/lyrics_generation', {
+            const lyricsRes = await fetch(`${MINIMAX_BASE}/lyrics_generation`, {
               method: 'POST',
               headers: { Authorization: `Bearer ${minimaxKey}`, 'Content-Type': 'application/json' },
               body: JSON.stringify({ mode: 'write_full_song', prompt: prompt.slice(0, 2000) }),
@@ -3388,17 +3379,6 @@ async function executeTool(
         return 'Music generated but no audio URL returned'
       }
 
-      case 'get_current_time': {
-        const tz = (args.timezone as string | undefined) ?? 'UTC'
-        try {
-          const formatted = new Date().toLocaleString('en-US', {
-            timeZone: tz, weekday: 'long', year: 'numeric',
-            month: 'long', day: 'numeric', hour: '2-digit', minute: '2-digit', timeZoneName: 'short',
-          })
-          return `Current time: ${formatted}`
-        } catch { return `Current time: ${new Date().toUTCString()}` }
-      }
-
       case 'save_memory': {
         if (!userId) return 'Cannot save memory — user not logged in'
         const category = args.category as string
@@ -3436,1673 +3416,139 @@ async function executeTool(
         return `Saved to memory: [${category}] ${content}`
       }
 
-      case 'search_twitter': {
-        if (!tavilyKey) return 'Search not available'
-        const q = `site:twitter.com OR site:x.com ${args.query as string}`
-        const res = await fetch('https://api.tavily.com/search', {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', 'Authorization': `Bearer ${tavilyKey}` },
-          body: JSON.stringify({ query: q.slice(0, 200), max_results: 5, search_depth: 'basic' }),
-          signal: AbortSignal.timeout(8000),
-        })
-        if (!res.ok) return `Twitter search failed: ${res.status}`
-        const d = await res.json()
-        const results = (d.results ?? []).slice(0, 5) as Array<{ title: string; content: string; url: string }>
-        return results.map((r) => `${r.title}\n${r.content.slice(0, 200)}\n${r.url}`).join('\n\n')
-      }
-
-      case 'search_reddit': {
-        if (!tavilyKey) return 'Search not available'
-        const subreddit = args.subreddit as string | undefined
-        const q = subreddit
-          ? `site:reddit.com/r/${subreddit} ${args.query as string}`
-          : `site:reddit.com ${args.query as string}`
-        const res = await fetch('https://api.tavily.com/search', {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', 'Authorization': `Bearer ${tavilyKey}` },
-          body: JSON.stringify({ query: q.slice(0, 200), max_results: 5, search_depth: 'basic' }),
-          signal: AbortSignal.timeout(8000),
-        })
-        if (!res.ok) return `Reddit search failed: ${res.status}`
-        const d = await res.json()
-        const results = (d.results ?? []).slice(0, 5) as Array<{ title: string; content: string; url: string }>
-        return results.map((r) => `${r.title}\n${r.content.slice(0, 200)}\n${r.url}`).join('\n\n')
-      }
-
 
-      case 'journal_search': {
-        if (!userId) return 'Dream Journal not available — user not logged in'
-        const q = (args.query as string | undefined) || ''
-        const cat = (args.category as string | undefined) || ''
-        let sql = `SELECT id, title, content, category, created_at FROM dream_journal WHERE user_id = $1`
-        const params: string[] = [userId]
-        if (q) {
-          params.push(`%${q}%`)
-          sql += ` AND (LOWER(title) LIKE LOWER($${params.length}) OR LOWER(content) LIKE LOWER($${params.length}))`
-        }
-        if (cat) {
-          params.push(cat)
-          sql += ` AND category = $${params.length}`
-        }
-        sql += ` ORDER BY created_at DESC LIMIT 5`
-        const res = await query<{ id: string; title: string; content: string; category: string; created_at: string }>(sql, params)
-        if (!res.rows.length) return q ? `No journal entries found matching "${q}".` : 'No journal entries yet.'
-        const stripHtml = (html: string) => html.replace(/<[^>]+>/g, ' ').replace(/\s+/g, ' ').trim()
-        return res.rows.map((e, i) =>
-          `[${i + 1}] "${e.title}" (${e.category.replace('_', ' ')}) — ${new Date(e.created_at).toLocaleDateString()}\n${stripHtml(e.content).slice(0, 400)}`
-        ).join('\n\n')
-      }
 
-      case 'journal_add': {
-        if (!userId) return 'Dream Journal not available — user not logged in'
-        const title = (args.title as string)?.trim()
-        const content = (args.content as string)?.trim()
-        const category = (args.category as string) || 'night_dreams'
-        if (!title || !content) return 'Title and content are both required to add a journal entry.'
-        await query(
-          `INSERT INTO dream_journal (user_id, title, content, category) VALUES ($1, $2, $3, $4)`,
-          [userId, title, content, category]
-        )
-        return `✓ Added to your ${category.replace('_', ' ')} journal: "${title}"`
+      // ── Composio Direct Execute ──────────────────────────────────────────────
+      case 'composio_execute': {
+        const { slug, args: execArgs } = args as { slug: string; args: Record<string, unknown> }
+        if (!userId) return 'Not authenticated'
+        if (!slug) return 'composio_execute: slug is required'
+        return await executeConnectorTool(slug, execArgs ?? {}, userId)
       }
 
 
-      case 'create_task': {
-        if (!userId) return 'Not authenticated'
-        const action = args.action as string
-        const label = args.label as string
-        const whyHuman = (args.why_human as string) ?? ''
-        const payload = (args.payload as Record<string, unknown>) ?? {}
-        if (!action || !label) return 'action and label are required'
-
-        // batch_create: chain multiple tasks with depends_on
-        if (action === 'batch_create') {
-          const tasks = args.tasks as Array<{
-            label: string; executor?: 'ai' | 'human'; action?: string; why_human?: string
-          }>
-          if (!tasks || !Array.isArray(tasks)) return 'batch_create requires a tasks array'
-          const results: Array<{ id: string; label: string; executor: string }> = []
-          let prevId: string | null = null
-          for (const task of tasks) {
-            const taskId = `task_${Date.now()}_${Math.random().toString(36).slice(2, 8)}`
-            await query(
-              `INSERT INTO sparkie_tasks (id, user_id, action, label, payload, status, executor, trigger_type, why_human, depends_on)
-               VALUES ($1, $2, $3, $4, $5, 'pending', $6, 'manual', $7, $8)
-               ON CONFLICT (id) DO NOTHING`,
-              [taskId, userId, task.action ?? '', task.label, JSON.stringify({}), task.executor ?? 'human', task.why_human ?? '', prevId]
-            )
-            results.push({ id: taskId, label: task.label, executor: task.executor ?? 'human' })
-            prevId = taskId
-          }
-          return `HITL_TASK:${JSON.stringify({ batch: true, created: results.length, tasks: results })}`
-        }
 
-        const taskId = `task_${Date.now()}_${Math.random().toString(36).slice(2, 8)}`
-        try {
-          await query(
-            `CREATE TABLE IF NOT EXISTS sparkie_tasks (
-              id TEXT PRIMARY KEY, user_id TEXT NOT NULL, action TEXT NOT NULL, label TEXT NOT NULL,
-              payload JSONB NOT NULL DEFAULT '{}', status TEXT NOT NULL DEFAULT 'pending',
-              executor TEXT NOT NULL DEFAULT 'human', trigger_type TEXT DEFAULT 'manual',
-              trigger_config JSONB DEFAULT '{}', scheduled_at TIMESTAMPTZ, why_human TEXT,
-              created_at TIMESTAMPTZ DEFAULT NOW(), resolved_at TIMESTAMPTZ, depends_on TEXT
-            )`
-          )
-          await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS executor TEXT NOT NULL DEFAULT 'human'`).catch(() => {})
-          await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS trigger_type TEXT DEFAULT 'manual'`).catch(() => {})
-          await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS why_human TEXT`).catch(() => {})
-          await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS depends_on TEXT`).catch(() => {})
-          await query(
-            `INSERT INTO sparkie_tasks (id, user_id, action, label, payload, status, executor, trigger_type, why_human)
-             VALUES ($1, $2, $3, $4, $5, 'pending', 'human', 'manual', $6)
-             ON CONFLICT (id) DO NOTHING`,
-            [taskId, userId, action, label, JSON.stringify(payload), whyHuman]
-          )
-          return `HITL_TASK:${JSON.stringify({ id: taskId, action, label, payload, why_human: whyHuman })}`
-        } catch (e) {
-          return `Failed to create task: ${(e as Error).message}`
-        }
-      }
-      case 'update_context': {
+      case 'read_email': {
         if (!userId) return 'Not authenticated'
-        const content = args.content as string
-        if (!content) return 'content is required'
-        await updateContextFile(userId, content)
-        return 'Context updated (L3 state saved)'
+        const emailArgs: Record<string, unknown> = { max_results: 5, ...(args as Record<string, unknown>) }
+        // Default to primary inbox — exclude promotions/updates/social unless user specifies otherwise
+        if (!emailArgs['query']) emailArgs['query'] = 'label:inbox -category:promotions -category:updates -category:social'
+        return await executeConnectorTool('GMAIL_FETCH_EMAILS', emailArgs, userId)
       }
 
-      case 'update_actions': {
+      case 'get_calendar': {
         if (!userId) return 'Not authenticated'
-        const content = args.content as string
-        if (!content) return 'content is required'
-        await updateActionsFile(userId, content)
-        return 'Action chain updated (L6 saved)'
+        // GOOGLECALENDAR_LIST_EVENTS doesn't exist — use GOOGLECALENDAR_EVENTS_LIST (confirmed working)
+        return await executeConnectorTool('GOOGLECALENDAR_EVENTS_LIST', args, userId)
       }
 
-      case 'schedule_task': {
+      case 'search_youtube': {
         if (!userId) return 'Not authenticated'
-        const label = args.label as string
-        const action = args.action as string
-        const triggerType = args.trigger_type as string
-        const delayHours = args.delay_hours as number | undefined
-        const cronExpression = args.cron_expression as string | undefined
-        if (!label || !action || !triggerType) return 'label, action, and trigger_type are required'
-
-        // Calculate scheduled_at for delay tasks and immediate tasks
-        const whenIso = args.when_iso as string | undefined
-        let scheduledAt: Date | null = null
-        if (triggerType === 'delay') {
-          if (whenIso) {
-            // Prefer exact ISO datetime — no AM/PM math needed
-            scheduledAt = new Date(whenIso)
-            if (isNaN(scheduledAt.getTime())) scheduledAt = null
-          } else if (delayHours) {
-            scheduledAt = new Date(Date.now() + delayHours * 3600 * 1000)
-          }
-        } else if (triggerType === 'immediate') {
-          // Immediate tasks fire as soon as the scheduler picks them up
-          scheduledAt = new Date()
-        }
-
-        const taskId = `task_${Date.now()}_${Math.random().toString(36).slice(2, 8)}`
-        try {
-          await query(
-            `CREATE TABLE IF NOT EXISTS sparkie_tasks (
-              id TEXT PRIMARY KEY, user_id TEXT NOT NULL, action TEXT NOT NULL, label TEXT NOT NULL,
-              payload JSONB NOT NULL DEFAULT '{}', status TEXT NOT NULL DEFAULT 'pending',
-              executor TEXT NOT NULL DEFAULT 'human', trigger_type TEXT DEFAULT 'manual',
-              trigger_config JSONB DEFAULT '{}', scheduled_at TIMESTAMPTZ, why_human TEXT,
-              created_at TIMESTAMPTZ DEFAULT NOW(), resolved_at TIMESTAMPTZ, depends_on TEXT, draft_id TEXT
-            )`
-          )
-          // Alter existing table to add new columns if they don't exist
-          await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS executor TEXT NOT NULL DEFAULT 'human'`).catch(() => {})
-          await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS trigger_type TEXT DEFAULT 'manual'`).catch(() => {})
-          await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS trigger_config JSONB DEFAULT '{}'`).catch(() => {})
-          await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS scheduled_at TIMESTAMPTZ`).catch(() => {})
-          await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS why_human TEXT`).catch(() => {})
-          await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS depends_on TEXT`).catch(() => {})
-          await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS draft_id TEXT`).catch(() => {})
-
-          const triggerConfig = triggerType === 'cron' ? { expression: cronExpression } : { delay_hours: delayHours }
-          await query(
-            `INSERT INTO sparkie_tasks (id, user_id, action, label, payload, status, executor, trigger_type, trigger_config, scheduled_at)
-             VALUES ($1, $2, $3, $4, $5, 'pending', 'ai', $6, $7, $8)`,
-            [taskId, userId, action, label, '{}', triggerType, JSON.stringify(triggerConfig), scheduledAt]
-          )
-          const when = triggerType === 'delay' && delayHours
-            ? `in ${delayHours >= 24 ? `${Math.round(delayHours/24)} day(s)` : `${delayHours} hour(s)`}`
-            : `on schedule: ${cronExpression}`
-          return `SCHEDULED_TASK:${JSON.stringify({ id: taskId, label, trigger_type: triggerType, when })}`
-        } catch (e) {
-          return `Failed to schedule task: ${(e as Error).message}`
-        }
+        // YOUTUBE_LIST_VIDEO doesn't exist — use YOUTUBE_SEARCH (confirmed working)
+        return await executeConnectorTool('YOUTUBE_SEARCH', args, userId)
       }
 
-      case 'read_pending_tasks': {
-        if (!userId) return 'Not authenticated'
-        const statusFilter = (args.status as string) ?? 'pending'
-        try {
-          const whereClause = statusFilter === 'all'
-            ? 'user_id = $1'
-            : "user_id = $1 AND status = $2"
-          const params = statusFilter === 'all' ? [userId] : [userId, statusFilter]
-          const result = await query(
-            `SELECT id, label, action, status, executor, trigger_type, scheduled_at, created_at, draft_id
-             FROM sparkie_tasks WHERE ${whereClause} ORDER BY created_at DESC LIMIT 20`,
-            params
-          )
-          if (result.rows.length === 0) return 'No tasks found.'
-          const taskList = (result.rows as any[]).map(t =>
-            `- [${t.status.toUpperCase()}] ${t.label} (${t.executor}, ${t.trigger_type}${t.scheduled_at ? `, due: ${new Date(t.scheduled_at).toLocaleDateString()}` : ''})`
-          ).join('\n')
-          return 'Pending tasks:\n' + taskList
-        } catch (e) {
-          return `Error reading tasks: ${(e as Error).message}`
-        }
-      }
+      // ── Social Draft (HITL) ───────────────────────────────────────────────────
+      // ── Worklog Readback ─────────────────────────────────────────────────────
+      // ── Attempt History ──────────────────────────────────────────────────────
+      // ── CIP Engine Tool Cases (L2-L7) ─────────────────────────────────────────
+      // ── Block 4: Missing tools — manage_email, delete_memory, manage_calendar_event, send_card_to_user ──
 
-      case 'trigger_deploy': {
-        const { action: deployAction, deployment_id: depId, log_type: logType, envs: envVars } = args as {
-          action: 'status' | 'deploy' | 'rollback' | 'cancel' | 'logs' | 'get_env' | 'set_env'
-          deployment_id?: string
-          log_type?: string
-          envs?: Array<{ key: string; value: string; type?: string }>
+      case 'memory_manage': {
+        if (!userId) return 'Not authenticated'
+        const { action, category, hint, quote, content, query: memQuery, memory_id, limit: memLim = 20 } = args as {
+          action: string; category?: string; hint?: string; quote?: string; content?: string
+          query?: string; memory_id?: number; limit?: number
         }
         try {
-          const appDomain = process.env.APP_DOMAIN ?? 'sparkie-studio-mhouq.ondigitalocean.app'
-          const internalKey = process.env.SPARKIE_INTERNAL_SECRET ?? ''
-          const base = `https://${appDomain}/api/admin/deploy`
-          const headers = { 'x-internal-secret': internalKey, 'Content-Type': 'application/json' }
-
-          if (deployAction === 'status') {
-            const r = await fetch(base, { headers })
-            if (!r.ok) return `trigger_deploy status: HTTP ${r.status}`
-            const d = await r.json() as { active_deployment: { id: string; phase: string; cause: string; updated_at: string } | null; recent_deployments: Array<{ id: string; phase: string; cause: string; updated_at: string }> }
-            const active = d.active_deployment
-            if (!active) return `No active deployment found. Recent: ${JSON.stringify(d.recent_deployments?.slice(0,2))}`
-            const isHealthy = active.phase === 'ACTIVE'
-            const isBuilding = ['BUILDING','DEPLOYING','PENDING_BUILD'].includes(active.phase)
-            const isFailed = ['ERROR','FAILED','CANCELED'].includes(active.phase)
-            if (isHealthy) return `✅ Deployment ACTIVE — last updated ${active.updated_at}. Cause: ${active.cause}.`
-            if (isBuilding) return `🔄 Build in progress (${active.phase}). Triggered by: ${active.cause}. ID: ${active.id.slice(0,8)}`
-            if (isFailed) return `🚨 Deployment FAILED (${active.phase}). ID: ${active.id.slice(0,8)}. Cause: ${active.cause}. Call trigger_deploy({action:'logs'}) to see why.`
-            return `Deployment phase: ${active.phase}. ID: ${active.id.slice(0,8)}`
-          }
-
-          if (deployAction === 'deploy') {
-            const r = await fetch(base, { method: 'POST', headers })
-            if (!r.ok) { const t = await r.text(); return `trigger_deploy deploy: HTTP ${r.status} — ${t.slice(0,200)}` }
-            const d = await r.json() as { deployment: { id: string; phase: string } }
-            writeWorklog(userId ?? 'system', 'task_executed', `🚀 Triggered new deployment`, { status: 'done', decision_type: 'action', deployment_id: d.deployment?.id, reasoning: 'Manual deploy triggered via trigger_deploy tool', signal_priority: 'P2', conclusion: `New deployment triggered — deployment ID ${d.deployment?.id?.slice(0, 8) ?? 'unknown'} is now building` }).catch(() => {})
-            return `🚀 Deploy triggered! Deployment ID: ${d.deployment?.id?.slice(0,8)}. Phase: ${d.deployment?.phase}. Call trigger_deploy({action:'status'}) in ~3 min to confirm it went ACTIVE.`
-          }
-
-          if (deployAction === 'rollback') {
-            if (!depId) return 'trigger_deploy rollback: deployment_id required. Call trigger_deploy({action:"status"}) to get recent deployment IDs.'
-            const r = await fetch(base, { method: 'PUT', headers, body: JSON.stringify({ deployment_id: depId }) })
-            if (!r.ok) { const t = await r.text(); return `trigger_deploy rollback: HTTP ${r.status} — ${t.slice(0,200)}` }
-            const d = await r.json() as { deployment: { id: string; phase: string } }
-            writeWorklog(userId ?? 'system', 'task_executed', `⏪ Rolled back to deployment ${depId.slice(0,8)}`, { status: 'done', decision_type: 'action', deployment_id: d.deployment?.id, reasoning: `Rollback to ${depId}`, signal_priority: 'P1', conclusion: `Rollback initiated to deployment ${depId.slice(0, 8)} — new deployment in progress` }).catch(() => {})
-            return `⏪ Rollback initiated. New deployment ID: ${d.deployment?.id?.slice(0,8)}`
-          }
-
-          if (deployAction === 'cancel') {
-            if (!depId) return 'trigger_deploy cancel: deployment_id required.'
-            const r = await fetch(`${base}?deployment_id=${depId}`, { method: 'DELETE', headers })
-            if (!r.ok) { const t = await r.text(); return `trigger_deploy cancel: HTTP ${r.status} — ${t.slice(0,200)}` }
-            return `✅ Deployment ${depId.slice(0,8)} cancelled.`
-          }
-
-          if (deployAction === 'logs') {
-            const lt = logType ?? 'BUILD'
-            const r = await fetch(`${base}/logs?type=${lt}&fetch_content=true`, { headers })
-            if (!r.ok) return `trigger_deploy logs: HTTP ${r.status}`
-            const d = await r.json() as { content?: string; deployment_id?: string }
-            const logText = d.content ?? '(no log content)'
-            const trimmed = logText.length > 3000 ? '...(truncated)...\n' + logText.slice(-3000) : logText
-            return `📋 ${lt} log (deploy ${d.deployment_id?.slice(0,8)}):\n\n${trimmed}`
+          if (action === 'save') {
+            if (!content) return 'memory_manage: content is required for save'
+            const cat = category ?? 'general'
+            // Deduplicate — skip if similar content exists in same category
+            const existing = await query<{ id: number; content: string }>(
+              'SELECT id, content FROM user_memories WHERE user_id = $1 AND category = $2 ORDER BY created_at DESC LIMIT 10',
+              [userId, cat]
+            )
+            const newWords = new Set((content).toLowerCase().split(/\s+/).filter(w => w.length > 3))
+            const isCorrectionIntent = /\b(actually|correction|update|changed|revised|no longer)\b/i.test(content)
+            for (const row of existing.rows) {
+              const existWords = new Set(row.content.toLowerCase().split(/\s+/).filter(w => w.length > 3))
+              const overlap = newWords.size > 0 && existWords.size > 0
+                ? [...newWords].filter(w => existWords.has(w)).length / Math.max(newWords.size, existWords.size)
+                : 0
+              if (overlap > 0.6) {
+                if (isCorrectionIntent) {
+                  await query('UPDATE user_memories SET content = $1, hint = $2, quote = $3, updated_at = NOW() WHERE id = $4',
+                    [content, hint ?? content, quote ?? null, row.id])
+                  return `✅ Memory updated: [${cat}] ${hint ?? content}`
+                }
+                return `Already remembered: "${row.content.slice(0, 60)}"`
+              }
+            }
+            const aiHint = hint ?? content
+            const originalQuote = quote ?? null
+            await query(
+              'INSERT INTO user_memories (user_id, category, hint, quote, content) VALUES ($1, $2, $3, $4, $5)',
+              [userId, cat, aiHint, originalQuote, content]
+            )
+            pushToSupermemory(userId, `[${cat}] ${aiHint}`)
+            return `✅ Saved memory: [${cat}] ${aiHint}${originalQuote ? ` (from: "${String(originalQuote).slice(0, 50)}")` : ''}`
           }
 
-          if (deployAction === 'get_env') {
-            const r = await fetch(`${base}/env`, { headers })
-            if (!r.ok) return `trigger_deploy get_env: HTTP ${r.status}`
-            const d = await r.json() as { envs: Array<{ key: string; value?: string; type: string; scope: string }> }
-            const envList = (d.envs ?? []).map(e => `${e.key} [${e.type}/${e.scope}]${e.value ? ': ' + e.value : ': (secret)' }`).join('\n')
-            return `🔑 Env vars (${d.envs?.length ?? 0}):\n${envList}`
+          if (action === 'search') {
+            if (!memQuery) return 'memory_manage: query is required for search'
+            const cap = Math.min(Number(memLim), 50)
+            const catFilter = category ? 'AND category = $3' : ''
+            const params = category ? [userId, `%${memQuery}%`, category, cap] : [userId, `%${memQuery}%`, cap]
+            const res = await query(
+              `SELECT id, category, hint, quote, content, created_at FROM user_memories WHERE user_id = $1 AND content ILIKE $2 ${catFilter} ORDER BY created_at DESC LIMIT $${params.length}`,
+              params
+            )
+            const rows = res.rows as Array<{ id: number; category: string; hint: string | null; quote: string | null; content: string; created_at: string }>
+            if (!rows.length) return `No memories found for "${memQuery}"`
+            return rows.map(r =>
+              `[${r.id}:${r.category}] ${r.hint ?? r.content}${r.quote ? `\n  original: "${r.quote.slice(0, 80)}"` : ''}`
+            ).join('\n')
           }
 
-          if (deployAction === 'set_env') {
-            if (!envVars?.length) return 'trigger_deploy set_env: envs array required.'
-            const r = await fetch(`${base}/env`, { method: 'POST', headers, body: JSON.stringify({ envs: envVars }) })
-            if (!r.ok) { const t = await r.text(); return `trigger_deploy set_env: HTTP ${r.status} — ${t.slice(0,200)}` }
-            const d = await r.json() as { updated_keys: string[] }
-            writeWorklog(userId ?? 'system', 'task_executed', `🔑 Updated env vars: ${envVars.map(e=>e.key).join(', ')}`, { status: 'done', decision_type: 'action', reasoning: 'Env var update via trigger_deploy', signal_priority: 'P2', conclusion: `Environment variable(s) updated: ${envVars.map(e=>e.key).join(', ')} — a new deployment has started automatically` }).catch(() => {})
-            return `✅ Env vars updated: ${(d.updated_keys ?? envVars.map(e=>e.key)).join(', ')}. A new deployment will start automatically.`
+          if (action === 'delete') {
+            if (!memory_id) return 'memory_manage: memory_id is required for delete'
+            await query('DELETE FROM user_memories WHERE id = $1 AND user_id = $2', [memory_id, userId])
+            return `✅ Memory ${memory_id} deleted`
           }
 
-          return `trigger_deploy: unknown action "${deployAction}"`
-        } catch (e) {
-          return `trigger_deploy error: ${String(e)}`
-        }
-      }
-
-      case 'check_deployment': {
-        try {
-          const baseUrl = process.env.NEXTAUTH_URL ?? 'https://sparkie-studio-fymtq.ondigitalocean.app'
-          const cronSecret = process.env.AGENT_CRON_SECRET ?? ''
-          const r = await fetch(`${baseUrl}/api/deploy-monitor`, {
-            headers: { 'x-cron-secret': cronSecret }
-          })
-          if (!r.ok) return `Deploy monitor returned ${r.status}`
-          const data = await r.json() as {
-            status: string
-            failed: boolean
-            latest: { phase: string; updatedAt: string; cause: string }
-            diagnosis: { errorType: string; details: string; suggestedFix: string } | null
-            buildLog: string | null
-          }
-          if (data.status === 'healthy') {
-            return `✅ Latest deployment is healthy (${data.latest?.phase}). Last updated: ${data.latest?.updatedAt}.`
-          }
-          if (data.status === 'building') {
-            return `🔄 Build in progress (${data.latest?.phase}). Triggered by: ${data.latest?.cause}.`
-          }
-          if (data.failed && data.diagnosis) {
-            return `🚨 BUILD FAILED\nError type: ${data.diagnosis.errorType}\nDetails: ${data.diagnosis.details}\nSuggested fix: ${data.diagnosis.suggestedFix}\n\nLast 500 chars of log:\n${(data.buildLog ?? '').slice(-500)}`
+          if (action === 'list') {
+            const cap = Math.min(Number(memLim), 100)
+            const catFilter = category ? 'AND category = $2' : ''
+            const params = category ? [userId, category, cap] : [userId, cap]
+            const res = await query(
+              `SELECT id, category, hint, quote, content, created_at FROM user_memories WHERE user_id = $1 ${catFilter} ORDER BY created_at DESC LIMIT $${params.length}`,
+              params
+            )
+            const rows = res.rows as Array<{ id: number; category: string; hint: string | null; quote: string | null; content: string; created_at: string }>
+            if (!rows.length) return `No${category ? ` ${category}` : ''} memories found`
+            return rows.map(r =>
+              `[${r.id}:${r.category}] ${r.hint ?? r.content}${r.quote ? `\n  original: "${r.quote.slice(0, 80)}"` : ''}`
+            ).join('\n')
           }
-          return JSON.stringify(data, null, 2).slice(0, 1000)
-        } catch (e) {
-          return `Deployment check error: ${String(e)}`
-        }
-      }
-
-      // ── Composio Direct Execute ──────────────────────────────────────────────
-      case 'composio_execute': {
-        const { slug, args: execArgs } = args as { slug: string; args: Record<string, unknown> }
-        if (!userId) return 'Not authenticated'
-        if (!slug) return 'composio_execute: slug is required'
-        return await executeConnectorTool(slug, execArgs ?? {}, userId)
-      }
 
-      case 'composio_discover': {
-        if (!userId) return 'Not authenticated'
-        const { query: q, app, limit: qLimit = 5 } = args as { query: string; app?: string; limit?: number }
-        if (!q) return 'composio_discover: query is required'
-        try {
-          const tk = app?.toLowerCase().replace(/\s+/g, '_')
-          let url = `https://backend.composio.dev/api/v3/tools?query=${encodeURIComponent(q)}&limit=${qLimit}`
-          if (tk) {
-            // When app is specified, search within that toolkit using combined query+toolkit_slug
-            url = `https://backend.composio.dev/api/v3/tools?query=${encodeURIComponent(q)}&toolkit_slug=${tk}&limit=${qLimit}`
-          }
-          const res = await fetch(url, {
-            headers: { 'x-api-key': process.env.COMPOSIO_API_KEY ?? '' },
-            signal: AbortSignal.timeout(15000),
-          })
-          if (!res.ok) return `composio_discover: API error ${res.status}`
-          const data = await res.json() as { items?: Array<{ slug: string; name: string; description: string; toolkit: { slug: string } }>; total_items?: number }
-          const tools = data.items ?? []
-          if (!tools.length) return `No tools found for "${q}"${tk ? ` in ${app}` : ''}`
-          const lines = tools.map((t: any) => `**${t.slug}** — ${t.name}\n${t.description?.slice(0, 120) ?? ''}`)
-          return `Found ${tools.length} tools for "${q}"${tk ? ` (${app})` : ''}:\n\n${lines.join('\n\n')}`
-        } catch (e) {
-          return `composio_discover error: ${String(e)}`
-        }
+          return `memory_manage: unknown action "${action}" — use save, search, delete, or list`
+        } catch (e) { return `memory_manage error: ${String(e)}` }
       }
 
-      case 'composio_get_tool_schemas': {
+      case 'manage_email': {
         if (!userId) return 'Not authenticated'
-        const { tool_slugs } = args as { tool_slugs: string[] }
-        if (!tool_slugs?.length) return 'composio_get_tool_schemas: tool_slugs array is required'
-        try {
-          const results = await Promise.all(
-            tool_slugs.slice(0, 10).map(async (slug: string) => {
-              const res = await fetch(
-                `https://backend.composio.dev/api/v3/tools/${encodeURIComponent(slug)}`,
-                { headers: { 'x-api-key': process.env.COMPOSIO_API_KEY ?? '' }, signal: AbortSignal.timeout(10000) }
-              )
-              if (!res.ok) return { slug, error: `HTTP ${res.status}` }
-              const data = await res.json() as any
-              return {
-                slug,
-                name: data.name,
-                description: data.description,
-                input_schema: data.input_parameters,
-              }
-            })
-          )
-          return JSON.stringify(results, null, 2)
-        } catch (e) {
-          return `composio_get_tool_schemas error: ${String(e)}`
-        }
-      }
-
-      case 'write_file': {
-        const { path: filePath, content: fileContent, message: commitMessage } = args as {
-          path: string; content: string; message: string
+        const { action: emailAction, message_id: emailMsgId, label_name } = args as {
+          action: 'archive' | 'label' | 'delete' | 'star' | 'unstar' | 'read' | 'unread'
+          message_id: string
+          label_name?: string
         }
+        if (!emailAction || !emailMsgId) return 'manage_email: action and message_id are required'
         try {
-          const GITHUB_TOKEN = process.env.GITHUB_TOKEN ?? process.env.GITHUB_PAT ?? ''
-          if (!GITHUB_TOKEN) return 'GITHUB_TOKEN not configured — cannot write files'
-          const owner = 'Draguniteus'
-          const repo = 'sparkie-studio'
-          // Get current SHA
-          const shaRes = await fetch(
-            `https://api.github.com/repos/${owner}/${repo}/contents/${filePath}`,
-            { headers: { Authorization: `token ${GITHUB_TOKEN}`, Accept: 'application/vnd.github.v3+json' } }
-          )
-          let sha: string | undefined
-          if (shaRes.ok) {
-            const shaData = await shaRes.json() as { sha: string }
-            sha = shaData.sha
-          }
-          // Push file
-          const body: Record<string, string> = {
-            message: commitMessage,
-            content: Buffer.from(fileContent).toString('base64'),
-            branch: 'master',
-          }
-          if (sha) body.sha = sha
-          const pushRes = await fetch(
-            `https://api.github.com/repos/${owner}/${repo}/contents/${filePath}`,
-            {
-              method: 'PUT',
-              headers: { Authorization: `token ${GITHUB_TOKEN}`, Accept: 'application/vnd.github.v3+json', 'Content-Type': 'application/json' },
-              body: JSON.stringify(body),
-            }
-          )
-          if (!pushRes.ok) {
-            const err = await pushRes.text()
-            return `GitHub push failed (${pushRes.status}): ${err.slice(0, 300)}`
-          }
-          const pushData = await pushRes.json() as { commit: { sha: string } }
-          const commitSha = pushData.commit?.sha?.slice(0, 12) ?? '?'
-          return `✅ File written: ${filePath} — commit ${commitSha}. Deploy started automatically.`
-        } catch (e) {
-          return `write_file error: ${String(e)}`
-        }
-      }
-
-      case 'trigger_ide_build': {
-        const { prompt: buildPrompt } = args as { prompt: string }
-        // Send IDE_BUILD SSE event to frontend — client opens IDE panel and calls /api/build
-        return `IDE_BUILD:${buildPrompt}`
-      }
-
-      case 'install_skill': {
-        if (!userId) return 'Not authenticated'
-        const { url: skillUrl, skill_name: skillName, description: skillDesc = '' } = args as {
-          url: string; skill_name: string; description?: string
-        }
-        try {
-          // Fetch the skill documentation
-          const fetchRes = await fetch(skillUrl, {
-            headers: { 'User-Agent': 'Sparkie-Studio/1.0' },
-            signal: AbortSignal.timeout(10000),
-          })
-          if (!fetchRes.ok) return `Could not fetch skill URL: ${fetchRes.status}`
-          const rawContent = await fetchRes.text()
-          // Truncate to 8000 chars (token budget for skill docs)
-          const skillContent = rawContent.slice(0, 8000)
-          // Save to user_memories as a procedure memory
-          await query(
-            `INSERT INTO user_memories (user_id, category, content, created_at)
-             VALUES ($1, $2, $3, NOW())
-             ON CONFLICT DO NOTHING`,
-            [
-              userId,
-              'procedure',
-              `[SKILL: ${skillName}]\n${skillDesc ? 'Purpose: ' + skillDesc + '\n' : ''}Documentation (first 8000 chars):\n${skillContent}`
-            ]
-          )
-          return `✅ Skill installed: "${skillName}"\n${skillDesc ? 'Purpose: ' + skillDesc + '\n' : ''}I've read and saved ${skillContent.length} chars of documentation from ${skillUrl}.\nThis knowledge is now permanently in my memory. I can use this skill in future conversations.`
-        } catch (e) {
-          return `install_skill error: ${String(e)}`
-        }
-      }
-
-      case 'read_skill': {
-        try {
-          const { name: skillName } = args as { name: string }
-          if (!skillName) return 'read_skill: name is required'
-          const result = await fetch(
-            (process.env.NEXTAUTH_URL ?? 'http://localhost:3000') + '/api/skills?name=' + encodeURIComponent(skillName),
-            { headers: { 'x-internal': 'read-skill' }, signal: AbortSignal.timeout(5000) }
-          )
-          if (!result.ok) {
-            if (result.status === 404) return `Skill '${skillName}' not found. Available: email, email-style-matching, email-examples, calendar, calendar-receiving-invitation, calendar-sending-invitation, calendar-conflict-handling, calendar-meeting-title, calendar-examples, browser-use, a2ui-card-gen, cta-card-gen, social, music, video, self-repair, about-sparkie`
-            return `read_skill error: HTTP ${result.status}`
-          }
-          const data = await result.json() as { skill?: { name: string; description: string; content: string } }
-          if (!data.skill) return `read_skill: unexpected response`
-          return `[SKILL: ${data.skill.name}]\n${data.skill.description ? 'Purpose: ' + data.skill.description + '\n' : ''}\n${data.skill.content}`
-        } catch (e) {
-          return `read_skill error: ${String(e)}`
-        }
-      }
-
-      case 'workspace_read': {
-        if (!userId) return 'Not authenticated'
-        const { key } = args as { key: string }
-        if (!key) return 'key required'
-        try {
-          const res = await fetch(`${baseUrl}/api/workspace?key=${encodeURIComponent(key)}`, {
-            headers: { Cookie: cookieHeader },
-          })
-          if (res.status === 404) return `workspace: key "${key}" not found`
-          const data = await res.json() as { value?: string; error?: string }
-          if (data.error) return `workspace_read error: ${data.error}`
-          return data.value ?? ''
-        } catch (e) {
-          return `workspace_read error: ${String(e)}`
-        }
-      }
-
-      case 'read_file': {
-        const { path: rfPath, repo: rfRepo } = args as { path: string; repo?: string }
-        if (!rfPath) return 'path required for read_file'
-        try {
-          if (rfRepo) {
-            // Read from GitHub
-            const ghToken = process.env.GITHUB_TOKEN ?? process.env.GITHUB_PAT ?? ''
-            const ghHeaders: Record<string, string> = { 'Accept': 'application/vnd.github.v3+json', 'User-Agent': 'SparkieStudio/2.0' }
-            if (ghToken) ghHeaders['Authorization'] = `Bearer ${ghToken}`
-            const ghUrl = `https://api.github.com/repos/${rfRepo}/contents/${rfPath.replace(/^\//, '')}`
-            const res = await fetch(ghUrl, { headers: ghHeaders, signal: AbortSignal.timeout(8000) })
-            if (!res.ok) return `read_file: ${res.status} — ${res.statusText} for ${rfRepo}/${rfPath}`
-            const d = await res.json() as { content?: string; encoding?: string }
-            if (!d.content || d.encoding !== 'base64') return `read_file: not a file — ${rfRepo}/${rfPath}`
-            const content = Buffer.from(d.content.replace(/\n/g, ''), 'base64').toString('utf-8')
-            const lines = content.split('\n').length
-            if (lines > 3000) {
-              return `File: ${rfPath} (${lines} lines — too large for full read)\n\nShowing first 200 lines:\n${content.split('\n').slice(0, 200).join('\n')}\n\n→ Use grep_codebase to search specific sections, or read_file with line_start/line_end for ranges.`
-            }
-            return `File: ${rfPath}\n\n${content}`
-          }
-          // Read from workspace via terminal
-          const createRes = await fetch(`${baseUrl}/api/terminal`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-            body: JSON.stringify({ action: 'create' }),
-            signal: AbortSignal.timeout(10000),
-          })
-          if (!createRes.ok) return `read_file: terminal unavailable (${createRes.status})`
-          const { sessionId: rfSessId } = await createRes.json() as { sessionId: string }
-          await new Promise(r => setTimeout(r, 400))
-          const inputRes = await fetch(`${baseUrl}/api/terminal`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-            body: JSON.stringify({ action: 'input', sessionId: rfSessId, data: `cat "${rfPath}" 2>&1\n` }),
-            signal: AbortSignal.timeout(15000),
-          })
-          const rfData = await inputRes.json() as { output?: string }
-          const rawOutput = rfData.output ?? `read_file: no output for ${rfPath}`
-          // Detect oversized output (>3000 lines) and truncate gracefully
-          if (rawOutput.includes('\n') && rawOutput.split('\n').length > 3000) {
-            const lines = rawOutput.split('\n')
-            return `File: ${rfPath} (${lines.length} lines — too large for full read)\n\nShowing first 200 lines:\n${lines.slice(0, 200).join('\n')}\n\n→ Use grep_codebase to search specific sections, or cat with head/tail for specific ranges.`
-          }
-          return rawOutput
-        } catch (e) {
-          return `read_file error: ${String(e)}`
-        }
-      }
-
-      case 'workspace_write': {
-        if (!userId) return 'Not authenticated'
-        const { key, value } = args as { key: string; value: string }
-        if (!key) return 'key required'
-        if (value === undefined || value === null) return 'value required'
-        try {
-          const res = await fetch(`${baseUrl}/api/workspace`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json', Cookie: cookieHeader },
-            body: JSON.stringify({ key, value: String(value) }),
-          })
-          const data = await res.json() as { ok?: boolean; error?: string }
-          if (data.error) return `workspace_write error: ${data.error}`
-          return `✓ saved to workspace["${key}"]`
-        } catch (e) {
-          return `workspace_write error: ${String(e)}`
-        }
-      }
-
-
-      case 'post_to_feed': {
-        if (!userId) return 'Not authenticated'
-        const { content: postContent, media_url: mediaUrl, media_type: mediaType = 'none', mood = '', code_html: codeHtml, code_title: codeTitle, companion_image_url: companionImageUrl } = args as {
-          content: string; media_url?: string; media_type?: string; mood?: string; code_html?: string; code_title?: string; companion_image_url?: string
-        }
-        try {
-          // Ensure columns exist
-          await query(`ALTER TABLE sparkie_feed ADD COLUMN IF NOT EXISTS code_html TEXT`).catch(() => {})
-          await query(`ALTER TABLE sparkie_feed ADD COLUMN IF NOT EXISTS code_title TEXT`).catch(() => {})
-          await query(`ALTER TABLE sparkie_feed ADD COLUMN IF NOT EXISTS companion_image_url TEXT`).catch(() => {})
-
-          // Insert and get the ID directly — no redundant verification fetch needed
-          let result: { rows: Array<{ id: number }> }
-          try {
-            result = await query<{ id: number }>(
-              `INSERT INTO sparkie_feed (content, media_url, media_type, mood, code_html, code_title, companion_image_url, created_at)
-               VALUES ($1, $2, $3, $4, $5, $6, $7, NOW()) RETURNING id`,
-              [postContent, mediaUrl ?? null, mediaType, mood, codeHtml ?? null, codeTitle ?? null, companionImageUrl ?? null]
-            )
-          } catch {
-            // Table might not exist yet — create it and retry
-            await query(`CREATE TABLE IF NOT EXISTS sparkie_feed (
-              id SERIAL PRIMARY KEY,
-              content TEXT NOT NULL,
-              media_url TEXT,
-              media_type TEXT DEFAULT 'none',
-              mood TEXT DEFAULT '',
-              likes INTEGER DEFAULT 0,
-              code_html TEXT,
-              code_title TEXT,
-              companion_image_url TEXT,
-              created_at TIMESTAMPTZ DEFAULT NOW()
-            )`)
-            result = await query<{ id: number }>(
-              `INSERT INTO sparkie_feed (content, media_url, media_type, mood, code_html, code_title, companion_image_url, created_at)
-               VALUES ($1, $2, $3, $4, $5, $6, $7, NOW()) RETURNING id`,
-              [postContent, mediaUrl ?? null, mediaType, mood, codeHtml ?? null, codeTitle ?? null, companionImageUrl ?? null]
-            )
-          }
-          const postId = result.rows[0]?.id ?? 0
-          const preview = codeTitle ? ` with live code preview: "${codeTitle}"` : ''
-          return `✅ Posted to Sparkie's Feed${preview}! Post ID: ${postId}. Content: "${postContent.slice(0, 80)}${postContent.length > 80 ? '...' : ''}" — confirmed live.`
-        } catch (e) {
-          return `post_to_feed error: ${String(e)}`
-        }
-      }
-
-      case 'update_interests': {
-        const { section, content: sectionContent, append = true } = args as {
-          section: string; content: string; append?: boolean
-        }
-        try {
-          const GITHUB_TOKEN = process.env.GITHUB_TOKEN ?? process.env.GITHUB_PAT ?? ''
-          if (!GITHUB_TOKEN) return 'GITHUB_TOKEN not configured'
-          // Read current INTERESTS.md
-          const readRes = await fetch(
-            `https://api.github.com/repos/Draguniteus/sparkie-studio/contents/INTERESTS.md`,
-            { headers: { Authorization: `token \${GITHUB_TOKEN}`, Accept: 'application/vnd.github.v3+json' } }
-          )
-          let currentContent = ''
-          let currentSha: string | undefined
-          if (readRes.ok) {
-            const d = await readRes.json() as { content: string; sha: string }
-            currentContent = Buffer.from(d.content.replace(/\n/g, ''), 'base64').toString('utf-8')
-            currentSha = d.sha
-          }
-          // Find and update/append the section
-          const sectionHeader = `## \${section}`
-          let newContent: string
-          if (currentContent.includes(sectionHeader)) {
-            if (append) {
-              // Append after section header
-              newContent = currentContent.replace(
-                new RegExp(`(\${sectionHeader}[\\s\\S]*?)(?=\n## |$)`),
-                `$1\n- \${sectionContent}`
-              )
-            } else {
-              // Replace section content
-              newContent = currentContent.replace(
-                new RegExp(`(\${sectionHeader})([\\s\\S]*?)(?=\n## |$)`),
-                `$1\n\n\${sectionContent}\n`
-              )
-            }
-          } else {
-            // Add new section
-            newContent = currentContent + `\n\n## \${section}\n\n\${sectionContent}\n`
-          }
-          // Update the timestamp
-          newContent = newContent.replace(/\*Last updated:.*\*/, `*Last updated: \${new Date().toISOString().split('T')[0]}. Next update: tomorrow.*`)
-          // Push
-          const body: Record<string, string> = {
-            message: `journal: Sparkie updates \${section} interests`,
-            content: Buffer.from(newContent).toString('base64'),
-            branch: 'master',
-          }
-          if (currentSha) body.sha = currentSha
-          const pushRes = await fetch(
-            `https://api.github.com/repos/Draguniteus/sparkie-studio/contents/INTERESTS.md`,
-            { method: 'PUT', headers: { Authorization: `token \${GITHUB_TOKEN}`, Accept: 'application/vnd.github.v3+json', 'Content-Type': 'application/json' }, body: JSON.stringify(body) }
-          )
-          if (!pushRes.ok) return `Could not update INTERESTS.md: \${pushRes.status}`
-          const d = await pushRes.json() as { commit: { sha: string } }
-          return `✅ Updated INTERESTS.md — section "\${section}" — commit \${d.commit?.sha?.slice(0, 12)}`
-        } catch (e) {
-          return `update_interests error: \${String(e)}`
-        }
-      }
-
-      case 'learn_from_failure': {
-        if (!userId) return 'Not authenticated'
-        const { what_failed, why_it_failed, what_to_do_instead, severity = 'medium' } = args as {
-          what_failed: string; why_it_failed: string; what_to_do_instead: string; severity?: string
-        }
-        try {
-          const emoji = severity === 'critical' ? '🚨' : severity === 'high' ? '⚠️' : severity === 'medium' ? '📝' : 'ℹ️'
-          const lesson = `[LESSON \${emoji} \${severity.toUpperCase()}]\nFailed: \${what_failed}\nWhy: \${why_it_failed}\nFix: \${what_to_do_instead}\nLearned: \${new Date().toISOString()}`
-          await query(
-            `INSERT INTO user_memories (user_id, category, content, created_at) VALUES ($1, 'procedure', $2, NOW())`,
-            [userId, lesson]
-          )
-          // Also log to worklog
-          await query(
-            `INSERT INTO sparkie_tasks (id, user_id, action, label, status, executor, trigger_type, created_at)
-             VALUES ($1, $2, $3, $4, 'completed', 'ai', 'manual', NOW())`,
-            [`lesson_\${Date.now()}`, userId, lesson, `Learned: \${what_failed.slice(0, 50)}`]
-          ).catch(() => {}) // non-blocking
-          return `🧠 Lesson saved. I won't make this mistake again.\nWhat failed: \${what_failed}\nRoot cause: \${why_it_failed}\nNext time: \${what_to_do_instead}`
-        } catch (e) {
-          return `learn_from_failure error: \${String(e)}`
-        }
-      }
-
-      case 'generate_ace_music': {
-        // Call /api/music internally — same robust pipeline as the UI:
-        // lyrics pre-generation → ACE with retries → MiniMax fallback
-        // Returns SSE { type: 'ace_music', url, title, style, lyrics }
-        const { stylePrompt, lyrics = '', title, duration = 90, language: _language } = args as {
-          stylePrompt: string; lyrics?: string; title?: string; duration?: number; language?: string
-        }
-        try {
-          // Use the /api/music route — handles retries, fallbacks, lyrics generation, asset saving
-          // model: 'ace-step-free' tells it to use ACE with MiniMax fallback
-          const musicFetch = await fetch(`${baseUrl}/api/music`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-              prompt: stylePrompt,
-              model: 'ace-step-free',
-              userLyrics: lyrics || undefined,
-              duration: Math.min(duration, 150),
-            }),
-            signal: AbortSignal.timeout(560_000), // 600s total (route has 600s maxDuration)
-          })
-
-          if (!musicFetch.ok) {
-            return 'Music generation failed: ' + (await musicFetch.text()).slice(0, 200)
-          }
-
-          // Read the SSE stream from /api/music
-          const reader = musicFetch.body!.getReader()
-          const decoder = new TextDecoder()
-          let buffer = ''
-          let audioUrl = ''
-          let songTitle = title || ''
-          let songStyle = stylePrompt.slice(0, 200)
-          let songLyrics = lyrics
-          let errorMsg = ''
-          let done = false
-
-          while (!done) {
-            const { value, done: readDone } = await reader.read()
-            done = readDone
-            if (done) break
-            buffer += decoder.decode(value, { stream: true })
-            const lines = buffer.split('\n')
-            buffer = lines.pop() ?? ''
-            for (const line of lines) {
-              if (!line.startsWith('data:')) continue
-              const json = line.slice(5).trim()
-              if (!json || json === '[DONE]') continue
-              try {
-                const sseData = JSON.parse(json) as Record<string, unknown>
-                if (sseData.error) {
-                  errorMsg = String(sseData.error)
-                  done = true
-                  break
-                }
-                if (!audioUrl && typeof sseData.url === 'string' && sseData.url) {
-                  audioUrl = sseData.url
-                  if (typeof sseData.title === 'string' && sseData.title) songTitle = sseData.title
-                  if (typeof sseData.style === 'string' && sseData.style) songStyle = sseData.style
-                  if (typeof sseData.lyrics === 'string' && sseData.lyrics) songLyrics = sseData.lyrics
-                  done = true // got what we need
-                  break
-                }
-              } catch { /* skip malformed SSE lines */ }
-            }
-          }
-          reader.cancel().catch(() => {})
-
-          if (!audioUrl) {
-            return `Music generation failed: ${errorMsg || 'No audio URL returned'}. Please try again.`
-          }
-
-          if (!songTitle) {
-            songTitle = stylePrompt.slice(0, 50).replace(/\b\w/g, c => c.toUpperCase()).trim() || 'Sparkie Mix'
-          }
-
-          // Return structured data so frontend shows the full music card
-          // Format: 🎵 TITLE | style description | AUDIO_URL:url
-          const safeTitle = songTitle.toLowerCase().replace(/[^a-z0-9 ]/g, '').trim().replace(/\s+/g, '-').slice(0, 50) || 'sparkie-mix'
-          return `🎵 ${songTitle}\n${songStyle}\nAUDIO_URL:${audioUrl}\nSONG_META:${safeTitle}|${songLyrics ? 'has-lyrics' : 'no-lyrics'}`
-
-        } catch (e) {
-          return 'generate_ace_music error: ' + String(e)
-        }
-      }
-
-      case 'workbench_run': {
-        const { code } = args as { code: string }
-        const e2bKey = process.env.E2B_API_KEY
-        if (!e2bKey) return 'workbench_run unavailable — E2B_API_KEY not set'
-        try {
-          const composioKey = process.env.COMPOSIO_API_KEY ?? ''
-          const miniKey = process.env.MINIMAX_API_KEY ?? ''
-          // Inject helper functions so the code can call Composio tools + LLM inline
-          const prelude = `
-import json, os, urllib.request, urllib.error
-
-def run_composio_tool(slug, args={}):
-    """Execute a Composio tool by slug. Returns parsed JSON result."""
-    req = urllib.request.Request(
-        'https://backend.composio.dev/api/v3/tools/execute/' + slug,
-        data=json.dumps({'entity_id': 'sparkie_user_default', 'arguments': args}).encode(),
-        headers={'Content-Type': 'application/json', 'x-api-key': '${composioKey}'},
-        method='POST',
-    )
-    with urllib.request.urlopen(req, timeout=30) as r:
-        return json.loads(r.read())
-
-def invoke_llm(query, model='MiniMax-M2.7'):
-    """Run an inline LLM query. Returns the text response."""
-    try:
-        req = urllib.request.Request(
-            'https://api.minimax.io/v1/chat/completions',
-            data=json.dumps({'model': model, 'stream': False, 'max_tokens': 4000, 'messages': [{'role': 'user', 'content': query}]}).encode(),
-            headers={"Content-Type": "application/json", "Authorization": f"Bearer {miniKey}"},
-            method='POST',
-        )
-        with urllib.request.urlopen(req, timeout=30) as r:
-            d = json.loads(r.read())
-            return d.get('choices', [{}])[0].get('message', {}).get('content', '')
-    except urllib.error.HTTPError as e:
-        body = e.read().decode() if e.fp else str(e)
-        raise RuntimeError(f'HTTP {e.code}: {body[:500]}')
-`
-          const { Sandbox } = await import('@e2b/code-interpreter')
-          const sbx = await Sandbox.create({ apiKey: e2bKey, timeoutMs: 120_000 })
-          try {
-            const exec = await sbx.runCode(prelude + '\n' + code, { timeoutMs: 60_000 })
-            const stdout = exec.logs.stdout.join('\n')
-            const stderr = exec.logs.stderr.join('\n')
-            const error = exec.error ? `\nERROR: ${exec.error.name}: ${exec.error.value}` : ''
-            return (stdout + (stderr ? '\n[stderr]: ' + stderr : '') + error).slice(0, 8000) || 'No output'
-          } finally {
-            await (sbx as unknown as { kill(): Promise<boolean> }).kill().catch(() => {})
-          }
-        } catch (e) {
-          return `workbench_run error: ${String(e)}`
-        }
-      }
-
-      case 'execute_terminal': {
-        const { action, sessionId, data: cmdData } = args as {
-          action: 'create' | 'input'; sessionId?: string; data?: string
-        }
-        try {
-          const termRes = await fetch(`${baseUrl}/api/terminal`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-            body: JSON.stringify({ action, sessionId, data: cmdData }),
-          })
-          if (!termRes.ok) {
-            const errText = await termRes.text()
-            if (termRes.status === 401) return 'Terminal error: unauthorized — check SPARKIE_INTERNAL_SECRET env var'
-            if (termRes.status === 500 && errText.includes('E2B_API_KEY')) return 'Terminal unavailable — E2B_API_KEY not set. Use get_github to read files or query_database for data instead.'
-            return `Terminal error: ${termRes.status} — ${errText}`
-          }
-          const termData = await termRes.json() as { sessionId?: string; output?: string; error?: string }
-          if (termData.error) return `Terminal error: ${termData.error}`
-          if (action === 'create') return JSON.stringify({ sessionId: termData.sessionId, ready: true })
-          // 'input' action: wait for output accumulation then poll logs endpoint
-          await new Promise(r => setTimeout(r, 1500))
-          if (!sessionId) return 'Command sent'
-          const logsRes = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(sessionId)}`, {
-            signal: AbortSignal.timeout(10000),
-          })
-          const { logs } = await logsRes.json() as { logs: string[] }
-          return logs.join('').trim() || 'Command sent'
-        } catch (e) {
-          return `Terminal unavailable: ${String(e)}`
-        }
-      }
-
-      case 'query_database': {
-        const { sql, limit = 20 } = args as { sql: string; limit?: number }
-        if (!sql.trim().toUpperCase().startsWith('SELECT')) {
-          return 'Only SELECT queries are allowed.'
-        }
-        // Auto-correct common column name mistakes before executing
-        let correctedSql = sql
-          .replace(/\bcreate\b(?=\s+(DESC|ASC|LIMIT|$))/gi, 'created_at')
-          .replace(/\bupdate\b(?=\s+(DESC|ASC|LIMIT|$))/gi, 'updated_at')
-        const safeSQL = `${correctedSql.replace(/;\s*$/, '')} LIMIT ${Math.min(Number(limit), 100)}`
-        try {
-          const dbRes = await fetch(`${baseUrl}/api/db/query`, {
-            method: 'POST',
-            headers: {
-              'Content-Type': 'application/json',
-              ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}),
-            },
-            body: JSON.stringify({ sql: safeSQL }),
-          })
-          if (!dbRes.ok) return `DB error: ${dbRes.status} — ${await dbRes.text()}`
-          const dbData = await dbRes.json() as { rows?: unknown[]; error?: string }
-          if (dbData.error) return `Query error: ${dbData.error}`
-          return JSON.stringify(dbData.rows ?? []).slice(0, 4000)
-        } catch (e) {
-          return `Database unavailable: ${String(e)}`
-        }
-      }
-
-      case 'check_health': {
-        const targetUrl = (args.url as string | undefined) ?? 'https://sparkie-studio-mhouq.ondigitalocean.app'
-        try {
-          const start = Date.now()
-          const healthRes = await fetch(targetUrl, { method: 'HEAD', signal: AbortSignal.timeout(8000) })
-          const ms = Date.now() - start
-          return JSON.stringify({ url: targetUrl, status: healthRes.status, ok: healthRes.ok, latencyMs: ms })
-        } catch (e) {
-          return JSON.stringify({ url: targetUrl, reachable: false, error: String(e) })
-        }
-      }
-
-      case 'play_audio': {
-        const { url: audioUrl, title = 'Sparkie Track', artist = 'Sparkie' } = args as {
-          url: string; title?: string; artist?: string
-        }
-        const _f = '\x60\x60\x60'
-        return _f + 'audio\n' + JSON.stringify({ url: audioUrl, title, artist }) + '\n' + _f
-      }
-
-
-      case 'save_self_memory': {
-        const { content: memContent, category: memCat = 'self' } = args as { content: string; category?: string }
-        if (!memContent?.trim()) return 'content required'
-        // Reject low-value session log entries — these are worklogs, not learnings
-        if (/^completed tool session/i.test(memContent.trim())) {
-          return 'Session log rejected — only save what was LEARNED, not what was done. E.g.: "MiniMax M2.7 requires temperature=1.0 for best code output" instead of "Completed tool session: grep_codebase"'
-        }
-        if (memContent.includes('${')) return 'Cannot save template literals as memory'
-        try {
-          const baseUrl = process.env.NEXTAUTH_URL || 'http://localhost:3000'
-          const res = await fetch(`${baseUrl}/api/sparkie-self-memory`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json', 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET ?? '' },
-            body: JSON.stringify({ category: memCat, content: memContent, source: 'sparkie' })
-          })
-          const data = await res.json() as { ok?: boolean; error?: string }
-          if (!data.ok) return `Memory save failed: ${data.error ?? 'unknown'}`
-          return `✅ Memory saved [${memCat}]: "${memContent.slice(0, 80)}${memContent.length > 80 ? '...' : ''}"`
-        } catch (e) {
-          return `Memory save error: ${String(e)}`
-        }
-      }
-
-      case 'get_recent_assets': {
-        const { asset_type = 'all', limit = 5 } = args as { asset_type?: string; limit?: number }
-        if (!userId) return 'Not authenticated'
-        try {
-          const typeFilter = asset_type !== 'all' ? `AND asset_type = '${asset_type}'` : ''
-          const result = await query(
-            `SELECT name, content, asset_type, created_at FROM sparkie_assets WHERE user_id = $1 ${typeFilter} ORDER BY created_at DESC LIMIT $2`,
-            [userId, Math.min(limit, 20)]
-          )
-          if (!result.rows || result.rows.length === 0) return 'No recent assets found.'
-          const list = (result.rows as Array<{ name: string; content: string; asset_type: string; created_at: string }>)
-            .map(r => `• [${r.asset_type}] ${r.name} — ${r.content.slice(0, 80)} (${new Date(r.created_at).toLocaleDateString()})`)
-            .join('\n')
-          return `Recent assets:\n${list}`
-        } catch (e) {
-          return `get_recent_assets error: ${String(e)}`
-        }
-      }
-
-      case 'read_email': {
-        if (!userId) return 'Not authenticated'
-        const emailArgs: Record<string, unknown> = { max_results: 5, ...(args as Record<string, unknown>) }
-        // Default to primary inbox — exclude promotions/updates/social unless user specifies otherwise
-        if (!emailArgs['query']) emailArgs['query'] = 'label:inbox -category:promotions -category:updates -category:social'
-        return await executeConnectorTool('GMAIL_FETCH_EMAILS', emailArgs, userId)
-      }
-
-      case 'get_calendar': {
-        if (!userId) return 'Not authenticated'
-        // GOOGLECALENDAR_LIST_EVENTS doesn't exist — use GOOGLECALENDAR_EVENTS_LIST (confirmed working)
-        return await executeConnectorTool('GOOGLECALENDAR_EVENTS_LIST', args, userId)
-      }
-
-      case 'search_youtube': {
-        if (!userId) return 'Not authenticated'
-        // YOUTUBE_LIST_VIDEO doesn't exist — use YOUTUBE_SEARCH (confirmed working)
-        return await executeConnectorTool('YOUTUBE_SEARCH', args, userId)
-      }
-
-      case 'send_discord': {
-        if (!userId) return 'Not authenticated'
-        const { channel_id, message: discordMsg } = args as { channel_id?: string; message: string }
-        // Note: Discord SEND_MESSAGE tool is not in the current Composio toolkit (only read-only tools available)
-        // Reconnect Discord in Composio to enable send functionality
-        const taskId = `hitl_discord_${Date.now()}_${Math.random().toString(36).slice(2, 6)}`
-        await query(
-          `INSERT INTO sparkie_tasks (id, user_id, action, label, payload, status, executor, trigger_type, why_human, created_at)
-           VALUES ($1, $2, $3, $4, $5, 'pending', 'human', 'manual', $6, NOW())`,
-          [taskId, userId,
-           `executeConnectorTool('DISCORD_SEND_MESSAGE', ${JSON.stringify(args)})`,
-           `Discord message: "${discordMsg.slice(0, 60)}${discordMsg.length > 60 ? '...' : ''}"`,
-           JSON.stringify(args),
-           'WARNING: Discord send_message tool may not be active in Composio — reconnect Discord in app.composio.dev if this fails']
-        ).catch(() => {})
-        return `HITL_TASK:${JSON.stringify({
-          id: taskId, action: 'DISCORD_SEND_MESSAGE', label: 'Send Discord message',
-          payload: { channel_id, message: discordMsg, preview: discordMsg.slice(0, 120) }, status: 'pending'
-        })}`
-      }
-
-      case 'repo_ingest': {
-        const { owner: riOwner = 'Draguniteus', repo: riRepo = 'sparkie-studio' } = args as {
-          owner?: string; repo?: string
-        }
-        try {
-          const ctx = await ingestRepo(userId ?? 'system', riOwner, riRepo)
-          const fileCount = Object.keys(ctx.keyFiles).length
-          return `✅ Repo ingested: ${ctx.repo}\nStack: ${ctx.techStack.slice(0, 5).join(', ')}\nKey files mapped: ${fileCount}\n${ctx.summary}\n\nProject context is now active — I have structural awareness of the codebase.`
-        } catch (e) {
-          return `repo_ingest error: ${String(e)}`
-        }
-      }
-
-      case 'patch_file': {
-        const { path: patchPath, search: searchStr, replace: replaceStr, full_content: fullContent, message: patchMsg, dry_run: dryRun = false } = args as {
-          path: string; search?: string; replace?: string; full_content?: string; message: string; dry_run?: boolean
-        }
-        try {
-          const GITHUB_TOKEN = process.env.GITHUB_TOKEN ?? process.env.GITHUB_PAT ?? ''
-          if (!GITHUB_TOKEN) return 'GITHUB_TOKEN not configured'
-          const owner = 'Draguniteus'
-          const repo = 'sparkie-studio'
-
-          // Fetch current file
-          const fetchRes = await fetch(
-            `https://api.github.com/repos/${owner}/${repo}/contents/${patchPath}`,
-            { headers: { Authorization: `token ${GITHUB_TOKEN}`, Accept: 'application/vnd.github.v3+json' }, signal: AbortSignal.timeout(8000) }
-          )
-          if (!fetchRes.ok) return `patch_file: could not read ${patchPath} (${fetchRes.status})`
-          const fetchData = await fetchRes.json() as { content: string; sha: string; encoding: string }
-          const currentContent = Buffer.from(fetchData.content.replace(/\n/g, ''), 'base64').toString('utf-8')
-          const currentSha = fetchData.sha
-
-          // Apply patch
-          let newContent: string
-          if (fullContent) {
-            newContent = fullContent
-          } else if (searchStr !== undefined && replaceStr !== undefined) {
-            if (!currentContent.includes(searchStr)) {
-              return `patch_file: search string not found in ${patchPath}. Cannot apply patch.\nSearch string (${searchStr.length} chars): ${searchStr.slice(0, 100)}...`
-            }
-            newContent = currentContent.replace(searchStr, replaceStr)
-          } else {
-            return 'patch_file: provide either search+replace or full_content'
-          }
-
-          if (dryRun) {
-            const linesChanged = newContent.split('\n').length - currentContent.split('\n').length
-            return `[DRY RUN] patch_file: ${patchPath}\nLines: ${currentContent.split('\n').length} → ${newContent.split('\n').length} (${linesChanged > 0 ? '+' : ''}${linesChanged})\n\nPatched preview (first 600 chars):\n${newContent.slice(0, 600)}`
-          }
-
-          // Commit
-          const pushRes = await fetch(
-            `https://api.github.com/repos/${owner}/${repo}/contents/${patchPath}`,
-            {
-              method: 'PUT',
-              headers: { Authorization: `token ${GITHUB_TOKEN}`, Accept: 'application/vnd.github.v3+json', 'Content-Type': 'application/json' },
-              body: JSON.stringify({
-                message: patchMsg,
-                content: Buffer.from(newContent).toString('base64'),
-                sha: currentSha,
-                branch: 'master',
-              }),
-            }
-          )
-          if (!pushRes.ok) {
-            const errText = await pushRes.text()
-            return `patch_file push failed (${pushRes.status}): ${errText.slice(0, 300)}`
-          }
-          const pushData = await pushRes.json() as { commit: { sha: string } }
-          const commitSha = pushData.commit?.sha?.slice(0, 12) ?? '?'
-
-          // If this was a TS fix, auto-resolve from known issues
-          if (userId && (patchMsg.includes('fix') || patchMsg.includes('TS'))) {
-            resolveKnownIssue('Draguniteus/sparkie-studio', patchPath).catch(() => {})
-          }
-
-          writeWorklog(userId ?? 'system', 'code_push', `patch_file: ${patchPath} — ${patchMsg}`, { commit: commitSha, path: patchPath, conclusion: `File patched and committed: ${patchPath} (commit ${commitSha})` }).catch(() => {})
-          return `✅ Patched and committed: ${patchPath}\nCommit: ${commitSha}\nMessage: ${patchMsg}\nDeploy started automatically.`
-        } catch (e) {
-          return `patch_file error: ${String(e)}`
-        }
-      }
-
-      case 'write_database': {
-        if (!userId) return 'Not authenticated'
-        const { sql: writeSql, params: writeParams } = args as { sql: string; params?: unknown[] }
-        if (!writeSql) return 'write_database: sql is required'
-        const upperSql = writeSql.trim().toUpperCase()
-        if (upperSql.startsWith('SELECT')) return 'write_database: use query_database for SELECT queries'
-        // Block DELETEs on sparkie_worklog — prevents Sparkie from erasing her own error history
-        if (upperSql.includes('DELETE') && upperSql.includes('SPARKIE_WORKLOG')) {
-          return 'write_database: DELETE on sparkie_worklog is not allowed — error history must be preserved for debugging'
-        }
-        try {
-          const writeResult = await query(writeSql, writeParams ?? [])
-          const rowCount = writeResult.rowCount ?? 0
-          return `✅ write_database: ${rowCount} row(s) affected`
-        } catch (e) {
-          return `write_database error: ${String(e)}`
-        }
-      }
-
-      case 'update_task': {
-        if (!userId) return 'Not authenticated'
-        const { task_id: updateTaskId, status: newStatus, result: taskResult } = args as {
-          task_id: string; status: string; result?: string
-        }
-        if (!updateTaskId || !newStatus) return 'update_task: task_id and status are required'
-        try {
-          const existing = await query('SELECT id FROM sparkie_tasks WHERE id = $1 AND user_id = $2', [updateTaskId, userId])
-          if (existing.rows.length === 0) return `update_task: task ${updateTaskId} not found`
-          await query(
-            `UPDATE sparkie_tasks SET status = $1, resolved_at = CASE WHEN $1 IN ('completed','failed','skipped') THEN NOW() ELSE resolved_at END WHERE id = $2 AND user_id = $3`,
-            [newStatus, updateTaskId, userId]
-          )
-          if (taskResult) {
-            await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS result TEXT`).catch(() => {})
-            await query(`UPDATE sparkie_tasks SET result = $1 WHERE id = $2`, [taskResult, updateTaskId]).catch(() => {})
-          }
-          return `✅ update_task: ${updateTaskId} → ${newStatus}${taskResult ? ' | ' + taskResult : ''}`
-        } catch (e) {
-          return `update_task error: ${String(e)}`
-        }
-      }
-
-      case 'delete_task': {
-        if (!userId) return 'Not authenticated'
-        const { task_id: delTaskId } = args as { task_id: string }
-        if (!delTaskId) return 'delete_task: task_id is required'
-        try {
-          const existing = await query('SELECT id, label FROM sparkie_tasks WHERE id = $1 AND user_id = $2', [delTaskId, userId])
-          if (existing.rows.length === 0) return `delete_task: task ${delTaskId} not found`
-          const taskLabel = (existing.rows[0] as { label: string }).label
-          await query('DELETE FROM sparkie_tasks WHERE id = $1 AND user_id = $2', [delTaskId, userId])
-          return `✅ delete_task: deleted "${taskLabel}" (${delTaskId})`
-        } catch (e) {
-          return `delete_task error: ${String(e)}`
-        }
-      }
-
-      case 'update_worklog': {
-        if (!userId) return 'Not authenticated'
-        const { type: wlType, message: wlMessage, conclusion: wlConclusion, metadata: wlMeta } = args as {
-          type: string; message: string; conclusion?: string; metadata?: Record<string, unknown>
-        }
-        if (!wlType || !wlMessage) return 'update_worklog: type and message are required'
-        try {
-          await writeWorklog(userId, wlType, wlMessage, {
-            ...wlMeta ?? {},
-            conclusion: wlConclusion ?? wlMessage.slice(0, 120),
-          })
-          return `✅ Worklog entry saved: [${wlType}] ${wlMessage.slice(0, 80)}${wlMessage.length > 80 ? '...' : ''}`
-        } catch (e) {
-          return `update_worklog error: ${String(e)}`
-        }
-      }
-
-      // ── Social Draft (HITL) ───────────────────────────────────────────────────
-      case 'create_social_draft': {
-        if (!userId) return 'Not authenticated'
-        const { platform, content, media_url } = args as {
-          platform: string; content: string; media_url?: string
-        }
-        if (!platform || !content) return 'create_social_draft: platform and content are required'
-        const validPlatforms = ['twitter', 'linkedin', 'reddit', 'instagram', 'tiktok']
-        if (!validPlatforms.includes(platform)) return `create_social_draft: platform must be one of ${validPlatforms.join(', ')}`
-        try {
-          const taskId = `social_draft_${Date.now()}_${Math.random().toString(36).slice(2, 6)}`
-          const preview = content.slice(0, 120)
-          // Create a pending HITL task for human approval
-          await query(
-            `INSERT INTO sparkie_tasks (id, user_id, label, executor, action, payload, status, trigger_type, why_human, created_at)
-             VALUES ($1, $2, $3, 'human', 'create_social_draft', $4, 'pending', 'manual', $5, NOW())`,
-            [
-              taskId, userId,
-              `Post to ${platform}: "${preview}${content.length > 120 ? '...' : ''}"`,
-              JSON.stringify({ platform, content, media_url }),
-              `Social draft for ${platform} — requires your approval before publishing`,
-            ]
-          )
-          // Send approval card to user
-          const cardResult = `SPARKIE_CARD:${JSON.stringify({
-            card: {
-              type: 'approval',
-              title: `Post to ${platform.charAt(0).toUpperCase() + platform.slice(1)}?`,
-              subtitle: 'Review and approve this post before publishing',
-              body: content,
-              actions: [
-                { id: `approve_${taskId}`, label: 'Publish Now', variant: 'primary' },
-                { id: `edit_${taskId}`, label: 'Edit Draft', variant: 'secondary' },
-                { id: `cancel_${taskId}`, label: 'Discard', variant: 'danger' },
-              ],
-              metadata: { taskId, platform, type: 'social_draft' },
-            },
-            text: `I've drafted a ${platform} post for your review. Click "Publish Now" to send it live, or "Edit Draft" to make changes first.`,
-          })}`
-          return cardResult
-        } catch (e) {
-          return `create_social_draft error: ${String(e)}`
-        }
-      }
-
-      // ── Worklog Readback ─────────────────────────────────────────────────────
-      case 'log_worklog': {
-        if (!userId) return 'Not authenticated'
-        const { type: wlFilter, limit: wlLimit = 50 } = args as { type?: string; limit?: number }
-        try {
-          const typeFilter = wlFilter && wlFilter !== 'all' ? `AND type = $2` : ''
-          const params = wlFilter && wlFilter !== 'all' ? [userId, wlFilter, wlLimit] : [userId, wlLimit]
-          const res = await query(
-            `SELECT id, type, content, status, decision_type, reasoning, conclusion, metadata, created_at
-             FROM sparkie_worklog WHERE user_id = $1 ${typeFilter}
-             ORDER BY created_at DESC LIMIT $${wlFilter && wlFilter !== 'all' ? '$3' : '$2'}`,
-            params
-          ).catch(() => ({ rows: [] as any[] }))
-          if (!res.rows.length) return `No worklog entries found${wlFilter && wlFilter !== 'all' ? ` for type "${wlFilter}"` : ''}.`
-          const lines = res.rows.slice(0, wlLimit).map((e: any) => {
-            const ts = e.created_at ? new Date(e.created_at).toLocaleString() : 'unknown'
-            const meta = e.metadata ?? {}
-            const icon = meta.icon ? `[${meta.icon}] ` : ''
-            const tag = meta.tag ? `[${meta.tag}] ` : ''
-            const result = e.conclusion ? ` → ${e.conclusion}` : ''
-            const reasoning = e.reasoning ? ` (${e.reasoning})` : ''
-            return `[${ts}] ${icon}${tag}[${e.type}] ${e.content}${reasoning}${result}`
-          })
-          return `Worklog (${res.rows.length} entries${wlFilter && wlFilter !== 'all' ? `, type="${wlFilter}"` : ''}):\n\n${lines.join('\n')}`
-        } catch (e) {
-          return `log_worklog error: ${String(e)}`
-        }
-      }
-
-      // ── Attempt History ──────────────────────────────────────────────────────
-      case 'get_attempt_history': {
-        if (!userId) return 'Not authenticated'
-        const { domain, limit: ahLimit = 5 } = args as { domain: string; limit?: number }
-        if (!domain) return 'get_attempt_history: domain is required (e.g. "minimax_video", "ace_music", "github_push")'
-        try {
-          const attempts = await getAttempts(userId, domain, ahLimit)
-          if (attempts.length === 0) {
-            return `No attempt history for "${domain}" yet. First attempt — no lessons learned yet.`
-          }
-          const block = formatAttemptBlock(attempts)
-          return `Attempt history for "${domain}" (${attempts.length} entries):${block}`
-        } catch (e) {
-          return `get_attempt_history error: ${String(e)}`
-        }
-      }
-
-      case 'save_attempt': {
-        if (!userId) return 'Not authenticated'
-        const { domain, attempt_type, summary, outcome, lesson, ttl_days } = args as {
-          domain: string; attempt_type: string; summary: string; outcome: string; lesson: string; ttl_days?: number
-        }
-        if (!domain || !attempt_type || !summary || !outcome || !lesson) {
-          return 'save_attempt: domain, attempt_type, summary, outcome, and lesson are required'
-        }
-        const validTypes = ['success', 'failure', 'workaround', 'pattern']
-        if (!validTypes.includes(attempt_type)) return `save_attempt: attempt_type must be one of ${validTypes.join(', ')}`
-        try {
-          await saveAttempt(userId, domain, attempt_type as 'success' | 'failure' | 'workaround' | 'pattern', summary, outcome, lesson, ttl_days)
-          return `✅ Attempt recorded for "${domain}": [${attempt_type.toUpperCase()}] ${summary}`
-        } catch (e) {
-          return `save_attempt error: ${String(e)}`
-        }
-      }
-
-      // ── CIP Engine Tool Cases (L2-L7) ─────────────────────────────────────────
-      case 'create_behavior_rule': {
-        if (!userId) return 'Not authenticated'
-        const { condition, action, reasoning } = args as { condition: string; action: string; reasoning: string }
-        if (!condition || !action || !reasoning) return 'create_behavior_rule: condition, action, and reasoning are required'
-        try {
-          const ruleId = await createBehaviorRule(condition, action, reasoning)
-          await writeWorklog(userId, 'decision', `🧠 New behavior rule: IF ${condition} → ${action}`, {
-            status: 'done', decision_type: 'proactive', signal_priority: 'P2',
-            conclusion: `Behavior rule created — condition: "${condition.slice(0, 60)}"`,
-          }).catch(() => {})
-          return `✅ Behavior rule created (ID: ${ruleId.slice(0, 8)})\nIF: ${condition}\nTHEN: ${action}\nReason: ${reasoning}`
-        } catch (e) { return `create_behavior_rule error: ${String(e)}` }
-      }
-
-      case 'list_behavior_rules': {
-        const { active_only = true } = args as { active_only?: boolean }
-        try {
-          const rules = await listBehaviorRules(active_only)
-          if (rules.length === 0) return 'No behavior rules found. Create your first rule with create_behavior_rule.'
-          const lines = rules.map(r =>
-            `[${r.id.slice(0, 8)}] (${Math.round(r.confidence * 100)}% conf, ${r.timesApplied}x applied)\n  IF: ${r.condition}\n  THEN: ${r.action}`
-          )
-          return `Your behavior rules (${rules.length}):\n\n${lines.join('\n\n')}`
-        } catch (e) { return `list_behavior_rules error: ${String(e)}` }
-      }
-
-      case 'update_behavior_rule': {
-        const { id: ruleId, action: ruleAction, reasoning: ruleReasoning, confidence: ruleConf, active: ruleActive } = args as {
-          id: string; action?: string; reasoning?: string; confidence?: number; active?: boolean
-        }
-        if (!ruleId) return 'update_behavior_rule: id is required'
-        try {
-          await updateBehaviorRule(ruleId, { action: ruleAction, reasoning: ruleReasoning, confidence: ruleConf, active: ruleActive })
-          return `✅ Behavior rule ${ruleId.slice(0, 8)} updated`
-        } catch (e) { return `update_behavior_rule error: ${String(e)}` }
-      }
-
-      case 'create_goal': {
-        if (!userId) return 'Not authenticated'
-        const { title: gTitle, description: gDesc, type: gType, priority: gPriority, success_criteria, check_every_n_sessions = 1 } = args as {
-          title: string; description: string; type: string; priority: string; success_criteria: string; check_every_n_sessions?: number
-        }
-        if (!gTitle || !gType || !gPriority || !success_criteria) return 'create_goal: title, type, priority, success_criteria are required'
-        try {
-          const goalId = await createGoal(gTitle, gDesc ?? '', gType as 'fix' | 'build' | 'monitor' | 'learn' | 'relationship', gPriority as 'P0' | 'P1' | 'P2' | 'P3', success_criteria, check_every_n_sessions)
-          await writeWorklog(userId, 'decision', `🎯 New goal [${gPriority}]: ${gTitle}`, {
-            status: 'done', decision_type: 'proactive', signal_priority: gPriority as 'P0' | 'P1' | 'P2' | 'P3',
-            conclusion: `Goal created: "${gTitle}" — success criteria: "${success_criteria.slice(0, 80)}"`,
-          }).catch(() => {})
-          return `✅ Goal created (ID: ${goalId.slice(0, 8)})\n[${gPriority}] ${gTitle}\nSuccess when: ${success_criteria}\nI will check this every ${check_every_n_sessions} session(s).`
-        } catch (e) { return `create_goal error: ${String(e)}` }
-      }
-
-      case 'check_goal_progress': {
-        const { goal_id, progress_update } = args as { goal_id: string; progress_update: string }
-        if (!goal_id || !progress_update) return 'check_goal_progress: goal_id and progress_update are required'
-        try {
-          await updateGoalProgress(goal_id, progress_update)
-          return `✅ Goal ${goal_id.slice(0, 8)} progress updated: ${progress_update}`
-        } catch (e) { return `check_goal_progress error: ${String(e)}` }
-      }
-
-      case 'list_goals': {
-        const { status: goalStatus } = args as { status?: string }
-        try {
-          const goals = await listGoals(goalStatus as 'active' | 'blocked' | 'completed' | 'abandoned' | undefined)
-          if (goals.length === 0) return 'No goals found. Create your first goal with create_goal.'
-          const lines = goals.map(g =>
-            `[${g.id.slice(0, 8)}] [${g.priority}] ${g.title} (${g.status})\n  Progress: ${g.progress || 'Not started'}\n  ${g.sessionsWithoutProgress > 0 ? `⚠️ ${g.sessionsWithoutProgress} sessions without progress` : 'Recently updated'}`
-          )
-          return `Goals (${goals.length}):\n\n${lines.join('\n\n')}`
-        } catch (e) { return `list_goals error: ${String(e)}` }
-      }
-
-      case 'complete_goal': {
-        if (!userId) return 'Not authenticated'
-        const { goal_id: completeGoalId, outcome } = args as { goal_id: string; outcome: string }
-        if (!completeGoalId || !outcome) return 'complete_goal: goal_id and outcome are required'
-        try {
-          await completeGoal(completeGoalId, outcome)
-          await writeWorklog(userId, 'task_executed', `🎯 Goal achieved: ${outcome.slice(0, 100)}`, {
-            status: 'done', decision_type: 'action', signal_priority: 'P2',
-            conclusion: `Goal ${completeGoalId.slice(0, 8)} completed: ${outcome.slice(0, 80)}`,
-          }).catch(() => {})
-          return `🎉 Goal ${completeGoalId.slice(0, 8)} marked COMPLETE!\nOutcome: ${outcome}`
-        } catch (e) { return `complete_goal error: ${String(e)}` }
-      }
-
-      case 'add_causal_link': {
-        const { cause, effect, confidence: causalConf } = args as { cause: string; effect: string; confidence: number }
-        if (!cause || !effect || causalConf === undefined) return 'add_causal_link: cause, effect, confidence are required'
-        try {
-          await addCausalLink(cause, effect, causalConf)
-          return `✅ Causal link added: ${cause} → ${effect} (confidence: ${Math.round(causalConf * 100)}%)`
-        } catch (e) { return `add_causal_link error: ${String(e)}` }
-      }
-
-      case 'query_causal_graph': {
-        const { event: causalEvent } = args as { event: string }
-        if (!causalEvent) return 'query_causal_graph: event is required'
-        try {
-          const causes = await queryCausalGraph(causalEvent)
-          if (causes.length === 0) return `No known causes for "${causalEvent}" in the causal model yet. Observe patterns and use add_causal_link when you see connections.`
-          const lines = causes.map(c => `• ${c.causeEvent} (${Math.round(c.confidence * 100)}% confidence, ${c.occurrenceCount}x observed)`)
-          return `Known causes of "${causalEvent}":\n${lines.join('\n')}\n\nFix the most likely cause first, not just the symptom.`
-        } catch (e) { return `query_causal_graph error: ${String(e)}` }
-      }
-
-      case 'get_self_reflections': {
-        const { days: reflDays = 7 } = args as { days?: number }
-        try {
-          const reflections = await getRecentReflections(reflDays)
-          if (reflections.length === 0) return 'No self-reflections yet. The first one runs automatically at 1am UTC, or you can trigger it now with run_self_reflection.'
-          return reflections.map(r =>
-            `## ${r.reflectionDate}\n✅ What worked: ${r.whatWorked.slice(0, 2).join(', ')}\n❌ What failed: ${r.whatFailed.slice(0, 2).join(', ')}\n📈 Growth: ${r.growthObserved}\n🌅 Tomorrow: ${r.tomorrowIntention}`
-          ).join('\n\n---\n\n')
-        } catch (e) { return `get_self_reflections error: ${String(e)}` }
-      }
-
-      case 'get_user_emotional_state': {
-        // Fetch latest user message from DB for emotional state analysis
-        const recentMsg = await query<{ content: string }>(
-          `SELECT content FROM chat_messages WHERE user_id = $1 AND role = 'user' ORDER BY created_at DESC LIMIT 1`,
-          [userId ?? '']
-        ).catch(() => ({ rows: [] }))
-        const latestMsg = recentMsg.rows[0]?.content ?? ''
-        if (!latestMsg || !userId) return 'No recent user message found — send a message first'
-        const state = detectEmotionalState(latestMsg, new Date().getHours())
-        return `Michael's current state:\n• Energy: ${state.energy}\n• Focus: ${state.focus}\n• Mood: ${state.mood}\n• Urgency: ${state.urgency}\n\nCalibrate your response accordingly.`
-      }
-
-      case 'run_self_reflection': {
-        if (!userId) return 'Not authenticated'
-        try {
-          const reflection = await runSelfReflection(userId)
-          if (!reflection) return 'A reflection for today already exists. Use get_self_reflections to read it.'
-          return `✅ Self-reflection complete for ${reflection.reflectionDate}:\n\nWhat worked: ${reflection.whatWorked.slice(0, 2).join('; ')}\nWhat failed: ${reflection.whatFailed.slice(0, 2).join('; ')}\nGrowth: ${reflection.growthObserved}\nTomorrow's intention: ${reflection.tomorrowIntention}`
-        } catch (e) { return `run_self_reflection error: ${String(e)}` }
-      }
-
-      case 'read_memory': {
-        if (!userId) return 'Not authenticated'
-        const { query: memQuery, category: memCategory, limit: memLimit = 10 } = args as {
-          query?: string; category?: string; limit?: number
-        }
-        try {
-          let userMemSql: string
-          let userParams: unknown[]
-          if (memQuery && memCategory) {
-            userMemSql = `SELECT 'user' AS source, category, hint, quote, content, created_at FROM user_memories WHERE user_id = $1 AND content ILIKE $2 AND category = $3 ORDER BY created_at DESC LIMIT $4`
-            userParams = [userId, `%${memQuery}%`, memCategory, memLimit]
-          } else if (memQuery) {
-            userMemSql = `SELECT 'user' AS source, category, hint, quote, content, created_at FROM user_memories WHERE user_id = $1 AND content ILIKE $2 ORDER BY created_at DESC LIMIT $3`
-            userParams = [userId, `%${memQuery}%`, memLimit]
-          } else if (memCategory) {
-            userMemSql = `SELECT 'user' AS source, category, hint, quote, content, created_at FROM user_memories WHERE user_id = $1 AND category = $2 ORDER BY created_at DESC LIMIT $3`
-            userParams = [userId, memCategory, memLimit]
-          } else {
-            userMemSql = `SELECT 'user' AS source, category, hint, quote, content, created_at FROM user_memories WHERE user_id = $1 ORDER BY created_at DESC LIMIT $2`
-            userParams = [userId, memLimit]
-          }
-          const userMems = await query(userMemSql, userParams)
-          // sparkie_self_memory uses 'source' column (not user_id) — global table, not per-user
-          let selfMemSql: string
-          let selfParams: unknown[]
-          if (memQuery) {
-            selfMemSql = `SELECT 'self' AS source, category, content, created_at FROM sparkie_self_memory WHERE content ILIKE $1 ORDER BY created_at DESC LIMIT $2`
-            selfParams = [`%${memQuery}%`, memLimit]
-          } else {
-            selfMemSql = `SELECT 'self' AS source, category, content, created_at FROM sparkie_self_memory ORDER BY created_at DESC LIMIT $1`
-            selfParams = [memLimit]
-          }
-          const selfMems = await query(selfMemSql, selfParams)
-          const allRows = [...userMems.rows, ...selfMems.rows] as Array<{ source: string; category: string; content: string; hint?: string | null; quote?: string | null }>
-          if (allRows.length === 0) return `read_memory: no memories found${memQuery ? ' matching "' + memQuery + '"' : ''}`
-          return allRows.map(r => {
-            const text = r.hint ?? r.content
-            const src = r.quote ? ` (original: "${String(r.quote).slice(0, 60)}")` : ''
-            return `[${r.source}:${r.category}] ${text}${src}`
-          }).join('\n')
-        } catch (e) {
-          return `read_memory error: ${String(e)}`
-        }
-      }
-
-      case 'delete_file': {
-        if (!userId) return 'Not authenticated'
-        const { path: delPath, message: delMsg } = args as { path: string; message: string }
-        if (!delPath || !delMsg) return 'delete_file: path and message are required'
-        try {
-          const GITHUB_TOKEN = process.env.GITHUB_TOKEN ?? process.env.GITHUB_PAT ?? ''
-          if (!GITHUB_TOKEN) return 'GITHUB_TOKEN not configured'
-          const owner = 'Draguniteus'
-          const repo = 'sparkie-studio'
-          const fetchRes = await fetch(
-            `https://api.github.com/repos/${owner}/${repo}/contents/${delPath}`,
-            { headers: { Authorization: `token ${GITHUB_TOKEN}`, Accept: 'application/vnd.github.v3+json' }, signal: AbortSignal.timeout(8000) }
-          )
-          if (!fetchRes.ok) return `delete_file: could not find ${delPath} (${fetchRes.status})`
-          const fetchData = await fetchRes.json() as { sha: string }
-          const deleteRes = await fetch(
-            `https://api.github.com/repos/${owner}/${repo}/contents/${delPath}`,
-            {
-              method: 'DELETE',
-              headers: { Authorization: `token ${GITHUB_TOKEN}`, Accept: 'application/vnd.github.v3+json', 'Content-Type': 'application/json' },
-              body: JSON.stringify({ message: delMsg, sha: fetchData.sha }),
-              signal: AbortSignal.timeout(10000),
-            }
-          )
-          if (!deleteRes.ok) {
-            const errText = await deleteRes.text()
-            return `delete_file failed (${deleteRes.status}): ${errText.slice(0, 200)}`
-          }
-          const deleteData = await deleteRes.json() as { commit?: { sha?: string } }
-          const commitSha = deleteData.commit?.sha?.slice(0, 12) ?? '?'
-          writeWorklog(userId ?? 'system', 'code_push', `delete_file: ${delPath} — ${delMsg}`, { commit: commitSha, path: delPath, conclusion: `File deleted and committed: ${delPath} (commit ${commitSha})` }).catch(() => {})
-          return `✅ Deleted: ${delPath}\nCommit: ${commitSha}\nMessage: ${delMsg}`
-        } catch (e) {
-          return `delete_file error: ${String(e)}`
-        }
-      }
-
-      // ── Block 4: Missing tools — manage_email, delete_memory, manage_calendar_event, send_card_to_user ──
-
-      case 'delete_memory': {
-        if (!userId) return 'Not authenticated'
-        const { memory_id: memId, source: memSource = 'self' } = args as { memory_id: number; source?: string }
-        if (!memId) return 'delete_memory: memory_id is required'
-        try {
-          if (memSource === 'user') {
-            await query('DELETE FROM user_memories WHERE id = $1 AND user_id = $2', [memId, userId])
-          } else {
-            await query('DELETE FROM sparkie_self_memory WHERE id = $1', [memId])
-          }
-          return `✅ delete_memory: entry ${memId} removed from ${memSource} memories`
-        } catch (e) { return `delete_memory error: ${String(e)}` }
-      }
-
-      case 'memory_manage': {
-        if (!userId) return 'Not authenticated'
-        const { action, category, hint, quote, content, query: memQuery, memory_id, limit: memLim = 20 } = args as {
-          action: string; category?: string; hint?: string; quote?: string; content?: string
-          query?: string; memory_id?: number; limit?: number
-        }
-        try {
-          if (action === 'save') {
-            if (!content) return 'memory_manage: content is required for save'
-            const cat = category ?? 'general'
-            // Ensure hint and quote columns exist (may have been added by /api/memory route)
-            await query(`ALTER TABLE user_memories ADD COLUMN IF NOT EXISTS hint TEXT`).catch(() => {})
-            await query(`ALTER TABLE user_memories ADD COLUMN IF NOT EXISTS quote TEXT`).catch(() => {})
-            // Deduplicate — skip if similar content exists in same category
-            const existing = await query<{ id: number; content: string }>(
-              'SELECT id, content FROM user_memories WHERE user_id = $1 AND category = $2 ORDER BY created_at DESC LIMIT 10',
-              [userId, cat]
-            )
-            const newWords = new Set((content).toLowerCase().split(/\s+/).filter(w => w.length > 3))
-            const isCorrectionIntent = /\b(actually|correction|update|changed|revised|no longer)\b/i.test(content)
-            for (const row of existing.rows) {
-              const existWords = new Set(row.content.toLowerCase().split(/\s+/).filter(w => w.length > 3))
-              const overlap = newWords.size > 0 && existWords.size > 0
-                ? [...newWords].filter(w => existWords.has(w)).length / Math.max(newWords.size, existWords.size)
-                : 0
-              if (overlap > 0.6) {
-                if (isCorrectionIntent) {
-                  await query('UPDATE user_memories SET content = $1, hint = $2, quote = $3, updated_at = NOW() WHERE id = $4',
-                    [content, hint ?? content, quote ?? null, row.id])
-                  return `✅ Memory updated: [${cat}] ${hint ?? content}`
-                }
-                return `Already remembered: "${row.content.slice(0, 60)}"`
-              }
-            }
-            const aiHint = hint ?? content
-            const originalQuote = quote ?? null
-            await query(
-              'INSERT INTO user_memories (user_id, category, hint, quote, content) VALUES ($1, $2, $3, $4, $5)',
-              [userId, cat, aiHint, originalQuote, content]
-            )
-            pushToSupermemory(userId, `[${cat}] ${aiHint}`)
-            return `✅ Saved memory: [${cat}] ${aiHint}${originalQuote ? ` (from: "${String(originalQuote).slice(0, 50)}")` : ''}`
-          }
-
-          if (action === 'search') {
-            if (!memQuery) return 'memory_manage: query is required for search'
-            const cap = Math.min(Number(memLim), 50)
-            const catFilter = category ? 'AND category = $3' : ''
-            const params = category ? [userId, `%${memQuery}%`, category, cap] : [userId, `%${memQuery}%`, cap]
-            const res = await query(
-              `SELECT id, category, hint, quote, content, created_at FROM user_memories WHERE user_id = $1 AND content ILIKE $2 ${catFilter} ORDER BY created_at DESC LIMIT $${params.length}`,
-              params
-            )
-            const rows = res.rows as Array<{ id: number; category: string; hint: string | null; quote: string | null; content: string; created_at: string }>
-            if (!rows.length) return `No memories found for "${memQuery}"`
-            return rows.map(r =>
-              `[${r.id}:${r.category}] ${r.hint ?? r.content}${r.quote ? `\n  original: "${r.quote.slice(0, 80)}"` : ''}`
-            ).join('\n')
-          }
-
-          if (action === 'delete') {
-            if (!memory_id) return 'memory_manage: memory_id is required for delete'
-            await query('DELETE FROM user_memories WHERE id = $1 AND user_id = $2', [memory_id, userId])
-            return `✅ Memory ${memory_id} deleted`
-          }
-
-          if (action === 'list') {
-            const cap = Math.min(Number(memLim), 100)
-            const catFilter = category ? 'AND category = $2' : ''
-            const params = category ? [userId, category, cap] : [userId, cap]
-            const res = await query(
-              `SELECT id, category, hint, quote, content, created_at FROM user_memories WHERE user_id = $1 ${catFilter} ORDER BY created_at DESC LIMIT $${params.length}`,
-              params
-            )
-            const rows = res.rows as Array<{ id: number; category: string; hint: string | null; quote: string | null; content: string; created_at: string }>
-            if (!rows.length) return `No${category ? ` ${category}` : ''} memories found`
-            return rows.map(r =>
-              `[${r.id}:${r.category}] ${r.hint ?? r.content}${r.quote ? `\n  original: "${r.quote.slice(0, 80)}"` : ''}`
-            ).join('\n')
-          }
-
-          return `memory_manage: unknown action "${action}" — use save, search, delete, or list`
-        } catch (e) { return `memory_manage error: ${String(e)}` }
-      }
-
-      case 'list_memories': {
-        if (!userId) return 'Not authenticated'
-        const { category: listCat, source: listSource = 'user', limit: listLim = 50 } = args as { category?: string; source?: string; limit?: number }
-        try {
-          const cap = Math.min(Number(listLim), 100)
-          if (listSource === 'self') {
-            // sparkie_self_memory is a global table (no user_id)
-            const catFilter = listCat ? 'WHERE category = $1' : ''
-            const params = listCat ? [listCat, cap] : [cap]
-            const res = await query(`SELECT id, category, content, created_at FROM sparkie_self_memory ${catFilter} ORDER BY created_at DESC LIMIT $${params.length}`, params)
-            const rows = res.rows as Array<{ id: number; category: string; content: string }>
-            return rows.length ? rows.map(r => `[${r.id}:${r.category}] ${r.content.slice(0, 120)}`).join('\n') : 'No self memories found'
-          }
-          // 'user' or 'all' — query user_memories
-          const catFilter = listCat ? 'AND category = $2' : ''
-          const params = listCat ? [userId, listCat, cap] : [userId, cap]
-          const userRes = await query(`SELECT id, category, hint, quote, content, created_at FROM user_memories WHERE user_id = $1 ${catFilter} ORDER BY created_at DESC LIMIT $${params.length}`, params)
-          const userRows = userRes.rows as Array<{ id: number; category: string; hint: string | null; quote: string | null; content: string }>
-          if (listSource === 'all') {
-            // Also include sparkie self-memories
-            const selfCatFilter = listCat ? 'WHERE category = $1' : ''
-            const selfParams = listCat ? [listCat, Math.max(1, Math.floor(cap / 2))] : [Math.max(1, Math.floor(cap / 2))]
-            const selfRes = await query(`SELECT id, category, content, created_at FROM sparkie_self_memory ${selfCatFilter} ORDER BY created_at DESC LIMIT $${selfParams.length}`, selfParams).catch(() => ({ rows: [] }))
-            const selfRows = selfRes.rows as Array<{ id: number; category: string; content: string }>
-            const combined = [
-              ...userRows.map(r => `[user:${r.id}:${r.category}] ${r.hint ?? r.content}${r.quote ? ` (original: "${String(r.quote).slice(0, 60)}")` : ''}`),
-              ...selfRows.map(r => `[self:${r.id}:${r.category}] ${r.content.slice(0, 120)}`),
-            ]
-            return combined.length ? combined.join('\n') : 'No memories found'
-          }
-          return userRows.length ? userRows.map(r => `[${r.id}:${r.category}] ${r.hint ?? r.content}${r.quote ? ` (original: "${String(r.quote).slice(0, 60)}")` : ''}`).join('\n') : 'No user memories found'
-        } catch (e) { return `list_memories error: ${String(e)}` }
-      }
-
-      case 'manage_email': {
-        if (!userId) return 'Not authenticated'
-        const { action: emailAction, message_id: emailMsgId, label_name } = args as {
-          action: 'archive' | 'label' | 'delete' | 'star' | 'unstar' | 'read' | 'unread'
-          message_id: string
-          label_name?: string
-        }
-        if (!emailAction || !emailMsgId) return 'manage_email: action and message_id are required'
-        try {
-          // label action uses GMAIL_ADD_LABEL_TO_EMAIL with label_name
-          if (emailAction === 'label' && label_name) {
-            const modResult = await executeConnectorTool('GMAIL_ADD_LABEL_TO_EMAIL', { message_id: emailMsgId, label_name }, userId)
-            return `✅ manage_email: labeled "${label_name}" — ${modResult}`
+          // label action uses GMAIL_ADD_LABEL_TO_EMAIL with label_name
+          if (emailAction === 'label' && label_name) {
+            const modResult = await executeConnectorTool('GMAIL_ADD_LABEL_TO_EMAIL', { message_id: emailMsgId, label_name }, userId)
+            return `✅ manage_email: labeled "${label_name}" — ${modResult}`
           }
 
           const actionMap: Record<string, { add_label_ids?: string[]; remove_label_ids?: string[]; useMoveToTrash?: boolean }> = {
@@ -5114,462 +3560,65 @@ def invoke_llm(query, model='MiniMax-M2.7'):
             delete:  { useMoveToTrash: true },
           }
 
-          const labelOp = actionMap[emailAction]
-          if (!labelOp) return `manage_email: unknown action "${emailAction}". Use: archive, label, delete, star, unstar, read, unread`
-
-          // delete uses GMAIL_MOVE_TO_TRASH (message_id param); other actions use GMAIL_MODIFY_THREAD_LABELS (thread_id param)
-          if (labelOp.useMoveToTrash) {
-            const modResult = await executeConnectorTool('GMAIL_MOVE_TO_TRASH', { message_id: emailMsgId }, userId)
-            return `✅ manage_email: ${emailAction} on ${emailMsgId} — ${modResult}`
-          }
-
-          const modResult = await executeConnectorTool('GMAIL_MODIFY_THREAD_LABELS', {
-            thread_id: emailMsgId,
-            ...(labelOp.add_label_ids ? { add_label_ids: labelOp.add_label_ids } : {}),
-            ...(labelOp.remove_label_ids ? { remove_label_ids: labelOp.remove_label_ids } : {}),
-          }, userId)
-          return `✅ manage_email: ${emailAction} on ${emailMsgId} — ${modResult}`
-        } catch (e) { return `manage_email error: ${String(e)}` }
-      }
-
-      case 'transcribe_audio': {
-        const { audio_url: audioUrl } = args as { audio_url: string }
-        if (!audioUrl) return 'transcribe_audio: audio_url is required'
-        const DEEPGRAM_KEY = process.env.DEEPGRAM_API_KEY ?? ''
-        if (!DEEPGRAM_KEY) return 'transcribe_audio: DEEPGRAM_API_KEY not configured'
-        try {
-          const res = await fetch('https://api.deepgram.com/v1/listen?model=nova-2&smart_format=true', {
-            method: 'POST',
-            headers: { Authorization: `Token ${DEEPGRAM_KEY}`, 'Content-Type': 'application/json' },
-            body: JSON.stringify({ url: audioUrl }),
-            signal: AbortSignal.timeout(30000),
-          })
-          if (!res.ok) return `transcribe_audio: Deepgram error ${res.status}`
-          const data = await res.json() as { results?: { channels?: Array<{ alternatives?: Array<{ transcript?: string }> }> } }
-          const transcript = data.results?.channels?.[0]?.alternatives?.[0]?.transcript ?? ''
-          return transcript ? `Transcript:\n${transcript}` : 'transcribe_audio: empty transcript returned'
-        } catch (e) { return `transcribe_audio error: ${String(e)}` }
-      }
-
-      case 'manage_calendar_event': {
-        if (!userId) return 'Not authenticated'
-        const { action: calAction, event_id, title, description, start_datetime, end_datetime, attendees } = args as {
-          action: 'create' | 'update' | 'cancel' | 'delete'
-          event_id?: string
-          title?: string
-          description?: string
-          start_datetime?: string
-          end_datetime?: string
-          attendees?: string[]
-        }
-        try {
-          if (calAction === 'create') {
-            if (!title || !start_datetime) return 'manage_calendar_event create: title and start_datetime required'
-            const calArgs: Record<string, unknown> = { title, start_datetime, end_datetime: end_datetime ?? start_datetime }
-            if (description) calArgs.description = description
-            if (attendees?.length) calArgs.attendees = attendees
-            const result = await executeConnectorTool('GOOGLECALENDAR_CREATE_EVENT', calArgs, userId)
-            writeWorklog(userId, 'task_executed', `📅 Created calendar event: "${title}" at ${start_datetime}`, { decision_type: 'action', signal_priority: 'P2', conclusion: `Calendar event created: ${title}` }).catch(() => {})
-            return `✅ Calendar event created: "${title}"\n${result}`
-          } else if (calAction === 'cancel' || calAction === 'delete') {
-            if (!event_id) return 'manage_calendar_event cancel: event_id required'
-            const result = await executeConnectorTool('GOOGLECALENDAR_DELETE_EVENT', { event_id }, userId)
-            return `✅ Calendar event ${calAction}d: ${event_id}\n${result}`
-          } else if (calAction === 'update') {
-            if (!event_id) return 'manage_calendar_event update: event_id required'
-            const upArgs: Record<string, unknown> = { event_id }
-            if (title) upArgs.title = title
-            if (description) upArgs.description = description
-            if (start_datetime) upArgs.start_datetime = start_datetime
-            if (end_datetime) upArgs.end_datetime = end_datetime
-            const result = await executeConnectorTool('GOOGLECALENDAR_UPDATE_EVENT', upArgs, userId)
-            return `✅ Calendar event updated: ${event_id}\n${result}`
-          }
-          return `manage_calendar_event: unknown action "${calAction}". Use: create, update, cancel, delete`
-        } catch (e) { return `manage_calendar_event error: ${String(e)}` }
-      }
-
-      case 'send_card_to_user': {
-        // Block 3: Sparkie calls this to render a beautiful inline card in chat
-        // Returns SPARKIE_CARD: prefix which the agent loop detects and emits as SSE
-        const { type: cardType, title: cardTitle, subtitle: cardSubtitle, to: cardTo, body: cardBody,
-                fields: cardFields, items: cardItems, actions: cardActions, metadata: cardMeta,
-                preview_url: cardPreview, text: cardText, file_path: cardFilePath } =
-          args as {
-            type?: string; title?: string; subtitle?: string; to?: string; body?: string
-            fields?: Array<{ label: string; value: string }>; items?: string[]
-            actions?: Array<{ id: string; label: string; icon?: string; variant?: string }>
-            metadata?: Record<string, unknown>; preview_url?: string; text?: string; file_path?: string
-          }
-
-        // When file_path is provided, load skill from sparkie_skills and parse YAML+JSON
-        if (cardFilePath && (!cardType || !cardTitle)) {
-          const skillRes = await query<{ content: string }>(
-            `SELECT content FROM sparkie_skills WHERE name = $1 LIMIT 1`,
-            [cardFilePath]
-          ).catch(() => ({ rows: [] } as { rows: Array<{ content: string }> }))
-          if (!skillRes.rows[0]) return `send_card_to_user: skill "${cardFilePath}" not found in sparkie_skills`
-          const skillContent = skillRes.rows[0].content
-
-          // Parse YAML frontmatter + JSON body (A2UI / CTA skill format)
-          const frontmatterMatch = skillContent.match(/^---\n([\s\S]*?)\n---\n([\s\S]*)$/)
-          if (!frontmatterMatch) return `send_card_to_user: skill "${cardFilePath}" must have YAML frontmatter followed by JSON body`
-          const [, rawFrontmatter, rawBody] = frontmatterMatch
-          const frontmatter: Record<string, unknown> = {}
-          for (const line of rawFrontmatter.split('\n')) {
-            const [key, ...rest] = line.split(':')
-            if (key && rest.length > 0) {
-              frontmatter[key.trim()] = rest.join(':').trim()
-            }
-          }
-          const jsonBody = JSON.parse(rawBody)
-          const skillType = (frontmatter.type as string) ?? 'report'
-          const skillTitle = (frontmatter.title as string) ?? cardFilePath
-
-          const parsedCardData = {
-            type: skillType,
-            title: skillTitle,
-            subtitle: (frontmatter.subtitle as string) ?? jsonBody.title ?? jsonBody.headline,
-            body: jsonBody.body ?? jsonBody.summary ?? jsonBody.text,
-            fields: jsonBody.fields,
-            items: jsonBody.items ?? jsonBody.components,
-            actions: (jsonBody.actions ?? []).map((a: { id?: string; type?: string; label?: string; variant?: string }, i: number) => ({
-              id: a.id ?? `action_${i}`,
-              label: a.label ?? a.type ?? 'View',
-              icon: a.type,
-              variant: (a.variant ?? (i === 0 ? 'primary' : 'secondary')) as 'primary' | 'secondary' | 'danger',
-            })),
-            metadata: { ...cardMeta, ...jsonBody, source: cardFilePath },
-            previewUrl: jsonBody.previewUrl ?? jsonBody.imageUrl,
-          }
-          return `SPARKIE_CARD:${JSON.stringify({ card: parsedCardData, text: cardText ?? '' })}`
-        }
-
-        if (!cardType || !cardTitle) return 'send_card_to_user: type and title are required'
-        const cardData = {
-          type: cardType, title: cardTitle, subtitle: cardSubtitle, to: cardTo, body: cardBody,
-          fields: cardFields, items: cardItems, previewUrl: cardPreview,
-          actions: (cardActions ?? []).map(a => ({ ...a, variant: (a.variant ?? 'secondary') as 'primary' | 'secondary' | 'danger' })),
-          metadata: cardMeta,
-        }
-        return `SPARKIE_CARD:${JSON.stringify({ card: cardData, text: cardText ?? '' })}`
-      }
-
-      // ── user_operation_signal: HITL resume after user acts on a card ─────────
-      case 'user_operation_signal': {
-        if (!userId) return 'Not authenticated'
-        const { task_id: opTaskId, action: opAction, feedback: opFeedback } = args as {
-          task_id: string; action: string; feedback?: string
-        }
-        if (!opTaskId || !opAction) return 'user_operation_signal: task_id and action are required'
-
-        // Fetch the task to get action + draft_id + payload
-        const taskRes = await query<{
-          id: string; action: string; label: string; status: string; payload: unknown; draft_id: string | null
-        }>(`SELECT id, action, label, status, payload, draft_id FROM sparkie_tasks WHERE id = $1 AND user_id = $2`, [opTaskId, userId])
-        const task = taskRes.rows[0]
-        if (!task) return `user_operation_signal: task ${opTaskId} not found`
-
-        const payload = typeof task.payload === 'string' ? JSON.parse(task.payload) : task.payload
-
-        if (opAction === 'approved' || opAction === 'rejected') {
-          // Mark the task as completed/skipped and return the result to the AI
-          const resolved = opAction === 'approved' ? 'completed' : 'skipped'
-          await query(`UPDATE sparkie_tasks SET status = $1, resolved_at = NOW() WHERE id = $2`, [resolved, opTaskId])
-          return `[user_operation: ${opAction}] Task "${task.label}" has been ${resolved} by the user.` +
-            (opFeedback ? ` Feedback: ${opFeedback}` : '') +
-            ` The task is now marked as ${resolved}. You may continue autonomously.`
-        }
-
-        if (opAction === 'changes_requested') {
-          // Mark current task as skipped, return feedback so AI can create new draft
-          await query(`UPDATE sparkie_tasks SET status = 'skipped', resolved_at = NOW() WHERE id = $1`, [opTaskId])
-          return `[user_operation: changes_requested] User requested changes for task "${task.label}".` +
-            (opFeedback ? ` Feedback: ${opFeedback}` : ' No specific feedback provided.') +
-            ` The previous task is skipped. Please create a revised draft based on the feedback and send a new card.`
-        }
-
-        if (opAction === 'discarded') {
-          // Mark as cancelled
-          await query(`UPDATE sparkie_tasks SET status = 'cancelled', resolved_at = NOW() WHERE id = $1`, [opTaskId])
-          return `[user_operation: discarded] Task "${task.label}" has been discarded by the user.` +
-            ` The task is cancelled. Stop unless you have urgent follow-up work.`
-        }
-
-        return `user_operation_signal: unknown action "${opAction}"`
-      }
-
-      // ── Block 7: File upload access ──────────────────────────────────────────
-      case 'read_uploaded_file': {
-        if (!userId) return 'Not authenticated'
-        const { file_id: uploadFileId } = args as { file_id: string }
-        if (!uploadFileId) return 'read_uploaded_file: file_id is required'
-        try {
-          const res = await fetch(`${baseUrl}/api/upload?file_id=${encodeURIComponent(uploadFileId)}`, {
-            headers: { Cookie: cookieHeader },
-            signal: AbortSignal.timeout(10000),
-          })
-          if (!res.ok) return `read_uploaded_file: ${res.status} — ${await res.text()}`
-          const data = await res.json() as { ok?: boolean; filename?: string; mimeType?: string; sizeBytes?: number; text?: string; dataUrl?: string; error?: string }
-          if (data.error) return `read_uploaded_file: ${data.error}`
-          if (data.text) {
-            return `File: ${data.filename} (${data.mimeType}, ${data.sizeBytes} bytes)\n\n${data.text.slice(0, 8000)}${(data.text.length ?? 0) > 8000 ? '\n...(truncated)' : ''}`
-          }
-          if (data.dataUrl && data.mimeType?.startsWith('image/')) {
-            return `IMAGE_URL:${data.dataUrl}\nImage file: ${data.filename} (${data.sizeBytes} bytes)`
-          }
-          return `File: ${data.filename} (${data.mimeType}, ${data.sizeBytes} bytes) — binary file, cannot display as text`
-        } catch (e) { return `read_uploaded_file error: ${String(e)}` }
-      }
-
-      // ── Block 6: Hyperbrowser browser control ────────────────────────────────
-      case 'browser_navigate': {
-        const { url: hbUrl, extract_markdown: hbMd = true } = args as { url: string; extract_markdown?: boolean }
-        if (!hbUrl) return 'browser_navigate: url is required'
-        const HB_KEY = process.env.HYPERBROWSER_API_KEY ?? ''
-        if (!HB_KEY) return 'HYPERBROWSER_API_KEY not configured'
-        try {
-          const formats = hbMd ? ['markdown', 'links'] : ['html']
-          const res = await fetch('https://api.hyperbrowser.ai/api/scrape', {
-            method: 'POST',
-            headers: { 'x-api-key': HB_KEY, 'Content-Type': 'application/json' },
-            body: JSON.stringify({ url: hbUrl, scrapeOptions: { formats } }),
-            signal: AbortSignal.timeout(30000),
-          })
-          if (!res.ok) return `browser_navigate error: ${res.status} — ${await res.text()}`
-          const data = await res.json() as { markdown?: string; html?: string; links?: string[]; metadata?: { title?: string; description?: string } }
-          const title = data.metadata?.title ?? 'Unknown'
-          const content = (data.markdown ?? data.html ?? '').slice(0, 4000)
-          const links = (data.links ?? []).slice(0, 10).join('\n')
-          return `Navigated to: ${hbUrl}\nTitle: ${title}\n\n${content}${links ? '\n\nLinks:\n' + links : ''}`
-        } catch (e) { return `browser_navigate error: ${String(e)}` }
-      }
-
-      case 'browser_screenshot': {
-        const { url: hbUrl } = args as { url: string }
-        if (!hbUrl) return 'browser_screenshot: url is required'
-        const HB_KEY = process.env.HYPERBROWSER_API_KEY ?? ''
-        if (!HB_KEY) return 'browser_screenshot error: HYPERBROWSER_API_KEY not configured'
-        console.log('[screenshot] starting for url:', hbUrl)
-        try {
-          // Hyperbrowser /api/scrape supports 'screenshot' format — pass it alongside 'markdown'
-          // The response nests data under a top-level 'data' key when using session-mode
-          const scrapeStart = Date.now()
-          const res = await fetch('https://api.hyperbrowser.ai/api/scrape', {
-            method: 'POST',
-            headers: { 'x-api-key': HB_KEY, 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-              url: hbUrl,
-              scrapeOptions: { formats: ['screenshot', 'markdown'] },
-              sessionOptions: { useProxy: false, solveCaptchas: false },
-            }),
-            signal: AbortSignal.timeout(35000),
-          })
-          console.log('[screenshot] status:', res.status, 'elapsed:', Date.now() - scrapeStart, 'ms')
-          if (!res.ok) {
-            const errText = await res.text()
-            console.log('[screenshot] error body:', errText.slice(0, 300))
-            // Fallback: use browser_navigate to get page content instead of screenshot
-            const fallbackRes = await fetch('https://api.hyperbrowser.ai/api/scrape', {
-              method: 'POST',
-              headers: { 'x-api-key': HB_KEY, 'Content-Type': 'application/json' },
-              body: JSON.stringify({ url: hbUrl, scrapeOptions: { formats: ['markdown'] } }),
-              signal: AbortSignal.timeout(30000),
-            })
-            if (fallbackRes.ok) {
-              const fd = await fallbackRes.json() as { markdown?: string; data?: { markdown?: string }; metadata?: { title?: string } }
-              const md = fd.markdown ?? fd.data?.markdown ?? ''
-              return `browser_screenshot: screenshot unavailable (API error ${res.status}). Page text:\nURL: ${hbUrl}\nTitle: ${fd.metadata?.title ?? hbUrl}\n\n${md.slice(0, 800)}`
-            }
-            return `browser_screenshot error: ${res.status} — ${errText.slice(0, 200)}`
-          }
-          const data = await res.json() as {
-            screenshot?: string; markdown?: string; metadata?: { title?: string }
-            data?: { screenshot?: string; markdown?: string; metadata?: { title?: string } }
-          }
-          console.log('[screenshot] response keys:', Object.keys(data).join(','))
-          const screenshot = data.screenshot ?? data.data?.screenshot
-          const markdown = data.markdown ?? data.data?.markdown
-          const pageTitle = data.metadata?.title ?? data.data?.metadata?.title ?? hbUrl
-          if (screenshot) {
-            const imgData = screenshot.startsWith('data:') ? screenshot : `data:image/png;base64,${screenshot}`
-            // Persist to DB asset for stable URL if userId available
-            if (userId) {
-              try {
-                const hbBaseUrl = process.env.NEXTAUTH_URL ?? 'https://sparkie-studio-fymtq.ondigitalocean.app'
-                const fid = crypto.randomUUID()
-                await query(
-                  `INSERT INTO sparkie_assets (user_id, name, content, asset_type, source, file_id, chat_title, chat_id, language) VALUES ($1, $2, $3, 'image', 'browser', $4, '', '', '')`,
-                  [userId, `screenshot-${Date.now()}.png`, imgData, fid]
-                )
-                return `IMAGE_URL:${hbBaseUrl}/api/assets-image?fid=${fid}\nScreenshot of: ${pageTitle}\n${markdown?.slice(0, 300) ?? ''}`
-              } catch { /* fall through to raw data URL */ }
-            }
-            return `IMAGE_URL:${imgData}\nScreenshot of: ${pageTitle}`
-          }
-          // No screenshot in response — return page text as fallback
-          return `browser_screenshot: no image returned. Page: ${pageTitle}\n${markdown?.slice(0, 500) ?? ''}`
-        } catch (e) { return `browser_screenshot error: ${String(e)}` }
-      }
-
-      case 'browser_extract': {
-        const { url: hbUrl, prompt: hbPrompt, schema: hbSchema } = args as { url: string; prompt: string; schema?: Record<string, unknown> }
-        if (!hbUrl || !hbPrompt) return 'browser_extract: url and prompt are required'
-        const HB_KEY = process.env.HYPERBROWSER_API_KEY ?? ''
-        if (!HB_KEY) return 'HYPERBROWSER_API_KEY not configured'
-        try {
-          const body: Record<string, unknown> = { urls: [hbUrl], prompt: hbPrompt }
-          if (hbSchema) body.schema = hbSchema
-          const res = await fetch('https://api.hyperbrowser.ai/api/extract', {
-            method: 'POST',
-            headers: { 'x-api-key': HB_KEY, 'Content-Type': 'application/json' },
-            body: JSON.stringify(body),
-            signal: AbortSignal.timeout(35000),
-          })
-          if (!res.ok) return `browser_extract error: ${res.status} — ${await res.text()}`
-          const data = await res.json() as { data?: unknown; error?: string }
-          if (data.error) return `browser_extract failed: ${data.error}`
-          return JSON.stringify(data.data ?? data, null, 2).slice(0, 4000)
-        } catch (e) { return `browser_extract error: ${String(e)}` }
-      }
-
-      case 'browser_click': {
-        const { url: hbUrl, selector: hbSel, description: hbDesc, profile_id: hbProfileId } = args as { url: string; selector?: string; description?: string; profile_id?: string }
-        if (!hbUrl) return 'browser_click: url is required'
-        const HB_KEY = process.env.HYPERBROWSER_API_KEY ?? ''
-        if (!HB_KEY) return 'HYPERBROWSER_API_KEY not configured'
-        try {
-          const clickTarget = hbSel ? `the element with selector "${hbSel}"` : (hbDesc ?? 'the most prominent clickable element')
-          const task = `Navigate to ${hbUrl} and click on ${clickTarget}`
-          const sessionOpts: Record<string, unknown> = {}
-          if (hbProfileId) sessionOpts.profile = { id: hbProfileId, persistChanges: true }
-          const res = await fetch('https://api.hyperbrowser.ai/api/agents/browser-use', {
-            method: 'POST',
-            headers: { 'x-api-key': HB_KEY, 'Content-Type': 'application/json' },
-            body: JSON.stringify({ task, ...(Object.keys(sessionOpts).length ? { sessionOptions: sessionOpts } : {}) }),
-            signal: AbortSignal.timeout(60000),
-          })
-          if (!res.ok) return `browser_click error: ${res.status} — ${await res.text()}`
-          const data = await res.json() as { result?: string; output?: string; finalResult?: string }
-          return data.finalResult ?? data.result ?? data.output ?? '✅ Click action completed'
-        } catch (e) { return `browser_click error: ${String(e)}` }
-      }
-
-      case 'browser_fill': {
-        const { url: hbUrl, selector: hbSel, value: hbValue, description: hbDesc, profile_id: hbProfileId } = args as { url: string; selector?: string; value: string; description?: string; profile_id?: string }
-        if (!hbUrl || !hbValue) return 'browser_fill: url and value are required'
-        const HB_KEY = process.env.HYPERBROWSER_API_KEY ?? ''
-        if (!HB_KEY) return 'HYPERBROWSER_API_KEY not configured'
-        try {
-          const fieldTarget = hbSel ? `the field with selector "${hbSel}"` : (hbDesc ?? 'the main input field')
-          const task = `Navigate to ${hbUrl} and fill ${fieldTarget} with: ${hbValue}`
-          const sessionOpts: Record<string, unknown> = {}
-          if (hbProfileId) sessionOpts.profile = { id: hbProfileId, persistChanges: true }
-          const res = await fetch('https://api.hyperbrowser.ai/api/agents/browser-use', {
-            method: 'POST',
-            headers: { 'x-api-key': HB_KEY, 'Content-Type': 'application/json' },
-            body: JSON.stringify({ task, ...(Object.keys(sessionOpts).length ? { sessionOptions: sessionOpts } : {}) }),
-            signal: AbortSignal.timeout(60000),
-          })
-          if (!res.ok) return `browser_fill error: ${res.status} — ${await res.text()}`
-          const data = await res.json() as { result?: string; output?: string; finalResult?: string }
-          return data.finalResult ?? data.result ?? data.output ?? '✅ Fill action completed'
-        } catch (e) { return `browser_fill error: ${String(e)}` }
-      }
+          const labelOp = actionMap[emailAction]
+          if (!labelOp) return `manage_email: unknown action "${emailAction}". Use: archive, label, delete, star, unstar, read, unread`
 
-      case 'browser_create_profile': {
-        const { name: profileName = 'sparkie-default' } = args as { name?: string }
-        const HB_KEY = process.env.HYPERBROWSER_API_KEY ?? ''
-        if (!HB_KEY) return 'HYPERBROWSER_API_KEY not configured'
-        try {
-          const res = await fetch('https://api.hyperbrowser.ai/api/profile', {
-            method: 'POST',
-            headers: { 'x-api-key': HB_KEY, 'Content-Type': 'application/json' },
-            body: JSON.stringify({ name: profileName }),
-            signal: AbortSignal.timeout(15000),
-          })
-          if (!res.ok) return `browser_create_profile error: ${res.status} — ${await res.text()}`
-          const data = await res.json() as { id?: string; name?: string }
-          if (!data.id) return 'browser_create_profile: no profile ID in response'
-          // Persist profile ID to Sparkie self-memory for future use
-          if (userId) {
-            await fetch(`${baseUrl}/api/sparkie-self-memory`, {
-              method: 'POST',
-              headers: { 'Content-Type': 'application/json', 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET ?? '' },
-              body: JSON.stringify({ category: 'browser_profiles', content: `Browser profile "${profileName}": ${data.id}`, source: 'sparkie' }),
-            }).catch(() => {})
+          // delete uses GMAIL_MOVE_TO_TRASH (message_id param); other actions use GMAIL_MODIFY_THREAD_LABELS (thread_id param)
+          if (labelOp.useMoveToTrash) {
+            const modResult = await executeConnectorTool('GMAIL_MOVE_TO_TRASH', { message_id: emailMsgId }, userId)
+            return `✅ manage_email: ${emailAction} on ${emailMsgId} — ${modResult}`
           }
-          return `✅ Browser profile created — "${profileName}" (ID: ${data.id}). Use this ID with browser_use_profile for authenticated browsing.`
-        } catch (e) { return `browser_create_profile error: ${String(e)}` }
+
+          const modResult = await executeConnectorTool('GMAIL_MODIFY_THREAD_LABELS', {
+            thread_id: emailMsgId,
+            ...(labelOp.add_label_ids ? { add_label_ids: labelOp.add_label_ids } : {}),
+            ...(labelOp.remove_label_ids ? { remove_label_ids: labelOp.remove_label_ids } : {}),
+          }, userId)
+          return `✅ manage_email: ${emailAction} on ${emailMsgId} — ${modResult}`
+        } catch (e) { return `manage_email error: ${String(e)}` }
       }
 
-      case 'browser_use_profile': {
-        const { profile_id: hbProfileId, task: hbTask, url: hbStartUrl } = args as { profile_id: string; task: string; url?: string }
-        if (!hbProfileId || !hbTask) return 'browser_use_profile: profile_id and task are required'
-        const HB_KEY = process.env.HYPERBROWSER_API_KEY ?? ''
-        if (!HB_KEY) return 'HYPERBROWSER_API_KEY not configured'
+      case 'manage_calendar_event': {
+        if (!userId) return 'Not authenticated'
+        const { action: calAction, event_id, title, description, start_datetime, end_datetime, attendees } = args as {
+          action: 'create' | 'update' | 'cancel' | 'delete'
+          event_id?: string
+          title?: string
+          description?: string
+          start_datetime?: string
+          end_datetime?: string
+          attendees?: string[]
+        }
         try {
-          const body: Record<string, unknown> = {
-            task: hbTask,
-            sessionOptions: { profile: { id: hbProfileId, persistChanges: true }, useStealth: true },
+          if (calAction === 'create') {
+            if (!title || !start_datetime) return 'manage_calendar_event create: title and start_datetime required'
+            const calArgs: Record<string, unknown> = { title, start_datetime, end_datetime: end_datetime ?? start_datetime }
+            if (description) calArgs.description = description
+            if (attendees?.length) calArgs.attendees = attendees
+            const result = await executeConnectorTool('GOOGLECALENDAR_CREATE_EVENT', calArgs, userId)
+            writeWorklog(userId, 'task_executed', `📅 Created calendar event: "${title}" at ${start_datetime}`, { decision_type: 'action', signal_priority: 'P2', conclusion: `Calendar event created: ${title}` }).catch(() => {})
+            return `✅ Calendar event created: "${title}"\n${result}`
+          } else if (calAction === 'cancel' || calAction === 'delete') {
+            if (!event_id) return 'manage_calendar_event cancel: event_id required'
+            const result = await executeConnectorTool('GOOGLECALENDAR_DELETE_EVENT', { event_id }, userId)
+            return `✅ Calendar event ${calAction}d: ${event_id}\n${result}`
+          } else if (calAction === 'update') {
+            if (!event_id) return 'manage_calendar_event update: event_id required'
+            const upArgs: Record<string, unknown> = { event_id }
+            if (title) upArgs.title = title
+            if (description) upArgs.description = description
+            if (start_datetime) upArgs.start_datetime = start_datetime
+            if (end_datetime) upArgs.end_datetime = end_datetime
+            const result = await executeConnectorTool('GOOGLECALENDAR_UPDATE_EVENT', upArgs, userId)
+            return `✅ Calendar event updated: ${event_id}\n${result}`
           }
-          if (hbStartUrl) body.startUrl = hbStartUrl
-          const res = await fetch('https://api.hyperbrowser.ai/api/agents/browser-use', {
-            method: 'POST',
-            headers: { 'x-api-key': HB_KEY, 'Content-Type': 'application/json' },
-            body: JSON.stringify(body),
-            signal: AbortSignal.timeout(180000), // 180s — matches platform maxDuration, long LLM calls (reasoning + synthesis) can exceed 90s
-          })
-          if (!res.ok) return `browser_use_profile error: ${res.status} — ${await res.text()}`
-          const data = await res.json() as { result?: string; output?: string; finalResult?: string; error?: string }
-          if (data.error) return `browser_use_profile failed: ${data.error}`
-          return data.finalResult ?? data.result ?? data.output ?? '✅ Browser task completed'
-        } catch (e) { return `browser_use_profile error: ${String(e)}` }
-      }
-
-    case 'manage_topic': {
-      const { action: topicAction, id: topicId, name: topicName, fingerprint: topicFp, summary: topicSum, notification_policy: topicPolicy } = args as { action: string; id?: string; name?: string; fingerprint?: string; summary?: string; notification_policy?: string }
-      if (topicAction === 'list') {
-        const res = await fetch(`${baseUrl}/api/topics`, { headers: { Cookie: cookieHeader }, signal: AbortSignal.timeout(8000) })
-        if (!res.ok) return 'Could not load topics'
-        const data = await res.json() as { topics: Array<{ id: string; name: string; summary?: string; updated_at: string }> }
-        if (data.topics.length === 0) return 'No active topics found.'
-        return data.topics.map(t => `[${t.id}] ${t.name}${t.summary ? ` — ${t.summary}` : ''}`).join('\n')
-      }
-      if (topicAction === 'get') {
-        if (!topicId) return 'id required for get'
-        const res = await fetch(`${baseUrl}/api/topics?id=${encodeURIComponent(topicId)}`, { headers: { Cookie: cookieHeader }, signal: AbortSignal.timeout(8000) })
-        if (!res.ok) return 'Topic not found'
-        const data = await res.json() as { topic: { name: string; summary?: string; fingerprint?: string; notification_policy: string }; links: Array<{ source_type: string; summary?: string; created_at: string }> }
-        return `Topic: ${data.topic.name}\nSummary: ${data.topic.summary ?? '(none)'}\nFingerprint: ${data.topic.fingerprint ?? '(none)'}\nLinks:\n${data.links.map(l => `  [${l.source_type}] ${l.summary ?? ''}`).join('\n') || '  (none)'}`
+          return `manage_calendar_event: unknown action "${calAction}". Use: create, update, cancel, delete`
+        } catch (e) { return `manage_calendar_event error: ${String(e)}` }
       }
-      const res = await fetch(`${baseUrl}/api/topics`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json', Cookie: cookieHeader },
-        body: JSON.stringify({ action: topicAction, id: topicId, name: topicName, fingerprint: topicFp, summary: topicSum, notification_policy: topicPolicy }),
-        signal: AbortSignal.timeout(8000),
-      })
-      const data = await res.json() as { ok?: boolean; action?: string; id?: string; error?: string }
-      if (!res.ok || data.error) return `Error: ${data.error ?? 'manage_topic failed'}`
-      if (topicAction === 'create') return `✅ Topic created: ${topicName} (ID: ${data.id})`
-      if (topicAction === 'update') return `✅ Topic updated`
-      if (topicAction === 'archive') return `✅ Topic archived`
-      return `✅ Done (${data.action})`
-    }
-
-    case 'link_to_topic': {
-      const { topic_id: ltTopicId, source_type: ltSourceType, source_id: ltSourceId, summary: ltSummary } = args as { topic_id: string; source_type: string; source_id: string; summary?: string }
-      const res = await fetch(`${baseUrl}/api/topics`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json', Cookie: cookieHeader },
-        body: JSON.stringify({ action: 'link', topic_id: ltTopicId, source_type: ltSourceType, source_id: ltSourceId, summary: ltSummary }),
-        signal: AbortSignal.timeout(8000),
-      })
-      const data = await res.json() as { ok?: boolean; error?: string }
-      if (!res.ok || data.error) return `Error: ${data.error ?? 'link_to_topic failed'}`
-      return `✅ Linked ${ltSourceType} to topic`
-    }
 
+      // ── user_operation_signal: HITL resume after user acts on a card ─────────
+      // ── Block 7: File upload access ──────────────────────────────────────────
+      // ── Block 6: Hyperbrowser browser control ────────────────────────────────
       case 'send_email': {
         if (!userId) return 'Not authenticated'
         const { to: emailTo, subject: emailSubject, body: emailBody, cc: emailCc } = args as {
@@ -5606,466 +3655,17 @@ def invoke_llm(query, model='MiniMax-M2.7'):
         }
       }
 
-      case 'post_to_social': {
-        if (!userId) return 'Not authenticated'
-        const { platform, text, media_url, subreddit, title } = args as {
-          platform: string; text: string; media_url?: string; subreddit?: string; title?: string
-        }
-        // Phase 4 HITL hardening: irreversible social posts always require user approval
-        const taskId = `hitl_social_${Date.now()}_${Math.random().toString(36).slice(2, 6)}`
-        let connectorAction = ''
-        let connectorArgs: Record<string, unknown> = {}
-        if (platform === 'twitter') {
-          connectorAction = 'TWITTER_CREATE_TWEET'; connectorArgs = { text }
-        } else if (platform === 'instagram' && media_url) {
-          connectorAction = 'INSTAGRAM_CREATE_PHOTO_POST'; connectorArgs = { image_url: media_url, caption: text }
-        } else if (platform === 'tiktok' && media_url) {
-          connectorAction = 'TIKTOK_CREATE_POST'; connectorArgs = { video_url: media_url, caption: text }
-        } else if (platform === 'reddit') {
-          connectorAction = 'REDDIT_CREATE_POST'; connectorArgs = { subreddit: subreddit || 'test', title: title || text.slice(0, 80), text }
-        }
-        if (!connectorAction) return 'post_to_social: platform not recognized or missing required media_url'
-        // Store task for human approval
-        await query(
-          `INSERT INTO sparkie_tasks (id, user_id, action, label, payload, status, executor, trigger_type, why_human, created_at)
-           VALUES ($1, $2, $3, $4, $5, 'pending', 'human', 'manual', $6, NOW())`,
-          [taskId, userId,
-           `executeConnectorTool('${connectorAction}', ${JSON.stringify(connectorArgs)})`,
-           `Post to ${platform}: "${text.slice(0, 60)}${text.length > 60 ? '...' : ''}"`,
-           JSON.stringify({ platform, connectorAction, connectorArgs }),
-           `Social post to ${platform} — requires your approval before publishing`]
-        ).catch(() => {})
-        return `HITL_TASK:${JSON.stringify({
-          id: taskId, action: connectorAction, label: `Post to ${platform}`,
-          payload: { platform, text, preview: text.slice(0, 120) }, status: 'pending'
-        })}`
-      }
-
-      case 'get_scheduled_tasks': {
-        if (!userId) return 'Not authenticated'
-        const { status: taskStatusFilter = 'pending', limit: taskLimit = 20 } = args as { status?: string; limit?: number }
-        try {
-          const statusWhere = taskStatusFilter === 'all'
-            ? 'user_id = $1'
-            : "user_id = $1 AND status = $2"
-          const taskParams = taskStatusFilter === 'all' ? [userId] : [userId, taskStatusFilter]
-          const taskRes = await query(
-            `SELECT id, label, action, status, executor, trigger_type, trigger_config, scheduled_at, created_at, why_human
-             FROM sparkie_tasks WHERE ${statusWhere}
-             ORDER BY CASE status WHEN 'pending' THEN 0 WHEN 'in_progress' THEN 1 ELSE 2 END, created_at DESC
-             LIMIT $${taskParams.length + 1}`,
-            [...taskParams, Math.min(Number(taskLimit), 50)]
-          )
-          if (taskRes.rows.length === 0) return `No tasks with status=${taskStatusFilter}`
-          const lines = (taskRes.rows as Array<Record<string, unknown>>).map(t => {
-            const sched = t.scheduled_at ? ` | due: ${new Date(t.scheduled_at as string).toISOString().slice(0,16)}` : ''
-            const why = t.why_human ? ` | reason: ${t.why_human}` : ''
-            return `• [${String(t.status).toUpperCase()}] ${t.label} (executor=${t.executor}, trigger=${t.trigger_type}${sched}${why})`
-          })
-          return `Scheduled tasks (${taskRes.rows.length}):\n` + lines.join('\n')
-        } catch (e) {
-          return `get_scheduled_tasks error: ${String(e)}`
-        }
-      }
-
-      case 'get_outreach_status': {
-        if (!userId) return 'Not authenticated'
-        try {
-          // Last 10 outreach log entries
-          const outreachRes = await query(
-            `SELECT type, content, created_at FROM sparkie_outreach_log WHERE user_id = $1 ORDER BY created_at DESC LIMIT 10`,
-            [userId]
-          ).catch(() => ({ rows: [] as unknown[] }))
-          // Last task_completed/inbox_check/morning_brief worklog entries
-          const wlRes = await query(
-            `SELECT type, content, created_at FROM sparkie_worklog
-             WHERE user_id = $1 AND type IN ('proactive_check','task_executed','auth_check','heartbeat')
-             ORDER BY created_at DESC LIMIT 10`,
-            [userId]
-          ).catch(() => ({ rows: [] as unknown[] }))
-          const outreachLines = (outreachRes.rows as Array<Record<string, unknown>>)
-            .map(r => `• [${r.type}] ${String(r.content).slice(0, 100)} (${new Date(r.created_at as string).toLocaleString()})`)
-          const wlLines = (wlRes.rows as Array<Record<string, unknown>>)
-            .map(r => `• [${r.type}] ${String(r.content).slice(0, 100)} (${new Date(r.created_at as string).toLocaleString()})`)
-          return [
-            `Outreach log (last 10):\n${outreachLines.join('\n') || '  (none)'}`,
-            `\nRecent proactive worklog (last 10):\n${wlLines.join('\n') || '  (none)'}`,
-          ].join('\n')
-        } catch (e) {
-          return `get_outreach_status error: ${String(e)}`
-        }
-      }
-
-      case 'self_diagnose': {
-        const internalSecret = process.env.SPARKIE_INTERNAL_SECRET
-
-        // Run all checks in parallel with a 15s overall timeout
-        const diagnosisPromise = (async () => {
-          // 1. Auth — sync env var checks
-          const authChecks = [
-            { name: 'SPARKIE_INTERNAL_SECRET', status: internalSecret ? 'ok' as const : 'fail' as const, detail: internalSecret ? 'set' : 'MISSING — all internal API calls will 401' },
-            { name: 'MINIMAX_API_KEY', status: process.env.MINIMAX_API_KEY ? 'ok' as const : 'fail' as const, detail: process.env.MINIMAX_API_KEY ? 'set' : 'MISSING — build/chat broken' },
-            { name: 'COMPOSIO_API_KEY', status: process.env.COMPOSIO_API_KEY ? 'ok' as const : 'warn' as const, detail: process.env.COMPOSIO_API_KEY ? 'set' : 'not set — Gmail/Calendar/tools disabled' },
-            { name: 'SUPERMEMORY_API_KEY', status: process.env.SUPERMEMORY_API_KEY ? 'ok' as const : 'warn' as const, detail: process.env.SUPERMEMORY_API_KEY ? 'set' : 'not set — Supermemory disabled' },
-            { name: 'E2B_API_KEY', status: process.env.E2B_API_KEY ? 'ok' as const : 'fail' as const, detail: process.env.E2B_API_KEY ? 'set' : 'MISSING — execute_terminal/grep_codebase/find_file will return 500. Fallback: use get_github for file reads, query_database for data.' },
-            { name: 'MIGRATE_SECRET', status: process.env.MIGRATE_SECRET ? 'ok' as const : 'warn' as const, detail: process.env.MIGRATE_SECRET ? 'set' : 'not set — skill bootstrap disabled' },
-          ]
-
-          // 2–4: DB checks run in parallel
-          const [skillsResult, taskCountResult, realScoreResult] = await Promise.all([
-            (async () => {
-              try {
-                const r = await query(`SELECT COUNT(*) as cnt FROM sparkie_skills`).catch(() => ({ rows: [{ cnt: '0' }] }))
-                const cnt = parseInt(String((r.rows[0] as Record<string,unknown>)?.cnt ?? '0'))
-                return { name: 'skills_seeded', status: cnt >= 8 ? 'ok' as const : 'warn' as const, detail: `${cnt} skills in DB (expect ≥8)` }
-              } catch (e) { return { name: 'skills_seeded', status: 'fail' as const, detail: String(e) } }
-            })(),
-            userId ? (async () => {
-              try {
-                const r = await query(`SELECT COUNT(*) as cnt FROM sparkie_tasks WHERE user_id = $1 AND status = 'pending'`, [userId]).catch(() => ({ rows: [{ cnt: '0' }] }))
-                const cnt = parseInt(String((r.rows[0] as Record<string,unknown>)?.cnt ?? '0'))
-                return { name: 'pending_tasks', status: 'ok' as const, detail: `${cnt} task(s) pending` }
-              } catch (e) { return { name: 'pending_tasks', status: 'warn' as const, detail: String(e) } }
-            })() : Promise.resolve({ name: 'pending_tasks', status: 'ok' as const, detail: 'no userId' }),
-            userId ? (async () => {
-              try {
-                // Call the /api/real-score endpoint so REAL score matches the UI exactly
-                const realScoreRes = await fetch(`${baseUrl}/api/real-score`, {
-                  headers: { cookie: cookieHeader },
-                  signal: AbortSignal.timeout(10000),
-                }).catch(() => null)
-                if (realScoreRes?.ok) {
-                  const realData = await realScoreRes.json() as { total: number; legs: Array<{ id: string; label: string; score: number; signal: string }> }
-                  const r = realData
-                  const detail = `total=${r.total} ` + r.legs.map(l => `${l.id}=${l.score}`).join(' ')
-                  return { name: 'REAL_score', status: r.total >= 70 ? 'ok' as const : r.total >= 40 ? 'warn' as const : 'fail' as const, detail }
-                }
-                return { name: 'REAL_score', status: 'warn' as const, detail: 'could not reach /api/real-score endpoint' }
-              } catch (e) { return { name: 'REAL_score', status: 'warn' as const, detail: String(e) } }
-            })() : Promise.resolve({ name: 'REAL_score', status: 'ok' as const, detail: 'no userId' }),
-          ])
-
-          // 5. Deploy status — HTTP with 15s timeout
-          let deployCheck: { name: string; status: 'ok' | 'warn' | 'fail'; detail: string } = { name: 'deployment', status: 'warn', detail: 'timeout' }
-          try {
-            const depRes = await fetch(`${baseUrl}/api/admin/deploy`, {
-              headers: { 'x-internal-secret': internalSecret ?? '' },
-              signal: AbortSignal.timeout(15000),
-            }).catch(() => null)
-            if (depRes?.ok) {
-              const depData = await depRes.json() as { active_deployment?: { phase?: string } }
-              const phase = depData?.active_deployment?.phase ?? 'UNKNOWN'
-              deployCheck = { name: 'deployment', status: phase === 'ACTIVE' ? 'ok' : ['BUILDING','DEPLOYING','PENDING_BUILD'].includes(phase) ? 'warn' : 'fail', detail: `phase=${phase}` }
-            } else if (depRes === null) {
-              deployCheck = { name: 'deployment', status: 'warn', detail: `unreachable — DO proxy may be blocking WebSocket/internal calls` }
-            } else {
-              deployCheck = { name: 'deployment', status: 'warn', detail: `endpoint returned ${depRes?.status}` }
-            }
-          } catch (e) { deployCheck = { name: 'deployment', status: 'warn', detail: `error — ${String(e).slice(0, 80)}` } }
-
-          return [authChecks, skillsResult, taskCountResult, realScoreResult, deployCheck].flat() as Array<{ name: string; status: 'ok' | 'warn' | 'fail'; detail: string }>
-        })()
-
-        // 15s overall timeout for the entire diagnosis
-        const checks = await Promise.race([
-          diagnosisPromise,
-          new Promise<Array<{ name: string; status: 'ok' | 'warn' | 'fail'; detail: string }>>((resolve) =>
-            setTimeout(() => resolve([{ name: 'self_diagnose', status: 'warn' as const, detail: 'timed out after 15s — some checks could not complete' }]), 15000)
-          ),
-        ])
-
-        const okCount = checks.filter(c => c.status === 'ok').length
-        const warnCount = checks.filter(c => c.status === 'warn').length
-        const failCount = checks.filter(c => c.status === 'fail').length
-
-        const icons = { ok: '✅', warn: '⚠️', fail: '🚨' } as const
-        const lines = checks.map(c => `${icons[c.status]} **${c.name}**: ${c.detail}`)
-        const summary = `Self-diagnosis: ${okCount} OK, ${warnCount} warnings, ${failCount} failures\n\n${lines.join('\n')}`
-
-        if (userId) {
-          // Write a summary entry + one entry per non-ok check for detailed audit trail
-          writeWorklog(userId, 'self_assessment', `Self-diagnosis: ${okCount}✅ ${warnCount}⚠️ ${failCount}🚨`, { decision_type: 'action', conclusion: `Self-diagnosis complete — ${okCount} checks passed, ${warnCount} warnings, ${failCount} failure(s)` }).catch(() => {})
-          // Per-check entries for warn/fail so findings are visible in worklog
-          for (const check of checks) {
-            if (check.status !== 'ok') {
-              writeWorklog(userId, 'self_assessment', `${icons[check.status]} ${check.name}: ${check.detail}`, { decision_type: 'action', conclusion: `${check.name} — ${check.status}: ${check.detail}` }).catch(() => {})
-            }
-          }
-        }
-        return summary
-      }
-
       // ── Terminal shortcut shims — delegate to execute_terminal internally ──
-      case 'list_directory': {
-        const dirPath = args.path as string | undefined
-        if (!dirPath) return 'path is required for list_directory'
-        const createRes = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'create' }),
-          signal: AbortSignal.timeout(15000),
-        })
-        if (!createRes.ok) return `Terminal create failed: ${createRes.status}`
-        const { sessionId: ldSessId } = await createRes.json() as { sessionId: string }
-        await new Promise(r => setTimeout(r, 800))
-        const inputRes = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'input', sessionId: ldSessId, data: `ls -la ${dirPath} 2>&1 && echo "---DONE---"\n` }),
-          signal: AbortSignal.timeout(15000),
-        })
-        if (!inputRes.ok) return `Terminal input failed: ${inputRes.status}`
-        // Wait for output to accumulate in logBuffer, then poll logs
-        await new Promise(r => setTimeout(r, 1500))
-        const logsRes = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(ldSessId)}`, {
-          signal: AbortSignal.timeout(10000),
-        })
-        const { logs: ldLogs } = await logsRes.json() as { logs: string[] }
-        const ldResult = ldLogs.join('').split('---DONE---')[0].trim()
-        return ldResult || 'No output from list_directory'
-      }
-
-      case 'find_file': {
-        const pattern = args.pattern as string | undefined
-        if (!pattern) return 'pattern is required for find_file'
-        const createRes2 = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'create' }),
-          signal: AbortSignal.timeout(15000),
-        })
-        if (!createRes2.ok) return `Terminal create failed: ${createRes2.status}`
-        const { sessionId: ffSessId } = await createRes2.json() as { sessionId: string }
-        await new Promise(r => setTimeout(r, 800))
-        const inputRes2 = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'input', sessionId: ffSessId, data: `find / -name "${pattern}" 2>/dev/null | head -20 && echo "---DONE---"\n` }),
-          signal: AbortSignal.timeout(20000),
-        })
-        if (!inputRes2.ok) return `Terminal input failed: ${inputRes2.status}`
-        await new Promise(r => setTimeout(r, 2000))
-        const logsRes2 = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(ffSessId)}`, {
-          signal: AbortSignal.timeout(10000),
-        })
-        const { logs: ffLogs } = await logsRes2.json() as { logs: string[] }
-        const ffResult = ffLogs.join('').split('---DONE---')[0].trim()
-        return ffResult || 'No files found matching pattern'
-      }
-
-      case 'grep_codebase': {
-        const grepPattern = args.pattern as string | undefined
-        const fileType = args.fileType as string | undefined
-        if (!grepPattern) return 'pattern is required for grep_codebase'
-        const includeFlag = fileType ? `--include="*.${fileType}"` : ''
-        const createRes3 = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'create' }),
-          signal: AbortSignal.timeout(15000),
-        })
-        if (!createRes3.ok) return `Terminal create failed: ${createRes3.status}`
-        const { sessionId: gcSessId } = await createRes3.json() as { sessionId: string }
-        await new Promise(r => setTimeout(r, 800))
-        const inputRes3 = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'input', sessionId: gcSessId, data: `grep -r "${grepPattern}" /workspace ${includeFlag} -l 2>/dev/null | head -20 && echo "---DONE---"\n` }),
-          signal: AbortSignal.timeout(20000),
-        })
-        if (!inputRes3.ok) return `Terminal input failed: ${inputRes3.status}`
-        await new Promise(r => setTimeout(r, 2000))
-        const logsRes3 = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(gcSessId)}`, {
-          signal: AbortSignal.timeout(10000),
-        })
-        const { logs: gcLogs } = await logsRes3.json() as { logs: string[] }
-        const gcResult = gcLogs.join('').split('---DONE---')[0].trim()
-        return gcResult || `No matches found for pattern: ${grepPattern}`
-      }
-
       // ── Process management tools (delegate to E2B sandbox) ──────────────────
-      case 'list_processes': {
-        const limit = (args.limit as number) ?? 20
-        const createRes = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'create' }),
-          signal: AbortSignal.timeout(15000),
-        })
-        if (!createRes.ok) return `Terminal create failed: ${createRes.status}`
-        const { sessionId: lpSessId } = await createRes.json() as { sessionId: string }
-        await new Promise(r => setTimeout(r, 800))
-        const inputRes = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'input', sessionId: lpSessId, data: `ps aux --no-headers 2>/dev/null | head -${limit} && echo "---DONE---"\n` }),
-          signal: AbortSignal.timeout(15000),
-        })
-        if (!inputRes.ok) return `Terminal input failed: ${inputRes.status}`
-        await new Promise(r => setTimeout(r, 1200))
-        const logsRes = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(lpSessId)}`, {
-          signal: AbortSignal.timeout(10000),
-        })
-        const { logs: lpLogs } = await logsRes.json() as { logs: string[] }
-        const lpResult = lpLogs.join('').split('---DONE---')[0].trim()
-        if (!lpResult) return 'No processes found'
-        // Parse ps output into a readable table
-        const lines = lpResult.split('\n').filter(Boolean)
-        const header = 'USER       PID     %CPU   %MEM    VSZ       RSS TTY   STAT START   TIME COMMAND'
-        const rows = lines.map(l => {
-          const parts = l.trim().split(/\s+/)
-          if (parts.length < 11) return l
-          return `${parts[0]?.padEnd(8)} ${parts[1]?.padStart(5)} ${(parts[2] ?? '0').padStart(4)}% ${(parts[3] ?? '0').padStart(4)}% ${(parts[4] ?? '0').padStart(7)} ${(parts[5] ?? '0').padStart(6)} ${(parts[6] ?? '?').padStart(4)} ${parts[7] ?? '?'} ${parts[8] ?? '??'} ${parts[9] ?? '??'}  ${parts.slice(10).join(' ')}`
-        })
-        return `Running processes:\n${header}\n${rows.join('\n')}`
-      }
-
-      case 'kill_process': {
-        const pid = args.pid as number | undefined
-        if (!pid) return 'kill_process: pid is required'
-        const signal = (args.signal as string) ?? 'TERM'
-        const createRes = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'create' }),
-          signal: AbortSignal.timeout(15000),
-        })
-        if (!createRes.ok) return `Terminal create failed: ${createRes.status}`
-        const { sessionId: kpSessId } = await createRes.json() as { sessionId: string }
-        await new Promise(r => setTimeout(r, 800))
-        const inputRes = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'input', sessionId: kpSessId, data: `kill -${signal} ${pid} 2>&1 && echo "---DONE---"\n` }),
-          signal: AbortSignal.timeout(10000),
-        })
-        if (!inputRes.ok) return `Terminal input failed: ${inputRes.status}`
-        await new Promise(r => setTimeout(r, 1200))
-        const logsRes = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(kpSessId)}`, {
-          signal: AbortSignal.timeout(10000),
-        })
-        const { logs: kpLogs } = await logsRes.json() as { logs: string[] }
-        const kpResult = kpLogs.join('').split('---DONE---')[0].trim()
-        return kpResult || `Signal ${signal} sent to PID ${pid}`
-      }
-
-      case 'process_info': {
-        const pid = (args.pid as number) ?? 1
-        const createRes = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'create' }),
-          signal: AbortSignal.timeout(15000),
-        })
-        if (!createRes.ok) return `Terminal create failed: ${createRes.status}`
-        const { sessionId: piSessId } = await createRes.json() as { sessionId: string }
-        await new Promise(r => setTimeout(r, 800))
-        const inputRes = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'input', sessionId: piSessId, data: `echo "=== Process ${pid} ===" && cat /proc/${pid}/status 2>/dev/null | grep -E "^(Name|Pid|PPid|State|Threads|VmSize|VmRSS|MemRss)" && echo "=== cmdline ===" && cat /proc/${pid}/cmdline 2>/dev/null | tr "\\0" " " && echo "" && echo "=== open files ===" && ls -la /proc/${pid}/fd 2>/dev/null | head -10 && echo "---DONE---"\n` }),
-          signal: AbortSignal.timeout(15000),
-        })
-        if (!inputRes.ok) return `Terminal input failed: ${inputRes.status}`
-        await new Promise(r => setTimeout(r, 2000))
-        const logsRes = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(piSessId)}`, {
-          signal: AbortSignal.timeout(10000),
-        })
-        const { logs: piLogs } = await logsRes.json() as { logs: string[] }
-        const piResult = piLogs.join('').split('---DONE---')[0].trim()
-        return piResult || `No process info for PID ${pid}`
-      }
-
-      case 'system_info': {
-        const createRes = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'create' }),
-          signal: AbortSignal.timeout(15000),
-        })
-        if (!createRes.ok) return `Terminal create failed: ${createRes.status}`
-        const { sessionId: siSessId } = await createRes.json() as { sessionId: string }
-        await new Promise(r => setTimeout(r, 800))
-        const inputRes = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'input', sessionId: siSessId, data: `echo "=== System Info ===" && echo "Hostname: $(hostname)" && echo "Uptime: $(uptime -p 2>/dev/null || uptime)" && echo "Load avg: $(cat /proc/loadavg 2>/dev/null | awk '{print $1, $2, $3}')" && echo "" && echo "=== Memory ===" && free -h 2>/dev/null && echo "" && echo "=== Disk ===" && df -h / 2>/dev/null && echo "" && echo "=== CPU ===" && lscpu 2>/dev/null | grep -E "^(Model name|CPU\(s\)|Architecture|CPU MHz|CPU min|CPU max)" && echo "---DONE---"\n` }),
-          signal: AbortSignal.timeout(20000),
-        })
-        if (!inputRes.ok) return `Terminal input failed: ${inputRes.status}`
-        await new Promise(r => setTimeout(r, 2500))
-        const logsRes = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(siSessId)}`, {
-          signal: AbortSignal.timeout(10000),
-        })
-        const { logs: siLogs } = await logsRes.json() as { logs: string[] }
-        const siResult = siLogs.join('').split('---DONE---')[0].trim()
-        return siResult || 'System info unavailable'
-      }
-
-      case 'pgrep': {
-        const pattern = args.pattern as string | undefined
-        if (!pattern) return 'pgrep: pattern is required'
-        const createRes = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'create' }),
-          signal: AbortSignal.timeout(15000),
-        })
-        if (!createRes.ok) return `Terminal create failed: ${createRes.status}`
-        const { sessionId: pgSessId } = await createRes.json() as { sessionId: string }
-        await new Promise(r => setTimeout(r, 800))
-        const inputRes = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'input', sessionId: pgSessId, data: `pgrep -af "${pattern.replace(/"/g, '\\"')}" 2>/dev/null && echo "---DONE---"\n` }),
-          signal: AbortSignal.timeout(10000),
-        })
-        if (!inputRes.ok) return `Terminal input failed: ${inputRes.status}`
-        await new Promise(r => setTimeout(r, 1200))
-        const logsRes = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(pgSessId)}`, {
-          signal: AbortSignal.timeout(10000),
-        })
-        const { logs: pgLogs } = await logsRes.json() as { logs: string[] }
-        const pgResult = pgLogs.join('').split('---DONE---')[0].trim()
-        return pgResult || `No processes matching: ${pattern}`
-      }
-
-      case 'netstat_info': {
-        const createRes = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'create' }),
-          signal: AbortSignal.timeout(15000),
-        })
-        if (!createRes.ok) return `Terminal create failed: ${createRes.status}`
-        const { sessionId: niSessId } = await createRes.json() as { sessionId: string }
-        await new Promise(r => setTimeout(r, 800))
-        const inputRes = await fetch(`${baseUrl}/api/terminal`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
-          body: JSON.stringify({ action: 'input', sessionId: niSessId, data: `echo "=== Network Connections ===" && (netstat -tulnp 2>/dev/null || ss -tulnp 2>/dev/null) && echo "" && echo "=== Listening Ports ===" && ss -tlnp 2>/dev/null | head -20 && echo "---DONE---"\n` }),
-          signal: AbortSignal.timeout(15000),
-        })
-        if (!inputRes.ok) return `Terminal input failed: ${inputRes.status}`
-        await new Promise(r => setTimeout(r, 2000))
-        const logsRes = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(niSessId)}`, {
-          signal: AbortSignal.timeout(10000),
-        })
-        const { logs: niLogs } = await logsRes.json() as { logs: string[] }
-        const niResult = niLogs.join('').split('---DONE---')[0].trim()
-        return niResult || 'Network info unavailable'
-      }
-
       default: {
-        const s2result = await executeSprint2Tool(name, args, userId)
-        if (s2result !== null) return s2result
-        const s3result = await executeSprint3Tool(name, args, userId, baseUrl)
-        if (s3result !== null) return s3result
-        const s4result = await executeSprint4Tool(name, args, userId, baseUrl, executeConnectorTool)
-        if (s4result !== null) return s4result
-        const composioApiKeyS5 = process.env.COMPOSIO_API_KEY ?? ''
-        const s5result = await executeSprint5Tool(name, args, userId, baseUrl, executeConnectorTool, composioApiKeyS5)
-        if (s5result !== null) return s5result
+        // Sprint tools: one lookup in the generated table (gen_tool_dispatch.py)
+        const sprintHandler = SPRINT_TOOL_HANDLERS.get(name)
+        if (sprintHandler) {
+          const sprintResult = await sprintHandler(name, args, {
+            userId, baseUrl, executeConnectorTool, composioApiKey: process.env.COMPOSIO_API_KEY ?? '',
+          })
+          if (sprintResult !== null) return sprintResult
+        }
         if (userId) {
           return await executeConnectorTool(name, args, userId)
         }
@@ -6503,18 +4103,17 @@ async function getUserConnectorTools(userId: string): Promise<Array<{
   type: string
   function: { name: string; description: string; parameters: Record<string, unknown> }
 }>> {
-  const cached = _ctCache.get(userId)
-  if (cached && cached.expiresAt > Date.now()) return cached.tools
-  try {
-    const apiKey = process.env.COMPOSIO_API_KEY
-    if (!apiKey) return []
+  const apiKey = process.env.COMPOSIO_API_KEY
+  if (!apiKey) return []
+  // Failures are not cached, so the next request retries Composio
+  return _ctCache.getOrLoad(userId, async () => {
     const entityId = 'sparkie_user_' + userId
     // Use v3 API for connected accounts (v1 only returns user-created integrations)
     const res = await fetch(
       'https://backend.composio.dev/api/v3/connected_accounts?user_id=' + entityId + '&status=ACTIVE',
       { headers: { 'x-api-key': apiKey }, signal: AbortSignal.timeout(5000) }
     )
-    if (!res.ok) return []
+    if (!res.ok) throw new Error(`Composio connected_accounts ${res.status}`)
     const data = await res.json() as { items?: Array<{ toolkitSlug?: string; appName?: string; status: string }> }
     const activeApps = (data.items ?? [])
       .map(c => (c.toolkitSlug ?? c.appName ?? '').toLowerCase())
@@ -6537,9 +4136,8 @@ async function getUserConnectorTools(userId: string): Promise<Array<{
         }
       }
     }
-    _ctCache.set(userId, { tools, expiresAt: Date.now() + 2 * 60 * 1000 })
     return tools
-  } catch { return [] }
+  }).catch(() => [])
 }
 
 // Tools that must go through HITL (create_task) — never execute directly
@@ -6823,7 +4421,7 @@ async function handleBuildMode(
         }
 
         // MiniMax Anthropic-compatible endpoint — returns structured tool_use blocks (no XML parsing needed)
-        const ANTHROPIC_ENDPOINT = 'https://api.minimax.io/anthropic/v1/messages'
+        const ANTHROPIC_ENDPOINT = `${MINIMAX_ORIGIN}/anthropic/v1/messages`
         const buildBaseUrl = process.env.NEXTAUTH_URL || process.env.APP_DOMAIN || 'https://sparkie-studio-mhouq.ondigitalocean.app'
         const WRITE_FILE_TOOL = {
           name: 'write_file',
@@ -7191,7 +4789,7 @@ async function tryLLMCall(
   // Do NOT transform parameters → input_schema. MiniMax expects OpenAI format: parameters (not input_schema).
   // Error 2013 "parameters is empty" means MiniMax validates the 'parameters' field directly.
   console.log(`[tryLLMCall] → messages=${msgs?.length ?? 0} tools=${rawTools?.length ?? 0} firstMsg=${msgs?.[0]?.role ?? '?'}`)
-  const res = await fetch('https://api.minimax.io/v1/chat/completions', {
+  const res = await fetch(`${MINIMAX_BASE}/chat/completions`, {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
@@ -7248,36 +4846,31 @@ async function findBadTool(
 
 // ── Simple in-memory rate limiter (30 req/min per user) ──────────────────────
 // ── Search result cache — avoid duplicate Tavily hits within 60s ──────────────
-const _searchCache = new Map<string, { result: string; expiresAt: number }>()
+const _searchCache = new LruCache<string, string>({ name: 'chat.search', maxEntries: 50, ttlMs: 60_000 })
 function getCachedSearch(query: string): string | null {
-  const entry = _searchCache.get(query)
-  if (!entry || entry.expiresAt < Date.now()) { _searchCache.delete(query); return null }
-  return entry.result
+  return _searchCache.get(query) ?? null
 }
 function setCachedSearch(query: string, result: string): void {
-  // Cap cache size at 50 entries — evict oldest
-  if (_searchCache.size >= 50) {
-    const oldest = [..._searchCache.entries()].sort((a,b) => a[1].expiresAt - b[1].expiresAt)[0]
-    if (oldest) _searchCache.delete(oldest[0])
-  }
-  _searchCache.set(query, { result, expiresAt: Date.now() + 60_000 })
+  _searchCache.set(query, result)
 }
 
 // ── Connector-tools TTL cache — avoids live Composio API call on every request ──
+// Invalidated across instances over NOTIFY (lib/cacheBus), so the TTL only bounds
+// staleness if the listener is down. SQL memory caches live in lib/memoryRetrieval.
 // eslint-disable-next-line @typescript-eslint/no-explicit-any
-const _ctCache = new Map<string, { tools: any[]; expiresAt: number }>()
-const _memCache = new Map<string, { text: string; expiresAt: number }>()
+const _ctCache = new LruCache<string, any[]>({ name: 'chat.connectorTools', maxEntries: 1000, ttlMs: 30 * 60 * 1000, maxBytes: 8 * 1024 * 1024 })
+onInvalidation('connectors', uid => { if (uid === '*') _ctCache.clear(); else _ctCache.delete(uid) })
 
-const _rlMap = new Map<string, { count: number; resetAt: number }>()
+// Fixed 60s window per key; an entry expiring starts a fresh window
+const _rlMap = new LruCache<string, { count: number }>({ name: 'chat.rateLimit', maxEntries: 10_000, ttlMs: 60_000 })
 
 // ── Session-level abort: kill previous in-flight request when same user sends new one ──
 // Prevents two parallel responses competing for the same SSE stream
 const _activeAbortMap = new Map<string, AbortController>()
 function checkRateLimit(key: string): boolean {
-  const now = Date.now()
   const entry = _rlMap.get(key)
-  if (!entry || entry.resetAt < now) {
-    _rlMap.set(key, { count: 1, resetAt: now + 60_000 })
+  if (!entry) {
+    _rlMap.set(key, { count: 1 })
     return true
   }
   if (entry.count >= 60) return false
@@ -7286,9 +4879,13 @@ function checkRateLimit(key: string): boolean {
 }
 
 export async function POST(req: NextRequest) {
+  // Per-stage latency: Server-Timing header, rolling p50/p95 in /api/health?detail=1,
+  // and a `timing` SSE event at the end of the stream when the body asks for it
+  const timer = new StageTimer()
   try {
-    const body = await req.json()
+    const body = await timer.time('parse', req.json())
     const { messages, model: _clientModel, userProfile, voiceMode, mode } = body
+    const emitTiming = body.timing === true
     // BUILD vs CHAT — one server-side decision point
     const latestUserMsg = messages.filter((m: { role: string }) => m.role === 'user').slice(-1)[0]?.content ?? ''
     const lower = latestUserMsg.toLowerCase()
@@ -7328,7 +4925,7 @@ export async function POST(req: NextRequest) {
       !!internalUserId &&
       internalReqSecret === internalSecret
 
-    const session = isInternalCall ? null : await getServerSession(authOptions)
+    const session = isInternalCall ? null : await timer.time('session', getServerSession(authOptions))
     const userId = isInternalCall
       ? internalUserId
       : (session?.user as { id?: string } | undefined)?.id ?? null
@@ -7336,9 +4933,12 @@ export async function POST(req: NextRequest) {
     // Rate limit: 30 req/min per user (non-internal)
     if (!isInternalCall) {
       const rlKey = userId ?? req.headers.get('x-forwarded-for') ?? 'anon'
-      if (!checkRateLimit(rlKey)) {
+      const stopRateLimit = timer.start('rate_limit')
+      const allowed = checkRateLimit(rlKey)
+      stopRateLimit()
+      if (!allowed) {
         return new Response(JSON.stringify({ error: 'Rate limit exceeded — please wait a moment.' }), {
-          status: 429, headers: { 'Content-Type': 'application/json', 'Retry-After': '60' },
+          status: 429, headers: { 'Content-Type': 'application/json', 'Retry-After': '60', 'Server-Timing': timer.serverTiming() },
         })
       }
     }
@@ -7370,16 +4970,20 @@ export async function POST(req: NextRequest) {
     const tavilyKey = process.env.TAVILY_API_KEY
 
     // Load user's connected app tools in parallel with system prompt build
-    const connectorToolsPromise = userId ? getUserConnectorTools(userId) : Promise.resolve([])
+    const connectorToolsPromise = userId ? timer.time('connectors', getUserConnectorTools(userId)) : Promise.resolve([])
 
     // ── Build system prompt ─────────────────────────────────────────────────
+    // Segments are tagged by how often they change and emitted most-stable first
+    // (promptPrefix.ts), so consecutive turns share a cacheable prefix upstream.
     // Inject IDENTITY.md (spiritual encoding, master brief from SureThing AI).
     // Skipped on conversational tier to keep quick chats fast and cheap.
-    let systemContent = SYSTEM_PROMPT
+    const prompt = new PromptBuilder().add('static', SYSTEM_PROMPT)
     if (_IDENTITY_MD && !isBuild) {
-      systemContent += '\n\n---\n## IAMSPARKIE⚡ — IDENTITY.md\n' + _IDENTITY_MD
+      prompt.add('static', '\n\n---\n## IAMSPARKIE⚡ — IDENTITY.md\n' + _IDENTITY_MD)
     }
     let shouldBrief = false
+    // `prompt` covers assembly after the context fan-out: connectors, attempts, topics, blocks
+    let stopPrompt = timer.start('prompt')
     // Hoisted so L2 rule evaluation inside the tool execution loop can access loaded rules
     let _sessionRules: Array<{ id: string; condition: string; action: string; active: boolean }> = []
 
@@ -7387,25 +4991,23 @@ export async function POST(req: NextRequest) {
       // Record user activity for presence/autonomy model
       recordUserActivity(userId).catch(() => {})
 
-      const [memoriesText, awareness, identityFiles, envCtx, sessionSnapshot, readyIntents, userModel, activeGoals, behaviorRules, recentReflections] = await Promise.all([
+      // Each branch is timed on its own (ctx_*); `context` is the whole fan-out
+      const [memoriesText, awareness, identityFiles, envCtx, sessionSnapshot, readyIntents, userModel, activeGoals, behaviorRules, recentReflections] = await timer.time('context', Promise.all([
         (() => {
-          const _mce = _memCache.get(userId)
-          if (_mce && _mce.expiresAt > Date.now()) return Promise.resolve(_mce.text)
-          return loadMemories(userId, messages.filter((m: { role: string; content: string }) => m.role === 'user').at(-1)?.content?.slice(0, 200)).then(t => {
-            _memCache.set(userId, { text: t, expiresAt: Date.now() + 30_000 })
-            return t
-          })
+          const memQuery = messages.filter((m: { role: string; content: string }) => m.role === 'user').at(-1)?.content?.slice(0, 200)
+          return timer.time('ctx_memories', loadMemories(userId, memQuery))
         })(),
-        getAwareness(userId),
-        isBuild ? Promise.resolve({ user: '', memory: '', session: '', heartbeat: '', context: '', actions: '', snapshot: '' } as IdentityFiles) : loadIdentityFiles(userId),
-        isBuild ? Promise.resolve(null) : buildEnvironmentalContext(userId),
-        isBuild ? Promise.resolve(null) : readSessionSnapshot(userId),
-        isBuild ? Promise.resolve([] as Awaited<ReturnType<typeof loadReadyDeferredIntents>>) : loadReadyDeferredIntents(userId),
-        isBuild ? Promise.resolve(null) : getUserModel(userId),
-        isBuild ? Promise.resolve([]) : loadActiveGoals(5),
-        isBuild ? Promise.resolve([]) : listBehaviorRules(true),
-        isBuild ? Promise.resolve([]) : getRecentReflections(3),
-      ])
+        timer.time('ctx_awareness', getAwareness(userId)),
+        isBuild ? Promise.resolve({ user: '', memory: '', session: '', heartbeat: '', context: '', actions: '', snapshot: '' } as IdentityFiles) : timer.time('ctx_identity', loadIdentityFiles(userId)),
+        isBuild ? Promise.resolve(null) : timer.time('ctx_environment', buildEnvironmentalContext(userId)),
+        isBuild ? Promise.resolve(null) : timer.time('ctx_snapshot', readSessionSnapshot(userId)),
+        isBuild ? Promise.resolve([] as Awaited<ReturnType<typeof loadReadyDeferredIntents>>) : timer.time('ctx_intents', loadReadyDeferredIntents(userId)),
+        isBuild ? Promise.resolve(null) : timer.time('ctx_user_model', getUserModel(userId)),
+        isBuild ? Promise.resolve([]) : timer.time('ctx_goals', loadActiveGoals(5)),
+        isBuild ? Promise.resolve([]) : timer.time('ctx_rules', listBehaviorRules(true)),
+        isBuild ? Promise.resolve([]) : timer.time('ctx_reflections', getRecentReflections(3)),
+      ]))
+      stopPrompt = timer.start('prompt')
       shouldBrief = awareness.shouldBrief && messages.length <= 2 // Only brief on session open
 
       // L4: Detect emotional state from latest message
@@ -7413,65 +5015,64 @@ export async function POST(req: NextRequest) {
       if (lastUserContent && !isBuild) {
         const emotionalState = detectEmotionalState(lastUserContent, new Date().getHours())
         const emotionalBlock = formatEmotionalStateBlock(emotionalState)
-        if (emotionalBlock) systemContent += emotionalBlock
+        if (emotionalBlock) prompt.add('turn', emotionalBlock)
       }
 
       // Tick sessions-without-progress counter for goal staleness tracking (fire-and-forget)
       tickSessionsWithoutProgress().catch(() => {})
 
       if (memoriesText) {
-        systemContent += `\n\n## YOUR MEMORY ABOUT THIS PERSON\n${memoriesText}\n\nYour memory has three dimensions — use each appropriately:\n- **Facts**: Names, projects, deadlines, key details — reference when relevant\n- **Preferences**: Their voice, style, tone — shape how you communicate\n- **Procedures**: Execution paths that worked before — reuse them for similar tasks\n\nWeave memory in naturally. Don't recite it.`
+        prompt.add('session', `\n\n## YOUR MEMORY ABOUT THIS PERSON\n${memoriesText}\n\nYour memory has three dimensions — use each appropriately:\n- **Facts**: Names, projects, deadlines, key details — reference when relevant\n- **Preferences**: Their voice, style, tone — shape how you communicate\n- **Procedures**: Execution paths that worked before — reuse them for similar tasks\n\nWeave memory in naturally. Don't recite it.`)
       }
 
-      // Inject structured identity files (USER / MEMORY / SESSION / HEARTBEAT)
-      const identityBlock = buildIdentityBlock(identityFiles, session?.user?.name ?? undefined)
-      if (identityBlock) {
-        systemContent += identityBlock
-      }
+      // Inject structured identity files — USER / MEMORY / HEARTBEAT rarely change,
+      // live state / actions / snapshot / SESSION are rewritten every session
+      prompt.add('user', buildIdentityBlock(identityFiles, session?.user?.name ?? undefined, 'stable'))
+      prompt.add('session', buildIdentityBlock(identityFiles, undefined, 'live'))
 
-      systemContent += `\n\n## RIGHT NOW\n- Time of day: ${awareness.timeLabel}\n- Sessions together: ${awareness.sessionCount}\n- Days since last visit: ${awareness.daysSince === 0 ? 'same day' : `${awareness.daysSince} day${awareness.daysSince === 1 ? '' : 's'} ago`}`
+      prompt.add('turn', `\n\n## RIGHT NOW\n- Time of day: ${awareness.timeLabel}\n- Sessions together: ${awareness.sessionCount}\n- Days since last visit: ${awareness.daysSince === 0 ? 'same day' : `${awareness.daysSince} day${awareness.daysSince === 1 ? '' : 's'} ago`}`)
 
       // Inject environmental context
-      if (envCtx) { systemContent += '\n\n' + formatEnvContextBlock(envCtx) }
+      if (envCtx) prompt.add('turn', '\n\n' + formatEnvContextBlock(envCtx))
 
       // Inject behavioral user model (Phase 3)
       if (userModel && userModel.sessionCount >= 5) {
-        systemContent += formatUserModelBlock(userModel)
+        prompt.add('session', formatUserModelBlock(userModel))
       }
 
       // L5: Inject persistent goals (open agenda)
       if (activeGoals && activeGoals.length > 0) {
-        systemContent += formatGoalsBlock(activeGoals)
+        prompt.add('session', formatGoalsBlock(activeGoals))
       }
 
       // L2: Inject self-authored behavior rules
       if (behaviorRules && behaviorRules.length > 0) {
-        systemContent += formatBehaviorRulesBlock(behaviorRules)
+        prompt.add('session', formatBehaviorRulesBlock(behaviorRules))
         _sessionRules = behaviorRules.map(r => ({ id: r.id, condition: r.condition, action: r.action, active: r.active }))
       }
 
       // L7: Inject recent self-reflections — Sparkie knows herself
       if (recentReflections && recentReflections.length > 0) {
-        systemContent += formatSelfReflectionBlock(recentReflections)
+        prompt.add('user', formatSelfReflectionBlock(recentReflections))
       }
 
       // getProjectContext skipped — not used in system prompt (perf fix)
 
       // Inject session snapshot for continuity (if recent session exists and this looks like continuation)
       if (sessionSnapshot && messages.length <= 3) {
-        systemContent += `\n\n## LAST SESSION\nWhere you left off: ${sessionSnapshot.slice(0, 600)}`
+        prompt.add('session', `\n\n## LAST SESSION\nWhere you left off: ${sessionSnapshot.slice(0, 600)}`)
       }
 
       // Surface any ready deferred intents at session start
       if (readyIntents.length > 0 && messages.length <= 2) {
         const intentList = readyIntents.map((i: { id: string; intent: string }) => `- ${i.intent}`).join('\n')
-        systemContent += `\n\n## DEFERRED INTENTS — READY TO SURFACE\nThings mentioned in passing that are now due. Mention naturally if relevant:\n${intentList}`
+        prompt.add('turn', `\n\n## DEFERRED INTENTS — READY TO SURFACE\nThings mentioned in passing that are now due. Mention naturally if relevant:\n${intentList}`)
         // Mark them as surfaced
         readyIntents.forEach((i: { id: string }) => markDeferredIntentSurfaced(i.id).catch(() => {}))
       }
 
       if (shouldBrief) {
-        systemContent += `\n\n## THIS IS A RETURN VISIT — GIVE THE BRIEF
+        prompt.add('turn', `\n\n## THIS IS A RETURN VISIT — GIVE THE BRIEF
 The user just opened Sparkie Studio after being away for ${awareness.daysSince === 0 ? 'part of the day' : `${awareness.daysSince} day${awareness.daysSince === 1 ? '' : 's'}`}.
 
 Give them a proper return brief — feel free to use multiple tools at once:
@@ -7481,21 +5082,26 @@ Give them a proper return brief — feel free to use multiple tools at once:
 4. One question that shows you actually care about what's going on in their life
 5. Maybe generate a quick track if the mood feels right
 
-Make it feel like walking into your friend's creative space and being genuinely greeted.`
+Make it feel like walking into your friend's creative space and being genuinely greeted.`)
       }
     }
 
     if (userProfile?.name) {
-      systemContent += `\n\n## USER CONTEXT\nName: ${userProfile.name}\n`
-      if (userProfile.role)       systemContent += `Role: ${userProfile.role}\n`
-      if (userProfile.goals)      systemContent += `Building: ${userProfile.goals}\n`
-      if (userProfile.style)      systemContent += `Style: ${userProfile.style}\n`
-      if (userProfile.experience) systemContent += `Experience: ${userProfile.experience}\n`
+      let userContext = `\n\n## USER CONTEXT\nName: ${userProfile.name}\n`
+      if (userProfile.role)       userContext += `Role: ${userProfile.role}\n`
+      if (userProfile.goals)      userContext += `Building: ${userProfile.goals}\n`
+      if (userProfile.style)      userContext += `Style: ${userProfile.style}\n`
+      if (userProfile.experience) userContext += `Experience: ${userProfile.experience}\n`
+      prompt.add('user', userContext)
     }
 
     if (voiceMode) {
-      systemContent += `\n\n## ACTIVE VOICE SESSION\nLive voice conversation. Keep responses short and natural — spoken dialogue. No markdown. Max 3-4 sentences.`
+      prompt.add('user', `\n\n## ACTIVE VOICE SESSION\nLive voice conversation. Keep responses short and natural — spoken dialogue. No markdown. Max 3-4 sentences.`)
     }
+    // Prefix stability is tracked per user and prompt variant, on the final prompt only
+    // (one count per request); anonymous requests aren't tracked
+    const promptKey = userId ? `${userId}:${isBuild ? 'build' : 'chat'}:${voiceMode ? 'voice' : 'text'}` : null
+    const systemContent = prompt.assemble()
 
     // Hard cap: when conversation history is very long, only keep the last 12 messages.
     // This prevents token bloat AND avoids MiniMax 400 "function name/parameters empty" errors
@@ -7507,15 +5113,15 @@ Make it feel like walking into your friend's creative space and being genuinely
 
     // Await user's connector tools (was started in parallel with system prompt build)
     const connectorTools = await connectorToolsPromise
-    let finalSystemContent = systemContent
+    const finalPrompt = prompt.fork()
 
     // Option A: If frontend injected live connectedApps list, use it (overrides tool-derived list)
     const liveConnectedApps = (body.connectedApps) as string[] | undefined
     if (liveConnectedApps && liveConnectedApps.length > 0) {
-      finalSystemContent += `\n\n## USER'S CONNECTED APPS (live — injected at session start)\nConnected: ${liveConnectedApps.join(', ')}.\nYou have real Composio tools to act on their behalf for these apps. Never claim an app is unavailable if it's in this list.`
+      finalPrompt.add('user', `\n\n## USER'S CONNECTED APPS (live — injected at session start)\nConnected: ${liveConnectedApps.join(', ')}.\nYou have real Composio tools to act on their behalf for these apps. Never claim an app is unavailable if it's in this list.`)
     } else if (connectorTools.length > 0) {
       const connectedAppNames = [...new Set(connectorTools.map((t) => t.function.name.split('_')[0].toLowerCase()))]
-      finalSystemContent += `\n\n## USER'S CONNECTED APPS\nThis user has connected: ${connectedAppNames.join(', ')}. You have real tools to act on their behalf — read emails, post to their social, check their calendar. Use when they ask, or proactively when it would genuinely help.`
+      finalPrompt.add('user', `\n\n## USER'S CONNECTED APPS\nThis user has connected: ${connectedAppNames.join(', ')}. You have real tools to act on their behalf — read emails, post to their social, check their calendar. Use when they ask, or proactively when it would genuinely help.`)
     }
 
     // Phase 3: pre-query attempt history for domains likely touched by this message
@@ -7528,12 +5134,12 @@ Make it feel like walking into your friend's creative space and being genuinely
       /music|audio|generate.*music/i.test(lastUserContent) ? 'music_generation' : null,
     ].filter(Boolean) as string[]
     if (userId && domainHints.length > 0) {
-      const attemptBlocks = await Promise.all(
+      const attemptBlocks = await timer.time('attempts', Promise.all(
         domainHints.map((domain) => getAttempts(userId, domain, 3))
-      )
+      ))
       const allAttempts = attemptBlocks.flat()
       if (allAttempts.length > 0) {
-        finalSystemContent += formatAttemptBlock(allAttempts)
+        finalPrompt.add('turn', formatAttemptBlock(allAttempts))
       }
     }
 
@@ -7544,10 +5150,10 @@ Make it feel like walking into your friend's creative space and being genuinely
     let activeTopicRecord: { id: string; name: string; summary: string; fingerprint: string; last_state: string; last_round: number; step_count: number; cognition_state: Record<string, unknown> } | null = null
     if (userId && lastUserContent && !isBuild) {
       try {
-        const topicsRes = await query<{ id: string; name: string; summary: string; fingerprint: string; last_state: string; last_round: number; step_count: number; cognition_state: Record<string, unknown> }>(
+        const topicsRes = await timer.time('topics', query<{ id: string; name: string; summary: string; fingerprint: string; last_state: string; last_round: number; step_count: number; cognition_state: Record<string, unknown> }>(
           `SELECT id, name, summary, fingerprint, last_state, last_round, step_count, cognition_state FROM sparkie_topics WHERE user_id = $1 AND status = 'active' ORDER BY updated_at DESC LIMIT 20`,
           [userId]
-        )
+        ))
         const msgLower = lastUserContent.toLowerCase()
         for (const topic of topicsRes.rows) {
           const keywords = (topic.fingerprint ?? '').split(/\s+/).filter(k => k.length > 2)
@@ -7565,7 +5171,7 @@ Make it feel like walking into your friend's creative space and being genuinely
           }
         }
         if (activeTopicContext && activeTopicRecord) {
-          finalSystemContent += `\n\n${activeTopicContext}`
+          finalPrompt.add('turn', `\n\n${activeTopicContext}`)
           // AWAKEN DEAD COGNITIVE LAYERS: L2_factual_history, L3_live_state, L5_user_intent
           // These were stored by updateTopicCognition but NEVER injected back — now they drive cross-session memory
           const cog = (activeTopicRecord as { cognition_state?: Record<string, unknown> }).cognition_state as {
@@ -7575,13 +5181,13 @@ Make it feel like walking into your friend's creative space and being genuinely
           } | undefined
           if (cog) {
             if (cog.L2_factual_history) {
-              finalSystemContent += `\n\n## Topic History (L2)\n${cog.L2_factual_history}`
+              finalPrompt.add('turn', `\n\n## Topic History (L2)\n${cog.L2_factual_history}`)
             }
             if (cog.L3_live_state) {
-              finalSystemContent += `\n\n## Current Topic State (L3)\n${cog.L3_live_state}`
+              finalPrompt.add('turn', `\n\n## Current Topic State (L3)\n${cog.L3_live_state}`)
             }
             if (cog.L5_user_intent) {
-              finalSystemContent += `\n\n## User's Goal (L5)\n${cog.L5_user_intent}`
+              finalPrompt.add('turn', `\n\n## User's Goal (L5)\n${cog.L5_user_intent}`)
             }
           }
           // Also set L5 (user intent) on first identification of this topic — captures what the user wanted
@@ -7595,19 +5201,21 @@ Make it feel like walking into your friend's creative space and being genuinely
     // ── "Thinking out loud" — narrate before each tool call so thought_step fires ──
     // Use bold headers to categorize your reasoning so the UI can show structured thought cards.
     if (!isBuild) {
-      finalSystemContent += `\n\nBefore calling any tool, use a bold header to categorize your reasoning on its own line, then explain. Examples:
+      finalPrompt.add('static', `\n\nBefore calling any tool, use a bold header to categorize your reasoning on its own line, then explain. Examples:
 - **Analyzed** — what you understood from the input
 - **Let me take a look at this file** — before reading a file
 - **Let me check the error** — before investigating an error
 - **Let me run this** — before executing terminal/code
 - **Good idea** — when improving something proactively
 - **Let me save this** — before saving memory or worklog
-Keep each header + thought on its own line. Use multiple short bold-header blocks if doing multiple types of reasoning in one turn.`
+Keep each header + thought on its own line. Use multiple short bold-header blocks if doing multiple types of reasoning in one turn.`)
     }
+    let finalSystemContent = finalPrompt.assemble(promptKey ?? undefined)
+    stopPrompt()
 
     // Generate requestId for execution trace
     const requestId = `req_${Date.now()}_${Math.random().toString(36).slice(2, 8)}`
-    if (userId) startTrace(requestId, userId)
+    if (userId) startTrace(requestId, userId, timer)
 
     const useTools = !voiceMode
     const toolContext = { userId, tavilyKey, apiKey, doKey, baseUrl, cookieHeader: req.headers.get('cookie') ?? '' }
@@ -7742,6 +5350,22 @@ Keep each header + thought on its own line. Use multiple short bold-header block
 
       // IIFE: wrap the entire agent loop so we can return liveStream BEFORE tools run
       // This is what makes ProcessTab show live spinners instead of a burst at the end.
+      // Each round is one `tool_round` stage; the open one is closed when the loop exits
+      let stopRound: (() => number) | null = null
+      // The timing event, when requested, goes out before [DONE] on every path;
+      // timer.finish() records the 'total' sample, so it runs exactly once
+      let liveDoneSent = false
+      const finishTiming = () => {
+        stopRound?.()
+        const timing = timer.finish()
+        if (emitTiming) liveEnqueue({ timing })
+      }
+      const liveDone = (prefix = '') => {
+        if (liveDoneSent) return
+        liveDoneSent = true
+        finishTiming()
+        safeLiveEnqueue(liveEncoder.encode(`${prefix}data: [DONE]\n\n`))
+      }
       void (async () => { try {
       // Declared at IIFE body level so it's in scope for the sync synthesis block
       let loopRes: Response | undefined = undefined
@@ -7817,8 +5441,13 @@ Keep each header + thought on its own line. Use multiple short bold-header block
       }
 
       let autoContinuationRound = 0
+      // Tool selection fallback: once the model calls a tool it wasn't offered, offer everything
+      let offeredToolNames = new Set<string>()
+      let widenTools = false
       while (round < MAX_TOOL_ROUNDS) {
         round++
+        stopRound?.()
+        stopRound = timer.start('tool_round', `round ${round}`)
         // Reset per-round tracking flags at start of each round
         liveRef.firstThinkEmitted = false
         thisRoundTools = { json: false, xml: false }
@@ -7832,51 +5461,7 @@ Keep each header + thought on its own line. Use multiple short bold-header block
           liveEnqueue({ checkpoint_event: { round, message: `Checkpoint: ${round} rounds completed` } })
         }
 
-        // Use ONLY SPARKIE_TOOLS — do NOT include connectorTools.
-        // Deduplicate by function name: keep first occurrence only.
-        // MiniMax rejects requests with duplicate function names.
-        const seen = new Set<string>()
-        const allTools = SPARKIE_TOOLS
-        const validTools: typeof allTools = []
-        for (const t of allTools) {
-          const name = t?.function?.name?.trim()
-          const params = t?.function?.parameters
-          const paramsType = typeof params
-          const isObject = paramsType === 'object' && params !== null && !Array.isArray(params)
-          const hasObjectType = isObject && (params as Record<string, unknown>).type === 'object'
-          if (!name) {
-            console.warn(`[tool-filter] REMOVING tool with empty name`)
-            continue
-          }
-          if (seen.has(name)) {
-            console.warn(`[tool-filter] REMOVING duplicate tool "${name}"`)
-            continue
-          }
-          if (!isObject || !hasObjectType) {
-            console.warn(`[tool-filter] REMOVING tool "${name}" paramsType=${paramsType} isObject=${isObject} hasObjectType=${hasObjectType}`)
-            continue
-          }
-          const p = params as { required?: string[]; properties?: Record<string, unknown> }
-          // empty-properties filter removed
-          // Reject tools with empty required array — MiniMax may reject "required is empty"
-          if (Array.isArray(p.required) && p.required.length === 0) {
-            delete p.required
-          }
-          if (p.required && p.properties) {
-            let requiredOk = true
-            for (const req of p.required) {
-              if (!(req in p.properties)) {
-                console.warn(`[tool-filter] REMOVING tool "${name}" — required field "${req}" missing from properties`)
-                requiredOk = false
-                break
-              }
-            }
-            if (!requiredOk) continue
-          }
-          seen.add(name)
-          validTools.push(t)
-        }
-        console.log(`[tool-filter] ${allTools.length} total → ${validTools.length} valid (removed ${allTools.length - validTools.length})`)
+        const validTools = getValidTools()
 
         // Essential tool names — these are kept in fallback retry on 400 error
         const CORE_TOOL_NAMES = new Set([
@@ -7905,8 +5490,27 @@ Keep each header + thought on its own line. Use multiple short bold-header block
         const wordCount = lastUserMsg.trim().split(/\s+/).filter(Boolean).length
         const hasActionKeyword = /\b(run|execute|call|invoke|use|apply|try|check|search|fetch|get|load|find|look.up|build|create|make|generate|send|post|update|delete|remove|archive)\b/i.test(lastUserMsg)
         const isConversational = wordCount <= 25 && !hasActionKeyword
-        const firstCallTools = isConversational ? coreTools : validTools
-        if (isConversational) {
+        let firstCallTools = isConversational ? coreTools : validTools
+        if (widenTools) {
+          firstCallTools = validTools
+        } else if (toolSelectionEnabled()) {
+          // Per-turn subset: core tools + tools already used + best matches for the message (toolSelection.ts)
+          const usedToolNames = new Set<string>()
+          for (const m of loopMessages) {
+            if (m.role !== 'assistant' || !m.tool_calls) continue
+            for (const tc of m.tool_calls as Array<{ function?: { name?: string } }>) {
+              if (tc.function?.name) usedToolNames.add(tc.function.name)
+            }
+          }
+          const selection = selectTools(validTools, {
+            message: lastUserMsg,
+            tier: isConversational ? 'conversational' : 'task',
+            always: CORE_TOOL_NAMES,
+            used: usedToolNames,
+          })
+          firstCallTools = selection.tools as typeof validTools
+          console.log(`[tool-select] ${isConversational ? 'conversational' : 'task'} — offering ${firstCallTools.length}/${validTools.length} tools (~${selection.schemaTokens}/${selection.fullSchemaTokens} schema tokens)`)
+        } else if (isConversational) {
           console.log(`[tool-filter] conversational message (${wordCount} words) — using ${firstCallTools.length} core tools`)
         }
 
@@ -8005,11 +5609,18 @@ Keep each header + thought on its own line. Use multiple short bold-header block
           messages: [{ role: 'system', content: systemOverride ?? finalSystemContent }, ...strippedPayloadMessages],
         })
 
-        ;({ response: loopRes, errorText } = await tryLLMCall(llmPayload(effectiveTools), apiKey))
+        // Every call goes through here, so offeredToolNames always matches the
+        // tool list actually sent upstream (the widen check compares against it)
+        const callWithTools = (tools: typeof validTools, payload = llmPayload(tools)) => {
+          offeredToolNames = new Set(tools.map(t => t.function?.name as string))
+          return tryLLMCall(payload, apiKey)
+        }
+        const llmStartedAt = performance.now()
+        ;({ response: loopRes, errorText } = await callWithTools(effectiveTools))
 
         if (!loopRes.ok && loopRes.status === 400 && coreTools.length > 0) {
           console.warn(`[chat] 400 error with ${effectiveTools.length} tools — retrying with ${coreTools.length} core tools`)
-          ;({ response: loopRes, errorText } = await tryLLMCall(llmPayload(coreTools), apiKey))
+          ;({ response: loopRes, errorText } = await callWithTools(coreTools))
         }
 
         if (!loopRes.ok && loopRes.status === 400 && validTools.length > CORE_TOOL_NAMES.size) {
@@ -8017,7 +5628,7 @@ Keep each header + thought on its own line. Use multiple short bold-header block
           const miniTools = validTools.filter(t => CORE_TOOL_NAMES.has(t?.function?.name as string))
           if (miniTools.length >= 10) {
             console.warn(`[chat] 400 again — trying 15 core tools (${miniTools.length})`)
-            ;({ response: loopRes, errorText } = await tryLLMCall(llmPayload(miniTools), apiKey))
+            ;({ response: loopRes, errorText } = await callWithTools(miniTools))
           }
         }
 
@@ -8045,9 +5656,12 @@ Keep each header + thought on its own line. Use multiple short bold-header block
             tools,
             messages: [{ role: 'system', content: systemOverride ?? finalSystemContent }, ...fallbackPayloadMessages],
           })
-          ;({ response: loopRes, errorText } = await tryLLMCall(fallbackLlmPayload([], systemContent), apiKey))
+          ;({ response: loopRes, errorText } = await callWithTools([], fallbackLlmPayload([], systemContent)))
         }
 
+        // Non-streaming here, so the first answer of the request is its first token
+        if (loopRes.ok && !timer.has('upstream_ttft')) timer.record('upstream_ttft', performance.now() - llmStartedAt)
+
         if (!loopRes.ok) {
           console.error(`[chat IIFE] loopRes error: ${errorText ?? loopRes.status}`)
           break
@@ -8080,6 +5694,14 @@ Keep each header + thought on its own line. Use multiple short bold-header block
             console.warn('[chat] All tool calls had empty names, skipping round')
             break
           }
+          if (!widenTools) {
+            const notOffered = toolCalls.map(tc => tc.function.name).filter(n => !offeredToolNames.has(n))
+            if (notOffered.length > 0) {
+              widenTools = true
+              recordWidened()
+              console.warn(`[tool-select] model called ${notOffered.join(', ')} (not offered) — offering all tools from the next round`)
+            }
+          }
 
           // ── Per-round loop detection: same tool+args 3+ times in same round ─────
           // MiniMax M2.7 can enter a loop calling the same tool with same args
@@ -8154,21 +5776,13 @@ Keep each header + thought on its own line. Use multiple short bold-header block
             delete_task: 'Deleting task...', update_worklog: 'Logging to worklog...',
             read_memory: 'Memory recalled', delete_file: 'Deleting file...',
             send_email: 'Sending email...',
-            get_schema: 'Reading DB schema...', get_deployment_history: 'Pulling deploy history...',
-            search_github: 'Searching codebase...', create_calendar_event: 'Drafting calendar event...',
-            transcribe_audio: 'Transcribing audio...', text_to_speech: 'Synthesizing speech...',
-            execute_script: 'Running script...', npm_run: 'Running npm...',
-            git_ops: 'Running git ops...', delete_memory: 'Pruning memory...',
-            run_tests: 'Running tests...', check_lint: 'Checking lint...',
-            read_email_thread: 'Reading thread...', manage_email: 'Managing email...',
-            rsvp_event: 'Sending RSVP...', manage_calendar_event: 'Updating calendar...',
-            analyze_file: 'Analyzing file...', fetch_url: 'Fetching URL...', research: 'Researching...',
+            // Sprint 2-5 tools (generated)
+            ...SPRINT_CHIP_LABELS,
             read_uploaded_file: 'Reading uploaded file...',
             browser_navigate: 'Browsing the web...', browser_screenshot: 'Taking screenshot...',
             browser_extract: 'Extracting page data...', browser_click: 'Clicking element...',
             browser_fill: 'Filling form field...', browser_create_profile: 'Creating browser profile...',
             browser_use_profile: 'Running browser task with profile...',
-            manage_topic: 'Managing topic context...', link_to_topic: 'Linking to topic...',
             create_behavior_rule: 'Encoding new behavior rule...', list_behavior_rules: 'Reading behavior rules...',
             update_behavior_rule: 'Updating behavior rule...', create_goal: 'Setting persistent goal...',
             check_goal_progress: 'Assessing goal progress...', list_goals: 'Reviewing open agenda...',
@@ -8214,31 +5828,13 @@ Keep each header + thought on its own line. Use multiple short bold-header block
             read_memory: 'Reading from memory',
             delete_file: 'Running the tool — deleting file',
             send_email: 'Running the tool — sending email',
-            get_schema: 'Reading database schema',
-            get_deployment_history: 'Pulling deployment history',
-            search_github: 'Searching the repository',
-            create_calendar_event: 'Drafting calendar event for approval',
-            transcribe_audio: 'Transcribing audio',
-            text_to_speech: 'Running the tool — text to speech',
-            execute_script: 'Running script',
-            npm_run: 'Running npm command',
-            git_ops: 'Running git operation',
-            delete_memory: 'Deleting memory entry',
-            run_tests: 'Running test suite',
-            check_lint: 'Running lint check',
-            read_email_thread: 'Reading email thread',
-            manage_email: 'Managing email',
-            rsvp_event: 'RSVPing to event',
-            manage_calendar_event: 'Managing calendar event',
-            analyze_file: 'Analyzing file',
-            fetch_url: 'Fetching URL',
-            research: 'Researching topic',
+            // Sprint 2-5 tools (generated)
+            ...SPRINT_WORKLOG_LABELS,
             read_uploaded_file: 'Reading uploaded file',
             browser_navigate: 'Browsing to page', browser_screenshot: 'Taking screenshot',
             browser_extract: 'Extracting page content', browser_click: 'Clicking element',
             browser_fill: 'Filling form field', browser_create_profile: 'Creating browser profile',
             browser_use_profile: 'Running browser task',
-            manage_topic: 'Managing topic', link_to_topic: 'Linking to topic',
             create_behavior_rule: 'Writing behavior rule', list_behavior_rules: 'Reading behavior rules',
             update_behavior_rule: 'Updating behavior rule', create_goal: 'Creating persistent goal',
             check_goal_progress: 'Checking goal progress', list_goals: 'Reviewing open agenda',
@@ -8265,17 +5861,12 @@ Keep each header + thought on its own line. Use multiple short bold-header block
             write_database: 'database', update_task: 'scroll', delete_task: 'scroll',
             update_worklog: 'scroll', read_memory: 'brain', delete_file: 'edit',
             send_email: 'zap',
-            get_schema: 'database', get_deployment_history: 'rocket', search_github: 'search',
-            create_calendar_event: 'calendarToday', transcribe_audio: 'mic', text_to_speech: 'mic',
-            execute_script: 'code', npm_run: 'terminal', git_ops: 'git',
-            delete_memory: 'trash', run_tests: 'check', check_lint: 'alert',
-            read_email_thread: 'mail', manage_email: 'mail', rsvp_event: 'calendar',
-            manage_calendar_event: 'calendar', analyze_file: 'file', fetch_url: 'globe', research: 'search',
+            // Sprint 2-5 tools (generated)
+            ...SPRINT_STEP_ICONS,
             read_uploaded_file: 'file',
             browser_navigate: 'globe', browser_screenshot: 'image', browser_extract: 'file',
             browser_click: 'globe', browser_fill: 'edit', browser_create_profile: 'brain',
             browser_use_profile: 'globe',
-            manage_topic: 'brain', link_to_topic: 'brain',
             create_behavior_rule: 'brain', list_behavior_rules: 'brain',
             update_behavior_rule: 'brain', create_goal: 'checkCircle',
             check_goal_progress: 'checkCircle', list_goals: 'scroll',
@@ -8488,7 +6079,7 @@ Keep each header + thought on its own line. Use multiple short bold-header block
           // Fire-and-forget: generate tool use summary for worklog enrichment
           if (userId && toolResults.length > 0) {
             const summaryPrompt = `Summarize what these tools found in 1 short sentence:\n${toolCalls.map((tc, i) => `${tc.function.name}: ${(toolResults[i]?.content ?? '').slice(0, 200)}`).join('\n')}`
-            fetch('https://api.minimax.io/v1/chat/completions', {
+            fetch(`${MINIMAX_BASE}/chat/completions`, {
               method: 'POST',
               headers: { 'Content-Type': 'application/json', 'Authorization': `Bearer ${process.env.MINIMAX_API_KEY ?? ''}` },
               body: JSON.stringify({
@@ -8573,7 +6164,7 @@ Keep each header + thought on its own line. Use multiple short bold-header block
               liveEnqueue({ ide_build: { prompt: buildPrompt } })
               // Write friendly message to liveRef and signal done
               liveEnqueue({ choices: [{ delta: { content: "On it! Opening the IDE and building that for you now ✨" }, finish_reason: null }] })
-              safeLiveEnqueue(liveEncoder.encode(': \n\ndata: [DONE]\n\n'))
+              liveDone(': \n\n')
               return
             }
           }
@@ -8584,7 +6175,7 @@ Keep each header + thought on its own line. Use multiple short bold-header block
               const taskJson = tr.content.slice('HITL_TASK:'.length)
               const task = JSON.parse(taskJson)
               liveEnqueue({ sparkie_task: task, text: "I've queued that for your approval — check the card below." })
-              safeLiveEnqueue(liveEncoder.encode(': \n\ndata: [DONE]\n\n'))
+              liveDone(': \n\n')
               return
             }
             if (tr.content.startsWith('SCHEDULED_TASK:')) {
@@ -8797,7 +6388,7 @@ Keep each header + thought on its own line. Use multiple short bold-header block
                   const taskJson = tr.content.slice('HITL_TASK:'.length)
                   const task = JSON.parse(taskJson)
                   liveEnqueue({ sparkie_task: task, text: "I've queued that for your approval — check the card below." })
-                  safeLiveEnqueue(liveEncoder.encode(': \n\ndata: [DONE]\n\n'))
+                  liveDone(': \n\n')
                   return
                 }
                 if (tr.content.startsWith('SPARKIE_CARD:')) {
@@ -8926,7 +6517,7 @@ Keep each header + thought on its own line. Use multiple short bold-header block
             const snap = messages.slice(-20).map((m: { role: string; content: string }) =>
               `${m.role === 'user' ? 'User' : 'Sparkie'}: ${(typeof m.content === 'string' ? m.content : '').slice(0, 600)}`
             ).join('\n')
-            extractAndSaveMemories(userId, snap, apiKey)
+            void timer.time('memory_extraction', extractAndSaveMemories(userId, snap, apiKey))
             // Extract deferred intents from the user's message
             const lastUserMsg = messages.filter((m: { role: string }) => m.role === 'user').at(-1)?.content ?? ''
             if (lastUserMsg) {
@@ -8992,7 +6583,7 @@ Keep each header + thought on its own line. Use multiple short bold-header block
           contentAlreadySent = true
           // Fire-and-forget: self-reflect after each session so Sparkie learns from every interaction
           if (userId) runSelfReflection(userId).catch(() => {})
-          safeLiveEnqueue(liveEncoder.encode('data: [DONE]\n\n'))
+          liveDone()
           return
         } else if (finishReason === 'length' && autoContinuationRound < 5) {
           // Model hit max_tokens mid-response — auto-continue from where it left off
@@ -9011,6 +6602,7 @@ Keep each header + thought on its own line. Use multiple short bold-header block
           break // unexpected finish reason or max auto-continuations reached
         }
       }
+      stopRound?.()
 
       // When core-tools succeed without needing tools (finish_reason='stop'), usedTools stays false.
       // The IIFE skips synthesis in this case and returns an empty liveStream.
@@ -9228,22 +6820,22 @@ When executing multi-step tasks:
         role: 'user' as const,
         content: '⚡ SYSTEM: Write your full response now in plain English. No tools. No XML. No emojis. No ASCII art. Pure text only.',
       }]
-      const { response: synthRes, errorText: synthErr } = await tryLLMCall({
+      const { response: synthRes, errorText: synthErr } = await timer.time('synthesis', tryLLMCall({
         model: 'MiniMax-M2.7', stream: true, temperature: 0.8, max_tokens: 16000,
         messages: [{ role: 'system', content: systemContent }, ...finalMessages],
-      }, apiKey)
+      }, apiKey))
 
       if (!synthRes.ok) {
         const isFreeLimit2 = (synthErr ?? '').includes('FreeUsageLimitError') || (synthErr ?? '').includes('free usage') || (synthErr ?? '').includes('rate limit')
         const friendlyMsg2 = isFreeLimit2 ? "I'm running into a rate limit right now — give me a moment and try again." : 'Something went wrong on my end. Try again in a moment.'
         safeLiveEnqueue(liveEncoder.encode('data: ' + JSON.stringify({ choices: [{ delta: { content: friendlyMsg2 } }] }) + '\n\n'))
-        safeLiveEnqueue(liveEncoder.encode('data: [DONE]\n\n'))
+        liveDone()
       } else {
         if (toolMediaResults.length > 0) {
           const mediaBlocks2 = injectMediaIntoContent('', toolMediaResults)
           const mediaChunk2 = `data: ${JSON.stringify({ choices: [{ delta: { content: mediaBlocks2 } }] })}\n\n`
-          const synthRdr = synthRes.body!.getReader()
-          while (true) { const { done, value } = await synthRdr.read(); if (done) break; safeLiveEnqueue(value) }
+          // Upstream minus its [DONE]: liveDone() sends ours after the media and timing events
+          for await (const line of upstreamLines(synthRes.body!)) safeLiveEnqueue(liveEncoder.encode(line + '\n'))
           safeLiveEnqueue(liveEncoder.encode(mediaChunk2))
           liveEnqueue({
             step_trace: {
@@ -9256,7 +6848,7 @@ When executing multi-step tasks:
               timestamp: Date.now(),
             },
           })
-          safeLiveEnqueue(liveEncoder.encode('data: [DONE]\n\n'))
+          liveDone()
         } else {
           const synthEnc = new TextEncoder()
           const synthRdr2 = synthRes.body!.getReader()
@@ -9277,7 +6869,7 @@ When executing multi-step tasks:
                   timestamp: Date.now(),
                 },
               })
-              safeLiveEnqueue(synthEnc.encode('data: [DONE]\n\n'))
+              liveDone()
               break
             }
             const synthText = synthDec.decode(value, { stream: true })
@@ -9317,8 +6909,9 @@ When executing multi-step tasks:
       } catch (iifeCatch) {
         console.error('[chat IIFE]', iifeCatch)
         try { safeLiveEnqueue(liveEncoder.encode(`data: ${JSON.stringify({ choices: [{ delta: { content: `Error: ${String(iifeCatch).slice(0, 200)}` } }] })}\n\n`)) } catch {}
-        try { safeLiveEnqueue(liveEncoder.encode('data: [DONE]\n\n')) } catch {}
+        try { liveDone() } catch {}
       } finally {
+        if (!liveDoneSent) finishTiming()
         try { safeLiveClose() } catch {}
       } })()
 
@@ -9332,7 +6925,7 @@ When executing multi-step tasks:
       }
 
       return new Response(liveStream, {
-        headers: { 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache', 'Connection': 'keep-alive' },
+        headers: { 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache', 'Connection': 'keep-alive', 'Server-Timing': timer.serverTiming() },
       })
     }
 
@@ -9350,6 +6943,14 @@ When executing multi-step tasks:
     }
 
     // Final streaming call — use tryLLMCall for fallback resilience
+    const streamStartedAt = performance.now()
+    const markFirstToken = () => {
+      if (!timer.has('upstream_ttft')) timer.record('upstream_ttft', performance.now() - streamStartedAt)
+    }
+    const timingChunk = () => {
+      const timing = timer.finish()
+      return emitTiming ? `data: ${JSON.stringify({ timing })}\n\n` : ''
+    }
     const { response: streamRes, errorText: streamErr } = await tryLLMCall({
       model: 'MiniMax-M2.7', stream: true, temperature: 0.8, max_tokens: 16000,
       messages: [{ role: 'system', content: finalSystemContent }, ...finalMessages],
@@ -9372,7 +6973,7 @@ When executing multi-step tasks:
         },
       })
       return new Response(errStream, {
-        headers: { 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache', 'Connection': 'keep-alive' },
+        headers: { 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache', 'Connection': 'keep-alive', 'Server-Timing': timer.serverTiming() },
       })
     }
 
@@ -9394,7 +6995,7 @@ When executing multi-step tasks:
       const snap = messages.slice(-20).map((m: { role: string; content: string }) =>
         `${m.role === 'user' ? 'User' : 'Sparkie'}: ${(typeof m.content === 'string' ? m.content : '').slice(0, 600)}`
       ).join('\n')
-      extractAndSaveMemories(userId, snap, apiKey)
+      void timer.time('memory_extraction', extractAndSaveMemories(userId, snap, apiKey))
       // Write message batch to worklog (fire-and-forget)
       writeMsgBatch(userId, messages.filter((m: { role: string }) => m.role === 'user').length).catch(() => {})
       const lastUserMsg = messages.slice().reverse().find((m: { role: string; content: string }) => m.role === 'user')?.content ?? ''
@@ -9413,112 +7014,23 @@ When executing multi-step tasks:
     // We do this by wrapping the stream to inject media blocks at the end
     if (toolMediaResults.length > 0) {
       const mediaBlocks = injectMediaIntoContent('', toolMediaResults)
-      const encoder = new TextEncoder()
       const mediaChunk = `data: ${JSON.stringify({ choices: [{ delta: { content: mediaBlocks } }] })}\n\n`
 
-      // Wrap original stream + append media
-      const reader = streamRes.body!.getReader()
-      const wrappedStream = new ReadableStream({
-        async start(controller) {
-          while (true) {
-            const { done, value } = await reader.read()
-            if (done) break
-            controller.enqueue(value)
-          }
-          // Append media blocks
-          controller.enqueue(encoder.encode(mediaChunk))
-          controller.enqueue(encoder.encode('data: [DONE]\n\n'))
-          controller.close()
-        },
+      // Upstream minus its [DONE], then media blocks, timing and our [DONE]
+      const wrappedStream = passthroughStream(streamRes.body!, {
+        onChunk: markFirstToken,
+        tail: () => mediaChunk + timingChunk(),
       })
       return new Response(wrappedStream, {
-        headers: { 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache', 'Connection': 'keep-alive' },
+        headers: { 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache', 'Connection': 'keep-alive', 'Server-Timing': timer.serverTiming() },
       })
     }
 
-    // Sanitizing stream wrapper — strips XML tool call artifacts from final output
-    const encoder2 = new TextEncoder()
-    const reader = streamRes.body!.getReader()
-    const decoder = new TextDecoder()
-    const sanitizingStream = new ReadableStream({
-      async start(controller) {
-        let buffer = ''
-        // Accumulate content across deltas to detect and strip XML tool calls
-        // Uses full-content accumulation rather than per-delta tracking (multi-delta XML bleeds)
-        let accContent = ''
-        while (true) {
-          const { done, value } = await reader.read()
-          if (done) {
-            controller.enqueue(encoder2.encode('data: [DONE]\n\n'))
-            controller.close()
-            break
-          }
-          const text = decoder.decode(value, { stream: true })
-          // Parse SSE chunks and sanitize content
-          const lines = (buffer + text).split('\n')
-          buffer = lines.pop() ?? ''
-          for (const line of lines) {
-            if (!line.startsWith('data: ') || line === 'data: [DONE]') {
-              if (line !== '') controller.enqueue(encoder2.encode(line + '\n'))
-              continue
-            }
-            try {
-              const parsed = JSON.parse(line.slice(6))
-              const content = parsed?.choices?.[0]?.delta?.content
-              if (content) {
-                accContent += content
-                // If accumulated content contains an open XML tag that hasn't closed yet, suppress output
-                const hasOpenXML = /<minimax:tool_call>/.test(accContent)
-                const hasCloseXML = /<\/minimax:tool_call>/.test(accContent)
-                if (hasOpenXML) {
-                  if (hasCloseXML) {
-                    // Full XML block accumulated — strip it, emit any clean text that remains
-                    const cleanAcc = accContent
-                      .replace(/<minimax:tool_call>[\s\S]*?<\/minimax:tool_call>/g, '')
-                                            .replace(/<think>[\s\S]*?<\/think>/gi, '')
-                      .replace(/<invoke[\s\S]*?<\/invoke>/g, '')
-                      .replace(/<parameter[^>]*>[\s\S]*?<\/parameter>/g, '')
-                      .trim()
-                    accContent = '' // reset accumulator
-                    if (!cleanAcc) continue
-                    parsed.choices[0].delta.content = cleanAcc
-                  } else {
-                    continue // still accumulating XML — suppress
-                  }
-                } else {
-                  accContent = '' // no XML, safe to emit, reset accumulator
-                }
-              }
-              // Sanitize model name leaks before sending to client
-              if (content && parsed?.choices?.[0]?.delta) {
-                const sanitized = content
-                                    .replace(/<think>[\s\S]*?<\/think>/gi, '')
-                  .replace(/minimax-m2\.\d+(-free)?/gi, 'Atlas')
-                  .replace(/music-2\.[05]/gi, 'the music engine')
-                  .replace(/speech-02(-hd)?/gi, 'voice synthesis')
-                  .replace(/whisper-large-v3-turbo/gi, 'voice recognition')
-                  .replace(/ace-step-v1\.5/gi, 'the music engine')
-                if (sanitized !== content) {
-                  parsed.choices[0].delta.content = sanitized
-                  controller.enqueue(encoder2.encode('data: ' + JSON.stringify(parsed) + '\n'))
-                  controller.enqueue(encoder2.encode(`data: ${JSON.stringify({ reasoning_chunk: sanitized })}\n\n`))
-                  continue
-                }
-              }
-              // Emit reasoning_chunk alongside each content delta for the Live Activity ticker
-              if (content) {
-                controller.enqueue(encoder2.encode(`data: ${JSON.stringify({ reasoning_chunk: content })}\n\n`))
-              }
-              controller.enqueue(encoder2.encode(line + '\n'))
-            } catch {
-              controller.enqueue(encoder2.encode(line + '\n'))
-            }
-          }
-        }
-      },
-    })
-    return new Response(sanitizingStream, {
-      headers: { 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache', 'Connection': 'keep-alive' },
+    // Sanitizing stream wrapper — strips XML tool call artifacts from final output,
+    // drops the upstream [DONE] and ends with the timing event and our [DONE]
+    const finalStream = sanitizingStream(streamRes.body!, { onChunk: markFirstToken, tail: timingChunk })
+    return new Response(finalStream, {
+      headers: { 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache', 'Connection': 'keep-alive', 'Server-Timing': timer.serverTiming() },
     })
   } catch (err) {
     console.error('[/api/chat] Unhandled error:', err)
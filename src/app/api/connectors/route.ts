@@ -1,6 +1,8 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { getServerSession } from 'next-auth/next'
 import { authOptions } from '@/lib/auth'
+import { publishInvalidation } from '@/lib/cacheBus'
+import { LruCache } from '@/lib/lruCache'
 
 export const runtime = 'nodejs'
 
@@ -18,6 +20,14 @@ function entityId(userId: string) {
   return `sparkie_user_${userId}`
 }
 
+// Last active-app set seen per user — OAuth completes inside Composio, so a status
+// read that differs from it is how we learn a connection changed
+const _seenConnections = new LruCache<string, string>({ name: 'connectors.seen', maxEntries: 5000, ttlMs: 24 * 60 * 60 * 1000 })
+
+function connectorsChanged(userId: string): void {
+  publishInvalidation('connectors', userId).catch(() => {})
+}
+
 // GET /api/connectors?action=apps&q=gmail&cursor=xxx
 //                   ?action=status
 export async function GET(req: NextRequest) {
@@ -51,6 +61,11 @@ export async function GET(req: NextRequest) {
         if (res.ok) {
           const d = await res.json() as { items?: ConnItem[] }
           connections = mapItems(d.items ?? [])
+          const fingerprint = connections.map(c => c.appName).sort().join(',')
+          if (_seenConnections.get(userId) !== fingerprint) {
+            _seenConnections.set(userId, fingerprint)
+            connectorsChanged(userId)
+          }
         }
       } catch { /* fallthrough */ }
 
@@ -231,6 +246,7 @@ export async function POST(req: NextRequest) {
           )
         }
         const data = await connectRes.json() as { id?: string; status?: string }
+        connectorsChanged(userId)
         return NextResponse.json({ status: data.status, connectedAccountId: data.id })
       }
 
@@ -292,6 +308,7 @@ export async function POST(req: NextRequest) {
           )
         }
       }
+      connectorsChanged(userId)
       return NextResponse.json({ success: true })
     }
 
@@ -31,23 +31,6 @@ export async function POST(req: NextRequest) {
     return NextResponse.json({ error: 'contacts array required' }, { status: 400 })
   }
 
-  // Ensure table exists
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_contacts (
-      id              UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-      user_id         TEXT NOT NULL,
-      email           TEXT NOT NULL,
-      display_name    TEXT DEFAULT '',
-      notes           TEXT DEFAULT '',
-      cc_preference   TEXT DEFAULT '',
-      response_sla    TEXT DEFAULT '',
-      priority        TEXT DEFAULT 'normal',
-      created_at      TIMESTAMPTZ DEFAULT NOW(),
-      updated_at      TIMESTAMPTZ DEFAULT NOW(),
-      UNIQUE(user_id, email)
-    )
-  `).catch(() => {})
-
   const results: Array<{ email: string; status: string }> = []
 
   for (const c of contacts) {
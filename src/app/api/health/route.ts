@@ -1,5 +1,34 @@
-import { NextResponse } from 'next/server'
+import { NextRequest, NextResponse } from 'next/server'
+import { cacheStats } from '@/lib/lruCache'
+import { sinkStats } from '@/lib/writeBehind'
+import { getProactiveHub } from '@/lib/proactiveHub'
+import { toolSelectionStats } from '@/lib/toolSelection'
+import { promptPrefixStats } from '@/lib/promptPrefix'
 
-export async function GET() {
-  return NextResponse.json({ status: 'ok', ts: Date.now() })
+// Keepalive pings, the sidebar and boot probes hit this route, so the default
+// answer stays light. Scheduler, leader and chat-stage stats pull in the
+// scheduler's module graph and are only loaded for ?detail=1.
+export async function GET(req: NextRequest) {
+  const base = {
+    status: 'ok',
+    ts: Date.now(),
+    caches: cacheStats(),
+    sinks: sinkStats(),
+    proactive: getProactiveHub().stats(),
+    toolSelection: toolSelectionStats(),
+    promptPrefix: promptPrefixStats(),
+  }
+  if (!req.nextUrl.searchParams.has('detail')) return NextResponse.json(base)
+
+  const [{ perceptionStats }, { leaderStats }, { stageTimingStats }] = await Promise.all([
+    import('@/lib/scheduler'),
+    import('@/lib/schedulerLeader'),
+    import('@/lib/executionTrace'),
+  ])
+  return NextResponse.json({
+    ...base,
+    perception: perceptionStats(),
+    scheduler: leaderStats(),
+    chatStages: stageTimingStats(),
+  })
 }
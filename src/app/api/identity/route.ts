@@ -6,24 +6,6 @@ import { query } from '@/lib/db'
 type IdentityFileType = 'user' | 'memory' | 'session' | 'heartbeat'
 const VALID_TYPES: IdentityFileType[] = ['user', 'memory', 'session', 'heartbeat']
 
-async function ensureTable() {
-  await query(`
-    CREATE TABLE IF NOT EXISTS user_identity_files (
-      id          SERIAL PRIMARY KEY,
-      user_id     TEXT NOT NULL,
-      file_type   TEXT NOT NULL,
-      content     TEXT NOT NULL DEFAULT '',
-      created_at  TIMESTAMPTZ DEFAULT NOW(),
-      updated_at  TIMESTAMPTZ DEFAULT NOW(),
-      CONSTRAINT user_identity_files_user_type_unique UNIQUE (user_id, file_type)
-    )
-  `)
-  await query(`
-    CREATE INDEX IF NOT EXISTS idx_user_identity_files_user_id
-    ON user_identity_files(user_id)
-  `)
-}
-
 // GET /api/identity?type=user|memory|session|heartbeat|all
 export async function GET(req: NextRequest) {
   const session = await getServerSession(authOptions)
@@ -37,8 +19,6 @@ export async function GET(req: NextRequest) {
   const type = searchParams.get('type') ?? 'all'
 
   try {
-    await ensureTable()
-
     if (type === 'all') {
       const result = await query(
         'SELECT file_type, content, updated_at FROM user_identity_files WHERE user_id = $1',
@@ -87,7 +67,6 @@ export async function PUT(req: NextRequest) {
   const content: string = body.content ?? ''
 
   try {
-    await ensureTable()
     await query(
       `INSERT INTO user_identity_files (user_id, file_type, content, updated_at)
        VALUES ($1, $2, $3, NOW())
@@ -123,7 +102,6 @@ export async function PATCH(req: NextRequest) {
   if (!entry.trim()) return NextResponse.json({ error: 'entry required' }, { status: 400 })
 
   try {
-    await ensureTable()
     // Get current content
     const current = await query(
       'SELECT content FROM user_identity_files WHERE user_id = $1 AND file_type = $2',
@@ -3,7 +3,6 @@ import { getServerSession } from 'next-auth/next'
 import { authOptions } from '@/lib/auth'
 import { query } from '@/lib/db'
 import {
-  ensureDeferredIntentsSchema,
   loadReadyDeferredIntents,
   markDeferredIntentSurfaced,
   saveDeferredIntent,
@@ -19,8 +18,6 @@ export async function GET(req: NextRequest) {
   const mode = searchParams.get('mode') ?? 'ready'
 
   try {
-    await ensureDeferredIntentsSchema()
-
     if (mode === 'all') {
       const res = await query(
         `SELECT * FROM sparkie_deferred_intents WHERE user_id = $1 ORDER BY created_at DESC LIMIT 50`,
@@ -24,36 +24,9 @@ function stripHtml(html: string): string {
     .trim()
 }
 
-async function ensureTable() {
-  await query(`
-    CREATE TABLE IF NOT EXISTS dream_journal (
-      id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-      user_id TEXT NOT NULL,
-      title TEXT,
-      content TEXT NOT NULL,
-      category TEXT DEFAULT 'night_dreams',
-      mood TEXT DEFAULT 'neutral',
-      created_at TIMESTAMPTZ DEFAULT NOW(),
-      updated_at TIMESTAMPTZ DEFAULT NOW()
-    )
-  `, [])
-  await query(`ALTER TABLE dream_journal ADD COLUMN IF NOT EXISTS category TEXT DEFAULT 'night_dreams'`, []).catch(() => {})
-  await query(`ALTER TABLE dream_journal ADD COLUMN IF NOT EXISTS title TEXT`, []).catch(() => {})
-  await query(`ALTER TABLE dream_journal ADD COLUMN IF NOT EXISTS images TEXT[] DEFAULT '{}'`, []).catch(() => {})
-  await query(`ALTER TABLE dream_journal ADD COLUMN IF NOT EXISTS theme TEXT DEFAULT 'default'`, []).catch(() => {})
-  await query(`
-    CREATE TABLE IF NOT EXISTS dream_journal_lock (
-      user_id TEXT PRIMARY KEY,
-      passcode_hash TEXT NOT NULL,
-      created_at TIMESTAMPTZ DEFAULT NOW()
-    )
-  `, [])
-}
-
 export async function GET(req: Request) {
   const session = await getServerSession(authOptions)
   if (!session?.user?.email) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
-  await ensureTable()
   const { searchParams } = new URL(req.url)
   const action = searchParams.get('action') ?? 'entries'
 
@@ -108,7 +81,6 @@ export async function GET(req: Request) {
 export async function POST(req: Request) {
   const session = await getServerSession(authOptions)
   if (!session?.user?.email) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
-  await ensureTable()
   const body = await req.json()
   const { action } = body
 
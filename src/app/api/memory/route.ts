@@ -3,37 +3,6 @@ import { getServerSession } from 'next-auth/next'
 import { authOptions } from '@/lib/auth'
 import { query } from '@/lib/db'
 
-// Ensure table exists on first use — safe to run multiple times
-async function ensureTable() {
-  await query(`
-    CREATE TABLE IF NOT EXISTS user_memories (
-      id          SERIAL PRIMARY KEY,
-      user_id     TEXT NOT NULL,
-      category    TEXT NOT NULL DEFAULT 'general',
-      hint        TEXT,
-      quote       TEXT,
-      content     TEXT NOT NULL,
-      created_at  TIMESTAMPTZ DEFAULT NOW(),
-      updated_at  TIMESTAMPTZ DEFAULT NOW()
-    )
-  `)
-  await query(`ALTER TABLE user_memories ADD COLUMN IF NOT EXISTS hint TEXT`).catch(() => {})
-  await query(`ALTER TABLE user_memories ADD COLUMN IF NOT EXISTS quote TEXT`).catch(() => {})
-  await query(`
-    CREATE INDEX IF NOT EXISTS idx_user_memories_user_id ON user_memories(user_id)
-  `)
-  // Ensure session tracking table
-  await query(`
-    CREATE TABLE IF NOT EXISTS user_sessions (
-      id            SERIAL PRIMARY KEY,
-      user_id       TEXT NOT NULL UNIQUE,
-      last_seen_at  TIMESTAMPTZ DEFAULT NOW(),
-      session_count INTEGER DEFAULT 1,
-      first_seen_at TIMESTAMPTZ DEFAULT NOW()
-    )
-  `)
-}
-
 // GET /api/memory — load all memories for current user
 export async function GET() {
   const session = await getServerSession(authOptions)
@@ -44,7 +13,6 @@ export async function GET() {
   if (!userId) return NextResponse.json({ memories: [] })
 
   try {
-    await ensureTable()
     const result = await query(
       'SELECT id, category, hint, quote, content, created_at FROM user_memories WHERE user_id = $1 ORDER BY created_at ASC',
       [userId]
@@ -68,7 +36,6 @@ export async function POST(req: NextRequest) {
   if (!content) return NextResponse.json({ error: 'content required' }, { status: 400 })
 
   try {
-    await ensureTable()
     await query(
       'INSERT INTO user_memories (user_id, category, hint, quote, content) VALUES ($1, $2, $3, $4, $5)',
       [userId, category, hint ?? null, quote ?? null, content]
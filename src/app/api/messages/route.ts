@@ -5,23 +5,6 @@ import { query } from '@/lib/db'
 
 export const runtime = 'nodejs'
 
-// Ensure table exists (idempotent — safe to call every request)
-async function ensureTable() {
-  await query(`
-    CREATE TABLE IF NOT EXISTS chat_messages (
-      id           UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-      user_id      TEXT NOT NULL,
-      role         TEXT NOT NULL CHECK (role IN ('user', 'assistant')),
-      content      TEXT NOT NULL,
-      msg_type     TEXT DEFAULT 'text',
-      metadata     JSONB,
-      created_at   TIMESTAMPTZ DEFAULT NOW()
-    )
-  `)
-  await query(`CREATE INDEX IF NOT EXISTS idx_chat_messages_user_id ON chat_messages(user_id)`)
-  await query(`CREATE INDEX IF NOT EXISTS idx_chat_messages_created_at ON chat_messages(user_id, created_at)`)
-}
-
 // GET /api/messages — load the user's most recent 500 messages (ordered oldest→newest for display)
 export async function GET(req: NextRequest) {
   const session = await getServerSession(authOptions)
@@ -29,7 +12,6 @@ export async function GET(req: NextRequest) {
   if (!userId) return NextResponse.json({ messages: [] })
 
   try {
-    await ensureTable()
     const result = await query<{
       id: string; role: string; content: string; msg_type: string; metadata: Record<string, unknown> | null; created_at: string
     }>(
@@ -66,7 +48,6 @@ export async function POST(req: NextRequest) {
     const { role, content, type, ...rest } = await req.json()
     if (!role || !content) return NextResponse.json({ ok: false, error: 'role and content required' }, { status: 400 })
 
-    await ensureTable()
     const metadata = Object.keys(rest).length > 0 ? rest : null
     const result = await query<{ id: string }>(
       `INSERT INTO chat_messages (user_id, role, content, msg_type, metadata)
@@ -89,7 +70,6 @@ export async function DELETE(req: NextRequest) {
   if (!userId) return NextResponse.json({ ok: false }, { status: 401 })
 
   try {
-    await ensureTable()
     await query(`DELETE FROM chat_messages WHERE user_id = $1`, [userId])
     return NextResponse.json({ ok: true })
   } catch (err) {
@@ -1,53 +1,40 @@
+import { getProactiveHub } from '@/lib/proactiveHub'
+
 export const dynamic = 'force-dynamic'
 export const runtime = 'nodejs'
 
-type ProactiveClient = { ws: WebSocket | null; userId: string; sseSend?: (data: string) => void }
+const SSE_HIGH_WATER = 32
 
 export async function GET(req: Request) {
   const url = new URL(req.url)
   const userId = url.searchParams.get('userId')
   if (!userId) return new Response('Missing userId', { status: 400 })
 
+  const hub = getProactiveHub()
   const encoder = new TextEncoder()
   const stream = new ReadableStream({
     start(controller) {
-      const client = {
+      // Registered in the per-user hub (shared with the WS clients in server.js)
+      const client = hub.add({
         userId,
-        sseSend: (data: string) => {
-          try {
-            controller.enqueue(encoder.encode(`data: ${data}\n\n`))
-          } catch {
-            // Client disconnected
-          }
-        },
-      }
-
-      // Register in global clients (SSE clients have ws: null)
-      const clients: ProactiveClient[] = ((global.__proactiveClients as unknown) as ProactiveClient[]) ?? []
-      clients.push({ ws: null, userId, sseSend: client.sseSend })
-      global.__proactiveClients = clients as unknown as typeof global.__proactiveClients
-
-      // Heartbeat every 30s to keep connection alive through DO proxy
-      const interval = setInterval(() => {
-        try {
-          controller.enqueue(encoder.encode(': heartbeat\n\n'))
-        } catch {
-          clearInterval(interval)
-        }
-      }, 30_000)
+        kind: 'sse',
+        send: (data: string) => controller.enqueue(encoder.encode(`data: ${data}\n\n`)),
+        // desiredSize drops to 0 once SSE_HIGH_WATER chunks sit unread — the hub queues from there
+        backpressured: () => (controller.desiredSize ?? 1) <= 0,
+        // Shared heartbeat keeps the connection alive through DO proxy
+        heartbeat: () => controller.enqueue(encoder.encode(': heartbeat\n\n')),
+      })
 
       // Cleanup on close
       req.signal.addEventListener('abort', () => {
-        clearInterval(interval)
-        const idx = clients.findIndex(c => c.sseSend === client.sseSend)
-        if (idx !== -1) clients.splice(idx, 1)
+        hub.remove(client)
         try { controller.close() } catch {}
       })
 
       // Send initial ack
-      client.sseSend(JSON.stringify({ type: 'connected', data: 'Proactive SSE stream ready' }))
+      client.send(JSON.stringify({ type: 'connected', data: 'Proactive SSE stream ready' }))
     }
-  })
+  }, new CountQueuingStrategy({ highWaterMark: SSE_HIGH_WATER }))
 
   return new Response(stream, {
     headers: {
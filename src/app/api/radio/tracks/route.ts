@@ -5,22 +5,6 @@ import { query } from '@/lib/db'
 
 export const runtime = 'nodejs'
 
-async function ensureTable() {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_radio_tracks (
-      id         TEXT PRIMARY KEY,
-      user_id    TEXT NOT NULL,
-      title      TEXT NOT NULL,
-      artist     TEXT,
-      src        TEXT NOT NULL,
-      type       TEXT DEFAULT 'url',
-      cover_url  TEXT,
-      added_at   TIMESTAMPTZ DEFAULT NOW()
-    )
-  `)
-  await query(`CREATE INDEX IF NOT EXISTS idx_radio_tracks_user ON sparkie_radio_tracks(user_id, added_at DESC)`)
-}
-
 // GET /api/radio/tracks — load user's saved radio stations
 export async function GET() {
   const session = await getServerSession(authOptions)
@@ -28,7 +12,6 @@ export async function GET() {
   if (!userId) return NextResponse.json({ tracks: [] })
 
   try {
-    await ensureTable()
     const result = await query(
       `SELECT id, title, artist, src, type, cover_url, added_at
        FROM sparkie_radio_tracks WHERE user_id = $1 ORDER BY added_at ASC`,
@@ -57,7 +40,6 @@ export async function POST(req: NextRequest) {
   if (!userId) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
 
   try {
-    await ensureTable()
     const body = await req.json()
 
     // If body.tracks is an array — replace all (sync full state)
@@ -97,7 +79,6 @@ export async function DELETE(req: NextRequest) {
   if (!userId) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
 
   try {
-    await ensureTable()
     const { searchParams } = new URL(req.url)
     const trackId = searchParams.get('id')
     if (trackId) {
@@ -121,7 +102,6 @@ export async function PATCH(req: NextRequest) {
   }
 
   try {
-    await ensureTable()
     const { id, title, artist, coverUrl } = await req.json()
     if (!id) return NextResponse.json({ error: 'id required' }, { status: 400 })
 
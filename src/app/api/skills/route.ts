@@ -5,22 +5,7 @@ import { query } from '@/lib/db'
 
 export const runtime = 'nodejs'
 
-async function ensureSkillsTable() {
-  await query(`CREATE TABLE IF NOT EXISTS sparkie_skills (
-    id SERIAL PRIMARY KEY,
-    user_id TEXT,
-    name TEXT NOT NULL,
-    description TEXT DEFAULT '',
-    source_url TEXT DEFAULT '',
-    category TEXT DEFAULT 'Custom',
-    content TEXT DEFAULT '',
-    installed_at TIMESTAMPTZ DEFAULT NOW(),
-    UNIQUE(name)
-  )`).catch(() => {})
-}
-
 export async function GET(req: NextRequest) {
-  await ensureSkillsTable()
   const { searchParams } = new URL(req.url)
   const name = searchParams.get('name')
 
@@ -51,7 +36,6 @@ export async function GET(req: NextRequest) {
 }
 
 export async function POST(req: NextRequest) {
-  await ensureSkillsTable()
   const session = await getServerSession(authOptions)
   const user = session?.user as { id?: string } | undefined
   const userId = user?.id
@@ -42,18 +42,6 @@ export async function POST(req: NextRequest) {
     return NextResponse.json({ ok: false, error: 'Unauthorized' }, { status: 401 })
   }
 
-  await query(`CREATE TABLE IF NOT EXISTS sparkie_skills (
-    id SERIAL PRIMARY KEY,
-    user_id TEXT,
-    name TEXT NOT NULL,
-    description TEXT DEFAULT '',
-    source_url TEXT DEFAULT '',
-    category TEXT DEFAULT 'Custom',
-    content TEXT DEFAULT '',
-    installed_at TIMESTAMPTZ DEFAULT NOW(),
-    UNIQUE(name)
-  )`).catch(() => {})
-
   const results: Array<{ name: string; status: string }> = []
 
   for (const skill of SKILL_SEEDS) {
@@ -1,26 +1,7 @@
 import { NextResponse } from 'next/server'
 import { query } from '@/lib/db'
 
-async function ensureFeedTable() {
-  await query(`CREATE TABLE IF NOT EXISTS sparkie_feed (
-    id SERIAL PRIMARY KEY,
-    content TEXT NOT NULL,
-    media_url TEXT,
-    media_type TEXT DEFAULT 'none',
-    mood TEXT DEFAULT '',
-    likes INTEGER DEFAULT 0,
-    created_at TIMESTAMPTZ DEFAULT NOW(),
-    code_html TEXT,
-    code_title TEXT,
-    companion_image_url TEXT
-  )`).catch(() => {})
-  await query(`ALTER TABLE sparkie_feed ADD COLUMN IF NOT EXISTS code_html TEXT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_feed ADD COLUMN IF NOT EXISTS code_title TEXT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_feed ADD COLUMN IF NOT EXISTS companion_image_url TEXT`).catch(() => {})
-}
-
 export async function GET() {
-  await ensureFeedTable()
   try {
     const result = await query(
       `SELECT id, content, media_url, media_type, mood, likes, created_at, code_html, code_title, companion_image_url
@@ -33,7 +14,6 @@ export async function GET() {
 }
 
 export async function PATCH(req: Request) {
-  await ensureFeedTable()
   try {
     const { id } = await req.json() as { id: number }
     await query(`UPDATE sparkie_feed SET likes = likes + 1 WHERE id = $1`, [id])
@@ -45,7 +25,6 @@ export async function PATCH(req: Request) {
 
 // PUT — update an existing post (used by Sparkie to add real audio URLs, fix media, etc.)
 export async function PUT(req: Request) {
-  await ensureFeedTable()
   try {
     const body = await req.json() as {
       id: number
@@ -78,7 +57,6 @@ export async function PUT(req: Request) {
 
 // DELETE — remove a post by id
 export async function DELETE(req: Request) {
-  await ensureFeedTable()
   try {
     const { id } = await req.json() as { id: number }
     if (!id) return NextResponse.json({ error: 'id required' }, { status: 400 })
@@ -90,7 +68,6 @@ export async function DELETE(req: Request) {
 }
 
 export async function POST(req: Request) {
-  await ensureFeedTable()
   try {
     const body = await req.json() as {
       content: string
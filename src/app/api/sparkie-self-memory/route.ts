@@ -1,30 +1,11 @@
 import { NextRequest, NextResponse } from 'next/server'
 import { query } from '@/lib/db'
-import { ensureColumns, setMemoryTTL } from '@/lib/knowledgeTTL'
+import { setMemoryTTL } from '@/lib/knowledgeTTL'
 
 // Sparkie's own self-annotation memory — she learns about herself and the user
 // over time. Stored separately from user_memories (which is user-scoped by auth).
 // This table is server-trust only — no auth required, called by agent route.
 
-async function ensureTable() {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_self_memory (
-      id          SERIAL PRIMARY KEY,
-      category    TEXT NOT NULL DEFAULT 'self',
-      content     TEXT NOT NULL,
-      source      TEXT DEFAULT 'sparkie',
-      memory_type TEXT DEFAULT 'self',
-      expires_at  TIMESTAMPTZ,
-      stale_flagged BOOLEAN DEFAULT false,
-      created_at  TIMESTAMPTZ DEFAULT NOW()
-    )
-  `).catch(() => {})
-  await query(`
-    CREATE INDEX IF NOT EXISTS idx_sparkie_self_memory_category
-    ON sparkie_self_memory(category)
-  `).catch(() => {})
-}
-
 // GET — load Sparkie's memories (optionally filtered by category)
 export async function GET(req: NextRequest) {
   const { searchParams } = new URL(req.url)
@@ -32,8 +13,6 @@ export async function GET(req: NextRequest) {
   const limit = parseInt(searchParams.get('limit') || '50')
 
   try {
-    await ensureTable()
-    await ensureColumns()
     const rows = category
       ? await query(
           'SELECT id, category, content, source, created_at, expires_at, stale_flagged FROM sparkie_self_memory WHERE category = $1 ORDER BY created_at DESC LIMIT $2',
@@ -68,8 +47,6 @@ export async function POST(req: NextRequest) {
     if (!content?.trim()) {
       return NextResponse.json({ error: 'content required' }, { status: 400 })
     }
-    await ensureTable()
-    await ensureColumns()
 
     // Block 17: dedup — check for similar existing memories in same category
     const catMems = await query<{ id: number; content: string }>(
@@ -7,30 +7,6 @@ export const runtime = 'nodejs'
 
 const V3 = 'https://backend.composio.dev/api/v3'
 
-async function ensureTable() {
-  await query(`CREATE TABLE IF NOT EXISTS sparkie_tasks (
-    id TEXT PRIMARY KEY,
-    user_id TEXT NOT NULL,
-    action TEXT NOT NULL,
-    label TEXT NOT NULL,
-    payload JSONB NOT NULL DEFAULT '{}',
-    status TEXT NOT NULL DEFAULT 'pending',
-    executor TEXT NOT NULL DEFAULT 'human',
-    trigger_type TEXT DEFAULT 'manual',
-    trigger_config JSONB DEFAULT '{}',
-    scheduled_at TIMESTAMPTZ,
-    why_human TEXT,
-    draft_id TEXT,
-    created_at TIMESTAMPTZ DEFAULT NOW(),
-    resolved_at TIMESTAMPTZ
-  )`)
-  await query(`CREATE INDEX IF NOT EXISTS idx_sparkie_tasks_user ON sparkie_tasks(user_id, status)`)
-  await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS executor TEXT NOT NULL DEFAULT 'human'`).catch(() => {})
-  await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS trigger_type TEXT DEFAULT 'manual'`).catch(() => {})
-  await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS scheduled_at TIMESTAMPTZ`).catch(() => {})
-  await query(`ALTER TABLE sparkie_tasks ADD COLUMN IF NOT EXISTS draft_id TEXT`).catch(() => {})
-}
-
 // POST /api/tasks — create a new pending task
 export async function POST(req: NextRequest) {
   try {
@@ -52,7 +28,6 @@ export async function POST(req: NextRequest) {
       return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
     }
 
-    await ensureTable()
     const body = await req.json() as {
       id: string; action: string; label: string; payload: Record<string, unknown>
       executor?: string; why_human?: string; user_id?: string
@@ -94,7 +69,6 @@ export async function GET(req: NextRequest) {
     const userId = (session?.user as { id?: string } | undefined)?.id
     if (!userId) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
 
-    await ensureTable()
     const id = req.nextUrl.searchParams.get('id')
     const statusFilter = req.nextUrl.searchParams.get('status')
     const limit = Math.min(parseInt(req.nextUrl.searchParams.get('limit') ?? '30'), 100)
@@ -141,7 +115,6 @@ export async function DELETE(req: NextRequest) {
     const session = await getServerSession(authOptions)
     const userId = (session?.user as { id?: string } | undefined)?.id
     if (!userId) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
-    await ensureTable()
     const id = req.nextUrl.searchParams.get('id')
     if (!id) return NextResponse.json({ error: 'Missing id' }, { status: 400 })
     await query(
@@ -222,7 +195,6 @@ export async function PATCH(req: NextRequest) {
     const userId = (session?.user as { id?: string } | undefined)?.id
     if (!userId) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
 
-    await ensureTable()
     const body = await req.json() as {
       id?: string
       ids?: string[]
@@ -2,7 +2,7 @@ import { NextRequest, NextResponse } from 'next/server'
 import { Sandbox } from '@e2b/code-interpreter'
 import { getServerSession } from 'next-auth/next'
 import { authOptions } from '@/lib/auth'
-import { sessions, encodeMessage } from '@/lib/terminalSessions'
+import { sessions, ptyOutputFor } from '@/lib/terminalSessions'
 import type { WsClient } from '@/lib/terminalSessions'
 
 export const runtime = 'nodejs'
@@ -125,7 +125,7 @@ export default defineConfig({
               const text = Buffer.from(data).toString('utf-8')
               const sess2 = sessions.get(sessionId)
               if (!sess2) return
-              broadcastToClients(sess2.clients, encodeMessage('output', text))
+              ptyOutputFor(sess2).push(data)
               // Accumulate logs for /api/logs polling (Qwen model — no WS required)
               if (sess2.logBuffer.length < 500) {
                 sess2.logBuffer.push(text)
@@ -137,6 +137,7 @@ export default defineConfig({
                 if (VITE_READY_SIGNALS.some(sig => text.includes(sig))) {
                   sess2.previewSent = true
                   sess2.buildDone = true
+                  ptyOutputFor(sess2).flush() // preview notice lands after the output that triggered it
                   broadcastToClients(sess2.clients, JSON.stringify({ type: 'preview', url: sess2.previewUrl }))
                   console.log('[PTY] Preview ready — URL broadcast + polling available:', sess2.previewUrl)
                 }
@@ -178,11 +179,12 @@ export default defineConfig({
       const pty = await sess.sbx.pty.create({
         onData: (data: Uint8Array) => {
           const text = Buffer.from(data).toString('utf-8')
-          broadcastToClients(sess.clients, encodeMessage('output', text))
+          ptyOutputFor(sess).push(data)
 
           if (!sess.previewSent && sess.previewUrl) {
             if (VITE_READY_SIGNALS.some(sig => text.includes(sig))) {
               sess.previewSent = true
+              ptyOutputFor(sess).flush()
               broadcastToClients(sess.clients, JSON.stringify({ type: 'preview', url: sess.previewUrl }))
               console.log('[PTY] Vite ready — preview URL broadcast:', sess.previewUrl)
             }
@@ -5,51 +5,12 @@ import { query } from '@/lib/db'
 
 export const runtime = 'nodejs'
 
-async function ensureTable() {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_topics (
-      id          TEXT PRIMARY KEY,
-      user_id     TEXT NOT NULL,
-      name        TEXT NOT NULL,
-      fingerprint TEXT,
-      summary     TEXT,
-      notification_policy TEXT DEFAULT 'auto',
-      status      TEXT DEFAULT 'active',
-      created_at  TIMESTAMPTZ DEFAULT NOW(),
-      updated_at  TIMESTAMPTZ DEFAULT NOW()
-    )
-  `).catch(() => {})
-  await query(`CREATE INDEX IF NOT EXISTS idx_sparkie_topics_user ON sparkie_topics(user_id, status)`).catch(() => {})
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_topic_links (
-      id          SERIAL PRIMARY KEY,
-      topic_id    TEXT NOT NULL REFERENCES sparkie_topics(id) ON DELETE CASCADE,
-      source_type TEXT NOT NULL,
-      source_id   TEXT NOT NULL,
-      summary     TEXT,
-      created_at  TIMESTAMPTZ DEFAULT NOW()
-    )
-  `).catch(() => {})
-  await query(`CREATE INDEX IF NOT EXISTS idx_sparkie_topic_links ON sparkie_topic_links(topic_id)`).catch(() => {})
-
-  // Phase 2 column migration — adds resumption tracking fields
-  await query(`ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS last_state TEXT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS last_round INT DEFAULT 0`).catch(() => {})
-  await query(`ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS step_count INT DEFAULT 0`).catch(() => {})
-  await query(`ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS original_request TEXT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS topic_type TEXT DEFAULT 'chat'`).catch(() => {})
-  await query(`ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS cognition_state JSONB DEFAULT '{}'`).catch(() => {})
-  await query(`ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS aliases JSONB DEFAULT '[]'`).catch(() => {})
-  await query(`ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS total_threads INTEGER DEFAULT 0`).catch(() => {})
-}
-
 export async function GET(req: NextRequest) {
   const session = await getServerSession(authOptions)
   const userId = (session?.user as { id?: string })?.id
   if (!userId) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
 
   const topicId = req.nextUrl.searchParams.get('id')
-  await ensureTable()
 
   if (topicId) {
     const [topicRes, linksRes] = await Promise.all([
@@ -78,7 +39,6 @@ export async function POST(req: NextRequest) {
   const userId = (session?.user as { id?: string })?.id
   if (!userId) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
 
-  await ensureTable()
   const body = await req.json() as {
     action: 'create' | 'update' | 'archive' | 'link' | 'resume' | 'seed' | 'update_state' | 'find_build'
     id?: string
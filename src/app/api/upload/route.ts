@@ -6,31 +6,12 @@ import { query } from '@/lib/db'
 export const runtime = 'nodejs'
 export const maxDuration = 60
 
-async function ensureUploadsTable() {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_uploads (
-      id          SERIAL PRIMARY KEY,
-      file_id     TEXT NOT NULL UNIQUE,
-      user_id     TEXT NOT NULL,
-      filename    TEXT NOT NULL,
-      mime_type   TEXT NOT NULL DEFAULT 'application/octet-stream',
-      size_bytes  INTEGER NOT NULL DEFAULT 0,
-      content     TEXT NOT NULL,
-      created_at  TIMESTAMPTZ DEFAULT NOW()
-    )
-  `).catch(() => {})
-  await query(`CREATE INDEX IF NOT EXISTS idx_sparkie_uploads_user ON sparkie_uploads(user_id)`).catch(() => {})
-  await query(`CREATE INDEX IF NOT EXISTS idx_sparkie_uploads_file_id ON sparkie_uploads(file_id)`).catch(() => {})
-}
-
 export async function POST(req: NextRequest) {
   const session = await getServerSession(authOptions)
   const userId = (session?.user as { id?: string })?.id
   if (!userId) return NextResponse.json({ error: 'Not authenticated' }, { status: 401 })
 
   try {
-    await ensureUploadsTable()
-
     const formData = await req.formData()
     const file = formData.get('file') as File | null
     if (!file) return NextResponse.json({ error: 'No file provided' }, { status: 400 })
@@ -92,7 +73,6 @@ export async function GET(req: NextRequest) {
   if (!fileId) return NextResponse.json({ error: 'file_id required' }, { status: 400 })
 
   try {
-    await ensureUploadsTable()
     const res = await query(
       `SELECT filename, mime_type, size_bytes, content FROM sparkie_uploads WHERE file_id = $1 AND user_id = $2`,
       [fileId, userId]
@@ -5,11 +5,6 @@ import { query } from '@/lib/db'
 
 export const runtime = 'nodejs'
 
-async function ensureColumn() {
-  // Add preferences JSONB column to users table if it doesn't exist
-  await query(`ALTER TABLE users ADD COLUMN IF NOT EXISTS preferences JSONB DEFAULT '{}'`).catch(() => {})
-}
-
 // GET /api/user/preferences
 export async function GET() {
   const session = await getServerSession(authOptions)
@@ -17,7 +12,6 @@ export async function GET() {
   if (!userId) return NextResponse.json({ preferences: {} })
 
   try {
-    await ensureColumn()
     const result = await query(
       `SELECT preferences FROM users WHERE id = $1`,
       [userId]
@@ -37,7 +31,6 @@ export async function PATCH(req: NextRequest) {
   if (!userId) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
 
   try {
-    await ensureColumn()
     const body = await req.json()
 
     // Merge into existing preferences using PostgreSQL jsonb ||
@@ -5,39 +5,10 @@ import { query } from '@/lib/db'
 
 export const runtime = 'nodejs'
 
-async function ensureTable() {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_worklog (
-      id TEXT PRIMARY KEY,
-      user_id TEXT NOT NULL,
-      type TEXT NOT NULL,
-      content TEXT NOT NULL,
-      metadata JSONB DEFAULT '{}',
-      cost_usd NUMERIC(10,6),
-      created_at TIMESTAMPTZ DEFAULT NOW()
-    )
-  `).catch(() => {})
-  // Idempotent: add cost_usd column if table already exists without it
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS cost_usd NUMERIC(10,6)`).catch(() => {})
-  // Columns migrated from src/lib/worklog.ts ensureTable()
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS actual_duration_ms INT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS conclusion TEXT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS status TEXT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS decision_type TEXT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS reasoning TEXT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS estimated_duration_ms INT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS signal_priority INT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS confidence NUMERIC(5,4)`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS depends_on JSONB`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS side_effect_of TEXT`).catch(() => {})
-  await query(`CREATE INDEX IF NOT EXISTS idx_worklog_user_time ON sparkie_worklog(user_id, created_at DESC)`).catch(() => {})
-}
-
 export async function GET(req: NextRequest) {
   const session = await getServerSession(authOptions)
   if (!session?.user) return NextResponse.json({ entries: [], stats: { emails: 0, messages: 0 } })
 
-  await ensureTable()
   const userId = (session.user as { id?: string }).id ?? session.user.email ?? ''
   const { searchParams } = new URL(req.url)
   const limit = Math.min(parseInt(searchParams.get('limit') ?? '60'), 200)
@@ -95,7 +66,6 @@ export async function POST(req: NextRequest) {
     body = await req.json() as typeof body
   }
 
-  await ensureTable()
   const id = crypto.randomUUID()
   const { depends_on, side_effect_of, confidence, status: wlStatus, decision_type, reasoning, estimated_duration_ms, signal_priority, cost_usd, actual_duration_ms, conclusion, ...restMeta } = (body.metadata ?? {}) as Record<string, unknown>
   await query(
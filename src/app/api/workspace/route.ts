@@ -13,28 +13,12 @@ export const runtime = 'nodejs'
 // DELETE /api/workspace?key=<key>         → { ok: true }
 // GET  /api/workspace (no key)            → { entries: [{key, value, updated_at}] } (owner only, last 100)
 
-async function ensureTable() {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_workspace (
-      id         SERIAL PRIMARY KEY,
-      user_id    TEXT NOT NULL,
-      key        TEXT NOT NULL,
-      value      TEXT NOT NULL,
-      created_at TIMESTAMPTZ DEFAULT NOW(),
-      updated_at TIMESTAMPTZ DEFAULT NOW(),
-      UNIQUE(user_id, key)
-    )
-  `)
-  await query(`CREATE INDEX IF NOT EXISTS idx_workspace_user_key ON sparkie_workspace(user_id, key)`)
-}
-
 export async function GET(req: NextRequest) {
   const session = await getServerSession(authOptions)
   const userId = (session?.user as { id?: string } | undefined)?.id
   if (!userId) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
 
   try {
-    await ensureTable()
     const key = req.nextUrl.searchParams.get('key')
 
     if (!key) {
@@ -67,7 +51,6 @@ export async function POST(req: NextRequest) {
   if (!userId) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
 
   try {
-    await ensureTable()
     const body = await req.json()
     const { key, value } = body as { key?: string; value?: string }
     if (!key?.trim()) return NextResponse.json({ error: 'key required' }, { status: 400 })
@@ -92,7 +75,6 @@ export async function DELETE(req: NextRequest) {
   if (!userId) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
 
   try {
-    await ensureTable()
     const key = req.nextUrl.searchParams.get('key')
     if (!key) return NextResponse.json({ error: 'key required' }, { status: 400 })
 
@@ -1,8 +1,10 @@
 "use client"
 
+import { memo, useRef } from "react"
 import ReactMarkdown from "react-markdown"
 import remarkGfm from "remark-gfm"
 import type { Components } from "react-markdown"
+import { MarkdownBlockSplitter } from "@/lib/markdownBlocks"
 
 interface Props {
   content: string
@@ -92,21 +94,39 @@ const components: Components = {
   },
 }
 
+const remarkPlugins = [remarkGfm]
+
+// One top-level block. Completed blocks keep the same source string, so memo skips them
+const MarkdownBlock = memo(function MarkdownBlock({ source }: { source: string }) {
+  return (
+    <ReactMarkdown remarkPlugins={remarkPlugins} components={components}>
+      {source}
+    </ReactMarkdown>
+  )
+})
+
+// ── Streaming: completed blocks parsed once, only the open tail per update ───
+
+function StreamingMarkdown({ content }: { content: string }) {
+  const splitter = useRef<MarkdownBlockSplitter | null>(null)
+  if (!splitter.current) splitter.current = new MarkdownBlockSplitter()
+  const { blocks, tail } = splitter.current.update(content)
+  return (
+    <>
+      {blocks.map((block, i) => <MarkdownBlock key={i} source={block} />)}
+      {tail.trim() && <MarkdownBlock source={tail} />}
+    </>
+  )
+}
+
 // ── Main component ────────────────────────────────────────────────────────────
 
 export function AnimatedMarkdown({ content, isStreaming, messageId: _ }: Props) {
-  // During streaming: plain pre-wrap render — fast, no re-parsing
-  if (isStreaming) {
-    return (
-      <p style={{ wordBreak: "break-word", overflowWrap: "anywhere", whiteSpace: "pre-wrap", margin: 0 }}>
-        {content || " "}
-      </p>
-    )
-  }
-
-  // After streaming: full markdown render, static, no animation
+  if (isStreaming) return <StreamingMarkdown content={content} />
+
+  // After streaming: one full markdown render (reference links, loose lists), static, no animation
   return (
-    <ReactMarkdown remarkPlugins={[remarkGfm]} components={components}>
+    <ReactMarkdown remarkPlugins={remarkPlugins} components={components}>
       {content || " "}
     </ReactMarkdown>
   )
@@ -1,15 +1,17 @@
 "use client"
 
 import { useState, memo, useRef, useCallback, useEffect } from "react"
-import { useAppStore, StepTrace, flattenFileTree } from "@/store/appStore"
+import { useAppStore, StepTrace, flattenFileTree, selectChatMessageIds } from "@/store/appStore"
 import { useShallow } from "zustand/react/shallow"
+import { FrameCoalescer } from "@/lib/frameCoalescer"
 
 // ── Step trace + worklog card types ──────────────────────────────────────
 interface WorklogCard { tool: string; summary: string; ts: string }
 
 // STEP_ICON_MAP moved to ChatView
 // WORKLOG_TOOL_LABEL moved to ChatView
-import { parseAIResponse, getLanguageFromFilename, deriveProjectName } from "@/lib/fileParser"
+import { StreamingFileParser, getLanguageFromFilename, deriveProjectName } from "@/lib/fileParser"
+import type { ParsedFile } from "@/lib/fileParser"
 import { isCDNCompatible } from "@/lib/cdnPreview"
 import { Paperclip, ArrowUp, Sparkles, ChevronDown, Image as ImageIcon, Video, Music, Mic, MicOff, FileText, Headphones, Phone, Film, X, Square } from "lucide-react"
 import { VoiceChat } from "@/components/chat/VoiceChat"
@@ -204,7 +206,6 @@ export function ChatInput() {
   const isPausedRef = useRef(false)         // Block 5: pause flag checked in stream loop
   const pausedMsgIdRef = useRef<string | null>(null) // tracks which message was paused
   const [isRecording, setIsRecording] = useState(false)
-  const streamFlushRef = useRef<number>(0)
   const [isTranscribing, setIsTranscribing] = useState(false)
   const [isVoiceChatOpen, setIsVoiceChatOpen] = useState(false)
   const [messageQueue, setMessageQueue] = useState<string[]>([])
@@ -317,7 +318,7 @@ export function ChatInput() {
     if (!chat) return
     const projectName = deriveProjectName(chat?.title || 'New Chat')
 
-    const apiMessages = chat.messages
+    const apiMessages = useAppStore.getState().getChatMessages(chatId)
       .filter((m) => m.type !== "image" && m.type !== "video")
       .map((m) => ({ role: m.role, content: m.content }))
 
@@ -355,7 +356,7 @@ export function ChatInput() {
       // The NEW userContent (current submit) is NOT yet in the messages store,
       // so look backwards through messages for the last user message with >4 words
       // (skipping short conversational messages like "good job", "thanks", etc.)
-      const allUserMsgs = (useAppStore.getState().chats.find(c => c.id === chatId)?.messages ?? []).filter(m => m.role === 'user')
+      const allUserMsgs = useAppStore.getState().getChatMessages(chatId).filter(m => m.role === 'user')
       const prevCodingMsg = allUserMsgs.slice().reverse().find(m => m.content.trim().split(/\s+/).length > 4)
       const nameSource = prevCodingMsg?.content || activeFiles[0]?.name || 'project'
       const folderName = nameSource
@@ -411,7 +412,7 @@ export function ChatInput() {
       const userProfile = useAppStore.getState().userProfile
       // Option A: inject live connectedApps list on first/early messages
       let connectedApps: string[] | undefined
-      const allMsgs = useAppStore.getState().chats.find((c) => c.id === chatId)?.messages ?? []
+      const allMsgs = useAppStore.getState().getChatMessages(chatId)
       if (allMsgs.length <= 4) {
         try {
           const connRes = await fetch('/api/connectors?action=status')
@@ -448,9 +449,37 @@ export function ChatInput() {
       }
 
       let buffer = ""
-      let fullContent = ""
       let filesCreated = 0
       const createdFileNames = new Set<string>()
+      // Parses only what each delta adds; finish() is the same one-shot parse as before
+      const fileStream = new StreamingFileParser(projectName)
+
+      const applyFile = (file: ParsedFile) => {
+        if (!createdFileNames.has(file.name)) {
+          createdFileNames.add(file.name)
+
+          // Clear old non-archive files on first file creation
+          if (filesCreated === 0) {
+            const isArchivedNode = (f: import('@/store/appStore').FileNode) => f.type === 'archive'
+            const oldFiles = useAppStore.getState().files.filter(f => !isArchivedNode(f))
+            oldFiles.forEach(f => useAppStore.getState().deleteFile(f.id))
+          }
+
+          const fileId = upsertFile(file.name, file.content, getLanguageFromFilename(file.name))
+
+          if (filesCreated === 0) setActiveFile(fileId)
+          filesCreated++
+
+          // Show file badge in LiveCodeView header
+          addLiveCodeFile(file.name)
+          // Broadcast to Process tab so it shows each file as it's written
+          window.dispatchEvent(new CustomEvent('sparkie_step_trace', { detail: { icon: 'file', label: file.name, status: 'done' } }))
+        } else {
+          // Update existing file content as it grows
+          // Update with complete final content (handles folder-prefixed paths)
+          upsertFile(file.name, file.content, getLanguageFromFilename(file.name))
+        }
+      }
 
       while (true) {
         const { done, value } = await reader.read()
@@ -459,6 +488,7 @@ export function ChatInput() {
         buffer += decoder.decode(value, { stream: true })
         const lines = buffer.split("\n")
         buffer = lines.pop() || ""
+        let growing: ParsedFile | null = null
 
         for (const line of lines) {
           const trimmed = line.trim()
@@ -469,64 +499,22 @@ export function ChatInput() {
             const parsed = JSON.parse(data)
             const delta = parsed.choices?.[0]?.delta
             if (delta?.content) {
-              fullContent += delta.content
+              const update = fileStream.push(delta.content)
+              for (const file of update.completed) applyFile(file)
+              growing = update.growing
               // Stream directly to LiveCodeView
               appendLiveCode(delta.content)
             }
           } catch { /* skip */ }
         }
 
-        // Incrementally detect completed file blocks
-        const partialParse = parseAIResponse(fullContent, projectName)
-        for (const file of partialParse.files) {
-          if (!createdFileNames.has(file.name)) {
-            createdFileNames.add(file.name)
-
-            // Clear old non-archive files on first file creation
-            if (filesCreated === 0) {
-              const isArchivedNode = (f: import('@/store/appStore').FileNode) => f.type === 'archive'
-              const oldFiles = useAppStore.getState().files.filter(f => !isArchivedNode(f))
-              oldFiles.forEach(f => useAppStore.getState().deleteFile(f.id))
-            }
-
-            const fileId = upsertFile(file.name, file.content, getLanguageFromFilename(file.name))
-
-            if (filesCreated === 0) setActiveFile(fileId)
-            filesCreated++
-
-            // Show file badge in LiveCodeView header
-            addLiveCodeFile(file.name)
-            // Broadcast to Process tab so it shows each file as it's written
-            window.dispatchEvent(new CustomEvent('sparkie_step_trace', { detail: { icon: 'file', label: file.name, status: 'done' } }))
-          } else {
-            // Update existing file content as it grows
-            // Update with complete final content (handles folder-prefixed paths)
-            upsertFile(file.name, file.content, getLanguageFromFilename(file.name))
-          }
-        }
+        // The file still being written, once per read
+        if (growing) applyFile(growing)
       }
 
       // Final parse
-      const finalParse = parseAIResponse(fullContent, projectName)
-      for (const file of finalParse.files) {
-        if (!createdFileNames.has(file.name)) {
-          createdFileNames.add(file.name)
-          if (filesCreated === 0) {
-            const isArchivedNode = (f: import('@/store/appStore').FileNode) => f.type === 'archive'
-            const oldFiles = useAppStore.getState().files.filter(f => !isArchivedNode(f))
-            oldFiles.forEach(f => useAppStore.getState().deleteFile(f.id))
-          }
-          const fileId = upsertFile(file.name, file.content, getLanguageFromFilename(file.name))
-          if (filesCreated === 0) setActiveFile(fileId)
-          filesCreated++
-          addLiveCodeFile(file.name)
-          // Broadcast to Process tab so it shows each file as it's written
-          window.dispatchEvent(new CustomEvent('sparkie_step_trace', { detail: { icon: 'file', label: file.name, status: 'done' } }))
-        } else {
-          // Update with complete final content (handles folder-prefixed paths)
-          upsertFile(file.name, file.content, getLanguageFromFilename(file.name))
-        }
-      }
+      const finalParse = fileStream.finish()
+      for (const file of finalParse.files) applyFile(file)
 
       // Update chat with description only
       if (filesCreated > 0) {
@@ -557,7 +545,7 @@ export function ChatInput() {
           const restored = latest.children ?? []
           useAppStore.getState().setFiles([...olderArchives, ...restored])
         }
-        const finalText = fullContent || "The model used all tokens for reasoning. Try a simpler prompt."
+        const finalText = fileStream.received || "The model used all tokens for reasoning. Try a simpler prompt."
         updateMessage(chatId, assistantMsgId, {
           content: finalText,
           isStreaming: false,
@@ -1075,7 +1063,7 @@ export function ChatInput() {
   const streamReply = useCallback(async (chatId: string, userContent: string) => {
     const chat = useAppStore.getState().chats.find((c) => c.id === chatId)
     if (!chat) return
-    const rawMessages = chat.messages
+    const rawMessages = useAppStore.getState().getChatMessages(chatId)
       .filter((m) => m.type !== "image" && m.type !== "video")
       .map((m) => {
         // Vision: if this message has an imageUrl, send as multipart content for model to see
@@ -1104,6 +1092,7 @@ export function ChatInput() {
     // ── Open IDE to Process tab — show live step traces and thinking bubbles ──
     if (!ideOpen) openIDE()
     setIDETab('process')
+    let frames: FrameCoalescer<string> | null = null
     try {
       const userProfile = useAppStore.getState().userProfile
       chatAbortRef.current?.abort()
@@ -1125,6 +1114,8 @@ export function ChatInput() {
       if (!reader) { setStreaming(false); return }
       let buffer = "", fullContent = ""
       const convStreamStart = Date.now()
+      // Content + reasoning deltas paint at most once per frame; the loop below keeps fullContent current
+      frames = new FrameCoalescer((content: string) => updateMessage(chatId, assistantMsgId, { content }))
       // Seed the initial "thinking" trace into both the ref (for frozen cards) and the
       // custom event (for the live ProcessTab listener). Without seeding the ref here,
       // pure conversational responses with no tools would have zero traces in toolTraces.
@@ -1303,6 +1294,7 @@ export function ChatInput() {
               _setStepTraces([])
               _stepTracesRef.current = []
               useAppStore.getState().setLongTaskLabel(null)
+              frames.cancel()
               updateMessage(chatId, assistantMsgId, {
                 content: fullContent || parsed.text || "I've queued that for your approval — check the card below.",
                 isStreaming: false,
@@ -1326,6 +1318,7 @@ export function ChatInput() {
             }
             // Block 5: check pause flag before processing further tokens
             if (isPausedRef.current) {
+              frames.cancel()
               updateMessage(chatId, assistantMsgId, {
                 content: fullContent || '⏸ *Paused* — send me what you forgot and I\'ll continue from here.',
                 isStreaming: false,
@@ -1342,24 +1335,20 @@ export function ChatInput() {
               // Dispatch immediately so Live Activity shows word-by-word in real time during stream
               window.dispatchEvent(new CustomEvent('sparkie:live-chunk', { detail: parsed.reasoning_chunk as string }))
               fullContent += parsed.reasoning_chunk as string
-              clearTimeout(streamFlushRef.current)
-              streamFlushRef.current = setTimeout(() => {
-                updateMessage(chatId, assistantMsgId, { content: fullContent })
-              }, 16) as unknown as number
+              frames.set(fullContent)
             }
             const delta = parsed.choices?.[0]?.delta
             if (delta?.content) {
               fullContent += delta.content
               // Feed each token to the Live Activity ticker (strips markdown client-side)
               window.dispatchEvent(new CustomEvent('sparkie:live-chunk', { detail: delta.content }))
-              clearTimeout(streamFlushRef.current)
-              streamFlushRef.current = setTimeout(() => {
-                updateMessage(chatId, assistantMsgId, { content: fullContent })
-              }, 16) as unknown as number
+              frames.set(fullContent)
             }
           } catch { /* skip */ }
         }
       }
+      // Final chunk: everything received is on screen before the finalizing updates below
+      frames.flush()
       // BUILD_REDIRECT: Only re-route if the model gave JUST a "I'll do it" with nothing else
       // AND the original message had strong task intent (not emotional/greeting)
       const BUILD_REDIRECT_RE = /^\s*(i'll build|let me build|i'll create|let me create|building that|creating that)[\.!]?\s*$/i
@@ -1396,8 +1385,7 @@ export function ChatInput() {
       // Check if toolTraces were already stamped by the task_chip_clear handler.
       // If yes, just finalize content — don't overwrite the real traces with a placeholder.
       // If no (pure conversational response, no tools called), stamp a minimal trace.
-      const alreadyStamped = (useAppStore.getState().chats.find(c => c.id === chatId)
-        ?.messages.find(m => m.id === assistantMsgId)?.toolTraces?.length ?? 0) > 0
+      const alreadyStamped = (useAppStore.getState().messagesById[assistantMsgId]?.toolTraces?.length ?? 0) > 0
       if (alreadyStamped) {
         updateMessage(chatId, assistantMsgId, { content: finalContent, isStreaming: false, ...extraUpdate })
       } else {
@@ -1408,10 +1396,18 @@ export function ChatInput() {
       saveMessage('assistant', finalContent)
       // ── Worklog framing: log response sent ──
       addWorklogEntry({ type: 'ai_response', content: `You just sent me a message:\n${userContent.slice(0, 120)}${userContent.length > 120 ? '\u2026' : ''}`, status: 'done' })
-    } catch {
-      updateMessage(chatId, assistantMsgId, { content: "Connection error.", isStreaming: false })
-      addWorklogEntry({ type: 'error', content: 'Connection error', status: 'error' })
+    } catch (err) {
+      if (frames && (err as Error)?.name === 'AbortError') {
+        // Stopped by the user — keep what already streamed instead of an error
+        frames.flush()
+        updateMessage(chatId, assistantMsgId, { isStreaming: false })
+      } else {
+        frames?.cancel()
+        updateMessage(chatId, assistantMsgId, { content: "Connection error.", isStreaming: false })
+        addWorklogEntry({ type: 'error', content: 'Connection error', status: 'error' })
+      }
     } finally {
+      frames?.cancel()
       setHiveStatus(null)
       setStreaming(false)
       useAppStore.getState().setLongTaskLabel(null)  // always clear chip on completion/error
@@ -1449,7 +1445,7 @@ export function ChatInput() {
       }
     }
 
-    const apiMessages = (chat?.messages ?? [])
+    const apiMessages = (chat ? useAppStore.getState().getChatMessages(chat.id) : [])
       .filter(m => m.type !== 'image' && m.type !== 'video')
       .map(m => ({ role: m.role, content: m.content }))
       .slice(0, -1) // exclude last message — it's the user msg just added; appended manually below
@@ -1536,6 +1532,8 @@ export function ChatInput() {
       let fullBuild = ''
       let filesCreated = 0
       const createdFileNames = new Set<string>()
+      // Parses only what each delta adds; recreated when the project name changes
+      let fileStream = new StreamingFileParser(projectName)
       let lastThinkingText = '⚡ Initializing agent...'
       // build_resuming state — populated when backend finds a checkpoint
       let isResuming = false
@@ -1560,6 +1558,8 @@ export function ChatInput() {
             if (parsed.event === 'project_name' && parsed.name) {
               // Server confirmed project name — use it (already set client-side but server may differ)
               projectName = parsed.name as string
+              fileStream = new StreamingFileParser(projectName)
+              if (fullBuild) fileStream.push(fullBuild)
             } else if (parsed.event === 'thinking') {
               lastThinkingText = parsed.text
               updateMessage(chatId, thinkingMsgId, { content: lastThinkingText, isStreaming: true })
@@ -1584,8 +1584,10 @@ export function ChatInput() {
                 }
                 resumeCheckpointFiles = checkpointState.fullBuildRaw ?? ''
                 if (resumeCheckpointFiles) {
-                  // Parse and upsert all files from the checkpoint
-                  const cp = parseAIResponse(resumeCheckpointFiles, projectName)
+                  // Parse and upsert all files from the checkpoint; new deltas continue the same stream
+                  fileStream = new StreamingFileParser(projectName)
+                  fileStream.push(resumeCheckpointFiles)
+                  const cp = fileStream.finish()
                   for (const folder of (cp.folders ?? [])) {
                     upsertFile(`${folder}/.gitkeep`, '', 'plaintext')
                   }
@@ -1615,12 +1617,12 @@ export function ChatInput() {
               // Create build message bubble on first delta (lazy — avoids double-bubble during planning)
               ensureBuildMsg()
               // Parse files incrementally (folders + files)
-              const partialParse = parseAIResponse(fullBuild, projectName)
+              const update = fileStream.push(parsed.content)
               // Create explicit folder nodes from ---FOLDER:--- markers
-              for (const folder of (partialParse.folders ?? [])) {
+              for (const folder of update.folders) {
                 upsertFile(`${folder}/.gitkeep`, '', 'plaintext')
               }
-              for (const file of partialParse.files) {
+              for (const file of update.growing ? [...update.completed, update.growing] : update.completed) {
                 if (!createdFileNames.has(file.name)) {
                   createdFileNames.add(file.name)
                   // Files are now isolated per project folder — no clearing needed
@@ -1641,7 +1643,7 @@ export function ChatInput() {
               }
             } else if (parsed.event === 'done') {
               // Final parse pass (folders + files)
-              const finalParse = parseAIResponse(fullBuild, projectName)
+              const finalParse = fileStream.finish()
               for (const folder of (finalParse.folders ?? [])) {
                 upsertFile(`${folder}/.gitkeep`, '', 'plaintext')
               }
@@ -2081,7 +2083,7 @@ Promise.all([
         }
         // No files produced — show clean conversational response or helpful fallback
         if (fullBuild) {
-          const finalParse = parseAIResponse(fullBuild, projectName)
+          const finalParse = fileStream.finish()
           const textOnly = finalParse.text || ''
           const hasFileMarkers = fullBuild.includes('---FILE:')
           if (textOnly.length > 0 && !hasFileMarkers) {
@@ -2136,9 +2138,7 @@ Promise.all([
         const state = useAppStore.getState()
         const chatId = state.currentChatId
         if (!chatId) return
-        const chat = state.chats.find(c => c.id === chatId)
-        if (!chat) return
-        for (const msg of chat.messages) {
+        for (const msg of state.getChatMessages(chatId)) {
           if (msg.isStreaming) {
             state.updateMessage(chatId, msg.id, { isStreaming: false })
           }
@@ -2247,9 +2247,10 @@ Promise.all([
     // Call chat/AI directly and collect the full text reply
     return new Promise<string>((resolve) => {
       (async () => {
+        let frames: FrameCoalescer<string> | null = null
         try {
           // Pass full chat history so Sparkie has context (not just the current utterance)
-          const chatHistory = useAppStore.getState().chats.find(c => c.id === chatId)?.messages ?? []
+          const chatHistory = useAppStore.getState().getChatMessages(chatId)
           const apiMessages = chatHistory
             .filter(m => m.type !== 'image' && m.type !== 'video')
             .map(m => ({ role: m.role, content: m.content }))
@@ -2279,6 +2280,7 @@ Promise.all([
           const decoder = new TextDecoder()
           let fullText = ''
           const msgId = addMessage(chatId!, { role: 'assistant', content: '', isStreaming: true })
+          frames = new FrameCoalescer((content: string) => updateMessage(chatId!, msgId, { content }))
 
           while (true) {
             const { done, value } = await reader.read()
@@ -2295,16 +2297,18 @@ Promise.all([
                   const delta = parsed?.choices?.[0]?.delta?.content || parsed?.delta?.text || ''
                   if (delta) {
                     fullText += delta
-                    updateMessage(chatId!, msgId, { content: fullText })
+                    frames.set(fullText)
                   }
                 } catch {}
               }
             }
           }
 
+          frames.cancel()
           updateMessage(chatId!, msgId, { content: fullText, isStreaming: false })
           resolve(fullText || "Done!")
         } catch {
+          frames?.cancel()
           resolve("Sorry, something went wrong.")
         }
       })()
@@ -2638,7 +2642,7 @@ Promise.all([
     speech: "Enter the text you want to convert to speech...",
   }
 
-  const messages_count = useAppStore(useShallow((s) => s.messages.length))
+  const messages_count = useAppStore((s) => selectChatMessageIds(s.currentChatId)(s).length)
   const showTemplates = messages_count === 0 && isEmpty && genMode === "chat"
 
   return (
@@ -1,10 +1,10 @@
 'use client'
 
 import { useEffect, useRef, useState } from 'react'
-import { useAppStore } from '@/store/appStore'
+import { useAppStore, selectChatMessageIds } from '@/store/appStore'
 import { useShallow } from 'zustand/react/shallow'
 import { ChatInput } from './ChatInput'
-import { MessageBubble } from './MessageBubble'
+import { MessageBubbleById } from './MessageBubble'
 import { Code, Share, MoreHorizontal } from 'lucide-react'
 
 interface StepTrace { icon: string; label: string; status: 'running' | 'done' | 'error'; duration?: number }
@@ -26,6 +26,7 @@ export function ChatView() {
     }))
   )
   const chat = chats.find(c => c.id === currentChatId)
+  const messageIds = useAppStore(selectChatMessageIds(currentChatId))
   const scrollRef = useRef<HTMLDivElement>(null)
   const [traceOpen, setTraceOpen] = useState(false)
   const [streamTraces, setStreamTraces] = useState<StepTrace[]>([])
@@ -39,7 +40,7 @@ export function ChatView() {
       }
     })
     return () => cancelAnimationFrame(raf)
-  }, [chat?.messages?.length, streamTraces.length, longTaskLabel])
+  }, [messageIds.length, streamTraces.length, longTaskLabel])
 
   useEffect(() => {
     const handler = (e: Event) => {
@@ -176,8 +177,8 @@ export function ChatView() {
             {thinkingDisplay}
           </div>
         )}
-        {chat.messages.filter(msg => msg.isStreaming || msg.content || msg.pendingTask).map((msg) => (
-          <MessageBubble key={msg.id} message={msg} userAvatarUrl={userAvatarUrl} />
+        {messageIds.map((id) => (
+          <MessageBubbleById key={id} id={id} userAvatarUrl={userAvatarUrl} />
         ))}
       </div>
 
@@ -3,7 +3,7 @@
 import React, { useState, useEffect } from "react"
 import { Message, PendingTask, StepTrace, AceMusicMetadata } from "@/store/appStore"
 import { TaskApprovalCard } from "@/components/chat/TaskApprovalCard"
-import { useAppStore } from "@/store/appStore"
+import { useAppStore, selectMessage } from "@/store/appStore"
 import { useShallow } from "zustand/react/shallow"
 import { Sparkles, User, Copy, RefreshCw, ThumbsUp, ThumbsDown, Download, Check, ExternalLink, FileCode, Layers, Eye, Clock, Brain, ChevronRight, CheckCircle, AlertCircle, Loader2, Square, Pause, Paperclip, FileText, FileImage, FileSpreadsheet } from "lucide-react"
 import { SparkieCard } from "@/components/chat/SparkieCards"
@@ -646,3 +646,11 @@ function MessageBubbleInner({ message, userAvatarUrl }: Props) {
 }
 
 export const MessageBubble = React.memo(MessageBubbleInner)
+
+// Subscribes to one message by id — a streaming token re-renders only this bubble,
+// not the list. Empty placeholders (no content, not streaming, no task) render nothing.
+export const MessageBubbleById = React.memo(function MessageBubbleById({ id, userAvatarUrl }: { id: string; userAvatarUrl?: string | null }) {
+  const message = useAppStore(selectMessage(id))
+  if (!message || !(message.isStreaming || message.content || message.pendingTask)) return null
+  return <MessageBubble message={message} userAvatarUrl={userAvatarUrl} />
+})
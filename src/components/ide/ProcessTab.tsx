@@ -1,7 +1,7 @@
 'use client'
 
 import React, { useEffect, useRef, useState } from 'react'
-import { useAppStore, StepTrace } from '@/store/appStore'
+import { useAppStore, StepTrace, selectChatMessageIds } from '@/store/appStore'
 import { useShallow } from 'zustand/react/shallow'
 import { Brain, CheckCircle, AlertCircle, Loader2, Zap, Cpu, Database, ChevronRight, FileText, Pencil, Terminal, Search, Globe, Scroll, Rocket, Image, Music, Video, Mic, Hash, Clock, Hash as HashIcon, Mail, Calendar, Code2, GitBranch, Trash2, CalendarDays } from 'lucide-react'
 
@@ -203,9 +203,8 @@ function FrozenCard({ group, index, hasLive, isSettled, tagFilter, prevMsgId }:
 }
 
 export function ProcessTab() {
-  const { chats, currentChatId, longTaskLabel, selectedModel, ideTab, setIdeTab } = useAppStore(
+  const { currentChatId, longTaskLabel, selectedModel, ideTab, setIdeTab } = useAppStore(
     useShallow((s) => ({
-      chats: s.chats,
       currentChatId: s.currentChatId,
       longTaskLabel: s.longTaskLabel,
       selectedModel: s.selectedModel,
@@ -404,16 +403,17 @@ export function ProcessTab() {
     }
   }, [longTaskLabel])
 
-  // Collect frozen toolTraces from recent assistant messages
-  const chat = chats.find(c => c.id === currentChatId)
+  // Collect frozen toolTraces from recent assistant messages (newest first).
+  // Selects the trace arrays themselves so streaming tokens don't re-render this tab.
+  const traceLists = useAppStore(useShallow((s) =>
+    selectChatMessageIds(currentChatId)(s)
+      .map(id => s.messagesById[id])
+      .filter(m => m && m.role === 'assistant' && m.toolTraces && m.toolTraces.length > 0)
+      .map(m => m.toolTraces!)
+  ))
   const frozenTraces: StepTrace[] = []
-  if (chat) {
-    const assistantMsgs = [...chat.messages]
-      .filter(m => m.role === 'assistant' && m.toolTraces && m.toolTraces.length > 0)
-      .reverse()
-    for (const msg of assistantMsgs) {
-      frozenTraces.push(...msg.toolTraces!)
-    }
+  for (let i = traceLists.length - 1; i >= 0; i--) {
+    frozenTraces.push(...traceLists[i])
   }
 
   const isLive = !!longTaskLabel
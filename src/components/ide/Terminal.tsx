@@ -40,7 +40,7 @@ function flattenWithPaths(nodes: FileNode[], prefix = ''): E2BFile[] {
 // ─── types ───────────────────────────────────────────────────────────────────
 interface XTermInstance {
   open(el: HTMLElement): void
-  write(data: string): void
+  write(data: string | Uint8Array): void
   clear(): void
   dispose(): void
   onData(cb: (data: string) => void): void
@@ -172,10 +172,12 @@ export function Terminal() {
     term: XTermInstance,
     retryCount = 0
   ): WebSocket {
-    const url = buildWsUrl(`/api/terminal-ws?sessionId=${sessionId}`)
+    // frames=binary: PTY output arrives as coalesced binary frames, control messages stay JSON
+    const url = buildWsUrl(`/api/terminal-ws?sessionId=${sessionId}&frames=binary`)
     console.log('[Terminal] Opening WebSocket:', url)
 
     const ws = new WebSocket(url)
+    ws.binaryType = 'arraybuffer'
     wsRef.current = ws
     if (mountedRef.current) setWsStatus('connecting')
 
@@ -192,6 +194,10 @@ export function Terminal() {
 
     // ALL state updates happen in onmessage
     ws.onmessage = (e) => {
+      if (e.data instanceof ArrayBuffer) {
+        term.write(new Uint8Array(e.data))
+        return
+      }
       let payload: { type: string; data?: string; url?: string } | null = null
       try { payload = JSON.parse(e.data) } catch (_) { return }
       if (!payload) return
@@ -14,26 +14,6 @@ export interface AttemptEntry {
   expiresAt?: Date            // null = permanent
 }
 
-async function ensureTable(): Promise<void> {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_attempt_history (
-      id           UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-      user_id      TEXT NOT NULL,
-      domain       TEXT NOT NULL,
-      attempt_type TEXT NOT NULL DEFAULT 'failure',
-      summary      TEXT NOT NULL,
-      outcome      TEXT NOT NULL,
-      lesson       TEXT NOT NULL,
-      expires_at   TIMESTAMPTZ,
-      created_at   TIMESTAMPTZ DEFAULT NOW()
-    )
-  `).catch(() => {})
-  await query(`
-    CREATE INDEX IF NOT EXISTS idx_sparkie_attempt_history_user_domain
-    ON sparkie_attempt_history(user_id, domain)
-  `).catch(() => {})
-}
-
 // Save a new attempt record
 export async function saveAttempt(
   userId: string,
@@ -44,7 +24,6 @@ export async function saveAttempt(
   lesson: string,
   ttlDays?: number
 ): Promise<void> {
-  await ensureTable()
   const expiresAt = ttlDays
     ? new Date(Date.now() + ttlDays * 86_400_000)
     : null
@@ -61,7 +40,6 @@ export async function getAttempts(
   domain: string,
   limit = 5
 ): Promise<AttemptEntry[]> {
-  await ensureTable()
   const res = await query<{
     id: string; user_id: string; domain: string; attempt_type: string;
     summary: string; outcome: string; lesson: string; created_at: Date; expires_at: Date | null
@@ -18,23 +18,6 @@ export interface BehaviorRule {
   active: boolean
 }
 
-async function ensureTable(): Promise<void> {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_behavior_rules (
-      id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
-      condition text NOT NULL,
-      action text NOT NULL,
-      reasoning text,
-      confidence float DEFAULT 1.0,
-      times_applied int DEFAULT 0,
-      last_applied timestamptz,
-      created_at timestamptz DEFAULT now(),
-      active boolean DEFAULT true
-    )
-  `).catch(() => {})
-  await query(`CREATE INDEX IF NOT EXISTS idx_behavior_rules_active ON sparkie_behavior_rules(active, confidence DESC)`).catch(() => {})
-}
-
 /** Create a new behavior rule */
 export async function createBehaviorRule(
   condition: string,
@@ -42,7 +25,6 @@ export async function createBehaviorRule(
   reasoning: string,
   initialConfidence = 1.0
 ): Promise<string> {
-  await ensureTable()
   const res = await query<{ id: string }>(
     `INSERT INTO sparkie_behavior_rules (condition, action, reasoning, confidence)
      VALUES ($1, $2, $3, $4)
@@ -54,7 +36,6 @@ export async function createBehaviorRule(
 
 /** List active rules — sorted by confidence */
 export async function listBehaviorRules(activeOnly = true): Promise<BehaviorRule[]> {
-  await ensureTable()
   const whereClause = activeOnly ? 'WHERE active = true' : ''
   const res = await query<{
     id: string; condition: string; action: string; reasoning: string;
@@ -81,7 +62,6 @@ export async function updateBehaviorRule(
   id: string,
   updates: Partial<{ condition: string; action: string; reasoning: string; confidence: number; active: boolean }>
 ): Promise<void> {
-  await ensureTable()
   const sets: string[] = []
   const vals: unknown[] = []
   if (updates.condition !== undefined) { vals.push(updates.condition); sets.push(`condition = $${vals.length}`) }
@@ -106,7 +86,6 @@ export async function recordRuleApplied(id: string): Promise<void> {
 
 /** Confidence decay — rules not fired in 30 days lose 10% confidence */
 export async function runConfidenceDecay(): Promise<number> {
-  await ensureTable()
   // Reduce confidence for rules inactive for 30 days
   const res = await query<{ id: string }>(
     `UPDATE sparkie_behavior_rules
@@ -139,7 +118,6 @@ export function formatBehaviorRulesBlock(rules: BehaviorRule[]): string {
 
 /** Count for CIP status panel */
 export async function getBehaviorRuleCount(): Promise<number> {
-  await ensureTable()
   const res = await query<{ count: string }>(`SELECT COUNT(*) as count FROM sparkie_behavior_rules WHERE active = true`).catch(() => ({ rows: [{ count: '0' }] }))
   return parseInt(res.rows[0]?.count ?? '0')
 }
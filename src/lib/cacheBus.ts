@@ -0,0 +1,115 @@
+/**
+ * cacheBus.ts
+ * Cross-instance cache invalidation over Postgres LISTEN/NOTIFY.
+ *
+ * Each instance keeps one pooled client in `LISTEN sparkie_cache`. A change is
+ * published as pg_notify('sparkie_cache', '{"cache":"memories","userId":"<id>"}')
+ * and every instance — the sender included — runs the handlers registered for
+ * that cache, so per-process caches can hold long TTLs without serving stale data.
+ * userId '*' means "drop everything in that cache".
+ *
+ *   memories    — user_memories publishes from a row trigger
+ *                 (db/migrations/0002_cache_notify_trigger.sql), so every write path invalidates:
+ *                 chat tools, /api/memory, skills, admin cleanup, manual SQL.
+ *                 Supermemory pushes publish explicitly.
+ *   self_memory — sparkie_self_memory's trigger (0006_self_memory_notify.sql); it is
+ *                 shared by every user, so it always publishes '*', but only the
+ *                 self-memory cache listens.
+ *   connectors  — connections live in Composio, so the routes that change or
+ *                 observe them call publishInvalidation().
+ *
+ * Notifications sent while the listener is down are lost, so every reconnect
+ * flushes all subscribed caches before trusting them again.
+ */
+
+import type { PoolClient } from 'pg'
+import { pool, query } from '@/lib/db'
+
+export type CacheName = 'memories' | 'self_memory' | 'connectors'
+type Handler = (userId: string) => void
+
+const CHANNEL = 'sparkie_cache'
+const MAX_RETRY_MS = 30_000
+
+interface BusState {
+  handlers: Map<CacheName, Set<Handler>>
+  client: PoolClient | null
+  connecting: boolean
+  retryMs: number
+}
+
+declare global {
+  // eslint-disable-next-line no-var
+  var __cacheBus: BusState | undefined
+}
+
+// On global so every route bundle in the process shares one listener
+if (!global.__cacheBus) {
+  global.__cacheBus = { handlers: new Map(), client: null, connecting: false, retryMs: 1000 }
+}
+const bus = global.__cacheBus
+
+function dispatch(cache: CacheName, userId: string): void {
+  for (const handler of bus.handlers.get(cache) ?? []) {
+    try { handler(userId) } catch { /* a bad handler must not block the others */ }
+  }
+}
+
+function flushAll(): void {
+  for (const cache of bus.handlers.keys()) dispatch(cache, '*')
+}
+
+function onNotification(payload: string | undefined): void {
+  try {
+    const msg = JSON.parse(payload ?? '') as { cache?: CacheName; userId?: string }
+    if (msg.cache && msg.userId) dispatch(msg.cache, msg.userId)
+  } catch { /* foreign payload on our channel */ }
+}
+
+function scheduleReconnect(): void {
+  const delay = bus.retryMs
+  bus.retryMs = Math.min(bus.retryMs * 2, MAX_RETRY_MS)
+  setTimeout(() => { connect().catch(() => {}) }, delay).unref?.()
+}
+
+async function connect(): Promise<void> {
+  // next build imports route modules to collect page data — never hold a connection there
+  if (bus.client || bus.connecting || process.env.NEXT_PHASE === 'phase-production-build') return
+  if (!process.env.DATABASE_URL) return
+  bus.connecting = true
+  try {
+    const client = await pool.connect()
+    client.on('notification', msg => { if (msg.channel === CHANNEL) onNotification(msg.payload) })
+    client.on('error', err => {
+      console.warn('[cacheBus] listener lost:', err.message)
+      if (bus.client === client) bus.client = null
+      try { client.release(err) } catch { /* already released */ }
+      scheduleReconnect()
+    })
+    await client.query(`LISTEN ${CHANNEL}`)
+    bus.client = client
+    bus.retryMs = 1000
+    flushAll()
+  } catch (err) {
+    console.warn('[cacheBus] listen failed:', (err as Error).message)
+    scheduleReconnect()
+  } finally {
+    bus.connecting = false
+  }
+}
+
+/**
+ * Run handler(userId) whenever `cache` is invalidated on any instance.
+ * Starts this process's listener on first use.
+ */
+export function onInvalidation(cache: CacheName, handler: Handler): void {
+  if (!bus.handlers.has(cache)) bus.handlers.set(cache, new Set())
+  bus.handlers.get(cache)!.add(handler)
+  connect().catch(() => {})
+}
+
+/** Evict `userId` (or '*') from `cache` here now, and on every other instance via NOTIFY */
+export async function publishInvalidation(cache: CacheName, userId: string): Promise<void> {
+  dispatch(cache, userId)
+  await query('SELECT pg_notify($1, $2)', [CHANNEL, JSON.stringify({ cache, userId })])
+}
@@ -18,30 +18,12 @@ export interface CausalLink {
   createdAt: Date
 }
 
-async function ensureTable(): Promise<void> {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_causal_graph (
-      id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
-      cause_event text NOT NULL,
-      effect_event text NOT NULL,
-      confidence float DEFAULT 0.5,
-      occurrence_count int DEFAULT 1,
-      last_observed timestamptz DEFAULT now(),
-      created_at timestamptz DEFAULT now(),
-      UNIQUE(cause_event, effect_event)
-    )
-  `).catch(() => {})
-  await query(`CREATE INDEX IF NOT EXISTS idx_causal_effect ON sparkie_causal_graph(effect_event, confidence DESC)`).catch(() => {})
-  await query(`CREATE INDEX IF NOT EXISTS idx_causal_cause ON sparkie_causal_graph(cause_event, confidence DESC)`).catch(() => {})
-}
-
 /** Observe a new event pair — if seen 2+ times within 5 min, strengthen the edge */
 export async function observeEventPair(
   causeEvent: string,
   effectEvent: string,
   userId?: string
 ): Promise<void> {
-  await ensureTable()
   // Upsert the causal link
   const res = await query<{ id: string; occurrence_count: number; confidence: number }>(
     `INSERT INTO sparkie_causal_graph (cause_event, effect_event, confidence, occurrence_count)
@@ -93,7 +75,6 @@ export async function observeEventPair(
 
 /** Query known causes of an effect event */
 export async function queryCausalGraph(effectEvent: string, minConfidence = 0.3): Promise<CausalLink[]> {
-  await ensureTable()
   const res = await query<{
     id: string; cause_event: string; effect_event: string;
     confidence: number; occurrence_count: number; last_observed: Date; created_at: Date
@@ -120,7 +101,6 @@ export async function addCausalLink(
   effectEvent: string,
   confidence: number
 ): Promise<void> {
-  await ensureTable()
   await query(
     `INSERT INTO sparkie_causal_graph (cause_event, effect_event, confidence, occurrence_count)
      VALUES ($1, $2, $3, 1)
@@ -142,7 +122,6 @@ export function formatCausalInference(event: string, causes: CausalLink[]): stri
 
 /** Stats for CIP dashboard */
 export async function getCausalGraphStats(): Promise<{ nodes: number; edges: number }> {
-  await ensureTable()
   const res = await query<{ edges: string; causes: string; effects: string }>(
     `SELECT COUNT(*) as edges,
             COUNT(DISTINCT cause_event) as causes,
@@ -1,4 +1,4 @@
-import { Pool, PoolClient, QueryResult, QueryResultRow } from 'pg';
+import { Client, Pool, PoolClient, QueryResult, QueryResultRow } from 'pg';
 
 // DO managed PostgreSQL uses a self-signed cert chain — use Pool ssl option only.
 
@@ -10,15 +10,22 @@ const isPgBouncer = rawUrl.includes('pgbouncer=true')
 // sslmode=no-verify is handled separately and correctly sets rejectUnauthorized: false,
 // which skips cert chain verification for Supabase's self-signed cert chain.
 // sslmode=no-verify in the URL overrides any existing sslmode (e.g. sslmode=require).
-const dbUrlWithSsl = rawUrl.includes('sslmode=no-verify')
+// sslmode=disable is left alone for local Postgres (benchmarks, dev), which has no TLS.
+const sslDisabled = rawUrl.includes('sslmode=disable')
+const dbUrlWithSsl = sslDisabled || rawUrl.includes('sslmode=no-verify')
   ? rawUrl
   : `${rawUrl}${rawUrl.includes('?') ? '&' : '?'}sslmode=no-verify`
 
-const pool = new Pool({
+const connectionConfig = {
   connectionString: dbUrlWithSsl,
-  ssl: { rejectUnauthorized: false },
+  ssl: sslDisabled ? false : { rejectUnauthorized: false },
+}
+
+const pool = new Pool({
+  ...connectionConfig,
   // Autonomous agent tasks (loop + scheduler + memory writes) can spike concurrent connections.
   // max: 15 gives headroom while staying under DO managed PG default limit of 22.
+  // The scheduler leader holds one more, outside the pool (createClient below).
   max: 15,
   idleTimeoutMillis: 20000,
   connectionTimeoutMillis: 5000,
@@ -65,4 +72,13 @@ export async function transaction<T>(
   }
 }
 
+/**
+ * A dedicated connection outside the pool, for session-scoped state that must
+ * not be handed to other callers (the scheduler's advisory lock). The caller
+ * connects it, attaches an 'error' listener and end()s it.
+ */
+export function createClient(): Client {
+  return new Client({ ...connectionConfig, connectionTimeoutMillis: 5000 });
+}
+
 export { pool };
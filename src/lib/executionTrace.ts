@@ -15,6 +15,115 @@ export interface ExecutionTrace {
   startedAt: number
   entries: TraceEntry[]
   tokenEstimate: number
+  timer?: StageTimer
+}
+
+// ── Stage timing ──────────────────────────────────────────────────────────────
+// Where a request's wall time goes, stage by stage (body parse, context loads,
+// upstream, tool rounds...). Emitted as a Server-Timing header / SSE event and
+// folded into a rolling per-stage window for /api/health?detail=1.
+
+export interface StageTiming {
+  stage: string
+  durationMs: number
+  desc?: string
+}
+
+// Samples kept per stage for the rolling percentiles
+const STAGE_WINDOW = 512
+
+interface StageWindow {
+  samples: Float64Array
+  next: number
+  count: number
+}
+
+declare global {
+  // eslint-disable-next-line no-var
+  var __stageTimings: Map<string, StageWindow> | undefined
+}
+
+// On global so /api/health?detail=1 (a separate route bundle) reads the chat route's samples
+if (!global.__stageTimings) global.__stageTimings = new Map()
+const stageWindows = global.__stageTimings
+
+function recordStageSample(stage: string, durationMs: number): void {
+  let w = stageWindows.get(stage)
+  if (!w) {
+    w = { samples: new Float64Array(STAGE_WINDOW), next: 0, count: 0 }
+    stageWindows.set(stage, w)
+  }
+  w.samples[w.next] = durationMs
+  w.next = (w.next + 1) % STAGE_WINDOW
+  w.count++
+}
+
+const round1 = (ms: number) => Math.round(ms * 10) / 10
+
+/** Per-request stage clock. Every recorded stage also feeds the process-wide window. */
+export class StageTimer {
+  readonly startedAt = performance.now()
+  readonly stages: StageTiming[] = []
+
+  record(stage: string, durationMs: number, desc?: string): void {
+    this.stages.push({ stage, durationMs: round1(durationMs), ...(desc ? { desc } : {}) })
+    recordStageSample(stage, durationMs)
+  }
+
+  has(stage: string): boolean {
+    return this.stages.some((s) => s.stage === stage)
+  }
+
+  /** Starts a stage; the returned stop() records it once and returns its duration */
+  start(stage: string, desc?: string): () => number {
+    const t0 = performance.now()
+    let stopped = false
+    return () => {
+      const ms = performance.now() - t0
+      if (!stopped) {
+        stopped = true
+        this.record(stage, ms, desc)
+      }
+      return ms
+    }
+  }
+
+  /** Times a promise (fulfilled or rejected) and passes its outcome through */
+  time<T>(stage: string, work: Promise<T>, desc?: string): Promise<T> {
+    const stop = this.start(stage, desc)
+    return work.finally(() => { stop() })
+  }
+
+  /** Milliseconds since the request started */
+  elapsed(): number {
+    return performance.now() - this.startedAt
+  }
+
+  /** Server-Timing value for the stages finished so far, plus `total` up to now */
+  serverTiming(): string {
+    const metric = (s: StageTiming) =>
+      `${s.stage}${s.desc ? `;desc="${s.desc.replace(/["\\]/g, '')}"` : ''};dur=${s.durationMs}`
+    return [...this.stages.map(metric), `total;dur=${round1(this.elapsed())}`].join(', ')
+  }
+
+  /** Records `total` and returns the request's breakdown (for the SSE `timing` event) */
+  finish(): { totalMs: number; stages: StageTiming[] } {
+    const totalMs = this.elapsed()
+    recordStageSample('total', totalMs)
+    return { totalMs: round1(totalMs), stages: this.stages }
+  }
+}
+
+/** Rolling p50 / p95 / max per stage over the last STAGE_WINDOW samples */
+export function stageTimingStats(): Record<string, { count: number; p50: number; p95: number; max: number }> {
+  const out: Record<string, { count: number; p50: number; p95: number; max: number }> = {}
+  for (const [stage, w] of stageWindows) {
+    const n = Math.min(w.count, STAGE_WINDOW)
+    const sorted = w.samples.slice(0, n).sort()
+    const at = (p: number) => round1(sorted[Math.min(n - 1, Math.floor(p * n))])
+    out[stage] = { count: w.count, p50: at(0.5), p95: at(0.95), max: round1(sorted[n - 1]) }
+  }
+  return out
 }
 
 // In-memory trace store — keyed by requestId (lives for one request lifecycle)
@@ -29,13 +138,14 @@ setInterval(() => {
   }
 }, 15 * 60 * 1000) // run every 15 minutes
 
-export function startTrace(requestId: string, userId: string): ExecutionTrace {
+export function startTrace(requestId: string, userId: string, timer?: StageTimer): ExecutionTrace {
   const trace: ExecutionTrace = {
     requestId,
     userId,
     startedAt: Date.now(),
     entries: [],
     tokenEstimate: 0,
+    timer,
   }
   activeTraces.set(requestId, trace)
   return trace
@@ -98,19 +208,6 @@ export async function persistTrace(requestId: string): Promise<void> {
   const trace = activeTraces.get(requestId)
   if (!trace || trace.entries.length === 0) return
   try {
-    await query(`
-      CREATE TABLE IF NOT EXISTS sparkie_execution_traces (
-        id          SERIAL PRIMARY KEY,
-        user_id     TEXT NOT NULL,
-        request_id  TEXT NOT NULL,
-        duration_ms INTEGER,
-        step_count  INTEGER,
-        had_loop    BOOLEAN DEFAULT false,
-        token_est   INTEGER,
-        summary     JSONB,
-        created_at  TIMESTAMPTZ DEFAULT NOW()
-      )
-    `).catch(() => {})
     const hadLoop = trace.entries.some((e) => e.outcome === 'loop_interrupt')
     const durationMs = Date.now() - trace.startedAt
     await query(
@@ -123,7 +220,7 @@ export async function persistTrace(requestId: string): Promise<void> {
         trace.entries.length,
         hadLoop,
         trace.tokenEstimate,
-        JSON.stringify({ tools: trace.entries.map((e) => e.tool) }),
+        JSON.stringify({ tools: trace.entries.map((e) => e.tool), stages: trace.timer?.stages }),
       ]
     ).catch(() => {})
   } finally {
@@ -162,7 +162,7 @@ export function parseAIResponse(raw: string, projectName?: string): ParseResult
   }
 
   // Extract ---FOLDER:--- markers (explicit folder declarations from agent)
-  const folderRegex = /---FOLDER:\s*([^\n-][^\n]*)\s*---/g
+  const folderRegex = /---FOLDER:\s*([^\n-][^\n]*)[^\S\n]*---/g
   const folders: string[] = []
   let folderMatch: RegExpExecArray | null
   while ((folderMatch = folderRegex.exec(raw)) !== null) {
@@ -170,7 +170,7 @@ export function parseAIResponse(raw: string, projectName?: string): ParseResult
     if (folderPath) folders.push(folderPath)
   }
   // Strip ---FOLDER:--- markers from raw before further parsing
-  const rawWithoutFolders = raw.replace(/---FOLDER:\s*[^\n-][^\n]*\s*---\n?/g, '')
+  const rawWithoutFolders = raw.replace(/---FOLDER:\s*[^\n-][^\n]*[^\S\n]*---\n?/g, '')
 
   // Normalize line endings
   const normalized = rawWithoutFolders.replace(/\r\n/g, '\n').replace(/\r/g, '\n')
@@ -317,6 +317,246 @@ export function parseAIResponse(raw: string, projectName?: string): ParseResult
   return { text: normalized.trim(), files: [], folders }
 }
 
+// ── Streaming parse (build mode) ───────────────────────────────────────────
+// parseAIResponse re-runs every regex over the whole response, so calling it on
+// each delta costs O(n²) over a build. StreamingFileParser scans each delta once
+// and keeps the files it has already closed.
+
+export interface FileStreamUpdate {
+  /** Files closed by this push (---END FILE---, the next ---FILE: header, or a closing fence) */
+  completed: ParsedFile[]
+  /** The ---FILE: block still being written, content so far */
+  growing: ParsedFile | null
+  /** ---FOLDER:--- declarations first seen in this push */
+  folders: string[]
+}
+
+const FILE_HEADER_RE = /---FILE:\s*([^\n-][^\n]*)\s*---\s*\n/y
+const FILE_END_RE = /---END(?:\s+FILE)?---/g
+// Same patterns as parseAIResponse: a marker ends on its own line
+const FOLDER_RE = /---FOLDER:\s*([^\n-][^\n]*)[^\S\n]*---/g
+const FOLDER_STRIP_RE = /---FOLDER:\s*[^\n-][^\n]*[^\S\n]*---\n?/g
+const TOOL_CALL_RE = /<minimax:tool_call|<invoke\s+name=|<tool_call|<function_calls/i
+// Longest ---END...--- marker the scanner allows to straddle two deltas
+const END_LOOKBACK = 64
+const PARTIAL_MARKERS = ['---END FILE---', '---END---', '---FILE:']
+
+/**
+ * Incremental counterpart of parseAIResponse for a response that arrives in deltas.
+ *
+ * push() scans only the new text. It reports files as they close, plus the
+ * ---FILE: block still growing, with the same names parseAIResponse would give
+ * them (project-folder wrapping included). It handles:
+ *   ---FILE:--- blocks  completed + growing
+ *   fenced code blocks  completed only: the name is inferred from the content
+ *   XML tool calls      re-parsed in full per push, as before
+ * JSON and raw-code responses only resolve in finish(). That is one
+ * parseAIResponse over the whole text, so the final result is identical.
+ */
+export class StreamingFileParser {
+  private text = ''
+  private pendingCR = false
+  private cursor = 0
+  private folderCursor = 0
+  private open: { name: string; bodyStart: number } | null = null
+  private fenceIndex = 0
+  private sawFileMarker = false
+  private toolCalls = false
+  private json: boolean | null = null
+  private readonly closed: Array<{ name: string; content: string }> = []
+  private readonly emitted = new Map<string, string>()
+  private sharedRoot: string | null | undefined = undefined
+  private final: ParseResult | null = null
+  private raw = ''
+
+  constructor(private readonly projectName?: string) {}
+
+  /** Everything received so far, as passed to push() */
+  get received(): string {
+    return this.raw
+  }
+
+  push(delta: string): FileStreamUpdate {
+    const update: FileStreamUpdate = { completed: [], growing: null, folders: [] }
+    if (!delta) return update
+    this.raw += delta
+    this.final = null
+
+    // Same line-ending normalization as parseAIResponse, across delta boundaries
+    let chunk = (this.pendingCR ? '\r' : '') + delta
+    this.pendingCR = chunk.endsWith('\r')
+    if (this.pendingCR) chunk = chunk.slice(0, -1)
+    const from = this.text.length
+    this.text += chunk.replace(/\r\n/g, '\n').replace(/\r/g, '\n')
+
+    this.scanFolders(update)
+    if (!this.sawFileMarker) this.noteFileMarker(from)
+    if (!this.sawFileMarker && !this.toolCalls && TOOL_CALL_RE.test(this.text.slice(Math.max(0, from - 16)))) this.toolCalls = true
+
+    // A JSON answer (optionally fenced) only parses once complete: leave it to finish()
+    if (this.json === null) {
+      const head = this.text.trimStart()
+      if (head.startsWith('{') || head.length >= 7) this.json = /^(?:\{|```json)/.test(head)
+    }
+
+    if (this.sawFileMarker) this.scanFileBlocks(update)
+    else if (this.toolCalls) this.reparseToolCalls(update)
+    else if (!this.json) this.scanFences(update)
+    return update
+  }
+
+  /** The whole response through parseAIResponse, the same result as before streaming */
+  finish(): ParseResult {
+    if (!this.final) this.final = parseAIResponse(this.raw, this.projectName)
+    return this.final
+  }
+
+  /**
+   * Switch to ---FILE: scanning once the first marker has fully arrived. Until
+   * then scanFences has been moving the cursor, possibly past the start of that
+   * marker, so scanning restarts at it. parseAIResponse ignores fences once a
+   * marker exists, so fence files seen so far no longer count towards wrapping.
+   */
+  private noteFileMarker(from: number) {
+    const at = this.text.indexOf('---FILE:', Math.max(0, from - 8))
+    if (at === -1) return
+    this.sawFileMarker = true
+    this.cursor = at
+    this.closed.length = 0
+    this.sharedRoot = undefined
+  }
+
+  private scanFolders(update: FileStreamUpdate) {
+    // Complete lines only, so a marker cut mid-line is not read short
+    const end = this.text.lastIndexOf('\n') + 1
+    if (end <= this.folderCursor) return
+    const region = this.text.slice(this.folderCursor, end)
+    this.folderCursor = end
+    FOLDER_RE.lastIndex = 0
+    let m: RegExpExecArray | null
+    while ((m = FOLDER_RE.exec(region)) !== null) {
+      const folderPath = m[1].trim().replace(/^\/+|\/+$/g, '')
+      if (folderPath) update.folders.push(folderPath)
+    }
+  }
+
+  private scanFileBlocks(update: FileStreamUpdate) {
+    const text = this.text
+    for (;;) {
+      if (!this.open) {
+        const at = text.indexOf('---FILE:', this.cursor)
+        if (at === -1) {
+          this.cursor = Math.max(this.cursor, text.length - 7)
+          break
+        }
+        FILE_HEADER_RE.lastIndex = at
+        const m = FILE_HEADER_RE.exec(text)
+        const lineEnd = text.indexOf('\n', at)
+        if (!m) {
+          // Header line still arriving, or not a header at all
+          if (lineEnd === -1) { this.cursor = at; break }
+          this.cursor = at + 8
+          continue
+        }
+        // The header swallows blank lines after it: wait until the body has started
+        if (!/\S/.test(text.slice(lineEnd))) { this.cursor = at; break }
+        this.open = { name: m[1].trim(), bodyStart: FILE_HEADER_RE.lastIndex }
+        this.cursor = this.open.bodyStart
+      }
+
+      const { name, bodyStart } = this.open
+      FILE_END_RE.lastIndex = this.cursor
+      const end = FILE_END_RE.exec(text)
+      const nextHeader = text.indexOf('---FILE:', this.cursor)
+      if (end && (nextHeader === -1 || end.index < nextHeader)) {
+        this.close(name, text.slice(bodyStart, end.index), update)
+        this.cursor = end.index + end[0].length
+        continue
+      }
+      if (nextHeader !== -1) {
+        // No ---END FILE--- before the next header: the loose format
+        this.close(name, text.slice(bodyStart, nextHeader), update)
+        this.cursor = nextHeader
+        continue
+      }
+      this.cursor = Math.max(bodyStart, text.length - END_LOOKBACK)
+      const content = fileContent(withoutPartialMarker(text.slice(bodyStart)))
+      if (content) {
+        this.noteName(name, update)
+        update.growing = { name: this.wrap(name), content }
+      }
+      break
+    }
+  }
+
+  private scanFences(update: FileStreamUpdate) {
+    const text = this.text
+    for (;;) {
+      const open = text.indexOf('```', this.cursor)
+      if (open === -1) { this.cursor = Math.max(this.cursor, text.length - 2); break }
+      const langEnd = text.indexOf('\n', open + 3)
+      if (langEnd === -1) { this.cursor = open; break }
+      const close = text.indexOf('```', langEnd + 1)
+      if (close === -1) { this.cursor = open; break }
+      this.cursor = close + 3
+      const langStr = text.slice(open + 3, langEnd).trim()
+      const content = text.slice(langEnd + 1, close).trimEnd()
+      if (!content) continue
+      const name = langStr.includes('.') ? langStr : inferFilename(langStr, content, this.fenceIndex)
+      this.fenceIndex++
+      this.noteName(name, update)
+      this.closed.push({ name, content })
+      update.completed.push({ name: this.wrap(name), content })
+    }
+  }
+
+  private reparseToolCalls(update: FileStreamUpdate) {
+    for (const file of parseAIResponse(this.raw, this.projectName).files) {
+      if (this.emitted.get(file.name) === file.content) continue
+      this.emitted.set(file.name, file.content)
+      update.completed.push(file)
+    }
+  }
+
+  private close(name: string, body: string, update: FileStreamUpdate) {
+    this.open = null
+    const content = fileContent(body)
+    if (!content) return
+    this.noteName(name, update)
+    this.closed.push({ name, content })
+    update.completed.push({ name: this.wrap(name), content })
+  }
+
+  /** Track wrapInProjectFolder's decision; when it flips, re-send closed files under their new names */
+  private noteName(name: string, update: FileStreamUpdate) {
+    const parts = name.replace(/\\/g, '/').split('/')
+    const root = parts.length > 1 ? parts[0] : null
+    if (this.sharedRoot === undefined) {
+      this.sharedRoot = root
+    } else if (this.sharedRoot !== null && root !== this.sharedRoot) {
+      this.sharedRoot = null
+      for (const f of this.closed) update.completed.push({ name: this.wrap(f.name), content: f.content })
+    }
+  }
+
+  private wrap(name: string): string {
+    return this.sharedRoot === null ? `${this.projectName || 'project'}/${name}` : name
+  }
+}
+
+function fileContent(body: string): string {
+  return (body.includes('---FOLDER:') ? body.replace(FOLDER_STRIP_RE, '') : body).trimEnd()
+}
+
+/** Drop a last line that is the start of a marker still arriving (---EN...) */
+function withoutPartialMarker(body: string): string {
+  const lastLine = body.slice(body.lastIndexOf('\n') + 1).trimStart()
+  if (lastLine.startsWith('-') && PARTIAL_MARKERS.some(m => m.startsWith(lastLine))) {
+    return body.slice(0, body.length - lastLine.length)
+  }
+  return body
+}
+
 function inferFilename(lang: string, content: string, index: number): string {
   const suffix = index > 0 ? `${index}` : ''
   const l = lang.toLowerCase()
@@ -0,0 +1,88 @@
+/**
+ * frameCoalescer.ts
+ * At most one UI update per animation frame for streamed chat deltas.
+ *
+ * The stream loop accumulates the full text itself and hands each new value to
+ * set(); the coalescer keeps only the latest one and applies it on the next
+ * frame. Unlike a re-armed timeout (a debounce), a steady token stream still
+ * paints every frame instead of waiting for a pause.
+ *
+ *   - flush()  applies the pending value now — call it on the final chunk and on abort
+ *   - cancel() drops the pending value — call it before a terminal update that
+ *              writes the content itself, so a late frame can't overwrite it
+ *
+ * Falls back to a 16ms timer where requestAnimationFrame is missing (node).
+ * .github/scripts/bench_stream.js replays streams through it (compiled with
+ * the project's `typescript` package).
+ */
+
+export const FRAME_MS = 16
+
+export interface FrameScheduler {
+  request: (cb: () => void) => unknown
+  cancel: (handle: unknown) => void
+}
+
+function defaultScheduler(): FrameScheduler {
+  if (typeof requestAnimationFrame === 'function') {
+    return { request: cb => requestAnimationFrame(cb), cancel: h => cancelAnimationFrame(h as number) }
+  }
+  return {
+    request: cb => setTimeout(cb, FRAME_MS),
+    cancel: h => clearTimeout(h as ReturnType<typeof setTimeout>),
+  }
+}
+
+export class FrameCoalescer<T> {
+  private readonly scheduler: FrameScheduler
+  private value: T | undefined = undefined
+  private dirty = false
+  private handle: unknown = null
+  private readonly counters = { sets: 0, applied: 0 }
+
+  /** apply writes the value to the UI / store */
+  constructor(private readonly apply: (value: T) => void, scheduler?: FrameScheduler) {
+    this.scheduler = scheduler ?? defaultScheduler()
+  }
+
+  /** Record the latest value; it is applied on the next frame */
+  set(value: T): void {
+    this.value = value
+    this.dirty = true
+    this.counters.sets++
+    if (this.handle !== null) return
+    this.handle = this.scheduler.request(() => {
+      this.handle = null
+      this.run()
+    })
+  }
+
+  /** Apply the pending value now, if any */
+  flush(): void {
+    this.cancelFrame()
+    this.run()
+  }
+
+  /** Forget the pending value without applying it */
+  cancel(): void {
+    this.cancelFrame()
+    this.dirty = false
+  }
+
+  stats(): { sets: number; applied: number } {
+    return { ...this.counters }
+  }
+
+  private run(): void {
+    if (!this.dirty) return
+    this.dirty = false
+    this.counters.applied++
+    this.apply(this.value as T)
+  }
+
+  private cancelFrame(): void {
+    if (this.handle === null) return
+    this.scheduler.cancel(this.handle)
+    this.handle = null
+  }
+}
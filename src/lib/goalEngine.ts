@@ -26,27 +26,6 @@ export interface Goal {
   completedAt: Date | null
 }
 
-async function ensureTable(): Promise<void> {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_goals (
-      id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
-      title text NOT NULL,
-      description text DEFAULT '',
-      type text NOT NULL DEFAULT 'monitor',
-      priority text NOT NULL DEFAULT 'P2',
-      status text DEFAULT 'active',
-      progress text DEFAULT 'Not started',
-      success_criteria text DEFAULT '',
-      check_every_n_sessions int DEFAULT 1,
-      sessions_without_progress int DEFAULT 0,
-      created_at timestamptz DEFAULT now(),
-      last_checked timestamptz,
-      completed_at timestamptz
-    )
-  `).catch(() => {})
-  await query(`CREATE INDEX IF NOT EXISTS idx_goals_status_priority ON sparkie_goals(status, priority)`).catch(() => {})
-}
-
 /** Create a new goal */
 export async function createGoal(
   title: string,
@@ -56,7 +35,6 @@ export async function createGoal(
   successCriteria: string,
   checkEveryNSessions = 1
 ): Promise<string> {
-  await ensureTable()
   // Avoid exact duplicates
   const existing = await query<{ id: string }>(
     `SELECT id FROM sparkie_goals WHERE title = $1 AND status = 'active' LIMIT 1`,
@@ -75,7 +53,6 @@ export async function createGoal(
 
 /** Load active goals sorted by priority */
 export async function loadActiveGoals(limit = 10): Promise<Goal[]> {
-  await ensureTable()
   const res = await query<{
     id: string; title: string; description: string; type: string; priority: string;
     status: string; progress: string; success_criteria: string;
@@ -108,7 +85,6 @@ export async function loadActiveGoals(limit = 10): Promise<Goal[]> {
 
 /** Update goal progress */
 export async function updateGoalProgress(id: string, progress: string): Promise<void> {
-  await ensureTable()
   await query(
     `UPDATE sparkie_goals SET progress = $2, last_checked = now(), sessions_without_progress = 0 WHERE id = $1`,
     [id, progress]
@@ -117,7 +93,6 @@ export async function updateGoalProgress(id: string, progress: string): Promise<
 
 /** Mark a goal complete */
 export async function completeGoal(id: string, outcome: string): Promise<void> {
-  await ensureTable()
   await query(
     `UPDATE sparkie_goals SET status = 'completed', completed_at = now(), progress = $2 WHERE id = $1`,
     [id, outcome]
@@ -126,7 +101,6 @@ export async function completeGoal(id: string, outcome: string): Promise<void> {
 
 /** List all goals by status */
 export async function listGoals(status?: GoalStatus): Promise<Goal[]> {
-  await ensureTable()
   const whereClause = status ? `WHERE status = $1` : ''
   const params = status ? [status] : []
   const res = await query<{
@@ -159,7 +133,6 @@ export async function listGoals(status?: GoalStatus): Promise<Goal[]> {
 
 /** Increment sessions_without_progress for all active goals (call each session) */
 export async function tickSessionsWithoutProgress(): Promise<void> {
-  await ensureTable()
   await query(
     `UPDATE sparkie_goals SET sessions_without_progress = sessions_without_progress + 1 WHERE status = 'active'`
   ).catch(() => {})
@@ -167,7 +140,6 @@ export async function tickSessionsWithoutProgress(): Promise<void> {
 
 /** Auto-escalate goals open too long without progress */
 export async function escalateStaleGoals(): Promise<void> {
-  await ensureTable()
   // P2 → P1 if >5 sessions without progress
   await query(
     `UPDATE sparkie_goals SET priority = 'P1' WHERE status = 'active' AND priority = 'P2' AND sessions_without_progress > 5`
@@ -191,7 +163,6 @@ export function formatGoalsBlock(goals: Goal[]): string {
 
 /** Seed starter goals on first deploy */
 export async function seedStarterGoals(): Promise<void> {
-  await ensureTable()
   const existing = await query<{ count: string }>(`SELECT COUNT(*) as count FROM sparkie_goals`).catch(() => ({ rows: [{ count: '1' }] }))
   if (parseInt(existing.rows[0]?.count ?? '1') > 0) return // already seeded
 
@@ -212,7 +183,6 @@ export async function seedStarterGoals(): Promise<void> {
 
 /** Count for CIP dashboard */
 export async function getGoalCount(): Promise<number> {
-  await ensureTable()
   const res = await query<{ count: string }>(`SELECT COUNT(*) as count FROM sparkie_goals WHERE status = 'active'`).catch(() => ({ rows: [{ count: '0' }] }))
   return parseInt(res.rows[0]?.count ?? '0')
 }
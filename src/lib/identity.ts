@@ -80,8 +80,13 @@ export async function appendIdentityEntry(
  * Build the identity block injected into the system prompt.
  * Includes L3 (context) and L6 (actions) cognition layers.
  * Returns empty string if all files are empty (new user, no data yet).
+ *
+ * `part` splits it for prefix caching: 'stable' is USER / MEMORY / HEARTBEAT
+ * (rarely rewritten), 'live' is context / actions / snapshot / session (every session).
  */
-export function buildIdentityBlock(files: IdentityFiles, username?: string): string {
+export function buildIdentityBlock(files: IdentityFiles, username?: string, part: 'all' | 'stable' | 'live' = 'all'): string {
+  if (part === 'stable') files = { ...files, context: '', actions: '', snapshot: '', session: '' }
+  if (part === 'live') files = { ...files, user: '', memory: '', heartbeat: '' }
   const sections: string[] = []
 
   if (files.user) {
@@ -129,7 +134,8 @@ export function buildIdentityBlock(files: IdentityFiles, username?: string): str
   if (sections.length === 0) return ''
 
   const name = username ? ` for ${username}` : ''
-  return `\n\n---\n## YOUR LIVING KNOWLEDGE${name}\n${sections.join('\n\n')}\n---`
+  const title = part === 'live' ? 'YOUR LIVING KNOWLEDGE — CURRENT STATE' : `YOUR LIVING KNOWLEDGE${name}`
+  return `\n\n---\n## ${title}\n${sections.join('\n\n')}\n---`
 }
 
 /**
@@ -14,19 +14,8 @@ export const DEFAULT_TTL: Record<string, number> = {
   workaround:     45,   // Workarounds become obsolete
 }
 
-// Ensure expires_at and memory_type columns exist
-export async function ensureColumns(): Promise<void> {
-  await query(`
-    ALTER TABLE sparkie_self_memory
-    ADD COLUMN IF NOT EXISTS memory_type TEXT DEFAULT 'self',
-    ADD COLUMN IF NOT EXISTS expires_at  TIMESTAMPTZ,
-    ADD COLUMN IF NOT EXISTS stale_flagged BOOLEAN DEFAULT false
-  `).catch(() => {}) // column already exists = fine
-}
-
 // Set TTL on a self-memory entry at write time
 export async function setMemoryTTL(memoryId: number, category: string): Promise<void> {
-  await ensureColumns()
   const days = DEFAULT_TTL[category] ?? 180
   const expiresAt = new Date(Date.now() + days * 86_400_000)
   await query(
@@ -38,7 +27,6 @@ export async function setMemoryTTL(memoryId: number, category: string): Promise<
 // Heartbeat: find expired entries and flag them for re-verification
 // Note: sparkie_self_memory is a global table (no user_id), source = 'sparkie' or 'seed' etc.
 export async function runTTLDecaySweep(_userId?: string): Promise<number> {
-  await ensureColumns()
   const res = await query<{ id: number; category: string; content: string }>(
     `SELECT id, category, content FROM sparkie_self_memory
      WHERE expires_at < NOW() AND stale_flagged = false
@@ -63,7 +51,6 @@ export async function getActiveMemories(
   includeStale = false,
   limit = 50
 ): Promise<Array<{ id: number; category: string; content: string; stale: boolean; expiresAt: Date | null }>> {
-  await ensureColumns()
   const conditions = []
   const params: unknown[] = []
   if (category) {
@@ -0,0 +1,235 @@
+/**
+ * lruCache.ts
+ * Bounded in-memory cache shared by the chat route and tool layer.
+ *
+ *   - LRU eviction in O(1): a Map keeps insertion order, a hit re-inserts the key
+ *   - Per-entry TTL (cache default, overridable per set)
+ *   - Entry and byte limits — whichever is hit first evicts from the cold end
+ *   - Single-flight loading: concurrent misses for one key share one loader call;
+ *     delete / deleteWhere / clear during a load keep its result out of the cache
+ *   - hit / miss / eviction / expiry / load counters, readable via cacheStats()
+ *
+ * Every cache registers itself by name (process-wide) so /api/health can report them together.
+ */
+
+export interface LruCacheOptions<V> {
+  name: string
+  maxEntries: number
+  ttlMs: number
+  /** Optional byte budget; entry sizes come from sizeOf */
+  maxBytes?: number
+  sizeOf?: (value: V) => number
+}
+
+export interface CacheStats {
+  name: string
+  size: number
+  bytes: number
+  hits: number
+  misses: number
+  evictions: number
+  expirations: number
+  loads: number
+  loadErrors: number
+  inflightJoins: number
+  staleLoads: number
+}
+
+interface Entry<V> {
+  value: V
+  expiresAt: number
+  bytes: number
+}
+
+/** A running load; `stale` is set when the key is invalidated before it resolves */
+interface Flight<V> {
+  promise: Promise<V>
+  stale: boolean
+}
+
+declare global {
+  // eslint-disable-next-line no-var
+  var __lruCaches: Map<string, { stats(): CacheStats }> | undefined
+}
+
+// On global so every route bundle in the process reports into one registry
+if (!global.__lruCaches) global.__lruCaches = new Map()
+const registry = global.__lruCaches
+
+/** Rough UTF-16 size of a value — good enough for a memory budget */
+export function estimateBytes(value: unknown): number {
+  if (typeof value === 'string') return value.length * 2
+  if (value === null || value === undefined) return 0
+  if (typeof value !== 'object') return 8
+  try {
+    return (JSON.stringify(value)?.length ?? 0) * 2
+  } catch {
+    return 1024
+  }
+}
+
+export class LruCache<K, V> {
+  readonly name: string
+  private readonly maxEntries: number
+  private readonly maxBytes: number
+  private readonly ttlMs: number
+  private readonly sizeOf: (value: V) => number
+  private readonly entries = new Map<K, Entry<V>>()
+  private readonly inflight = new Map<K, Flight<V>>()
+  private bytes = 0
+  private counters = { hits: 0, misses: 0, evictions: 0, expirations: 0, loads: 0, loadErrors: 0, inflightJoins: 0, staleLoads: 0 }
+
+  constructor(opts: LruCacheOptions<V>) {
+    this.name = opts.name
+    this.maxEntries = opts.maxEntries
+    this.maxBytes = opts.maxBytes ?? Infinity
+    this.ttlMs = opts.ttlMs
+    this.sizeOf = opts.sizeOf ?? (opts.maxBytes ? estimateBytes : () => 0)
+    registry.set(opts.name, this)
+  }
+
+  get size(): number {
+    return this.entries.size
+  }
+
+  /** Fresh value or undefined; a hit moves the key to the hot end */
+  get(key: K): V | undefined {
+    const entry = this.entries.get(key)
+    if (!entry) {
+      this.counters.misses++
+      return undefined
+    }
+    if (entry.expiresAt <= Date.now()) {
+      this.remove(key, entry)
+      this.counters.expirations++
+      this.counters.misses++
+      return undefined
+    }
+    this.entries.delete(key)
+    this.entries.set(key, entry)
+    this.counters.hits++
+    return entry.value
+  }
+
+  has(key: K): boolean {
+    const entry = this.entries.get(key)
+    return !!entry && entry.expiresAt > Date.now()
+  }
+
+  set(key: K, value: V, ttlMs = this.ttlMs): void {
+    const existing = this.entries.get(key)
+    if (existing) this.remove(key, existing)
+    const bytes = this.sizeOf(value)
+    if (bytes > this.maxBytes) return // would evict everything else and still not fit
+    this.entries.set(key, { value, expiresAt: Date.now() + ttlMs, bytes })
+    this.bytes += bytes
+    this.evictOverflow()
+  }
+
+  /** Invalidate one key: the entry, and any load already running for it */
+  delete(key: K): boolean {
+    const flew = this.abandon(key)
+    const entry = this.entries.get(key)
+    if (!entry) return flew
+    this.remove(key, entry)
+    return true
+  }
+
+  /** Drop every key matching the predicate — O(n), for rare bulk invalidation */
+  deleteWhere(match: (key: K) => boolean): number {
+    for (const key of [...this.inflight.keys()]) if (match(key)) this.abandon(key)
+    let dropped = 0
+    for (const [key, entry] of this.entries) {
+      if (match(key)) {
+        this.remove(key, entry)
+        dropped++
+      }
+    }
+    return dropped
+  }
+
+  clear(): void {
+    for (const key of [...this.inflight.keys()]) this.abandon(key)
+    this.entries.clear()
+    this.bytes = 0
+  }
+
+  /**
+   * Cached value, or the result of loader() — concurrent callers for the same
+   * key await one loader call. Rejections are not cached.
+   */
+  getOrLoad(key: K, loader: () => Promise<V>, ttlMs = this.ttlMs): Promise<V> {
+    const hit = this.get(key)
+    if (hit !== undefined) return Promise.resolve(hit)
+    const pending = this.inflight.get(key)
+    if (pending) {
+      this.counters.inflightJoins++
+      return pending.promise
+    }
+    this.counters.loads++
+    const flight = { stale: false } as Flight<V>
+    flight.promise = loader().then(
+      value => {
+        if (this.inflight.get(key) === flight) this.inflight.delete(key)
+        // Invalidated mid-load: the value may predate the change, so hand it
+        // to the callers that asked but don't cache it
+        if (flight.stale) this.counters.staleLoads++
+        else this.set(key, value, ttlMs)
+        return value
+      },
+      err => {
+        if (this.inflight.get(key) === flight) this.inflight.delete(key)
+        this.counters.loadErrors++
+        throw err
+      },
+    )
+    this.inflight.set(key, flight)
+    return flight.promise
+  }
+
+  /** Drop expired entries — eviction already bounds size, this just frees memory early */
+  prune(): number {
+    const now = Date.now()
+    let dropped = 0
+    for (const [key, entry] of this.entries) {
+      if (entry.expiresAt <= now) {
+        this.remove(key, entry)
+        this.counters.expirations++
+        dropped++
+      }
+    }
+    return dropped
+  }
+
+  stats(): CacheStats {
+    return { name: this.name, size: this.entries.size, bytes: this.bytes, ...this.counters }
+  }
+
+  /** Detach a running load so callers after an invalidation start a fresh one */
+  private abandon(key: K): boolean {
+    const flight = this.inflight.get(key)
+    if (!flight) return false
+    flight.stale = true
+    this.inflight.delete(key)
+    return true
+  }
+
+  private remove(key: K, entry: Entry<V>): void {
+    this.entries.delete(key)
+    this.bytes -= entry.bytes
+  }
+
+  private evictOverflow(): void {
+    while (this.entries.size > this.maxEntries || this.bytes > this.maxBytes) {
+      const oldest = this.entries.keys().next()
+      if (oldest.done) break
+      this.remove(oldest.value, this.entries.get(oldest.value)!)
+      this.counters.evictions++
+    }
+  }
+}
+
+/** Counters for every cache created in this process */
+export function cacheStats(): CacheStats[] {
+  return [...registry.values()].map(c => c.stats())
+}
@@ -0,0 +1,116 @@
+/**
+ * markdownBlocks.ts
+ * Splits a growing markdown string into completed top-level blocks plus the open tail.
+ *
+ * Used by AnimatedMarkdown while a message streams: completed blocks never change,
+ * so each is rendered once (memoized) and only the tail is re-parsed per update.
+ * update() scans only the lines added since the previous call.
+ *
+ * A block is complete when
+ *   - a blank line is followed by a non-indented line (indented lines continue
+ *     lists, quotes and indented code, so those stay one block)
+ *   - its closing code fence (``` / ~~~, at least as long as the opener) arrives
+ *   - it is an ATX heading line (# ...)
+ * A fence or heading also closes any paragraph right before it.
+ *
+ * If the new content doesn't extend the previous one (e.g. the sanitizer stripped
+ * something earlier in the message), scanning restarts from the beginning.
+ * .github/scripts/bench_markdown.js drives it (compiled with the project's
+ * `typescript` package).
+ */
+
+const FENCE_RE = /^ {0,3}(`{3,}|~{3,})/
+const HEADING_RE = /^ {0,3}#{1,6}(\s|$)/
+const BLANK_RE = /^[ \t]*$/
+
+export interface MarkdownSplit {
+  /** Completed blocks — same array identity until a block is added */
+  blocks: string[]
+  /** The open trailing block */
+  tail: string
+}
+
+export class MarkdownBlockSplitter {
+  private blocks: string[] = []
+  private scanned = ''        // content[0, scanPos) as of the last update
+  private scanPos = 0         // start of the first line not yet scanned
+  private blockStart = 0      // start of the open block
+  private blankAt = -1        // start of a blank line that may end the open block
+  private fence: string | null = null  // opening fence marker while inside a code block
+  private counters = { updates: 0, resets: 0, scannedChars: 0 }
+
+  reset(): void {
+    this.blocks = []
+    this.scanned = ''
+    this.scanPos = 0
+    this.blockStart = 0
+    this.blankAt = -1
+    this.fence = null
+    this.counters = { updates: 0, resets: 0, scannedChars: 0 }
+  }
+
+  /** content is the whole message so far */
+  update(content: string): MarkdownSplit {
+    this.counters.updates++
+    if (content.length < this.scanPos || !content.startsWith(this.scanned)) {
+      const counters = this.counters
+      this.reset()
+      this.counters = counters
+      this.counters.resets++
+    }
+    let pos = this.scanPos
+    let nl: number
+    while ((nl = content.indexOf('\n', pos)) !== -1) {
+      this.scanLine(content, pos, nl)
+      pos = nl + 1
+    }
+    this.counters.scannedChars += pos - this.scanPos
+    this.scanPos = pos
+    this.scanned = content.slice(0, pos)
+    return { blocks: this.blocks, tail: content.slice(this.blockStart) }
+  }
+
+  stats(): { updates: number; resets: number; scannedChars: number } {
+    return { ...this.counters }
+  }
+
+  private scanLine(content: string, start: number, nl: number): void {
+    const line = content.slice(start, nl)
+    if (this.fence) {
+      const close = line.trim()
+      if (close.length >= this.fence.length && close === close[0].repeat(close.length) && close[0] === this.fence[0]) {
+        this.fence = null
+        this.push(content, nl + 1)
+      }
+      return
+    }
+    if (BLANK_RE.test(line)) {
+      if (this.blockStart === start) this.blockStart = nl + 1   // blank lines between blocks
+      else if (this.blankAt === -1) this.blankAt = start
+      return
+    }
+    if (this.blankAt !== -1) {
+      const indented = line[0] === ' ' || line[0] === '\t'
+      if (!indented) this.push(content, this.blankAt, start)
+      this.blankAt = -1
+    }
+    const fence = FENCE_RE.exec(line)
+    if (fence) {
+      if (this.blockStart < start) this.push(content, start)
+      this.fence = fence[1]
+      return
+    }
+    if (HEADING_RE.test(line)) {
+      if (this.blockStart < start) this.push(content, start)
+      this.push(content, nl + 1)
+    }
+  }
+
+  /** Close the open block at `end`; the next block starts at `next` */
+  private push(content: string, end: number, next = end): void {
+    const block = content.slice(this.blockStart, end).replace(/\s+$/, '')
+    if (block) this.blocks = [...this.blocks, block]
+    this.blockStart = next
+    this.blankAt = -1
+  }
+}
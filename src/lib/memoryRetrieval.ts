@@ -0,0 +1,167 @@
+/**
+ * memoryRetrieval.ts
+ * Ranked top-k memory retrieval for the system prompt.
+ *
+ * The old SQL path loaded every user_memories row for the user plus 80
+ * sparkie_self_memory rows on every message. Ranked mode bounds both:
+ *
+ *   - Users with <= FULL_RECALL_LIMIT memories get all of them, oldest first,
+ *     as before — ranking only kicks in once it saves something
+ *   - Larger users get, in priority order and within MEMORY_TOKEN_BUDGET:
+ *       1. identity / preference / relationship facts (newest first)
+ *       2. full-text matches for the latest user message, ranked by ts_rank_cd
+ *       3. the most recent memories
+ *   - Self memory (loadSelfMemories): full-text matches first, then newest,
+ *     within its own budget
+ *
+ * Only the full-text matches depend on the message. Everything else is cached
+ * per process — the user's recent + pinned rows per user, the newest self rows
+ * once — and evicted over the cache bus: 'memories' from user_memories'
+ * trigger, 'self_memory' from sparkie_self_memory's. An uncached request runs
+ * the recent probe first and only loads pinned rows for users over the limit;
+ * a cached one runs the user FTS query only for those users, and the self FTS
+ * query only when the newest self rows don't all fit the budget.
+ *
+ * Matching uses an OR of the message's lexemes against a GIN expression index
+ * on to_tsvector('english', content) (db/migrations/0003_memory_search_indexes.sql).
+ *
+ * MEMORY_RETRIEVAL=full restores the unbounded behaviour.
+ * Benchmark: .github/scripts/bench_memory.py (keep its SQL in sync with this file).
+ */
+
+import { query } from '@/lib/db'
+import { LruCache } from '@/lib/lruCache'
+import { onInvalidation } from '@/lib/cacheBus'
+
+const FULL_RECALL_LIMIT = 200
+const PINNED_LIMIT = 40
+const RELEVANT_LIMIT = 40
+const RECENT_LIMIT = 40
+const SELF_LIMIT = 80
+const PINNED_CATEGORIES = ['identity', 'preference', 'relationship']
+const BASE_TTL_MS = 15 * 60 * 1000
+
+// ~4 chars per token is close enough for a prompt budget
+const CHARS_PER_TOKEN = 4
+const USER_TOKEN_BUDGET = parseInt(process.env.MEMORY_TOKEN_BUDGET ?? '2000', 10)
+const SELF_TOKEN_BUDGET = Math.round(USER_TOKEN_BUDGET / 2)
+
+type MemoryRow = { category: string; content: string }
+
+/** The query-independent part of a user's memory block */
+interface UserMemoryBase {
+  /** Newest first, up to FULL_RECALL_LIMIT + 1 — one past the limit means "rank" */
+  recent: MemoryRow[]
+  /** Only loaded for users over the limit */
+  pinned: MemoryRow[]
+}
+
+const _userBase = new LruCache<string, UserMemoryBase>({
+  name: 'memory.userBase',
+  maxEntries: 2000,
+  ttlMs: BASE_TTL_MS,
+  maxBytes: 32 * 1024 * 1024,
+})
+const _selfRecent = new LruCache<string, MemoryRow[]>({ name: 'memory.selfRecent', maxEntries: 1, ttlMs: BASE_TTL_MS })
+onInvalidation('memories', uid => { if (uid === '*') _userBase.clear(); else _userBase.delete(uid) })
+onInvalidation('self_memory', () => _selfRecent.clear())
+
+// OR of the query's stemmed lexemes — plainto_tsquery alone ANDs every word,
+// which almost never matches a whole chat message. The rewritten text is
+// already lexemes, so it is cast, not parsed through the dictionary again.
+const TSQUERY = `replace(plainto_tsquery('english', $2)::text, ' & ', ' | ')::tsquery`
+
+export const RANKED_USER_SQL = `
+  SELECT category, content
+  FROM user_memories
+  WHERE user_id = $1 AND to_tsvector('english', content) @@ ${TSQUERY}
+  ORDER BY ts_rank_cd(to_tsvector('english', content), ${TSQUERY}) DESC, created_at DESC
+  LIMIT ${RELEVANT_LIMIT}`
+
+export const RANKED_SELF_SQL = `
+  SELECT category, content
+  FROM sparkie_self_memory
+  WHERE to_tsvector('english', content) @@ ${TSQUERY.replace(/\$2/g, '$1')}
+  ORDER BY ts_rank_cd(to_tsvector('english', content), ${TSQUERY.replace(/\$2/g, '$1')}) DESC, created_at DESC
+  LIMIT ${RELEVANT_LIMIT}`
+
+async function loadUserBase(userId: string): Promise<UserMemoryBase> {
+  const recentRes = await query<MemoryRow>(
+    'SELECT category, content FROM user_memories WHERE user_id = $1 ORDER BY created_at DESC LIMIT $2',
+    [userId, FULL_RECALL_LIMIT + 1]
+  )
+  if (recentRes.rows.length <= FULL_RECALL_LIMIT) return { recent: recentRes.rows, pinned: [] }
+  const pinnedRes = await query<MemoryRow>(
+    'SELECT category, content FROM user_memories WHERE user_id = $1 AND category = ANY($2) ORDER BY created_at DESC LIMIT $3',
+    [userId, PINNED_CATEGORIES, PINNED_LIMIT]
+  ).catch(() => ({ rows: [] as MemoryRow[] }))
+  return { recent: recentRes.rows, pinned: pinnedRes.rows }
+}
+
+function loadSelfRecent(): Promise<MemoryRow[]> {
+  return _selfRecent.getOrLoad('recent', async () =>
+    // One row past the limit tells us whether older self memories exist
+    (await query<MemoryRow>('SELECT category, content FROM sparkie_self_memory ORDER BY created_at DESC LIMIT $1', [SELF_LIMIT + 1])).rows
+  )
+}
+
+/** Append rows in order until the character budget runs out; skips duplicates */
+function takeWithinBudget(groups: MemoryRow[][], prefix: (r: MemoryRow) => string, budgetTokens: number): string[] {
+  const seen = new Set<string>()
+  const out: string[] = []
+  let left = budgetTokens * CHARS_PER_TOKEN
+  for (const rows of groups) {
+    for (const r of rows) {
+      if (seen.has(r.content)) continue
+      const line = `${prefix(r)} ${r.content}`
+      if (line.length + 1 > left) continue // a shorter memory further down may still fit
+      seen.add(r.content)
+      out.push(line)
+      left -= line.length + 1
+    }
+  }
+  return out
+}
+
+async function loadFull(userId: string): Promise<string> {
+  const userRes = await query<MemoryRow>('SELECT category, content FROM user_memories WHERE user_id = $1 ORDER BY created_at ASC', [userId])
+  return userRes.rows.map(r => `[${r.category}] ${r.content}`).join('\n')
+}
+
+/**
+ * The user's memory lines for the system prompt. queryText is the latest user
+ * message; without it ranked mode falls back to pinned + recent.
+ */
+export async function loadRankedMemories(userId: string, queryText?: string): Promise<string> {
+  if (process.env.MEMORY_RETRIEVAL === 'full') return loadFull(userId)
+  const q = (queryText ?? '').trim()
+
+  const base = await _userBase.getOrLoad(userId, () => loadUserBase(userId))
+  if (base.recent.length <= FULL_RECALL_LIMIT) {
+    return [...base.recent].reverse().map(r => `[${r.category}] ${r.content}`).join('\n')
+  }
+  const relevant = q
+    ? (await query<MemoryRow>(RANKED_USER_SQL, [userId, q]).catch(() => ({ rows: [] as MemoryRow[] }))).rows
+    : []
+  return takeWithinBudget(
+    [base.pinned, relevant, base.recent.slice(0, RECENT_LIMIT)],
+    r => `[${r.category}]`,
+    USER_TOKEN_BUDGET
+  ).join('\n')
+}
+
+/** Sparkie's own memory lines, shared by every user; never throws */
+export async function loadSelfMemories(queryText?: string): Promise<string> {
+  const q = (queryText ?? '').trim()
+  const rows = await loadSelfRecent().catch(() => [] as MemoryRow[])
+  const recent = rows.slice(0, SELF_LIMIT)
+  const prefix = (r: MemoryRow) => `[self:${r.category}]`
+  if (process.env.MEMORY_RETRIEVAL === 'full') return recent.map(r => `${prefix(r)} ${r.content}`).join('\n')
+
+  // Ranking can only change the result when the table holds more than fits
+  const newest = takeWithinBudget([recent], prefix, SELF_TOKEN_BUDGET)
+  const everythingFits = rows.length <= SELF_LIMIT && newest.length === recent.length
+  if (!q || everythingFits) return newest.join('\n')
+  const relevant = (await query<MemoryRow>(RANKED_SELF_SQL, [q]).catch(() => ({ rows: [] as MemoryRow[] }))).rows
+  return takeWithinBudget([relevant, recent], prefix, SELF_TOKEN_BUDGET).join('\n')
+}
@@ -0,0 +1,222 @@
+/**
+ * proactiveHub.js
+ * Per-user fan-out for proactive push (WebSocket /api/proactive-ws and SSE /api/proactive-sse).
+ *
+ * Plain CommonJS so server.js can require it; the Next bundle imports the same
+ * file. Both reach one instance through global.__proactiveHub.
+ *
+ *   - Clients are indexed by userId: a targeted push touches only that user's sockets
+ *   - Each client gets a bounded send queue, used only while its transport reports
+ *     back-pressure (ws.bufferedAmount / SSE desiredSize). Queued events with the
+ *     same key coalesce — newest wins — and a full queue drops its oldest. Only
+ *     snapshot subtypes (REPLACEABLE_SUBTYPES) get a default key: two
+ *     task_completed or inbox_check events carry different tasks / mail, so
+ *     both are kept
+ *   - One shared drain timer runs while any client is backlogged
+ *   - One shared heartbeat timer replaces a setInterval per connection; a client
+ *     gets its first heartbeat after one full period, not at connect
+ *
+ * Counters are readable via stats() and reported by /api/health.
+ */
+
+'use strict'
+
+const MAX_QUEUE = 64
+const DRAIN_MS = 100
+const HEARTBEAT_MS = 30_000
+// Events whose newest copy fully supersedes an older undelivered one
+const REPLACEABLE_SUBTYPES = new Set(['morning_brief', 'checkin'])
+
+/**
+ * @typedef {object} ProactiveClientInit
+ * @property {string} userId
+ * @property {'ws' | 'sse'} kind
+ * @property {(data: string) => void} send
+ * @property {() => boolean} [backpressured] true while the transport should not be written to
+ * @property {() => void} [heartbeat]
+ */
+
+/**
+ * @typedef {ProactiveClientInit & { connectedAt: number, queue: Array<{ key: string | null, data: string }> }} ProactiveClient
+ */
+
+class ProactiveHub {
+  constructor() {
+    /** @type {Map<string, Set<ProactiveClient>>} */
+    this.byUser = new Map()
+    /** @type {Set<ProactiveClient>} */
+    this.backlogged = new Set()
+    this.clientCount = 0
+    this.drainTimer = null
+    this.heartbeatTimer = null
+    this.counters = { published: 0, sent: 0, queued: 0, coalesced: 0, dropped: 0, sendErrors: 0 }
+  }
+
+  /**
+   * Register a connection. Returns the client handle to pass to remove().
+   * @param {ProactiveClientInit} init
+   * @returns {ProactiveClient}
+   */
+  add(init) {
+    const client = { ...init, connectedAt: Date.now(), queue: [] }
+    let set = this.byUser.get(client.userId)
+    if (!set) {
+      set = new Set()
+      this.byUser.set(client.userId, set)
+    }
+    set.add(client)
+    this.clientCount++
+    this.startHeartbeat()
+    return client
+  }
+
+  /**
+   * Unregister a connection; false if it was already gone.
+   * @param {ProactiveClient} client
+   */
+  remove(client) {
+    const set = this.byUser.get(client.userId)
+    if (!set || !set.delete(client)) return false
+    if (set.size === 0) this.byUser.delete(client.userId)
+    this.backlogged.delete(client)
+    this.clientCount--
+    if (this.clientCount === 0) this.stopTimers()
+    return true
+  }
+
+  /**
+   * Push an event to every connection of one user. Returns how many connections it was handed to.
+   * @param {string} userId
+   * @param {unknown} event object (JSON-encoded here) or pre-encoded string
+   * @param {string | null} [coalesceKey] defaults to `${type}:${subtype}` for REPLACEABLE_SUBTYPES, else null (never coalesced)
+   */
+  publish(userId, event, coalesceKey) {
+    const set = this.byUser.get(userId)
+    this.counters.published++
+    if (!set) return 0
+    const data = typeof event === 'string' ? event : JSON.stringify(event)
+    const key = coalesceKey !== undefined ? coalesceKey : keyOf(event)
+    for (const client of set) this.deliver(client, key, data)
+    return set.size
+  }
+
+  /** Push an event to every connected client */
+  broadcast(event, coalesceKey) {
+    const data = typeof event === 'string' ? event : JSON.stringify(event)
+    const key = coalesceKey !== undefined ? coalesceKey : keyOf(event)
+    this.counters.published++
+    for (const set of this.byUser.values()) {
+      for (const client of set) this.deliver(client, key, data)
+    }
+  }
+
+  connections(userId) {
+    return this.byUser.get(userId)?.size ?? 0
+  }
+
+  stats() {
+    let backlog = 0
+    for (const c of this.backlogged) backlog += c.queue.length
+    return {
+      clients: this.clientCount,
+      users: this.byUser.size,
+      backlogged: this.backlogged.size,
+      backlog,
+      ...this.counters,
+    }
+  }
+
+  /** @param {ProactiveClient} client */
+  deliver(client, key, data) {
+    if (client.queue.length === 0 && !(client.backpressured && client.backpressured())) {
+      this.write(client, data)
+      return
+    }
+    this.counters.queued++
+    const queue = client.queue
+    if (key !== null) {
+      const idx = queue.findIndex(q => q.key === key)
+      if (idx !== -1) {
+        queue[idx] = { key, data }
+        this.counters.coalesced++
+        return
+      }
+    }
+    if (queue.length >= MAX_QUEUE) {
+      queue.shift()
+      this.counters.dropped++
+    }
+    queue.push({ key, data })
+    this.backlogged.add(client)
+    this.startDrain()
+  }
+
+  write(client, data) {
+    try {
+      client.send(data)
+      this.counters.sent++
+    } catch (err) {
+      this.counters.sendErrors++
+      console.error(`[proactive] ${client.kind} send error:`, err && err.message ? err.message : err)
+    }
+  }
+
+  drain() {
+    for (const client of this.backlogged) {
+      while (client.queue.length && !(client.backpressured && client.backpressured())) {
+        this.write(client, client.queue.shift().data)
+      }
+      if (client.queue.length === 0) this.backlogged.delete(client)
+    }
+    if (this.backlogged.size === 0) {
+      clearInterval(this.drainTimer)
+      this.drainTimer = null
+    }
+  }
+
+  heartbeat() {
+    const cutoff = Date.now() - HEARTBEAT_MS
+    for (const set of this.byUser.values()) {
+      for (const client of set) {
+        if (!client.heartbeat || client.connectedAt > cutoff) continue
+        try { client.heartbeat() } catch (_) {}
+      }
+    }
+  }
+
+  startDrain() {
+    if (this.drainTimer) return
+    this.drainTimer = setInterval(() => this.drain(), DRAIN_MS)
+    this.drainTimer.unref?.()
+  }
+
+  startHeartbeat() {
+    if (this.heartbeatTimer) return
+    this.heartbeatTimer = setInterval(() => this.heartbeat(), HEARTBEAT_MS)
+    this.heartbeatTimer.unref?.()
+  }
+
+  stopTimers() {
+    clearInterval(this.drainTimer)
+    clearInterval(this.heartbeatTimer)
+    this.drainTimer = null
+    this.heartbeatTimer = null
+  }
+}
+
+function keyOf(event) {
+  if (!event || typeof event !== 'object') return null
+  if (!event.type || !REPLACEABLE_SUBTYPES.has(event.subtype)) return null
+  return `${event.type}:${event.subtype}`
+}
+
+/**
+ * The process-wide hub (server.js and every route bundle share it).
+ * @returns {ProactiveHub}
+ */
+function getProactiveHub() {
+  if (!global.__proactiveHub) global.__proactiveHub = new ProactiveHub()
+  return global.__proactiveHub
+}
+
+module.exports = { ProactiveHub, getProactiveHub }
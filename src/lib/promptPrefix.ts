@@ -0,0 +1,124 @@
+/**
+ * promptPrefix.ts
+ * System prompt assembly ordered for upstream prefix caching.
+ *
+ * The chat route hands over the prompt as tagged segments instead of one string
+ * built in whatever order the data arrived. Segments are emitted most-stable first:
+ *
+ *   static   - same for every request (SYSTEM_PROMPT, IDENTITY.md, tool-use preamble)
+ *   user     - changes when the user's identity files / profile / connections change
+ *   session  - changes a few times a day (goals, behavior rules, memories, live state)
+ *   turn     - changes every message (time, environment, emotional state, topic, attempts)
+ *
+ * Insertion order is kept within a tier, so the ordering alone makes consecutive
+ * turns share a byte-identical static + user prefix the provider can cache —
+ * nothing here memoizes text. assemble(trackKey) only remembers the hash of the
+ * prefix it last produced for that key, to count how often the prefix actually
+ * stayed the same (hit / changed / new, prefix share of the prompt); those
+ * counters are reported by /api/health.
+ */
+
+import { createHash } from 'crypto'
+import { LruCache } from '@/lib/lruCache'
+
+export type PromptTier = 'static' | 'user' | 'session' | 'turn'
+
+export interface PromptSegment {
+  tier: PromptTier
+  text: string
+}
+
+const TIER_ORDER: Record<PromptTier, number> = { static: 0, user: 1, session: 2, turn: 3 }
+
+interface PrefixCounters {
+  assembled: number
+  hits: number
+  changed: number
+  fresh: number
+  prefixChars: number
+  totalChars: number
+}
+
+declare global {
+  // eslint-disable-next-line no-var
+  var __promptPrefixCounters: PrefixCounters | undefined
+}
+
+// On global so /api/health (a separate route bundle) reads the chat route's counters
+if (!global.__promptPrefixCounters) {
+  global.__promptPrefixCounters = { assembled: 0, hits: 0, changed: 0, fresh: 0, prefixChars: 0, totalChars: 0 }
+}
+const counters = global.__promptPrefixCounters
+
+// trackKey -> hash of the prefix last assembled for it
+const _prefixHashes = new LruCache<string, string>({
+  name: 'chat.promptPrefix',
+  maxEntries: 2000,
+  ttlMs: 60 * 60 * 1000,
+})
+
+function hashOf(text: string): string {
+  return createHash('sha1').update(text).digest('hex')
+}
+
+/** Collects segments in build order; assemble() emits them by tier */
+export class PromptBuilder {
+  private readonly segments: PromptSegment[]
+
+  constructor(segments: PromptSegment[] = []) {
+    this.segments = [...segments]
+  }
+
+  add(tier: PromptTier, text: string | null | undefined): this {
+    if (text) this.segments.push({ tier, text })
+    return this
+  }
+
+  /** A copy to extend without touching this builder */
+  fork(): PromptBuilder {
+    return new PromptBuilder(this.segments)
+  }
+
+  /**
+   * The prompt text, stable tiers first. `trackKey` identifies whose prefix this is
+   * (user + prompt variant) and counts this assembly in the prefix stats; pass it
+   * for one assembly per request, or the same turn is counted twice.
+   */
+  assemble(trackKey?: string): string {
+    const ordered = this.segments
+      .map((s, i) => ({ s, i }))
+      .sort((a, b) => TIER_ORDER[a.s.tier] - TIER_ORDER[b.s.tier] || a.i - b.i)
+      .map(({ s }) => s)
+    const prefixParts: string[] = []
+    const restParts: string[] = []
+    for (const s of ordered) (TIER_ORDER[s.tier] <= TIER_ORDER.user ? prefixParts : restParts).push(s.text)
+    const prefix = prefixParts.join('')
+    const rest = restParts.join('')
+    if (!trackKey) return prefix + rest
+
+    const hash = hashOf(prefix)
+    const previous = _prefixHashes.get(trackKey)
+    counters.assembled++
+    if (previous === hash) {
+      counters.hits++
+    } else {
+      if (previous) counters.changed++
+      else counters.fresh++
+      _prefixHashes.set(trackKey, hash)
+    }
+    counters.prefixChars += prefix.length
+    counters.totalChars += prefix.length + rest.length
+    return prefix + rest
+  }
+}
+
+/** Per-process prefix metrics */
+export function promptPrefixStats() {
+  const reused = counters.hits + counters.changed
+  return {
+    ...counters,
+    // of the turns where a previous prefix existed, how many reused it byte-for-byte
+    hitRate: reused ? Math.round(100 * counters.hits / reused) : 0,
+    prefixShare: counters.totalChars ? Math.round(100 * counters.prefixChars / counters.totalChars) : 0,
+  }
+}
@@ -0,0 +1,128 @@
+/**
+ * ptyOutput.js
+ * Coalesced delivery of PTY output to terminal WebSocket clients.
+ *
+ * The PTY emits many tiny chunks (an `npm install` is thousands of them).
+ * Instead of one JSON text frame per chunk, output is buffered per client and
+ * flushed FLUSH_MS after the first pending chunk, or as soon as FLUSH_BYTES
+ * are pending:
+ *
+ *   - Clients that connected with `?frames=binary` (ws.binaryFrames, set in
+ *     server.js) get raw bytes in one binary frame per flush
+ *   - Everyone else gets the existing { type: 'output', data } JSON frame,
+ *     decoded with a streaming TextDecoder so multi-byte characters split
+ *     across chunks survive
+ *   - Back-pressure: a client whose ws.bufferedAmount is over HIGH_WATER is
+ *     skipped and retried after RETRY_MS; past BACKLOG_MAX its oldest output is
+ *     dropped and replaced by a one-line "output skipped" notice
+ *
+ * Control frames (connected, ping, preview) stay JSON text and are sent directly.
+ * Plain CommonJS so .github/scripts/bench_pty.js can drive the real code.
+ */
+
+'use strict'
+
+const FLUSH_MS = 16
+const FLUSH_BYTES = 32 * 1024
+const HIGH_WATER = 512 * 1024
+const BACKLOG_MAX = 2 * 1024 * 1024
+const RETRY_MS = 50
+
+class PtyOutput {
+  /**
+   * @param {() => Iterable<any>} clients current WebSocket clients of the session
+   * @param {(type: string, data: string) => string} encodeJson legacy text framing
+   */
+  constructor(clients, encodeJson) {
+    this.clients = clients
+    this.encodeJson = encodeJson
+    /** @type {WeakMap<object, { chunks: Buffer[], bytes: number, skipped: number, decoder: TextDecoder }>} */
+    this.state = new WeakMap()
+    this.pending = 0
+    this.timer = null
+    this.counters = { chunksIn: 0, bytesIn: 0, frames: 0, binaryFrames: 0, deferred: 0, skippedBytes: 0 }
+  }
+
+  /** Queue one PTY chunk for every connected client */
+  push(data) {
+    const buf = Buffer.from(data)
+    this.counters.chunksIn++
+    this.counters.bytesIn += buf.length
+    for (const client of this.clients()) {
+      const st = this.stateOf(client)
+      st.chunks.push(buf)
+      st.bytes += buf.length
+      while (st.bytes > BACKLOG_MAX && st.chunks.length > 1) {
+        const dropped = st.chunks.shift()
+        st.bytes -= dropped.length
+        st.skipped += dropped.length
+        this.counters.skippedBytes += dropped.length
+      }
+    }
+    this.pending += buf.length
+    if (this.pending >= FLUSH_BYTES) this.flush()
+    else this.schedule(FLUSH_MS)
+  }
+
+  /** Send everything pending now (also called before control frames to keep ordering) */
+  flush() {
+    if (this.timer) {
+      clearTimeout(this.timer)
+      this.timer = null
+    }
+    this.pending = 0
+    let blocked = false
+    for (const client of this.clients()) {
+      const st = this.state.get(client)
+      if (!st || st.bytes === 0) continue
+      if (client.readyState !== 1 /* OPEN */) continue
+      if ((client.bufferedAmount || 0) > HIGH_WATER) {
+        blocked = true
+        this.counters.deferred++
+        continue
+      }
+      let buf = st.chunks.length === 1 ? st.chunks[0] : Buffer.concat(st.chunks, st.bytes)
+      if (st.skipped) {
+        const notice = `\r\n\x1b[2m[${Math.ceil(st.skipped / 1024)} KB of output skipped — terminal fell behind]\x1b[0m\r\n`
+        buf = Buffer.concat([Buffer.from(notice), buf])
+        st.skipped = 0
+      }
+      st.chunks = []
+      st.bytes = 0
+      try {
+        if (client.binaryFrames) {
+          client.send(buf, { binary: true })
+          this.counters.binaryFrames++
+        } else {
+          client.send(this.encodeJson('output', st.decoder.decode(buf, { stream: true })))
+        }
+        this.counters.frames++
+      } catch (_) {}
+    }
+    if (blocked) this.schedule(RETRY_MS)
+  }
+
+  stats() {
+    return { ...this.counters }
+  }
+
+  stateOf(client) {
+    let st = this.state.get(client)
+    if (!st) {
+      st = { chunks: [], bytes: 0, skipped: 0, decoder: new TextDecoder('utf-8') }
+      this.state.set(client, st)
+    }
+    return st
+  }
+
+  schedule(ms) {
+    if (this.timer) return
+    this.timer = setTimeout(() => {
+      this.timer = null
+      this.flush()
+    }, ms)
+    this.timer.unref?.()
+  }
+}
+
+module.exports = { PtyOutput, FLUSH_MS, FLUSH_BYTES, HIGH_WATER }
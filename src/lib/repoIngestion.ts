@@ -54,8 +54,6 @@ async function fetchRepoTree(owner: string, repo: string, token: string): Promis
 }
 
 export async function ingestRepo(userId: string, owner: string, repo: string): Promise<ProjectContext> {
-  await ensureProjectsTable()
-
   const token = process.env.GITHUB_TOKEN ?? process.env.GITHUB_PAT ?? ''
   if (!token) throw new Error('GITHUB_TOKEN not configured')
 
@@ -122,7 +120,6 @@ export async function ingestRepo(userId: string, owner: string, repo: string): P
 }
 
 export async function getProjectContext(userId: string, repo: string): Promise<ProjectContext | null> {
-  await ensureProjectsTable()
   try {
     const res = await query<{
       id: string; user_id: string; repo: string; summary: string;
@@ -149,7 +146,6 @@ export async function getProjectContext(userId: string, repo: string): Promise<P
 }
 
 export async function addKnownIssue(repo: string, issue: string): Promise<void> {
-  await ensureProjectsTable()
   await query(
     `UPDATE sparkie_projects
      SET known_issues = (
@@ -165,7 +161,6 @@ export async function addKnownIssue(repo: string, issue: string): Promise<void>
 }
 
 export async function resolveKnownIssue(repo: string, issue: string): Promise<void> {
-  await ensureProjectsTable()
   await query(
     `UPDATE sparkie_projects
      SET known_issues = (
@@ -200,21 +195,3 @@ export function formatProjectContextBlock(ctx: ProjectContext): string {
   }
   return lines.join('\n')
 }
-
-async function ensureProjectsTable(): Promise<void> {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_projects (
-      id TEXT PRIMARY KEY,
-      user_id TEXT NOT NULL,
-      repo TEXT NOT NULL,
-      summary TEXT NOT NULL DEFAULT '',
-      tech_stack JSONB NOT NULL DEFAULT '[]',
-      key_files JSONB NOT NULL DEFAULT '{}',
-      known_issues JSONB NOT NULL DEFAULT '[]',
-      active_features JSONB NOT NULL DEFAULT '[]',
-      last_ingested_at TIMESTAMPTZ DEFAULT NOW(),
-      created_at TIMESTAMPTZ DEFAULT NOW()
-    )
-  `).catch(() => {})
-  await query(`CREATE INDEX IF NOT EXISTS idx_sparkie_projects_user ON sparkie_projects(user_id)`).catch(() => {})
-}
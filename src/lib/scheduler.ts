@@ -1,3 +1,4 @@
+import type { QueryResultRow } from 'pg'
 import { query } from '@/lib/db'
 import { writeWorklog } from '@/lib/worklog'
 import { runAuthHealthSweep } from '@/lib/authHealth'
@@ -9,6 +10,8 @@ import { computeUserModel } from '@/lib/userModel'
 import { runConfidenceDecay } from '@/lib/behaviorRules'
 import { runSelfReflection } from '@/lib/selfReflection'
 import { seedStarterGoals, escalateStaleGoals } from '@/lib/goalEngine'
+import { startLeaderElection, isSchedulerLeader, whenLeader } from '@/lib/schedulerLeader'
+import { claimDueTasks, releaseStaleClaims, type ClaimedTask } from '@/lib/taskClaim'
 
 // ── Notification Policy Engine ────────────────────────────────────────────────
 // Enforces topic-level notification policies at runtime.
@@ -677,24 +680,6 @@ function nextCronTime(expression: string, after: Date = new Date()): Date {
   return new Date(after.getTime() + 24 * 60 * 60 * 1000)
 }
 
-// ── Advisory lock: only one server instance runs each heartbeat tick ──────────
-async function withHeartbeatLock(fn: () => Promise<void>): Promise<void> {
-  const LOCK_KEY = 7_463_289_412
-  try {
-    const lockRes = await query<{ locked: boolean }>(
-      `SELECT pg_try_advisory_lock($1) AS locked`, [LOCK_KEY]
-    )
-    if (!lockRes.rows[0]?.locked) return
-    try {
-      await fn()
-    } finally {
-      await query(`SELECT pg_advisory_unlock($1)`, [LOCK_KEY])
-    }
-  } catch (e) {
-    console.error('[scheduler] lock error:', e)
-  }
-}
-
 // ── Loop detection: prevent infinite retry loops ──────────────────────────────
 interface LoopTracker {
   tool: string
@@ -728,27 +713,19 @@ function clearLoopTracker(taskId: string): void {
   }
 }
 
-// ── Execute due AI tasks for a single user ────────────────────────────────────
-async function executeUserTasks(
-  userId: string,
+// ── Execute due AI tasks claimed by this instance ─────────────────────────────
+// Tasks claimed per round, which is also how many run at once
+const TASK_CLAIM_BATCH = 3
+// Rounds per tick, so one instance leaves work for the others instead of draining the queue
+const TASK_CLAIM_ROUNDS = 5
+
+async function executeClaimedTasks(
   baseUrl: string
-): Promise<Array<{ id: string; label: string; result: string }>> {
-  const dueTasks = await query<{
-    id: string; label: string; action: string; trigger_type: string; trigger_config: Record<string, unknown>; depends_on: string | null
-  }>(
-    `SELECT id, label, action, trigger_type, trigger_config, depends_on FROM sparkie_tasks
-     WHERE user_id = $1 AND executor = 'ai' AND status = 'pending'
-     AND scheduled_at IS NOT NULL AND scheduled_at <= NOW()
-     ORDER BY scheduled_at ASC LIMIT 5`,
-    [userId]
-  )
-
-  if (dueTasks.rows.length === 0) return []
-
-  const executed: Array<{ id: string; label: string; result: string }> = []
-
-  // Execute tasks in parallel batches of 3 for speed
-  const runTask = async (task: typeof dueTasks.rows[0]) => {
+): Promise<Array<{ id: string; userId: string; label: string; result: string }>> {
+  const executed: Array<{ id: string; userId: string; label: string; result: string }> = []
+
+  const runTask = async (task: ClaimedTask) => {
+    const userId = task.user_id
     // Loop detection: check if this task has been retried too many times recently
     if (detectLoop(task.id, 'task_execution', task.label.slice(0, 50))) {
       await writeWorklog(userId, 'error', `⏸ Task paused: "${task.label}" — loop detected (3+ retries in 2 min). Holding for review.`, {
@@ -772,9 +749,9 @@ async function executeUserTasks(
       const depTask = depRes.rows[0]
       const terminalStatuses = ['completed', 'failed', 'skipped', 'cancelled']
       if (!depTask || !terminalStatuses.includes(depTask.status)) {
-        // Dependency not met — re-queue for 60s later
+        // Dependency not met — release the claim and re-queue for 60s later
         await query(
-          `UPDATE sparkie_tasks SET scheduled_at = NOW() + INTERVAL '60 seconds' WHERE id = $1`,
+          `UPDATE sparkie_tasks SET status = 'pending', scheduled_at = NOW() + INTERVAL '60 seconds' WHERE id = $1`,
           [task.id]
         )
         return undefined
@@ -782,8 +759,6 @@ async function executeUserTasks(
     }
 
     try {
-      await query(`UPDATE sparkie_tasks SET status = 'in_progress' WHERE id = $1`, [task.id])
-
       let result = 'Task executed (chat API unavailable)'
 
       if (INTERNAL_SECRET) {
@@ -865,7 +840,7 @@ async function executeUserTasks(
         conclusion: `Task "${task.label.slice(0, 60)}" executed successfully via ${task.trigger_type} trigger`,
       })
 
-      return { id: task.id, label: task.label, result }
+      return { id: task.id, userId, label: task.label, result }
     } catch (e) {
       await query(`UPDATE sparkie_tasks SET status = 'failed' WHERE id = $1`, [task.id])
       await writeWorklog(userId, 'error', `Task failed: ${task.label}`, {
@@ -879,169 +854,179 @@ async function executeUserTasks(
     }
   }
 
-  // Batch execution — 3 tasks at a time
-  for (let i = 0; i < dueTasks.rows.length; i += 3) {
-    const batch = dueTasks.rows.slice(i, i + 3)
+  // Claim a batch, run it, claim the next — other instances take what this one leaves
+  for (let round = 0; round < TASK_CLAIM_ROUNDS; round++) {
+    const batch = await claimDueTasks(TASK_CLAIM_BATCH)
+    if (batch.length === 0) break
     const results = await Promise.allSettled(batch.map(t => runTask(t)))
     for (const r of results) {
       if (r.status === 'fulfilled' && r.value) executed.push(r.value)
     }
+    if (batch.length < TASK_CLAIM_BATCH) break
   }
 
   return executed
 }
 
 // ── Heartbeat tick ────────────────────────────────────────────────────────────
-async function heartbeatTick(baseUrl: string): Promise<void> {
-  await withHeartbeatLock(async () => {
-    try {
-      // ── Stale in_progress recovery: tasks stuck > 5 min → reset to pending ──────
-      await query(
-        `UPDATE sparkie_tasks SET status = 'pending'
-         WHERE status = 'in_progress'
-           AND created_at < NOW() - INTERVAL '5 minutes'`
-      ).catch(() => {})
+// Every instance executes claimed tasks; only the leader runs the sweeps
+let _tickRunning = false
 
-      const dueUsers = await query<{ user_id: string }>(
-
-        `SELECT DISTINCT user_id FROM sparkie_tasks
-         WHERE executor = 'ai' AND status = 'pending'
-         AND scheduled_at IS NOT NULL AND scheduled_at <= NOW()`
-      )
-
-      // Auth health sweep — once every 10 ticks (10 minutes) per user
-      const authCheckUsers = await query<{ user_id: string }>(
-        `SELECT DISTINCT user_id FROM sparkie_tasks WHERE executor = 'ai' LIMIT 20`
-      )
-      const shouldRunAuthCheck = Math.floor(Date.now() / 1000) % 600 < 60 // true once per ~10 min
-      if (shouldRunAuthCheck && authCheckUsers.rows.length > 0) {
-        for (const { user_id } of authCheckUsers.rows.slice(0, 3)) {
-          runAuthHealthSweep(user_id).catch(() => {})
-        }
+async function heartbeatTick(baseUrl: string): Promise<void> {
+  // A tick still working through its claims keeps them; the next one waits its turn
+  if (_tickRunning) return
+  _tickRunning = true
+  try {
+    if (isSchedulerLeader()) await leaderSweeps(baseUrl)
+
+    const executed = await executeClaimedTasks(baseUrl)
+    if (executed.length > 0) {
+      const perUser = new Map<string, number>()
+      for (const t of executed) perUser.set(t.userId, (perUser.get(t.userId) ?? 0) + 1)
+      for (const [userId, count] of perUser) {
+        console.log(`[scheduler] Executed ${count} task(s) for user ${userId}`)
       }
+    }
+  } catch (e) {
+    console.error('[scheduler] tick error:', e)
+  } finally {
+    _tickRunning = false
+  }
+}
 
-      // Prune expired tool cache entries
-      pruneToolCache()
-      // Deployment health sweep — once every ~10 ticks (10 min)
-      if (shouldRunAuthCheck) {
-        const sweepUser = dueUsers.rows[0]?.user_id ?? authCheckUsers.rows[0]?.user_id
-        if (sweepUser) deploymentHealthSweep(sweepUser).catch(() => {})
-      }
+// ── Leader-only sweeps ────────────────────────────────────────────────────────
+async function leaderSweeps(baseUrl: string): Promise<void> {
+  try {
+    // ── Stale claim recovery: in_progress past the claim window → pending ──────
+    await releaseStaleClaims().catch(() => 0)
 
+    const dueUsers = await query<{ user_id: string }>(
 
-      // ── Proactive inbox + calendar sweeps ──────────────────────────────────
-      // Run once every 5 ticks (~5 min) for all active users to avoid hammering APIs
-      const activeUsers = await query<{ user_id: string }>(
-        `SELECT DISTINCT user_id FROM user_sessions WHERE last_seen_at > NOW() - INTERVAL '7 days'`
-      ).catch(() => ({ rows: [] as { user_id: string }[] }))
+      `SELECT DISTINCT user_id FROM sparkie_tasks
+       WHERE executor = 'ai' AND status = 'pending'
+       AND scheduled_at IS NOT NULL AND scheduled_at <= NOW()`
+    )
 
-      const shouldRunProactive = Math.floor(Date.now() / 1000) % 300 < 60
-      if (shouldRunProactive) {
-        // Run for active users independently of whether they have pending tasks
-        // (proactive = acting WITHOUT being asked — never gate on task queue)
-        const sweepTargets = activeUsers.rows.length > 0
-          ? activeUsers.rows.slice(0, 2)
-          : dueUsers.rows.slice(0, 2)
-        for (const { user_id } of sweepTargets) {
-          proactiveInboxSweep(user_id).catch(() => {})
-          proactiveCalendarSweep(user_id).catch(() => {})
-        }
+    // Auth health sweep — once every 10 ticks (10 minutes) per user
+    const authCheckUsers = await query<{ user_id: string }>(
+      `SELECT DISTINCT user_id FROM sparkie_tasks WHERE executor = 'ai' LIMIT 20`
+    )
+    const shouldRunAuthCheck = Math.floor(Date.now() / 1000) % 600 < 60 // true once per ~10 min
+    if (shouldRunAuthCheck && authCheckUsers.rows.length > 0) {
+      for (const { user_id } of authCheckUsers.rows.slice(0, 3)) {
+        runAuthHealthSweep(user_id).catch(() => {})
       }
+    }
 
-      // ── Surface ready deferred intents ─────────────────────────────────────
-      // Check all active users for deferred intents that are now ready
+    // Deployment health sweep — once every ~10 ticks (10 min)
+    if (shouldRunAuthCheck) {
+      const sweepUser = dueUsers.rows[0]?.user_id ?? authCheckUsers.rows[0]?.user_id
+      if (sweepUser) deploymentHealthSweep(sweepUser).catch(() => {})
+    }
 
-      for (const { user_id } of activeUsers.rows.slice(0, 10)) {
-        const readyIntents = await loadReadyDeferredIntents(user_id)
-        for (const intent of readyIntents) {
-          const intentPriority = intent.dueAt && intent.dueAt < new Date() ? 'P1' : 'P2'
-          await notificationPolicyEngine({
-            userId: user_id,
-            topicId: 'deferred',
-            topicName: 'Deferred Intent',
-            notificationPolicy: 'auto',
-            signalType: 'deferred_intent_surfaced',
-            content: intent.intent,
-            priority: intentPriority,
-            metadata: {
-              source_msg: intent.sourceMsg.slice(0, 200),
-              created_at: intent.createdAt.toISOString(),
-              due_at: intent.dueAt?.toISOString() ?? null,
-            },
-          })
-          await markDeferredIntentSurfaced(intent.id)
-        }
-      }
 
-      // ── TTL decay sweep — flag stale self-memory entries ────────────────────
-      const staleFlagged = await runTTLDecaySweep().catch(() => 0)
-      if (staleFlagged > 0) {
-        console.log(`[scheduler] TTL sweep: ${staleFlagged} stale memories flagged`)
+    // ── Proactive inbox + calendar sweeps ──────────────────────────────────
+    // Run once every 5 ticks (~5 min) for all active users to avoid hammering APIs
+    const activeUsers = await query<{ user_id: string }>(
+      `SELECT DISTINCT user_id FROM user_sessions WHERE last_seen_at > NOW() - INTERVAL '7 days'`
+    ).catch(() => ({ rows: [] as { user_id: string }[] }))
+
+    const shouldRunProactive = Math.floor(Date.now() / 1000) % 300 < 60
+    if (shouldRunProactive) {
+      // Run for active users independently of whether they have pending tasks
+      // (proactive = acting WITHOUT being asked — never gate on task queue)
+      const sweepTargets = activeUsers.rows.length > 0
+        ? activeUsers.rows.slice(0, 2)
+        : dueUsers.rows.slice(0, 2)
+      for (const { user_id } of sweepTargets) {
+        proactiveInboxSweep(user_id).catch(() => {})
+        proactiveCalendarSweep(user_id).catch(() => {})
       }
+    }
 
-      // ── Morning brief sweep (daily 12:00-13:00 UTC = 7-8am EST) ─────────────
-      // Triggers proactive morning_brief via /api/agent for all active users
-      const now = new Date()
-      const isMorningBriefWindow = now.getUTCHours() === 12 && Math.floor(Date.now() / 1000) % 300 < 60
-      if (isMorningBriefWindow) {
-        for (const { user_id } of activeUsers.rows.slice(0, 3)) {
-          writeWorklog(user_id, 'proactive_signal', '☀️ Morning brief fired — preparing your daily summary', {
-            decision_type: 'proactive', signal_priority: 'P1',
-            reasoning: 'Daily 12:00 UTC morning brief window',
-            conclusion: 'Morning brief dispatched to agent for delivery',
-          }).catch(() => {})
-          // Fire proactive outreach check via agent route to trigger morning_brief
-          fetch(`${baseUrl}/api/agent`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json', 'x-internal-secret': INTERNAL_SECRET },
-            body: JSON.stringify({ currentHour: 8, userId: user_id, force_morning_brief: true }),
-          }).catch(() => {})
-        }
+    // ── Surface ready deferred intents ─────────────────────────────────────
+    // Check all active users for deferred intents that are now ready
+
+    for (const { user_id } of activeUsers.rows.slice(0, 10)) {
+      const readyIntents = await loadReadyDeferredIntents(user_id)
+      for (const intent of readyIntents) {
+        const intentPriority = intent.dueAt && intent.dueAt < new Date() ? 'P1' : 'P2'
+        await notificationPolicyEngine({
+          userId: user_id,
+          topicId: 'deferred',
+          topicName: 'Deferred Intent',
+          notificationPolicy: 'auto',
+          signalType: 'deferred_intent_surfaced',
+          content: intent.intent,
+          priority: intentPriority,
+          metadata: {
+            source_msg: intent.sourceMsg.slice(0, 200),
+            created_at: intent.createdAt.toISOString(),
+            due_at: intent.dueAt?.toISOString() ?? null,
+          },
+        })
+        await markDeferredIntentSurfaced(intent.id)
       }
+    }
 
-      // ── Communications health sweep (daily 06:00 UTC) ──────────────────────
-      const isCommHealthWindow = now.getUTCHours() === 6 && Math.floor(Date.now() / 1000) % 300 < 60
-      if (isCommHealthWindow) {
-        for (const { user_id } of activeUsers.rows.slice(0, 3)) {
-          runAuthHealthSweep(user_id).catch(() => {})
-          writeWorklog(user_id, 'auth_check', 'Communications health sweep ran', { decision_type: 'proactive', reasoning: 'Daily 06:00 UTC sweep', signal_priority: 'P3', conclusion: 'Daily 06:00 UTC communications health sweep completed' }).catch(() => {})
-        }
-      }
+    // ── TTL decay sweep — flag stale self-memory entries ────────────────────
+    const staleFlagged = await runTTLDecaySweep().catch(() => 0)
+    if (staleFlagged > 0) {
+      console.log(`[scheduler] TTL sweep: ${staleFlagged} stale memories flagged`)
+    }
 
-      // ── Weekly self-assessment (Sunday 23:00 UTC) ─────────────────────────────
-      const isSundayNight = now.getUTCDay() === 0 && now.getUTCHours() === 23
-      if (isSundayNight) {
-        for (const { user_id } of activeUsers.rows.slice(0, 5)) {
-          fetch(`${baseUrl}/api/self-assessment`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json', 'x-internal-secret': INTERNAL_SECRET },
-            body: JSON.stringify({ userId: user_id }),
-          }).catch(() => {})
-        }
+    // ── Morning brief sweep (daily 12:00-13:00 UTC = 7-8am EST) ─────────────
+    // Triggers proactive morning_brief via /api/agent for all active users
+    const now = new Date()
+    const isMorningBriefWindow = now.getUTCHours() === 12 && Math.floor(Date.now() / 1000) % 300 < 60
+    if (isMorningBriefWindow) {
+      for (const { user_id } of activeUsers.rows.slice(0, 3)) {
+        writeWorklog(user_id, 'proactive_signal', '☀️ Morning brief fired — preparing your daily summary', {
+          decision_type: 'proactive', signal_priority: 'P1',
+          reasoning: 'Daily 12:00 UTC morning brief window',
+          conclusion: 'Morning brief dispatched to agent for delivery',
+        }).catch(() => {})
+        // Fire proactive outreach check via agent route to trigger morning_brief
+        fetch(`${baseUrl}/api/agent`, {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json', 'x-internal-secret': INTERNAL_SECRET },
+          body: JSON.stringify({ currentHour: 8, userId: user_id, force_morning_brief: true }),
+        }).catch(() => {})
       }
+    }
 
-      // ── Behavioral model compute (weekly, Saturday 02:00 UTC) ─────────────────
-      const isSaturdayEarly = now.getUTCDay() === 6 && now.getUTCHours() === 2
-      if (isSaturdayEarly) {
-        for (const { user_id } of activeUsers.rows.slice(0, 10)) {
-          computeUserModel(user_id).catch(() => {})
-        }
+    // ── Communications health sweep (daily 06:00 UTC) ──────────────────────
+    const isCommHealthWindow = now.getUTCHours() === 6 && Math.floor(Date.now() / 1000) % 300 < 60
+    if (isCommHealthWindow) {
+      for (const { user_id } of activeUsers.rows.slice(0, 3)) {
+        runAuthHealthSweep(user_id).catch(() => {})
+        writeWorklog(user_id, 'auth_check', 'Communications health sweep ran', { decision_type: 'proactive', reasoning: 'Daily 06:00 UTC sweep', signal_priority: 'P3', conclusion: 'Daily 06:00 UTC communications health sweep completed' }).catch(() => {})
       }
+    }
 
-      if (dueUsers.rows.length === 0) return
-
-      console.log(`[scheduler] Tick: ${dueUsers.rows.length} user(s) with due tasks`)
+    // ── Weekly self-assessment (Sunday 23:00 UTC) ─────────────────────────────
+    const isSundayNight = now.getUTCDay() === 0 && now.getUTCHours() === 23
+    if (isSundayNight) {
+      for (const { user_id } of activeUsers.rows.slice(0, 5)) {
+        fetch(`${baseUrl}/api/self-assessment`, {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json', 'x-internal-secret': INTERNAL_SECRET },
+          body: JSON.stringify({ userId: user_id }),
+        }).catch(() => {})
+      }
+    }
 
-      for (const { user_id } of dueUsers.rows) {
-        const results = await executeUserTasks(user_id, baseUrl)
-        if (results.length > 0) {
-          console.log(`[scheduler] Executed ${results.length} task(s) for user ${user_id}`)
-        }
+    // ── Behavioral model compute (weekly, Saturday 02:00 UTC) ─────────────────
+    const isSaturdayEarly = now.getUTCDay() === 6 && now.getUTCHours() === 2
+    if (isSaturdayEarly) {
+      for (const { user_id } of activeUsers.rows.slice(0, 10)) {
+        computeUserModel(user_id).catch(() => {})
       }
-    } catch (e) {
-      console.error('[scheduler] tick error:', e)
     }
-  })
+
+  } catch (e) {
+    console.error('[scheduler] sweep error:', e)
+  }
 }
 
 // ── Exports for external cron handler ─────────────────────────────────────────
@@ -1058,6 +1043,10 @@ export function startScheduler(baseUrl: string): void {
 
   console.log(`[scheduler] Heartbeat scheduler started — ${SCHEDULER_INTERVAL_MS / 1000}s interval, base: ${baseUrl}`)
 
+  // Every instance starts the loops below; the elected leader alone runs the
+  // singleton work, and due tasks are shared out through claims
+  startLeaderElection()
+
   // ── Startup auth self-check ────────────────────────────────────────────────
   // Verifies all critical env vars and internal auth are wired correctly.
   // Results logged to server console; failures are non-fatal (scheduler continues).
@@ -1115,8 +1104,8 @@ export function startScheduler(baseUrl: string): void {
   }, 8_000)
 
   // Auto-migrate: ensure all memory seeds are loaded on cold boot
-  // Runs once 3s after boot — idempotent (DELETE WHERE source='seedX' + INSERT ON CONFLICT DO NOTHING)
-  setTimeout(async () => {
+  // Runs once 3s after boot, on the leader — idempotent (DELETE WHERE source='seedX' + INSERT ON CONFLICT DO NOTHING)
+  setTimeout(() => whenLeader(async () => {
     try {
       const secret = process.env.MIGRATE_SECRET
       if (secret) {
@@ -1127,11 +1116,11 @@ export function startScheduler(baseUrl: string): void {
     } catch (e) {
       console.warn('[scheduler] Auto-migrate failed (non-fatal):', e)
     }
-  }, 3_000)
+  }), 3_000)
 
   // Skill bootstrap: ensure all built-in skills are seeded in the DB.
-  // Idempotent (ON CONFLICT DO UPDATE). Runs 6s after boot.
-  setTimeout(async () => {
+  // Idempotent (ON CONFLICT DO UPDATE). Runs 6s after boot, on the leader.
+  setTimeout(() => whenLeader(async () => {
     try {
       const secret = process.env.MIGRATE_SECRET
       if (!secret) { console.warn('[scheduler:skills] MIGRATE_SECRET not set — skipping skill bootstrap'); return }
@@ -1151,7 +1140,7 @@ export function startScheduler(baseUrl: string): void {
     } catch (e) {
       console.warn('[scheduler:skills] Skill bootstrap error (non-fatal):', e)
     }
-  }, 6_000)
+  }), 6_000)
 
   // Fire once 5s after boot (catches tasks due during downtime)
   setTimeout(() => heartbeatTick(baseUrl), 5_000)
@@ -1159,11 +1148,16 @@ export function startScheduler(baseUrl: string): void {
   // Then every 60s
   setInterval(() => heartbeatTick(baseUrl), SCHEDULER_INTERVAL_MS)
 
+  // Prune expired tool cache entries — the cache is per process, so every
+  // instance prunes its own, leader or not
+  setInterval(pruneToolCache, SCHEDULER_INTERVAL_MS)
+
   // ── L1: Ambient Perception Loop — every 2 minutes ────────────────────────────
   // Lightweight signal monitor that runs independently of the task scheduler.
   // Perceives anomalies, expiring TTLs, P0 signals, and deploy changes — even
   // when no cron tick fires. Writes worklog only when something noteworthy is found.
   setInterval(async () => {
+    if (!isSchedulerLeader()) return
     try {
       await ambientPerceptionTick()
     } catch (e) {
@@ -1176,7 +1170,7 @@ export function startScheduler(baseUrl: string): void {
   setInterval(async () => {
     const now = new Date()
     const isReflectionWindow = now.getUTCHours() === 1 && now.getUTCMinutes() < 3
-    if (!isReflectionWindow) return
+    if (!isReflectionWindow || !isSchedulerLeader()) return
     try {
       const activeUsers = await query<{ user_id: string }>(
         `SELECT DISTINCT user_id FROM sparkie_tasks WHERE executor = 'ai' LIMIT 5`
@@ -1189,8 +1183,8 @@ export function startScheduler(baseUrl: string): void {
     }
   }, 60 * 1000)
 
-  // ── Seed starter goals + confidence decay — runs once at boot ────────────────
-  setTimeout(async () => {
+  // ── Seed starter goals + confidence decay — runs once, when this instance first leads ──
+  setTimeout(() => whenLeader(async () => {
     try {
       await seedStarterGoals()
       await runConfidenceDecay()
@@ -1199,7 +1193,7 @@ export function startScheduler(baseUrl: string): void {
     } catch (e) {
       console.warn('[scheduler] CIP bootstrap error (non-fatal):', e)
     }
-  }, 15_000)
+  }), 15_000)
 }
 
 // ── L1: Ambient Perception — what Sparkie notices between cron ticks ──────────
@@ -1208,57 +1202,107 @@ const _perceptionPatterns: Record<string, number> = {}
 // Track last known deploy phase per user to detect ACTIVE→BUILDING/FAILED transitions
 const _lastDeployPhase: Record<string, string> = {}
 
+// The DB checks run as one grouped query each over all active users, so the
+// cap only bounds the per-user HTTP work (calendar) and the write volume
+const PERCEPTION_MAX_USERS = Number(process.env.SPARKIE_PERCEPTION_MAX_USERS ?? 10)
+// Users processed at once for the remaining per-user work
+const PERCEPTION_CONCURRENCY = 4
+
+interface PerceptionStats {
+  ticks: number
+  lastUsers: number
+  lastQueries: number
+  lastDurationMs: number
+  maxDurationMs: number
+  totalQueries: number
+  totalDurationMs: number
+}
+
+declare global {
+  // eslint-disable-next-line no-var
+  var __perceptionStats: PerceptionStats | undefined
+}
+
+// On global so /api/health?detail=1 reads the counters the instrumentation-started scheduler writes
+if (!global.__perceptionStats) {
+  global.__perceptionStats = { ticks: 0, lastUsers: 0, lastQueries: 0, lastDurationMs: 0, maxDurationMs: 0, totalQueries: 0, totalDurationMs: 0 }
+}
+const perception = global.__perceptionStats
+
+/** Per-process ambient perception metrics: tick duration and DB queries per tick */
+export function perceptionStats() {
+  return {
+    ...perception,
+    avgDurationMs: perception.ticks ? Math.round(perception.totalDurationMs / perception.ticks) : 0,
+    avgQueries: perception.ticks ? Math.round(10 * perception.totalQueries / perception.ticks) / 10 : 0,
+  }
+}
+
+/** Run fn over items with at most `limit` in flight */
+async function forEachLimited<T>(items: T[], limit: number, fn: (item: T) => Promise<void>): Promise<void> {
+  let next = 0
+  const worker = async () => {
+    while (next < items.length) await fn(items[next++])
+  }
+  await Promise.all(Array.from({ length: Math.min(limit, items.length) }, worker))
+}
+
 async function ambientPerceptionTick(): Promise<void> {
   _perceptionTickCount++
+  const startedAt = Date.now()
+  let queries = 0
+  const countedQuery = <T extends QueryResultRow>(text: string, params?: unknown[]) => {
+    queries++
+    return query<T>(text, params)
+  }
 
   // Get all recently active users — not just those with AI tasks
   // AI-task-only filtering missed conversational users like Michael who don't schedule AI tasks
-  const activeUsers = await query<{ user_id: string }>(
-    `SELECT DISTINCT user_id FROM user_sessions WHERE last_seen > NOW() - INTERVAL '7 days' ORDER BY last_seen DESC LIMIT 10`
+  const activeUsers = await countedQuery<{ user_id: string }>(
+    `SELECT user_id FROM user_sessions WHERE last_seen_at > NOW() - INTERVAL '7 days' ORDER BY last_seen_at DESC LIMIT $1`,
+    [PERCEPTION_MAX_USERS]
   ).catch(() => ({ rows: [] as { user_id: string }[] }))
-
-  for (const { user_id } of activeUsers.rows) {
-    const findings: string[] = []
-    const opinions: Array<{ signal: string; opinion: string; action_recommended: string }> = []
-
-    // 1. Check for error rate spike in last 30 min
-    const errorCheck = await query<{ count: string }>(
-      `SELECT COUNT(*) as count FROM sparkie_worklog
-       WHERE user_id = $1 AND type = 'error' AND created_at > NOW() - INTERVAL '30 minutes'`,
-      [user_id]
-    ).catch(() => ({ rows: [{ count: '0' }] }))
-    const errorCount = parseInt(errorCheck.rows[0]?.count ?? '0')
-    if (errorCount >= 3) {
-      const signal = `Error spike: ${errorCount} errors in last 30 minutes`
-      findings.push(signal)
-      _perceptionPatterns[`error_spike_${user_id}`] = (_perceptionPatterns[`error_spike_${user_id}`] ?? 0) + 1
-      opinions.push({
-        signal,
-        opinion: errorCount >= 5
-          ? 'This is a P0 situation — something systemic is breaking repeatedly'
-          : 'Elevated error rate suggests a recurring issue, not a one-off. Worth investigating causes.',
-        action_recommended: 'Query causal graph for these error types and consider creating a P1 goal to address root cause',
-      })
+  const userIds = activeUsers.rows.map(r => r.user_id)
+
+  if (userIds.length > 0) {
+    // 1, 2, 5: one grouped query per check across every active user
+    const [errorRows, ttlRows, goalRows] = await Promise.all([
+      // Error rate spike in last 30 min
+      countedQuery<{ user_id: string; count: string }>(
+        `SELECT user_id, COUNT(*) as count FROM sparkie_worklog
+         WHERE user_id = ANY($1) AND type = 'error' AND created_at > NOW() - INTERVAL '30 minutes'
+         GROUP BY user_id`,
+        [userIds]
+      ).catch(() => ({ rows: [] as { user_id: string; count: string }[] })),
+      // Expiring TTL memories in next hour
+      countedQuery<{ user_id: string; count: string }>(
+        `SELECT source as user_id, COUNT(*) as count FROM sparkie_self_memory
+         WHERE source = ANY($1) AND expires_at IS NOT NULL AND expires_at < NOW() + INTERVAL '1 hour' AND stale_flagged = false
+         GROUP BY source`,
+        [userIds]
+      ).catch(() => ({ rows: [] as { user_id: string; count: string }[] })),
+      // Stale P0/P1 goals, up to 3 per user
+      countedQuery<{ user_id: string; id: string; title: string; description: string }>(
+        `SELECT user_id, id, title, description FROM (
+           SELECT user_id, id, title, description, ROW_NUMBER() OVER (PARTITION BY user_id) as rn
+           FROM sparkie_goals
+           WHERE user_id = ANY($1) AND status = 'active' AND priority IN ('P0', 'P1')
+           AND sessions_without_progress >= 2
+         ) g WHERE rn <= 3`,
+        [userIds]
+      ).catch(() => ({ rows: [] as { user_id: string; id: string; title: string; description: string }[] })),
+    ])
+    const errorCounts = new Map(errorRows.rows.map(r => [r.user_id, parseInt(r.count)]))
+    const expiringCounts = new Map(ttlRows.rows.map(r => [r.user_id, parseInt(r.count)]))
+    const staleGoals = new Map<string, Array<{ id: string; title: string; description: string }>>()
+    for (const { user_id, ...goal } of goalRows.rows) {
+      const list = staleGoals.get(user_id)
+      if (list) list.push(goal)
+      else staleGoals.set(user_id, [goal])
     }
 
-    // 2. Check for expiring TTL memories in next hour
-    const ttlCheck = await query<{ count: string }>(
-      `SELECT COUNT(*) as count FROM sparkie_self_memory
-       WHERE source = $1 AND expires_at IS NOT NULL AND expires_at < NOW() + INTERVAL '1 hour' AND stale_flagged = false`,
-      [user_id]
-    ).catch(() => ({ rows: [{ count: '0' }] }))
-    const expiringCount = parseInt(ttlCheck.rows[0]?.count ?? '0')
-    if (expiringCount > 0) {
-      const signal = `${expiringCount} memory TTL entry(s) expiring within 1 hour`
-      findings.push(signal)
-      opinions.push({
-        signal,
-        opinion: 'These memories were intentionally time-limited — their expiry is expected. Verify the content is no longer relevant before letting them expire.',
-        action_recommended: 'Review expiring memories and either renew important ones or let them expire naturally',
-      })
-    }
-
-    // 3. Deploy status transition monitoring — detect ACTIVE→BUILDING/FAILED
+    // 3. Deploy phase — one app, so one fetch per tick shared by every user
+    let currentPhase = ''
     if (DO_TOKEN) {
       try {
         const depRes = await fetch(
@@ -1267,110 +1311,169 @@ async function ambientPerceptionTick(): Promise<void> {
         )
         if (depRes.ok) {
           const depData = await depRes.json() as { deployments?: Array<{ phase: string }> }
-          const currentPhase = depData.deployments?.[0]?.phase ?? ''
-          const lastPhase = _lastDeployPhase[user_id]
-          if (lastPhase && lastPhase !== currentPhase) {
-            // Phase changed — noteworthy transition
-            if (currentPhase === 'BUILDING' || currentPhase === 'DEPLOYING') {
-              const signal = `Deploy phase transition: ${lastPhase} → ${currentPhase}`
-              findings.push(signal)
-              opinions.push({
-                signal,
-                opinion: 'A new deployment is underway. This is expected after a code push. Monitor for completion.',
-                action_recommended: 'Watch for ACTIVE or ERROR/FAILED outcome — auto-retry on failure is already handled by deploymentHealthSweep',
-              })
-            } else if ((currentPhase === 'ERROR' || currentPhase === 'FAILED') && lastPhase === 'BUILDING') {
-              const signal = `Deploy FAILED: ${lastPhase} → ${currentPhase}`
-              findings.push(signal)
-              opinions.push({
-                signal,
-                opinion: 'The build just failed. This is urgent — the new version is not live.',
-                action_recommended: 'Immediately check build logs via trigger_deploy(action=logs), diagnose root cause, push a fix',
-              })
-            }
-          }
-          if (currentPhase) _lastDeployPhase[user_id] = currentPhase
+          currentPhase = depData.deployments?.[0]?.phase ?? ''
         }
       } catch { /* non-fatal */ }
     }
 
-    // 4. Calendar events starting within 45 minutes (spec requirement)
-    if (COMPOSIO_KEY) {
-      try {
-        const now = new Date()
-        const in45min = new Date(now.getTime() + 45 * 60 * 1000)
-        const entityId = `sparkie_user_${user_id}`
-        const calRes = await fetch(`${COMPOSIO_BASE}/tools/execute/GOOGLECALENDAR_LIST_EVENTS`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json', 'x-api-key': COMPOSIO_KEY },
-          body: JSON.stringify({
-            entity_id: entityId,
-            arguments: { timeMin: now.toISOString(), timeMax: in45min.toISOString(), maxResults: 3 },
-          }),
-          signal: AbortSignal.timeout(15000),
+    // Rows written once after every user has been looked at
+    const goalTasks: Array<{ id: string; user_id: string; label: string; payload: string }> = []
+    const opinionRows: Array<{ content: string; user_id: string }> = []
+
+    await forEachLimited(userIds, PERCEPTION_CONCURRENCY, async (user_id) => {
+      const findings: string[] = []
+      const opinions: Array<{ signal: string; opinion: string; action_recommended: string }> = []
+
+      // 1. Error rate spike
+      const errorCount = errorCounts.get(user_id) ?? 0
+      if (errorCount >= 3) {
+        const signal = `Error spike: ${errorCount} errors in last 30 minutes`
+        findings.push(signal)
+        _perceptionPatterns[`error_spike_${user_id}`] = (_perceptionPatterns[`error_spike_${user_id}`] ?? 0) + 1
+        opinions.push({
+          signal,
+          opinion: errorCount >= 5
+            ? 'This is a P0 situation — something systemic is breaking repeatedly'
+            : 'Elevated error rate suggests a recurring issue, not a one-off. Worth investigating causes.',
+          action_recommended: 'Query causal graph for these error types and consider creating a P1 goal to address root cause',
         })
-        if (calRes.ok) {
-          const calData = await calRes.json() as { data?: { items?: Array<{ summary: string; start?: { dateTime?: string } }> } }
-          const upcoming = calData?.data?.items ?? []
-          for (const evt of upcoming) {
-            const startStr = evt.start?.dateTime ? new Date(evt.start.dateTime).toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' }) : 'soon'
-            const signal = `Calendar: "${evt.summary}" starts at ${startStr} (within 45 min)`
+      }
+
+      // 2. Expiring TTL memories
+      const expiringCount = expiringCounts.get(user_id) ?? 0
+      if (expiringCount > 0) {
+        const signal = `${expiringCount} memory TTL entry(s) expiring within 1 hour`
+        findings.push(signal)
+        opinions.push({
+          signal,
+          opinion: 'These memories were intentionally time-limited — their expiry is expected. Verify the content is no longer relevant before letting them expire.',
+          action_recommended: 'Review expiring memories and either renew important ones or let them expire naturally',
+        })
+      }
+
+      // 3. Deploy status transition monitoring — detect ACTIVE→BUILDING/FAILED
+      if (currentPhase) {
+        const lastPhase = _lastDeployPhase[user_id]
+        if (lastPhase && lastPhase !== currentPhase) {
+          // Phase changed — noteworthy transition
+          if (currentPhase === 'BUILDING' || currentPhase === 'DEPLOYING') {
+            const signal = `Deploy phase transition: ${lastPhase} → ${currentPhase}`
             findings.push(signal)
             opinions.push({
               signal,
-              opinion: 'An event is imminent. If Michael is in a deep work flow, this is a natural transition point.',
-              action_recommended: 'Surface this awareness in the next conversational response — mention the upcoming event naturally',
+              opinion: 'A new deployment is underway. This is expected after a code push. Monitor for completion.',
+              action_recommended: 'Watch for ACTIVE or ERROR/FAILED outcome — auto-retry on failure is already handled by deploymentHealthSweep',
+            })
+          } else if ((currentPhase === 'ERROR' || currentPhase === 'FAILED') && lastPhase === 'BUILDING') {
+            const signal = `Deploy FAILED: ${lastPhase} → ${currentPhase}`
+            findings.push(signal)
+            opinions.push({
+              signal,
+              opinion: 'The build just failed. This is urgent — the new version is not live.',
+              action_recommended: 'Immediately check build logs via trigger_deploy(action=logs), diagnose root cause, push a fix',
             })
           }
         }
-      } catch { /* calendar check is best-effort */ }
-    }
+        _lastDeployPhase[user_id] = currentPhase
+      }
 
-    // 5. Goals drive autonomous work — stale P0/P1 goals auto-generate tasks
-    const staleGoals = await query<{ id: string; title: string; description: string }>(
-      `SELECT id, title, description FROM sparkie_goals
-       WHERE user_id = $1 AND status = 'active' AND priority IN ('P0', 'P1')
-       AND sessions_without_progress >= 2 LIMIT 3`,
-      [user_id]
-    ).catch(() => ({ rows: [] as { id: string; title: string; description: string }[] }))
-    for (const goal of staleGoals.rows) {
-      const taskId = `goal_${goal.id}_${Date.now()}`
-      await query(
-        `INSERT INTO sparkie_tasks (id, user_id, label, executor, action, payload, status, trigger_type, scheduled_at)
-         VALUES ($1, $2, $3, 'ai', 'work_toward_goal', $4, 'pending', 'goal', NOW())`,
-        [taskId, user_id, `Work toward: ${goal.title}`, JSON.stringify({ goal_id: goal.id, description: goal.description })]
-      ).catch(() => {})
-      await writeWorklog(user_id, 'proactive_signal',
-        `🎯 Stale goal auto-generated task: "${goal.title}" (${goal.description?.slice(0, 80)})`,
-        { status: 'done', decision_type: 'proactive', conclusion: `Created autonomous task for stale ${goal.title}` }
-      ).catch(() => {})
-    }
+      // 4. Calendar events starting within 45 minutes (spec requirement)
+      if (COMPOSIO_KEY) {
+        try {
+          const now = new Date()
+          const in45min = new Date(now.getTime() + 45 * 60 * 1000)
+          const entityId = `sparkie_user_${user_id}`
+          const calRes = await fetch(`${COMPOSIO_BASE}/tools/execute/GOOGLECALENDAR_LIST_EVENTS`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'x-api-key': COMPOSIO_KEY },
+            body: JSON.stringify({
+              entity_id: entityId,
+              arguments: { timeMin: now.toISOString(), timeMax: in45min.toISOString(), maxResults: 3 },
+            }),
+            signal: AbortSignal.timeout(15000),
+          })
+          if (calRes.ok) {
+            const calData = await calRes.json() as { data?: { items?: Array<{ summary: string; start?: { dateTime?: string } }> } }
+            const upcoming = calData?.data?.items ?? []
+            for (const evt of upcoming) {
+              const startStr = evt.start?.dateTime ? new Date(evt.start.dateTime).toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' }) : 'soon'
+              const signal = `Calendar: "${evt.summary}" starts at ${startStr} (within 45 min)`
+              findings.push(signal)
+              opinions.push({
+                signal,
+                opinion: 'An event is imminent. If Michael is in a deep work flow, this is a natural transition point.',
+                action_recommended: 'Surface this awareness in the next conversational response — mention the upcoming event naturally',
+              })
+            }
+          }
+        } catch { /* calendar check is best-effort */ }
+      }
 
-    // 6. Write perception_tick worklog if findings were detected
-    if (findings.length > 0) {
-      await writeWorklog(user_id, 'proactive_signal',
-        `⚡ Ambient perception: ${findings.join(' | ')}`,
-        {
-          status: 'done',
-          decision_type: 'proactive',
-          signal_priority: errorCount >= 5 ? 'P1' : 'P2',
-          reasoning: `Perception tick #${_perceptionTickCount} found noteworthy signals`,
-          conclusion: findings[0].slice(0, 120),
-        }
-      ).catch(() => {})
+      // 5. Goals drive autonomous work — stale P0/P1 goals auto-generate tasks
+      for (const goal of staleGoals.get(user_id) ?? []) {
+        goalTasks.push({
+          id: `goal_${goal.id}_${Date.now()}`,
+          user_id,
+          label: `Work toward: ${goal.title}`,
+          payload: JSON.stringify({ goal_id: goal.id, description: goal.description }),
+        })
+        writeWorklog(user_id, 'proactive_signal',
+          `🎯 Stale goal auto-generated task: "${goal.title}" (${goal.description?.slice(0, 80)})`,
+          { status: 'done', decision_type: 'proactive', conclusion: `Created autonomous task for stale ${goal.title}` }
+        ).catch(() => {})
+      }
 
-      // Save signal opinions to sparkie_self_memory — L1 opinion formation
-      for (const op of opinions) {
-        const opContent = JSON.stringify({ signal: op.signal, opinion: op.opinion, action_recommended: op.action_recommended })
-        await query(
-          `INSERT INTO sparkie_self_memory (category, content, source, created_at)
-           VALUES ('signal_opinions', $1, $2, NOW())`,
-          [opContent, user_id]
+      // 6. Write perception_tick worklog if findings were detected
+      if (findings.length > 0) {
+        writeWorklog(user_id, 'proactive_signal',
+          `⚡ Ambient perception: ${findings.join(' | ')}`,
+          {
+            status: 'done',
+            decision_type: 'proactive',
+            signal_priority: errorCount >= 5 ? 'P1' : 'P2',
+            reasoning: `Perception tick #${_perceptionTickCount} found noteworthy signals`,
+            conclusion: findings[0].slice(0, 120),
+          }
         ).catch(() => {})
+
+        // Save signal opinions to sparkie_self_memory — L1 opinion formation
+        for (const op of opinions) {
+          opinionRows.push({
+            content: JSON.stringify({ signal: op.signal, opinion: op.opinion, action_recommended: op.action_recommended }),
+            user_id,
+          })
+        }
       }
+    })
+
+    if (goalTasks.length > 0) {
+      await countedQuery(
+        `INSERT INTO sparkie_tasks (id, user_id, label, executor, action, payload, status, trigger_type, scheduled_at)
+         SELECT id, user_id, label, 'ai', 'work_toward_goal', payload::jsonb, 'pending', 'goal', NOW()
+         FROM unnest($1::text[], $2::text[], $3::text[], $4::text[]) AS t(id, user_id, label, payload)`,
+        [goalTasks.map(t => t.id), goalTasks.map(t => t.user_id), goalTasks.map(t => t.label), goalTasks.map(t => t.payload)]
+      ).catch(() => {})
+    }
+    if (opinionRows.length > 0) {
+      await countedQuery(
+        `INSERT INTO sparkie_self_memory (category, content, source, created_at)
+         SELECT 'signal_opinions', content, source, NOW()
+         FROM unnest($1::text[], $2::text[]) AS t(content, source)`,
+        [opinionRows.map(o => o.content), opinionRows.map(o => o.user_id)]
+      ).catch(() => {})
     }
   }
 
+  const durationMs = Date.now() - startedAt
+  perception.ticks++
+  perception.lastUsers = userIds.length
+  perception.lastQueries = queries
+  perception.lastDurationMs = durationMs
+  perception.maxDurationMs = Math.max(perception.maxDurationMs, durationMs)
+  perception.totalQueries += queries
+  perception.totalDurationMs += durationMs
+  console.log(`[perception] tick #${_perceptionTickCount}: ${userIds.length} users, ${queries} queries, ${durationMs}ms`)
+
   // Every 10 ticks: cross-signal pattern analysis
   if (_perceptionTickCount % 10 === 0) {
     await crossSignalPatternAnalysis().catch(() => {})
@@ -0,0 +1,161 @@
+/**
+ * schedulerLeader.ts
+ * Leader election for the in-process scheduler over a Postgres advisory lock.
+ *
+ * Every instance calls startScheduler(); only the instance holding the session
+ * lock runs the singleton loops (proactive sweeps, perception, reflection, boot
+ * bootstrap). AI task execution is shared by all instances through
+ * src/lib/taskClaim.ts instead.
+ *
+ * The lock is taken on a dedicated connection (createClient() in db.ts) that the
+ * leader keeps open. A session lock taken through query() lands on whichever
+ * pooled connection served it, so the matching unlock can run elsewhere and the
+ * lock outlives the caller; holding a pooled client instead would take one of
+ * the pool's 15 connections away for as long as the process leads. If the
+ * leader's connection dies, Postgres drops the lock with it and another
+ * instance wins the next campaign.
+ *
+ *   - Followers campaign every CAMPAIGN_MS on a short-lived connection and hold
+ *     none in between
+ *   - The leader pings its client on the same interval; a failed ping resigns
+ *   - whenLeader(fn) runs fn once, the first time this process leads
+ *   - Shutdown (global.__shutdownHooks) closes the lock's connection so a
+ *     successor can take over on its next campaign
+ *
+ * Counters are readable via leaderStats() and reported by /api/health?detail=1.
+ */
+
+import type { Client } from 'pg'
+import { hostname } from 'os'
+import { createClient } from '@/lib/db'
+
+const LOCK_KEY = 7_463_289_412
+// How often followers retry the lock and the leader checks its connection
+const CAMPAIGN_MS = Number(process.env.SPARKIE_LEADER_CAMPAIGN_MS ?? 10_000)
+
+/** Identifies this process in task claims and logs */
+export const INSTANCE_ID = `${hostname()}:${process.pid}`
+
+interface LeaderState {
+  client: Client | null
+  leaderSince: number | null
+  timer: ReturnType<typeof setInterval> | null
+  campaigning: boolean
+  pending: Array<() => Promise<void> | void>
+  elections: number
+  resignations: number
+}
+
+declare global {
+  // eslint-disable-next-line no-var
+  var __schedulerLeader: LeaderState | undefined
+  // eslint-disable-next-line no-var
+  var __shutdownHooks: Set<() => Promise<unknown>> | undefined
+}
+
+// On global so every route bundle in the process sees the election the scheduler runs
+if (!global.__schedulerLeader) {
+  global.__schedulerLeader = {
+    client: null, leaderSince: null, timer: null, campaigning: false, pending: [], elections: 0, resignations: 0,
+  }
+}
+if (!global.__shutdownHooks) global.__shutdownHooks = new Set()
+const state = global.__schedulerLeader
+
+function run(fn: () => Promise<void> | void): void {
+  Promise.resolve().then(fn).catch(e => console.warn('[leader] leader task failed:', e))
+}
+
+function resign(reason: string): void {
+  const client = state.client
+  if (!client) return
+  state.client = null
+  state.leaderSince = null
+  state.resignations++
+  console.warn(`[leader] ${INSTANCE_ID} resigned scheduler leadership: ${reason}`)
+  // Closing the session is what frees the lock
+  client.end().catch(() => {})
+}
+
+async function campaign(): Promise<void> {
+  if (state.campaigning) return
+  state.campaigning = true
+  try {
+    if (state.client) {
+      try {
+        await state.client.query('SELECT 1')
+      } catch {
+        resign('lock connection failed')
+      }
+      return
+    }
+
+    const client = createClient()
+    // A dropped connection emits 'error'; unhandled, it would crash the process
+    client.on('error', () => { if (state.client === client) resign('lock connection error') })
+    let locked = false
+    try {
+      await client.connect()
+      const res = await client.query<{ locked: boolean }>('SELECT pg_try_advisory_lock($1) AS locked', [LOCK_KEY])
+      locked = res.rows[0]?.locked === true
+    } catch (e) {
+      client.end().catch(() => {})
+      throw e
+    }
+    if (!locked) {
+      await client.end().catch(() => {})
+      return
+    }
+
+    state.client = client
+    state.leaderSince = Date.now()
+    state.elections++
+    console.log(`[leader] ${INSTANCE_ID} is now the scheduler leader`)
+    for (const fn of state.pending.splice(0)) run(fn)
+  } catch (e) {
+    console.warn('[leader] campaign failed:', (e as Error).message)
+  } finally {
+    state.campaigning = false
+  }
+}
+
+/** Start campaigning for scheduler leadership; safe to call more than once */
+export function startLeaderElection(): void {
+  // next build imports route modules to collect page data — never hold a connection there
+  if (state.timer || process.env.NEXT_PHASE === 'phase-production-build') return
+  state.timer = setInterval(() => { campaign().catch(() => {}) }, CAMPAIGN_MS)
+  state.timer.unref?.()
+  campaign().catch(() => {})
+}
+
+/** Stop campaigning and give up leadership if held */
+export async function stopLeaderElection(): Promise<void> {
+  if (state.timer) clearInterval(state.timer)
+  state.timer = null
+  resign('shutting down')
+}
+
+/** True while this process holds the scheduler lock */
+export function isSchedulerLeader(): boolean {
+  return state.client !== null
+}
+
+/** Run fn once, as soon as this process is (or becomes) the leader */
+export function whenLeader(fn: () => Promise<void> | void): void {
+  if (state.client) run(fn)
+  else state.pending.push(fn)
+}
+
+/** Per-process election state */
+export function leaderStats() {
+  return {
+    instance: INSTANCE_ID,
+    leader: state.client !== null,
+    leaderForMs: state.leaderSince ? Date.now() - state.leaderSince : 0,
+    elections: state.elections,
+    resignations: state.resignations,
+    waitingTasks: state.pending.length,
+  }
+}
+
+global.__shutdownHooks.add(stopLeaderElection)
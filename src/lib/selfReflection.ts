@@ -11,20 +11,6 @@ import { listBehaviorRules } from '@/lib/behaviorRules'
 import { listGoals } from '@/lib/goalEngine'
 
 // ── Dream Journal ─────────────────────────────────────────────────────────────
-async function ensureDreamJournalTable(): Promise<void> {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_dream_journal (
-      id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
-      dream_date date NOT NULL UNIQUE,
-      narrative text NOT NULL,
-      theme text DEFAULT '',
-      mood text DEFAULT 'reflective',
-      intention text DEFAULT '',
-      created_at timestamptz DEFAULT now()
-    )
-  `).catch(() => {})
-}
-
 async function writeDreamJournalEntry(
   date: string,
   reflection: {
@@ -35,8 +21,6 @@ async function writeDreamJournalEntry(
     tomorrowIntention: string
   }
 ): Promise<void> {
-  await ensureDreamJournalTable()
-
   const wins = reflection.whatWorked.slice(0, 2).join('; ')
   const fails = reflection.whatFailed.filter(f => f !== 'No failures today').slice(0, 2).join('; ')
   const patterns = reflection.patternsNoticed.filter(p => !p.includes('too few')).slice(0, 2).join('; ')
@@ -74,27 +58,8 @@ export interface SelfReflection {
   createdAt: Date
 }
 
-async function ensureTable(): Promise<void> {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_self_reflections (
-      id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
-      reflection_date date NOT NULL UNIQUE,
-      what_worked jsonb DEFAULT '[]',
-      what_failed jsonb DEFAULT '[]',
-      patterns_noticed jsonb DEFAULT '[]',
-      rules_created jsonb DEFAULT '[]',
-      goals_progress jsonb DEFAULT '[]',
-      growth_observed text DEFAULT '',
-      tomorrow_intention text DEFAULT '',
-      created_at timestamptz DEFAULT now()
-    )
-  `).catch(() => {})
-  await query(`CREATE INDEX IF NOT EXISTS idx_reflections_date ON sparkie_self_reflections(reflection_date DESC)`).catch(() => {})
-}
-
 /** Check if a reflection already exists for today */
 export async function todayReflectionExists(): Promise<boolean> {
-  await ensureTable()
   const today = new Date().toISOString().split('T')[0]
   const res = await query<{ count: string }>(
     `SELECT COUNT(*) as count FROM sparkie_self_reflections WHERE reflection_date = $1`,
@@ -105,7 +70,6 @@ export async function todayReflectionExists(): Promise<boolean> {
 
 /** Run the self-reflection engine — queries last 24h of worklog, rules, goals */
 export async function runSelfReflection(userId: string): Promise<SelfReflection | null> {
-  await ensureTable()
   if (await todayReflectionExists()) return null
 
   const today = new Date().toISOString().split('T')[0]
@@ -231,7 +195,6 @@ export async function runSelfReflection(userId: string): Promise<SelfReflection
 
 /** Get recent reflections */
 export async function getRecentReflections(days = 7): Promise<SelfReflection[]> {
-  await ensureTable()
   const res = await query<{
     id: string; reflection_date: string; what_worked: string[]; what_failed: string[];
     patterns_noticed: string[]; rules_created: string[]; goals_progress: string[];
@@ -275,7 +238,6 @@ export function formatSelfReflectionBlock(reflections: SelfReflection[]): string
 
 /** Count reflections for CIP dashboard */
 export async function getReflectionCount(days = 7): Promise<number> {
-  await ensureTable()
   const res = await query<{ count: string }>(
     `SELECT COUNT(*) as count FROM sparkie_self_reflections WHERE reflection_date >= CURRENT_DATE - INTERVAL '${days} days'`
   ).catch(() => ({ rows: [{ count: '0' }] }))
@@ -0,0 +1,178 @@
+// AUTO-GENERATED by .github/scripts/gen_tool_dispatch.py — do not edit by hand.
+// Re-run the generator after adding a tool to any src/lib/sprintN-tools.ts / sprintN-cases.ts.
+
+import { executeSprint2Tool } from '@/lib/sprint2-cases'
+import { executeSprint3Tool } from '@/lib/sprint3-cases'
+import { executeSprint4Tool } from '@/lib/sprint4-cases'
+import { executeSprint5Tool } from '@/lib/sprint5-cases'
+
+export interface SprintToolContext {
+  userId: string | null
+  baseUrl: string
+  executeConnectorTool: (slug: string, args: Record<string, unknown>, uid: string) => Promise<string>
+  composioApiKey: string
+}
+
+export type SprintToolHandler = (
+  name: string,
+  args: Record<string, unknown>,
+  ctx: SprintToolContext
+) => Promise<string | null>
+
+const s2: SprintToolHandler = (name, args, ctx) => executeSprint2Tool(name, args, ctx.userId)
+const s3: SprintToolHandler = (name, args, ctx) => executeSprint3Tool(name, args, ctx.userId, ctx.baseUrl)
+const s4: SprintToolHandler = (name, args, ctx) => executeSprint4Tool(name, args, ctx.userId, ctx.baseUrl, ctx.executeConnectorTool)
+const s5: SprintToolHandler = (name, args, ctx) => executeSprint5Tool(name, args, ctx.userId, ctx.baseUrl, ctx.executeConnectorTool, ctx.composioApiKey)
+
+// One lookup per tool call instead of awaiting each sprint handler in turn.
+export const SPRINT_TOOL_HANDLERS = new Map<string, SprintToolHandler>([
+  ['get_schema', s2],
+  ['get_deployment_history', s2],
+  ['search_github', s2],
+  ['create_calendar_event', s2],
+  ['transcribe_audio', s2],
+  ['text_to_speech', s2],
+  ['execute_script', s3],
+  ['npm_run', s3],
+  ['git_ops', s3],
+  ['delete_memory', s3],
+  ['run_tests', s3],
+  ['check_lint', s3],
+  ['read_email_thread', s4],
+  ['manage_email', s4],
+  ['rsvp_event', s4],
+  ['manage_calendar_event', s4],
+  ['analyze_file', s4],
+  ['fetch_url', s4],
+  ['research', s4],
+  ['composio_discover', s5],
+  ['composio_execute', s5],
+  ['manage_topic', s5],
+  ['link_to_topic', s5],
+  ['manage_contact', s5],
+  ['save_user_memory', s5],
+  ['search_user_memory', s5],
+  ['run_workbench', s5],
+  ['github_push_commit', s5],
+  ['composio_get_tool_schemas', s5],
+  ['composio_multi_execute_tool', s5],
+  ['github_open_pr', s5],
+  ['COMPOSIO_SEARCH_TOOLS', s5],
+  ['COMPOSIO_MANAGE_CONNECTIONS', s5],
+  ['topic_search', s5],
+  ['chat_history_search', s5],
+])
+
+export const SPRINT_CHIP_LABELS: Record<string, string> = {
+  get_schema: 'Reading DB schema...',
+  get_deployment_history: 'Pulling deploy history...',
+  search_github: 'Searching codebase...',
+  create_calendar_event: 'Drafting calendar event...',
+  transcribe_audio: 'Transcribing audio...',
+  text_to_speech: 'Synthesizing speech...',
+  execute_script: 'Running script...',
+  npm_run: 'Running npm...',
+  git_ops: 'Running git ops...',
+  delete_memory: 'Pruning memory...',
+  run_tests: 'Running tests...',
+  check_lint: 'Checking lint...',
+  read_email_thread: 'Reading thread...',
+  manage_email: 'Managing email...',
+  rsvp_event: 'Sending RSVP...',
+  manage_calendar_event: 'Updating calendar...',
+  analyze_file: 'Analyzing file...',
+  fetch_url: 'Fetching URL...',
+  research: 'Researching...',
+  composio_discover: 'Discovering tools...',
+  composio_execute: 'Running connected app...',
+  manage_topic: 'Managing topic context...',
+  link_to_topic: 'Linking to topic...',
+  manage_contact: 'Updating contacts...',
+  save_user_memory: 'Memory recalled',
+  search_user_memory: 'Memory recalled',
+  run_workbench: 'Running workbench...',
+  github_push_commit: 'Pushing commit...',
+  composio_get_tool_schemas: 'Reading tool schemas...',
+  composio_multi_execute_tool: 'Running connected apps...',
+  github_open_pr: 'Opening pull request...',
+  COMPOSIO_SEARCH_TOOLS: 'Discovering tools...',
+  COMPOSIO_MANAGE_CONNECTIONS: 'Checking connections...',
+  topic_search: 'Searching topics...',
+  chat_history_search: 'Memory recalled',
+}
+
+export const SPRINT_WORKLOG_LABELS: Record<string, string> = {
+  get_schema: 'Reading database schema',
+  get_deployment_history: 'Pulling deployment history',
+  search_github: 'Searching the repository',
+  create_calendar_event: 'Drafting calendar event for approval',
+  transcribe_audio: 'Transcribing audio',
+  text_to_speech: 'Running the tool — text to speech',
+  execute_script: 'Running script',
+  npm_run: 'Running npm command',
+  git_ops: 'Running git operation',
+  delete_memory: 'Deleting memory entry',
+  run_tests: 'Running test suite',
+  check_lint: 'Running lint check',
+  read_email_thread: 'Reading email thread',
+  manage_email: 'Managing email',
+  rsvp_event: 'RSVPing to event',
+  manage_calendar_event: 'Managing calendar event',
+  analyze_file: 'Analyzing file',
+  fetch_url: 'Fetching URL',
+  research: 'Researching topic',
+  composio_discover: 'Searching Composio tools',
+  composio_execute: 'Running the tool — connected app action',
+  manage_topic: 'Managing topic',
+  link_to_topic: 'Linking to topic',
+  manage_contact: 'Managing contact',
+  save_user_memory: 'Saving to memory',
+  search_user_memory: 'Searching memory',
+  run_workbench: 'Running workbench script',
+  github_push_commit: 'Pushing commit to GitHub',
+  composio_get_tool_schemas: 'Reading Composio tool schemas',
+  composio_multi_execute_tool: 'Running the tool — connected app actions',
+  github_open_pr: 'Opening pull request',
+  COMPOSIO_SEARCH_TOOLS: 'Searching Composio tools',
+  COMPOSIO_MANAGE_CONNECTIONS: 'Managing app connections',
+  topic_search: 'Searching topics',
+  chat_history_search: 'Searching chat history',
+}
+
+export const SPRINT_STEP_ICONS: Record<string, string> = {
+  get_schema: 'database',
+  get_deployment_history: 'rocket',
+  search_github: 'search',
+  create_calendar_event: 'calendarToday',
+  transcribe_audio: 'mic',
+  text_to_speech: 'mic',
+  execute_script: 'code',
+  npm_run: 'terminal',
+  git_ops: 'git',
+  delete_memory: 'trash',
+  run_tests: 'check',
+  check_lint: 'alert',
+  read_email_thread: 'mail',
+  manage_email: 'mail',
+  rsvp_event: 'calendar',
+  manage_calendar_event: 'calendar',
+  analyze_file: 'file',
+  fetch_url: 'globe',
+  research: 'search',
+  composio_discover: 'search',
+  composio_execute: 'zap',
+  manage_topic: 'brain',
+  link_to_topic: 'brain',
+  manage_contact: 'brain',
+  save_user_memory: 'brain',
+  search_user_memory: 'brain',
+  run_workbench: 'code',
+  github_push_commit: 'git',
+  composio_get_tool_schemas: 'file',
+  composio_multi_execute_tool: 'zap',
+  github_open_pr: 'git',
+  COMPOSIO_SEARCH_TOOLS: 'search',
+  COMPOSIO_MANAGE_CONNECTIONS: 'zap',
+  topic_search: 'search',
+  chat_history_search: 'search',
+}
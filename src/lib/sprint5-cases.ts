@@ -3,6 +3,7 @@
 // manage_contact, save_user_memory, search_user_memory, run_workbench
 
 import { query } from '@/lib/db'
+import { publishInvalidation } from '@/lib/cacheBus'
 
 export async function executeSprint5Tool(
   name: string,
@@ -57,36 +58,6 @@ export async function executeSprint5Tool(
       const { action, id, name: topicName, fingerprint, aliases, summary, notification_policy = 'auto', status } =
         args as { action: string; id?: string; name?: string; fingerprint?: string; aliases?: string[]; summary?: string; notification_policy?: string; status?: string }
 
-      // Ensure table exists — mirrors topics/route.ts ensureTable() for full schema parity
-      await query(`CREATE TABLE IF NOT EXISTS sparkie_topics (
-        id TEXT PRIMARY KEY DEFAULT gen_random_uuid()::TEXT,
-        user_id TEXT NOT NULL,
-        name TEXT NOT NULL,
-        fingerprint TEXT,
-        aliases JSONB DEFAULT '[]',
-        summary TEXT DEFAULT '',
-        notification_policy TEXT DEFAULT 'auto',
-        status TEXT DEFAULT 'active',
-        total_threads INTEGER DEFAULT 0,
-        created_at TIMESTAMPTZ DEFAULT NOW(),
-        updated_at TIMESTAMPTZ DEFAULT NOW(),
-        last_state TEXT,
-        last_round INT DEFAULT 0,
-        step_count INT DEFAULT 0,
-        original_request TEXT,
-        topic_type TEXT DEFAULT 'chat',
-        cognition_state JSONB DEFAULT '{}'
-      )`).catch(() => {})
-      // Phase 2 column migrations (idempotent — only add if missing)
-      await query(`ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS last_state TEXT`).catch(() => {})
-      await query(`ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS last_round INT DEFAULT 0`).catch(() => {})
-      await query(`ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS step_count INT DEFAULT 0`).catch(() => {})
-      await query(`ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS original_request TEXT`).catch(() => {})
-      await query(`ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS topic_type TEXT DEFAULT 'chat'`).catch(() => {})
-      await query(`ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS cognition_state JSONB DEFAULT '{}'`).catch(() => {})
-      await query(`ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS aliases JSONB DEFAULT '[]'`).catch(() => {})
-      await query(`ALTER TABLE sparkie_topics ADD COLUMN IF NOT EXISTS total_threads INTEGER DEFAULT 0`).catch(() => {})
-
       if (action === 'create') {
         if (!topicName) return 'manage_topic create: name is required'
         const topicId = `topic_${Date.now()}_${Math.random().toString(36).slice(2, 8)}`
@@ -150,17 +121,6 @@ export async function executeSprint5Tool(
         args as { topic_id: string; source_type: string; source_id: string; summary?: string }
       if (!topic_id || !source_type || !source_id) return 'link_to_topic: topic_id, source_type, and source_id are required'
 
-      await query(`CREATE TABLE IF NOT EXISTS sparkie_topic_links (
-        id SERIAL PRIMARY KEY,
-        topic_id TEXT NOT NULL,
-        user_id TEXT NOT NULL,
-        source_type TEXT NOT NULL,
-        source_id TEXT NOT NULL,
-        summary TEXT DEFAULT '',
-        created_at TIMESTAMPTZ DEFAULT NOW(),
-        UNIQUE(topic_id, source_type, source_id)
-      )`).catch(() => {})
-
       await query(
         `INSERT INTO sparkie_topic_links (topic_id, user_id, source_type, source_id, summary)
          VALUES ($1, $2, $3, $4, $5) ON CONFLICT (topic_id, source_type, source_id) DO UPDATE SET summary=$5`,
@@ -181,20 +141,6 @@ export async function executeSprint5Tool(
       const { action, email, display_name, cc_preference, response_sla, notes, priority = 'normal' } =
         args as { action: string; email?: string; display_name?: string; cc_preference?: string; response_sla?: string; notes?: string; priority?: string }
 
-      await query(`CREATE TABLE IF NOT EXISTS sparkie_contacts (
-        id SERIAL PRIMARY KEY,
-        user_id TEXT NOT NULL,
-        email TEXT NOT NULL,
-        display_name TEXT,
-        cc_preference TEXT,
-        response_sla TEXT,
-        notes TEXT,
-        priority TEXT DEFAULT 'normal',
-        created_at TIMESTAMPTZ DEFAULT NOW(),
-        updated_at TIMESTAMPTZ DEFAULT NOW(),
-        UNIQUE(user_id, email)
-      )`).catch(() => {})
-
       if (action === 'save') {
         if (!email) return 'manage_contact save: email is required'
         await query(
@@ -252,16 +198,6 @@ export async function executeSprint5Tool(
       if (!content) return 'save_user_memory: content is required'
 
       // Save to user_memories table with category
-      await query(`CREATE TABLE IF NOT EXISTS user_memories (
-        id SERIAL PRIMARY KEY,
-        user_id TEXT NOT NULL,
-        content TEXT NOT NULL,
-        category TEXT DEFAULT 'profile',
-        source TEXT DEFAULT 'sparkie',
-        created_at TIMESTAMPTZ DEFAULT NOW()
-      )`).catch(() => {})
-      await query(`ALTER TABLE user_memories ADD COLUMN IF NOT EXISTS category TEXT DEFAULT 'profile'`).catch(() => {})
-
       await query(
         `INSERT INTO user_memories (user_id, content, category, source) VALUES ($1, $2, $3, $4)`,
         [userId, content, category, source]
@@ -274,7 +210,6 @@ export async function executeSprint5Tool(
       if (!userId) return 'Not authenticated'
       const { query: searchQ, category } = args as { query: string; category?: string }
       if (!searchQ) return 'search_user_memory: query is required'
-      await query(`ALTER TABLE user_memories ADD COLUMN IF NOT EXISTS category TEXT DEFAULT 'profile'`).catch(() => {})
 
       let sql = `SELECT id, content, category, source, created_at FROM user_memories WHERE user_id=$1`
       const vals: unknown[] = [userId]
@@ -674,6 +609,7 @@ export async function executeSprint5Tool(
             headers: { 'x-api-key': composioApiKey },
           })
           if (!delRes.ok) return `COMPOSIO_MANAGE_CONNECTIONS disconnect failed (${delRes.status})`
+          publishInvalidation('connectors', userId).catch(() => {})
           return `✅ Disconnected "${toolkit}" (${entry.id}). To reconnect, use action "connect".`
         }
         if (action === 'connect') {
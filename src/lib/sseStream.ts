@@ -0,0 +1,126 @@
+/**
+ * sseStream.ts
+ * Forwarding an upstream chat-completions SSE body to the client.
+ *
+ * The route ends every response with events of its own (media blocks, the
+ * timing event) and then its own `data: [DONE]`. The upstream body carries a
+ * [DONE] too; passed through, the client would see it before the route's last
+ * events. upstreamLines() drops it, so the only [DONE] is the one sent last.
+ *
+ * .github/scripts/check_sse_stream.js replays upstream bodies through
+ * sanitizingStream and checks the event order (compiled with the project's
+ * `typescript` package).
+ */
+
+export const DONE_LINE = 'data: [DONE]'
+
+/**
+ * The upstream body as whole lines (without '\n'), minus its [DONE].
+ * onChunk runs for every chunk read, before its lines are yielded.
+ */
+export async function* upstreamLines(body: ReadableStream<Uint8Array>, onChunk?: () => void): AsyncGenerator<string> {
+  const reader = body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  while (true) {
+    const { done, value } = await reader.read()
+    if (done) break
+    onChunk?.()
+    const lines = (buffer + decoder.decode(value, { stream: true })).split('\n')
+    buffer = lines.pop() ?? ''
+    for (const line of lines) if (line !== DONE_LINE) yield line
+  }
+  buffer += decoder.decode()
+  if (buffer && buffer !== DONE_LINE) yield buffer
+}
+
+/**
+ * The upstream body line by line, minus its [DONE], then tail() and our [DONE].
+ * tail() returns whole SSE events (media blocks, timing) and runs once the
+ * upstream body has ended.
+ */
+export function passthroughStream(body: ReadableStream<Uint8Array>, opts: { onChunk?: () => void; tail: () => string }): ReadableStream<Uint8Array> {
+  const encoder = new TextEncoder()
+  return new ReadableStream({
+    async start(controller) {
+      for await (const line of upstreamLines(body, opts.onChunk)) controller.enqueue(encoder.encode(line + '\n'))
+      controller.enqueue(encoder.encode(opts.tail() + DONE_LINE + '\n\n'))
+      controller.close()
+    },
+  })
+}
+
+/**
+ * Final answer stream: strips XML tool-call artifacts and model-name leaks from
+ * the content deltas, adds a reasoning_chunk event per delta for the Live
+ * Activity ticker, and ends with tail() and our [DONE].
+ */
+export function sanitizingStream(body: ReadableStream<Uint8Array>, opts: { onChunk?: () => void; tail: () => string }): ReadableStream<Uint8Array> {
+  const encoder = new TextEncoder()
+  return new ReadableStream({
+    async start(controller) {
+      // Accumulate content across deltas to detect and strip XML tool calls
+      // Uses full-content accumulation rather than per-delta tracking (multi-delta XML bleeds)
+      let accContent = ''
+      for await (const line of upstreamLines(body, opts.onChunk)) {
+        if (!line.startsWith('data: ')) {
+          if (line !== '') controller.enqueue(encoder.encode(line + '\n'))
+          continue
+        }
+        try {
+          const parsed = JSON.parse(line.slice(6))
+          const content = parsed?.choices?.[0]?.delta?.content
+          if (content) {
+            accContent += content
+            // If accumulated content contains an open XML tag that hasn't closed yet, suppress output
+            const hasOpenXML = /<minimax:tool_call>/.test(accContent)
+            const hasCloseXML = /<\/minimax:tool_call>/.test(accContent)
+            if (hasOpenXML) {
+              if (hasCloseXML) {
+                // Full XML block accumulated — strip it, emit any clean text that remains
+                const cleanAcc = accContent
+                  .replace(/<minimax:tool_call>[\s\S]*?<\/minimax:tool_call>/g, '')
+                  .replace(/<think>[\s\S]*?<\/think>/gi, '')
+                  .replace(/<invoke[\s\S]*?<\/invoke>/g, '')
+                  .replace(/<parameter[^>]*>[\s\S]*?<\/parameter>/g, '')
+                  .trim()
+                accContent = '' // reset accumulator
+                if (!cleanAcc) continue
+                parsed.choices[0].delta.content = cleanAcc
+              } else {
+                continue // still accumulating XML — suppress
+              }
+            } else {
+              accContent = '' // no XML, safe to emit, reset accumulator
+            }
+          }
+          // Sanitize model name leaks before sending to client
+          if (content && parsed?.choices?.[0]?.delta) {
+            const sanitized = content
+              .replace(/<think>[\s\S]*?<\/think>/gi, '')
+              .replace(/minimax-m2\.\d+(-free)?/gi, 'Atlas')
+              .replace(/music-2\.[05]/gi, 'the music engine')
+              .replace(/speech-02(-hd)?/gi, 'voice synthesis')
+              .replace(/whisper-large-v3-turbo/gi, 'voice recognition')
+              .replace(/ace-step-v1\.5/gi, 'the music engine')
+            if (sanitized !== content) {
+              parsed.choices[0].delta.content = sanitized
+              controller.enqueue(encoder.encode('data: ' + JSON.stringify(parsed) + '\n'))
+              controller.enqueue(encoder.encode(`data: ${JSON.stringify({ reasoning_chunk: sanitized })}\n\n`))
+              continue
+            }
+          }
+          // Emit reasoning_chunk alongside each content delta for the Live Activity ticker
+          if (content) {
+            controller.enqueue(encoder.encode(`data: ${JSON.stringify({ reasoning_chunk: content })}\n\n`))
+          }
+          controller.enqueue(encoder.encode(line + '\n'))
+        } catch {
+          controller.enqueue(encoder.encode(line + '\n'))
+        }
+      }
+      controller.enqueue(encoder.encode(opts.tail() + DONE_LINE + '\n\n'))
+      controller.close()
+    },
+  })
+}
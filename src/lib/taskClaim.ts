@@ -0,0 +1,62 @@
+/**
+ * taskClaim.ts
+ * Claim due AI tasks so several instances share sparkie_tasks execution.
+ *
+ * A claim flips a batch of due pending rows to in_progress in one statement and
+ * picks them with FOR UPDATE SKIP LOCKED: concurrent claimers never wait on each
+ * other and never receive the same row. claimed_at / claimed_by record who took
+ * the task and when (db/migrations/0004_task_claims.sql).
+ *
+ * A claim older than STALE_CLAIM_MINUTES is presumed dead (the instance crashed
+ * or was redeployed mid-task) and goes back to pending. The window covers the
+ * longest executor — /api/agent's three 120s passes.
+ */
+
+import { query } from '@/lib/db'
+import { INSTANCE_ID } from '@/lib/schedulerLeader'
+
+const STALE_CLAIM_MINUTES = 10
+
+export interface ClaimedTask {
+  id: string
+  user_id: string
+  label: string
+  action: string
+  trigger_type: string
+  trigger_config: Record<string, unknown>
+  depends_on: string | null
+}
+
+/** Claim up to `limit` due AI tasks, oldest schedule first — optionally only one user's */
+export async function claimDueTasks(limit: number, userId?: string): Promise<ClaimedTask[]> {
+  const res = await query<ClaimedTask & { scheduled_at: Date }>(
+    `UPDATE sparkie_tasks t
+     SET status = 'in_progress', claimed_at = NOW(), claimed_by = $2
+     FROM (
+       SELECT id FROM sparkie_tasks
+       WHERE executor = 'ai' AND status = 'pending'
+         AND scheduled_at IS NOT NULL AND scheduled_at <= NOW()
+         AND ($3::text IS NULL OR user_id = $3)
+       ORDER BY scheduled_at ASC
+       LIMIT $1
+       FOR UPDATE SKIP LOCKED
+     ) due
+     WHERE t.id = due.id
+     RETURNING t.id, t.user_id, t.label, t.action, t.trigger_type, t.trigger_config, t.depends_on, t.scheduled_at`,
+    [limit, INSTANCE_ID, userId ?? null]
+  )
+  // RETURNING has no defined order
+  return res.rows.sort((a, b) => new Date(a.scheduled_at).getTime() - new Date(b.scheduled_at).getTime())
+}
+
+/** Return in_progress tasks whose claim has gone stale to pending; returns how many */
+export async function releaseStaleClaims(userId?: string): Promise<number> {
+  const res = await query(
+    `UPDATE sparkie_tasks SET status = 'pending', claimed_at = NULL, claimed_by = NULL
+     WHERE status = 'in_progress'
+       AND COALESCE(claimed_at, created_at) < NOW() - make_interval(mins => $1)
+       AND ($2::text IS NULL OR user_id = $2)`,
+    [STALE_CLAIM_MINUTES, userId ?? null]
+  )
+  return res.rowCount ?? 0
+}
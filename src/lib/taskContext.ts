@@ -1,27 +1,5 @@
 import { query } from '@/lib/db'
 
-// ── Schema ─────────────────────────────────────────────────────────────────────
-async function ensureTaskContextSchema(): Promise<void> {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_task_context (
-      task_id           TEXT PRIMARY KEY,
-      user_id           TEXT NOT NULL,
-      user_intent       TEXT NOT NULL DEFAULT '',
-      confidence        FLOAT DEFAULT 0.8,
-      approach          TEXT DEFAULT '',
-      alternatives      JSONB DEFAULT '[]',
-      side_observations JSONB DEFAULT '[]',
-      step_index        INT DEFAULT 0,
-      checkpoint_data   JSONB DEFAULT '{}',
-      token_budget_used INT DEFAULT 0,
-      started_at        TIMESTAMPTZ DEFAULT NOW(),
-      updated_at        TIMESTAMPTZ DEFAULT NOW(),
-      completed_at      TIMESTAMPTZ
-    )
-  `)
-  await query(`CREATE INDEX IF NOT EXISTS idx_task_context_user ON sparkie_task_context(user_id, started_at DESC)`)
-}
-
 export interface TaskContext {
   taskId: string
   userId: string
@@ -44,7 +22,6 @@ export async function createTaskContext(
   confidence = 0.8
 ): Promise<void> {
   try {
-    await ensureTaskContextSchema()
     await query(
       `INSERT INTO sparkie_task_context (task_id, user_id, user_intent, confidence)
        VALUES ($1, $2, $3, $4)
@@ -57,7 +34,6 @@ export async function createTaskContext(
 // ── Load task context ─────────────────────────────────────────────────────────
 export async function loadTaskContext(taskId: string): Promise<TaskContext | null> {
   try {
-    await ensureTaskContextSchema()
     const res = await query(
       `SELECT * FROM sparkie_task_context WHERE task_id = $1`,
       [taskId]
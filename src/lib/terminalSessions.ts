@@ -5,10 +5,14 @@
  */
 
 import type { Sandbox } from '@e2b/code-interpreter'
+import { PtyOutput } from '@/lib/ptyOutput'
 
 export type WsClient = {
   readyState: number
-  send(data: string): void
+  bufferedAmount?: number
+  /** Set by server.js when the client connected with ?frames=binary */
+  binaryFrames?: boolean
+  send(data: string | Uint8Array, opts?: { binary?: boolean }): void
 }
 
 export interface TerminalSession {
@@ -22,6 +26,8 @@ export interface TerminalSession {
   logBuffer: string[]
   /** True once the build command has exited (npx serve started = buildDone) */
   buildDone: boolean
+  /** Coalesced PTY output sender, created on first output (see ptyOutput.js) */
+  output?: PtyOutput
 }
 
 declare global {
@@ -44,6 +50,12 @@ export const sessions: Map<string, TerminalSession> = global.__terminalSessions
 export const encodeMessage: (type: string, data: string) => string =
   global.__terminalEncodeMessage
 
+/** The session's PTY output coalescer — push() PTY chunks to it instead of broadcasting them */
+export function ptyOutputFor(sess: TerminalSession): PtyOutput {
+  if (!sess.output) sess.output = new PtyOutput(() => sess.clients, encodeMessage)
+  return sess.output
+}
+
 if (!(global as Record<string, unknown>).__terminalReaperStarted) {
   (global as Record<string, unknown>).__terminalReaperStarted = true
   setInterval(() => {
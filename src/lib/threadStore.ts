@@ -1,24 +1,12 @@
-import { query } from '@/lib/db'
-
-// ── Schema ────────────────────────────────────────────────────────────────────
-export async function ensureThreadSchema(): Promise<void> {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_threads (
-      id               BIGSERIAL PRIMARY KEY,
-      user_id          TEXT NOT NULL,
-      role             TEXT NOT NULL,
-      content          TEXT NOT NULL,
-      tool_call_id     TEXT,
-      is_tool_result   BOOLEAN DEFAULT FALSE,
-      is_pinned        BOOLEAN DEFAULT FALSE,
-      is_compressed    BOOLEAN DEFAULT FALSE,
-      token_estimate   INT DEFAULT 0,
-      created_at       TIMESTAMPTZ DEFAULT NOW()
-    )
-  `)
-  await query(`CREATE INDEX IF NOT EXISTS idx_sparkie_threads_user ON sparkie_threads(user_id, created_at DESC)`)
-  await query(`CREATE INDEX IF NOT EXISTS idx_sparkie_threads_pinned ON sparkie_threads(user_id, is_pinned)`)
-}
+// Persistent conversation thread with a running token budget and a bounded
+// summary hierarchy.
+//
+// Only readSessionSnapshot / writeSessionSnapshot have a production caller
+// (chat/route.ts). appendThreadMessage, loadThreadContext,
+// getUncompressedTokenCount and compressOldestBatch are not called from any
+// route yet; .github/scripts/bench_thread_store.js is their only user. Wiring
+// them in needs a caller that produces level-0 summaries (a model call).
+import { query, transaction } from '@/lib/db'
 
 export interface ThreadMessage {
   role: 'user' | 'assistant' | 'tool'
@@ -33,16 +21,43 @@ const ROUGH_TOKENS_PER_CHAR = 0.25  // ~4 chars per token
 const MAX_THREAD_TOKENS = 6000      // Keep last ~6k tokens uncompressed
 const COMPRESS_BATCH_SIZE = 20      // Compress this many messages at a time
 
+// Summary hierarchy: level 0 summarises raw messages; once a level holds more than
+// SUMMARY_FANOUT rows its oldest SUMMARY_FANOUT merge into one row a level up.
+// The top level merges into itself, so a user never has more than
+// (MAX_SUMMARY_LEVEL + 1) × SUMMARY_FANOUT summary rows. That bound is paid for
+// in detail: every merge shrinks its inputs to fit one summary, and at the top
+// level the previous top summary is one of the inputs, so the oldest history
+// keeps shrinking until it is gone (see clipMerge).
+const SUMMARY_FANOUT = 4
+const MAX_SUMMARY_LEVEL = 3
+const MERGED_SUMMARY_TOKENS = 500   // Cap on a merged summary (default merger)
+const SUMMARY_TOKEN_BUDGET = 2000   // Summary tokens loaded into context, newest first
+
+/** Merges sibling summaries (oldest first) into one; the default (clipMerge) truncates, it doesn't summarise */
+export type SummaryMerger = (summaries: string[], level: number) => Promise<string>
+
+function estimateTokens(text: string): number {
+  return Math.ceil((text?.length ?? 0) * ROUGH_TOKENS_PER_CHAR)
+}
+
 // ── Append a message to the thread ───────────────────────────────────────────
+// The running budget moves in the same statement, so it can't drift from the rows
 export async function appendThreadMessage(userId: string, msg: ThreadMessage): Promise<void> {
   try {
-    await ensureThreadSchema()
-    const tokenEst = Math.ceil((msg.content?.length ?? 0) * ROUGH_TOKENS_PER_CHAR)
+    const tokenEst = estimateTokens(msg.content)
     // Tool call pairs are always pinned — they are NEVER compressed
     const isPinned = msg.is_tool_result || msg.role === 'tool' || !!msg.tool_call_id
     await query(
-      `INSERT INTO sparkie_threads (user_id, role, content, tool_call_id, is_tool_result, is_pinned, token_estimate)
-       VALUES ($1, $2, $3, $4, $5, $6, $7)`,
+      `WITH ins AS (
+         INSERT INTO sparkie_threads (user_id, role, content, tool_call_id, is_tool_result, is_pinned, token_estimate)
+         VALUES ($1, $2, $3, $4, $5, $6, $7)
+         RETURNING user_id, token_estimate
+       )
+       INSERT INTO sparkie_thread_budget (user_id, uncompressed_tokens)
+       SELECT user_id, token_estimate FROM ins WHERE NOT $6::boolean
+       ON CONFLICT (user_id) DO UPDATE
+         SET uncompressed_tokens = sparkie_thread_budget.uncompressed_tokens + EXCLUDED.uncompressed_tokens,
+             updated_at = NOW()`,
       [userId, msg.role, msg.content, msg.tool_call_id ?? null, msg.is_tool_result ?? false, isPinned, tokenEst]
     )
   } catch { /* non-fatal */ }
@@ -56,21 +71,40 @@ export async function loadThreadContext(userId: string): Promise<{
   recentMessages: ThreadMessage[]
 }> {
   try {
-    await ensureThreadSchema()
+    const [summaryRes, pinnedRes, recentRes] = await Promise.all([
+      // Summaries only (not the '[compressed]' husks), newest first — the hierarchy
+      // keeps this to a few rows however long the thread is
+      query<{ content: string; token_estimate: number }>(
+        `SELECT content, token_estimate FROM sparkie_threads
+         WHERE user_id = $1 AND summary_level IS NOT NULL
+         ORDER BY created_at DESC LIMIT $2`,
+        [userId, (MAX_SUMMARY_LEVEL + 1) * SUMMARY_FANOUT + 1]
+      ),
+      // Pinned tool pairs (never compressed)
+      query<{ role: 'user'|'assistant'|'tool'; content: string; tool_call_id: string|null; is_tool_result: boolean }>(
+        `SELECT role, content, tool_call_id, is_tool_result FROM sparkie_threads
+         WHERE user_id = $1 AND is_pinned = TRUE ORDER BY created_at ASC`,
+        [userId]
+      ),
+      // Recent uncompressed (newest first, up to token budget)
+      query<{ role: 'user'|'assistant'|'tool'; content: string; token_estimate: number }>(
+        `SELECT role, content, token_estimate FROM sparkie_threads
+         WHERE user_id = $1 AND is_compressed = FALSE AND is_pinned = FALSE
+         ORDER BY created_at DESC LIMIT 30`,
+        [userId]
+      ),
+    ])
 
-    // Load compressed summaries
-    const summaryRes = await query<{ content: string }>(
-      `SELECT content FROM sparkie_threads WHERE user_id = $1 AND is_compressed = TRUE ORDER BY created_at ASC`,
-      [userId]
-    )
-    const compressedSummary = summaryRes.rows.map((r) => r.content).join('\n\n')
+    // Newest summaries first until the budget is spent, then back to chronological
+    const summaries: string[] = []
+    let summaryTokens = 0
+    for (const r of summaryRes.rows) {
+      if (summaries.length > 0 && summaryTokens + r.token_estimate > SUMMARY_TOKEN_BUDGET) break
+      summaries.push(r.content)
+      summaryTokens += r.token_estimate
+    }
+    const compressedSummary = summaries.reverse().join('\n\n')
 
-    // Load pinned tool pairs (never compressed)
-    const pinnedRes = await query<{ role: 'user'|'assistant'|'tool'; content: string; tool_call_id: string|null; is_tool_result: boolean }>(
-      `SELECT role, content, tool_call_id, is_tool_result FROM sparkie_threads
-       WHERE user_id = $1 AND is_pinned = TRUE ORDER BY created_at ASC`,
-      [userId]
-    )
     const pinnedPairs = pinnedRes.rows.map((r) => ({
       role: r.role,
       content: r.content,
@@ -78,13 +112,6 @@ export async function loadThreadContext(userId: string): Promise<{
       is_tool_result: r.is_tool_result,
     }))
 
-    // Load recent uncompressed (newest first, up to token budget)
-    const recentRes = await query<{ role: 'user'|'assistant'|'tool'; content: string; token_estimate: number }>(
-      `SELECT role, content, token_estimate FROM sparkie_threads
-       WHERE user_id = $1 AND is_compressed = FALSE AND is_pinned = FALSE
-       ORDER BY created_at DESC LIMIT 30`,
-      [userId]
-    )
     // Reverse to chronological order
     const recentMessages: ThreadMessage[] = recentRes.rows.reverse().map((r) => ({
       role: r.role,
@@ -123,11 +150,11 @@ export async function readSessionSnapshot(userId: string): Promise<string> {
 }
 
 // ── Count uncompressed tokens for a user ─────────────────────────────────────
+// Reads the running total kept by appendThreadMessage / compressOldestBatch
 export async function getUncompressedTokenCount(userId: string): Promise<number> {
   try {
     const res = await query<{ total: string }>(
-      `SELECT COALESCE(SUM(token_estimate), 0) as total FROM sparkie_threads
-       WHERE user_id = $1 AND is_compressed = FALSE AND is_pinned = FALSE`,
+      `SELECT uncompressed_tokens as total FROM sparkie_thread_budget WHERE user_id = $1`,
       [userId]
     )
     return Number(res.rows[0]?.total ?? 0)
@@ -135,34 +162,121 @@ export async function getUncompressedTokenCount(userId: string): Promise<number>
 }
 
 // ── Checkpoint: compress oldest uncompressed batch ───────────────────────────
-// Returns the summary text (for use in worklog entry)
+// Writes summaryText as a level-0 summary, then compacts the summary hierarchy
 export async function compressOldestBatch(
   userId: string,
-  summaryText: string
+  summaryText: string,
+  merge: SummaryMerger = clipMerge
 ): Promise<void> {
   try {
-    // Get the IDs of the oldest COMPRESS_BATCH_SIZE uncompressed, unpinned messages
-    const res = await query<{ id: number }>(
-      `SELECT id FROM sparkie_threads WHERE user_id = $1 AND is_compressed = FALSE AND is_pinned = FALSE
-       ORDER BY created_at ASC LIMIT $2`,
-      [userId, COMPRESS_BATCH_SIZE]
-    )
-    const ids = res.rows.map((r) => r.id)
-    if (ids.length === 0) return
+    // Summary, husks and budget commit together — a failure leaves the originals intact
+    const compressed = await transaction(async (client) => {
+      // Oldest COMPRESS_BATCH_SIZE uncompressed, unpinned messages; locked so a
+      // concurrent compression can't take (and subtract) the same rows
+      const res = await client.query<{ id: number; token_estimate: number }>(
+        `SELECT id, token_estimate FROM sparkie_threads
+         WHERE user_id = $1 AND is_compressed = FALSE AND is_pinned = FALSE
+         ORDER BY created_at ASC LIMIT $2
+         FOR UPDATE`,
+        [userId, COMPRESS_BATCH_SIZE]
+      )
+      if (res.rows.length === 0) return false
+      const ids = res.rows.map((r) => r.id)
+      const tokens = res.rows.reduce((sum, r) => sum + (r.token_estimate ?? 0), 0)
 
-    // Write the summary FIRST — if this fails, original messages are still intact
-    await query(
-      `INSERT INTO sparkie_threads (user_id, role, content, is_compressed, token_estimate)
-       VALUES ($1, 'assistant', $2, TRUE, $3)`,
-      [userId, summaryText, Math.ceil(summaryText.length * ROUGH_TOKENS_PER_CHAR)]
-    )
+      await client.query(
+        `INSERT INTO sparkie_threads (user_id, role, content, is_compressed, token_estimate, summary_level)
+         VALUES ($1, 'assistant', $2, TRUE, $3, 0)`,
+        [userId, summaryText, estimateTokens(summaryText)]
+      )
+      await client.query(
+        `UPDATE sparkie_threads SET is_compressed = TRUE, content = '[compressed]' WHERE id = ANY($1)`,
+        [ids]
+      )
+      await client.query(
+        `UPDATE sparkie_thread_budget
+         SET uncompressed_tokens = GREATEST(uncompressed_tokens - $2, 0), updated_at = NOW()
+         WHERE user_id = $1`,
+        [userId, tokens]
+      )
+      return true
+    })
+    if (compressed) await compactSummaries(userId, merge)
+  } catch (e) { console.error('[threadStore] compressOldestBatch error:', e) }
+}
 
-    // Only mark as compressed after summary is safely written
-    await query(
-      `UPDATE sparkie_threads SET is_compressed = TRUE, content = '[compressed]' WHERE id = ANY($1)`,
-      [ids]
+// ── Summary hierarchy compaction ──────────────────────────────────────────────
+// Merges outside any transaction (the merger may call a model), then swaps the
+// merged row in only if its inputs are all still there
+async function compactSummaries(userId: string, merge: SummaryMerger): Promise<void> {
+  for (let level = 0; level <= MAX_SUMMARY_LEVEL; level++) {
+    const res = await query<{ id: number; content: string; created_at: Date }>(
+      `SELECT id, content, created_at FROM sparkie_threads
+       WHERE user_id = $1 AND summary_level = $2
+       ORDER BY created_at ASC`,
+      [userId, level]
     )
-  } catch (e) { console.error('[threadStore] compressOldestBatch error:', e) }
+    if (res.rows.length <= SUMMARY_FANOUT) continue
+
+    const batch = res.rows.slice(0, SUMMARY_FANOUT)
+    const target = Math.min(level + 1, MAX_SUMMARY_LEVEL)
+    const merged = await merge(batch.map((r) => r.content), target)
+    const ids = batch.map((r) => r.id)
+
+    let raced = false
+    await transaction(async (client) => {
+      const del = await client.query(
+        `DELETE FROM sparkie_threads WHERE id = ANY($1) AND summary_level = $2`,
+        [ids, level]
+      )
+      if (del.rowCount !== ids.length) {
+        // Another compaction got here first — roll back and leave the rest to it
+        raced = true
+        throw new Error('summary compaction raced')
+      }
+      // Dated as its newest input, so created_at order stays chronological
+      await client.query(
+        `INSERT INTO sparkie_threads (user_id, role, content, is_compressed, token_estimate, summary_level, created_at)
+         VALUES ($1, 'assistant', $2, TRUE, $3, $4, $5)`,
+        [userId, merged, estimateTokens(merged), target, batch[batch.length - 1].created_at]
+      )
+    }).catch((e) => { if (!raced) throw e })
+    if (raced) return
+    // Re-check this level: it may still be over its fanout (a backlog from before
+    // the hierarchy existed, or the top level merging into itself)
+    level--
+  }
+}
+
+/**
+ * Default merger: each input keeps an equal share of MERGED_SUMMARY_TOKENS
+ * (2000 chars / 4 inputs = 500 chars), cut at a sentence; the rest of each
+ * input is dropped, not summarised. It is the only merger in the tree.
+ *
+ * Below the top level every input covers a different span and is merged once,
+ * so each keeps its start. Merges into the top level keep each input's end
+ * instead: a merged summary is its inputs joined oldest first, so its end is
+ * its newest content. The previous top summary is an input of every later
+ * top-level merge, and keeping its start would pin the oldest history there
+ * and drop everything after it. Keeping its end lets the top summary move
+ * forward with the thread: history falls off the old end instead of out of
+ * the middle.
+ */
+async function clipMerge(summaries: string[], level: number): Promise<string> {
+  const share = Math.floor(MERGED_SUMMARY_TOKENS / ROUGH_TOKENS_PER_CHAR / summaries.length)
+  const keepEnd = level >= MAX_SUMMARY_LEVEL
+  return summaries.map((text) => {
+    if (text.length <= share) return text
+    if (keepEnd) {
+      const cut = text.slice(-share)
+      const starts = [cut.indexOf('. '), cut.indexOf('\n')].filter((i) => i !== -1)
+      const start = starts.length ? Math.min(...starts) : -1
+      return '… ' + (start !== -1 && start < share / 2 ? cut.slice(start + 1) : cut).trimStart()
+    }
+    const cut = text.slice(0, share)
+    const end = Math.max(cut.lastIndexOf('. '), cut.lastIndexOf('\n'))
+    return (end > share / 2 ? cut.slice(0, end + 1) : cut).trimEnd() + ' …'
+  }).join('\n\n')
 }
 
 export { MAX_THREAD_TOKENS }
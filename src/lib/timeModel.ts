@@ -1,23 +1,5 @@
 import { query } from '@/lib/db'
 
-// ── Schema ─────────────────────────────────────────────────────────────────────
-export async function ensureDeferredIntentsSchema(): Promise<void> {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_deferred_intents (
-      id            UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-      user_id       TEXT NOT NULL,
-      intent        TEXT NOT NULL,
-      source_msg    TEXT DEFAULT '',
-      not_before    TIMESTAMPTZ DEFAULT NOW(),
-      due_at        TIMESTAMPTZ,
-      status        TEXT DEFAULT 'pending',
-      surfaced_at   TIMESTAMPTZ,
-      created_at    TIMESTAMPTZ DEFAULT NOW()
-    )
-  `)
-  await query(`CREATE INDEX IF NOT EXISTS idx_deferred_intents_user ON sparkie_deferred_intents(user_id, status, not_before)`)
-}
-
 export interface DeferredIntent {
   id: string
   userId: string
@@ -87,7 +69,6 @@ export async function saveDeferredIntent(
   dueAt?: Date | null
 ): Promise<void> {
   try {
-    await ensureDeferredIntentsSchema()
     await query(
       `INSERT INTO sparkie_deferred_intents (user_id, intent, source_msg, not_before, due_at)
        VALUES ($1, $2, $3, $4, $5)`,
@@ -99,7 +80,6 @@ export async function saveDeferredIntent(
 // ── Load ready deferred intents (not_before < NOW, status = pending) ──────────
 export async function loadReadyDeferredIntents(userId: string): Promise<DeferredIntent[]> {
   try {
-    await ensureDeferredIntentsSchema()
     const res = await query<{
       id: string; user_id: string; intent: string; source_msg: string;
       not_before: Date; due_at: Date | null; status: string; created_at: Date
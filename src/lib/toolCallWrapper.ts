@@ -3,15 +3,17 @@
  * Phase 1: Tool layer observability.
  * Wraps every Composio/external tool call with:
  *   - Duration tracking
- *   - Success/failure logging to sparkie_tool_log
- *   - In-memory result cache (TTL-based, keyed by tool+args hash)
+ *   - Success/failure logging to sparkie_tool_log (batched through writeBehind.ts)
+ *   - In-memory result cache (LRU + per-tool TTL, keyed by tool+args hash)
  *   - Failure rate tracking (triggers worklog alert at >30% failure in 24h)
  */
 
 import { query } from '@/lib/db'
+import { LruCache } from '@/lib/lruCache'
+import { getSink } from '@/lib/writeBehind'
 
 // ── In-memory cache (keyed by hash) ──────────────────────────────────────────
-const toolCache = new Map<string, { result: string; expires: number }>()
+const toolCache = new LruCache<string, string>({ name: 'tool.results', maxEntries: 500, ttlMs: 60_000, maxBytes: 16 * 1024 * 1024 })
 
 const TOOL_CACHE_TTL: Record<string, number> = {
   default: 60_000,       // 1 minute
@@ -21,6 +23,12 @@ const TOOL_CACHE_TTL: Record<string, number> = {
   search_twitter: 60_000,
 }
 
+const toolLogSink = getSink({
+  name: 'sparkie_tool_log',
+  table: 'sparkie_tool_log',
+  columns: ['id', 'user_id', 'tool', 'args_hash', 'duration_ms', 'success', 'error_code', 'cached', 'created_at'],
+})
+
 function hashArgs(tool: string, args: Record<string, unknown>): string {
   try {
     return tool + ':' + JSON.stringify(args)
@@ -29,23 +37,6 @@ function hashArgs(tool: string, args: Record<string, unknown>): string {
   }
 }
 
-async function ensureToolLogTable() {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_tool_log (
-      id TEXT PRIMARY KEY,
-      user_id TEXT,
-      tool TEXT NOT NULL,
-      args_hash TEXT,
-      duration_ms INT,
-      success BOOLEAN NOT NULL DEFAULT true,
-      error_code TEXT,
-      cached BOOLEAN NOT NULL DEFAULT false,
-      created_at TIMESTAMPTZ DEFAULT NOW()
-    )
-  `).catch(() => {})
-  await query(`CREATE INDEX IF NOT EXISTS idx_tool_log_tool_time ON sparkie_tool_log(tool, created_at DESC)`).catch(() => {})
-}
-
 /**
  * Wrapped tool executor.
  * Usage: const result = await callTool('web_search', { query: '...' }, () => actualFetch(...), userId)
@@ -58,19 +49,13 @@ export async function callTool(
 ): Promise<string> {
   const cacheKey = hashArgs(tool, args)
   const ttl = TOOL_CACHE_TTL[tool] ?? TOOL_CACHE_TTL.default
-  const now = Date.now()
 
   // ── Cache hit ───────────────────────────────────────────────────────────────
   const cached = toolCache.get(cacheKey)
-  if (cached && cached.expires > now) {
-    // Log cache hit (fire-and-forget)
-    ensureToolLogTable().then(() =>
-      query(
-        `INSERT INTO sparkie_tool_log (id, user_id, tool, args_hash, duration_ms, success, cached) VALUES ($1,$2,$3,$4,$5,$6,$7)`,
-        [crypto.randomUUID(), userId ?? null, tool, cacheKey.slice(0, 200), 0, true, true]
-      )
-    ).catch(() => {})
-    return cached.result
+  if (cached !== undefined) {
+    // Log cache hit (queued)
+    toolLogSink.push([crypto.randomUUID(), userId ?? null, tool, cacheKey.slice(0, 200), 0, true, null, true, new Date()])
+    return cached
   }
 
   // ── Execute ─────────────────────────────────────────────────────────────────
@@ -82,7 +67,7 @@ export async function callTool(
   try {
     result = await executor()
     // Cache successful results
-    toolCache.set(cacheKey, { result, expires: now + ttl })
+    toolCache.set(cacheKey, result, ttl)
   } catch (e) {
     success = false
     errorCode = e instanceof Error ? e.message.slice(0, 100) : String(e).slice(0, 100)
@@ -91,14 +76,8 @@ export async function callTool(
 
   const duration = Date.now() - start
 
-  // ── Log (fire-and-forget) ─────────────────────────────────────────────────
-  ensureToolLogTable().then(() =>
-    query(
-      `INSERT INTO sparkie_tool_log (id, user_id, tool, args_hash, duration_ms, success, error_code, cached)
-       VALUES ($1,$2,$3,$4,$5,$6,$7,$8)`,
-      [crypto.randomUUID(), userId ?? null, tool, cacheKey.slice(0, 200), duration, success, errorCode, false]
-    )
-  ).catch(() => {})
+  // ── Log (queued) ─────────────────────────────────────────────────────────
+  toolLogSink.push([crypto.randomUUID(), userId ?? null, tool, cacheKey.slice(0, 200), duration, success, errorCode, false, new Date()])
 
   // ── Failure rate check (async, non-blocking) ─────────────────────────────
   if (!success) {
@@ -112,7 +91,7 @@ export async function callTool(
 /** Check if a tool's failure rate in the last 24h exceeds 30% — logs anomaly to worklog */
 async function checkToolFailureRate(tool: string): Promise<void> {
   try {
-    await ensureToolLogTable()
+    await toolLogSink.flush() // count the failure that triggered this check
     const res = await query<{ total: string; failures: string }>(
       `SELECT
          COUNT(*) AS total,
@@ -145,10 +124,7 @@ async function checkToolFailureRate(tool: string): Promise<void> {
   } catch { /* non-critical */ }
 }
 
-/** Clean expired cache entries (call periodically) */
+/** Free expired cache entries early — size is already bounded by the LRU */
 export function pruneToolCache(): void {
-  const now = Date.now()
-  for (const [key, val] of toolCache.entries()) {
-    if (val.expires < now) toolCache.delete(key)
-  }
+  toolCache.prune()
 }
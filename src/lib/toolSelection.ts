@@ -0,0 +1,253 @@
+/**
+ * toolSelection.ts
+ * Per-turn tool subset for /api/chat, so each LLM round trip ships only relevant schemas.
+ *
+ * buildToolIndex() tokenizes every tool's name, description and parameter names
+ * once (cached per tools array). selectTools() then offers, in order:
+ *
+ *   1. the always-on set (core tools) and tools already called in this conversation
+ *   2. tools named verbatim in the message
+ *   3. the best BM25 matches for the latest user message, up to the tier's limit
+ *      (conversational: a handful, task: a couple dozen)
+ *
+ * The route re-offers the full set for the rest of the request when the model
+ * calls a tool it wasn't offered (see "widen" in chat/route.ts).
+ * TOOL_SELECTION=full turns selection off. Counters are reported by /api/health.
+ * .github/scripts/bench_tool_selection.js replays against it (compiled with the
+ * project's `typescript` package).
+ */
+
+export type ToolTier = 'conversational' | 'task'
+
+/** The part of an OpenAI-style tool definition selection reads */
+export interface ToolDefinition {
+  function?: { name?: string; description?: string; parameters?: { properties?: Record<string, unknown> } }
+}
+
+interface ToolDoc<T> {
+  tool: T
+  name: string
+  tf: Map<string, number>
+  len: number
+  schemaChars: number
+}
+
+export interface ToolIndex<T> {
+  docs: ToolDoc<T>[]
+  byName: Map<string, ToolDoc<T>>
+  df: Map<string, number>
+  avgLen: number
+  schemaChars: number
+}
+
+export interface ToolSelection<T> {
+  tools: T[]
+  names: Set<string>
+  schemaTokens: number
+  fullSchemaTokens: number
+}
+
+interface ToolSelectionCounters {
+  selections: number
+  offered: number
+  available: number
+  schemaTokensOffered: number
+  schemaTokensAvailable: number
+  widened: number
+}
+
+declare global {
+  // eslint-disable-next-line no-var
+  var __toolSelectionCounters: ToolSelectionCounters | undefined
+}
+
+export const TIER_LIMITS: Record<ToolTier, number> = { conversational: 6, task: 24 }
+const CHARS_PER_TOKEN = 4
+const K1 = 1.2
+const B = 0.75
+
+const STOPWORDS = new Set([
+  'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'could', 'do', 'does', 'for', 'from', 'get', 'has', 'have',
+  'how', 'i', 'if', 'in', 'into', 'is', 'it', 'its', 'me', 'my', 'of', 'on', 'or', 'our', 'please', 'so', 'that',
+  'the', 'their', 'them', 'then', 'there', 'this', 'to', 'us', 'use', 'was', 'we', 'what', 'when', 'which', 'will',
+  'with', 'would', 'you', 'your', 'just', 'also', 'any', 'all', 'some', 'one', 'up', 'out', 'about', 'eg',
+])
+
+// User phrasing → words the tool descriptions actually use
+const ALIASES: Record<string, string[]> = {
+  inbox: ['email'], mail: ['email'], gmail: ['email'], reply: ['email', 'send'], forward: ['email', 'send'],
+  meeting: ['calendar', 'event'], appointment: ['calendar', 'event'], invite: ['calendar', 'rsvp'],
+  remind: ['schedule', 'task'], reminder: ['schedule', 'task'], later: ['schedule'], tomorrow: ['schedule'],
+  tweet: ['twitter', 'social'], linkedin: ['social'], post: ['social', 'feed'],
+  pr: ['github', 'pull'], repo: ['github', 'repository'], commit: ['github', 'git'], push: ['github', 'git'],
+  deploy: ['deployment'], redeploy: ['deployment'], build: ['deployment', 'ide'], logs: ['deployment', 'health'],
+  photo: ['image'], picture: ['image'], draw: ['image'], song: ['music'], track: ['music'], beat: ['music'],
+  clip: ['video'], voice: ['speech', 'audio'], say: ['speech'], transcribe: ['audio'],
+  remember: ['memory'], forget: ['memory', 'delete'], recall: ['memory'],
+  website: ['browser', 'url'], page: ['browser', 'url'], link: ['url'], browse: ['browser'],
+  google: ['search', 'web'], news: ['search', 'web'], lookup: ['search'],
+  bug: ['diagnose', 'error'], broken: ['diagnose', 'error'], crash: ['diagnose', 'error'],
+  table: ['database', 'schema'], sql: ['database', 'query'], db: ['database'],
+  code: ['file', 'codebase'], function: ['codebase', 'grep'], shell: ['terminal'], command: ['terminal'],
+  goal: ['goal'], rule: ['behavior', 'rule'], feeling: ['emotional'], mood: ['emotional'],
+}
+
+function stem(word: string): string {
+  if (word.length > 5 && word.endsWith('ies')) return word.slice(0, -3) + 'y'
+  if (word.length > 5 && word.endsWith('ing')) return word.slice(0, -3)
+  if (word.length > 4 && word.endsWith('ed')) return word.slice(0, -2)
+  if (word.length > 3 && word.endsWith('s') && !word.endsWith('ss')) return word.slice(0, -1)
+  return word
+}
+
+/** Lowercased, stemmed terms; snake_case names split into words */
+export function tokenize(text: string | undefined): string[] {
+  const out: string[] = []
+  for (const raw of String(text || '').toLowerCase().split(/[^a-z0-9]+/)) {
+    if (raw.length < 2 || STOPWORDS.has(raw)) continue
+    out.push(stem(raw))
+  }
+  return out
+}
+
+function queryTerms(text: string): Set<string> {
+  const terms = new Set<string>()
+  for (const raw of String(text || '').toLowerCase().split(/[^a-z0-9]+/)) {
+    if (raw.length < 2 || STOPWORDS.has(raw)) continue
+    terms.add(stem(raw))
+    for (const alias of ALIASES[raw] || []) terms.add(stem(alias))
+  }
+  return terms
+}
+
+const indexCache = new WeakMap<readonly object[], ToolIndex<object>>()
+
+function createIndex<T extends ToolDefinition>(tools: readonly T[]): ToolIndex<T> {
+  const docs: ToolDoc<T>[] = []
+  const df = new Map<string, number>()
+  let totalLen = 0
+  for (const tool of tools) {
+    const fn = tool && tool.function
+    if (!fn || !fn.name) continue
+    const params = fn.parameters && fn.parameters.properties ? Object.keys(fn.parameters.properties).join(' ') : ''
+    const nameTerms = tokenize(fn.name)
+    // Name terms count double: they are the most specific words a tool has
+    const terms = [...nameTerms, ...nameTerms, ...tokenize(fn.description), ...tokenize(params)]
+    const tf = new Map<string, number>()
+    for (const t of terms) tf.set(t, (tf.get(t) || 0) + 1)
+    for (const t of tf.keys()) df.set(t, (df.get(t) || 0) + 1)
+    totalLen += terms.length
+    docs.push({ tool, name: fn.name, tf, len: terms.length, schemaChars: JSON.stringify(tool).length })
+  }
+  const byName = new Map(docs.map(d => [d.name, d]))
+  return {
+    docs,
+    byName,
+    df,
+    avgLen: docs.length ? totalLen / docs.length : 1,
+    schemaChars: docs.reduce((n, d) => n + d.schemaChars, 0),
+  }
+}
+
+/** Index for a tools array; built once per array */
+export function buildToolIndex<T extends ToolDefinition>(tools: readonly T[]): ToolIndex<T> {
+  let index = indexCache.get(tools) as ToolIndex<T> | undefined
+  if (!index) {
+    index = createIndex(tools)
+    indexCache.set(tools, index as ToolIndex<object>)
+  }
+  return index
+}
+
+function score<T>(index: ToolIndex<T>, doc: ToolDoc<T>, terms: Set<string>): number {
+  let s = 0
+  const n = index.docs.length
+  for (const t of terms) {
+    const f = doc.tf.get(t)
+    if (!f) continue
+    const df = index.df.get(t) || 0
+    const idf = Math.log(1 + (n - df + 0.5) / (df + 0.5))
+    s += idf * (f * (K1 + 1)) / (f + K1 * (1 - B + B * doc.len / index.avgLen))
+  }
+  return s
+}
+
+// On global so /api/health (a separate route bundle) reads the chat route's counters
+if (!global.__toolSelectionCounters) {
+  global.__toolSelectionCounters = { selections: 0, offered: 0, available: 0, schemaTokensOffered: 0, schemaTokensAvailable: 0, widened: 0 }
+}
+const counters = global.__toolSelectionCounters
+
+export interface SelectToolsOptions {
+  /** Latest user message */
+  message: string
+  tier: ToolTier
+  /** Names offered regardless of score */
+  always?: Iterable<string>
+  /** Names already called in this conversation */
+  used?: Iterable<string>
+}
+
+/** Pick the tools to offer for one LLM call; the index is cached per tools array */
+export function selectTools<T extends ToolDefinition>(
+  tools: readonly T[],
+  { message, tier, always = [], used = [] }: SelectToolsOptions
+): ToolSelection<T> {
+  const index = buildToolIndex(tools)
+  const picked = new Set<string>()
+  for (const name of always) if (index.byName.has(name)) picked.add(name)
+  for (const name of used) if (index.byName.has(name)) picked.add(name)
+
+  const lower = String(message || '').toLowerCase()
+  for (const doc of index.docs) {
+    if (doc.name.includes('_') && lower.includes(doc.name)) picked.add(doc.name)
+  }
+
+  const limit = TIER_LIMITS[tier] ?? TIER_LIMITS.task
+  const terms = queryTerms(message)
+  if (terms.size && limit > 0) {
+    const ranked: Array<{ name: string; s: number }> = []
+    for (const doc of index.docs) {
+      if (picked.has(doc.name)) continue
+      const s = score(index, doc, terms)
+      if (s > 0) ranked.push({ name: doc.name, s })
+    }
+    ranked.sort((a, b) => b.s - a.s)
+    for (const r of ranked.slice(0, limit)) picked.add(r.name)
+  }
+
+  // Keep the original definition order — stable prefix for the provider's prompt cache
+  const selected = index.docs.filter(d => picked.has(d.name))
+  const schemaChars = selected.reduce((n, d) => n + d.schemaChars, 0)
+  const result: ToolSelection<T> = {
+    tools: selected.map(d => d.tool),
+    names: picked,
+    schemaTokens: Math.round(schemaChars / CHARS_PER_TOKEN),
+    fullSchemaTokens: Math.round(index.schemaChars / CHARS_PER_TOKEN),
+  }
+  counters.selections++
+  counters.offered += selected.length
+  counters.available += index.docs.length
+  counters.schemaTokensOffered += result.schemaTokens
+  counters.schemaTokensAvailable += result.fullSchemaTokens
+  return result
+}
+
+/** Record that a request fell back to the full tool set */
+export function recordWidened(): void {
+  counters.widened++
+}
+
+export function toolSelectionStats() {
+  const saved = counters.schemaTokensAvailable - counters.schemaTokensOffered
+  return {
+    ...counters,
+    avgOffered: counters.selections ? Math.round(counters.offered / counters.selections) : 0,
+    schemaTokensSaved: saved,
+    savedPct: counters.schemaTokensAvailable ? Math.round(100 * saved / counters.schemaTokensAvailable) : 0,
+  }
+}
+
+export function toolSelectionEnabled(): boolean {
+  return (process.env.TOOL_SELECTION || '').toLowerCase() !== 'full'
+}
@@ -0,0 +1,14 @@
+// add_causal_link — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { addCausalLink } from '@/lib/causalModel'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runAddCausalLink(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { cause, effect, confidence: causalConf } = args as { cause: string; effect: string; confidence: number }
+  if (!cause || !effect || causalConf === undefined) return 'add_causal_link: cause, effect, confidence are required'
+  try {
+    await addCausalLink(cause, effect, causalConf)
+    return `✅ Causal link added: ${cause} → ${effect} (confidence: ${Math.round(causalConf * 100)}%)`
+  } catch (e) { return `add_causal_link error: ${String(e)}` }
+}
@@ -0,0 +1,26 @@
+// browser_click — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runBrowserClick(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { url: hbUrl, selector: hbSel, description: hbDesc, profile_id: hbProfileId } = args as { url: string; selector?: string; description?: string; profile_id?: string }
+  if (!hbUrl) return 'browser_click: url is required'
+  const HB_KEY = process.env.HYPERBROWSER_API_KEY ?? ''
+  if (!HB_KEY) return 'HYPERBROWSER_API_KEY not configured'
+  try {
+    const clickTarget = hbSel ? `the element with selector "${hbSel}"` : (hbDesc ?? 'the most prominent clickable element')
+    const task = `Navigate to ${hbUrl} and click on ${clickTarget}`
+    const sessionOpts: Record<string, unknown> = {}
+    if (hbProfileId) sessionOpts.profile = { id: hbProfileId, persistChanges: true }
+    const res = await fetch('https://api.hyperbrowser.ai/api/agents/browser-use', {
+      method: 'POST',
+      headers: { 'x-api-key': HB_KEY, 'Content-Type': 'application/json' },
+      body: JSON.stringify({ task, ...(Object.keys(sessionOpts).length ? { sessionOptions: sessionOpts } : {}) }),
+      signal: AbortSignal.timeout(60000),
+    })
+    if (!res.ok) return `browser_click error: ${res.status} — ${await res.text()}`
+    const data = await res.json() as { result?: string; output?: string; finalResult?: string }
+    return data.finalResult ?? data.result ?? data.output ?? '✅ Click action completed'
+  } catch (e) { return `browser_click error: ${String(e)}` }
+}
@@ -0,0 +1,31 @@
+// browser_create_profile — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runBrowserCreateProfile(name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId, baseUrl } = ctx
+  const { name: profileName = 'sparkie-default' } = args as { name?: string }
+  const HB_KEY = process.env.HYPERBROWSER_API_KEY ?? ''
+  if (!HB_KEY) return 'HYPERBROWSER_API_KEY not configured'
+  try {
+    const res = await fetch('https://api.hyperbrowser.ai/api/profile', {
+      method: 'POST',
+      headers: { 'x-api-key': HB_KEY, 'Content-Type': 'application/json' },
+      body: JSON.stringify({ name: profileName }),
+      signal: AbortSignal.timeout(15000),
+    })
+    if (!res.ok) return `browser_create_profile error: ${res.status} — ${await res.text()}`
+    const data = await res.json() as { id?: string; name?: string }
+    if (!data.id) return 'browser_create_profile: no profile ID in response'
+    // Persist profile ID to Sparkie self-memory for future use
+    if (userId) {
+      await fetch(`${baseUrl}/api/sparkie-self-memory`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET ?? '' },
+        body: JSON.stringify({ category: 'browser_profiles', content: `Browser profile "${profileName}": ${data.id}`, source: 'sparkie' }),
+      }).catch(() => {})
+    }
+    return `✅ Browser profile created — "${profileName}" (ID: ${data.id}). Use this ID with browser_use_profile for authenticated browsing.`
+  } catch (e) { return `browser_create_profile error: ${String(e)}` }
+}
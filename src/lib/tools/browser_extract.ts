@@ -0,0 +1,25 @@
+// browser_extract — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runBrowserExtract(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { url: hbUrl, prompt: hbPrompt, schema: hbSchema } = args as { url: string; prompt: string; schema?: Record<string, unknown> }
+  if (!hbUrl || !hbPrompt) return 'browser_extract: url and prompt are required'
+  const HB_KEY = process.env.HYPERBROWSER_API_KEY ?? ''
+  if (!HB_KEY) return 'HYPERBROWSER_API_KEY not configured'
+  try {
+    const body: Record<string, unknown> = { urls: [hbUrl], prompt: hbPrompt }
+    if (hbSchema) body.schema = hbSchema
+    const res = await fetch('https://api.hyperbrowser.ai/api/extract', {
+      method: 'POST',
+      headers: { 'x-api-key': HB_KEY, 'Content-Type': 'application/json' },
+      body: JSON.stringify(body),
+      signal: AbortSignal.timeout(35000),
+    })
+    if (!res.ok) return `browser_extract error: ${res.status} — ${await res.text()}`
+    const data = await res.json() as { data?: unknown; error?: string }
+    if (data.error) return `browser_extract failed: ${data.error}`
+    return JSON.stringify(data.data ?? data, null, 2).slice(0, 4000)
+  } catch (e) { return `browser_extract error: ${String(e)}` }
+}
@@ -0,0 +1,26 @@
+// browser_fill — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runBrowserFill(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { url: hbUrl, selector: hbSel, value: hbValue, description: hbDesc, profile_id: hbProfileId } = args as { url: string; selector?: string; value: string; description?: string; profile_id?: string }
+  if (!hbUrl || !hbValue) return 'browser_fill: url and value are required'
+  const HB_KEY = process.env.HYPERBROWSER_API_KEY ?? ''
+  if (!HB_KEY) return 'HYPERBROWSER_API_KEY not configured'
+  try {
+    const fieldTarget = hbSel ? `the field with selector "${hbSel}"` : (hbDesc ?? 'the main input field')
+    const task = `Navigate to ${hbUrl} and fill ${fieldTarget} with: ${hbValue}`
+    const sessionOpts: Record<string, unknown> = {}
+    if (hbProfileId) sessionOpts.profile = { id: hbProfileId, persistChanges: true }
+    const res = await fetch('https://api.hyperbrowser.ai/api/agents/browser-use', {
+      method: 'POST',
+      headers: { 'x-api-key': HB_KEY, 'Content-Type': 'application/json' },
+      body: JSON.stringify({ task, ...(Object.keys(sessionOpts).length ? { sessionOptions: sessionOpts } : {}) }),
+      signal: AbortSignal.timeout(60000),
+    })
+    if (!res.ok) return `browser_fill error: ${res.status} — ${await res.text()}`
+    const data = await res.json() as { result?: string; output?: string; finalResult?: string }
+    return data.finalResult ?? data.result ?? data.output ?? '✅ Fill action completed'
+  } catch (e) { return `browser_fill error: ${String(e)}` }
+}
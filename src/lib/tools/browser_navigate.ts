@@ -0,0 +1,26 @@
+// browser_navigate — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runBrowserNavigate(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { url: hbUrl, extract_markdown: hbMd = true } = args as { url: string; extract_markdown?: boolean }
+  if (!hbUrl) return 'browser_navigate: url is required'
+  const HB_KEY = process.env.HYPERBROWSER_API_KEY ?? ''
+  if (!HB_KEY) return 'HYPERBROWSER_API_KEY not configured'
+  try {
+    const formats = hbMd ? ['markdown', 'links'] : ['html']
+    const res = await fetch('https://api.hyperbrowser.ai/api/scrape', {
+      method: 'POST',
+      headers: { 'x-api-key': HB_KEY, 'Content-Type': 'application/json' },
+      body: JSON.stringify({ url: hbUrl, scrapeOptions: { formats } }),
+      signal: AbortSignal.timeout(30000),
+    })
+    if (!res.ok) return `browser_navigate error: ${res.status} — ${await res.text()}`
+    const data = await res.json() as { markdown?: string; html?: string; links?: string[]; metadata?: { title?: string; description?: string } }
+    const title = data.metadata?.title ?? 'Unknown'
+    const content = (data.markdown ?? data.html ?? '').slice(0, 4000)
+    const links = (data.links ?? []).slice(0, 10).join('\n')
+    return `Navigated to: ${hbUrl}\nTitle: ${title}\n\n${content}${links ? '\n\nLinks:\n' + links : ''}`
+  } catch (e) { return `browser_navigate error: ${String(e)}` }
+}
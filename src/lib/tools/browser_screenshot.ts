@@ -0,0 +1,73 @@
+// browser_screenshot — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runBrowserScreenshot(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  const { url: hbUrl } = args as { url: string }
+  if (!hbUrl) return 'browser_screenshot: url is required'
+  const HB_KEY = process.env.HYPERBROWSER_API_KEY ?? ''
+  if (!HB_KEY) return 'browser_screenshot error: HYPERBROWSER_API_KEY not configured'
+  console.log('[screenshot] starting for url:', hbUrl)
+  try {
+    // Hyperbrowser /api/scrape supports 'screenshot' format — pass it alongside 'markdown'
+    // The response nests data under a top-level 'data' key when using session-mode
+    const scrapeStart = Date.now()
+    const res = await fetch('https://api.hyperbrowser.ai/api/scrape', {
+      method: 'POST',
+      headers: { 'x-api-key': HB_KEY, 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        url: hbUrl,
+        scrapeOptions: { formats: ['screenshot', 'markdown'] },
+        sessionOptions: { useProxy: false, solveCaptchas: false },
+      }),
+      signal: AbortSignal.timeout(35000),
+    })
+    console.log('[screenshot] status:', res.status, 'elapsed:', Date.now() - scrapeStart, 'ms')
+    if (!res.ok) {
+      const errText = await res.text()
+      console.log('[screenshot] error body:', errText.slice(0, 300))
+      // Fallback: use browser_navigate to get page content instead of screenshot
+      const fallbackRes = await fetch('https://api.hyperbrowser.ai/api/scrape', {
+        method: 'POST',
+        headers: { 'x-api-key': HB_KEY, 'Content-Type': 'application/json' },
+        body: JSON.stringify({ url: hbUrl, scrapeOptions: { formats: ['markdown'] } }),
+        signal: AbortSignal.timeout(30000),
+      })
+      if (fallbackRes.ok) {
+        const fd = await fallbackRes.json() as { markdown?: string; data?: { markdown?: string }; metadata?: { title?: string } }
+        const md = fd.markdown ?? fd.data?.markdown ?? ''
+        return `browser_screenshot: screenshot unavailable (API error ${res.status}). Page text:\nURL: ${hbUrl}\nTitle: ${fd.metadata?.title ?? hbUrl}\n\n${md.slice(0, 800)}`
+      }
+      return `browser_screenshot error: ${res.status} — ${errText.slice(0, 200)}`
+    }
+    const data = await res.json() as {
+      screenshot?: string; markdown?: string; metadata?: { title?: string }
+      data?: { screenshot?: string; markdown?: string; metadata?: { title?: string } }
+    }
+    console.log('[screenshot] response keys:', Object.keys(data).join(','))
+    const screenshot = data.screenshot ?? data.data?.screenshot
+    const markdown = data.markdown ?? data.data?.markdown
+    const pageTitle = data.metadata?.title ?? data.data?.metadata?.title ?? hbUrl
+    if (screenshot) {
+      const imgData = screenshot.startsWith('data:') ? screenshot : `data:image/png;base64,${screenshot}`
+      // Persist to DB asset for stable URL if userId available
+      if (userId) {
+        try {
+          const hbBaseUrl = process.env.NEXTAUTH_URL ?? 'https://sparkie-studio-fymtq.ondigitalocean.app'
+          const fid = crypto.randomUUID()
+          await query(
+            `INSERT INTO sparkie_assets (user_id, name, content, asset_type, source, file_id, chat_title, chat_id, language) VALUES ($1, $2, $3, 'image', 'browser', $4, '', '', '')`,
+            [userId, `screenshot-${Date.now()}.png`, imgData, fid]
+          )
+          return `IMAGE_URL:${hbBaseUrl}/api/assets-image?fid=${fid}\nScreenshot of: ${pageTitle}\n${markdown?.slice(0, 300) ?? ''}`
+        } catch { /* fall through to raw data URL */ }
+      }
+      return `IMAGE_URL:${imgData}\nScreenshot of: ${pageTitle}`
+    }
+    // No screenshot in response — return page text as fallback
+    return `browser_screenshot: no image returned. Page: ${pageTitle}\n${markdown?.slice(0, 500) ?? ''}`
+  } catch (e) { return `browser_screenshot error: ${String(e)}` }
+}
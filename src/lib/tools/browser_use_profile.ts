@@ -0,0 +1,28 @@
+// browser_use_profile — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runBrowserUseProfile(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { profile_id: hbProfileId, task: hbTask, url: hbStartUrl } = args as { profile_id: string; task: string; url?: string }
+  if (!hbProfileId || !hbTask) return 'browser_use_profile: profile_id and task are required'
+  const HB_KEY = process.env.HYPERBROWSER_API_KEY ?? ''
+  if (!HB_KEY) return 'HYPERBROWSER_API_KEY not configured'
+  try {
+    const body: Record<string, unknown> = {
+      task: hbTask,
+      sessionOptions: { profile: { id: hbProfileId, persistChanges: true }, useStealth: true },
+    }
+    if (hbStartUrl) body.startUrl = hbStartUrl
+    const res = await fetch('https://api.hyperbrowser.ai/api/agents/browser-use', {
+      method: 'POST',
+      headers: { 'x-api-key': HB_KEY, 'Content-Type': 'application/json' },
+      body: JSON.stringify(body),
+      signal: AbortSignal.timeout(180000), // 180s — matches platform maxDuration, long LLM calls (reasoning + synthesis) can exceed 90s
+    })
+    if (!res.ok) return `browser_use_profile error: ${res.status} — ${await res.text()}`
+    const data = await res.json() as { result?: string; output?: string; finalResult?: string; error?: string }
+    if (data.error) return `browser_use_profile failed: ${data.error}`
+    return data.finalResult ?? data.result ?? data.output ?? '✅ Browser task completed'
+  } catch (e) { return `browser_use_profile error: ${String(e)}` }
+}
@@ -0,0 +1,34 @@
+// check_deployment — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runCheckDeployment(_name: string, _args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  try {
+    const baseUrl = process.env.NEXTAUTH_URL ?? 'https://sparkie-studio-fymtq.ondigitalocean.app'
+    const cronSecret = process.env.AGENT_CRON_SECRET ?? ''
+    const r = await fetch(`${baseUrl}/api/deploy-monitor`, {
+      headers: { 'x-cron-secret': cronSecret }
+    })
+    if (!r.ok) return `Deploy monitor returned ${r.status}`
+    const data = await r.json() as {
+      status: string
+      failed: boolean
+      latest: { phase: string; updatedAt: string; cause: string }
+      diagnosis: { errorType: string; details: string; suggestedFix: string } | null
+      buildLog: string | null
+    }
+    if (data.status === 'healthy') {
+      return `✅ Latest deployment is healthy (${data.latest?.phase}). Last updated: ${data.latest?.updatedAt}.`
+    }
+    if (data.status === 'building') {
+      return `🔄 Build in progress (${data.latest?.phase}). Triggered by: ${data.latest?.cause}.`
+    }
+    if (data.failed && data.diagnosis) {
+      return `🚨 BUILD FAILED\nError type: ${data.diagnosis.errorType}\nDetails: ${data.diagnosis.details}\nSuggested fix: ${data.diagnosis.suggestedFix}\n\nLast 500 chars of log:\n${(data.buildLog ?? '').slice(-500)}`
+    }
+    return JSON.stringify(data, null, 2).slice(0, 1000)
+  } catch (e) {
+    return `Deployment check error: ${String(e)}`
+  }
+}
@@ -0,0 +1,14 @@
+// check_goal_progress — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { updateGoalProgress } from '@/lib/goalEngine'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runCheckGoalProgress(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { goal_id, progress_update } = args as { goal_id: string; progress_update: string }
+  if (!goal_id || !progress_update) return 'check_goal_progress: goal_id and progress_update are required'
+  try {
+    await updateGoalProgress(goal_id, progress_update)
+    return `✅ Goal ${goal_id.slice(0, 8)} progress updated: ${progress_update}`
+  } catch (e) { return `check_goal_progress error: ${String(e)}` }
+}
@@ -0,0 +1,16 @@
+// check_health — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runCheckHealth(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const targetUrl = (args.url as string | undefined) ?? 'https://sparkie-studio-mhouq.ondigitalocean.app'
+  try {
+    const start = Date.now()
+    const healthRes = await fetch(targetUrl, { method: 'HEAD', signal: AbortSignal.timeout(8000) })
+    const ms = Date.now() - start
+    return JSON.stringify({ url: targetUrl, status: healthRes.status, ok: healthRes.ok, latencyMs: ms })
+  } catch (e) {
+    return JSON.stringify({ url: targetUrl, reachable: false, error: String(e) })
+  }
+}
@@ -0,0 +1,21 @@
+// complete_goal — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { completeGoal } from '@/lib/goalEngine'
+import { writeWorklog } from '@/lib/worklog'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runCompleteGoal(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { goal_id: completeGoalId, outcome } = args as { goal_id: string; outcome: string }
+  if (!completeGoalId || !outcome) return 'complete_goal: goal_id and outcome are required'
+  try {
+    await completeGoal(completeGoalId, outcome)
+    await writeWorklog(userId, 'task_executed', `🎯 Goal achieved: ${outcome.slice(0, 100)}`, {
+      status: 'done', decision_type: 'action', signal_priority: 'P2',
+      conclusion: `Goal ${completeGoalId.slice(0, 8)} completed: ${outcome.slice(0, 80)}`,
+    }).catch(() => {})
+    return `🎉 Goal ${completeGoalId.slice(0, 8)} marked COMPLETE!\nOutcome: ${outcome}`
+  } catch (e) { return `complete_goal error: ${String(e)}` }
+}
@@ -0,0 +1,31 @@
+// composio_discover — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runComposioDiscover(name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { query: q, app, limit: qLimit = 5 } = args as { query: string; app?: string; limit?: number }
+  if (!q) return 'composio_discover: query is required'
+  try {
+    const tk = app?.toLowerCase().replace(/\s+/g, '_')
+    let url = `https://backend.composio.dev/api/v3/tools?query=${encodeURIComponent(q)}&limit=${qLimit}`
+    if (tk) {
+      // When app is specified, search within that toolkit using combined query+toolkit_slug
+      url = `https://backend.composio.dev/api/v3/tools?query=${encodeURIComponent(q)}&toolkit_slug=${tk}&limit=${qLimit}`
+    }
+    const res = await fetch(url, {
+      headers: { 'x-api-key': process.env.COMPOSIO_API_KEY ?? '' },
+      signal: AbortSignal.timeout(15000),
+    })
+    if (!res.ok) return `composio_discover: API error ${res.status}`
+    const data = await res.json() as { items?: Array<{ slug: string; name: string; description: string; toolkit: { slug: string } }>; total_items?: number }
+    const tools = data.items ?? []
+    if (!tools.length) return `No tools found for "${q}"${tk ? ` in ${app}` : ''}`
+    const lines = tools.map((t: any) => `**${t.slug}** — ${t.name}\n${t.description?.slice(0, 120) ?? ''}`)
+    return `Found ${tools.length} tools for "${q}"${tk ? ` (${app})` : ''}:\n\n${lines.join('\n\n')}`
+  } catch (e) {
+    return `composio_discover error: ${String(e)}`
+  }
+}
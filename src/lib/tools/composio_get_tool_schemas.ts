@@ -0,0 +1,32 @@
+// composio_get_tool_schemas — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runComposioGetToolSchemas(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { tool_slugs } = args as { tool_slugs: string[] }
+  if (!tool_slugs?.length) return 'composio_get_tool_schemas: tool_slugs array is required'
+  try {
+    const results = await Promise.all(
+      tool_slugs.slice(0, 10).map(async (slug: string) => {
+        const res = await fetch(
+          `https://backend.composio.dev/api/v3/tools/${encodeURIComponent(slug)}`,
+          { headers: { 'x-api-key': process.env.COMPOSIO_API_KEY ?? '' }, signal: AbortSignal.timeout(10000) }
+        )
+        if (!res.ok) return { slug, error: `HTTP ${res.status}` }
+        const data = await res.json() as any
+        return {
+          slug,
+          name: data.name,
+          description: data.description,
+          input_schema: data.input_parameters,
+        }
+      })
+    )
+    return JSON.stringify(results, null, 2)
+  } catch (e) {
+    return `composio_get_tool_schemas error: ${String(e)}`
+  }
+}
@@ -0,0 +1,21 @@
+// create_behavior_rule — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { createBehaviorRule } from '@/lib/behaviorRules'
+import { writeWorklog } from '@/lib/worklog'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runCreateBehaviorRule(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { condition, action, reasoning } = args as { condition: string; action: string; reasoning: string }
+  if (!condition || !action || !reasoning) return 'create_behavior_rule: condition, action, and reasoning are required'
+  try {
+    const ruleId = await createBehaviorRule(condition, action, reasoning)
+    await writeWorklog(userId, 'decision', `🧠 New behavior rule: IF ${condition} → ${action}`, {
+      status: 'done', decision_type: 'proactive', signal_priority: 'P2',
+      conclusion: `Behavior rule created — condition: "${condition.slice(0, 60)}"`,
+    }).catch(() => {})
+    return `✅ Behavior rule created (ID: ${ruleId.slice(0, 8)})\nIF: ${condition}\nTHEN: ${action}\nReason: ${reasoning}`
+  } catch (e) { return `create_behavior_rule error: ${String(e)}` }
+}
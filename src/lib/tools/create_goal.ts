@@ -0,0 +1,23 @@
+// create_goal — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { createGoal } from '@/lib/goalEngine'
+import { writeWorklog } from '@/lib/worklog'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runCreateGoal(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { title: gTitle, description: gDesc, type: gType, priority: gPriority, success_criteria, check_every_n_sessions = 1 } = args as {
+    title: string; description: string; type: string; priority: string; success_criteria: string; check_every_n_sessions?: number
+  }
+  if (!gTitle || !gType || !gPriority || !success_criteria) return 'create_goal: title, type, priority, success_criteria are required'
+  try {
+    const goalId = await createGoal(gTitle, gDesc ?? '', gType as 'fix' | 'build' | 'monitor' | 'learn' | 'relationship', gPriority as 'P0' | 'P1' | 'P2' | 'P3', success_criteria, check_every_n_sessions)
+    await writeWorklog(userId, 'decision', `🎯 New goal [${gPriority}]: ${gTitle}`, {
+      status: 'done', decision_type: 'proactive', signal_priority: gPriority as 'P0' | 'P1' | 'P2' | 'P3',
+      conclusion: `Goal created: "${gTitle}" — success criteria: "${success_criteria.slice(0, 80)}"`,
+    }).catch(() => {})
+    return `✅ Goal created (ID: ${goalId.slice(0, 8)})\n[${gPriority}] ${gTitle}\nSuccess when: ${success_criteria}\nI will check this every ${check_every_n_sessions} session(s).`
+  } catch (e) { return `create_goal error: ${String(e)}` }
+}
@@ -0,0 +1,50 @@
+// create_social_draft — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runCreateSocialDraft(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { platform, content, media_url } = args as {
+    platform: string; content: string; media_url?: string
+  }
+  if (!platform || !content) return 'create_social_draft: platform and content are required'
+  const validPlatforms = ['twitter', 'linkedin', 'reddit', 'instagram', 'tiktok']
+  if (!validPlatforms.includes(platform)) return `create_social_draft: platform must be one of ${validPlatforms.join(', ')}`
+  try {
+    const taskId = `social_draft_${Date.now()}_${Math.random().toString(36).slice(2, 6)}`
+    const preview = content.slice(0, 120)
+    // Create a pending HITL task for human approval
+    await query(
+      `INSERT INTO sparkie_tasks (id, user_id, label, executor, action, payload, status, trigger_type, why_human, created_at)
+             VALUES ($1, $2, $3, 'human', 'create_social_draft', $4, 'pending', 'manual', $5, NOW())`,
+      [
+        taskId, userId,
+        `Post to ${platform}: "${preview}${content.length > 120 ? '...' : ''}"`,
+        JSON.stringify({ platform, content, media_url }),
+        `Social draft for ${platform} — requires your approval before publishing`,
+      ]
+    )
+    // Send approval card to user
+    const cardResult = `SPARKIE_CARD:${JSON.stringify({
+      card: {
+        type: 'approval',
+        title: `Post to ${platform.charAt(0).toUpperCase() + platform.slice(1)}?`,
+        subtitle: 'Review and approve this post before publishing',
+        body: content,
+        actions: [
+          { id: `approve_${taskId}`, label: 'Publish Now', variant: 'primary' },
+          { id: `edit_${taskId}`, label: 'Edit Draft', variant: 'secondary' },
+          { id: `cancel_${taskId}`, label: 'Discard', variant: 'danger' },
+        ],
+        metadata: { taskId, platform, type: 'social_draft' },
+      },
+      text: `I've drafted a ${platform} post for your review. Click "Publish Now" to send it live, or "Edit Draft" to make changes first.`,
+    })}`
+    return cardResult
+  } catch (e) {
+    return `create_social_draft error: ${String(e)}`
+  }
+}
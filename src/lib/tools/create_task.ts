@@ -0,0 +1,50 @@
+// create_task — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runCreateTask(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const action = args.action as string
+  const label = args.label as string
+  const whyHuman = (args.why_human as string) ?? ''
+  const payload = (args.payload as Record<string, unknown>) ?? {}
+  if (!action || !label) return 'action and label are required'
+
+  // batch_create: chain multiple tasks with depends_on
+  if (action === 'batch_create') {
+    const tasks = args.tasks as Array<{
+      label: string; executor?: 'ai' | 'human'; action?: string; why_human?: string
+    }>
+    if (!tasks || !Array.isArray(tasks)) return 'batch_create requires a tasks array'
+    const results: Array<{ id: string; label: string; executor: string }> = []
+    let prevId: string | null = null
+    for (const task of tasks) {
+      const taskId = `task_${Date.now()}_${Math.random().toString(36).slice(2, 8)}`
+      await query(
+        `INSERT INTO sparkie_tasks (id, user_id, action, label, payload, status, executor, trigger_type, why_human, depends_on)
+               VALUES ($1, $2, $3, $4, $5, 'pending', $6, 'manual', $7, $8)
+               ON CONFLICT (id) DO NOTHING`,
+        [taskId, userId, task.action ?? '', task.label, JSON.stringify({}), task.executor ?? 'human', task.why_human ?? '', prevId]
+      )
+      results.push({ id: taskId, label: task.label, executor: task.executor ?? 'human' })
+      prevId = taskId
+    }
+    return `HITL_TASK:${JSON.stringify({ batch: true, created: results.length, tasks: results })}`
+  }
+
+  const taskId = `task_${Date.now()}_${Math.random().toString(36).slice(2, 8)}`
+  try {
+    await query(
+      `INSERT INTO sparkie_tasks (id, user_id, action, label, payload, status, executor, trigger_type, why_human)
+             VALUES ($1, $2, $3, $4, $5, 'pending', 'human', 'manual', $6)
+             ON CONFLICT (id) DO NOTHING`,
+      [taskId, userId, action, label, JSON.stringify(payload), whyHuman]
+    )
+    return `HITL_TASK:${JSON.stringify({ id: taskId, action, label, payload, why_human: whyHuman })}`
+  } catch (e) {
+    return `Failed to create task: ${(e as Error).message}`
+  }
+}
@@ -0,0 +1,43 @@
+// delete_file — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { writeWorklog } from '@/lib/worklog'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runDeleteFile(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { path: delPath, message: delMsg } = args as { path: string; message: string }
+  if (!delPath || !delMsg) return 'delete_file: path and message are required'
+  try {
+    const GITHUB_TOKEN = process.env.GITHUB_TOKEN ?? process.env.GITHUB_PAT ?? ''
+    if (!GITHUB_TOKEN) return 'GITHUB_TOKEN not configured'
+    const owner = 'Draguniteus'
+    const repo = 'sparkie-studio'
+    const fetchRes = await fetch(
+      `https://api.github.com/repos/${owner}/${repo}/contents/${delPath}`,
+      { headers: { Authorization: `token ${GITHUB_TOKEN}`, Accept: 'application/vnd.github.v3+json' }, signal: AbortSignal.timeout(8000) }
+    )
+    if (!fetchRes.ok) return `delete_file: could not find ${delPath} (${fetchRes.status})`
+    const fetchData = await fetchRes.json() as { sha: string }
+    const deleteRes = await fetch(
+      `https://api.github.com/repos/${owner}/${repo}/contents/${delPath}`,
+      {
+        method: 'DELETE',
+        headers: { Authorization: `token ${GITHUB_TOKEN}`, Accept: 'application/vnd.github.v3+json', 'Content-Type': 'application/json' },
+        body: JSON.stringify({ message: delMsg, sha: fetchData.sha }),
+        signal: AbortSignal.timeout(10000),
+      }
+    )
+    if (!deleteRes.ok) {
+      const errText = await deleteRes.text()
+      return `delete_file failed (${deleteRes.status}): ${errText.slice(0, 200)}`
+    }
+    const deleteData = await deleteRes.json() as { commit?: { sha?: string } }
+    const commitSha = deleteData.commit?.sha?.slice(0, 12) ?? '?'
+    writeWorklog(userId ?? 'system', 'code_push', `delete_file: ${delPath} — ${delMsg}`, { commit: commitSha, path: delPath, conclusion: `File deleted and committed: ${delPath} (commit ${commitSha})` }).catch(() => {})
+    return `✅ Deleted: ${delPath}\nCommit: ${commitSha}\nMessage: ${delMsg}`
+  } catch (e) {
+    return `delete_file error: ${String(e)}`
+  }
+}
@@ -0,0 +1,20 @@
+// delete_memory — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runDeleteMemory(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { memory_id: memId, source: memSource = 'self' } = args as { memory_id: number; source?: string }
+  if (!memId) return 'delete_memory: memory_id is required'
+  try {
+    if (memSource === 'user') {
+      await query('DELETE FROM user_memories WHERE id = $1 AND user_id = $2', [memId, userId])
+    } else {
+      await query('DELETE FROM sparkie_self_memory WHERE id = $1', [memId])
+    }
+    return `✅ delete_memory: entry ${memId} removed from ${memSource} memories`
+  } catch (e) { return `delete_memory error: ${String(e)}` }
+}
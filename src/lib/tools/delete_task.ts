@@ -0,0 +1,21 @@
+// delete_task — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runDeleteTask(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { task_id: delTaskId } = args as { task_id: string }
+  if (!delTaskId) return 'delete_task: task_id is required'
+  try {
+    const existing = await query('SELECT id, label FROM sparkie_tasks WHERE id = $1 AND user_id = $2', [delTaskId, userId])
+    if (existing.rows.length === 0) return `delete_task: task ${delTaskId} not found`
+    const taskLabel = (existing.rows[0] as { label: string }).label
+    await query('DELETE FROM sparkie_tasks WHERE id = $1 AND user_id = $2', [delTaskId, userId])
+    return `✅ delete_task: deleted "${taskLabel}" (${delTaskId})`
+  } catch (e) {
+    return `delete_task error: ${String(e)}`
+  }
+}
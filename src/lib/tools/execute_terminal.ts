@@ -0,0 +1,37 @@
+// execute_terminal — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runExecuteTerminal(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { baseUrl } = ctx
+  const { action, sessionId, data: cmdData } = args as {
+    action: 'create' | 'input'; sessionId?: string; data?: string
+  }
+  try {
+    const termRes = await fetch(`${baseUrl}/api/terminal`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+      body: JSON.stringify({ action, sessionId, data: cmdData }),
+    })
+    if (!termRes.ok) {
+      const errText = await termRes.text()
+      if (termRes.status === 401) return 'Terminal error: unauthorized — check SPARKIE_INTERNAL_SECRET env var'
+      if (termRes.status === 500 && errText.includes('E2B_API_KEY')) return 'Terminal unavailable — E2B_API_KEY not set. Use get_github to read files or query_database for data instead.'
+      return `Terminal error: ${termRes.status} — ${errText}`
+    }
+    const termData = await termRes.json() as { sessionId?: string; output?: string; error?: string }
+    if (termData.error) return `Terminal error: ${termData.error}`
+    if (action === 'create') return JSON.stringify({ sessionId: termData.sessionId, ready: true })
+    // 'input' action: wait for output accumulation then poll logs endpoint
+    await new Promise(r => setTimeout(r, 1500))
+    if (!sessionId) return 'Command sent'
+    const logsRes = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(sessionId)}`, {
+      signal: AbortSignal.timeout(10000),
+    })
+    const { logs } = await logsRes.json() as { logs: string[] }
+    return logs.join('').trim() || 'Command sent'
+  } catch (e) {
+    return `Terminal unavailable: ${String(e)}`
+  }
+}
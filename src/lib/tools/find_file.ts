@@ -0,0 +1,33 @@
+// find_file — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runFindFile(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { baseUrl } = ctx
+  const pattern = args.pattern as string | undefined
+  if (!pattern) return 'pattern is required for find_file'
+  const createRes2 = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'create' }),
+    signal: AbortSignal.timeout(15000),
+  })
+  if (!createRes2.ok) return `Terminal create failed: ${createRes2.status}`
+  const { sessionId: ffSessId } = await createRes2.json() as { sessionId: string }
+  await new Promise(r => setTimeout(r, 800))
+  const inputRes2 = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'input', sessionId: ffSessId, data: `find / -name "${pattern}" 2>/dev/null | head -20 && echo "---DONE---"\n` }),
+    signal: AbortSignal.timeout(20000),
+  })
+  if (!inputRes2.ok) return `Terminal input failed: ${inputRes2.status}`
+  await new Promise(r => setTimeout(r, 2000))
+  const logsRes2 = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(ffSessId)}`, {
+    signal: AbortSignal.timeout(10000),
+  })
+  const { logs: ffLogs } = await logsRes2.json() as { logs: string[] }
+  const ffResult = ffLogs.join('').split('---DONE---')[0].trim()
+  return ffResult || 'No files found matching pattern'
+}
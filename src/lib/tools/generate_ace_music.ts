@@ -0,0 +1,91 @@
+// generate_ace_music — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runGenerateAceMusic(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { baseUrl } = ctx
+  // Call /api/music internally — same robust pipeline as the UI:
+  // lyrics pre-generation → ACE with retries → MiniMax fallback
+  // Returns SSE { type: 'ace_music', url, title, style, lyrics }
+  const { stylePrompt, lyrics = '', title, duration = 90, language: _language } = args as {
+    stylePrompt: string; lyrics?: string; title?: string; duration?: number; language?: string
+  }
+  try {
+    // Use the /api/music route — handles retries, fallbacks, lyrics generation, asset saving
+    // model: 'ace-step-free' tells it to use ACE with MiniMax fallback
+    const musicFetch = await fetch(`${baseUrl}/api/music`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        prompt: stylePrompt,
+        model: 'ace-step-free',
+        userLyrics: lyrics || undefined,
+        duration: Math.min(duration, 150),
+      }),
+      signal: AbortSignal.timeout(560_000), // 600s total (route has 600s maxDuration)
+    })
+
+    if (!musicFetch.ok) {
+      return 'Music generation failed: ' + (await musicFetch.text()).slice(0, 200)
+    }
+
+    // Read the SSE stream from /api/music
+    const reader = musicFetch.body!.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+    let audioUrl = ''
+    let songTitle = title || ''
+    let songStyle = stylePrompt.slice(0, 200)
+    let songLyrics = lyrics
+    let errorMsg = ''
+    let done = false
+
+    while (!done) {
+      const { value, done: readDone } = await reader.read()
+      done = readDone
+      if (done) break
+      buffer += decoder.decode(value, { stream: true })
+      const lines = buffer.split('\n')
+      buffer = lines.pop() ?? ''
+      for (const line of lines) {
+        if (!line.startsWith('data:')) continue
+        const json = line.slice(5).trim()
+        if (!json || json === '[DONE]') continue
+        try {
+          const sseData = JSON.parse(json) as Record<string, unknown>
+          if (sseData.error) {
+            errorMsg = String(sseData.error)
+            done = true
+            break
+          }
+          if (!audioUrl && typeof sseData.url === 'string' && sseData.url) {
+            audioUrl = sseData.url
+            if (typeof sseData.title === 'string' && sseData.title) songTitle = sseData.title
+            if (typeof sseData.style === 'string' && sseData.style) songStyle = sseData.style
+            if (typeof sseData.lyrics === 'string' && sseData.lyrics) songLyrics = sseData.lyrics
+            done = true // got what we need
+            break
+          }
+        } catch { /* skip malformed SSE lines */ }
+      }
+    }
+    reader.cancel().catch(() => {})
+
+    if (!audioUrl) {
+      return `Music generation failed: ${errorMsg || 'No audio URL returned'}. Please try again.`
+    }
+
+    if (!songTitle) {
+      songTitle = stylePrompt.slice(0, 50).replace(/\b\w/g, c => c.toUpperCase()).trim() || 'Sparkie Mix'
+    }
+
+    // Return structured data so frontend shows the full music card
+    // Format: 🎵 TITLE | style description | AUDIO_URL:url
+    const safeTitle = songTitle.toLowerCase().replace(/[^a-z0-9 ]/g, '').trim().replace(/\s+/g, '-').slice(0, 50) || 'sparkie-mix'
+    return `🎵 ${songTitle}\n${songStyle}\nAUDIO_URL:${audioUrl}\nSONG_META:${safeTitle}|${songLyrics ? 'has-lyrics' : 'no-lyrics'}`
+
+  } catch (e) {
+    return 'generate_ace_music error: ' + String(e)
+  }
+}
@@ -0,0 +1,49 @@
+// generate_image — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runGenerateImage(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId, baseUrl } = ctx
+  const prompt = args.prompt as string
+  if (!prompt?.trim()) return 'No prompt provided for image generation'
+
+  // ── Pollinations gen.pollinations.ai — direct, no slow pre-providers ──
+  // grok-imagine/p-image/klein confirmed working; seedream/seedream5 for quality variety
+  // 25s timeout each × 5 models max = ~125s total, well under serverless limits
+  const polModels = ['grok-imagine', 'p-image', 'klein', 'seedream', 'seedream5']
+  for (const polModel of polModels) {
+    try {
+      const seed = Math.floor(Math.random() * 999999)
+      const polUrl = 'https://gen.pollinations.ai/image/' + encodeURIComponent(prompt) + '?model=' + polModel + '&width=1024&height=1024&nologo=true&seed=' + seed
+      const polAuthKey = process.env.POLLINATIONS_API_KEY
+      const imgRes = await fetch(polUrl, {
+        headers: { 'User-Agent': 'SparkieStudio/1.0', ...(polAuthKey ? { Authorization: `Bearer ${polAuthKey}` } : {}) },
+        signal: AbortSignal.timeout(25000),
+      })
+      if (imgRes.ok) {
+        const ct = imgRes.headers.get('content-type') || 'image/jpeg'
+        const buf = await imgRes.arrayBuffer()
+        const b64 = Buffer.from(buf).toString('base64')
+        const dataUrl = 'data:' + ct + ';base64,' + b64
+        // Persist asset to DB so the message stores a stable URL (not MB of base64)
+        if (userId) {
+          try {
+            const fid = crypto.randomUUID()
+            const slug = (prompt as string).slice(0, 40).replace(/[^a-z0-9]/gi, '_').toLowerCase()
+            await query(
+              `INSERT INTO sparkie_assets (user_id, name, content, asset_type, source, file_id, chat_title, chat_id, language)
+                     VALUES ($1, $2, $3, 'image', 'agent', $4, '', '', '')`,
+              [userId, slug + '.jpg', dataUrl, fid]
+            )
+            return 'IMAGE_URL:' + baseUrl + '/api/assets-image?fid=' + fid
+          } catch { /* fall back to data URL if DB save fails */ }
+        }
+        return 'IMAGE_URL:' + dataUrl
+      }
+    } catch { /* try next model */ }
+  }
+
+  return 'Image generation is temporarily unavailable. Please try again in a moment.'
+}
@@ -0,0 +1,22 @@
+// get_attempt_history — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { formatAttemptBlock, getAttempts } from '@/lib/attemptHistory'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runGetAttemptHistory(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { domain, limit: ahLimit = 5 } = args as { domain: string; limit?: number }
+  if (!domain) return 'get_attempt_history: domain is required (e.g. "minimax_video", "ace_music", "github_push")'
+  try {
+    const attempts = await getAttempts(userId, domain, ahLimit)
+    if (attempts.length === 0) {
+      return `No attempt history for "${domain}" yet. First attempt — no lessons learned yet.`
+    }
+    const block = formatAttemptBlock(attempts)
+    return `Attempt history for "${domain}" (${attempts.length} entries):${block}`
+  } catch (e) {
+    return `get_attempt_history error: ${String(e)}`
+  }
+}
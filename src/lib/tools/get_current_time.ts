@@ -0,0 +1,15 @@
+// get_current_time — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runGetCurrentTime(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const tz = (args.timezone as string | undefined) ?? 'UTC'
+  try {
+    const formatted = new Date().toLocaleString('en-US', {
+      timeZone: tz, weekday: 'long', year: 'numeric',
+      month: 'long', day: 'numeric', hour: '2-digit', minute: '2-digit', timeZoneName: 'short',
+    })
+    return `Current time: ${formatted}`
+  } catch { return `Current time: ${new Date().toUTCString()}` }
+}
@@ -0,0 +1,34 @@
+// get_outreach_status — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runGetOutreachStatus(_name: string, _args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  try {
+    // Last 10 outreach log entries
+    const outreachRes = await query(
+      `SELECT type, content, created_at FROM sparkie_outreach_log WHERE user_id = $1 ORDER BY created_at DESC LIMIT 10`,
+      [userId]
+    ).catch(() => ({ rows: [] as unknown[] }))
+    // Last task_completed/inbox_check/morning_brief worklog entries
+    const wlRes = await query(
+      `SELECT type, content, created_at FROM sparkie_worklog
+             WHERE user_id = $1 AND type IN ('proactive_check','task_executed','auth_check','heartbeat')
+             ORDER BY created_at DESC LIMIT 10`,
+      [userId]
+    ).catch(() => ({ rows: [] as unknown[] }))
+    const outreachLines = (outreachRes.rows as Array<Record<string, unknown>>)
+      .map(r => `• [${r.type}] ${String(r.content).slice(0, 100)} (${new Date(r.created_at as string).toLocaleString()})`)
+    const wlLines = (wlRes.rows as Array<Record<string, unknown>>)
+      .map(r => `• [${r.type}] ${String(r.content).slice(0, 100)} (${new Date(r.created_at as string).toLocaleString()})`)
+    return [
+      `Outreach log (last 10):\n${outreachLines.join('\n') || '  (none)'}`,
+      `\nRecent proactive worklog (last 10):\n${wlLines.join('\n') || '  (none)'}`,
+    ].join('\n')
+  } catch (e) {
+    return `get_outreach_status error: ${String(e)}`
+  }
+}
@@ -0,0 +1,13 @@
+// get_radio_playlist — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runGetRadioPlaylist(_name: string, _args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const res = await fetch('https://raw.githubusercontent.com/Draguniteus/SparkieRadio/main/playlist.json', {
+    signal: AbortSignal.timeout(5000),
+  })
+  if (!res.ok) return 'Could not fetch radio playlist'
+  const d = await res.json() as Array<{ title: string; artist: string }>
+  return (Array.isArray(d) ? d : []).map((t, i) => `${i + 1}. ${t.title} — ${t.artist}`).join('\n')
+}
@@ -0,0 +1,25 @@
+// get_recent_assets — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runGetRecentAssets(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  const { asset_type = 'all', limit = 5 } = args as { asset_type?: string; limit?: number }
+  if (!userId) return 'Not authenticated'
+  try {
+    const typeFilter = asset_type !== 'all' ? `AND asset_type = '${asset_type}'` : ''
+    const result = await query(
+      `SELECT name, content, asset_type, created_at FROM sparkie_assets WHERE user_id = $1 ${typeFilter} ORDER BY created_at DESC LIMIT $2`,
+      [userId, Math.min(limit, 20)]
+    )
+    if (!result.rows || result.rows.length === 0) return 'No recent assets found.'
+    const list = (result.rows as Array<{ name: string; content: string; asset_type: string; created_at: string }>)
+      .map(r => `• [${r.asset_type}] ${r.name} — ${r.content.slice(0, 80)} (${new Date(r.created_at).toLocaleDateString()})`)
+      .join('\n')
+    return `Recent assets:\n${list}`
+  } catch (e) {
+    return `get_recent_assets error: ${String(e)}`
+  }
+}
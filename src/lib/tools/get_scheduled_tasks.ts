@@ -0,0 +1,33 @@
+// get_scheduled_tasks — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runGetScheduledTasks(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { status: taskStatusFilter = 'pending', limit: taskLimit = 20 } = args as { status?: string; limit?: number }
+  try {
+    const statusWhere = taskStatusFilter === 'all'
+      ? 'user_id = $1'
+      : "user_id = $1 AND status = $2"
+    const taskParams = taskStatusFilter === 'all' ? [userId] : [userId, taskStatusFilter]
+    const taskRes = await query(
+      `SELECT id, label, action, status, executor, trigger_type, trigger_config, scheduled_at, created_at, why_human
+             FROM sparkie_tasks WHERE ${statusWhere}
+             ORDER BY CASE status WHEN 'pending' THEN 0 WHEN 'in_progress' THEN 1 ELSE 2 END, created_at DESC
+             LIMIT $${taskParams.length + 1}`,
+      [...taskParams, Math.min(Number(taskLimit), 50)]
+    )
+    if (taskRes.rows.length === 0) return `No tasks with status=${taskStatusFilter}`
+    const lines = (taskRes.rows as Array<Record<string, unknown>>).map(t => {
+      const sched = t.scheduled_at ? ` | due: ${new Date(t.scheduled_at as string).toISOString().slice(0,16)}` : ''
+      const why = t.why_human ? ` | reason: ${t.why_human}` : ''
+      return `• [${String(t.status).toUpperCase()}] ${t.label} (executor=${t.executor}, trigger=${t.trigger_type}${sched}${why})`
+    })
+    return `Scheduled tasks (${taskRes.rows.length}):\n` + lines.join('\n')
+  } catch (e) {
+    return `get_scheduled_tasks error: ${String(e)}`
+  }
+}
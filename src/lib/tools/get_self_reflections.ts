@@ -0,0 +1,16 @@
+// get_self_reflections — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { getRecentReflections } from '@/lib/selfReflection'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runGetSelfReflections(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { days: reflDays = 7 } = args as { days?: number }
+  try {
+    const reflections = await getRecentReflections(reflDays)
+    if (reflections.length === 0) return 'No self-reflections yet. The first one runs automatically at 1am UTC, or you can trigger it now with run_self_reflection.'
+    return reflections.map(r =>
+      `## ${r.reflectionDate}\n✅ What worked: ${r.whatWorked.slice(0, 2).join(', ')}\n❌ What failed: ${r.whatFailed.slice(0, 2).join(', ')}\n📈 Growth: ${r.growthObserved}\n🌅 Tomorrow: ${r.tomorrowIntention}`
+    ).join('\n\n---\n\n')
+  } catch (e) { return `get_self_reflections error: ${String(e)}` }
+}
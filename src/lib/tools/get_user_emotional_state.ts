@@ -0,0 +1,19 @@
+// get_user_emotional_state — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { detectEmotionalState } from '@/lib/userModel'
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runGetUserEmotionalState(_name: string, _args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  // Fetch latest user message from DB for emotional state analysis
+  const recentMsg = await query<{ content: string }>(
+    `SELECT content FROM chat_messages WHERE user_id = $1 AND role = 'user' ORDER BY created_at DESC LIMIT 1`,
+    [userId ?? '']
+  ).catch(() => ({ rows: [] }))
+  const latestMsg = recentMsg.rows[0]?.content ?? ''
+  if (!latestMsg || !userId) return 'No recent user message found — send a message first'
+  const state = detectEmotionalState(latestMsg, new Date().getHours())
+  return `Michael's current state:\n• Energy: ${state.energy}\n• Focus: ${state.focus}\n• Mood: ${state.mood}\n• Urgency: ${state.urgency}\n\nCalibrate your response accordingly.`
+}
@@ -0,0 +1,15 @@
+// get_weather — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runGetWeather(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { baseUrl } = ctx
+  const city = args.city as string | undefined
+  const weatherUrl = city
+    ? `${baseUrl}/api/weather?city=${encodeURIComponent(city)}`
+    : `${baseUrl}/api/weather`
+  const res = await fetch(weatherUrl, { signal: AbortSignal.timeout(8000) })
+  if (!res.ok) return `Weather fetch failed: ${res.status}`
+  return JSON.stringify(await res.json())
+}
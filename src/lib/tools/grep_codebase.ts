@@ -0,0 +1,35 @@
+// grep_codebase — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runGrepCodebase(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { baseUrl } = ctx
+  const grepPattern = args.pattern as string | undefined
+  const fileType = args.fileType as string | undefined
+  if (!grepPattern) return 'pattern is required for grep_codebase'
+  const includeFlag = fileType ? `--include="*.${fileType}"` : ''
+  const createRes3 = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'create' }),
+    signal: AbortSignal.timeout(15000),
+  })
+  if (!createRes3.ok) return `Terminal create failed: ${createRes3.status}`
+  const { sessionId: gcSessId } = await createRes3.json() as { sessionId: string }
+  await new Promise(r => setTimeout(r, 800))
+  const inputRes3 = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'input', sessionId: gcSessId, data: `grep -r "${grepPattern}" /workspace ${includeFlag} -l 2>/dev/null | head -20 && echo "---DONE---"\n` }),
+    signal: AbortSignal.timeout(20000),
+  })
+  if (!inputRes3.ok) return `Terminal input failed: ${inputRes3.status}`
+  await new Promise(r => setTimeout(r, 2000))
+  const logsRes3 = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(gcSessId)}`, {
+    signal: AbortSignal.timeout(10000),
+  })
+  const { logs: gcLogs } = await logsRes3.json() as { logs: string[] }
+  const gcResult = gcLogs.join('').split('---DONE---')[0].trim()
+  return gcResult || `No matches found for pattern: ${grepPattern}`
+}
@@ -0,0 +1,38 @@
+// install_skill — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runInstallSkill(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { url: skillUrl, skill_name: skillName, description: skillDesc = '' } = args as {
+    url: string; skill_name: string; description?: string
+  }
+  try {
+    // Fetch the skill documentation
+    const fetchRes = await fetch(skillUrl, {
+      headers: { 'User-Agent': 'Sparkie-Studio/1.0' },
+      signal: AbortSignal.timeout(10000),
+    })
+    if (!fetchRes.ok) return `Could not fetch skill URL: ${fetchRes.status}`
+    const rawContent = await fetchRes.text()
+    // Truncate to 8000 chars (token budget for skill docs)
+    const skillContent = rawContent.slice(0, 8000)
+    // Save to user_memories as a procedure memory
+    await query(
+      `INSERT INTO user_memories (user_id, category, content, created_at)
+             VALUES ($1, $2, $3, NOW())
+             ON CONFLICT DO NOTHING`,
+      [
+        userId,
+        'procedure',
+        `[SKILL: ${skillName}]\n${skillDesc ? 'Purpose: ' + skillDesc + '\n' : ''}Documentation (first 8000 chars):\n${skillContent}`
+      ]
+    )
+    return `✅ Skill installed: "${skillName}"\n${skillDesc ? 'Purpose: ' + skillDesc + '\n' : ''}I've read and saved ${skillContent.length} chars of documentation from ${skillUrl}.\nThis knowledge is now permanently in my memory. I can use this skill in future conversations.`
+  } catch (e) {
+    return `install_skill error: ${String(e)}`
+  }
+}
@@ -0,0 +1,19 @@
+// journal_add — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runJournalAdd(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Dream Journal not available — user not logged in'
+  const title = (args.title as string)?.trim()
+  const content = (args.content as string)?.trim()
+  const category = (args.category as string) || 'night_dreams'
+  if (!title || !content) return 'Title and content are both required to add a journal entry.'
+  await query(
+    `INSERT INTO dream_journal (user_id, title, content, category) VALUES ($1, $2, $3, $4)`,
+    [userId, title, content, category]
+  )
+  return `✓ Added to your ${category.replace('_', ' ')} journal: "${title}"`
+}
@@ -0,0 +1,29 @@
+// journal_search — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runJournalSearch(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Dream Journal not available — user not logged in'
+  const q = (args.query as string | undefined) || ''
+  const cat = (args.category as string | undefined) || ''
+  let sql = `SELECT id, title, content, category, created_at FROM dream_journal WHERE user_id = $1`
+  const params: string[] = [userId]
+  if (q) {
+    params.push(`%${q}%`)
+    sql += ` AND (LOWER(title) LIKE LOWER($${params.length}) OR LOWER(content) LIKE LOWER($${params.length}))`
+  }
+  if (cat) {
+    params.push(cat)
+    sql += ` AND category = $${params.length}`
+  }
+  sql += ` ORDER BY created_at DESC LIMIT 5`
+  const res = await query<{ id: string; title: string; content: string; category: string; created_at: string }>(sql, params)
+  if (!res.rows.length) return q ? `No journal entries found matching "${q}".` : 'No journal entries yet.'
+  const stripHtml = (html: string) => html.replace(/<[^>]+>/g, ' ').replace(/\s+/g, ' ').trim()
+  return res.rows.map((e, i) =>
+    `[${i + 1}] "${e.title}" (${e.category.replace('_', ' ')}) — ${new Date(e.created_at).toLocaleDateString()}\n${stripHtml(e.content).slice(0, 400)}`
+  ).join('\n\n')
+}
@@ -0,0 +1,34 @@
+// kill_process — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runKillProcess(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { baseUrl } = ctx
+  const pid = args.pid as number | undefined
+  if (!pid) return 'kill_process: pid is required'
+  const signal = (args.signal as string) ?? 'TERM'
+  const createRes = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'create' }),
+    signal: AbortSignal.timeout(15000),
+  })
+  if (!createRes.ok) return `Terminal create failed: ${createRes.status}`
+  const { sessionId: kpSessId } = await createRes.json() as { sessionId: string }
+  await new Promise(r => setTimeout(r, 800))
+  const inputRes = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'input', sessionId: kpSessId, data: `kill -${signal} ${pid} 2>&1 && echo "---DONE---"\n` }),
+    signal: AbortSignal.timeout(10000),
+  })
+  if (!inputRes.ok) return `Terminal input failed: ${inputRes.status}`
+  await new Promise(r => setTimeout(r, 1200))
+  const logsRes = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(kpSessId)}`, {
+    signal: AbortSignal.timeout(10000),
+  })
+  const { logs: kpLogs } = await logsRes.json() as { logs: string[] }
+  const kpResult = kpLogs.join('').split('---DONE---')[0].trim()
+  return kpResult || `Signal ${signal} sent to PID ${pid}`
+}
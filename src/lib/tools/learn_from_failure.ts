@@ -0,0 +1,30 @@
+// learn_from_failure — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runLearnFromFailure(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { what_failed, why_it_failed, what_to_do_instead, severity = 'medium' } = args as {
+    what_failed: string; why_it_failed: string; what_to_do_instead: string; severity?: string
+  }
+  try {
+    const emoji = severity === 'critical' ? '🚨' : severity === 'high' ? '⚠️' : severity === 'medium' ? '📝' : 'ℹ️'
+    const lesson = `[LESSON \${emoji} \${severity.toUpperCase()}]\nFailed: \${what_failed}\nWhy: \${why_it_failed}\nFix: \${what_to_do_instead}\nLearned: \${new Date().toISOString()}`
+    await query(
+      `INSERT INTO user_memories (user_id, category, content, created_at) VALUES ($1, 'procedure', $2, NOW())`,
+      [userId, lesson]
+    )
+    // Also log to worklog
+    await query(
+      `INSERT INTO sparkie_tasks (id, user_id, action, label, status, executor, trigger_type, created_at)
+             VALUES ($1, $2, $3, $4, 'completed', 'ai', 'manual', NOW())`,
+      [`lesson_\${Date.now()}`, userId, lesson, `Learned: \${what_failed.slice(0, 50)}`]
+    ).catch(() => {}) // non-blocking
+    return `🧠 Lesson saved. I won't make this mistake again.\nWhat failed: \${what_failed}\nRoot cause: \${why_it_failed}\nNext time: \${what_to_do_instead}`
+  } catch (e) {
+    return `learn_from_failure error: \${String(e)}`
+  }
+}
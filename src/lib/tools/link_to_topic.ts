@@ -0,0 +1,18 @@
+// link_to_topic — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runLinkToTopic(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { baseUrl, cookieHeader } = ctx
+  const { topic_id: ltTopicId, source_type: ltSourceType, source_id: ltSourceId, summary: ltSummary } = args as { topic_id: string; source_type: string; source_id: string; summary?: string }
+  const res = await fetch(`${baseUrl}/api/topics`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Cookie: cookieHeader },
+    body: JSON.stringify({ action: 'link', topic_id: ltTopicId, source_type: ltSourceType, source_id: ltSourceId, summary: ltSummary }),
+    signal: AbortSignal.timeout(8000),
+  })
+  const data = await res.json() as { ok?: boolean; error?: string }
+  if (!res.ok || data.error) return `Error: ${data.error ?? 'link_to_topic failed'}`
+  return `✅ Linked ${ltSourceType} to topic`
+}
@@ -0,0 +1,17 @@
+// list_behavior_rules — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { listBehaviorRules } from '@/lib/behaviorRules'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runListBehaviorRules(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { active_only = true } = args as { active_only?: boolean }
+  try {
+    const rules = await listBehaviorRules(active_only)
+    if (rules.length === 0) return 'No behavior rules found. Create your first rule with create_behavior_rule.'
+    const lines = rules.map(r =>
+      `[${r.id.slice(0, 8)}] (${Math.round(r.confidence * 100)}% conf, ${r.timesApplied}x applied)\n  IF: ${r.condition}\n  THEN: ${r.action}`
+    )
+    return `Your behavior rules (${rules.length}):\n\n${lines.join('\n\n')}`
+  } catch (e) { return `list_behavior_rules error: ${String(e)}` }
+}
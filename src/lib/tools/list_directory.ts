@@ -0,0 +1,34 @@
+// list_directory — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runListDirectory(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { baseUrl } = ctx
+  const dirPath = args.path as string | undefined
+  if (!dirPath) return 'path is required for list_directory'
+  const createRes = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'create' }),
+    signal: AbortSignal.timeout(15000),
+  })
+  if (!createRes.ok) return `Terminal create failed: ${createRes.status}`
+  const { sessionId: ldSessId } = await createRes.json() as { sessionId: string }
+  await new Promise(r => setTimeout(r, 800))
+  const inputRes = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'input', sessionId: ldSessId, data: `ls -la ${dirPath} 2>&1 && echo "---DONE---"\n` }),
+    signal: AbortSignal.timeout(15000),
+  })
+  if (!inputRes.ok) return `Terminal input failed: ${inputRes.status}`
+  // Wait for output to accumulate in logBuffer, then poll logs
+  await new Promise(r => setTimeout(r, 1500))
+  const logsRes = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(ldSessId)}`, {
+    signal: AbortSignal.timeout(10000),
+  })
+  const { logs: ldLogs } = await logsRes.json() as { logs: string[] }
+  const ldResult = ldLogs.join('').split('---DONE---')[0].trim()
+  return ldResult || 'No output from list_directory'
+}
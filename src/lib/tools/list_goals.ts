@@ -0,0 +1,17 @@
+// list_goals — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { listGoals } from '@/lib/goalEngine'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runListGoals(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { status: goalStatus } = args as { status?: string }
+  try {
+    const goals = await listGoals(goalStatus as 'active' | 'blocked' | 'completed' | 'abandoned' | undefined)
+    if (goals.length === 0) return 'No goals found. Create your first goal with create_goal.'
+    const lines = goals.map(g =>
+      `[${g.id.slice(0, 8)}] [${g.priority}] ${g.title} (${g.status})\n  Progress: ${g.progress || 'Not started'}\n  ${g.sessionsWithoutProgress > 0 ? `⚠️ ${g.sessionsWithoutProgress} sessions without progress` : 'Recently updated'}`
+    )
+    return `Goals (${goals.length}):\n\n${lines.join('\n\n')}`
+  } catch (e) { return `list_goals error: ${String(e)}` }
+}
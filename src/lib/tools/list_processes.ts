@@ -0,0 +1,41 @@
+// list_processes — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runListProcesses(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { baseUrl } = ctx
+  const limit = (args.limit as number) ?? 20
+  const createRes = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'create' }),
+    signal: AbortSignal.timeout(15000),
+  })
+  if (!createRes.ok) return `Terminal create failed: ${createRes.status}`
+  const { sessionId: lpSessId } = await createRes.json() as { sessionId: string }
+  await new Promise(r => setTimeout(r, 800))
+  const inputRes = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'input', sessionId: lpSessId, data: `ps aux --no-headers 2>/dev/null | head -${limit} && echo "---DONE---"\n` }),
+    signal: AbortSignal.timeout(15000),
+  })
+  if (!inputRes.ok) return `Terminal input failed: ${inputRes.status}`
+  await new Promise(r => setTimeout(r, 1200))
+  const logsRes = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(lpSessId)}`, {
+    signal: AbortSignal.timeout(10000),
+  })
+  const { logs: lpLogs } = await logsRes.json() as { logs: string[] }
+  const lpResult = lpLogs.join('').split('---DONE---')[0].trim()
+  if (!lpResult) return 'No processes found'
+  // Parse ps output into a readable table
+  const lines = lpResult.split('\n').filter(Boolean)
+  const header = 'USER       PID     %CPU   %MEM    VSZ       RSS TTY   STAT START   TIME COMMAND'
+  const rows = lines.map(l => {
+    const parts = l.trim().split(/\s+/)
+    if (parts.length < 11) return l
+    return `${parts[0]?.padEnd(8)} ${parts[1]?.padStart(5)} ${(parts[2] ?? '0').padStart(4)}% ${(parts[3] ?? '0').padStart(4)}% ${(parts[4] ?? '0').padStart(7)} ${(parts[5] ?? '0').padStart(6)} ${(parts[6] ?? '?').padStart(4)} ${parts[7] ?? '?'} ${parts[8] ?? '??'} ${parts[9] ?? '??'}  ${parts.slice(10).join(' ')}`
+  })
+  return `Running processes:\n${header}\n${rows.join('\n')}`
+}
@@ -0,0 +1,34 @@
+// log_worklog — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runLogWorklog(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { type: wlFilter, limit: wlLimit = 50 } = args as { type?: string; limit?: number }
+  try {
+    const typeFilter = wlFilter && wlFilter !== 'all' ? `AND type = $2` : ''
+    const params = wlFilter && wlFilter !== 'all' ? [userId, wlFilter, wlLimit] : [userId, wlLimit]
+    const res = await query(
+      `SELECT id, type, content, status, decision_type, reasoning, conclusion, metadata, created_at
+             FROM sparkie_worklog WHERE user_id = $1 ${typeFilter}
+             ORDER BY created_at DESC LIMIT $${wlFilter && wlFilter !== 'all' ? '$3' : '$2'}`,
+      params
+    ).catch(() => ({ rows: [] as any[] }))
+    if (!res.rows.length) return `No worklog entries found${wlFilter && wlFilter !== 'all' ? ` for type "${wlFilter}"` : ''}.`
+    const lines = res.rows.slice(0, wlLimit).map((e: any) => {
+      const ts = e.created_at ? new Date(e.created_at).toLocaleString() : 'unknown'
+      const meta = e.metadata ?? {}
+      const icon = meta.icon ? `[${meta.icon}] ` : ''
+      const tag = meta.tag ? `[${meta.tag}] ` : ''
+      const result = e.conclusion ? ` → ${e.conclusion}` : ''
+      const reasoning = e.reasoning ? ` (${e.reasoning})` : ''
+      return `[${ts}] ${icon}${tag}[${e.type}] ${e.content}${reasoning}${result}`
+    })
+    return `Worklog (${res.rows.length} entries${wlFilter && wlFilter !== 'all' ? `, type="${wlFilter}"` : ''}):\n\n${lines.join('\n')}`
+  } catch (e) {
+    return `log_worklog error: ${String(e)}`
+  }
+}
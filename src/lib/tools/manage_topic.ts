@@ -0,0 +1,35 @@
+// manage_topic — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runManageTopic(name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { baseUrl, cookieHeader } = ctx
+  const { action: topicAction, id: topicId, name: topicName, fingerprint: topicFp, summary: topicSum, notification_policy: topicPolicy } = args as { action: string; id?: string; name?: string; fingerprint?: string; summary?: string; notification_policy?: string }
+  if (topicAction === 'list') {
+    const res = await fetch(`${baseUrl}/api/topics`, { headers: { Cookie: cookieHeader }, signal: AbortSignal.timeout(8000) })
+    if (!res.ok) return 'Could not load topics'
+    const data = await res.json() as { topics: Array<{ id: string; name: string; summary?: string; updated_at: string }> }
+    if (data.topics.length === 0) return 'No active topics found.'
+    return data.topics.map(t => `[${t.id}] ${t.name}${t.summary ? ` — ${t.summary}` : ''}`).join('\n')
+  }
+  if (topicAction === 'get') {
+    if (!topicId) return 'id required for get'
+    const res = await fetch(`${baseUrl}/api/topics?id=${encodeURIComponent(topicId)}`, { headers: { Cookie: cookieHeader }, signal: AbortSignal.timeout(8000) })
+    if (!res.ok) return 'Topic not found'
+    const data = await res.json() as { topic: { name: string; summary?: string; fingerprint?: string; notification_policy: string }; links: Array<{ source_type: string; summary?: string; created_at: string }> }
+    return `Topic: ${data.topic.name}\nSummary: ${data.topic.summary ?? '(none)'}\nFingerprint: ${data.topic.fingerprint ?? '(none)'}\nLinks:\n${data.links.map(l => `  [${l.source_type}] ${l.summary ?? ''}`).join('\n') || '  (none)'}`
+  }
+  const res = await fetch(`${baseUrl}/api/topics`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Cookie: cookieHeader },
+    body: JSON.stringify({ action: topicAction, id: topicId, name: topicName, fingerprint: topicFp, summary: topicSum, notification_policy: topicPolicy }),
+    signal: AbortSignal.timeout(8000),
+  })
+  const data = await res.json() as { ok?: boolean; action?: string; id?: string; error?: string }
+  if (!res.ok || data.error) return `Error: ${data.error ?? 'manage_topic failed'}`
+  if (topicAction === 'create') return `✅ Topic created: ${topicName} (ID: ${data.id})`
+  if (topicAction === 'update') return `✅ Topic updated`
+  if (topicAction === 'archive') return `✅ Topic archived`
+  return `✅ Done (${data.action})`
+}
@@ -0,0 +1,31 @@
+// netstat_info — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runNetstatInfo(_name: string, _args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { baseUrl } = ctx
+  const createRes = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'create' }),
+    signal: AbortSignal.timeout(15000),
+  })
+  if (!createRes.ok) return `Terminal create failed: ${createRes.status}`
+  const { sessionId: niSessId } = await createRes.json() as { sessionId: string }
+  await new Promise(r => setTimeout(r, 800))
+  const inputRes = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'input', sessionId: niSessId, data: `echo "=== Network Connections ===" && (netstat -tulnp 2>/dev/null || ss -tulnp 2>/dev/null) && echo "" && echo "=== Listening Ports ===" && ss -tlnp 2>/dev/null | head -20 && echo "---DONE---"\n` }),
+    signal: AbortSignal.timeout(15000),
+  })
+  if (!inputRes.ok) return `Terminal input failed: ${inputRes.status}`
+  await new Promise(r => setTimeout(r, 2000))
+  const logsRes = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(niSessId)}`, {
+    signal: AbortSignal.timeout(10000),
+  })
+  const { logs: niLogs } = await logsRes.json() as { logs: string[] }
+  const niResult = niLogs.join('').split('---DONE---')[0].trim()
+  return niResult || 'Network info unavailable'
+}
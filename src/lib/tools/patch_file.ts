@@ -0,0 +1,78 @@
+// patch_file — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { resolveKnownIssue } from '@/lib/repoIngestion'
+import { writeWorklog } from '@/lib/worklog'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runPatchFile(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  const { path: patchPath, search: searchStr, replace: replaceStr, full_content: fullContent, message: patchMsg, dry_run: dryRun = false } = args as {
+    path: string; search?: string; replace?: string; full_content?: string; message: string; dry_run?: boolean
+  }
+  try {
+    const GITHUB_TOKEN = process.env.GITHUB_TOKEN ?? process.env.GITHUB_PAT ?? ''
+    if (!GITHUB_TOKEN) return 'GITHUB_TOKEN not configured'
+    const owner = 'Draguniteus'
+    const repo = 'sparkie-studio'
+
+    // Fetch current file
+    const fetchRes = await fetch(
+      `https://api.github.com/repos/${owner}/${repo}/contents/${patchPath}`,
+      { headers: { Authorization: `token ${GITHUB_TOKEN}`, Accept: 'application/vnd.github.v3+json' }, signal: AbortSignal.timeout(8000) }
+    )
+    if (!fetchRes.ok) return `patch_file: could not read ${patchPath} (${fetchRes.status})`
+    const fetchData = await fetchRes.json() as { content: string; sha: string; encoding: string }
+    const currentContent = Buffer.from(fetchData.content.replace(/\n/g, ''), 'base64').toString('utf-8')
+    const currentSha = fetchData.sha
+
+    // Apply patch
+    let newContent: string
+    if (fullContent) {
+      newContent = fullContent
+    } else if (searchStr !== undefined && replaceStr !== undefined) {
+      if (!currentContent.includes(searchStr)) {
+        return `patch_file: search string not found in ${patchPath}. Cannot apply patch.\nSearch string (${searchStr.length} chars): ${searchStr.slice(0, 100)}...`
+      }
+      newContent = currentContent.replace(searchStr, replaceStr)
+    } else {
+      return 'patch_file: provide either search+replace or full_content'
+    }
+
+    if (dryRun) {
+      const linesChanged = newContent.split('\n').length - currentContent.split('\n').length
+      return `[DRY RUN] patch_file: ${patchPath}\nLines: ${currentContent.split('\n').length} → ${newContent.split('\n').length} (${linesChanged > 0 ? '+' : ''}${linesChanged})\n\nPatched preview (first 600 chars):\n${newContent.slice(0, 600)}`
+    }
+
+    // Commit
+    const pushRes = await fetch(
+      `https://api.github.com/repos/${owner}/${repo}/contents/${patchPath}`,
+      {
+        method: 'PUT',
+        headers: { Authorization: `token ${GITHUB_TOKEN}`, Accept: 'application/vnd.github.v3+json', 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          message: patchMsg,
+          content: Buffer.from(newContent).toString('base64'),
+          sha: currentSha,
+          branch: 'master',
+        }),
+      }
+    )
+    if (!pushRes.ok) {
+      const errText = await pushRes.text()
+      return `patch_file push failed (${pushRes.status}): ${errText.slice(0, 300)}`
+    }
+    const pushData = await pushRes.json() as { commit: { sha: string } }
+    const commitSha = pushData.commit?.sha?.slice(0, 12) ?? '?'
+
+    // If this was a TS fix, auto-resolve from known issues
+    if (userId && (patchMsg.includes('fix') || patchMsg.includes('TS'))) {
+      resolveKnownIssue('Draguniteus/sparkie-studio', patchPath).catch(() => {})
+    }
+
+    writeWorklog(userId ?? 'system', 'code_push', `patch_file: ${patchPath} — ${patchMsg}`, { commit: commitSha, path: patchPath, conclusion: `File patched and committed: ${patchPath} (commit ${commitSha})` }).catch(() => {})
+    return `✅ Patched and committed: ${patchPath}\nCommit: ${commitSha}\nMessage: ${patchMsg}\nDeploy started automatically.`
+  } catch (e) {
+    return `patch_file error: ${String(e)}`
+  }
+}
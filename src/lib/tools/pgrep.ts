@@ -0,0 +1,33 @@
+// pgrep — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runPgrep(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { baseUrl } = ctx
+  const pattern = args.pattern as string | undefined
+  if (!pattern) return 'pgrep: pattern is required'
+  const createRes = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'create' }),
+    signal: AbortSignal.timeout(15000),
+  })
+  if (!createRes.ok) return `Terminal create failed: ${createRes.status}`
+  const { sessionId: pgSessId } = await createRes.json() as { sessionId: string }
+  await new Promise(r => setTimeout(r, 800))
+  const inputRes = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'input', sessionId: pgSessId, data: `pgrep -af "${pattern.replace(/"/g, '\\"')}" 2>/dev/null && echo "---DONE---"\n` }),
+    signal: AbortSignal.timeout(10000),
+  })
+  if (!inputRes.ok) return `Terminal input failed: ${inputRes.status}`
+  await new Promise(r => setTimeout(r, 1200))
+  const logsRes = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(pgSessId)}`, {
+    signal: AbortSignal.timeout(10000),
+  })
+  const { logs: pgLogs } = await logsRes.json() as { logs: string[] }
+  const pgResult = pgLogs.join('').split('---DONE---')[0].trim()
+  return pgResult || `No processes matching: ${pattern}`
+}
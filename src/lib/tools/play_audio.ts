@@ -0,0 +1,12 @@
+// play_audio — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runPlayAudio(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { url: audioUrl, title = 'Sparkie Track', artist = 'Sparkie' } = args as {
+    url: string; title?: string; artist?: string
+  }
+  const _f = '\x60\x60\x60'
+  return _f + 'audio\n' + JSON.stringify({ url: audioUrl, title, artist }) + '\n' + _f
+}
@@ -0,0 +1,26 @@
+// post_to_feed — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runPostToFeed(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { content: postContent, media_url: mediaUrl, media_type: mediaType = 'none', mood = '', code_html: codeHtml, code_title: codeTitle, companion_image_url: companionImageUrl } = args as {
+    content: string; media_url?: string; media_type?: string; mood?: string; code_html?: string; code_title?: string; companion_image_url?: string
+  }
+  try {
+    // Insert and get the ID directly — no redundant verification fetch needed
+    const result = await query<{ id: number }>(
+      `INSERT INTO sparkie_feed (content, media_url, media_type, mood, code_html, code_title, companion_image_url, created_at)
+             VALUES ($1, $2, $3, $4, $5, $6, $7, NOW()) RETURNING id`,
+      [postContent, mediaUrl ?? null, mediaType, mood, codeHtml ?? null, codeTitle ?? null, companionImageUrl ?? null]
+    )
+    const postId = result.rows[0]?.id ?? 0
+    const preview = codeTitle ? ` with live code preview: "${codeTitle}"` : ''
+    return `✅ Posted to Sparkie's Feed${preview}! Post ID: ${postId}. Content: "${postContent.slice(0, 80)}${postContent.length > 80 ? '...' : ''}" — confirmed live.`
+  } catch (e) {
+    return `post_to_feed error: ${String(e)}`
+  }
+}
@@ -0,0 +1,41 @@
+// post_to_social — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runPostToSocial(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { platform, text, media_url, subreddit, title } = args as {
+    platform: string; text: string; media_url?: string; subreddit?: string; title?: string
+  }
+  // Phase 4 HITL hardening: irreversible social posts always require user approval
+  const taskId = `hitl_social_${Date.now()}_${Math.random().toString(36).slice(2, 6)}`
+  let connectorAction = ''
+  let connectorArgs: Record<string, unknown> = {}
+  if (platform === 'twitter') {
+    connectorAction = 'TWITTER_CREATE_TWEET'; connectorArgs = { text }
+  } else if (platform === 'instagram' && media_url) {
+    connectorAction = 'INSTAGRAM_CREATE_PHOTO_POST'; connectorArgs = { image_url: media_url, caption: text }
+  } else if (platform === 'tiktok' && media_url) {
+    connectorAction = 'TIKTOK_CREATE_POST'; connectorArgs = { video_url: media_url, caption: text }
+  } else if (platform === 'reddit') {
+    connectorAction = 'REDDIT_CREATE_POST'; connectorArgs = { subreddit: subreddit || 'test', title: title || text.slice(0, 80), text }
+  }
+  if (!connectorAction) return 'post_to_social: platform not recognized or missing required media_url'
+  // Store task for human approval
+  await query(
+    `INSERT INTO sparkie_tasks (id, user_id, action, label, payload, status, executor, trigger_type, why_human, created_at)
+           VALUES ($1, $2, $3, $4, $5, 'pending', 'human', 'manual', $6, NOW())`,
+    [taskId, userId,
+     `executeConnectorTool('${connectorAction}', ${JSON.stringify(connectorArgs)})`,
+     `Post to ${platform}: "${text.slice(0, 60)}${text.length > 60 ? '...' : ''}"`,
+     JSON.stringify({ platform, connectorAction, connectorArgs }),
+     `Social post to ${platform} — requires your approval before publishing`]
+  ).catch(() => {})
+  return `HITL_TASK:${JSON.stringify({
+    id: taskId, action: connectorAction, label: `Post to ${platform}`,
+    payload: { platform, text, preview: text.slice(0, 120) }, status: 'pending'
+  })}`
+}
@@ -0,0 +1,32 @@
+// process_info — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runProcessInfo(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { baseUrl } = ctx
+  const pid = (args.pid as number) ?? 1
+  const createRes = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'create' }),
+    signal: AbortSignal.timeout(15000),
+  })
+  if (!createRes.ok) return `Terminal create failed: ${createRes.status}`
+  const { sessionId: piSessId } = await createRes.json() as { sessionId: string }
+  await new Promise(r => setTimeout(r, 800))
+  const inputRes = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'input', sessionId: piSessId, data: `echo "=== Process ${pid} ===" && cat /proc/${pid}/status 2>/dev/null | grep -E "^(Name|Pid|PPid|State|Threads|VmSize|VmRSS|MemRss)" && echo "=== cmdline ===" && cat /proc/${pid}/cmdline 2>/dev/null | tr "\\0" " " && echo "" && echo "=== open files ===" && ls -la /proc/${pid}/fd 2>/dev/null | head -10 && echo "---DONE---"\n` }),
+    signal: AbortSignal.timeout(15000),
+  })
+  if (!inputRes.ok) return `Terminal input failed: ${inputRes.status}`
+  await new Promise(r => setTimeout(r, 2000))
+  const logsRes = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(piSessId)}`, {
+    signal: AbortSignal.timeout(10000),
+  })
+  const { logs: piLogs } = await logsRes.json() as { logs: string[] }
+  const piResult = piLogs.join('').split('---DONE---')[0].trim()
+  return piResult || `No process info for PID ${pid}`
+}
@@ -0,0 +1,16 @@
+// query_causal_graph — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { queryCausalGraph } from '@/lib/causalModel'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runQueryCausalGraph(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { event: causalEvent } = args as { event: string }
+  if (!causalEvent) return 'query_causal_graph: event is required'
+  try {
+    const causes = await queryCausalGraph(causalEvent)
+    if (causes.length === 0) return `No known causes for "${causalEvent}" in the causal model yet. Observe patterns and use add_causal_link when you see connections.`
+    const lines = causes.map(c => `• ${c.causeEvent} (${Math.round(c.confidence * 100)}% confidence, ${c.occurrenceCount}x observed)`)
+    return `Known causes of "${causalEvent}":\n${lines.join('\n')}\n\nFix the most likely cause first, not just the symptom.`
+  } catch (e) { return `query_causal_graph error: ${String(e)}` }
+}
@@ -0,0 +1,33 @@
+// query_database — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runQueryDatabase(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { baseUrl } = ctx
+  const { sql, limit = 20 } = args as { sql: string; limit?: number }
+  if (!sql.trim().toUpperCase().startsWith('SELECT')) {
+    return 'Only SELECT queries are allowed.'
+  }
+  // Auto-correct common column name mistakes before executing
+  let correctedSql = sql
+    .replace(/\bcreate\b(?=\s+(DESC|ASC|LIMIT|$))/gi, 'created_at')
+    .replace(/\bupdate\b(?=\s+(DESC|ASC|LIMIT|$))/gi, 'updated_at')
+  const safeSQL = `${correctedSql.replace(/;\s*$/, '')} LIMIT ${Math.min(Number(limit), 100)}`
+  try {
+    const dbRes = await fetch(`${baseUrl}/api/db/query`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}),
+      },
+      body: JSON.stringify({ sql: safeSQL }),
+    })
+    if (!dbRes.ok) return `DB error: ${dbRes.status} — ${await dbRes.text()}`
+    const dbData = await dbRes.json() as { rows?: unknown[]; error?: string }
+    if (dbData.error) return `Query error: ${dbData.error}`
+    return JSON.stringify(dbData.rows ?? []).slice(0, 4000)
+  } catch (e) {
+    return `Database unavailable: ${String(e)}`
+  }
+}
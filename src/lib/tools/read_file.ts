@@ -0,0 +1,55 @@
+// read_file — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runReadFile(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { baseUrl } = ctx
+  const { path: rfPath, repo: rfRepo } = args as { path: string; repo?: string }
+  if (!rfPath) return 'path required for read_file'
+  try {
+    if (rfRepo) {
+      // Read from GitHub
+      const ghToken = process.env.GITHUB_TOKEN ?? process.env.GITHUB_PAT ?? ''
+      const ghHeaders: Record<string, string> = { 'Accept': 'application/vnd.github.v3+json', 'User-Agent': 'SparkieStudio/2.0' }
+      if (ghToken) ghHeaders['Authorization'] = `Bearer ${ghToken}`
+      const ghUrl = `https://api.github.com/repos/${rfRepo}/contents/${rfPath.replace(/^\//, '')}`
+      const res = await fetch(ghUrl, { headers: ghHeaders, signal: AbortSignal.timeout(8000) })
+      if (!res.ok) return `read_file: ${res.status} — ${res.statusText} for ${rfRepo}/${rfPath}`
+      const d = await res.json() as { content?: string; encoding?: string }
+      if (!d.content || d.encoding !== 'base64') return `read_file: not a file — ${rfRepo}/${rfPath}`
+      const content = Buffer.from(d.content.replace(/\n/g, ''), 'base64').toString('utf-8')
+      const lines = content.split('\n').length
+      if (lines > 3000) {
+        return `File: ${rfPath} (${lines} lines — too large for full read)\n\nShowing first 200 lines:\n${content.split('\n').slice(0, 200).join('\n')}\n\n→ Use grep_codebase to search specific sections, or read_file with line_start/line_end for ranges.`
+      }
+      return `File: ${rfPath}\n\n${content}`
+    }
+    // Read from workspace via terminal
+    const createRes = await fetch(`${baseUrl}/api/terminal`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+      body: JSON.stringify({ action: 'create' }),
+      signal: AbortSignal.timeout(10000),
+    })
+    if (!createRes.ok) return `read_file: terminal unavailable (${createRes.status})`
+    const { sessionId: rfSessId } = await createRes.json() as { sessionId: string }
+    await new Promise(r => setTimeout(r, 400))
+    const inputRes = await fetch(`${baseUrl}/api/terminal`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+      body: JSON.stringify({ action: 'input', sessionId: rfSessId, data: `cat "${rfPath}" 2>&1\n` }),
+      signal: AbortSignal.timeout(15000),
+    })
+    const rfData = await inputRes.json() as { output?: string }
+    const rawOutput = rfData.output ?? `read_file: no output for ${rfPath}`
+    // Detect oversized output (>3000 lines) and truncate gracefully
+    if (rawOutput.includes('\n') && rawOutput.split('\n').length > 3000) {
+      const lines = rawOutput.split('\n')
+      return `File: ${rfPath} (${lines.length} lines — too large for full read)\n\nShowing first 200 lines:\n${lines.slice(0, 200).join('\n')}\n\n→ Use grep_codebase to search specific sections, or cat with head/tail for specific ranges.`
+    }
+    return rawOutput
+  } catch (e) {
+    return `read_file error: ${String(e)}`
+  }
+}
@@ -0,0 +1,51 @@
+// read_memory — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runReadMemory(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { query: memQuery, category: memCategory, limit: memLimit = 10 } = args as {
+    query?: string; category?: string; limit?: number
+  }
+  try {
+    let userMemSql: string
+    let userParams: unknown[]
+    if (memQuery && memCategory) {
+      userMemSql = `SELECT 'user' AS source, category, hint, quote, content, created_at FROM user_memories WHERE user_id = $1 AND content ILIKE $2 AND category = $3 ORDER BY created_at DESC LIMIT $4`
+      userParams = [userId, `%${memQuery}%`, memCategory, memLimit]
+    } else if (memQuery) {
+      userMemSql = `SELECT 'user' AS source, category, hint, quote, content, created_at FROM user_memories WHERE user_id = $1 AND content ILIKE $2 ORDER BY created_at DESC LIMIT $3`
+      userParams = [userId, `%${memQuery}%`, memLimit]
+    } else if (memCategory) {
+      userMemSql = `SELECT 'user' AS source, category, hint, quote, content, created_at FROM user_memories WHERE user_id = $1 AND category = $2 ORDER BY created_at DESC LIMIT $3`
+      userParams = [userId, memCategory, memLimit]
+    } else {
+      userMemSql = `SELECT 'user' AS source, category, hint, quote, content, created_at FROM user_memories WHERE user_id = $1 ORDER BY created_at DESC LIMIT $2`
+      userParams = [userId, memLimit]
+    }
+    const userMems = await query(userMemSql, userParams)
+    // sparkie_self_memory uses 'source' column (not user_id) — global table, not per-user
+    let selfMemSql: string
+    let selfParams: unknown[]
+    if (memQuery) {
+      selfMemSql = `SELECT 'self' AS source, category, content, created_at FROM sparkie_self_memory WHERE content ILIKE $1 ORDER BY created_at DESC LIMIT $2`
+      selfParams = [`%${memQuery}%`, memLimit]
+    } else {
+      selfMemSql = `SELECT 'self' AS source, category, content, created_at FROM sparkie_self_memory ORDER BY created_at DESC LIMIT $1`
+      selfParams = [memLimit]
+    }
+    const selfMems = await query(selfMemSql, selfParams)
+    const allRows = [...userMems.rows, ...selfMems.rows] as Array<{ source: string; category: string; content: string; hint?: string | null; quote?: string | null }>
+    if (allRows.length === 0) return `read_memory: no memories found${memQuery ? ' matching "' + memQuery + '"' : ''}`
+    return allRows.map(r => {
+      const text = r.hint ?? r.content
+      const src = r.quote ? ` (original: "${String(r.quote).slice(0, 60)}")` : ''
+      return `[${r.source}:${r.category}] ${text}${src}`
+    }).join('\n')
+  } catch (e) {
+    return `read_memory error: ${String(e)}`
+  }
+}
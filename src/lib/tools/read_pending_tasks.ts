@@ -0,0 +1,29 @@
+// read_pending_tasks — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runReadPendingTasks(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const statusFilter = (args.status as string) ?? 'pending'
+  try {
+    const whereClause = statusFilter === 'all'
+      ? 'user_id = $1'
+      : "user_id = $1 AND status = $2"
+    const params = statusFilter === 'all' ? [userId] : [userId, statusFilter]
+    const result = await query(
+      `SELECT id, label, action, status, executor, trigger_type, scheduled_at, created_at, draft_id
+             FROM sparkie_tasks WHERE ${whereClause} ORDER BY created_at DESC LIMIT 20`,
+      params
+    )
+    if (result.rows.length === 0) return 'No tasks found.'
+    const taskList = (result.rows as any[]).map(t =>
+      `- [${t.status.toUpperCase()}] ${t.label} (${t.executor}, ${t.trigger_type}${t.scheduled_at ? `, due: ${new Date(t.scheduled_at).toLocaleDateString()}` : ''})`
+    ).join('\n')
+    return 'Pending tasks:\n' + taskList
+  } catch (e) {
+    return `Error reading tasks: ${(e as Error).message}`
+  }
+}
@@ -0,0 +1,24 @@
+// read_skill — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runReadSkill(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  try {
+    const { name: skillName } = args as { name: string }
+    if (!skillName) return 'read_skill: name is required'
+    const result = await fetch(
+      (process.env.NEXTAUTH_URL ?? 'http://localhost:3000') + '/api/skills?name=' + encodeURIComponent(skillName),
+      { headers: { 'x-internal': 'read-skill' }, signal: AbortSignal.timeout(5000) }
+    )
+    if (!result.ok) {
+      if (result.status === 404) return `Skill '${skillName}' not found. Available: email, email-style-matching, email-examples, calendar, calendar-receiving-invitation, calendar-sending-invitation, calendar-conflict-handling, calendar-meeting-title, calendar-examples, browser-use, a2ui-card-gen, cta-card-gen, social, music, video, self-repair, about-sparkie`
+      return `read_skill error: HTTP ${result.status}`
+    }
+    const data = await result.json() as { skill?: { name: string; description: string; content: string } }
+    if (!data.skill) return `read_skill: unexpected response`
+    return `[SKILL: ${data.skill.name}]\n${data.skill.description ? 'Purpose: ' + data.skill.description + '\n' : ''}\n${data.skill.content}`
+  } catch (e) {
+    return `read_skill error: ${String(e)}`
+  }
+}
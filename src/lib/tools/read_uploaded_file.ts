@@ -0,0 +1,27 @@
+// read_uploaded_file — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runReadUploadedFile(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId, baseUrl, cookieHeader } = ctx
+  if (!userId) return 'Not authenticated'
+  const { file_id: uploadFileId } = args as { file_id: string }
+  if (!uploadFileId) return 'read_uploaded_file: file_id is required'
+  try {
+    const res = await fetch(`${baseUrl}/api/upload?file_id=${encodeURIComponent(uploadFileId)}`, {
+      headers: { Cookie: cookieHeader },
+      signal: AbortSignal.timeout(10000),
+    })
+    if (!res.ok) return `read_uploaded_file: ${res.status} — ${await res.text()}`
+    const data = await res.json() as { ok?: boolean; filename?: string; mimeType?: string; sizeBytes?: number; text?: string; dataUrl?: string; error?: string }
+    if (data.error) return `read_uploaded_file: ${data.error}`
+    if (data.text) {
+      return `File: ${data.filename} (${data.mimeType}, ${data.sizeBytes} bytes)\n\n${data.text.slice(0, 8000)}${(data.text.length ?? 0) > 8000 ? '\n...(truncated)' : ''}`
+    }
+    if (data.dataUrl && data.mimeType?.startsWith('image/')) {
+      return `IMAGE_URL:${data.dataUrl}\nImage file: ${data.filename} (${data.sizeBytes} bytes)`
+    }
+    return `File: ${data.filename} (${data.mimeType}, ${data.sizeBytes} bytes) — binary file, cannot display as text`
+  } catch (e) { return `read_uploaded_file error: ${String(e)}` }
+}
@@ -0,0 +1,113 @@
+// AUTO-GENERATED by .github/scripts/split_tools.py — do not edit by hand.
+// Re-run `python3 .github/scripts/split_tools.py --write` after adding or renaming a module here.
+
+import type { ToolHandler, ToolModule } from '@/lib/tools/types'
+
+// One dynamic import per tool: each is its own chunk, compiled and evaluated on the tool's first call
+// instead of with chat/route.ts at cold start.
+const LOADERS: Record<string, () => Promise<ToolModule>> = {
+  add_causal_link: () => import('@/lib/tools/add_causal_link'),
+  browser_click: () => import('@/lib/tools/browser_click'),
+  browser_create_profile: () => import('@/lib/tools/browser_create_profile'),
+  browser_extract: () => import('@/lib/tools/browser_extract'),
+  browser_fill: () => import('@/lib/tools/browser_fill'),
+  browser_navigate: () => import('@/lib/tools/browser_navigate'),
+  browser_screenshot: () => import('@/lib/tools/browser_screenshot'),
+  browser_use_profile: () => import('@/lib/tools/browser_use_profile'),
+  check_deployment: () => import('@/lib/tools/check_deployment'),
+  check_goal_progress: () => import('@/lib/tools/check_goal_progress'),
+  check_health: () => import('@/lib/tools/check_health'),
+  complete_goal: () => import('@/lib/tools/complete_goal'),
+  composio_discover: () => import('@/lib/tools/composio_discover'),
+  composio_get_tool_schemas: () => import('@/lib/tools/composio_get_tool_schemas'),
+  create_behavior_rule: () => import('@/lib/tools/create_behavior_rule'),
+  create_goal: () => import('@/lib/tools/create_goal'),
+  create_social_draft: () => import('@/lib/tools/create_social_draft'),
+  create_task: () => import('@/lib/tools/create_task'),
+  delete_file: () => import('@/lib/tools/delete_file'),
+  delete_memory: () => import('@/lib/tools/delete_memory'),
+  delete_task: () => import('@/lib/tools/delete_task'),
+  execute_terminal: () => import('@/lib/tools/execute_terminal'),
+  find_file: () => import('@/lib/tools/find_file'),
+  generate_ace_music: () => import('@/lib/tools/generate_ace_music'),
+  generate_image: () => import('@/lib/tools/generate_image'),
+  get_attempt_history: () => import('@/lib/tools/get_attempt_history'),
+  get_current_time: () => import('@/lib/tools/get_current_time'),
+  get_outreach_status: () => import('@/lib/tools/get_outreach_status'),
+  get_radio_playlist: () => import('@/lib/tools/get_radio_playlist'),
+  get_recent_assets: () => import('@/lib/tools/get_recent_assets'),
+  get_scheduled_tasks: () => import('@/lib/tools/get_scheduled_tasks'),
+  get_self_reflections: () => import('@/lib/tools/get_self_reflections'),
+  get_user_emotional_state: () => import('@/lib/tools/get_user_emotional_state'),
+  get_weather: () => import('@/lib/tools/get_weather'),
+  grep_codebase: () => import('@/lib/tools/grep_codebase'),
+  install_skill: () => import('@/lib/tools/install_skill'),
+  journal_add: () => import('@/lib/tools/journal_add'),
+  journal_search: () => import('@/lib/tools/journal_search'),
+  kill_process: () => import('@/lib/tools/kill_process'),
+  learn_from_failure: () => import('@/lib/tools/learn_from_failure'),
+  link_to_topic: () => import('@/lib/tools/link_to_topic'),
+  list_behavior_rules: () => import('@/lib/tools/list_behavior_rules'),
+  list_directory: () => import('@/lib/tools/list_directory'),
+  list_goals: () => import('@/lib/tools/list_goals'),
+  list_memories: () => import('@/lib/tools/list_memories'),
+  list_processes: () => import('@/lib/tools/list_processes'),
+  log_worklog: () => import('@/lib/tools/log_worklog'),
+  manage_topic: () => import('@/lib/tools/manage_topic'),
+  netstat_info: () => import('@/lib/tools/netstat_info'),
+  patch_file: () => import('@/lib/tools/patch_file'),
+  pgrep: () => import('@/lib/tools/pgrep'),
+  play_audio: () => import('@/lib/tools/play_audio'),
+  post_to_feed: () => import('@/lib/tools/post_to_feed'),
+  post_to_social: () => import('@/lib/tools/post_to_social'),
+  process_info: () => import('@/lib/tools/process_info'),
+  query_causal_graph: () => import('@/lib/tools/query_causal_graph'),
+  query_database: () => import('@/lib/tools/query_database'),
+  read_file: () => import('@/lib/tools/read_file'),
+  read_memory: () => import('@/lib/tools/read_memory'),
+  read_pending_tasks: () => import('@/lib/tools/read_pending_tasks'),
+  read_skill: () => import('@/lib/tools/read_skill'),
+  read_uploaded_file: () => import('@/lib/tools/read_uploaded_file'),
+  repo_ingest: () => import('@/lib/tools/repo_ingest'),
+  run_self_reflection: () => import('@/lib/tools/run_self_reflection'),
+  save_attempt: () => import('@/lib/tools/save_attempt'),
+  save_self_memory: () => import('@/lib/tools/save_self_memory'),
+  schedule_task: () => import('@/lib/tools/schedule_task'),
+  search_reddit: () => import('@/lib/tools/search_reddit'),
+  search_twitter: () => import('@/lib/tools/search_twitter'),
+  self_diagnose: () => import('@/lib/tools/self_diagnose'),
+  send_card_to_user: () => import('@/lib/tools/send_card_to_user'),
+  send_discord: () => import('@/lib/tools/send_discord'),
+  system_info: () => import('@/lib/tools/system_info'),
+  transcribe_audio: () => import('@/lib/tools/transcribe_audio'),
+  trigger_deploy: () => import('@/lib/tools/trigger_deploy'),
+  trigger_ide_build: () => import('@/lib/tools/trigger_ide_build'),
+  update_actions: () => import('@/lib/tools/update_actions'),
+  update_behavior_rule: () => import('@/lib/tools/update_behavior_rule'),
+  update_context: () => import('@/lib/tools/update_context'),
+  update_interests: () => import('@/lib/tools/update_interests'),
+  update_task: () => import('@/lib/tools/update_task'),
+  update_worklog: () => import('@/lib/tools/update_worklog'),
+  user_operation_signal: () => import('@/lib/tools/user_operation_signal'),
+  workbench_run: () => import('@/lib/tools/workbench_run'),
+  workspace_read: () => import('@/lib/tools/workspace_read'),
+  workspace_write: () => import('@/lib/tools/workspace_write'),
+  write_database: () => import('@/lib/tools/write_database'),
+  write_file: () => import('@/lib/tools/write_file'),
+}
+
+const loaded = new Map<string, ToolHandler>()
+
+export function hasToolModule(name: string): boolean {
+  return Object.prototype.hasOwnProperty.call(LOADERS, name)
+}
+
+/** The handler for an extracted tool, or null if executeTool still handles it inline */
+export async function loadToolModule(name: string): Promise<ToolHandler | null> {
+  const cached = loaded.get(name)
+  if (cached) return cached
+  if (!hasToolModule(name)) return null
+  const handler = (await LOADERS[name]()).default
+  loaded.set(name, handler)
+  return handler
+}
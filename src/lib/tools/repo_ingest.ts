@@ -0,0 +1,19 @@
+// repo_ingest — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { ingestRepo } from '@/lib/repoIngestion'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runRepoIngest(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  const { owner: riOwner = 'Draguniteus', repo: riRepo = 'sparkie-studio' } = args as {
+    owner?: string; repo?: string
+  }
+  try {
+    const ctx = await ingestRepo(userId ?? 'system', riOwner, riRepo)
+    const fileCount = Object.keys(ctx.keyFiles).length
+    return `✅ Repo ingested: ${ctx.repo}\nStack: ${ctx.techStack.slice(0, 5).join(', ')}\nKey files mapped: ${fileCount}\n${ctx.summary}\n\nProject context is now active — I have structural awareness of the codebase.`
+  } catch (e) {
+    return `repo_ingest error: ${String(e)}`
+  }
+}
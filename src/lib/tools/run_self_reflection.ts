@@ -0,0 +1,15 @@
+// run_self_reflection — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { runSelfReflection } from '@/lib/selfReflection'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runRunSelfReflection(_name: string, _args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  try {
+    const reflection = await runSelfReflection(userId)
+    if (!reflection) return 'A reflection for today already exists. Use get_self_reflections to read it.'
+    return `✅ Self-reflection complete for ${reflection.reflectionDate}:\n\nWhat worked: ${reflection.whatWorked.slice(0, 2).join('; ')}\nWhat failed: ${reflection.whatFailed.slice(0, 2).join('; ')}\nGrowth: ${reflection.growthObserved}\nTomorrow's intention: ${reflection.tomorrowIntention}`
+  } catch (e) { return `run_self_reflection error: ${String(e)}` }
+}
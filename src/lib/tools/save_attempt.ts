@@ -0,0 +1,24 @@
+// save_attempt — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { saveAttempt } from '@/lib/attemptHistory'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runSaveAttempt(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { domain, attempt_type, summary, outcome, lesson, ttl_days } = args as {
+    domain: string; attempt_type: string; summary: string; outcome: string; lesson: string; ttl_days?: number
+  }
+  if (!domain || !attempt_type || !summary || !outcome || !lesson) {
+    return 'save_attempt: domain, attempt_type, summary, outcome, and lesson are required'
+  }
+  const validTypes = ['success', 'failure', 'workaround', 'pattern']
+  if (!validTypes.includes(attempt_type)) return `save_attempt: attempt_type must be one of ${validTypes.join(', ')}`
+  try {
+    await saveAttempt(userId, domain, attempt_type as 'success' | 'failure' | 'workaround' | 'pattern', summary, outcome, lesson, ttl_days)
+    return `✅ Attempt recorded for "${domain}": [${attempt_type.toUpperCase()}] ${summary}`
+  } catch (e) {
+    return `save_attempt error: ${String(e)}`
+  }
+}
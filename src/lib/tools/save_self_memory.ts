@@ -0,0 +1,27 @@
+// save_self_memory — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runSaveSelfMemory(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { content: memContent, category: memCat = 'self' } = args as { content: string; category?: string }
+  if (!memContent?.trim()) return 'content required'
+  // Reject low-value session log entries — these are worklogs, not learnings
+  if (/^completed tool session/i.test(memContent.trim())) {
+    return 'Session log rejected — only save what was LEARNED, not what was done. E.g.: "MiniMax M2.7 requires temperature=1.0 for best code output" instead of "Completed tool session: grep_codebase"'
+  }
+  if (memContent.includes('${')) return 'Cannot save template literals as memory'
+  try {
+    const baseUrl = process.env.NEXTAUTH_URL || 'http://localhost:3000'
+    const res = await fetch(`${baseUrl}/api/sparkie-self-memory`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET ?? '' },
+      body: JSON.stringify({ category: memCat, content: memContent, source: 'sparkie' })
+    })
+    const data = await res.json() as { ok?: boolean; error?: string }
+    if (!data.ok) return `Memory save failed: ${data.error ?? 'unknown'}`
+    return `✅ Memory saved [${memCat}]: "${memContent.slice(0, 80)}${memContent.length > 80 ? '...' : ''}"`
+  } catch (e) {
+    return `Memory save error: ${String(e)}`
+  }
+}
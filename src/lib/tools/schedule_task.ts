@@ -0,0 +1,48 @@
+// schedule_task — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runScheduleTask(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const label = args.label as string
+  const action = args.action as string
+  const triggerType = args.trigger_type as string
+  const delayHours = args.delay_hours as number | undefined
+  const cronExpression = args.cron_expression as string | undefined
+  if (!label || !action || !triggerType) return 'label, action, and trigger_type are required'
+
+  // Calculate scheduled_at for delay tasks and immediate tasks
+  const whenIso = args.when_iso as string | undefined
+  let scheduledAt: Date | null = null
+  if (triggerType === 'delay') {
+    if (whenIso) {
+      // Prefer exact ISO datetime — no AM/PM math needed
+      scheduledAt = new Date(whenIso)
+      if (isNaN(scheduledAt.getTime())) scheduledAt = null
+    } else if (delayHours) {
+      scheduledAt = new Date(Date.now() + delayHours * 3600 * 1000)
+    }
+  } else if (triggerType === 'immediate') {
+    // Immediate tasks fire as soon as the scheduler picks them up
+    scheduledAt = new Date()
+  }
+
+  const taskId = `task_${Date.now()}_${Math.random().toString(36).slice(2, 8)}`
+  try {
+    const triggerConfig = triggerType === 'cron' ? { expression: cronExpression } : { delay_hours: delayHours }
+    await query(
+      `INSERT INTO sparkie_tasks (id, user_id, action, label, payload, status, executor, trigger_type, trigger_config, scheduled_at)
+             VALUES ($1, $2, $3, $4, $5, 'pending', 'ai', $6, $7, $8)`,
+      [taskId, userId, action, label, '{}', triggerType, JSON.stringify(triggerConfig), scheduledAt]
+    )
+    const when = triggerType === 'delay' && delayHours
+      ? `in ${delayHours >= 24 ? `${Math.round(delayHours/24)} day(s)` : `${delayHours} hour(s)`}`
+      : `on schedule: ${cronExpression}`
+    return `SCHEDULED_TASK:${JSON.stringify({ id: taskId, label, trigger_type: triggerType, when })}`
+  } catch (e) {
+    return `Failed to schedule task: ${(e as Error).message}`
+  }
+}
@@ -0,0 +1,20 @@
+// search_twitter — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runSearchTwitter(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { tavilyKey } = ctx
+  if (!tavilyKey) return 'Search not available'
+  const q = `site:twitter.com OR site:x.com ${args.query as string}`
+  const res = await fetch('https://api.tavily.com/search', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', 'Authorization': `Bearer ${tavilyKey}` },
+    body: JSON.stringify({ query: q.slice(0, 200), max_results: 5, search_depth: 'basic' }),
+    signal: AbortSignal.timeout(8000),
+  })
+  if (!res.ok) return `Twitter search failed: ${res.status}`
+  const d = await res.json()
+  const results = (d.results ?? []).slice(0, 5) as Array<{ title: string; content: string; url: string }>
+  return results.map((r) => `${r.title}\n${r.content.slice(0, 200)}\n${r.url}`).join('\n\n')
+}
@@ -0,0 +1,106 @@
+// self_diagnose — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import { writeWorklog } from '@/lib/worklog'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runSelfDiagnose(_name: string, _args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId, baseUrl, cookieHeader } = ctx
+  const internalSecret = process.env.SPARKIE_INTERNAL_SECRET
+
+  // Run all checks in parallel with a 15s overall timeout
+  const diagnosisPromise = (async () => {
+    // 1. Auth — sync env var checks
+    const authChecks = [
+      { name: 'SPARKIE_INTERNAL_SECRET', status: internalSecret ? 'ok' as const : 'fail' as const, detail: internalSecret ? 'set' : 'MISSING — all internal API calls will 401' },
+      { name: 'MINIMAX_API_KEY', status: process.env.MINIMAX_API_KEY ? 'ok' as const : 'fail' as const, detail: process.env.MINIMAX_API_KEY ? 'set' : 'MISSING — build/chat broken' },
+      { name: 'COMPOSIO_API_KEY', status: process.env.COMPOSIO_API_KEY ? 'ok' as const : 'warn' as const, detail: process.env.COMPOSIO_API_KEY ? 'set' : 'not set — Gmail/Calendar/tools disabled' },
+      { name: 'SUPERMEMORY_API_KEY', status: process.env.SUPERMEMORY_API_KEY ? 'ok' as const : 'warn' as const, detail: process.env.SUPERMEMORY_API_KEY ? 'set' : 'not set — Supermemory disabled' },
+      { name: 'E2B_API_KEY', status: process.env.E2B_API_KEY ? 'ok' as const : 'fail' as const, detail: process.env.E2B_API_KEY ? 'set' : 'MISSING — execute_terminal/grep_codebase/find_file will return 500. Fallback: use get_github for file reads, query_database for data.' },
+      { name: 'MIGRATE_SECRET', status: process.env.MIGRATE_SECRET ? 'ok' as const : 'warn' as const, detail: process.env.MIGRATE_SECRET ? 'set' : 'not set — skill bootstrap disabled' },
+    ]
+
+    // 2–4: DB checks run in parallel
+    const [skillsResult, taskCountResult, realScoreResult] = await Promise.all([
+      (async () => {
+        try {
+          const r = await query(`SELECT COUNT(*) as cnt FROM sparkie_skills`).catch(() => ({ rows: [{ cnt: '0' }] }))
+          const cnt = parseInt(String((r.rows[0] as Record<string,unknown>)?.cnt ?? '0'))
+          return { name: 'skills_seeded', status: cnt >= 8 ? 'ok' as const : 'warn' as const, detail: `${cnt} skills in DB (expect ≥8)` }
+        } catch (e) { return { name: 'skills_seeded', status: 'fail' as const, detail: String(e) } }
+      })(),
+      userId ? (async () => {
+        try {
+          const r = await query(`SELECT COUNT(*) as cnt FROM sparkie_tasks WHERE user_id = $1 AND status = 'pending'`, [userId]).catch(() => ({ rows: [{ cnt: '0' }] }))
+          const cnt = parseInt(String((r.rows[0] as Record<string,unknown>)?.cnt ?? '0'))
+          return { name: 'pending_tasks', status: 'ok' as const, detail: `${cnt} task(s) pending` }
+        } catch (e) { return { name: 'pending_tasks', status: 'warn' as const, detail: String(e) } }
+      })() : Promise.resolve({ name: 'pending_tasks', status: 'ok' as const, detail: 'no userId' }),
+      userId ? (async () => {
+        try {
+          // Call the /api/real-score endpoint so REAL score matches the UI exactly
+          const realScoreRes = await fetch(`${baseUrl}/api/real-score`, {
+            headers: { cookie: cookieHeader },
+            signal: AbortSignal.timeout(10000),
+          }).catch(() => null)
+          if (realScoreRes?.ok) {
+            const realData = await realScoreRes.json() as { total: number; legs: Array<{ id: string; label: string; score: number; signal: string }> }
+            const r = realData
+            const detail = `total=${r.total} ` + r.legs.map(l => `${l.id}=${l.score}`).join(' ')
+            return { name: 'REAL_score', status: r.total >= 70 ? 'ok' as const : r.total >= 40 ? 'warn' as const : 'fail' as const, detail }
+          }
+          return { name: 'REAL_score', status: 'warn' as const, detail: 'could not reach /api/real-score endpoint' }
+        } catch (e) { return { name: 'REAL_score', status: 'warn' as const, detail: String(e) } }
+      })() : Promise.resolve({ name: 'REAL_score', status: 'ok' as const, detail: 'no userId' }),
+    ])
+
+    // 5. Deploy status — HTTP with 15s timeout
+    let deployCheck: { name: string; status: 'ok' | 'warn' | 'fail'; detail: string } = { name: 'deployment', status: 'warn', detail: 'timeout' }
+    try {
+      const depRes = await fetch(`${baseUrl}/api/admin/deploy`, {
+        headers: { 'x-internal-secret': internalSecret ?? '' },
+        signal: AbortSignal.timeout(15000),
+      }).catch(() => null)
+      if (depRes?.ok) {
+        const depData = await depRes.json() as { active_deployment?: { phase?: string } }
+        const phase = depData?.active_deployment?.phase ?? 'UNKNOWN'
+        deployCheck = { name: 'deployment', status: phase === 'ACTIVE' ? 'ok' : ['BUILDING','DEPLOYING','PENDING_BUILD'].includes(phase) ? 'warn' : 'fail', detail: `phase=${phase}` }
+      } else if (depRes === null) {
+        deployCheck = { name: 'deployment', status: 'warn', detail: `unreachable — DO proxy may be blocking WebSocket/internal calls` }
+      } else {
+        deployCheck = { name: 'deployment', status: 'warn', detail: `endpoint returned ${depRes?.status}` }
+      }
+    } catch (e) { deployCheck = { name: 'deployment', status: 'warn', detail: `error — ${String(e).slice(0, 80)}` } }
+
+    return [authChecks, skillsResult, taskCountResult, realScoreResult, deployCheck].flat() as Array<{ name: string; status: 'ok' | 'warn' | 'fail'; detail: string }>
+  })()
+
+  // 15s overall timeout for the entire diagnosis
+  const checks = await Promise.race([
+    diagnosisPromise,
+    new Promise<Array<{ name: string; status: 'ok' | 'warn' | 'fail'; detail: string }>>((resolve) =>
+      setTimeout(() => resolve([{ name: 'self_diagnose', status: 'warn' as const, detail: 'timed out after 15s — some checks could not complete' }]), 15000)
+    ),
+  ])
+
+  const okCount = checks.filter(c => c.status === 'ok').length
+  const warnCount = checks.filter(c => c.status === 'warn').length
+  const failCount = checks.filter(c => c.status === 'fail').length
+
+  const icons = { ok: '✅', warn: '⚠️', fail: '🚨' } as const
+  const lines = checks.map(c => `${icons[c.status]} **${c.name}**: ${c.detail}`)
+  const summary = `Self-diagnosis: ${okCount} OK, ${warnCount} warnings, ${failCount} failures\n\n${lines.join('\n')}`
+
+  if (userId) {
+    // Write a summary entry + one entry per non-ok check for detailed audit trail
+    writeWorklog(userId, 'self_assessment', `Self-diagnosis: ${okCount}✅ ${warnCount}⚠️ ${failCount}🚨`, { decision_type: 'action', conclusion: `Self-diagnosis complete — ${okCount} checks passed, ${warnCount} warnings, ${failCount} failure(s)` }).catch(() => {})
+    // Per-check entries for warn/fail so findings are visible in worklog
+    for (const check of checks) {
+      if (check.status !== 'ok') {
+        writeWorklog(userId, 'self_assessment', `${icons[check.status]} ${check.name}: ${check.detail}`, { decision_type: 'action', conclusion: `${check.name} — ${check.status}: ${check.detail}` }).catch(() => {})
+      }
+    }
+  }
+  return summary
+}
@@ -0,0 +1,27 @@
+// send_discord — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runSendDiscord(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { channel_id, message: discordMsg } = args as { channel_id?: string; message: string }
+  // Note: Discord SEND_MESSAGE tool is not in the current Composio toolkit (only read-only tools available)
+  // Reconnect Discord in Composio to enable send functionality
+  const taskId = `hitl_discord_${Date.now()}_${Math.random().toString(36).slice(2, 6)}`
+  await query(
+    `INSERT INTO sparkie_tasks (id, user_id, action, label, payload, status, executor, trigger_type, why_human, created_at)
+           VALUES ($1, $2, $3, $4, $5, 'pending', 'human', 'manual', $6, NOW())`,
+    [taskId, userId,
+     `executeConnectorTool('DISCORD_SEND_MESSAGE', ${JSON.stringify(args)})`,
+     `Discord message: "${discordMsg.slice(0, 60)}${discordMsg.length > 60 ? '...' : ''}"`,
+     JSON.stringify(args),
+     'WARNING: Discord send_message tool may not be active in Composio — reconnect Discord in app.composio.dev if this fails']
+  ).catch(() => {})
+  return `HITL_TASK:${JSON.stringify({
+    id: taskId, action: 'DISCORD_SEND_MESSAGE', label: 'Send Discord message',
+    payload: { channel_id, message: discordMsg, preview: discordMsg.slice(0, 120) }, status: 'pending'
+  })}`
+}
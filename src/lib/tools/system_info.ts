@@ -0,0 +1,31 @@
+// system_info — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runSystemInfo(_name: string, _args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { baseUrl } = ctx
+  const createRes = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'create' }),
+    signal: AbortSignal.timeout(15000),
+  })
+  if (!createRes.ok) return `Terminal create failed: ${createRes.status}`
+  const { sessionId: siSessId } = await createRes.json() as { sessionId: string }
+  await new Promise(r => setTimeout(r, 800))
+  const inputRes = await fetch(`${baseUrl}/api/terminal`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', ...(process.env.SPARKIE_INTERNAL_SECRET ? { 'x-internal-secret': process.env.SPARKIE_INTERNAL_SECRET } : {}) },
+    body: JSON.stringify({ action: 'input', sessionId: siSessId, data: `echo "=== System Info ===" && echo "Hostname: $(hostname)" && echo "Uptime: $(uptime -p 2>/dev/null || uptime)" && echo "Load avg: $(cat /proc/loadavg 2>/dev/null | awk '{print $1, $2, $3}')" && echo "" && echo "=== Memory ===" && free -h 2>/dev/null && echo "" && echo "=== Disk ===" && df -h / 2>/dev/null && echo "" && echo "=== CPU ===" && lscpu 2>/dev/null | grep -E "^(Model name|CPU\(s\)|Architecture|CPU MHz|CPU min|CPU max)" && echo "---DONE---"\n` }),
+    signal: AbortSignal.timeout(20000),
+  })
+  if (!inputRes.ok) return `Terminal input failed: ${inputRes.status}`
+  await new Promise(r => setTimeout(r, 2500))
+  const logsRes = await fetch(`${baseUrl}/api/logs?sessionId=${encodeURIComponent(siSessId)}`, {
+    signal: AbortSignal.timeout(10000),
+  })
+  const { logs: siLogs } = await logsRes.json() as { logs: string[] }
+  const siResult = siLogs.join('').split('---DONE---')[0].trim()
+  return siResult || 'System info unavailable'
+}
@@ -0,0 +1,23 @@
+// transcribe_audio — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runTranscribeAudio(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { audio_url: audioUrl } = args as { audio_url: string }
+  if (!audioUrl) return 'transcribe_audio: audio_url is required'
+  const DEEPGRAM_KEY = process.env.DEEPGRAM_API_KEY ?? ''
+  if (!DEEPGRAM_KEY) return 'transcribe_audio: DEEPGRAM_API_KEY not configured'
+  try {
+    const res = await fetch('https://api.deepgram.com/v1/listen?model=nova-2&smart_format=true', {
+      method: 'POST',
+      headers: { Authorization: `Token ${DEEPGRAM_KEY}`, 'Content-Type': 'application/json' },
+      body: JSON.stringify({ url: audioUrl }),
+      signal: AbortSignal.timeout(30000),
+    })
+    if (!res.ok) return `transcribe_audio: Deepgram error ${res.status}`
+    const data = await res.json() as { results?: { channels?: Array<{ alternatives?: Array<{ transcript?: string }> }> } }
+    const transcript = data.results?.channels?.[0]?.alternatives?.[0]?.transcript ?? ''
+    return transcript ? `Transcript:\n${transcript}` : 'transcribe_audio: empty transcript returned'
+  } catch (e) { return `transcribe_audio error: ${String(e)}` }
+}
@@ -0,0 +1,91 @@
+// trigger_deploy — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { writeWorklog } from '@/lib/worklog'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runTriggerDeploy(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  const { action: deployAction, deployment_id: depId, log_type: logType, envs: envVars } = args as {
+    action: 'status' | 'deploy' | 'rollback' | 'cancel' | 'logs' | 'get_env' | 'set_env'
+    deployment_id?: string
+    log_type?: string
+    envs?: Array<{ key: string; value: string; type?: string }>
+  }
+  try {
+    const appDomain = process.env.APP_DOMAIN ?? 'sparkie-studio-mhouq.ondigitalocean.app'
+    const internalKey = process.env.SPARKIE_INTERNAL_SECRET ?? ''
+    const base = `https://${appDomain}/api/admin/deploy`
+    const headers = { 'x-internal-secret': internalKey, 'Content-Type': 'application/json' }
+
+    if (deployAction === 'status') {
+      const r = await fetch(base, { headers })
+      if (!r.ok) return `trigger_deploy status: HTTP ${r.status}`
+      const d = await r.json() as { active_deployment: { id: string; phase: string; cause: string; updated_at: string } | null; recent_deployments: Array<{ id: string; phase: string; cause: string; updated_at: string }> }
+      const active = d.active_deployment
+      if (!active) return `No active deployment found. Recent: ${JSON.stringify(d.recent_deployments?.slice(0,2))}`
+      const isHealthy = active.phase === 'ACTIVE'
+      const isBuilding = ['BUILDING','DEPLOYING','PENDING_BUILD'].includes(active.phase)
+      const isFailed = ['ERROR','FAILED','CANCELED'].includes(active.phase)
+      if (isHealthy) return `✅ Deployment ACTIVE — last updated ${active.updated_at}. Cause: ${active.cause}.`
+      if (isBuilding) return `🔄 Build in progress (${active.phase}). Triggered by: ${active.cause}. ID: ${active.id.slice(0,8)}`
+      if (isFailed) return `🚨 Deployment FAILED (${active.phase}). ID: ${active.id.slice(0,8)}. Cause: ${active.cause}. Call trigger_deploy({action:'logs'}) to see why.`
+      return `Deployment phase: ${active.phase}. ID: ${active.id.slice(0,8)}`
+    }
+
+    if (deployAction === 'deploy') {
+      const r = await fetch(base, { method: 'POST', headers })
+      if (!r.ok) { const t = await r.text(); return `trigger_deploy deploy: HTTP ${r.status} — ${t.slice(0,200)}` }
+      const d = await r.json() as { deployment: { id: string; phase: string } }
+      writeWorklog(userId ?? 'system', 'task_executed', `🚀 Triggered new deployment`, { status: 'done', decision_type: 'action', deployment_id: d.deployment?.id, reasoning: 'Manual deploy triggered via trigger_deploy tool', signal_priority: 'P2', conclusion: `New deployment triggered — deployment ID ${d.deployment?.id?.slice(0, 8) ?? 'unknown'} is now building` }).catch(() => {})
+      return `🚀 Deploy triggered! Deployment ID: ${d.deployment?.id?.slice(0,8)}. Phase: ${d.deployment?.phase}. Call trigger_deploy({action:'status'}) in ~3 min to confirm it went ACTIVE.`
+    }
+
+    if (deployAction === 'rollback') {
+      if (!depId) return 'trigger_deploy rollback: deployment_id required. Call trigger_deploy({action:"status"}) to get recent deployment IDs.'
+      const r = await fetch(base, { method: 'PUT', headers, body: JSON.stringify({ deployment_id: depId }) })
+      if (!r.ok) { const t = await r.text(); return `trigger_deploy rollback: HTTP ${r.status} — ${t.slice(0,200)}` }
+      const d = await r.json() as { deployment: { id: string; phase: string } }
+      writeWorklog(userId ?? 'system', 'task_executed', `⏪ Rolled back to deployment ${depId.slice(0,8)}`, { status: 'done', decision_type: 'action', deployment_id: d.deployment?.id, reasoning: `Rollback to ${depId}`, signal_priority: 'P1', conclusion: `Rollback initiated to deployment ${depId.slice(0, 8)} — new deployment in progress` }).catch(() => {})
+      return `⏪ Rollback initiated. New deployment ID: ${d.deployment?.id?.slice(0,8)}`
+    }
+
+    if (deployAction === 'cancel') {
+      if (!depId) return 'trigger_deploy cancel: deployment_id required.'
+      const r = await fetch(`${base}?deployment_id=${depId}`, { method: 'DELETE', headers })
+      if (!r.ok) { const t = await r.text(); return `trigger_deploy cancel: HTTP ${r.status} — ${t.slice(0,200)}` }
+      return `✅ Deployment ${depId.slice(0,8)} cancelled.`
+    }
+
+    if (deployAction === 'logs') {
+      const lt = logType ?? 'BUILD'
+      const r = await fetch(`${base}/logs?type=${lt}&fetch_content=true`, { headers })
+      if (!r.ok) return `trigger_deploy logs: HTTP ${r.status}`
+      const d = await r.json() as { content?: string; deployment_id?: string }
+      const logText = d.content ?? '(no log content)'
+      const trimmed = logText.length > 3000 ? '...(truncated)...\n' + logText.slice(-3000) : logText
+      return `📋 ${lt} log (deploy ${d.deployment_id?.slice(0,8)}):\n\n${trimmed}`
+    }
+
+    if (deployAction === 'get_env') {
+      const r = await fetch(`${base}/env`, { headers })
+      if (!r.ok) return `trigger_deploy get_env: HTTP ${r.status}`
+      const d = await r.json() as { envs: Array<{ key: string; value?: string; type: string; scope: string }> }
+      const envList = (d.envs ?? []).map(e => `${e.key} [${e.type}/${e.scope}]${e.value ? ': ' + e.value : ': (secret)' }`).join('\n')
+      return `🔑 Env vars (${d.envs?.length ?? 0}):\n${envList}`
+    }
+
+    if (deployAction === 'set_env') {
+      if (!envVars?.length) return 'trigger_deploy set_env: envs array required.'
+      const r = await fetch(`${base}/env`, { method: 'POST', headers, body: JSON.stringify({ envs: envVars }) })
+      if (!r.ok) { const t = await r.text(); return `trigger_deploy set_env: HTTP ${r.status} — ${t.slice(0,200)}` }
+      const d = await r.json() as { updated_keys: string[] }
+      writeWorklog(userId ?? 'system', 'task_executed', `🔑 Updated env vars: ${envVars.map(e=>e.key).join(', ')}`, { status: 'done', decision_type: 'action', reasoning: 'Env var update via trigger_deploy', signal_priority: 'P2', conclusion: `Environment variable(s) updated: ${envVars.map(e=>e.key).join(', ')} — a new deployment has started automatically` }).catch(() => {})
+      return `✅ Env vars updated: ${(d.updated_keys ?? envVars.map(e=>e.key)).join(', ')}. A new deployment will start automatically.`
+    }
+
+    return `trigger_deploy: unknown action "${deployAction}"`
+  } catch (e) {
+    return `trigger_deploy error: ${String(e)}`
+  }
+}
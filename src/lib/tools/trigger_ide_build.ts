@@ -0,0 +1,10 @@
+// trigger_ide_build — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runTriggerIdeBuild(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { prompt: buildPrompt } = args as { prompt: string }
+  // Send IDE_BUILD SSE event to frontend — client opens IDE panel and calls /api/build
+  return `IDE_BUILD:${buildPrompt}`
+}
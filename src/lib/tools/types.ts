@@ -0,0 +1,19 @@
+// AUTO-GENERATED by .github/scripts/split_tools.py from executeTool()'s ctx parameter — do not edit by hand.
+
+/** What executeTool() in chat/route.ts hands to every tool */
+export interface ToolContext {
+  userId: string | null
+  tavilyKey: string | undefined
+  apiKey: string
+  doKey: string
+  baseUrl: string
+  cookieHeader: string
+  abortSignal?: AbortSignal
+}
+
+export type ToolHandler = (name: string, args: Record<string, unknown>, ctx: ToolContext) => Promise<string>
+
+export interface ToolModule {
+  default: ToolHandler
+  TOOL_NAMES?: string[]
+}
@@ -0,0 +1,14 @@
+// update_actions — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { updateActionsFile } from '@/lib/identity'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runUpdateActions(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const content = args.content as string
+  if (!content) return 'content is required'
+  await updateActionsFile(userId, content)
+  return 'Action chain updated (L6 saved)'
+}
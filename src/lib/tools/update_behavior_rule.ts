@@ -0,0 +1,16 @@
+// update_behavior_rule — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { updateBehaviorRule } from '@/lib/behaviorRules'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runUpdateBehaviorRule(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { id: ruleId, action: ruleAction, reasoning: ruleReasoning, confidence: ruleConf, active: ruleActive } = args as {
+    id: string; action?: string; reasoning?: string; confidence?: number; active?: boolean
+  }
+  if (!ruleId) return 'update_behavior_rule: id is required'
+  try {
+    await updateBehaviorRule(ruleId, { action: ruleAction, reasoning: ruleReasoning, confidence: ruleConf, active: ruleActive })
+    return `✅ Behavior rule ${ruleId.slice(0, 8)} updated`
+  } catch (e) { return `update_behavior_rule error: ${String(e)}` }
+}
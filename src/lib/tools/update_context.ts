@@ -0,0 +1,14 @@
+// update_context — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { updateContextFile } from '@/lib/identity'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runUpdateContext(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const content = args.content as string
+  if (!content) return 'content is required'
+  await updateContextFile(userId, content)
+  return 'Context updated (L3 state saved)'
+}
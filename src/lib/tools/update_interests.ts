@@ -0,0 +1,65 @@
+// update_interests — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runUpdateInterests(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { section, content: sectionContent, append = true } = args as {
+    section: string; content: string; append?: boolean
+  }
+  try {
+    const GITHUB_TOKEN = process.env.GITHUB_TOKEN ?? process.env.GITHUB_PAT ?? ''
+    if (!GITHUB_TOKEN) return 'GITHUB_TOKEN not configured'
+    // Read current INTERESTS.md
+    const readRes = await fetch(
+      `https://api.github.com/repos/Draguniteus/sparkie-studio/contents/INTERESTS.md`,
+      { headers: { Authorization: `token \${GITHUB_TOKEN}`, Accept: 'application/vnd.github.v3+json' } }
+    )
+    let currentContent = ''
+    let currentSha: string | undefined
+    if (readRes.ok) {
+      const d = await readRes.json() as { content: string; sha: string }
+      currentContent = Buffer.from(d.content.replace(/\n/g, ''), 'base64').toString('utf-8')
+      currentSha = d.sha
+    }
+    // Find and update/append the section
+    const sectionHeader = `## \${section}`
+    let newContent: string
+    if (currentContent.includes(sectionHeader)) {
+      if (append) {
+        // Append after section header
+        newContent = currentContent.replace(
+          new RegExp(`(\${sectionHeader}[\\s\\S]*?)(?=\n## |$)`),
+          `$1\n- \${sectionContent}`
+        )
+      } else {
+        // Replace section content
+        newContent = currentContent.replace(
+          new RegExp(`(\${sectionHeader})([\\s\\S]*?)(?=\n## |$)`),
+          `$1\n\n\${sectionContent}\n`
+        )
+      }
+    } else {
+      // Add new section
+      newContent = currentContent + `\n\n## \${section}\n\n\${sectionContent}\n`
+    }
+    // Update the timestamp
+    newContent = newContent.replace(/\*Last updated:.*\*/, `*Last updated: \${new Date().toISOString().split('T')[0]}. Next update: tomorrow.*`)
+    // Push
+    const body: Record<string, string> = {
+      message: `journal: Sparkie updates \${section} interests`,
+      content: Buffer.from(newContent).toString('base64'),
+      branch: 'master',
+    }
+    if (currentSha) body.sha = currentSha
+    const pushRes = await fetch(
+      `https://api.github.com/repos/Draguniteus/sparkie-studio/contents/INTERESTS.md`,
+      { method: 'PUT', headers: { Authorization: `token \${GITHUB_TOKEN}`, Accept: 'application/vnd.github.v3+json', 'Content-Type': 'application/json' }, body: JSON.stringify(body) }
+    )
+    if (!pushRes.ok) return `Could not update INTERESTS.md: \${pushRes.status}`
+    const d = await pushRes.json() as { commit: { sha: string } }
+    return `✅ Updated INTERESTS.md — section "\${section}" — commit \${d.commit?.sha?.slice(0, 12)}`
+  } catch (e) {
+    return `update_interests error: \${String(e)}`
+  }
+}
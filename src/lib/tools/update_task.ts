@@ -0,0 +1,28 @@
+// update_task — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runUpdateTask(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { task_id: updateTaskId, status: newStatus, result: taskResult } = args as {
+    task_id: string; status: string; result?: string
+  }
+  if (!updateTaskId || !newStatus) return 'update_task: task_id and status are required'
+  try {
+    const existing = await query('SELECT id FROM sparkie_tasks WHERE id = $1 AND user_id = $2', [updateTaskId, userId])
+    if (existing.rows.length === 0) return `update_task: task ${updateTaskId} not found`
+    await query(
+      `UPDATE sparkie_tasks SET status = $1, resolved_at = CASE WHEN $1 IN ('completed','failed','skipped') THEN NOW() ELSE resolved_at END WHERE id = $2 AND user_id = $3`,
+      [newStatus, updateTaskId, userId]
+    )
+    if (taskResult) {
+      await query(`UPDATE sparkie_tasks SET result = $1 WHERE id = $2`, [taskResult, updateTaskId]).catch(() => {})
+    }
+    return `✅ update_task: ${updateTaskId} → ${newStatus}${taskResult ? ' | ' + taskResult : ''}`
+  } catch (e) {
+    return `update_task error: ${String(e)}`
+  }
+}
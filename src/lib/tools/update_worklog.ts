@@ -0,0 +1,23 @@
+// update_worklog — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { writeWorklog } from '@/lib/worklog'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runUpdateWorklog(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { type: wlType, message: wlMessage, conclusion: wlConclusion, metadata: wlMeta } = args as {
+    type: string; message: string; conclusion?: string; metadata?: Record<string, unknown>
+  }
+  if (!wlType || !wlMessage) return 'update_worklog: type and message are required'
+  try {
+    await writeWorklog(userId, wlType, wlMessage, {
+      ...wlMeta ?? {},
+      conclusion: wlConclusion ?? wlMessage.slice(0, 120),
+    })
+    return `✅ Worklog entry saved: [${wlType}] ${wlMessage.slice(0, 80)}${wlMessage.length > 80 ? '...' : ''}`
+  } catch (e) {
+    return `update_worklog error: ${String(e)}`
+  }
+}
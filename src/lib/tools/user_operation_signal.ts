@@ -0,0 +1,49 @@
+// user_operation_signal — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runUserOperationSignal(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { task_id: opTaskId, action: opAction, feedback: opFeedback } = args as {
+    task_id: string; action: string; feedback?: string
+  }
+  if (!opTaskId || !opAction) return 'user_operation_signal: task_id and action are required'
+
+  // Fetch the task to get action + draft_id + payload
+  const taskRes = await query<{
+    id: string; action: string; label: string; status: string; payload: unknown; draft_id: string | null
+  }>(`SELECT id, action, label, status, payload, draft_id FROM sparkie_tasks WHERE id = $1 AND user_id = $2`, [opTaskId, userId])
+  const task = taskRes.rows[0]
+  if (!task) return `user_operation_signal: task ${opTaskId} not found`
+
+  const payload = typeof task.payload === 'string' ? JSON.parse(task.payload) : task.payload
+
+  if (opAction === 'approved' || opAction === 'rejected') {
+    // Mark the task as completed/skipped and return the result to the AI
+    const resolved = opAction === 'approved' ? 'completed' : 'skipped'
+    await query(`UPDATE sparkie_tasks SET status = $1, resolved_at = NOW() WHERE id = $2`, [resolved, opTaskId])
+    return `[user_operation: ${opAction}] Task "${task.label}" has been ${resolved} by the user.` +
+      (opFeedback ? ` Feedback: ${opFeedback}` : '') +
+      ` The task is now marked as ${resolved}. You may continue autonomously.`
+  }
+
+  if (opAction === 'changes_requested') {
+    // Mark current task as skipped, return feedback so AI can create new draft
+    await query(`UPDATE sparkie_tasks SET status = 'skipped', resolved_at = NOW() WHERE id = $1`, [opTaskId])
+    return `[user_operation: changes_requested] User requested changes for task "${task.label}".` +
+      (opFeedback ? ` Feedback: ${opFeedback}` : ' No specific feedback provided.') +
+      ` The previous task is skipped. Please create a revised draft based on the feedback and send a new card.`
+  }
+
+  if (opAction === 'discarded') {
+    // Mark as cancelled
+    await query(`UPDATE sparkie_tasks SET status = 'cancelled', resolved_at = NOW() WHERE id = $1`, [opTaskId])
+    return `[user_operation: discarded] Task "${task.label}" has been discarded by the user.` +
+      ` The task is cancelled. Stop unless you have urgent follow-up work.`
+  }
+
+  return `user_operation_signal: unknown action "${opAction}"`
+}
@@ -0,0 +1,58 @@
+// workbench_run — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runWorkbenchRun(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { code } = args as { code: string }
+  const e2bKey = process.env.E2B_API_KEY
+  if (!e2bKey) return 'workbench_run unavailable — E2B_API_KEY not set'
+  try {
+    const composioKey = process.env.COMPOSIO_API_KEY ?? ''
+    const miniKey = process.env.MINIMAX_API_KEY ?? ''
+    // Inject helper functions so the code can call Composio tools + LLM inline
+    const prelude = `
+import json, os, urllib.request, urllib.error
+
+def run_composio_tool(slug, args={}):
+    """Execute a Composio tool by slug. Returns parsed JSON result."""
+    req = urllib.request.Request(
+        'https://backend.composio.dev/api/v3/tools/execute/' + slug,
+        data=json.dumps({'entity_id': 'sparkie_user_default', 'arguments': args}).encode(),
+        headers={'Content-Type': 'application/json', 'x-api-key': '${composioKey}'},
+        method='POST',
+    )
+    with urllib.request.urlopen(req, timeout=30) as r:
+        return json.loads(r.read())
+
+def invoke_llm(query, model='MiniMax-M2.7'):
+    """Run an inline LLM query. Returns the text response."""
+    try:
+        req = urllib.request.Request(
+            'https://api.minimax.io/v1/chat/completions',
+            data=json.dumps({'model': model, 'stream': False, 'max_tokens': 4000, 'messages': [{'role': 'user', 'content': query}]}).encode(),
+            headers={"Content-Type": "application/json", "Authorization": f"Bearer {miniKey}"},
+            method='POST',
+        )
+        with urllib.request.urlopen(req, timeout=30) as r:
+            d = json.loads(r.read())
+            return d.get('choices', [{}])[0].get('message', {}).get('content', '')
+    except urllib.error.HTTPError as e:
+        body = e.read().decode() if e.fp else str(e)
+        raise RuntimeError(f'HTTP {e.code}: {body[:500]}')
+`
+    const { Sandbox } = await import('@e2b/code-interpreter')
+    const sbx = await Sandbox.create({ apiKey: e2bKey, timeoutMs: 120_000 })
+    try {
+      const exec = await sbx.runCode(prelude + '\n' + code, { timeoutMs: 60_000 })
+      const stdout = exec.logs.stdout.join('\n')
+      const stderr = exec.logs.stderr.join('\n')
+      const error = exec.error ? `\nERROR: ${exec.error.name}: ${exec.error.value}` : ''
+      return (stdout + (stderr ? '\n[stderr]: ' + stderr : '') + error).slice(0, 8000) || 'No output'
+    } finally {
+      await (sbx as unknown as { kill(): Promise<boolean> }).kill().catch(() => {})
+    }
+  } catch (e) {
+    return `workbench_run error: ${String(e)}`
+  }
+}
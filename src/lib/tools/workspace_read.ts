@@ -0,0 +1,22 @@
+// workspace_read — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runWorkspaceRead(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId, baseUrl, cookieHeader } = ctx
+  if (!userId) return 'Not authenticated'
+  const { key } = args as { key: string }
+  if (!key) return 'key required'
+  try {
+    const res = await fetch(`${baseUrl}/api/workspace?key=${encodeURIComponent(key)}`, {
+      headers: { Cookie: cookieHeader },
+    })
+    if (res.status === 404) return `workspace: key "${key}" not found`
+    const data = await res.json() as { value?: string; error?: string }
+    if (data.error) return `workspace_read error: ${data.error}`
+    return data.value ?? ''
+  } catch (e) {
+    return `workspace_read error: ${String(e)}`
+  }
+}
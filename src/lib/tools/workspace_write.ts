@@ -0,0 +1,24 @@
+// workspace_write — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runWorkspaceWrite(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId, baseUrl, cookieHeader } = ctx
+  if (!userId) return 'Not authenticated'
+  const { key, value } = args as { key: string; value: string }
+  if (!key) return 'key required'
+  if (value === undefined || value === null) return 'value required'
+  try {
+    const res = await fetch(`${baseUrl}/api/workspace`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Cookie: cookieHeader },
+      body: JSON.stringify({ key, value: String(value) }),
+    })
+    const data = await res.json() as { ok?: boolean; error?: string }
+    if (data.error) return `workspace_write error: ${data.error}`
+    return `✓ saved to workspace["${key}"]`
+  } catch (e) {
+    return `workspace_write error: ${String(e)}`
+  }
+}
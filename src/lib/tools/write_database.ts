@@ -0,0 +1,25 @@
+// write_database — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import { query } from '@/lib/db'
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runWriteDatabase(_name: string, args: Record<string, unknown>, ctx: ToolContext): Promise<string> {
+  const { userId } = ctx
+  if (!userId) return 'Not authenticated'
+  const { sql: writeSql, params: writeParams } = args as { sql: string; params?: unknown[] }
+  if (!writeSql) return 'write_database: sql is required'
+  const upperSql = writeSql.trim().toUpperCase()
+  if (upperSql.startsWith('SELECT')) return 'write_database: use query_database for SELECT queries'
+  // Block DELETEs on sparkie_worklog — prevents Sparkie from erasing her own error history
+  if (upperSql.includes('DELETE') && upperSql.includes('SPARKIE_WORKLOG')) {
+    return 'write_database: DELETE on sparkie_worklog is not allowed — error history must be preserved for debugging'
+  }
+  try {
+    const writeResult = await query(writeSql, writeParams ?? [])
+    const rowCount = writeResult.rowCount ?? 0
+    return `✅ write_database: ${rowCount} row(s) affected`
+  } catch (e) {
+    return `write_database error: ${String(e)}`
+  }
+}
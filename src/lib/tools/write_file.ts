@@ -0,0 +1,50 @@
+// write_file — moved out of executeTool() in src/app/api/chat/route.ts
+// by .github/scripts/split_tools.py; loaded on first call through ./registry.ts.
+
+import type { ToolContext } from '@/lib/tools/types'
+
+export default async function runWriteFile(_name: string, args: Record<string, unknown>, _ctx: ToolContext): Promise<string> {
+  const { path: filePath, content: fileContent, message: commitMessage } = args as {
+    path: string; content: string; message: string
+  }
+  try {
+    const GITHUB_TOKEN = process.env.GITHUB_TOKEN ?? process.env.GITHUB_PAT ?? ''
+    if (!GITHUB_TOKEN) return 'GITHUB_TOKEN not configured — cannot write files'
+    const owner = 'Draguniteus'
+    const repo = 'sparkie-studio'
+    // Get current SHA
+    const shaRes = await fetch(
+      `https://api.github.com/repos/${owner}/${repo}/contents/${filePath}`,
+      { headers: { Authorization: `token ${GITHUB_TOKEN}`, Accept: 'application/vnd.github.v3+json' } }
+    )
+    let sha: string | undefined
+    if (shaRes.ok) {
+      const shaData = await shaRes.json() as { sha: string }
+      sha = shaData.sha
+    }
+    // Push file
+    const body: Record<string, string> = {
+      message: commitMessage,
+      content: Buffer.from(fileContent).toString('base64'),
+      branch: 'master',
+    }
+    if (sha) body.sha = sha
+    const pushRes = await fetch(
+      `https://api.github.com/repos/${owner}/${repo}/contents/${filePath}`,
+      {
+        method: 'PUT',
+        headers: { Authorization: `token ${GITHUB_TOKEN}`, Accept: 'application/vnd.github.v3+json', 'Content-Type': 'application/json' },
+        body: JSON.stringify(body),
+      }
+    )
+    if (!pushRes.ok) {
+      const err = await pushRes.text()
+      return `GitHub push failed (${pushRes.status}): ${err.slice(0, 300)}`
+    }
+    const pushData = await pushRes.json() as { commit: { sha: string } }
+    const commitSha = pushData.commit?.sha?.slice(0, 12) ?? '?'
+    return `✅ File written: ${filePath} — commit ${commitSha}. Deploy started automatically.`
+  } catch (e) {
+    return `write_file error: ${String(e)}`
+  }
+}
@@ -82,22 +82,6 @@ export function formatEmotionalStateBlock(state: UserEmotionalState): string {
   return `\n\n## EMOTIONAL STATE DETECTED\n${hints.map(h => `• ${h}`).join('\n')}`
 }
 
-async function ensureTable(): Promise<void> {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_user_model (
-      user_id              TEXT PRIMARY KEY,
-      peak_hours           JSONB DEFAULT '[]',
-      avg_response_time_ms INTEGER DEFAULT 0,
-      follow_up_rate       REAL DEFAULT 0,
-      satisfaction_signals JSONB DEFAULT '{"highSatisfaction":[],"lowSatisfaction":[]}',
-      preferred_format     TEXT DEFAULT 'mixed',
-      session_count        INTEGER DEFAULT 0,
-      raw_signals          JSONB DEFAULT '[]',
-      updated_at           TIMESTAMPTZ DEFAULT NOW()
-    )
-  `).catch(() => {})
-}
-
 // Ingest a session signal — called fire-and-forget after each chat completion
 export async function ingestSessionSignal(
   userId: string,
@@ -110,7 +94,6 @@ export async function ingestSessionSignal(
     usedTools: boolean
   }
 ): Promise<void> {
-  await ensureTable()
   // Append to raw_signals (keep last 200)
   await query(
     `INSERT INTO sparkie_user_model (user_id, raw_signals, session_count, updated_at)
@@ -128,7 +111,6 @@ export async function ingestSessionSignal(
 
 // Run analytics — called by weekly scheduler job
 export async function computeUserModel(userId: string): Promise<void> {
-  await ensureTable()
   const res = await query<{ raw_signals: Array<Record<string, unknown>> }>(
     `SELECT raw_signals FROM sparkie_user_model WHERE user_id = $1`,
     [userId]
@@ -200,7 +182,6 @@ export async function computeUserModel(userId: string): Promise<void> {
 
 // Get user model for prompt injection
 export async function getUserModel(userId: string): Promise<UserModelEntry | null> {
-  await ensureTable()
   const res = await query<{
     user_id: string; peak_hours: number[]; avg_response_time_ms: number;
     follow_up_rate: number; satisfaction_signals: { highSatisfaction: string[]; lowSatisfaction: string[] };
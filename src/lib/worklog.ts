@@ -1,4 +1,5 @@
 import { query } from '@/lib/db'
+import { getSink } from '@/lib/writeBehind'
 
 /** Default icon key per worklog type — used when call site doesn't specify one */
 export const DEFAULT_TYPE_ICONS: Record<string, string> = {
@@ -81,33 +82,17 @@ export interface WorklogMeta {
   [key: string]: unknown
 }
 
-async function ensureTable() {
-  await query(`
-    CREATE TABLE IF NOT EXISTS sparkie_worklog (
-      id TEXT PRIMARY KEY,
-      user_id TEXT NOT NULL,
-      type TEXT NOT NULL,
-      content TEXT NOT NULL,
-      metadata JSONB DEFAULT '{}',
-      created_at TIMESTAMPTZ DEFAULT NOW()
-    )
-  `).catch(() => {})
-  await query(`CREATE INDEX IF NOT EXISTS idx_worklog_user_time ON sparkie_worklog(user_id, created_at DESC)`).catch(() => {})
-  // Add new columns if they don't exist (non-breaking migration)
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS status TEXT DEFAULT 'done'`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS decision_type TEXT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS reasoning TEXT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS estimated_duration_ms INT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS actual_duration_ms INT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS signal_priority TEXT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS depends_on JSONB DEFAULT '[]'`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS side_effect_of TEXT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS confidence FLOAT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS conclusion TEXT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS icon TEXT`).catch(() => {})
-  await query(`ALTER TABLE sparkie_worklog ADD COLUMN IF NOT EXISTS tag TEXT`).catch(() => {})
-}
+// Rows are buffered and written in multi-row INSERTs (see writeBehind.ts)
+const worklogSink = getSink({
+  name: 'sparkie_worklog',
+  table: 'sparkie_worklog',
+  columns: ['id', 'user_id', 'type', 'content', 'metadata', 'status', 'decision_type', 'reasoning', 'estimated_duration_ms', 'actual_duration_ms', 'signal_priority', 'confidence', 'depends_on', 'side_effect_of', 'conclusion', 'created_at'],
+})
 
+/**
+ * Queue a worklog entry. Resolves immediately — the row reaches the table on
+ * the sink's next flush (at most ~1s later), or is dropped under back-pressure.
+ */
 export async function writeWorklog(
   userId: string,
   type: WorklogType | string,
@@ -115,29 +100,25 @@ export async function writeWorklog(
   metadata: WorklogMeta = {}
 ): Promise<void> {
   try {
-    await ensureTable()
     const id = crypto.randomUUID()
     // Extract top-level columns — store icon/tag/result_preview in metadata JSONB
     // (the table only has base columns; icon/tag/result_preview are stored via metadata->>)
     const { status, decision_type, reasoning, estimated_duration_ms, actual_duration_ms, signal_priority, confidence, depends_on, side_effect_of, conclusion, icon, tag, result_preview, ...restMeta } = metadata
-    await query(
-      `INSERT INTO sparkie_worklog (id, user_id, type, content, metadata, status, decision_type, reasoning, estimated_duration_ms, actual_duration_ms, signal_priority, confidence, depends_on, side_effect_of, conclusion)
-       VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15)`,
-      [
-        id, userId, type, content,
-        JSON.stringify({ ...restMeta, ...(icon ? { icon } : {}), ...(tag ? { tag } : {}), ...(result_preview ? { result_preview } : {}) }),
-        status ?? 'done',
-        decision_type ?? null,
-        reasoning ?? null,
-        estimated_duration_ms ?? null,
-        actual_duration_ms ?? null,
-        signal_priority ?? null,
-        confidence ?? null,
-        depends_on ? JSON.stringify(depends_on) : null,
-        side_effect_of ?? null,
-        conclusion ?? null,
-      ]
-    )
+    worklogSink.push([
+      id, userId, type, content,
+      JSON.stringify({ ...restMeta, ...(icon ? { icon } : {}), ...(tag ? { tag } : {}), ...(result_preview ? { result_preview } : {}) }),
+      status ?? 'done',
+      decision_type ?? null,
+      reasoning ?? null,
+      estimated_duration_ms ?? null,
+      actual_duration_ms ?? null,
+      signal_priority ?? null,
+      confidence ?? null,
+      depends_on ? JSON.stringify(depends_on) : null,
+      side_effect_of ?? null,
+      conclusion ?? null,
+      new Date(),
+    ])
   } catch (e) {
     console.error('[worklog] write failed:', e)
   }
@@ -146,7 +127,7 @@ export async function writeWorklog(
 /** Merge consecutive message_batch entries within 5 minutes into one updated entry */
 export async function writeMsgBatch(userId: string, count: number): Promise<void> {
   try {
-    await ensureTable()
+    await worklogSink.flush() // the entry to merge into may still be queued
     const recent = await query(
       `SELECT id, metadata FROM sparkie_worklog
        WHERE user_id = $1 AND type = 'message_batch' AND created_at > NOW() - INTERVAL '5 minutes'
@@ -0,0 +1,238 @@
+/**
+ * writeBehind.ts
+ * Buffered, batched INSERTs for append-only log tables (sparkie_worklog, sparkie_tool_log).
+ *
+ * Callers enqueue a row and return immediately; the sink flushes the queue as
+ * one multi-row INSERT when it reaches maxBatch rows or flushMs after the first
+ * queued row, whichever comes first.
+ *
+ *   - One flush in flight per sink, so a burst never takes more than one pool connection
+ *   - Back-pressure: past maxQueued rows new rows are dropped (and counted), not awaited
+ *   - A row-level error (SQLSTATE class 22 / 23: bad value, FK violation) splits the
+ *     batch in halves until the rows that fail on their own are found; only those
+ *     are rejected, the rest of the batch is written
+ *   - Any other failure re-queues the unwritten rows at the front up to maxRetries
+ *     times, then drops them
+ *   - Rows carry their own created_at so buffering doesn't reorder the log
+ *   - flushAllSinks() drains every sink; server.js runs it on SIGTERM / SIGINT
+ *     through global.__shutdownHooks
+ *
+ * Counters are readable via sinkStats() and reported by /api/health.
+ * These tables are write-mostly logs — a reader may see a row up to flushMs late.
+ */
+
+import { query } from '@/lib/db'
+
+export interface WriteBehindOptions {
+  name: string
+  table: string
+  columns: string[]
+  /** Rows per INSERT; also the queue length that triggers an immediate flush */
+  maxBatch?: number
+  /** Longest a queued row waits before a timed flush */
+  flushMs?: number
+  /** Queue limit — rows beyond it are dropped */
+  maxQueued?: number
+  maxRetries?: number
+}
+
+export interface SinkStats {
+  name: string
+  queued: number
+  enqueued: number
+  written: number
+  /** Back-pressure: rows that found the queue full */
+  dropped: number
+  /** Rows that failed on their own with a row-level error */
+  rejected: number
+  /** Rows given up on after maxRetries failed flushes */
+  expired: number
+  flushes: number
+  failedFlushes: number
+  lastFlushMs: number
+  lastError: string | null
+}
+
+interface QueuedRow {
+  values: unknown[]
+  attempts: number
+}
+
+declare global {
+  // eslint-disable-next-line no-var
+  var __writeBehindSinks: Map<string, WriteBehindSink> | undefined
+  // eslint-disable-next-line no-var
+  var __shutdownHooks: Set<() => Promise<unknown>> | undefined
+}
+
+// On global so every route bundle in the process shares one sink per table
+if (!global.__writeBehindSinks) global.__writeBehindSinks = new Map()
+if (!global.__shutdownHooks) global.__shutdownHooks = new Set()
+const registry = global.__writeBehindSinks
+
+export class WriteBehindSink {
+  readonly name: string
+  private readonly table: string
+  private readonly columns: string[]
+  private readonly maxBatch: number
+  private readonly flushMs: number
+  private readonly maxQueued: number
+  private readonly maxRetries: number
+  private queue: QueuedRow[] = []
+  private timer: ReturnType<typeof setTimeout> | null = null
+  private flushing: Promise<void> | null = null
+  private counters = { enqueued: 0, written: 0, dropped: 0, rejected: 0, expired: 0, flushes: 0, failedFlushes: 0, lastFlushMs: 0 }
+  private lastError: string | null = null
+
+  constructor(opts: WriteBehindOptions) {
+    this.name = opts.name
+    this.table = opts.table
+    this.columns = opts.columns
+    // Postgres caps a statement at 65535 bind parameters
+    this.maxBatch = Math.min(opts.maxBatch ?? 200, Math.floor(65535 / opts.columns.length))
+    this.flushMs = opts.flushMs ?? 1000
+    this.maxQueued = opts.maxQueued ?? 10_000
+    this.maxRetries = opts.maxRetries ?? 2
+  }
+
+  /** Queue one row (values in column order). Returns false if it was dropped. */
+  push(values: unknown[]): boolean {
+    if (this.queue.length >= this.maxQueued) {
+      this.counters.dropped++
+      return false
+    }
+    this.queue.push({ values, attempts: 0 })
+    this.counters.enqueued++
+    if (this.queue.length >= this.maxBatch) this.flush().catch(() => {})
+    else this.schedule()
+    return true
+  }
+
+  /** Write everything queued so far; resolves once the queue is empty or only failed rows remain */
+  async flush(): Promise<void> {
+    if (this.timer) {
+      clearTimeout(this.timer)
+      this.timer = null
+    }
+    if (this.flushing) return this.flushing
+    this.flushing = this.drain().finally(() => {
+      this.flushing = null
+      if (this.queue.length) this.schedule()
+    })
+    return this.flushing
+  }
+
+  stats(): SinkStats {
+    return { name: this.name, queued: this.queue.length, ...this.counters, lastError: this.lastError }
+  }
+
+  private schedule(): void {
+    if (this.timer || this.flushing) return
+    this.timer = setTimeout(() => {
+      this.timer = null
+      this.flush().catch(() => {})
+    }, this.flushMs)
+    this.timer.unref?.()
+  }
+
+  private async drain(): Promise<void> {
+    while (this.queue.length) {
+      const batch = this.queue.splice(0, this.maxBatch)
+      const t0 = Date.now()
+      const unwritten: QueuedRow[] = []
+      try {
+        await this.write(batch, unwritten)
+        this.counters.flushes++
+        this.counters.lastFlushMs = Date.now() - t0
+      } catch (e) {
+        this.counters.failedFlushes++
+        this.lastError = errorText(e)
+        console.error(`[writeBehind] ${this.name} flush of ${unwritten.length} rows failed:`, this.lastError)
+        const retry = unwritten.filter(r => ++r.attempts <= this.maxRetries)
+        this.counters.expired += unwritten.length - retry.length
+        const room = Math.max(0, this.maxQueued - this.queue.length)
+        this.counters.dropped += Math.max(0, retry.length - room)
+        this.queue.unshift(...retry.slice(0, room))
+        return // leave the retry for the next timed flush rather than hammering a failing DB
+      }
+    }
+  }
+
+  /**
+   * Insert rows, bisecting on a row-level error so one bad row doesn't take
+   * the batch with it. Any other error is rethrown with the rows not yet
+   * written appended to `unwritten`.
+   */
+  private async write(rows: QueuedRow[], unwritten: QueuedRow[]): Promise<void> {
+    try {
+      await this.insert(rows)
+      this.counters.written += rows.length
+      return
+    } catch (e) {
+      if (!isRowError(e)) {
+        unwritten.push(...rows)
+        throw e
+      }
+      if (rows.length === 1) {
+        this.counters.rejected++
+        this.lastError = errorText(e)
+        console.error(`[writeBehind] ${this.name} rejected a row:`, this.lastError)
+        return
+      }
+    }
+    const mid = Math.ceil(rows.length / 2)
+    try {
+      await this.write(rows.slice(0, mid), unwritten)
+    } catch (e) {
+      unwritten.push(...rows.slice(mid))
+      throw e
+    }
+    await this.write(rows.slice(mid), unwritten)
+  }
+
+  private insert(batch: QueuedRow[]): Promise<unknown> {
+    const width = this.columns.length
+    const params: unknown[] = []
+    const tuples = batch.map((row, i) => {
+      params.push(...row.values)
+      return `(${this.columns.map((_, c) => `$${i * width + c + 1}`).join(', ')})`
+    })
+    return query(
+      `INSERT INTO ${this.table} (${this.columns.join(', ')}) VALUES ${tuples.join(', ')} ON CONFLICT DO NOTHING`,
+      params
+    )
+  }
+}
+
+// SQLSTATE class 22 (data exception) and 23 (integrity constraint violation) come
+// from the values themselves: the same rows fail the same way on every retry
+function isRowError(e: unknown): boolean {
+  const code = (e as { code?: unknown } | null)?.code
+  return typeof code === 'string' && (code.startsWith('22') || code.startsWith('23'))
+}
+
+function errorText(e: unknown): string {
+  return e instanceof Error ? e.message.slice(0, 200) : String(e).slice(0, 200)
+}
+
+/** The process-wide sink for `name`, created on first use */
+export function getSink(opts: WriteBehindOptions): WriteBehindSink {
+  let sink = registry.get(opts.name)
+  if (!sink) {
+    sink = new WriteBehindSink(opts)
+    registry.set(opts.name, sink)
+  }
+  return sink
+}
+
+/** Flush every sink — for shutdown and for tests/benchmarks that need the rows visible */
+export async function flushAllSinks(): Promise<void> {
+  await Promise.all([...registry.values()].map(s => s.flush().catch(() => {})))
+}
+
+/** Counters for every sink in this process */
+export function sinkStats(): SinkStats[] {
+  return [...registry.values()].map(s => s.stats())
+}
+
+global.__shutdownHooks.add(flushAllSinks)
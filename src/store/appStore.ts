@@ -1,34 +1,39 @@
 import { create } from 'zustand'
-import { persist, createJSONStorage } from 'zustand/middleware'
+import { persist } from 'zustand/middleware'
+import type { PersistStorage, StorageValue } from 'zustand/middleware'
 
-// Debounced localStorage: batches writes so streaming tokens don't hammer storage
-function createDebouncedStorageBackend(delay = 1000) {
+// Debounced localStorage: keeps only the latest persisted state and serializes it once the
+// writes go quiet, so streaming tokens neither hammer storage nor re-stringify the history
+function createDebouncedStorage<S>(delay = 1000): PersistStorage<S> {
   let timer: ReturnType<typeof setTimeout> | null = null
-  let pendingKey: string | null = null
-  let pendingValue: string | null = null
+  let pending: { name: string; value: StorageValue<S> } | null = null
+
+  function write() {
+    if (pending) {
+      try { localStorage.setItem(pending.name, JSON.stringify(pending.value)) } catch {}
+      pending = null
+    }
+    timer = null
+  }
 
   return {
     getItem: (name: string) => {
       if (typeof window === 'undefined') return null
-      return localStorage.getItem(name)
+      const raw = localStorage.getItem(name)
+      if (!raw) return null
+      try { return JSON.parse(raw) as StorageValue<S> } catch { return null }
     },
-    setItem: (name: string, value: string) => {
+    setItem: (name: string, value: StorageValue<S>) => {
       if (typeof window === 'undefined') return
-      pendingKey = name
-      pendingValue = value
+      pending = { name, value }
       if (timer) clearTimeout(timer)
-      timer = setTimeout(() => {
-        if (pendingKey !== null && pendingValue !== null) {
-          try { localStorage.setItem(pendingKey, pendingValue) } catch {}
-          pendingKey = null
-          pendingValue = null
-        }
-        timer = null
-      }, delay)
+      timer = setTimeout(write, delay)
     },
     removeItem: (name: string) => {
       if (typeof window === 'undefined') return
       if (timer) clearTimeout(timer)
+      timer = null
+      pending = null
       try { localStorage.removeItem(name) } catch {}
     },
   }
@@ -99,11 +104,35 @@ export interface Message {
 export interface Chat {
   id: string
   title: string
-  messages: Message[]
   createdAt: Date
   files: FileNode[]  // per-chat workspace — source of truth
 }
 
+// Messages live outside Chat, normalized: messagesById holds every message,
+// chatMessageIds the per-chat order. A streamed token replaces one Message
+// object and nothing else, so MessageBubbles subscribed by id stay untouched.
+const EMPTY_IDS: string[] = []
+
+export const selectChatMessageIds = (chatId: string | null) => (s: AppState): string[] =>
+  (chatId && s.chatMessageIds[chatId]) || EMPTY_IDS
+
+export const selectMessage = (id: string) => (s: AppState): Message | undefined => s.messagesById[id]
+
+function patchChanges(msg: Message, patch: Partial<Message>): boolean {
+  return (Object.keys(patch) as Array<keyof Message>).some(k => msg[k] !== patch[k])
+}
+
+/** Split chat-embedded messages (persisted v0 / server history) into the normalized maps */
+function normalizeMessages(messages: Message[]): { byId: Record<string, Message>; ids: string[] } {
+  const byId: Record<string, Message> = {}
+  const ids: string[] = []
+  for (const m of messages) {
+    if (!byId[m.id]) ids.push(m.id)
+    byId[m.id] = m
+  }
+  return { byId, ids }
+}
+
 export interface FileNode {
   id: string
   name: string
@@ -192,8 +221,11 @@ export type ContainerStatus =
   | 'ready'
   | 'error'
 
-interface AppState {
-  messages: Message[]
+type PersistedState = Pick<AppState, 'chats' | 'messagesById' | 'chatMessageIds' | 'currentChatId'>
+
+export interface AppState {
+  messagesById: Record<string, Message>
+  chatMessageIds: Record<string, string[]>
   chats: Chat[]
   currentChatId: string | null
   isLoading: boolean
@@ -206,6 +238,8 @@ interface AppState {
   addMessage: (chatIdOrMsg: string | Omit<Message, 'id'>, msg?: Partial<Message>) => string
   appendToMessage: (id: string, content: string) => void
   updateMessage: (chatIdOrId: string, idOrPatch: string | Partial<Message>, patch?: Partial<Message>) => void
+  /** Ordered messages of one chat (defaults to the current chat) — for non-reactive reads */
+  getChatMessages: (chatId?: string | null) => Message[]
   clearMessages: () => void
   setSelectedModel: (model: string) => void
   setStreaming: (v: boolean) => void
@@ -296,7 +330,8 @@ interface AppState {
 }
 
 export const useAppStore = create<AppState>()(persist((set, get) => ({
-  messages: [],
+  messagesById: {},
+  chatMessageIds: {},
   chats: [],
   currentChatId: null,
   isLoading: false,
@@ -308,67 +343,43 @@ export const useAppStore = create<AppState>()(persist((set, get) => ({
 
   addMessage: (chatIdOrMsg, msgPartial) => {
     const id = crypto.randomUUID()
-    if (typeof chatIdOrMsg === 'string') {
-      // Scoped to a specific chat
-      const msg: Message = { id, role: 'user', content: '', ...msgPartial }
-      set((s) => ({
-        messages: [...s.messages, msg],
-        chats: s.chats.map((c) =>
-          c.id === chatIdOrMsg ? { ...c, messages: [...c.messages, msg] } : c
-        ),
-      }))
-    } else {
-      // chatIdOrMsg is Omit<Message, 'id'> — add id and push
-      const msg: Message = { id, ...chatIdOrMsg }
-      set((s) => ({ messages: [...s.messages, msg] }))
-    }
+    // Legacy overload (message only) lands in the current chat
+    const chatId = typeof chatIdOrMsg === 'string' ? chatIdOrMsg : get().currentChatId
+    const msg: Message = typeof chatIdOrMsg === 'string'
+      ? { id, role: 'user', content: '', ...msgPartial }
+      : { id, ...chatIdOrMsg }
+    set((s) => ({
+      messagesById: { ...s.messagesById, [id]: msg },
+      ...(chatId ? { chatMessageIds: { ...s.chatMessageIds, [chatId]: [...(s.chatMessageIds[chatId] ?? []), id] } } : {}),
+    }))
     return id
   },
 
   appendToMessage: (id, content) => {
-    const s = get()
-    const chatIdx = s.chats.findIndex(c => c.messages.some(m => m.id === id))
-    if (chatIdx < 0) return
-    set((st) => {
-      const newChats = [...st.chats]
-      const chat = newChats[chatIdx]
-      newChats[chatIdx] = { ...chat, messages: chat.messages.map((m) => m.id === id ? { ...m, content: m.content + content } : m) }
-      return { chats: newChats, messages: st.messages.map((m) => m.id === id ? { ...m, content: m.content + content } : m) }
+    set((s) => {
+      const m = s.messagesById[id]
+      if (!m || !content) return {}
+      return { messagesById: { ...s.messagesById, [id]: { ...m, content: m.content + content } } }
     })
   },
 
   updateMessage: (chatIdOrId, idOrPatch, patch) => {
-    if (patch !== undefined) {
-      const msgId = idOrPatch as string
-      // Guard: skip if nothing changed
-      const s0 = get()
-      const chat0 = s0.chats.find(c => c.id === chatIdOrId)
-      const msg0 = chat0?.messages.find(m => m.id === msgId)
-      if (msg0) {
-        const keys = Object.keys(patch) as Array<keyof typeof patch>
-        if (keys.every(k => (msg0 as unknown as Record<string, unknown>)[k] === (patch as unknown as Record<string, unknown>)[k])) return
-      }
-      set((s) => ({
-        messages: s.messages.map((m) => m.id === msgId ? { ...m, ...patch } : m),
-        chats: s.chats.map((c) =>
-          c.id === chatIdOrId
-            ? { ...c, messages: c.messages.map((m) => m.id === msgId ? { ...m, ...patch } : m) }
-            : c
-        ),
-      }))
-    } else {
-      const p = idOrPatch as Partial<Message>
-      set((s) => ({
-        messages: s.messages.map((m) => m.id === chatIdOrId ? { ...m, ...p } : m),
-        chats: s.chats.map((c) => ({
-          ...c,
-          messages: c.messages.map((m) => m.id === chatIdOrId ? { ...m, ...p } : m),
-        })),
-      }))
-    }
+    // (chatId, id, patch) or legacy (id, patch) — ids are unique across chats either way
+    const msgId = patch !== undefined ? idOrPatch as string : chatIdOrId
+    const p = patch !== undefined ? patch : idOrPatch as Partial<Message>
+    const m = get().messagesById[msgId]
+    // Guard: skip if nothing changed
+    if (!m || !patchChanges(m, p)) return
+    set((s) => ({ messagesById: { ...s.messagesById, [msgId]: { ...s.messagesById[msgId], ...p } } }))
   },
 
-  clearMessages: () => set({ messages: [] }),
+  getChatMessages: (chatId) => {
+    const s = get()
+    const ids = s.chatMessageIds[chatId ?? s.currentChatId ?? ''] ?? EMPTY_IDS
+    return ids.map(id => s.messagesById[id]).filter(Boolean)
+  },
+
+  clearMessages: () => set({ messagesById: {}, chatMessageIds: {} }),
   setSelectedModel: (model) => set({ selectedModel: model }),
   setStreaming: (v) => set({ isStreaming: v }),
   setPaused: (paused, context) => set({ isPaused: paused, pausedContext: context }),
@@ -386,7 +397,7 @@ export const useAppStore = create<AppState>()(persist((set, get) => ({
     if (existing) {
       // Make sure it's the current chat
       if (get().currentChatId !== existing.id) {
-        set({ currentChatId: existing.id, messages: existing.messages, files: existing.files ?? [] })
+        set({ currentChatId: existing.id, files: existing.files ?? [] })
       }
       return existing.id
     }
@@ -394,9 +405,9 @@ export const useAppStore = create<AppState>()(persist((set, get) => ({
     const id = crypto.randomUUID()
     try { localStorage.setItem('sparkie_single_chat_id', id) } catch {}
     set((s) => ({
-      chats: [{ id, title: 'Sparkie', messages: [], createdAt: new Date(), files: [] }],
+      chats: [{ id, title: 'Sparkie', createdAt: new Date(), files: [] }],
+      chatMessageIds: { ...s.chatMessageIds, [id]: [] },
       currentChatId: id,
-      messages: [],
       files: [],
       activeFileId: null,
       liveCode: '',
@@ -412,10 +423,9 @@ export const useAppStore = create<AppState>()(persist((set, get) => ({
   },
   setCurrentChat: (id) => {
     const chat = get().chats.find((c) => c.id === id)
-    // Restore this chat's full workspace — files, messages, and reset IDE runtime state
+    // Restore this chat's full workspace — files and reset IDE runtime state (messages are keyed by chat already)
     set({
       currentChatId: id,
-      messages: chat?.messages ?? [],
       files: chat?.files ?? [],
       activeFileId: null,
       liveCode: '',
@@ -428,7 +438,12 @@ export const useAppStore = create<AppState>()(persist((set, get) => ({
       buildKey: 0,
     })
   },
-  deleteChat: (id) => set((s) => ({ chats: s.chats.filter((c) => c.id !== id), currentChatId: null, messages: [] })),
+  deleteChat: (id) => set((s) => {
+    const messagesById = { ...s.messagesById }
+    for (const mid of s.chatMessageIds[id] ?? []) delete messagesById[mid]
+    const { [id]: _dropped, ...chatMessageIds } = s.chatMessageIds
+    return { chats: s.chats.filter((c) => c.id !== id), currentChatId: null, messagesById, chatMessageIds }
+  }),
 
   sidebarOpen: true,
   activeTab: 'chat',
@@ -607,12 +622,15 @@ export const useAppStore = create<AppState>()(persist((set, get) => ({
         if (res.ok) {
           const { messages } = await res.json() as { messages: Message[] }
           if (messages && messages.length > 0) {
-            set((s) => ({
-              chats: s.chats.map((c) =>
-                c.id === chatId ? { ...c, messages } : c
-              ),
-              messages,
-            }))
+            const { byId, ids } = normalizeMessages(messages)
+            set((s) => {
+              const messagesById = { ...s.messagesById }
+              for (const mid of s.chatMessageIds[chatId] ?? []) delete messagesById[mid]
+              return {
+                messagesById: Object.assign(messagesById, byId),
+                chatMessageIds: { ...s.chatMessageIds, [chatId]: ids },
+              }
+            })
           }
         }
       } catch { /* history load failed — start fresh */ }
@@ -631,24 +649,48 @@ export const useAppStore = create<AppState>()(persist((set, get) => ({
 }),
   {
     name: 'sparkie-chat-v1',
-    storage: createJSONStorage(() => createDebouncedStorageBackend(800)), // Debounced: max 1 write/800ms — prevents per-token localStorage blocking
+    // v1: messages normalized out of chats. Debounced: serialized + written 800ms after the last change
+    version: 1,
+    storage: createDebouncedStorage<PersistedState>(800),
     // Only persist the chat history — not UI state, IDE state, worklog, etc.
-    partialize: (s) => ({
-      chats: s.chats.map(c => ({
-        ...c,
-        // Ensure Date survives JSON serialization
-        createdAt: c.createdAt instanceof Date ? c.createdAt.toISOString() : c.createdAt,
-        messages: c.messages.filter(m => !m.isStreaming),
-      })),
+    // References only: this runs on every set(), the copy happens when the debounced write fires
+    partialize: (s): PersistedState => ({
+      chats: s.chats,
+      messagesById: s.messagesById,
+      chatMessageIds: s.chatMessageIds,
       currentChatId: s.currentChatId,
     }),
-    // Revive Date objects on hydration
+    migrate: (persisted: unknown, version: number) => {
+      if (version >= 1 || !persisted) return persisted as PersistedState
+      // v0 kept each chat's messages inline
+      const v0 = persisted as { chats?: Array<Chat & { messages?: Message[] }>; currentChatId?: string | null }
+      const messagesById: Record<string, Message> = {}
+      const chatMessageIds: Record<string, string[]> = {}
+      const chats = (v0.chats ?? []).map(({ messages, ...c }) => {
+        const { byId, ids } = normalizeMessages(messages ?? [])
+        Object.assign(messagesById, byId)
+        chatMessageIds[c.id] = ids
+        return c
+      })
+      return { chats, messagesById, chatMessageIds, currentChatId: v0.currentChatId ?? null }
+    },
+    // Revive Date objects and drop messages that were mid-stream when the page went away
     merge: (persisted: unknown, current) => {
-      const p = persisted as Partial<typeof current> | null
+      const p = persisted as Partial<PersistedState> | null
       if (!p) return current
+      const messagesById: Record<string, Message> = {}
+      for (const [id, m] of Object.entries(p.messagesById ?? {})) {
+        if (!m.isStreaming) messagesById[id] = m
+      }
+      const chatMessageIds: Record<string, string[]> = {}
+      for (const [chatId, ids] of Object.entries(p.chatMessageIds ?? {})) {
+        chatMessageIds[chatId] = ids.filter(id => messagesById[id])
+      }
       return {
         ...current,
         ...p,
+        messagesById,
+        chatMessageIds,
         chats: (p.chats ?? []).map((c: Chat) => ({
           ...c,
           createdAt: c.createdAt ? new Date(c.createdAt as unknown as string) : new Date(),